@@ -2,19 +2,15 @@
 Google Calendar Adapter - Implementation of CalendarPort for Google Calendar.
 
 Wraps the google_calendar.py functionality with the CalendarPort interface.
-Preserves OAuth credential management and API operations.
+Calendar REST calls (and token refresh) go through google_calendar.api_request.
 """
 
 import logging
 from datetime import datetime
 from typing import Any
+from urllib.parse import quote
 
-import httpx
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-
-from core.config import settings
+from core.google_calendar import GoogleCalendarAPIError, google_calendar
 from core.ports.calendar import (
     CalendarEvent,
     CalendarInfo,
@@ -26,14 +22,9 @@ from core.ports.calendar import (
 
 logger = logging.getLogger(__name__)
 
-# Google API endpoints
-GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 
-# Calendar scopes
-CALENDAR_SCOPES = [
-    "https://www.googleapis.com/auth/calendar.events",
-    "https://www.googleapis.com/auth/calendar.readonly",
-]
+def _event_path(event_id: str, calendar_id: str = "primary") -> str:
+    return f"/calendars/{quote(calendar_id, safe='')}/events/{quote(event_id, safe='')}"
 
 
 class GoogleCalendarAdapter:
@@ -57,25 +48,6 @@ class GoogleCalendarAdapter:
         """
         self._credential_provider = credential_provider
 
-    def _get_credentials(
-        self,
-        access_token: str,
-        refresh_token: str | None = None,
-    ) -> Credentials:
-        """Create Google credentials object."""
-        return Credentials(
-            token=access_token,
-            refresh_token=refresh_token,
-            token_uri=GOOGLE_TOKEN_URL,
-            client_id=settings.GOOGLE_CLIENT_ID,
-            client_secret=settings.GOOGLE_CLIENT_SECRET,
-            scopes=CALENDAR_SCOPES,
-        )
-
-    def _get_calendar_service(self, credentials: Credentials):
-        """Build Google Calendar API service."""
-        return build("calendar", "v3", credentials=credentials)
-
     async def _get_user_credentials(self, user_id: int) -> tuple[str, str | None]:
         """Get credentials for a user."""
         if self._credential_provider:
@@ -98,8 +70,6 @@ class GoogleCalendarAdapter:
         """Create a calendar event."""
         try:
             access_token, refresh_token = await self._get_user_credentials(user_id)
-            credentials = self._get_credentials(access_token, refresh_token)
-            service = self._get_calendar_service(credentials)
 
             event_body: dict[str, Any] = {
                 "summary": title,
@@ -130,14 +100,13 @@ class GoogleCalendarAdapter:
             if meeting_url:
                 event_body["location"] = meeting_url
 
-            created_event = (
-                service.events()
-                .insert(
-                    calendarId="primary",
-                    body=event_body,
-                    sendUpdates="all" if send_notifications else "none",
-                )
-                .execute()
+            created_event = await google_calendar.api_request(
+                access_token,
+                refresh_token,
+                "POST",
+                "/calendars/primary/events",
+                params={"sendUpdates": "all" if send_notifications else "none"},
+                json=event_body,
             )
 
             logger.info("Created calendar event %s", created_event.get("id"))
@@ -149,7 +118,7 @@ class GoogleCalendarAdapter:
                 ical_uid=created_event.get("iCalUID"),
             )
 
-        except HttpError as e:
+        except GoogleCalendarAPIError as e:
             logger.error("Google Calendar API error: %s", e)
             return CalendarResult(
                 success=False,
@@ -177,11 +146,9 @@ class GoogleCalendarAdapter:
         """Update an existing calendar event."""
         try:
             access_token, refresh_token = await self._get_user_credentials(user_id)
-            credentials = self._get_credentials(access_token, refresh_token)
-            service = self._get_calendar_service(credentials)
 
             # Get existing event
-            event = service.events().get(calendarId="primary", eventId=event_id).execute()
+            event = await google_calendar.api_request(access_token, refresh_token, "GET", _event_path(event_id))
 
             # Update fields
             if title:
@@ -195,12 +162,14 @@ class GoogleCalendarAdapter:
             if meeting_url:
                 event["location"] = meeting_url
 
-            service.events().update(
-                calendarId="primary",
-                eventId=event_id,
-                body=event,
-                sendUpdates="all",
-            ).execute()
+            await google_calendar.api_request(
+                access_token,
+                refresh_token,
+                "PUT",
+                _event_path(event_id),
+                params={"sendUpdates": "all"},
+                json=event,
+            )
 
             logger.info("Updated calendar event %s", event_id)
 
@@ -209,7 +178,7 @@ class GoogleCalendarAdapter:
                 event_id=event_id,
             )
 
-        except HttpError as e:
+        except GoogleCalendarAPIError as e:
             logger.error("Failed to update calendar event: %s", e)
             return CalendarResult(
                 success=False,
@@ -232,14 +201,14 @@ class GoogleCalendarAdapter:
         """Delete a calendar event."""
         try:
             access_token, refresh_token = await self._get_user_credentials(user_id)
-            credentials = self._get_credentials(access_token, refresh_token)
-            service = self._get_calendar_service(credentials)
 
-            service.events().delete(
-                calendarId="primary",
-                eventId=event_id,
-                sendUpdates="all" if send_notifications else "none",
-            ).execute()
+            await google_calendar.api_request(
+                access_token,
+                refresh_token,
+                "DELETE",
+                _event_path(event_id),
+                params={"sendUpdates": "all" if send_notifications else "none"},
+            )
 
             logger.info("Deleted calendar event %s", event_id)
 
@@ -248,8 +217,8 @@ class GoogleCalendarAdapter:
                 event_id=event_id,
             )
 
-        except HttpError as e:
-            if e.resp.status == 404:
+        except GoogleCalendarAPIError as e:
+            if e.status_code in (404, 410):
                 logger.warning("Calendar event %s not found", event_id)
                 return CalendarResult(success=True, event_id=event_id)
             logger.error("Failed to delete calendar event: %s", e)
@@ -275,8 +244,6 @@ class GoogleCalendarAdapter:
         """Check for busy times in a calendar."""
         try:
             access_token, refresh_token = await self._get_user_credentials(user_id)
-            credentials = self._get_credentials(access_token, refresh_token)
-            service = self._get_calendar_service(credentials)
 
             body = {
                 "timeMin": start_time.isoformat(),
@@ -284,7 +251,9 @@ class GoogleCalendarAdapter:
                 "items": [{"id": calendar_id}],
             }
 
-            result = service.freebusy().query(body=body).execute()
+            result = await google_calendar.api_request(
+                access_token, refresh_token, "POST", "/freeBusy", retry=True, json=body
+            )
 
             calendars = result.get("calendars", {})
             calendar_data = calendars.get(calendar_id, {})
@@ -323,20 +292,19 @@ class GoogleCalendarAdapter:
         """Get calendar events within a time range."""
         try:
             access_token, refresh_token = await self._get_user_credentials(user_id)
-            credentials = self._get_credentials(access_token, refresh_token)
-            service = self._get_calendar_service(credentials)
-
-            events_result = (
-                service.events()
-                .list(
-                    calendarId=calendar_id,
-                    timeMin=start_time.isoformat(),
-                    timeMax=end_time.isoformat(),
-                    singleEvents=True,
-                    orderBy="startTime",
-                    maxResults=max_results,
-                )
-                .execute()
+
+            events_result = await google_calendar.api_request(
+                access_token,
+                refresh_token,
+                "GET",
+                f"/calendars/{quote(calendar_id, safe='')}/events",
+                params={
+                    "timeMin": start_time.isoformat(),
+                    "timeMax": end_time.isoformat(),
+                    "singleEvents": "true",
+                    "orderBy": "startTime",
+                    "maxResults": max_results,
+                },
             )
 
             events = []
@@ -377,10 +345,10 @@ class GoogleCalendarAdapter:
         """List user's available calendars."""
         try:
             access_token, refresh_token = await self._get_user_credentials(user_id)
-            credentials = self._get_credentials(access_token, refresh_token)
-            service = self._get_calendar_service(credentials)
 
-            calendar_list = service.calendarList().list().execute()
+            calendar_list = await google_calendar.api_request(
+                access_token, refresh_token, "GET", "/users/me/calendarList"
+            )
 
             calendars = []
             for item in calendar_list.get("items", []):
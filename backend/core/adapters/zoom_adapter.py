@@ -2,18 +2,17 @@
 Zoom Adapter - Implementation of MeetingPort for Zoom.
 
 Wraps the ZoomClient from zoom_router.py with the MeetingPort interface.
-Preserves Server-to-Server OAuth and retry logic.
+Preserves Server-to-Server OAuth. Requests share the pooled "zoom" client,
+which retries rate limits and server errors (core/http_clients.py).
 """
 
-import asyncio
 import base64
 import logging
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
-import httpx
-
 from core.config import settings
+from core.http_clients import http_clients
 from core.ports.meeting import (
     MeetingDetails,
     MeetingPort,
@@ -28,11 +27,6 @@ logger = logging.getLogger(__name__)
 ZOOM_TOKEN_URL = "https://zoom.us/oauth/token"
 ZOOM_API_BASE = "https://api.zoom.us/v2"
 
-# Retry configuration
-ZOOM_MAX_RETRIES = 3
-ZOOM_RETRY_BASE_DELAY = 1.0
-ZOOM_RETRY_MAX_DELAY = 10.0
-
 
 class ZoomAdapter:
     """
@@ -41,7 +35,7 @@ class ZoomAdapter:
     Features:
     - Server-to-Server OAuth authentication
     - Automatic token refresh
-    - Retry logic with exponential backoff
+    - Retries with exponential backoff and a retry budget
     - Meeting CRUD operations
     """
 
@@ -67,28 +61,31 @@ class ZoomAdapter:
             f"{settings.ZOOM_CLIENT_ID}:{settings.ZOOM_CLIENT_SECRET}".encode()
         ).decode()
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                ZOOM_TOKEN_URL,
-                headers={
-                    "Authorization": f"Basic {credentials}",
-                    "Content-Type": "application/x-www-form-urlencoded",
-                },
-                data={
-                    "grant_type": "account_credentials",
-                    "account_id": settings.ZOOM_ACCOUNT_ID,
-                },
-            )
-
-            if response.status_code != 200:
-                logger.error("Zoom token error: %s", response.text)
-                raise ValueError("Failed to authenticate with Zoom")
-
-            data = response.json()
-            self._access_token = data["access_token"]
-            self._token_expires = datetime.now(UTC) + timedelta(seconds=data["expires_in"])
-
-            return self._access_token
+        # Issuing a token has no side effects, so it is safe to retry
+        response = await http_clients.request(
+            "zoom",
+            "POST",
+            ZOOM_TOKEN_URL,
+            retry=True,
+            headers={
+                "Authorization": f"Basic {credentials}",
+                "Content-Type": "application/x-www-form-urlencoded",
+            },
+            data={
+                "grant_type": "account_credentials",
+                "account_id": settings.ZOOM_ACCOUNT_ID,
+            },
+        )
+
+        if response.status_code != 200:
+            logger.error("Zoom token error: %s", response.text)
+            raise ValueError("Failed to authenticate with Zoom")
+
+        data = response.json()
+        self._access_token = data["access_token"]
+        self._token_expires = datetime.now(UTC) + timedelta(seconds=data["expires_in"])
+
+        return self._access_token
 
     async def _api_request(
         self,
@@ -96,57 +93,30 @@ class ZoomAdapter:
         endpoint: str,
         **kwargs: Any,
     ) -> dict:
-        """Make an authenticated Zoom API request with retry logic."""
-        last_error: Exception | None = None
-
-        for attempt in range(ZOOM_MAX_RETRIES + 1):
-            try:
-                token = await self._get_access_token()
-
-                async with httpx.AsyncClient() as client:
-                    response = await client.request(
-                        method,
-                        f"{ZOOM_API_BASE}{endpoint}",
-                        headers={
-                            "Authorization": f"Bearer {token}",
-                            "Content-Type": "application/json",
-                        },
-                        **kwargs,
-                    )
-
-                    if response.status_code == 429:
-                        # Rate limited - retry with backoff
-                        delay = min(ZOOM_RETRY_BASE_DELAY * (2 ** attempt), ZOOM_RETRY_MAX_DELAY)
-                        logger.warning("Zoom rate limited, retrying in %ss", delay)
-                        await asyncio.sleep(delay)
-                        continue
-
-                    if response.status_code >= 500:
-                        # Server error - retry
-                        delay = min(ZOOM_RETRY_BASE_DELAY * (2 ** attempt), ZOOM_RETRY_MAX_DELAY)
-                        logger.warning("Zoom server error, retrying in %ss", delay)
-                        await asyncio.sleep(delay)
-                        continue
-
-                    if response.status_code == 204:
-                        return {}
-
-                    if response.status_code >= 400:
-                        error_data = response.json() if response.content else {}
-                        raise ValueError(
-                            error_data.get("message", f"Zoom API error: {response.status_code}")
-                        )
-
-                    return response.json()
-
-            except httpx.RequestError as e:
-                last_error = e
-                delay = min(ZOOM_RETRY_BASE_DELAY * (2 ** attempt), ZOOM_RETRY_MAX_DELAY)
-                logger.warning("Zoom connection error, retrying in %ss: %s", delay, e)
-                await asyncio.sleep(delay)
-                continue
-
-        raise last_error or ValueError("Zoom API request failed after retries")
+        """Make an authenticated Zoom API request (retried by the shared client)."""
+        token = await self._get_access_token()
+
+        response = await http_clients.request(
+            "zoom",
+            method,
+            f"{ZOOM_API_BASE}{endpoint}",
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            },
+            **kwargs,
+        )
+
+        if response.status_code == 204:
+            return {}
+
+        if response.status_code >= 400:
+            error_data = response.json() if response.content else {}
+            raise ValueError(
+                error_data.get("message", f"Zoom API error: {response.status_code}")
+            )
+
+        return response.json()
 
     async def create_meeting(
         self,
@@ -14,8 +14,13 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
 from contextlib import asynccontextmanager
 from functools import lru_cache
+from urllib.parse import quote
 
 import aiofiles
 import boto3
@@ -26,6 +31,7 @@ from botocore.exceptions import ClientError
 from fastapi import HTTPException, status
 
 from core.config import settings
+from core.image_processing import rendition_key
 
 logger = logging.getLogger(__name__)
 
@@ -193,6 +199,36 @@ class AvatarStorageClient:
                 detail="Unable to store avatar",
             ) from exc
 
+    async def upload_objects(self, objects: Iterable[tuple[str, bytes, str]]) -> None:
+        """
+        Upload several in-memory objects (key, payload, content type) at once.
+
+        Used for avatar renditions; all uploads share one client connection.
+        """
+        await self.ensure_bucket()
+
+        try:
+            async with self._client() as client:
+                await asyncio.gather(
+                    *(
+                        client.put_object(
+                            Bucket=self._bucket,
+                            Key=key,
+                            Body=payload,
+                            ContentType=content_type,
+                            ACL="private",
+                            CacheControl="max-age=31536000, immutable",
+                        )
+                        for key, payload, content_type in objects
+                    )
+                )
+        except ClientError as exc:
+            logger.error("Failed to upload avatar objects: %s", exc)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Unable to store avatar",
+            ) from exc
+
     async def delete_file(self, key: str) -> None:
         """Delete an object from the storage bucket (idempotent)."""
         if not key:
@@ -346,11 +382,123 @@ def generate_presigned_url_sync(
         ) from exc
 
 
+# =============================================================================
+# Signed URL Cache
+# =============================================================================
+
+
+class PresignedUrlCache:
+    """
+    Bounded LRU of signed avatar URLs keyed by ``(key, ttl bucket)``.
+
+    Time is split into buckets of half the URL TTL. A URL signed during a
+    bucket is reused until the bucket ends, so it always has at least half its
+    lifetime left when handed out, and repeated renders within a bucket return
+    identical (browser-cacheable) URLs.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._urls: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    @staticmethod
+    def _bucket(ttl_seconds: int) -> int:
+        return int(time.time() // max(1, ttl_seconds // 2))
+
+    def get_many(self, keys: Iterable[str], ttl_seconds: int) -> tuple[dict[str, str], list[str]]:
+        """Return ``(cached urls, keys still to sign)``."""
+        bucket = self._bucket(ttl_seconds)
+        found: dict[str, str] = {}
+        missing: list[str] = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                url = self._urls.get((key, ttl_seconds, bucket))
+                if url is None:
+                    missing.append(key)
+                else:
+                    self._urls.move_to_end((key, ttl_seconds, bucket))
+                    found[key] = url
+        return found, missing
+
+    def put_many(self, urls: dict[str, str], ttl_seconds: int) -> None:
+        bucket = self._bucket(ttl_seconds)
+        with self._lock:
+            for key, url in urls.items():
+                self._urls[(key, ttl_seconds, bucket)] = url
+            while len(self._urls) > self.max_entries:
+                self._urls.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._urls.clear()
+
+
+presigned_url_cache = PresignedUrlCache(settings.AVATAR_URL_CACHE_MAX_ENTRIES)
+
+
+def _public_avatar_url(key: str) -> str:
+    """Stable CDN-style URL for a key (no signature, never expires)."""
+    return f"{settings.AVATAR_PUBLIC_BASE_URL.rstrip('/')}/{quote(key, safe='/')}"
+
+
+def sign_avatar_urls(keys: Iterable[str], ttl_seconds: int | None = None) -> dict[str, str]:
+    """
+    Resolve URLs for many storage keys at once.
+
+    Cached URLs are reused and the remaining keys are signed in one pass
+    with the shared client. With ``AVATAR_PUBLIC_BASE_URL`` set, stable
+    public URLs are returned instead of presigned ones.
+
+    Args:
+        keys: Object keys in storage (duplicates are signed once)
+        ttl_seconds: URL validity period (defaults to configured TTL)
+
+    Returns:
+        Mapping of key to URL
+    """
+    if settings.AVATAR_PUBLIC_BASE_URL:
+        return {key: _public_avatar_url(key) for key in keys}
+
+    expiry = ttl_seconds if ttl_seconds is not None else settings.AVATAR_STORAGE_URL_TTL_SECONDS
+    urls, missing = presigned_url_cache.get_many(keys, expiry)
+    if missing:
+        signed = {key: generate_presigned_url_sync(key, expiry) for key in missing}
+        presigned_url_cache.put_many(signed, expiry)
+        urls.update(signed)
+    return urls
+
+
+def prefetch_avatar_urls(
+    keys: Iterable[str | None],
+    *,
+    allow_absolute: bool = True,
+    size: int | None = None,
+) -> None:
+    """
+    Sign a page worth of avatar keys up front.
+
+    Call before building DTOs in a loop so the per-item ``build_avatar_url``
+    calls are served from the cache; pass the same ``size`` they use.
+    """
+    storage_keys = [
+        rendition_key(key, size) if size else key
+        for key in keys
+        if key and not (allow_absolute and (key.startswith("http://") or key.startswith("https://")))
+    ]
+    if storage_keys:
+        sign_avatar_urls(storage_keys)
+
+
 def build_avatar_url(
     key: str | None,
     *,
     default: str | None = None,
     allow_absolute: bool = True,
+    size: int | None = None,
 ) -> str | None:
     """
     Build a presigned avatar URL from a storage key (synchronous).
@@ -359,6 +507,9 @@ def build_avatar_url(
         key: Storage key or absolute URL.
         default: Value to return when key is falsy (e.g., default avatar URL).
         allow_absolute: If True, return key unchanged when it already looks absolute.
+        size: Display size in device pixels. Uploads stored as renditions
+            resolve to the closest one (see ``rendition_key``); other keys
+            and URLs are unaffected.
 
     Returns:
         Presigned URL for private avatar access, or default if key is empty.
@@ -367,15 +518,21 @@ def build_avatar_url(
         - URLs expire after configured TTL (default 5 minutes)
         - No permanent public access to avatar files
         - Each URL contains signed credentials
+
+    Signed URLs are cached (see ``PresignedUrlCache``); use
+    ``prefetch_avatar_urls`` to sign a whole page at once.
     """
     if not key:
         return default
 
+    if size:
+        key = rendition_key(key, size)
+
     # If already a full URL (e.g., from OAuth provider or external service), return as-is
     if allow_absolute and (key.startswith("http://") or key.startswith("https://")):
         return key
 
-    return generate_presigned_url_sync(key)
+    return sign_avatar_urls([key])[key]
 
 
 async def build_avatar_url_async(
@@ -383,6 +540,7 @@ async def build_avatar_url_async(
     *,
     default: str | None = None,
     allow_absolute: bool = True,
+    size: int | None = None,
 ) -> str | None:
     """
     Build a presigned avatar URL from a storage key (async version).
@@ -393,6 +551,9 @@ async def build_avatar_url_async(
     if not key:
         return default
 
+    if size:
+        key = rendition_key(key, size)
+
     if allow_absolute and (key.startswith("http://") or key.startswith("https://")):
         return key
 
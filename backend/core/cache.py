@@ -1,80 +1,591 @@
-"""Simple in-memory caching utilities for frequently accessed data."""
+"""
+Two-tier caching utilities for frequently accessed data.
 
+Tier 1 is a bounded in-process LRU with TTL and byte-size accounting. Tier 2
+is Redis (through ``CachePort``) and is shared by every uvicorn worker; it is
+consulted by ``async`` cached functions on a local miss. Sync cached
+functions only use the local tier, since the Redis client is async.
+
+Concurrent misses for the same key are collapsed into a single load
+(single-flight), so an expired hot key does not stampede the database.
+
+Invalidation is tag based. Every entry carries the tag of its namespace plus
+any tags declared on the decorator. Locally a tag index drops matching entries
+directly. In Redis each tag has a version counter: entries record the versions
+they were computed under and are treated as misses once any of them moves.
+Other workers keep serving their local copy until it expires, which is why the
+local TTL is capped by ``CACHE_LOCAL_TTL_SECONDS`` (or a decorator's own
+``local_ttl_seconds``).
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import sys
+import threading
 import time
-from collections.abc import Callable
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
 from functools import wraps
 from typing import Any
 
-# Simple in-memory cache with TTL
-_cache: dict[str, tuple[Any, float]] = {}
+import anyio.from_thread
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.ports.cache import CachePort
+
+logger = logging.getLogger(__name__)
+
+ENTRY_KEY_PREFIX = "cache:entry:"
+TAG_KEY_PREFIX = "cache:tag:"
+MAX_KEY_LENGTH = 200
+
+# Arguments that never contribute to a cache key
+_UNKEYED_TYPES: tuple[type, ...] = (Session, AsyncSession)
 
 
-def cache_with_ttl(ttl_seconds: int = 300):
+def namespace_tag(namespace: str) -> str:
+    """Tag attached to every entry of a namespace."""
+    return f"ns:{namespace}"
+
+
+def build_cache_key(*args: Any, **kwargs: Any) -> str:
+    """
+    Default key builder.
+
+    Database sessions are skipped so that calls from different requests share
+    an entry. Long keys are hashed to keep Redis keys bounded.
+    """
+    parts = [repr(arg) for arg in args if not isinstance(arg, _UNKEYED_TYPES)]
+    parts.extend(f"{name}={value!r}" for name, value in sorted(kwargs.items()) if not isinstance(value, _UNKEYED_TYPES))
+    key = "|".join(parts)
+    if len(key) > MAX_KEY_LENGTH:
+        key = hashlib.sha256(key.encode()).hexdigest()
+    return key
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate payload size in bytes (serialized size when possible)."""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+# =============================================================================
+# Tier 1: bounded in-process LRU
+# =============================================================================
+
+
+@dataclass
+class NamespaceMetrics:
+    """Hit/miss/eviction counters for one cache namespace."""
+
+    hits: int = 0
+    shared_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+@dataclass
+class _LocalEntry:
+    value: Any
+    expires_at: float
+    size: int
+    namespace: str
+    tags: frozenset[str]
+
+
+class LocalCache:
+    """Thread-safe LRU with TTL, entry and byte limits, and a tag index."""
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: OrderedDict[str, _LocalEntry] = OrderedDict()
+        self._tag_index: dict[str, set[str]] = defaultdict(set)
+        self._metrics: dict[str, NamespaceMetrics] = defaultdict(NamespaceMetrics)
+        self._tag_generations: dict[str, int] = defaultdict(int)
+        self._clear_generation = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def get(self, namespace: str, key: str) -> tuple[bool, Any]:
+        """Return ``(hit, value)``; a hit refreshes the entry's LRU position."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self._metrics[namespace].expirations += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._metrics[namespace].hits += 1
+            return True, entry.value
+
+    def generation(self, tags: Iterable[str]) -> tuple:
+        """Snapshot of invalidations affecting ``tags``; pass it to ``set``."""
+        with self._lock:
+            return self._clear_generation, tuple(self._tag_generations.get(tag, 0) for tag in sorted(tags))
+
+    def set(
+        self,
+        namespace: str,
+        key: str,
+        value: Any,
+        ttl_seconds: float,
+        tags: Iterable[str],
+        generation: tuple | None = None,
+    ) -> None:
+        """
+        Store a value, evicting least recently used entries to stay within limits.
+
+        If ``generation`` was taken before the value was loaded and one of its
+        tags has been invalidated since, the (possibly stale) value is dropped.
+        """
+        if ttl_seconds <= 0:
+            return
+        tags = frozenset(tags)
+        size = _estimate_size(value)
+        with self._lock:
+            if generation is not None and generation != self.generation(tags):
+                return
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+            entry = _LocalEntry(value, time.monotonic() + ttl_seconds, size, namespace, tags)
+            self._entries[key] = entry
+            self.total_bytes += size
+            metrics = self._metrics[namespace]
+            metrics.entries += 1
+            metrics.bytes += size
+            for tag in entry.tags:
+                self._tag_index[tag].add(key)
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                oldest_key, oldest = next(iter(self._entries.items()))
+                self._remove(oldest_key)
+                self._metrics[oldest.namespace].evictions += 1
+
+    def record_miss(self, namespace: str) -> None:
+        with self._lock:
+            self._metrics[namespace].misses += 1
+
+    def record_shared_hit(self, namespace: str) -> None:
+        with self._lock:
+            self._metrics[namespace].shared_hits += 1
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying any of ``tags``; returns the number removed."""
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                self._tag_generations[tag] += 1
+                for key in list(self._tag_index.get(tag, ())):
+                    entry = self._entries.get(key)
+                    if entry is None:
+                        continue
+                    self._remove(key)
+                    self._metrics[entry.namespace].invalidations += 1
+                    removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Drop all entries and reset metrics."""
+        with self._lock:
+            self._entries.clear()
+            self._tag_index.clear()
+            self._metrics.clear()
+            self._tag_generations.clear()
+            self._clear_generation += 1
+            self.total_bytes = 0
+
+    def metrics(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {namespace: asdict(metrics) for namespace, metrics in self._metrics.items()}
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry.size
+        metrics = self._metrics[entry.namespace]
+        metrics.entries -= 1
+        metrics.bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+
+# =============================================================================
+# Tier 2: Redis shared across workers
+# =============================================================================
+
+
+class SharedCache:
+    """Redis tier with tag-versioned entries."""
+
+    def __init__(self, port: CachePort) -> None:
+        self._port = port
+
+    async def get(self, key: str, tags: Iterable[str]) -> tuple[bool, Any, dict[str, int]]:
+        """
+        Return ``(hit, value, tag_versions)`` in one round trip.
+
+        The current tag versions are returned on a miss too; pass them to
+        ``set`` so a value computed across an invalidation is never served.
+        """
+        tag_list = sorted(tags)
+        entry_key = ENTRY_KEY_PREFIX + key
+        found = await self._port.get_many([entry_key, *(TAG_KEY_PREFIX + tag for tag in tag_list)])
+        versions = {tag: int(found.get(TAG_KEY_PREFIX + tag) or 0) for tag in tag_list}
+        payload = found.get(entry_key)
+        if isinstance(payload, dict) and "v" in payload and payload.get("t") == versions:
+            return True, payload["v"], versions
+        return False, None, versions
+
+    async def set(self, key: str, value: Any, ttl_seconds: int, versions: dict[str, int]) -> None:
+        if ttl_seconds <= 0:
+            return
+        await self._port.set(ENTRY_KEY_PREFIX + key, {"v": value, "t": versions}, ttl_seconds=ttl_seconds)
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            await self._port.increment(TAG_KEY_PREFIX + tag)
+
+
+_local = LocalCache(settings.CACHE_LOCAL_MAX_ENTRIES, settings.CACHE_LOCAL_MAX_BYTES)
+_shared: SharedCache | None = None
+_shared_configured = False
+
+
+def configure_shared_cache(port: CachePort | None) -> None:
+    """Set (or with ``None`` disable) the shared tier's backend."""
+    global _shared, _shared_configured
+    _shared = SharedCache(port) if port is not None else None
+    _shared_configured = True
+
+
+def _get_shared_cache() -> SharedCache | None:
+    if not _shared_configured:
+        port = None
+        if settings.CACHE_REDIS_ENABLED:
+            from core.adapters.redis_adapter import redis_adapter
+
+            port = redis_adapter
+        configure_shared_cache(port)
+    return _shared
+
+
+# =============================================================================
+# Single-flight
+# =============================================================================
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class _SyncSingleFlight:
+    """Collapse concurrent sync loads of one key onto the first caller."""
+
+    def __init__(self) -> None:
+        self._calls: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def run(self, key: str, load: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+        try:
+            call.value = load()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+
+class _AsyncSingleFlight:
+    """Collapse concurrent async loads of one key onto the first caller."""
+
+    def __init__(self) -> None:
+        self._calls: dict[str, asyncio.Future] = {}
+
+    async def run(self, key: str, load: Callable[[], Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        pending = self._calls.get(key)
+        if pending is not None and pending.get_loop() is loop:
+            return await asyncio.shield(pending)
+
+        future = loop.create_future()
+        self._calls[key] = future
+        try:
+            value = await load()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else was waiting
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+
+_sync_flight = _SyncSingleFlight()
+_async_flight = _AsyncSingleFlight()
+
+
+# =============================================================================
+# Public API
+# =============================================================================
+
+
+def cache_with_ttl(
+    ttl_seconds: int = 300,
+    *,
+    namespace: str | None = None,
+    key_builder: Callable[..., str] | None = None,
+    tags: Iterable[str] | Callable[..., Iterable[str]] | None = None,
+    shared: bool = True,
+    local_ttl_seconds: int | None = None,
+):
     """
     Decorator to cache function results with TTL (Time To Live).
 
+    Works on sync and async functions. Async functions also read and write the
+    shared Redis tier, so their values must be JSON-serializable.
+
     Args:
         ttl_seconds: Cache duration in seconds (default: 5 minutes)
+        namespace: Metrics and invalidation namespace (default: module.qualname)
+        key_builder: Builds the key from the call arguments (default:
+            ``build_cache_key``, which ignores database sessions)
+        tags: Invalidation tags, or a callable returning them from the call arguments
+        shared: Set False to keep an async function's values out of Redis
+        local_ttl_seconds: Local tier TTL for shared entries (default:
+            ``CACHE_LOCAL_TTL_SECONDS``); lower it where staleness on other
+            workers matters
 
     Usage:
-        @cache_with_ttl(ttl_seconds=300)
-        def get_subjects(db):
-            return db.query(Subject).all()
+        @cache_with_ttl(ttl_seconds=300, tags=lambda db, tutor_id: [f"tutor:{tutor_id}"])
+        async def get_tutor_summary(db, tutor_id):
+            ...
+
+        await invalidate_tags(f"tutor:{tutor_id}")
     """
 
     def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            # Create cache key from function name and args
-            cache_key = f"{func.__module__}.{func.__name__}:{str(args)}:{str(kwargs)}"
+        ns = namespace or f"{func.__module__}.{func.__qualname__}"
+        build_key = key_builder or build_cache_key
+        local_ttl = min(
+            ttl_seconds,
+            local_ttl_seconds if local_ttl_seconds is not None else settings.CACHE_LOCAL_TTL_SECONDS,
+        )
+
+        def resolve(args: tuple, kwargs: dict) -> tuple[str, frozenset[str]]:
+            key = f"{ns}:{build_key(*args, **kwargs)}"
+            entry_tags = {namespace_tag(ns)}
+            if tags is not None:
+                entry_tags.update(tags(*args, **kwargs) if callable(tags) else tags)
+            return key, frozenset(entry_tags)
+
+        if inspect.iscoroutinefunction(func):
 
-            # Check if cached and still valid
-            if cache_key in _cache:
-                cached_value, expiry_time = _cache[cache_key]
-                if time.time() < expiry_time:
-                    return cached_value
-                else:
-                    # Expired, remove from cache
-                    del _cache[cache_key]
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key, entry_tags = resolve(args, kwargs)
+                hit, value = _local.get(ns, key)
+                if hit:
+                    return value
 
-            # Not cached or expired - compute value
-            result = func(*args, **kwargs)
+                async def load():
+                    generation = _local.generation(entry_tags)
+                    shared_cache = _get_shared_cache() if shared else None
+                    versions: dict[str, int] = {}
+                    if shared_cache is not None:
+                        try:
+                            hit, value, versions = await shared_cache.get(key, entry_tags)
+                        except Exception as e:
+                            logger.warning("Shared cache read failed for %s: %s", key, e)
+                            shared_cache, hit = None, False
+                        if hit:
+                            _local.record_shared_hit(ns)
+                            _local.set(ns, key, value, local_ttl, entry_tags, generation)
+                            return value
 
-            # Store in cache with expiry time
-            _cache[cache_key] = (result, time.time() + ttl_seconds)
+                    _local.record_miss(ns)
+                    value = await func(*args, **kwargs)
+                    _local.set(ns, key, value, local_ttl, entry_tags, generation)
+                    if shared_cache is not None:
+                        try:
+                            await shared_cache.set(key, value, ttl_seconds, versions)
+                        except Exception as e:
+                            logger.warning("Shared cache write failed for %s: %s", key, e)
+                    return value
 
-            return result
+                return await _async_flight.run(key, load)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key, entry_tags = resolve(args, kwargs)
+            hit, value = _local.get(ns, key)
+            if hit:
+                return value
+
+            def load():
+                # Re-check: another thread may have filled the entry while we queued
+                hit, value = _local.get(ns, key)
+                if hit:
+                    return value
+                generation = _local.generation(entry_tags)
+                _local.record_miss(ns)
+                value = func(*args, **kwargs)
+                _local.set(ns, key, value, ttl_seconds, entry_tags, generation)
+                return value
+
+            return _sync_flight.run(key, load)
 
         return wrapper
 
     return decorator
 
 
-def invalidate_cache(pattern: str | None = None) -> None:
+async def invalidate_tags(*tags: str) -> int:
     """
-    Invalidate cached entries.
+    Invalidate entries carrying any of ``tags`` in both tiers.
+
+    Returns the number of local entries dropped.
+    """
+    removed = _local.invalidate_tags(tags)
+    shared_cache = _get_shared_cache()
+    if shared_cache is not None:
+        try:
+            await shared_cache.invalidate_tags(tags)
+        except Exception as e:
+            logger.warning("Shared cache invalidation failed for %s: %s", tags, e)
+    return removed
+
+
+async def _invalidate_shared(shared_cache: SharedCache, tags: tuple[str, ...]) -> None:
+    try:
+        await shared_cache.invalidate_tags(tags)
+    except Exception as e:
+        logger.warning("Shared cache invalidation failed for %s: %s", tags, e)
+
+
+async def _invalidate_shared_on_own_loop(shared_cache: SharedCache, tags: tuple[str, ...]) -> None:
+    from core.adapters.redis_adapter import RedisAdapter
+
+    port = shared_cache._port
+    if not isinstance(port, RedisAdapter):
+        await _invalidate_shared(shared_cache, tags)
+        return
+    # The shared adapter's client is bound to the loop it was first used on;
+    # this loop lives for one call, so it gets a client of its own
+    client = RedisAdapter(redis_url=port._redis_url)
+    try:
+        await _invalidate_shared(SharedCache(client), tags)
+    finally:
+        await client.close()
+
+
+_background_invalidations: set[asyncio.Task] = set()
+
+
+def invalidate_tags_sync(*tags: str) -> int:
+    """
+    ``invalidate_tags`` for sync code such as ORM event handlers.
+
+    The local tier is invalidated immediately. The shared tier is bumped on
+    the event loop running in this thread (as a background task), or through
+    the loop that dispatched this worker thread (sync FastAPI endpoints).
+    Without either (Celery tasks, scripts), it is bumped before returning on
+    a short-lived loop with its own Redis client.
+
+    Returns the number of local entries dropped.
+    """
+    removed = _local.invalidate_tags(tags)
+    shared_cache = _get_shared_cache()
+    if shared_cache is None:
+        return removed
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is not None:
+        task = loop.create_task(_invalidate_shared(shared_cache, tags))
+        _background_invalidations.add(task)
+        task.add_done_callback(_background_invalidations.discard)
+        return removed
+    try:
+        anyio.from_thread.run(_invalidate_shared, shared_cache, tags)
+    except RuntimeError:
+        asyncio.run(_invalidate_shared_on_own_loop(shared_cache, tags))
+    return removed
+
+
+def invalidate_cache(namespace: str | None = None) -> None:
+    """
+    Invalidate local cached entries.
 
     Args:
-        pattern: If provided, only invalidate keys containing this pattern.
-                 If None, invalidate all cache.
+        namespace: If provided, only drop entries of this namespace.
+                   If None, drop the whole local tier and reset metrics.
     """
-    if pattern is None:
-        _cache.clear()
+    if namespace is None:
+        _local.clear()
     else:
-        keys_to_remove = [key for key in _cache if pattern in key]
-        for key in keys_to_remove:
-            del _cache[key]
-
+        _local.invalidate_tags([namespace_tag(namespace)])
 
-def get_cache_stats() -> dict[str, Any]:
-    """Get cache statistics for monitoring."""
-    now = time.time()
-    valid_entries = sum(1 for _, expiry in _cache.values() if expiry > now)
-    expired_entries = len(_cache) - valid_entries
 
+def get_cache_metrics() -> dict[str, Any]:
+    """Per-namespace hit/miss/eviction counters and local tier usage."""
     return {
-        "total_entries": len(_cache),
-        "valid_entries": valid_entries,
-        "expired_entries": expired_entries,
-        "keys": list(_cache.keys()),
+        "entries": len(_local),
+        "bytes": _local.total_bytes,
+        "max_entries": _local.max_entries,
+        "max_bytes": _local.max_bytes,
+        "namespaces": _local.metrics(),
     }
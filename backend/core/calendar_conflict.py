@@ -6,30 +6,50 @@ Uses caching to minimize API calls while ensuring availability accuracy.
 
 Features:
 - Checks Google Calendar for busy times during requested booking slots
-- Caches results briefly (2 minutes) to reduce API load
+- Caches each tutor's busy times per UTC day in Redis (2 minutes), so any
+  slot on a cached day is answered without calling Google, by every worker
+- Batched lookups for many tutors: cached days are read in one Redis round
+  trip and each tutor's missing days are fetched with a single freebusy
+  request, with tutors queried concurrently
+- Invalidation per tutor, on booking event writes and on Google push
+  notifications (when GOOGLE_CALENDAR_WEBHOOK_URL is configured)
 - Graceful degradation: calendar check failures don't block bookings
 - Token refresh handling for expired access tokens
 """
 
+import asyncio
+import hashlib
+import hmac
 import logging
-import time
-from datetime import UTC, datetime, timedelta
+import uuid
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta
 from typing import Any
 
+from dateutil import parser
 from sqlalchemy.orm import Session
 
+from core.adapters.redis_adapter import redis_adapter
+from core.config import settings
 from core.google_calendar import google_calendar
+from core.ports.cache import CachePort
 from models import User
 
 logger = logging.getLogger(__name__)
 
-# Cache for calendar busy times: key -> (busy_times, expiry_timestamp)
-# Key format: f"calendar_busy:{user_id}:{start_iso}:{end_iso}"
-_calendar_cache: dict[str, tuple[list[dict[str, Any]], float]] = {}
-
 # Cache TTL in seconds (2 minutes - balance between freshness and API limits)
 CALENDAR_CACHE_TTL = 120
 
+# Tutors queried against Google at the same time by a batched lookup
+FREEBUSY_CONCURRENCY = 10
+
+# Push notification channels; renewed a day before Google expires them
+CALENDAR_WATCH_TTL = 7 * 24 * 3600
+CALENDAR_WATCH_RENEW_BEFORE = 24 * 3600
+# Wait before trying again after Google refused to open a channel
+CALENDAR_WATCH_RETRY_AFTER = 3600
+
 
 class CalendarAPIError(Exception):
     """Raised when calendar API calls fail."""
@@ -37,6 +57,81 @@ class CalendarAPIError(Exception):
     pass
 
 
+@dataclass
+class CachedBusyTimes:
+    """A tutor's cached days, read under the tutor's current cache version."""
+
+    version: int
+    days: dict[date, list[dict[str, Any]]]
+    watched: bool = False
+
+
+class CalendarBusyCache:
+    """
+    Busy times per tutor and UTC day, shared by all workers through Redis.
+
+    Day entries record the tutor's cache version when they were fetched.
+    ``invalidate`` bumps the version, so existing entries, and entries from
+    a fetch that was in flight during the invalidation, read as misses.
+    """
+
+    KEY_PREFIX = "calendar_busy:"
+    WATCH_KEY_PREFIX = "calendar_watch:"
+
+    def __init__(self, port: CachePort) -> None:
+        self._port = port
+
+    def _day_key(self, user_id: int, day: date) -> str:
+        return f"{self.KEY_PREFIX}{user_id}:{day.isoformat()}"
+
+    def _version_key(self, user_id: int) -> str:
+        return f"{self.KEY_PREFIX}{user_id}:version"
+
+    def _watch_key(self, user_id: int) -> str:
+        return f"{self.WATCH_KEY_PREFIX}{user_id}"
+
+    async def read(
+        self, user_ids: Sequence[int], days: Sequence[date], include_watch: bool = False
+    ) -> dict[int, CachedBusyTimes]:
+        """Cached days of every user in one round trip."""
+        keys: list[str] = []
+        for user_id in user_ids:
+            keys.append(self._version_key(user_id))
+            keys.extend(self._day_key(user_id, day) for day in days)
+            if include_watch:
+                keys.append(self._watch_key(user_id))
+        found = await self._port.get_many(keys)
+
+        result = {}
+        for user_id in user_ids:
+            version = int(found.get(self._version_key(user_id)) or 0)
+            cached = {}
+            for day in days:
+                entry = found.get(self._day_key(user_id, day))
+                if isinstance(entry, dict) and entry.get("v") == version:
+                    cached[day] = entry["busy"]
+            result[user_id] = CachedBusyTimes(version, cached, self._watch_key(user_id) in found)
+        return result
+
+    async def write(self, user_id: int, version: int, days: dict[date, list[dict[str, Any]]]) -> None:
+        await self._port.set_many(
+            {self._day_key(user_id, day): {"v": version, "busy": busy} for day, busy in days.items()},
+            ttl_seconds=CALENDAR_CACHE_TTL,
+        )
+
+    async def mark_watched(self, user_id: int, ttl_seconds: int) -> None:
+        await self._port.set(self._watch_key(user_id), 1, ttl_seconds=ttl_seconds)
+
+    async def invalidate(self, user_id: int | None = None) -> None:
+        if user_id is None:
+            await self._port.delete_pattern(f"{self.KEY_PREFIX}*")
+        else:
+            await self._port.increment(self._version_key(user_id))
+
+
+calendar_busy_cache = CalendarBusyCache(redis_adapter)
+
+
 class CalendarConflictService:
     """
     Service for checking external calendar conflicts at booking time.
@@ -46,8 +141,9 @@ class CalendarConflictService:
     avoid excessive API calls during peak booking times.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: CalendarBusyCache | None = None):
         self.db = db
+        self.cache = cache if cache is not None else calendar_busy_cache
 
     async def check_calendar_conflict(
         self,
@@ -85,27 +181,12 @@ class CalendarConflictService:
         if end_time.tzinfo is None:
             end_time = end_time.replace(tzinfo=UTC)
 
-        # Check cache first
-        cache_key = self._get_cache_key(tutor_user.id, start_time, end_time)
-        cached_result = self._get_cached_busy_times(cache_key)
-
-        if cached_result is not None:
-            logger.debug(f"Using cached calendar data for tutor {tutor_user.id}")
-            busy_times = cached_result
-        else:
-            # Fetch fresh data from Google Calendar
-            try:
-                busy_times = await self._fetch_busy_times(
-                    tutor_user, start_time, end_time
-                )
-                # Cache the result
-                self._cache_busy_times(cache_key, busy_times)
-            except CalendarAPIError as e:
-                logger.warning(
-                    f"Calendar check failed for tutor {tutor_user.id}: {e}"
-                )
-                # Graceful degradation - don't block booking if calendar check fails
-                return False, None
+        try:
+            busy_times = await self.get_busy_times(tutor_user, start_time, end_time)
+        except CalendarAPIError as e:
+            logger.warning(f"Calendar check failed for tutor {tutor_user.id}: {e}")
+            # Graceful degradation - don't block booking if calendar check fails
+            return False, None
 
         # Check if any busy time overlaps with the requested slot
         conflict = self._check_overlap(busy_times, start_time, end_time)
@@ -115,46 +196,171 @@ class CalendarConflictService:
 
         return False, None
 
+    async def get_busy_times(
+        self,
+        tutor_user: User,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> list[dict[str, Any]]:
+        """
+        Busy blocks of one tutor on the UTC days covering the range.
+
+        Raises:
+            CalendarAPIError: If the busy times could not be fetched
+        """
+        busy, errors = await self._load_busy_times([tutor_user], start_time, end_time)
+        if tutor_user.id in errors:
+            raise errors[tutor_user.id]
+        return busy.get(tutor_user.id, [])
+
+    async def get_busy_times_batch(
+        self,
+        tutor_users: Iterable[User],
+        start_time: datetime,
+        end_time: datetime,
+    ) -> dict[int, list[dict[str, Any]]]:
+        """
+        Busy blocks of many tutors on the UTC days covering the range.
+
+        Tutors without a connected calendar map to an empty list. Tutors whose
+        calendar could not be read are logged and left out, so callers can
+        tell "free" from "unknown".
+
+        Returns:
+            Busy blocks per tutor user ID
+        """
+        busy, errors = await self._load_busy_times(list(tutor_users), start_time, end_time)
+        for user_id, error in errors.items():
+            logger.warning(f"Calendar lookup failed for tutor {user_id}: {error}")
+        return busy
+
+    async def _load_busy_times(
+        self,
+        tutor_users: list[User],
+        start_time: datetime,
+        end_time: datetime,
+    ) -> tuple[dict[int, list[dict[str, Any]]], dict[int, CalendarAPIError]]:
+        days = _utc_days(start_time, end_time)
+        busy: dict[int, list[dict[str, Any]]] = {}
+        connected = []
+        for user in tutor_users:
+            if user.google_calendar_refresh_token:
+                connected.append(user)
+            else:
+                busy[user.id] = []
+        if not connected:
+            return busy, {}
+
+        watch_enabled = bool(settings.GOOGLE_CALENDAR_WEBHOOK_URL)
+        cached = await self.cache.read([user.id for user in connected], days, include_watch=watch_enabled)
+        semaphore = asyncio.Semaphore(FREEBUSY_CONCURRENCY)
+
+        async def load(user: User) -> list[dict[str, Any]]:
+            entry = cached[user.id]
+            missing = [day for day in days if day not in entry.days]
+            if missing:
+                # One request covers every missing day (and the cached ones between them)
+                async with semaphore:
+                    fetched = await self._fetch_days(user, missing[0], missing[-1])
+                    if watch_enabled and not entry.watched:
+                        await self._watch_calendar(user)
+                await self.cache.write(user.id, entry.version, fetched)
+                entry.days.update(fetched)
+            else:
+                logger.debug(f"Using cached calendar data for tutor {user.id}")
+            return _unique_blocks(block for day in days for block in entry.days[day])
+
+        results = await asyncio.gather(*(load(user) for user in connected), return_exceptions=True)
+        errors: dict[int, CalendarAPIError] = {}
+        for user, result in zip(connected, results, strict=True):
+            if isinstance(result, CalendarAPIError):
+                errors[user.id] = result
+            elif isinstance(result, Exception):
+                errors[user.id] = CalendarAPIError(f"Calendar lookup failed: {result}")
+            else:
+                busy[user.id] = result
+        return busy, errors
+
+    async def _fetch_days(
+        self, tutor_user: User, first_day: date, last_day: date
+    ) -> dict[date, list[dict[str, Any]]]:
+        """Fetch whole UTC days from Google and split the busy blocks by day."""
+        window_start = datetime.combine(first_day, time.min, tzinfo=UTC)
+        window_end = datetime.combine(last_day + timedelta(days=1), time.min, tzinfo=UTC)
+        busy_times = await self._fetch_busy_times(tutor_user, window_start, window_end)
+
+        days = {first_day + timedelta(days=offset): [] for offset in range((last_day - first_day).days + 1)}
+        for busy in busy_times:
+            try:
+                block_days = _utc_days(parser.isoparse(busy["start"]), parser.isoparse(busy["end"]))
+            except (KeyError, ValueError, TypeError):
+                # Unreadable block: keep it on every day so it is still checked
+                block_days = list(days)
+            for day in block_days:
+                if day in days:
+                    days[day].append(busy)
+        return days
+
     async def _fetch_busy_times(
         self,
         tutor_user: User,
         start_time: datetime,
         end_time: datetime,
+        calendar_ids: Sequence[str] = ("primary",),
     ) -> list[dict[str, Any]]:
         """
         Fetch busy times from Google Calendar API.
 
-        Handles token refresh if access token is expired.
+        All ``calendar_ids`` are queried in one freebusy request. Handles
+        token refresh if access token is expired.
 
         Raises:
             CalendarAPIError: If the calendar API call fails
         """
-        access_token = tutor_user.google_calendar_access_token
-        refresh_token = tutor_user.google_calendar_refresh_token
-
-        # Check if token needs refresh
-        if self._is_token_expired(tutor_user):
-            try:
-                access_token = await self._refresh_token(tutor_user)
-            except Exception as e:
-                raise CalendarAPIError(f"Token refresh failed: {e}") from e
-
-        # Expand the time range slightly to catch edge cases
-        # (e.g., meetings that start exactly when booking ends)
-        query_start = start_time - timedelta(minutes=1)
-        query_end = end_time + timedelta(minutes=1)
+        access_token = await self._get_access_token(tutor_user)
 
         try:
-            busy_times = await google_calendar.check_busy_times(
+            calendars = await google_calendar.query_free_busy(
                 access_token=access_token,
-                refresh_token=refresh_token,
-                start_time=query_start,
-                end_time=query_end,
+                refresh_token=tutor_user.google_calendar_refresh_token,
+                start_time=start_time,
+                end_time=end_time,
+                calendar_ids=list(calendar_ids),
             )
-            return busy_times
         except Exception as e:
             raise CalendarAPIError(f"Freebusy API call failed: {e}") from e
 
+        unreadable = [calendar_id for calendar_id in calendar_ids if calendar_id not in calendars]
+        if unreadable:
+            raise CalendarAPIError(f"Freebusy returned no data for {', '.join(unreadable)}")
+        return [busy for calendar_id in calendar_ids for busy in calendars[calendar_id]]
+
+    async def _get_access_token(self, user: User) -> str:
+        """The user's access token, refreshed first if it is (nearly) expired."""
+        if not self._is_token_expired(user):
+            return user.google_calendar_access_token
+        try:
+            return await self._refresh_token(user)
+        except Exception as e:
+            raise CalendarAPIError(f"Token refresh failed: {e}") from e
+
+    async def _watch_calendar(self, user: User) -> None:
+        """Open a push notification channel on the tutor's primary calendar."""
+        try:
+            await google_calendar.watch_events(
+                access_token=user.google_calendar_access_token,
+                refresh_token=user.google_calendar_refresh_token,
+                channel_id=uuid.uuid4().hex,
+                address=settings.GOOGLE_CALENDAR_WEBHOOK_URL,
+                token=watch_channel_token(user.id),
+                ttl_seconds=CALENDAR_WATCH_TTL,
+            )
+            ttl = CALENDAR_WATCH_TTL - CALENDAR_WATCH_RENEW_BEFORE
+        except Exception as e:
+            logger.warning(f"Failed to watch calendar of user {user.id}: {e}")
+            ttl = CALENDAR_WATCH_RETRY_AFTER
+        await self.cache.mark_watched(user.id, ttl)
+
     def _is_token_expired(self, user: User) -> bool:
         """Check if the user's calendar access token is expired or near expiry."""
         if not user.google_calendar_token_expires:
@@ -203,8 +409,6 @@ class CalendarConflictService:
         Two time ranges overlap if:
         - busy_start < booking_end AND busy_end > booking_start
         """
-        from dateutil import parser
-
         for busy in busy_times:
             try:
                 busy_start = parser.isoparse(busy.get("start", ""))
@@ -223,49 +427,45 @@ class CalendarConflictService:
 
         return False
 
-    def _get_cache_key(
-        self, user_id: int, start_time: datetime, end_time: datetime
-    ) -> str:
-        """Generate cache key for calendar busy times."""
-        # Round times to minute precision for better cache hits
-        start_rounded = start_time.replace(second=0, microsecond=0)
-        end_rounded = end_time.replace(second=0, microsecond=0)
-        return f"calendar_busy:{user_id}:{start_rounded.isoformat()}:{end_rounded.isoformat()}"
-
-    def _get_cached_busy_times(
-        self, cache_key: str
-    ) -> list[dict[str, Any]] | None:
-        """Get cached busy times if still valid."""
-        if cache_key in _calendar_cache:
-            busy_times, expiry = _calendar_cache[cache_key]
-            if time.time() < expiry:
-                return busy_times
-            else:
-                # Expired, remove from cache
-                del _calendar_cache[cache_key]
-        return None
 
-    def _cache_busy_times(
-        self, cache_key: str, busy_times: list[dict[str, Any]]
-    ) -> None:
-        """Cache busy times with TTL."""
-        _calendar_cache[cache_key] = (busy_times, time.time() + CALENDAR_CACHE_TTL)
+def _utc_days(start_time: datetime, end_time: datetime) -> list[date]:
+    """UTC days touched by [start_time, end_time)."""
+    if start_time.tzinfo is None:
+        start_time = start_time.replace(tzinfo=UTC)
+    if end_time.tzinfo is None:
+        end_time = end_time.replace(tzinfo=UTC)
+    first = start_time.astimezone(UTC).date()
+    last = max(first, (end_time.astimezone(UTC) - timedelta(microseconds=1)).date())
+    return [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+
 
-        # Simple cache cleanup: remove expired entries if cache is large
-        if len(_calendar_cache) > 1000:
-            self._cleanup_cache()
+def _unique_blocks(blocks: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Drop repeats of blocks spanning several cached days."""
+    seen = set()
+    unique = []
+    for block in blocks:
+        key = (block.get("start"), block.get("end"))
+        if key not in seen:
+            seen.add(key)
+            unique.append(block)
+    return unique
 
-    def _cleanup_cache(self) -> None:
-        """Remove expired entries from the cache."""
-        now = time.time()
-        expired_keys = [
-            key for key, (_, expiry) in _calendar_cache.items() if expiry <= now
-        ]
-        for key in expired_keys:
-            del _calendar_cache[key]
+
+def watch_channel_token(user_id: int) -> str:
+    """Token sent back by Google with every push notification for the user's channel."""
+    signature = hmac.new(settings.SECRET_KEY.encode(), f"calendar-watch:{user_id}".encode(), hashlib.sha256)
+    return f"{user_id}.{signature.hexdigest()[:32]}"
+
+
+def user_for_watch_token(token: str) -> int | None:
+    """User ID of a valid channel token, None if it was not issued by us."""
+    user_id, _, _ = token.partition(".")
+    if not user_id.isdigit() or not hmac.compare_digest(token, watch_channel_token(int(user_id))):
+        return None
+    return int(user_id)
 
 
-def invalidate_calendar_cache(user_id: int | None = None) -> None:
+async def invalidate_calendar_cache(user_id: int | None = None) -> None:
     """
     Invalidate calendar cache entries.
 
@@ -273,10 +473,4 @@ def invalidate_calendar_cache(user_id: int | None = None) -> None:
         user_id: If provided, only invalidate entries for this user.
                  If None, invalidate all calendar cache entries.
     """
-    if user_id is None:
-        _calendar_cache.clear()
-    else:
-        pattern = f"calendar_busy:{user_id}:"
-        keys_to_remove = [key for key in _calendar_cache if key.startswith(pattern)]
-        for key in keys_to_remove:
-            del _calendar_cache[key]
+    await calendar_busy_cache.invalidate(user_id)
@@ -32,7 +32,14 @@ celery_app = Celery(
     "edustream",
     broker=CELERY_BROKER_URL,
     backend=CELERY_RESULT_BACKEND,
-    include=["tasks.booking_tasks"],
+    include=[
+        "tasks.booking_tasks",
+        "tasks.admin_tasks",
+        "tasks.message_tasks",
+        "tasks.notification_tasks",
+        "tasks.payment_tasks",
+        "tasks.review_tasks",
+    ],
 )
 
 # Celery configuration
@@ -84,6 +91,35 @@ celery_app.conf.update(
             "schedule": 60.0,  # Every 1 minute
             "options": {"queue": "bookings"},
         },
+        "refresh-daily-metrics-rollup": {
+            "task": "tasks.admin_tasks.refresh_daily_metrics",
+            "schedule": 300.0,  # Every 5 minutes
+        },
+        "reconcile-daily-metrics-rollup": {
+            "task": "tasks.admin_tasks.refresh_daily_metrics",
+            "schedule": 86400.0,  # Daily full recompute
+            "kwargs": {"full": True},
+        },
+        "sync-conversations": {
+            "task": "tasks.message_tasks.sync_conversations",
+            "schedule": 86400.0,  # Daily backfill and counter repair
+        },
+        "deliver-notification-emails": {
+            "task": "tasks.notification_tasks.deliver_notification_emails",
+            "schedule": 10.0,  # Every 10 seconds (notification outbox)
+        },
+        "process-stripe-webhooks": {
+            "task": "tasks.payment_tasks.process_stripe_webhooks",
+            "schedule": 10.0,  # Every 10 seconds (retries and events missed after delivery)
+        },
+        "reconcile-tutor-earnings": {
+            "task": "tasks.payment_tasks.reconcile_tutor_earnings",
+            "schedule": 86400.0,  # Daily drift repair of running totals
+        },
+        "rebuild-tutor-ratings": {
+            "task": "tasks.review_tasks.rebuild_tutor_ratings",
+            "schedule": 86400.0,  # Daily drift repair of rating aggregates
+        },
     },
 
     # Beat scheduler persistence
@@ -83,10 +83,43 @@ class Settings(BaseSettings):
     RATE_LIMIT_REGISTRATION: str = "5/minute"
     RATE_LIMIT_LOGIN: str = "10/minute"
     RATE_LIMIT_DEFAULT: str = "20/minute"
+    # Redis-backed budgets (core/rate_limiting.py): requests a worker may admit per Redis round trip
+    RATE_LIMIT_LOCAL_LEASE_MAX: int = 20  # Also capped at a tenth of each limit
+    RATE_LIMIT_LOCAL_LEASE_TTL_SECONDS: float = 1.0  # Unused leased requests are dropped after this
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 10_000
 
     # Redis Configuration
     REDIS_URL: str = "redis://redis:6379/0"
 
+    # Two-tier cache (core/cache.py): bounded in-process LRU backed by Redis
+    CACHE_REDIS_ENABLED: bool = True
+    CACHE_LOCAL_MAX_ENTRIES: int = 10_000
+    CACHE_LOCAL_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_LOCAL_TTL_SECONDS: int = 60  # Bounds staleness on other workers after invalidation
+
+    # Authenticated principal snapshots (core/principal_cache.py)
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = 300
+    AUTH_PRINCIPAL_LOCAL_TTL_SECONDS: int = 5  # Other workers see a deactivation/role change within this
+
+    # WebSocket cluster mode: Redis pub/sub fan-out and presence across workers
+    WS_CLUSTER_ENABLED: bool = True
+    WS_PRESENCE_TTL_SECONDS: int = 90  # Presence of a crashed worker's users expires after this
+
+    # WebSocket outbound delivery: per-connection bounded queues
+    WS_SEND_QUEUE_SIZE: int = 256  # Messages buffered per connection
+    WS_SEND_TIMEOUT_SECONDS: float = 5.0
+    WS_SEND_CONCURRENCY: int = 512  # Writes in flight per worker
+    WS_BACKPRESSURE_POLICY: str = "disconnect"  # "drop" or "disconnect" when a queue is full
+
+    # Password hashing: bcrypt runs on a bounded thread pool, off the event loop
+    PASSWORD_BCRYPT_ROUNDS: int = 12  # Hashes with another cost are upgraded on next login
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Running + waiting; more requests get a 503
+
+    # Image processing: avatar/photo renditions are rendered in worker processes
+    IMAGE_PROCESSING_WORKERS: int = 2  # 0 runs jobs on the thread pool instead
+    IMAGE_PROCESSING_MAX_TASKS_PER_CHILD: int = 200  # Recycle workers so Pillow memory is returned
+
     # Account Lockout Configuration (brute-force protection)
     ACCOUNT_LOCKOUT_MAX_ATTEMPTS: int = 5
     ACCOUNT_LOCKOUT_DURATION_SECONDS: int = 900  # 15 minutes
@@ -118,6 +151,16 @@ class Settings(BaseSettings):
     DEFAULT_PAGE_SIZE: int = 50
     MAX_PAGE_SIZE: int = 100
 
+    # Booking lifecycle jobs: claim due bookings in chunks with FOR UPDATE SKIP LOCKED
+    # and bulk-write transitions. 0 keeps the per-booking FOR UPDATE NOWAIT loop.
+    BOOKING_JOB_BATCH_SIZE: int = 500
+    BOOKING_JOB_WORKERS: int = 1  # Celery shard tasks per run (each claims id % workers)
+
+    # Tutor search: use the search_vector GIN index (False falls back to ILIKE scans)
+    TUTOR_FULLTEXT_SEARCH_ENABLED: bool = True
+    # Message search: use the search_vector GIN indexes (False falls back to ILIKE scans)
+    MESSAGE_FULLTEXT_SEARCH_ENABLED: bool = True
+
     # Avatar Storage (MinIO / S3-compatible)
     AVATAR_STORAGE_ENDPOINT: str = "http://minio:9000"
     AVATAR_STORAGE_ACCESS_KEY: str = "minioadmin"
@@ -128,6 +171,10 @@ class Settings(BaseSettings):
     AVATAR_STORAGE_PUBLIC_ENDPOINT: str | None = "https://minio.valsa.solutions"
     AVATAR_STORAGE_URL_TTL_SECONDS: int = 300
     AVATAR_STORAGE_DEFAULT_URL: str = "https://placehold.co/300x300?text=Avatar"
+    AVATAR_URL_CACHE_MAX_ENTRIES: int = 10_000  # Signed URLs reused until shortly before expiry
+    # Stable CDN-style base URL for avatars (e.g. a CDN with origin access to the
+    # bucket). When set, avatar URLs are built from it instead of being presigned.
+    AVATAR_PUBLIC_BASE_URL: str | None = None
 
     # Message Attachment Storage (MinIO / S3-compatible) - Separate bucket for security
     MESSAGE_ATTACHMENT_STORAGE_ENDPOINT: str = "http://minio:9000"
@@ -140,6 +187,9 @@ class Settings(BaseSettings):
     MESSAGE_ATTACHMENT_MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10 MB
     MESSAGE_ATTACHMENT_MAX_IMAGE_SIZE: int = 5 * 1024 * 1024  # 5 MB
     MESSAGE_ATTACHMENT_URL_TTL_SECONDS: int = 3600  # 1 hour
+    # Streaming uploads (core/message_storage.py): files larger than one part use S3 multipart
+    MESSAGE_ATTACHMENT_UPLOAD_PART_SIZE: int = 5 * 1024 * 1024  # S3 minimum; also the per-upload buffer
+    MESSAGE_ATTACHMENT_UPLOAD_WORKERS: int = 8  # Threads (and S3 connections) for blocking storage calls
 
     # Stripe Payment Configuration
     STRIPE_SECRET_KEY: str | None = None  # sk_test_... or sk_live_...
@@ -161,11 +211,20 @@ class Settings(BaseSettings):
     # Recommended: 7 days minimum for MVP (covers most cancellation windows)
     STRIPE_PAYOUT_DELAY_DAYS: int = 7  # Hold funds for this many days before payout
 
+    # Stripe webhook events are stored on receipt and handled by a worker
+    # (modules/payments/infrastructure/webhook_inbox.py)
+    STRIPE_WEBHOOK_CONCURRENCY: int = 4  # Payment partitions handled in parallel per worker
+    STRIPE_WEBHOOK_BATCH_SIZE: int = 50  # Partitions claimed per round
+    STRIPE_WEBHOOK_MAX_ATTEMPTS: int = 8  # Failures before an event is dead-lettered
+
     # Google OAuth/OIDC Configuration
     GOOGLE_CLIENT_ID: str | None = None
     GOOGLE_CLIENT_SECRET: str | None = None
     GOOGLE_REDIRECT_URI: str = "https://edustream.valsa.solutions/api/auth/google/callback"
     GOOGLE_CALENDAR_REDIRECT_URI: str = "https://api.valsa.solutions/api/integrations/calendar/callback"
+    # Public URL of POST /integrations/calendar/notifications; when set, tutors' calendars
+    # are watched and changes invalidate cached busy times (core/calendar_conflict.py)
+    GOOGLE_CALENDAR_WEBHOOK_URL: str | None = None
     OAUTH_STATE_SECRET: str | None = None  # For CSRF protection
 
     # Brevo (Sendinblue) Email Configuration
@@ -173,6 +232,8 @@ class Settings(BaseSettings):
     BREVO_SENDER_EMAIL: str = "noreply@edustream.valsa.solutions"
     BREVO_SENDER_NAME: str = "EduStream"
     EMAIL_ENABLED: bool = True
+    NOTIFICATION_OUTBOX_BATCH_SIZE: int = 200  # Emails per Brevo batch call
+    NOTIFICATION_OUTBOX_MAX_ATTEMPTS: int = 5  # Transient failures before giving up
 
     # Zoom Video Integration
     ZOOM_CLIENT_ID: str | None = None
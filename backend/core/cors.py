@@ -191,8 +191,7 @@ def create_cors_rate_limit_handler(allowed_origins: list[str] | None = None):
     """
     Create a rate limit exception handler that includes CORS headers.
 
-    The default slowapi rate limit handler returns a 429 response without CORS headers,
-    which browsers interpret as a CORS error rather than showing the rate limit message.
+    Browsers report a 429 without CORS headers as a CORS error, hiding the rate limit message.
 
     Args:
         allowed_origins: List of allowed origins (uses get_cors_origins() if None)
@@ -149,7 +149,10 @@ COMMISSION_TIERS = [
 
 def get_tutor_lifetime_earnings(db: Session, tutor_profile_id: int) -> int:
     """
-    Calculate tutor's total lifetime earnings in cents from completed bookings.
+    Get tutor's total lifetime earnings in cents from completed bookings.
+
+    Reads the running total kept on the tutor profile (see core/tutor_earnings.py),
+    so the cost does not grow with the tutor's booking history.
 
     Args:
         db: Database session
@@ -158,17 +161,11 @@ def get_tutor_lifetime_earnings(db: Session, tutor_profile_id: int) -> int:
     Returns:
         Total earnings in cents
     """
-    from sqlalchemy import func
-
-    from models import Booking
+    from models import TutorProfile
 
     result = (
-        db.query(func.coalesce(func.sum(Booking.tutor_earnings_cents), 0))
-        .filter(
-            Booking.tutor_profile_id == tutor_profile_id,
-            Booking.session_state == "ENDED",
-            Booking.session_outcome == "COMPLETED",
-        )
+        db.query(TutorProfile.lifetime_earnings_cents)
+        .filter(TutorProfile.id == tutor_profile_id)
         .scalar()
     )
 
@@ -8,8 +8,8 @@ from sqlalchemy.orm import Session
 
 from core.config import Roles
 from core.exceptions import AuthenticationError
+from core.principal_cache import attach_user, resolve_principal
 from core.security import TokenManager
-from core.utils import StringUtils
 from database import get_db
 from models import TutorProfile, User
 
@@ -26,6 +26,9 @@ async def get_current_user(
     - Token signature and expiry
     - Password change timestamp (invalidates tokens issued before password change)
     - Role match (invalidates tokens with outdated role after demotion/promotion)
+
+    The checks run against a cached principal snapshot (core/principal_cache.py);
+    the returned user loads columns outside the snapshot on first access.
     """
     # Handle missing token (auto_error=False means token can be None)
     if not token:
@@ -48,25 +51,23 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(
-        User.email == StringUtils.normalize_email(email),
-        User.deleted_at.is_(None),  # Exclude soft-deleted users
-    ).first()
-    if user is None:
+    principal = await resolve_principal(db, email)  # Excludes soft-deleted users
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
 
-    if not user.is_active:
+    if not principal["is_active"]:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
 
     # Validate token was issued after any password change
-    if user.password_changed_at:
+    password_changed_at = principal["password_changed_at"]
+    if password_changed_at:
         token_pwd_ts = payload.get("pwd_ts")
         if token_pwd_ts:
-            # token_pwd_ts is already a float timestamp from JWT
-            if user.password_changed_at.timestamp() > token_pwd_ts:
+            # Both are float timestamps
+            if password_changed_at > token_pwd_ts:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Token invalidated by password change, please re-login",
@@ -83,14 +84,14 @@ async def get_current_user(
 
     # Validate role hasn't changed (prevents stale role after demotion/promotion)
     token_role = payload.get("role")
-    if token_role and token_role != user.role:
+    if token_role and token_role != principal["role"]:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token role outdated, please re-login",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return user
+    return attach_user(db, principal)
 
 
 async def get_current_user_optional(
@@ -113,25 +114,23 @@ async def get_current_user_optional(
     except AuthenticationError:
         return None
 
-    user = db.query(User).filter(
-        User.email == StringUtils.normalize_email(email),
-        User.deleted_at.is_(None),  # Exclude soft-deleted users
-    ).first()
-    if user is None or not user.is_active:
+    principal = await resolve_principal(db, email)  # Excludes soft-deleted users
+    if principal is None or not principal["is_active"]:
         return None
 
     # Validate token was issued after any password change
-    if user.password_changed_at:
+    password_changed_at = principal["password_changed_at"]
+    if password_changed_at:
         token_pwd_ts = payload.get("pwd_ts")
-        if not token_pwd_ts or user.password_changed_at.timestamp() > token_pwd_ts:
+        if not token_pwd_ts or password_changed_at > token_pwd_ts:
             return None
 
     # Validate role hasn't changed
     token_role = payload.get("role")
-    if token_role and token_role != user.role:
+    if token_role and token_role != principal["role"]:
         return None
 
-    return user
+    return attach_user(db, principal)
 
 
 async def get_current_active_user(
@@ -0,0 +1,81 @@
+"""Shared plumbing for tutor_profiles aggregates maintained in application code.
+
+core/tutor_earnings.py (lifetime earnings from bookings) and
+core/tutor_ratings.py (rating sum, count and histogram from reviews) adjust
+their aggregates from ORM flush events and repair them from the source rows.
+This module holds the parts they have in common: reading a row's columns
+before and after a flush, and rewriting drifted tutors one at a time.
+"""
+
+from collections.abc import Callable, Iterable, Mapping, Sequence
+
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+
+def _load_previous_value(target, value, oldvalue, initiator) -> None:
+    pass
+
+
+def track_previous_values(model, names: Iterable[str]) -> None:
+    """Load each column's previous value on assignment, so flush listeners can subtract it."""
+    for name in names:
+        event.listen(getattr(model, name), "set", _load_previous_value, active_history=True)
+
+
+def flushed_values(connection: Connection, target, names: Sequence[str], *, previous: bool) -> dict[str, object]:
+    """
+    Column values of ``target`` as loaded (``previous``) or as being flushed.
+
+    For use in mapper flush events (after_insert, after_update, before_delete).
+    Columns that are expired and untouched are read from the row over the
+    flush's connection, since loading them through the session mid-flush is
+    not allowed.
+    """
+    state = inspect(target)
+    values = {}
+    for name in names:
+        history = state.attrs[name].history
+        current = (history.deleted if previous else history.added) or history.unchanged
+        if current:
+            values[name] = current[0]
+    missing = [name for name in names if name not in values]
+    if missing and state.identity:
+        mapper_table = state.mapper.local_table
+        row = connection.execute(
+            select(*(mapper_table.c[name] for name in missing)).where(mapper_table.c.id == state.identity[0])
+        ).one_or_none()
+        values.update(row._mapping if row is not None else {})
+    return {name: values.get(name) for name in names}
+
+
+def repair_tutor_profiles(
+    db: Session,
+    tutor_profile_ids: Sequence[int],
+    recompute: Callable[[int], Mapping[str, object]],
+) -> int:
+    """
+    Overwrite each tutor's aggregates with ``recompute(tutor_profile_id)``.
+
+    Each tutor is recomputed under a row lock on its profile: flush listeners
+    adjust the aggregates under the same lock, so no concurrent change is
+    lost. Commits once per tutor.
+
+    Returns:
+        Number of tutors repaired
+    """
+    from models import TutorProfile
+
+    # End the transaction that found the drifted tutors before taking locks
+    db.rollback()
+    for tutor_profile_id in tutor_profile_ids:
+        db.execute(select(TutorProfile.id).where(TutorProfile.id == tutor_profile_id).with_for_update())
+        db.execute(
+            update(TutorProfile)
+            .where(TutorProfile.id == tutor_profile_id)
+            .values(**recompute(tutor_profile_id))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    return len(tutor_profile_ids)
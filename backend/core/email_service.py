@@ -11,12 +11,14 @@ Handles all transactional email sending including:
 Features:
 - Delivery tracking and logging
 - Retry logic for transient failures
+- Batch sending (one API call for many recipients)
 - Detailed error categorization
 """
 
 import asyncio
 import logging
-from dataclasses import dataclass
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import Enum
 from typing import Any
@@ -52,6 +54,16 @@ class EmailDeliveryResult:
             self.timestamp = datetime.now(UTC)
 
 
+@dataclass
+class BatchEmail:
+    """One recipient's version of a batch email."""
+
+    to_email: str
+    to_name: str
+    subject: str
+    params: dict[str, Any] = field(default_factory=dict)
+
+
 # ============================================================================
 # Email Service Class
 # ============================================================================
@@ -73,6 +85,9 @@ class EmailService:
         "unavailable",
     ]
 
+    # Brevo accepts at most this many message versions per request
+    BATCH_LIMIT = 1000
+
     def __init__(self) -> None:
         self._client = None
         self._api = None
@@ -338,6 +353,123 @@ class EmailService:
             attempts=max_retries,
         )
 
+    def send_batch_with_tracking(
+        self,
+        html_content: str,
+        messages: Sequence[BatchEmail],
+    ) -> list[EmailDeliveryResult]:
+        """
+        Send one email per message through Brevo's batch API.
+
+        ``html_content`` is shared by every version and reads each message's
+        ``params`` through Brevo placeholders (``{{ params.name }}``). Up to
+        BATCH_LIMIT messages go out per API call. When a call fails
+        permanently, its messages are resent one at a time so one bad address
+        doesn't fail the rest.
+
+        Returns one EmailDeliveryResult per message, in order.
+        """
+        if not messages:
+            return []
+
+        if not settings.EMAIL_ENABLED:
+            logger.info("Batch email delivery skipped (disabled)", extra={"email_count": len(messages)})
+            return [
+                EmailDeliveryResult(
+                    success=True,
+                    status=EmailDeliveryStatus.DISABLED,
+                    error_message="Email sending is disabled in configuration",
+                )
+                for _ in messages
+            ]
+
+        api = self._get_client()
+        if not api:
+            logger.warning("Batch email delivery failed (not configured)", extra={"email_count": len(messages)})
+            return [
+                EmailDeliveryResult(
+                    success=False,
+                    status=EmailDeliveryStatus.NOT_CONFIGURED,
+                    error_message="Email service not configured - missing API key",
+                )
+                for _ in messages
+            ]
+
+        results: list[EmailDeliveryResult] = []
+        for start in range(0, len(messages), self.BATCH_LIMIT):
+            chunk = messages[start : start + self.BATCH_LIMIT]
+            chunk_results = self._send_batch_chunk(api, html_content, chunk)
+            if len(chunk) > 1 and chunk_results[0].status == EmailDeliveryStatus.FAILED_PERMANENT:
+                chunk_results = [
+                    self._send_batch_chunk(api, html_content, [message])[0] for message in chunk
+                ]
+            results.extend(chunk_results)
+        return results
+
+    def _send_batch_chunk(
+        self,
+        api,
+        html_content: str,
+        messages: Sequence[BatchEmail],
+    ) -> list[EmailDeliveryResult]:
+        """Send up to BATCH_LIMIT messages in one API call."""
+        try:
+            import sib_api_v3_sdk
+
+            send_smtp_email = sib_api_v3_sdk.SendSmtpEmail(
+                sender=sib_api_v3_sdk.SendSmtpEmailSender(
+                    email=settings.BREVO_SENDER_EMAIL,
+                    name=settings.BREVO_SENDER_NAME,
+                ),
+                subject=messages[0].subject,
+                html_content=html_content,
+                message_versions=[
+                    sib_api_v3_sdk.SendSmtpEmailMessageVersions(
+                        to=[sib_api_v3_sdk.SendSmtpEmailTo(email=message.to_email, name=message.to_name)],
+                        params=message.params,
+                        subject=message.subject,
+                    )
+                    for message in messages
+                ],
+            )
+
+            response = api.send_transac_email(send_smtp_email)
+            message_ids = getattr(response, "message_ids", None) or []
+            if len(message_ids) != len(messages):
+                message_ids = [getattr(response, "message_id", None)] * len(messages)
+
+            logger.info(
+                "Batch email sent successfully",
+                extra={"email_count": len(messages), "status": EmailDeliveryStatus.SUCCESS.value},
+            )
+
+            return [
+                EmailDeliveryResult(success=True, status=EmailDeliveryStatus.SUCCESS, message_id=message_id)
+                for message_id in message_ids
+            ]
+
+        except Exception as e:
+            is_transient = self._is_transient_error(e)
+            status = (
+                EmailDeliveryStatus.FAILED_TRANSIENT
+                if is_transient
+                else EmailDeliveryStatus.FAILED_PERMANENT
+            )
+            error_msg = str(e)
+
+            logger.error(
+                "Batch email delivery failed",
+                extra={
+                    "email_count": len(messages),
+                    "status": status.value,
+                    "error": error_msg,
+                    "is_transient": is_transient,
+                },
+                exc_info=True,
+            )
+
+            return [EmailDeliveryResult(success=False, status=status, error_message=error_msg) for _ in messages]
+
     # ========================================================================
     # Booking Emails
     # ========================================================================
@@ -5,18 +5,18 @@ Handles:
 - OAuth2 flow for calendar access
 - Creating calendar events for bookings
 - Sending calendar invites to tutors and students
+
+Calls go to the Calendar REST API through the shared, pooled HTTP client
+(core/http_clients.py), so nothing here blocks the event loop.
 """
 
 import logging
 from datetime import datetime
 from typing import Any
-
-import httpx
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from urllib.parse import quote
 
 from core.config import settings
+from core.http_clients import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -29,14 +29,25 @@ CALENDAR_SCOPES = [
 # Google OAuth endpoints
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
+GOOGLE_CALENDAR_API_BASE = "https://www.googleapis.com/calendar/v3"
+
+
+class GoogleCalendarAPIError(Exception):
+    """Error response from the Google Calendar API."""
+
+    def __init__(self, status_code: int, message: str):
+        self.status_code = status_code
+        self.message = message
+        super().__init__(f"Google Calendar API error {status_code}: {message}")
+
+
+def _calendar_path(calendar_id: str) -> str:
+    return f"/calendars/{quote(calendar_id, safe='')}"
 
 
 class GoogleCalendarService:
     """Google Calendar API client."""
 
-    def __init__(self):
-        self._credentials_cache: dict[int, Credentials] = {}
-
     def get_authorization_url(self, state: str, redirect_uri: str | None = None) -> str:
         """
         Generate Google OAuth authorization URL for calendar access.
@@ -80,23 +91,26 @@ class GoogleCalendarService:
         if not settings.GOOGLE_CLIENT_ID or not settings.GOOGLE_CLIENT_SECRET:
             raise ValueError("Google OAuth not configured")
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                GOOGLE_TOKEN_URL,
-                data={
-                    "client_id": settings.GOOGLE_CLIENT_ID,
-                    "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                    "code": code,
-                    "grant_type": "authorization_code",
-                    "redirect_uri": redirect_uri or settings.GOOGLE_CALENDAR_REDIRECT_URI,
-                },
-            )
+        # Authorization codes are single-use, so a failed exchange is not retried
+        response = await http_clients.request(
+            "google_oauth",
+            "POST",
+            GOOGLE_TOKEN_URL,
+            retry=False,
+            data={
+                "client_id": settings.GOOGLE_CLIENT_ID,
+                "client_secret": settings.GOOGLE_CLIENT_SECRET,
+                "code": code,
+                "grant_type": "authorization_code",
+                "redirect_uri": redirect_uri or settings.GOOGLE_CALENDAR_REDIRECT_URI,
+            },
+        )
 
-            if response.status_code != 200:
-                logger.error(f"Google token exchange failed: {response.text}")
-                raise ValueError("Failed to exchange authorization code")
+        if response.status_code != 200:
+            logger.error(f"Google token exchange failed: {response.text}")
+            raise ValueError("Failed to exchange authorization code")
 
-            return response.json()
+        return response.json()
 
     async def refresh_access_token(self, refresh_token: str) -> dict[str, Any]:
         """
@@ -111,39 +125,70 @@ class GoogleCalendarService:
         if not settings.GOOGLE_CLIENT_ID or not settings.GOOGLE_CLIENT_SECRET:
             raise ValueError("Google OAuth not configured")
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                GOOGLE_TOKEN_URL,
-                data={
-                    "client_id": settings.GOOGLE_CLIENT_ID,
-                    "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                    "refresh_token": refresh_token,
-                    "grant_type": "refresh_token",
-                },
-            )
+        # Refreshing is idempotent, so transient failures are retried
+        response = await http_clients.request(
+            "google_oauth",
+            "POST",
+            GOOGLE_TOKEN_URL,
+            retry=True,
+            data={
+                "client_id": settings.GOOGLE_CLIENT_ID,
+                "client_secret": settings.GOOGLE_CLIENT_SECRET,
+                "refresh_token": refresh_token,
+                "grant_type": "refresh_token",
+            },
+        )
 
-            if response.status_code != 200:
-                logger.error(f"Google token refresh failed: {response.text}")
-                raise ValueError("Failed to refresh token")
+        if response.status_code != 200:
+            logger.error(f"Google token refresh failed: {response.text}")
+            raise ValueError("Failed to refresh token")
 
-            return response.json()
+        return response.json()
 
-    def _get_credentials(
-        self, access_token: str, refresh_token: str | None = None
-    ) -> Credentials:
-        """Create Google credentials object."""
-        return Credentials(
-            token=access_token,
-            refresh_token=refresh_token,
-            token_uri=GOOGLE_TOKEN_URL,
-            client_id=settings.GOOGLE_CLIENT_ID,
-            client_secret=settings.GOOGLE_CLIENT_SECRET,
-            scopes=CALENDAR_SCOPES,
-        )
+    async def api_request(
+        self,
+        access_token: str,
+        refresh_token: str | None,
+        method: str,
+        path: str,
+        *,
+        retry: bool | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Call the Calendar REST API (path relative to /calendar/v3).
+
+        An expired access token is refreshed once with ``refresh_token``, as
+        google-auth credentials did for the client library.
+
+        Returns:
+            Decoded JSON body ({} for empty responses)
 
-    def _get_calendar_service(self, credentials: Credentials):
-        """Build Google Calendar API service."""
-        return build("calendar", "v3", credentials=credentials)
+        Raises:
+            GoogleCalendarAPIError: For non-2xx responses
+        """
+        response = await self._send(access_token, method, path, retry, **kwargs)
+        if response.status_code == 401 and refresh_token:
+            tokens = await self.refresh_access_token(refresh_token)
+            response = await self._send(tokens["access_token"], method, path, retry, **kwargs)
+
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("error", {}).get("message") or response.text
+            except ValueError:
+                message = response.text
+            raise GoogleCalendarAPIError(response.status_code, message)
+        return response.json() if response.content else {}
+
+    async def _send(self, access_token: str, method: str, path: str, retry: bool | None, **kwargs: Any):
+        return await http_clients.request(
+            "google_calendar",
+            method,
+            f"{GOOGLE_CALENDAR_API_BASE}{path}",
+            retry=retry,
+            headers={"Authorization": f"Bearer {access_token}"},
+            **kwargs,
+        )
 
     async def create_booking_event(
         self,
@@ -183,9 +228,6 @@ class GoogleCalendarService:
             Created event data or None if failed
         """
         try:
-            credentials = self._get_credentials(access_token, refresh_token)
-            service = self._get_calendar_service(credentials)
-
             # Build event description
             full_description = f"""
 {description}
@@ -235,15 +277,14 @@ Created by EduStream
                 # Add as a simple link in description since we're using external meeting
                 event["conferenceData"] = None
 
-            # Create the event
-            created_event = (
-                service.events()
-                .insert(
-                    calendarId="primary",
-                    body=event,
-                    sendUpdates="all",  # Send email invites to attendees
-                )
-                .execute()
+            # Create the event (not retried: a lost response would duplicate it)
+            created_event = await self.api_request(
+                access_token,
+                refresh_token,
+                "POST",
+                f"{_calendar_path('primary')}/events",
+                params={"sendUpdates": "all"},  # Send email invites to attendees
+                json=event,
             )
 
             logger.info(
@@ -256,7 +297,7 @@ Created by EduStream
                 "ical_uid": created_event.get("iCalUID"),
             }
 
-        except HttpError as e:
+        except GoogleCalendarAPIError as e:
             logger.error(f"Google Calendar API error: {e}", exc_info=True)
             return None
         except Exception as e:
@@ -277,11 +318,10 @@ Created by EduStream
     ) -> bool:
         """Update an existing calendar event."""
         try:
-            credentials = self._get_credentials(access_token, refresh_token)
-            service = self._get_calendar_service(credentials)
+            event_path = f"{_calendar_path('primary')}/events/{quote(event_id, safe='')}"
 
             # Get existing event
-            event = service.events().get(calendarId="primary", eventId=event_id).execute()
+            event = await self.api_request(access_token, refresh_token, "GET", event_path)
 
             # Update fields
             if start_time:
@@ -296,12 +336,14 @@ Created by EduStream
                 event["location"] = meeting_url
 
             # Update the event
-            service.events().update(
-                calendarId="primary",
-                eventId=event_id,
-                body=event,
-                sendUpdates="all",
-            ).execute()
+            await self.api_request(
+                access_token,
+                refresh_token,
+                "PUT",
+                event_path,
+                params={"sendUpdates": "all"},
+                json=event,
+            )
 
             logger.info(f"Updated calendar event {event_id}")
             return True
@@ -319,20 +361,19 @@ Created by EduStream
     ) -> bool:
         """Delete a calendar event (e.g., when booking is cancelled)."""
         try:
-            credentials = self._get_credentials(access_token, refresh_token)
-            service = self._get_calendar_service(credentials)
-
-            service.events().delete(
-                calendarId="primary",
-                eventId=event_id,
-                sendUpdates="all" if send_updates else "none",
-            ).execute()
+            await self.api_request(
+                access_token,
+                refresh_token,
+                "DELETE",
+                f"{_calendar_path('primary')}/events/{quote(event_id, safe='')}",
+                params={"sendUpdates": "all" if send_updates else "none"},
+            )
 
             logger.info(f"Deleted calendar event {event_id}")
             return True
 
-        except HttpError as e:
-            if e.resp.status == 404:
+        except GoogleCalendarAPIError as e:
+            if e.status_code in (404, 410):
                 logger.warning(f"Calendar event {event_id} not found (already deleted?)")
                 return True
             logger.error(f"Failed to delete calendar event: {e}", exc_info=True)
@@ -346,10 +387,7 @@ Created by EduStream
     ) -> list[dict[str, Any]]:
         """Get list of user's calendars."""
         try:
-            credentials = self._get_credentials(access_token, refresh_token)
-            service = self._get_calendar_service(credentials)
-
-            calendar_list = service.calendarList().list().execute()
+            calendar_list = await self.api_request(access_token, refresh_token, "GET", "/users/me/calendarList")
             return calendar_list.get("items", [])
 
         except Exception as e:
@@ -382,23 +420,10 @@ Created by EduStream
             Empty list if no conflicts or on error.
         """
         try:
-            credentials = self._get_credentials(access_token, refresh_token)
-            service = self._get_calendar_service(credentials)
-
-            # Build freebusy query
-            body = {
-                "timeMin": start_time.isoformat(),
-                "timeMax": end_time.isoformat(),
-                "items": [{"id": calendar_id}],
-            }
-
-            # Query freebusy API
-            result = service.freebusy().query(body=body).execute()
-
-            # Extract busy times for the requested calendar
-            calendars = result.get("calendars", {})
-            calendar_data = calendars.get(calendar_id, {})
-            busy_times = calendar_data.get("busy", [])
+            calendars = await self.query_free_busy(
+                access_token, refresh_token, start_time, end_time, [calendar_id]
+            )
+            busy_times = calendars.get(calendar_id, [])
 
             logger.debug(
                 f"Calendar freebusy check: {len(busy_times)} busy blocks "
@@ -407,13 +432,87 @@ Created by EduStream
 
             return busy_times
 
-        except HttpError as e:
+        except GoogleCalendarAPIError as e:
             logger.error(f"Google Calendar freebusy API error: {e}", exc_info=True)
             return []
         except Exception as e:
             logger.error(f"Failed to check calendar busy times: {e}", exc_info=True)
             return []
 
+    async def query_free_busy(
+        self,
+        access_token: str,
+        refresh_token: str | None,
+        start_time: datetime,
+        end_time: datetime,
+        calendar_ids: list[str],
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Busy times of several calendars in one freebusy request.
+
+        Calendars Google reports errors for (not found, no access) are left
+        out of the result.
+
+        Returns:
+            Busy time blocks per calendar ID
+
+        Raises:
+            GoogleCalendarAPIError: For non-2xx responses
+            httpx.TransportError: If Google could not be reached
+        """
+        body = {
+            "timeMin": start_time.isoformat(),
+            "timeMax": end_time.isoformat(),
+            "items": [{"id": calendar_id} for calendar_id in calendar_ids],
+        }
+
+        # A read, so safe to retry although it is a POST
+        result = await self.api_request(access_token, refresh_token, "POST", "/freeBusy", retry=True, json=body)
+
+        busy: dict[str, list[dict[str, Any]]] = {}
+        for calendar_id, calendar_data in result.get("calendars", {}).items():
+            if calendar_data.get("errors"):
+                logger.warning(f"Freebusy error for calendar {calendar_id}: {calendar_data['errors']}")
+                continue
+            busy[calendar_id] = calendar_data.get("busy", [])
+        return busy
+
+    async def watch_events(
+        self,
+        access_token: str,
+        refresh_token: str | None,
+        channel_id: str,
+        address: str,
+        token: str,
+        ttl_seconds: int,
+        calendar_id: str = "primary",
+    ) -> dict[str, Any]:
+        """
+        Subscribe to push notifications for changes to a calendar's events.
+
+        Google POSTs to ``address`` with the channel ``token`` in the
+        X-Goog-Channel-Token header until the channel expires.
+
+        Returns:
+            The channel resource (id, resourceId, expiration)
+
+        Raises:
+            GoogleCalendarAPIError: For non-2xx responses
+        """
+        return await self.api_request(
+            access_token,
+            refresh_token,
+            "POST",
+            f"{_calendar_path(calendar_id)}/events/watch",
+            json={
+                "id": channel_id,
+                "type": "web_hook",
+                "address": address,
+                "token": token,
+                "params": {"ttl": str(ttl_seconds)},
+            },
+        )
+
     async def get_events_in_range(
         self,
         access_token: str,
@@ -440,20 +539,18 @@ Created by EduStream
             Empty list if no events or on error.
         """
         try:
-            credentials = self._get_credentials(access_token, refresh_token)
-            service = self._get_calendar_service(credentials)
-
-            events_result = (
-                service.events()
-                .list(
-                    calendarId=calendar_id,
-                    timeMin=start_time.isoformat(),
-                    timeMax=end_time.isoformat(),
-                    singleEvents=True,
-                    orderBy="startTime",
-                    maxResults=50,  # Reasonable limit for conflict checking
-                )
-                .execute()
+            events_result = await self.api_request(
+                access_token,
+                refresh_token,
+                "GET",
+                f"{_calendar_path(calendar_id)}/events",
+                params={
+                    "timeMin": start_time.isoformat(),
+                    "timeMax": end_time.isoformat(),
+                    "singleEvents": "true",
+                    "orderBy": "startTime",
+                    "maxResults": 50,  # Reasonable limit for conflict checking
+                },
             )
 
             events = events_result.get("items", [])
@@ -464,7 +561,7 @@ Created by EduStream
 
             return events
 
-        except HttpError as e:
+        except GoogleCalendarAPIError as e:
             logger.error(f"Google Calendar events API error: {e}", exc_info=True)
             return []
         except Exception as e:
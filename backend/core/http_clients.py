@@ -0,0 +1,286 @@
+"""
+Shared outbound HTTP clients.
+
+Integrations used to open a new ``httpx.AsyncClient`` for every call, paying
+DNS, TCP and TLS setup on each Zoom or Google request. ``http_clients`` keeps
+one pooled client per provider instead (closed in the application lifespan):
+
+- connection limits, keep-alive and timeouts per provider (PROVIDERS)
+- HTTP/2 when the optional ``h2`` package is installed
+- ``request()`` retries connection failures, 429 and 5xx responses with
+  exponential backoff (honouring Retry-After), limited by a per-provider
+  retry budget so an outage does not multiply the traffic sent to it
+
+A client is bound to the event loop that created it; code running on another
+loop (a script calling asyncio.run) transparently gets its own client, and the
+client it replaces is closed.
+
+Usage:
+    from core.http_clients import http_clients
+
+    response = await http_clients.request("zoom", "GET", f"/meetings/{meeting_id}")
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Methods that may be repeated after the request could have reached the server
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class ProviderConfig:
+    """Connection pool, timeout and retry settings for one upstream API."""
+
+    name: str
+    base_url: str = ""
+    timeout: float = 10.0
+    connect_timeout: float = 5.0
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+    max_retries: int = 2
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 10.0
+    # Retry budget: retries may add at most this share of traffic,
+    # plus retry_min_per_second so low-traffic providers can still retry
+    retry_ratio: float = 0.2
+    retry_min_per_second: float = 1.0
+
+
+PROVIDERS: dict[str, ProviderConfig] = {
+    config.name: config
+    for config in (
+        ProviderConfig(
+            name="zoom",
+            base_url="https://api.zoom.us/v2",
+            timeout=30.0,
+            max_retries=3,
+            retry_base_delay=1.0,
+        ),
+        ProviderConfig(name="google_oauth", base_url="https://oauth2.googleapis.com", max_connections=10),
+        ProviderConfig(
+            name="google_calendar",
+            base_url="https://www.googleapis.com/calendar/v3",
+            max_connections=50,
+            max_keepalive_connections=20,
+        ),
+    )
+}
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a share of recent requests.
+
+    Each request deposits ``ratio`` tokens and each retry spends one, so
+    while an upstream fails, retries stay near ``ratio`` of the traffic
+    instead of multiplying it by the retry count. ``min_per_second`` tokens
+    are added over time so an idle provider can still retry.
+    """
+
+    def __init__(self, ratio: float, min_per_second: float, max_balance: float = 10.0) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_balance = max_balance
+        self._balance = max_balance
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._balance = min(self.max_balance, self._balance + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def record_request(self) -> None:
+        self._refill()
+        self._balance = min(self.max_balance, self._balance + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget; False when it is exhausted."""
+        self._refill()
+        if self._balance < 1:
+            return False
+        self._balance -= 1
+        return True
+
+
+class HTTPClientRegistry:
+    """Lazily created, pooled ``httpx.AsyncClient`` per provider."""
+
+    def __init__(self, providers: dict[str, ProviderConfig] | None = None) -> None:
+        self._providers = dict(PROVIDERS if providers is None else providers)
+        self._budgets = {name: self._budget_for(config) for name, config in self._providers.items()}
+        self._transports: dict[str, httpx.AsyncBaseTransport] = {}
+        self._clients: dict[str, tuple[httpx.AsyncClient, asyncio.AbstractEventLoop]] = {}
+        self._closing: set[asyncio.Task] = set()
+
+    @staticmethod
+    def _budget_for(config: ProviderConfig) -> RetryBudget:
+        return RetryBudget(config.retry_ratio, config.retry_min_per_second)
+
+    def register(self, config: ProviderConfig, transport: httpx.AsyncBaseTransport | None = None) -> None:
+        """
+        Add or replace a provider (tests and benchmarks pass a mock transport).
+
+        Call before the provider is used; an existing client is dropped.
+        """
+        self._providers[config.name] = config
+        self._budgets[config.name] = self._budget_for(config)
+        if transport is None:
+            self._transports.pop(config.name, None)
+        else:
+            self._transports[config.name] = transport
+        entry = self._clients.pop(config.name, None)
+        if entry is not None:
+            self._retire(*entry)
+
+    def config(self, provider: str) -> ProviderConfig:
+        return self._providers[provider]
+
+    def client(self, provider: str) -> httpx.AsyncClient:
+        """The pooled client for ``provider`` on the running event loop."""
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(provider)
+        if entry is not None and entry[1] is loop and not entry[0].is_closed:
+            return entry[0]
+        if entry is not None:
+            self._retire(*entry)
+
+        config = self._providers[provider]
+        client = httpx.AsyncClient(
+            base_url=config.base_url,
+            timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            http2=config.http2 and HTTP2_AVAILABLE,
+            transport=self._transports.get(provider),
+        )
+        self._clients[provider] = (client, loop)
+        return client
+
+    def _retire(self, client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop) -> None:
+        """Close a replaced client in the background, on its own loop while that one runs."""
+        if client.is_closed:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop.is_running() and loop is not running:
+            asyncio.run_coroutine_threadsafe(self._close(client), loop)
+        elif running is not None:
+            # Its loop has ended (or is this one): release the sockets from here
+            task = running.create_task(self._close(client))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        else:
+            asyncio.run(self._close(client))
+
+    @staticmethod
+    async def _close(client: httpx.AsyncClient) -> None:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug(f"Error closing HTTP client: {e}")
+
+    def allow_retry(self, provider: str) -> bool:
+        """Spend one retry from the provider's budget (for callers with their own retry loop)."""
+        return self._budgets[provider].try_spend()
+
+    async def request(
+        self,
+        provider: str,
+        method: str,
+        url: str,
+        *,
+        retry: bool | None = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Send a request through the provider's pool, retrying transient failures.
+
+        Connection failures and 429 responses are retried for any method since
+        the server did not act on the request. Read errors and 5xx responses
+        are only retried for idempotent methods unless ``retry=True``;
+        ``retry=False`` disables retries. Retries stop when the provider's
+        retry budget runs out.
+
+        Returns:
+            The final response (error responses are returned, not raised)
+
+        Raises:
+            httpx.TransportError: If the last attempt failed to get a response
+        """
+        config = self._providers[provider]
+        budget = self._budgets[provider]
+        client = self.client(provider)
+        idempotent = method.upper() in IDEMPOTENT_METHODS if retry is None else retry
+        budget.record_request()
+
+        attempt = 0
+        while True:
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                not_sent = isinstance(e, httpx.ConnectError | httpx.ConnectTimeout | httpx.PoolTimeout)
+                if not self._may_retry(retry, not_sent or idempotent, attempt, config, budget):
+                    raise
+                delay = self._backoff(config, attempt)
+                logger.warning(f"{provider} {method} {url} failed ({e!r}), retrying in {delay:.1f}s")
+            else:
+                status = response.status_code
+                if status not in RETRYABLE_STATUS_CODES or not self._may_retry(
+                    retry, status == 429 or idempotent, attempt, config, budget
+                ):
+                    return response
+                delay = self._backoff(config, attempt, response.headers.get("Retry-After"))
+                await response.aclose()
+                logger.warning(f"{provider} {method} {url} returned {status}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _may_retry(
+        retry: bool | None, safe: bool, attempt: int, config: ProviderConfig, budget: RetryBudget
+    ) -> bool:
+        return retry is not False and safe and attempt < config.max_retries and budget.try_spend()
+
+    @staticmethod
+    def _backoff(config: ProviderConfig, attempt: int, retry_after: str | None = None) -> float:
+        if retry_after is not None:
+            try:
+                return min(max(float(retry_after), 0.0), config.retry_max_delay)
+            except ValueError:
+                pass  # HTTP-date form; fall back to backoff
+        delay = config.retry_base_delay * 2**attempt
+        # Full jitter keeps retrying callers from synchronising
+        return min(random.uniform(delay / 2, delay), config.retry_max_delay)
+
+    async def aclose(self) -> None:
+        """Close every pooled client (application shutdown)."""
+        clients, self._clients = self._clients, {}
+        for client, _ in clients.values():
+            await self._close(client)
+
+
+# Process-wide registry
+http_clients = HTTPClientRegistry()
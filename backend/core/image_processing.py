@@ -0,0 +1,312 @@
+"""
+Image rendition pipeline for avatars and tutor profile photos.
+
+Decoding, resizing and re-encoding an upload takes tens to hundreds of
+milliseconds of CPU, and it used to run inline in ``async def`` handlers,
+stalling every other request on the worker. The render functions here run
+on ``image_workers``, a small process pool, and produce every size the
+frontend needs from a single decode:
+
+- JPEGs are opened with ``Image.draft`` so libjpeg scales by 1/2, 1/4 or 1/8
+  while decoding when the largest output is much smaller than the upload
+- Each rendition is resized from the previous, larger one with
+  ``reducing_gap``, which runs a cheap integer ``reduce()`` before LANCZOS
+- Renditions are WebP and live next to each other under one random token
+  (``<prefix>/<token>/<size>.webp``, plus ``original.<ext>`` for profile
+  photos). ``rendition_key`` maps any of those keys to the best size for
+  display, so list views fetch 80 px thumbnails instead of the full image
+
+Keys and URLs in any other layout (older uploads, OAuth avatars) pass
+through ``rendition_key`` and ``rendition_keys`` unchanged.
+"""
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import re
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Any
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+RENDITION_SIZES = (640, 320, 160, 80)  # Largest first; each is rendered from the one before
+AVATAR_RENDITION_SIZES = (320, 160, 80)
+AVATAR_MIN_DIMENSION = 150
+AVATAR_MAX_DIMENSION = 2_000
+AVATAR_FORMATS = {"JPEG", "PNG"}
+MIN_IMAGE_DIMENSION = 300
+MAX_IMAGE_DIMENSION = 4096
+WEBP_QUALITY = 85
+WEBP_METHOD = 4
+REDUCING_GAP = 2.0
+
+# <prefix>/<32 hex token>/<original.jpg|original.png|NNN.webp>
+_RENDITION_PATTERN = re.compile(r"^(?P<base>.+/[0-9a-f]{32})/(?P<name>original\.(?:jpg|png)|(?P<size>\d+)\.webp)$")
+
+_FORMATS = {
+    "image/jpeg": ("JPEG", "jpg", "RGB"),
+    "image/png": ("PNG", "png", "RGBA"),
+}
+
+
+class ImageProcessingError(ValueError):
+    """
+    Raised for uploads that cannot be decoded or fail validation.
+
+    Plain ``ValueError`` so it pickles back from worker processes; callers
+    turn ``detail`` into a 400 response.
+    """
+
+    def __init__(self, detail: str) -> None:
+        super().__init__(detail)
+        self.detail = detail
+
+
+@dataclass(frozen=True)
+class RenderedImage:
+    """One encoded output of the pipeline."""
+
+    name: str  # "original" or the rendition size
+    content: bytes
+    content_type: str
+    extension: str
+
+    @property
+    def filename(self) -> str:
+        return f"{self.name}.{self.extension}"
+
+
+def _decode(image: Image.Image, scale: float) -> Image.Image:
+    """Load ``image``; JPEGs needing at most half their size are downscaled while decoding."""
+    if image.format == "JPEG" and scale <= 0.5:
+        width, height = image.size
+        image.draft("RGB", (math.ceil(width * scale), math.ceil(height * scale)))
+    image.load()
+    return ImageOps.exif_transpose(image)
+
+
+def _resize(image: Image.Image, size: tuple[int, int], box: tuple[int, int, int, int] | None = None) -> Image.Image:
+    return image.resize(size, Image.Resampling.LANCZOS, box=box, reducing_gap=REDUCING_GAP)
+
+
+def _encode(image: Image.Image, image_format: str, **options: Any) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def _webp(image: Image.Image, size: int) -> RenderedImage:
+    content = _encode(image, "WEBP", quality=WEBP_QUALITY, method=WEBP_METHOD)
+    return RenderedImage(str(size), content, "image/webp", "webp")
+
+
+def _normalize(image: Image.Image, content_type: str) -> tuple[Image.Image, RenderedImage]:
+    """Clamp an opened image between the minimum and maximum dimensions and re-encode it."""
+    target_format, extension, target_mode = _FORMATS.get(content_type, ("PNG", "png", "RGBA"))
+    width, height = image.size
+    if width <= 0 or height <= 0:
+        raise ImageProcessingError("Invalid image dimensions")
+
+    image = _decode(image, MAX_IMAGE_DIMENSION / max(width, height))
+    if image.mode != target_mode:
+        image = image.convert(target_mode)
+    width, height = image.size
+
+    if width < MIN_IMAGE_DIMENSION or height < MIN_IMAGE_DIMENSION:
+        scale = max(MIN_IMAGE_DIMENSION / width, MIN_IMAGE_DIMENSION / height)
+        image = _resize(
+            image,
+            (
+                max(MIN_IMAGE_DIMENSION, int(round(width * scale))),
+                max(MIN_IMAGE_DIMENSION, int(round(height * scale))),
+            ),
+        )
+        width, height = image.size
+
+    if width > MAX_IMAGE_DIMENSION or height > MAX_IMAGE_DIMENSION:
+        scale = min(MAX_IMAGE_DIMENSION / width, MAX_IMAGE_DIMENSION / height)
+        image = _resize(
+            image,
+            (
+                max(MIN_IMAGE_DIMENSION, int(round(width * scale))),
+                max(MIN_IMAGE_DIMENSION, int(round(height * scale))),
+            ),
+        )
+        width, height = image.size
+
+    if width < MIN_IMAGE_DIMENSION or height < MIN_IMAGE_DIMENSION:
+        target_width = max(width, MIN_IMAGE_DIMENSION)
+        target_height = max(height, MIN_IMAGE_DIMENSION)
+        background_color = (255, 255, 255, 0) if target_mode == "RGBA" else (255, 255, 255)
+        canvas = Image.new(target_mode, (target_width, target_height), color=background_color)
+        canvas.paste(image, ((target_width - width) // 2, (target_height - height) // 2))
+        image = canvas
+
+    options: dict[str, Any] = {"optimize": True}
+    if target_format == "JPEG":
+        options["quality"] = 90
+    content = _encode(image, target_format, **options)
+    return image, RenderedImage("original", content, f"image/{target_format.lower()}", extension)
+
+
+def _open_photo(content: bytes, content_type: str, *, renditions: bool) -> list[RenderedImage]:
+    try:
+        with Image.open(BytesIO(content)) as opened:
+            image, original = _normalize(opened, content_type)
+            outputs = [original]
+            if renditions:
+                for size in RENDITION_SIZES:
+                    # Fit within size x size; small photos are not upscaled
+                    scale = min(1.0, size / max(image.size))
+                    target = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+                    if target != image.size:
+                        image = _resize(image, target)
+                    outputs.append(_webp(image, size))
+    except ImageProcessingError:
+        raise
+    except UnidentifiedImageError as exc:
+        raise ImageProcessingError("Invalid image file") from exc
+    except Exception as exc:  # pragma: no cover - defensive guard
+        raise ImageProcessingError("Failed to process image") from exc
+    return outputs
+
+
+def normalize_image(content: bytes, content_type: str) -> RenderedImage:
+    """Resize an uploaded JPEG or PNG into the allowed dimensions, keeping its format."""
+    return _open_photo(content, content_type, renditions=False)[0]
+
+
+def render_profile_photo(content: bytes, content_type: str) -> list[RenderedImage]:
+    """Normalized original followed by WebP renditions in ``RENDITION_SIZES`` order."""
+    return _open_photo(content, content_type, renditions=True)
+
+
+def render_avatar(payload: bytes) -> list[RenderedImage]:
+    """Validate an avatar upload and render square WebP renditions in ``AVATAR_RENDITION_SIZES`` order."""
+    try:
+        with Image.open(BytesIO(payload)) as opened:
+            if (opened.format or "").upper() not in AVATAR_FORMATS:
+                raise ImageProcessingError("Unsupported image format")
+
+            width, height = opened.size
+            if width < AVATAR_MIN_DIMENSION or height < AVATAR_MIN_DIMENSION:
+                raise ImageProcessingError(
+                    f"Avatar must be at least {AVATAR_MIN_DIMENSION}x{AVATAR_MIN_DIMENSION} pixels"
+                )
+            if width > AVATAR_MAX_DIMENSION or height > AVATAR_MAX_DIMENSION:
+                raise ImageProcessingError(
+                    f"Avatar exceeds maximum dimension of {AVATAR_MAX_DIMENSION}x{AVATAR_MAX_DIMENSION} pixels"
+                )
+
+            image = _decode(opened, AVATAR_RENDITION_SIZES[0] / min(width, height)).convert("RGB")
+            width, height = image.size
+            side = min(width, height)
+            left, top = (width - side) // 2, (height - side) // 2
+            box: tuple[int, int, int, int] | None = (left, top, left + side, top + side)
+
+            outputs = []
+            for size in AVATAR_RENDITION_SIZES:
+                image = _resize(image, (size, size), box)
+                box = None  # Only the first pass crops; later ones shrink the previous rendition
+                outputs.append(_webp(image, size))
+    except ImageProcessingError:
+        raise
+    except UnidentifiedImageError as exc:
+        raise ImageProcessingError("Invalid image data") from exc
+    except Exception as exc:  # pragma: no cover - defensive guard
+        raise ImageProcessingError("Failed to process avatar") from exc
+    return outputs
+
+
+def _stored_sizes(match: re.Match[str]) -> list[int]:
+    largest = int(match["size"]) if match["size"] else RENDITION_SIZES[0]
+    return [size for size in RENDITION_SIZES if size <= largest]
+
+
+def rendition_key(key: str, size: int) -> str:
+    """
+    Pick the stored rendition of ``key`` to display at ``size`` device pixels.
+
+    Returns the smallest rendition at least ``size`` wide, or the largest one
+    when none is. Keys outside the rendition layout are returned unchanged.
+    """
+    match = _RENDITION_PATTERN.match(key)
+    if not match:
+        return key
+    sizes = _stored_sizes(match)
+    chosen = min((stored for stored in sizes if stored >= size), default=sizes[0])
+    return f"{match['base']}/{chosen}.webp"
+
+
+def rendition_keys(key: str) -> list[str]:
+    """Every object stored with ``key`` (just ``key`` itself for other layouts)."""
+    match = _RENDITION_PATTERN.match(key)
+    if not match:
+        return [key]
+    keys = [f"{match['base']}/{size}.webp" for size in _stored_sizes(match)]
+    return keys if match["size"] else [key, *keys]
+
+
+class ImageWorkerPool:
+    """
+    Runs render functions in worker processes.
+
+    Pillow holds the GIL for much of a resize, so threads would still slow
+    the event loop down. With ``IMAGE_PROCESSING_WORKERS`` set to 0 jobs run
+    on the default thread pool instead (handy for tests and tiny deployments).
+    """
+
+    def __init__(self, workers: int | None = None, max_tasks_per_child: int | None = None) -> None:
+        self.workers = settings.IMAGE_PROCESSING_WORKERS if workers is None else workers
+        self.max_tasks_per_child = max_tasks_per_child or settings.IMAGE_PROCESSING_MAX_TASKS_PER_CHILD
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned, not forked: the API process has live threads and sockets
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    max_tasks_per_child=self.max_tasks_per_child,
+                )
+            return self._executor
+
+    async def run[T](self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` off the event loop and return its result."""
+        if self.workers <= 0:
+            return await run_in_threadpool(fn, *args)
+
+        executor = self._get_executor()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            # A worker died (OOM on a huge upload, SIGKILL); later jobs get a fresh pool
+            logger.error("Image worker pool broke; restarting it")
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+image_workers = ImageWorkerPool()
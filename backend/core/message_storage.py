@@ -7,12 +7,24 @@ DDD+KISS Principles:
 - Presigned URLs for temporary secure access
 - Virus scanning placeholder (extensible)
 - File type validation and size limits
+
+Uploads are streamed: the file is read in chunks, checked against the size
+limit and the declared type's file signature as it arrives, and sent to S3
+in parts of MESSAGE_ATTACHMENT_UPLOAD_PART_SIZE (multipart upload for larger
+files), so an upload holds at most one part in memory. Blocking boto3 calls
+run on a bounded thread pool sharing one client, and the bucket is created
+once at startup rather than checked on every upload.
 """
 
+import asyncio
 import logging
 import secrets
-from functools import lru_cache
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from io import BytesIO
+from typing import Any
 
 import boto3
 from botocore.client import Config as BotoConfig
@@ -40,10 +52,28 @@ ALLOWED_DOCUMENT_TYPES = {
 }
 ALLOWED_MIME_TYPES = ALLOWED_IMAGE_TYPES | ALLOWED_DOCUMENT_TYPES
 
+# Leading bytes each allowed type must start with (WebP and text are checked in _matches_type)
+FILE_SIGNATURES = {
+    "image/jpeg": (b"\xff\xd8\xff",),
+    "image/png": (b"\x89PNG\r\n\x1a\n",),
+    "image/gif": (b"GIF87a", b"GIF89a"),
+    "application/pdf": (b"%PDF-",),
+    "application/msword": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",),  # OLE compound file
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": (b"PK\x03\x04",),
+}
+UTF16_BOMS = (b"\xff\xfe", b"\xfe\xff")
+
+READ_CHUNK_SIZE = 256 * 1024
+BUCKET_BOOTSTRAP_TIMEOUT_SECONDS = 10.0
+
+_bucket_ready = False
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
 
 @lru_cache(maxsize=1)
 def _s3_client():
-    """Return a lazily constructed S3 client for MinIO."""
+    """Return a lazily constructed S3 client for MinIO (thread-safe, shared by the storage pool)."""
     session = boto3.session.Session()
     return session.client(
         "s3",
@@ -52,10 +82,35 @@ def _s3_client():
         aws_secret_access_key=settings.MESSAGE_ATTACHMENT_STORAGE_SECRET_KEY,
         region_name=settings.MESSAGE_ATTACHMENT_STORAGE_REGION or None,
         use_ssl=settings.MESSAGE_ATTACHMENT_STORAGE_USE_SSL,
-        config=BotoConfig(signature_version="s3v4"),
+        config=BotoConfig(
+            signature_version="s3v4",
+            max_pool_connections=settings.MESSAGE_ATTACHMENT_UPLOAD_WORKERS,
+        ),
     )
 
 
+async def _run(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking storage call on the storage thread pool."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.MESSAGE_ATTACHMENT_UPLOAD_WORKERS,
+                thread_name_prefix="attachment-storage",
+            )
+        executor = _executor
+    return await asyncio.get_running_loop().run_in_executor(executor, partial(fn, *args, **kwargs))
+
+
+def shutdown_storage_executor() -> None:
+    """Stop the storage threads (application shutdown)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def _ensure_bucket_exists() -> None:
     """Create message attachments bucket if it doesn't exist (private by default)."""
     client = _s3_client()
@@ -92,6 +147,32 @@ def _ensure_bucket_exists() -> None:
             ) from exc
 
 
+def _bootstrap_bucket() -> None:
+    global _bucket_ready
+    _ensure_bucket_exists()
+    _bucket_ready = True
+
+
+async def _ensure_bucket_ready() -> None:
+    """Bootstrap the bucket if the startup attempt has not succeeded yet."""
+    if not _bucket_ready:
+        await _run(_bootstrap_bucket)
+
+
+async def init_message_storage() -> None:
+    """
+    Create the attachments bucket once at startup.
+
+    Failures are logged, not raised: if storage is down at startup, the first
+    upload retries the bootstrap.
+    """
+    try:
+        await asyncio.wait_for(_run(_bootstrap_bucket), BUCKET_BOOTSTRAP_TIMEOUT_SECONDS)
+        logger.info(f"Message attachment bucket ready: {settings.MESSAGE_ATTACHMENT_STORAGE_BUCKET}")
+    except Exception as e:
+        logger.warning(f"Message attachment storage unavailable at startup, will retry on first upload: {e!r}")
+
+
 def _categorize_file(mime_type: str) -> str:
     """Determine file category based on MIME type."""
     if mime_type in ALLOWED_IMAGE_TYPES:
@@ -102,7 +183,7 @@ def _categorize_file(mime_type: str) -> str:
         return "other"
 
 
-def _extract_image_dimensions(content: bytes) -> tuple[int | None, int | None]:
+def _extract_image_dimensions(content: bytes | bytearray) -> tuple[int | None, int | None]:
     """Extract width and height from image content."""
     try:
         with Image.open(BytesIO(content)) as img:
@@ -134,6 +215,78 @@ def _generate_secure_key(user_id: int, message_id: int, original_filename: str)
     return f"messages/{user_id}/{message_id}/{filename}"
 
 
+def _matches_type(mime_type: str, head: bytes) -> bool:
+    """Check the first chunk of a file against the signature of its declared type."""
+    if mime_type == "image/webp":
+        return head[:4] == b"RIFF" and head[8:12] == b"WEBP"
+    if mime_type == "text/plain":
+        return head.startswith(UTF16_BOMS) or b"\x00" not in head
+    return head.startswith(FILE_SIGNATURES[mime_type])
+
+
+def _too_large(is_image: bool, max_size: int) -> HTTPException:
+    kind = "Image" if is_image else "File"
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"{kind} too large (max: {max_size / 1024 / 1024:.0f} MB)",
+    )
+
+
+def _type_mismatch(mime_type: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"File content does not match its type: {mime_type}",
+    )
+
+
+class _MultipartUpload:
+    """An S3 multipart upload whose parts are sent from the storage thread pool."""
+
+    def __init__(self, bucket: str, key: str, upload_id: str) -> None:
+        self.bucket = bucket
+        self.key = key
+        self.upload_id = upload_id
+        self.parts: list[dict] = []
+
+    @classmethod
+    async def start(cls, bucket: str, key: str, **params: Any) -> "_MultipartUpload":
+        response = await _run(_s3_client().create_multipart_upload, Bucket=bucket, Key=key, **params)
+        return cls(bucket, key, response["UploadId"])
+
+    async def upload_part(self, body: bytes | bytearray) -> None:
+        part_number = len(self.parts) + 1
+        response = await _run(
+            _s3_client().upload_part,
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        self.parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+
+    async def complete(self) -> None:
+        await _run(
+            _s3_client().complete_multipart_upload,
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts},
+        )
+
+    async def abort(self) -> None:
+        try:
+            await _run(
+                _s3_client().abort_multipart_upload,
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self.upload_id,
+            )
+        except ClientError as exc:
+            # Incomplete uploads are also removed by the bucket lifecycle
+            logger.warning(f"Failed to abort multipart upload {self.upload_id} for {self.key}: {exc}")
+
+
 async def store_message_attachment(
     user_id: int,
     message_id: int,
@@ -142,6 +295,9 @@ async def store_message_attachment(
     """
     Store a message attachment securely in MinIO.
 
+    The upload is streamed in chunks: size and file signature are checked as
+    it is read, and files larger than one part are sent as a multipart upload.
+
     Returns:
         dict with file metadata: {
             'file_key': str,
@@ -156,77 +312,104 @@ async def store_message_attachment(
     Raises:
         HTTPException: If file validation fails or storage error occurs
     """
-    # 1. Validate MIME type
-    if upload.content_type not in ALLOWED_MIME_TYPES:
+    mime_type = upload.content_type
+
+    # 1. Validate declared MIME type
+    if mime_type not in ALLOWED_MIME_TYPES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Unsupported file type: {upload.content_type}. "
+            detail=f"Unsupported file type: {mime_type}. "
             f"Allowed: images (JPEG, PNG, GIF, WebP) and documents (PDF, DOC, TXT)",
         )
 
-    # 2. Read and validate size
-    content = await upload.read()
-    file_size = len(content)
-
-    if file_size == 0:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty file")
-
-    if file_size > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File too large: {file_size / 1024 / 1024:.1f} MB (max: 10 MB)",
-        )
+    is_image = mime_type in ALLOWED_IMAGE_TYPES
+    max_size = settings.MESSAGE_ATTACHMENT_MAX_IMAGE_SIZE if is_image else settings.MESSAGE_ATTACHMENT_MAX_FILE_SIZE
+    part_size = settings.MESSAGE_ATTACHMENT_UPLOAD_PART_SIZE
+    original_filename = sanitize_filename(upload.filename or "file")
 
-    # 3. Additional image validation
-    width, height = None, None
-    if upload.content_type in ALLOWED_IMAGE_TYPES:
-        if file_size > MAX_IMAGE_SIZE:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Image too large: {file_size / 1024 / 1024:.1f} MB (max: 5 MB)",
-            )
-        width, height = _extract_image_dimensions(content)
+    # The multipart parser records the size; reject before reading when it is known
+    if upload.size is not None and upload.size > max_size:
+        raise _too_large(is_image, max_size)
 
-    # 4. Generate secure storage key
+    # 2. Generate secure storage key
     file_key = _generate_secure_key(user_id, message_id, upload.filename or "file")
-    file_category = _categorize_file(upload.content_type)
-
-    # 5. Ensure bucket exists
-    _ensure_bucket_exists()
-
-    # 6. Upload to MinIO
-    client = _s3_client()
     bucket = settings.MESSAGE_ATTACHMENT_STORAGE_BUCKET
+    object_params = {
+        "ContentType": mime_type,
+        "Metadata": {
+            "user_id": str(user_id),
+            "message_id": str(message_id),
+            "original_filename": original_filename,
+        },
+    }
+
+    # 3. Stream to MinIO, validating as chunks arrive
+    buffer = bytearray()
+    file_size = 0
+    width, height = None, None
+    scan_for_nul = False
+    multipart: _MultipartUpload | None = None
     try:
-        client.put_object(
-            Bucket=bucket,
-            Key=file_key,
-            Body=content,
-            ContentType=upload.content_type,
-            Metadata={
-                "user_id": str(user_id),
-                "message_id": str(message_id),
-                "original_filename": sanitize_filename(upload.filename or "file"),
-            },
-        )
-        logger.info(
-            f"Uploaded message attachment: user={user_id}, message={message_id}, "
-            f"key={file_key}, size={file_size}, type={upload.content_type}"
-        )
+        while chunk := await upload.read(READ_CHUNK_SIZE):
+            if file_size == 0:
+                if not _matches_type(mime_type, chunk):
+                    raise _type_mismatch(mime_type)
+                scan_for_nul = mime_type == "text/plain" and not chunk.startswith(UTF16_BOMS)
+            elif scan_for_nul and b"\x00" in chunk:
+                raise _type_mismatch(mime_type)
+            file_size += len(chunk)
+            if file_size > max_size:
+                raise _too_large(is_image, max_size)
+            buffer += chunk
+
+            if len(buffer) >= part_size:
+                if multipart is None:
+                    if is_image:
+                        width, height = _extract_image_dimensions(buffer)
+                    await _ensure_bucket_ready()
+                    multipart = await _MultipartUpload.start(bucket, file_key, **object_params)
+                # boto3 accepts the bytearray as is; a new one avoids copying it
+                await multipart.upload_part(buffer)
+                buffer = bytearray()
+
+        if file_size == 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty file")
+
+        if multipart is None:
+            if is_image:
+                width, height = _extract_image_dimensions(buffer)
+            await _ensure_bucket_ready()
+            await _run(_s3_client().put_object, Bucket=bucket, Key=file_key, Body=buffer, **object_params)
+        else:
+            if buffer:
+                await multipart.upload_part(buffer)
+            await multipart.complete()
     except ClientError as exc:
+        if multipart is not None:
+            await multipart.abort()
         logger.error(f"Failed to upload attachment: {exc}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to store file",
         ) from exc
+    except BaseException:
+        if multipart is not None:
+            await multipart.abort()
+        raise
+
+    logger.info(
+        f"Uploaded message attachment: user={user_id}, message={message_id}, "
+        f"key={file_key}, size={file_size}, type={mime_type}"
+        + (f", parts={len(multipart.parts)}" if multipart else "")
+    )
 
-    # 7. Return metadata
+    # 4. Return metadata
     return {
         "file_key": file_key,
-        "original_filename": sanitize_filename(upload.filename or "file"),
+        "original_filename": original_filename,
         "file_size": file_size,
-        "mime_type": upload.content_type,
-        "file_category": file_category,
+        "mime_type": mime_type,
+        "file_category": _categorize_file(mime_type),
         "width": width,
         "height": height,
     }
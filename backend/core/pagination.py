@@ -1,12 +1,50 @@
-"""Pagination utilities for list endpoints."""
+"""
+Pagination utilities for list endpoints.
 
+Two modes:
+
+- Page mode (``page``/``page_size``): ``OFFSET``/``LIMIT`` plus an exact
+  ``count()``. Deep pages and the count get slower as the table grows.
+- Cursor mode (``cursor``): keyset pagination. A ``Keyset`` is a sort order
+  ending in a unique column. Each page continues strictly after the sort key
+  of the previous page's last row, so every page costs the same. The
+  position is carried in an opaque, HMAC-signed cursor bound to a scope
+  (endpoint, user and filters). Totals are opt-in and come from a short-lived
+  cached count or the planner's row estimate.
+
+List endpoints return ``next_cursor`` in both modes. A client can read the
+first page by number and then follow cursors.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+from collections.abc import Callable, Sequence
+from datetime import date, datetime
+from decimal import Decimal
 from math import ceil
-from typing import TypeVar
+from typing import Any, TypeVar
 
+from fastapi import HTTPException, status
 from pydantic import BaseModel, Field
+from sqlalchemy import Select, and_, func, or_, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import ColumnElement
+
+from core.cache import cache_with_ttl
+from core.config import settings
 
 T = TypeVar("T")
 
+# Cached totals for cursor mode are at most this old
+COUNT_CACHE_TTL_SECONDS = 60
+
+_CURSOR_SIGNATURE_BYTES = 12
+
 
 class PaginationParams(BaseModel):
     """Pagination query parameters."""
@@ -25,16 +63,32 @@ class PaginationParams(BaseModel):
         return self.page_size
 
 
+class CursorParams(BaseModel):
+    """Cursor-mode query parameters (use with ``Depends()`` next to page/page_size)."""
+
+    cursor: str | None = Field(
+        None,
+        description="next_cursor from the previous page; an empty value starts cursor paging (replaces page)",
+    )
+    include_total: bool = Field(False, description="In cursor mode, also return an approximate total")
+
+    @property
+    def enabled(self) -> bool:
+        return self.cursor is not None
+
+
 class PaginatedResponse[T](BaseModel):
     """Paginated response wrapper."""
 
     items: list[T] = Field(description="List of items for current page")
-    total: int = Field(description="Total number of items")
+    total: int | None = Field(description="Total number of items (cursor mode: only with include_total)")
     page: int = Field(description="Current page number")
     page_size: int = Field(description="Number of items per page")
-    total_pages: int = Field(description="Total number of pages")
+    total_pages: int | None = Field(description="Total number of pages")
     has_next: bool = Field(description="Whether there is a next page")
     has_prev: bool = Field(description="Whether there is a previous page")
+    next_cursor: str | None = Field(None, description="Cursor for the next page, null on the last page")
+    total_is_estimate: bool = Field(False, description="Whether total is cached or estimated rather than exact")
 
     @classmethod
     def create(
@@ -43,6 +97,7 @@ class PaginatedResponse[T](BaseModel):
         total: int,
         page: int,
         page_size: int,
+        next_cursor: str | None = None,
     ) -> "PaginatedResponse[T]":
         """
         Create paginated response.
@@ -52,6 +107,7 @@ class PaginatedResponse[T](BaseModel):
             total: Total number of items
             page: Current page number
             page_size: Number of items per page
+            next_cursor: Cursor to continue after this page in cursor mode
 
         Returns:
             PaginatedResponse instance
@@ -66,6 +122,31 @@ class PaginatedResponse[T](BaseModel):
             total_pages=total_pages,
             has_next=page < total_pages,
             has_prev=page > 1,
+            next_cursor=next_cursor,
+        )
+
+    @classmethod
+    def create_cursor_page(
+        cls,
+        items: list[T],
+        page_size: int,
+        next_cursor: str | None,
+        *,
+        has_prev: bool,
+        total: int | None = None,
+        total_is_estimate: bool = False,
+    ) -> "PaginatedResponse[T]":
+        """Create a cursor-mode response (``page`` is always 1 and totals are optional)."""
+        return cls(
+            items=items,
+            total=total,
+            page=1,
+            page_size=page_size,
+            total_pages=ceil(total / page_size) if total is not None and page_size > 0 else None,
+            has_next=next_cursor is not None,
+            has_prev=has_prev,
+            next_cursor=next_cursor,
+            total_is_estimate=total_is_estimate,
         )
 
 
@@ -91,3 +172,185 @@ def paginate[T](
         page=params.page,
         page_size=params.page_size,
     )
+
+
+# ============================================================================
+# Cursor (keyset) pagination
+# ============================================================================
+
+
+class InvalidCursorError(HTTPException):
+    """Cursor is malformed, tampered with, or was issued for another listing."""
+
+    def __init__(self) -> None:
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+        raise ValueError("Unknown cursor value")
+    return value
+
+
+def _signature(scope: str, payload: bytes) -> bytes:
+    message = scope.encode() + b"\0" + payload
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).digest()[:_CURSOR_SIGNATURE_BYTES]
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def encode_cursor(scope: str, values: Sequence[Any]) -> str:
+    """
+    Encode a sort key as an opaque cursor.
+
+    ``scope`` identifies the listing (endpoint, user, filters). A cursor only
+    decodes under the same scope, so it can't be replayed against a
+    different listing or altered by the client.
+    """
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":")).encode()
+    return f"{_b64encode(payload)}.{_b64encode(_signature(scope, payload))}"
+
+
+def decode_cursor(scope: str, cursor: str) -> tuple[Any, ...]:
+    """
+    Decode a cursor made by ``encode_cursor`` for the same scope.
+
+    Raises:
+        InvalidCursorError: Malformed, tampered with, or issued for another scope
+    """
+    try:
+        encoded_payload, encoded_signature = cursor.split(".")
+        payload = _b64decode(encoded_payload)
+        if not hmac.compare_digest(_b64decode(encoded_signature), _signature(scope, payload)):
+            raise InvalidCursorError()
+        return tuple(_decode_value(value) for value in json.loads(payload))
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError() from e
+
+
+class Keyset:
+    """
+    Sort order for keyset pagination.
+
+    Built from ``ORDER BY`` clauses, and the last one must be unique (usually
+    the primary key) so every row has a distinct position::
+
+        keyset = Keyset(Booking.start_time.desc(), Booking.id.desc())
+        statement = keyset.apply(select(Booking), after=decode_cursor(scope, cursor))
+
+    Sort columns must not be NULL. Wrap nullable ones in ``coalesce``.
+    """
+
+    def __init__(self, *order_by: ColumnElement) -> None:
+        if not order_by:
+            raise ValueError("Keyset needs at least one ORDER BY clause")
+        self.order_by = order_by
+        self._keys = [
+            (getattr(clause, "element", clause), getattr(clause, "modifier", None) is operators.desc_op)
+            for clause in order_by
+        ]
+
+    def after(self, values: Sequence[Any]) -> ColumnElement:
+        """Predicate for rows sorted strictly after ``values``."""
+        if len(values) != len(self._keys):
+            raise InvalidCursorError()
+        directions = {descending for _, descending in self._keys}
+        if len(directions) == 1:
+            # One direction: a row comparison, which an index on the sort columns can serve
+            row = tuple_(*(column for column, _ in self._keys))
+            return row < tuple_(*values) if directions.pop() else row > tuple_(*values)
+        # Mixed directions: (a > x) OR (a = x AND b < y) OR ...
+        branches = []
+        for position, (column, descending) in enumerate(self._keys):
+            earlier = [key == value for (key, _), value in zip(self._keys[:position], values[:position], strict=True)]
+            beyond = column < values[position] if descending else column > values[position]
+            branches.append(and_(*earlier, beyond))
+        return or_(*branches)
+
+    def apply(self, statement, after: Sequence[Any] | None = None):
+        """Order ``statement`` (a Select or ORM Query) by the keyset, continuing after ``after``."""
+        if after is not None:
+            statement = statement.where(self.after(after))
+        return statement.order_by(*self.order_by)
+
+
+def split_page[T](
+    rows: Sequence[T],
+    page_size: int,
+    scope: str,
+    key: Callable[[T], Sequence[Any]],
+) -> tuple[list[T], str | None]:
+    """
+    Trim rows fetched with ``limit(page_size + 1)`` and build the next cursor.
+
+    The extra row only signals that another page exists. The cursor encodes
+    ``key`` of the last row kept.
+    """
+    rows = list(rows)
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, encode_cursor(scope, key(rows[-1]))
+
+
+def _count_statement(statement: Select) -> Select:
+    return select(func.count()).select_from(statement.order_by(None).subquery())
+
+
+@cache_with_ttl(
+    ttl_seconds=COUNT_CACHE_TTL_SECONDS,
+    namespace="pagination.count",
+    key_builder=lambda db, key, statement: key,
+)
+def cached_count(db: Session, key: str, statement: Select) -> int:
+    """Count the rows of ``statement``, cached per ``key`` for COUNT_CACHE_TTL_SECONDS."""
+    return db.scalar(_count_statement(statement)) or 0
+
+
+@cache_with_ttl(
+    ttl_seconds=COUNT_CACHE_TTL_SECONDS,
+    namespace="pagination.count_async",
+    key_builder=lambda db, key, statement: key,
+)
+async def cached_count_async(db: AsyncSession, key: str, statement: Select) -> int:
+    """Async ``cached_count``; also shared across workers through Redis."""
+    return await db.scalar(_count_statement(statement)) or 0
+
+
+def estimated_row_count(db: Session, table_name: str) -> int | None:
+    """
+    Planner's row estimate for a whole table (``pg_class.reltuples``).
+
+    Free to read, refreshed by autovacuum/ANALYZE. Returns None when there is
+    no estimate (not PostgreSQL, or the table was never analyzed).
+    """
+    bind = db.get_bind()
+    if bind is None or bind.dialect.name != "postgresql":
+        return None
+    estimate = db.scalar(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+        {"table_name": table_name},
+    )
+    return estimate if estimate is not None and estimate >= 0 else None
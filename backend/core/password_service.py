@@ -0,0 +1,130 @@
+"""
+Async password hashing on a bounded worker pool.
+
+bcrypt is slow on purpose (about 250ms at 12 rounds), and ``PasswordHasher``
+ran it inline, so every login or password reset in an ``async def`` route
+stalled the event loop, and every other request on the worker with it.
+``PasswordService`` runs bcrypt on a dedicated thread pool instead; bcrypt
+releases the GIL while hashing, so the threads work in parallel:
+
+- ``PASSWORD_HASH_WORKERS`` hashes run at once; further requests wait in line
+- At most ``PASSWORD_HASH_MAX_PENDING`` requests are admitted (running plus
+  waiting). Beyond that callers fail fast with ``PasswordHashingBusyError``
+  (503 with Retry-After) rather than queueing behind seconds of bcrypt work
+- ``verify_and_update`` also returns a fresh hash when the stored one was made
+  with a cost other than ``PASSWORD_BCRYPT_ROUNDS``, so changing the cost
+  upgrades users as they log in
+"""
+
+import asyncio
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from fastapi import HTTPException, status
+
+from core.config import settings
+from core.security import PasswordHasher
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHashingBusyError(HTTPException):
+    """Raised when the password pool is saturated; surfaces as a 503."""
+
+    def __init__(self, retry_after: int = 1) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy. Please try again shortly.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    if not PasswordHasher.verify(plain_password, hashed_password):
+        return False, None
+    if PasswordHasher.needs_rehash(hashed_password):
+        return True, PasswordHasher.hash(plain_password)
+    return True, None
+
+
+class PasswordService:
+    """Runs ``PasswordHasher`` on a size-limited thread pool with admission control."""
+
+    def __init__(self, *, workers: int | None = None, max_pending: int | None = None) -> None:
+        self.workers = workers or settings.PASSWORD_HASH_WORKERS
+        self.max_pending = max(max_pending or settings.PASSWORD_HASH_MAX_PENDING, self.workers)
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {"completed": 0, "rejected": 0, "rehashed": 0}
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future[Any]:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats["rejected"] += 1
+                logger.warning(f"Password hashing pool saturated ({self._pending} pending), rejecting request")
+                raise PasswordHashingBusyError()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            self._pending += 1
+            executor = self._executor
+        # Released when the job finishes, even if the caller stopped waiting
+        future = executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future: Future[Any]) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._stats["completed"] += 1
+
+    async def hash(self, password: str) -> str:
+        """Hash a password without blocking the event loop."""
+        return await asyncio.wrap_future(self._submit(PasswordHasher.hash, password))
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password without blocking the event loop."""
+        return await asyncio.wrap_future(self._submit(PasswordHasher.verify, plain_password, hashed_password))
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """
+        Verify a password and upgrade its hash if the bcrypt cost changed.
+
+        Returns:
+            (verified, new_hash). ``new_hash`` is set only for a correct
+            password whose stored hash should be replaced
+        """
+        verified, new_hash = await asyncio.wrap_future(
+            self._submit(_verify_and_update, plain_password, hashed_password)
+        )
+        if new_hash is not None:
+            with self._lock:
+                self._stats["rehashed"] += 1
+        return verified, new_hash
+
+    def hash_sync(self, password: str) -> str:
+        """Hash on the pool from code already running in a worker thread (sync routes)."""
+        return self._submit(PasswordHasher.hash, password).result()
+
+    def get_stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                **self._stats,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads after queued jobs finish."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+# Global instance
+password_service = PasswordService()
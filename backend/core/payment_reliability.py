@@ -6,7 +6,6 @@ Provides circuit breaker, idempotency, and retry handling for Stripe operations.
 Features:
 - Circuit breaker pattern for Stripe API calls
 - Idempotency key generation and tracking
-- Webhook retry tracking
 - Payment status polling for timeout recovery
 - Graceful degradation when Stripe is unavailable
 """
@@ -18,7 +17,7 @@ import time
 import uuid
 from contextlib import contextmanager
 from dataclasses import dataclass, field
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime
 from enum import Enum
 from typing import Any, TypeVar
 
@@ -284,117 +283,6 @@ def generate_unique_idempotency_key(prefix: str = "op") -> str:
     return f"idem_{prefix}_{uuid.uuid4().hex}"
 
 
-@dataclass
-class WebhookRetryInfo:
-    """Information about webhook retry attempts."""
-
-    event_id: str
-    event_type: str
-    first_received_at: datetime
-    last_received_at: datetime
-    attempt_count: int
-    processed: bool
-    error_message: str | None = None
-
-
-class WebhookRetryTracker:
-    """
-    Track webhook retry attempts for monitoring and debugging.
-
-    Stripe may retry webhooks multiple times. This tracker helps
-    identify problematic webhooks and understand retry patterns.
-    """
-
-    def __init__(self, max_entries: int = 1000):
-        self._entries: dict[str, WebhookRetryInfo] = {}
-        self._max_entries = max_entries
-        self._lock = threading.Lock()
-
-    def record_attempt(
-        self,
-        event_id: str,
-        event_type: str,
-        processed: bool = False,
-        error_message: str | None = None,
-    ) -> WebhookRetryInfo:
-        """Record a webhook attempt."""
-        now = datetime.now(UTC)
-
-        with self._lock:
-            if event_id in self._entries:
-                entry = self._entries[event_id]
-                entry.last_received_at = now
-                entry.attempt_count += 1
-                entry.processed = processed or entry.processed
-                if error_message:
-                    entry.error_message = error_message
-            else:
-                # Clean up old entries if we're at capacity
-                if len(self._entries) >= self._max_entries:
-                    self._cleanup_old_entries()
-
-                entry = WebhookRetryInfo(
-                    event_id=event_id,
-                    event_type=event_type,
-                    first_received_at=now,
-                    last_received_at=now,
-                    attempt_count=1,
-                    processed=processed,
-                    error_message=error_message,
-                )
-                self._entries[event_id] = entry
-
-            return entry
-
-    def get_retry_info(self, event_id: str) -> WebhookRetryInfo | None:
-        """Get retry info for an event."""
-        with self._lock:
-            return self._entries.get(event_id)
-
-    def get_problematic_events(self, min_attempts: int = 3) -> list[WebhookRetryInfo]:
-        """Get events that have been retried multiple times."""
-        with self._lock:
-            return [
-                entry
-                for entry in self._entries.values()
-                if entry.attempt_count >= min_attempts and not entry.processed
-            ]
-
-    def get_stats(self) -> dict[str, Any]:
-        """Get webhook retry statistics."""
-        with self._lock:
-            total = len(self._entries)
-            processed = sum(1 for e in self._entries.values() if e.processed)
-            retried = sum(1 for e in self._entries.values() if e.attempt_count > 1)
-            max_attempts = max(
-                (e.attempt_count for e in self._entries.values()),
-                default=0,
-            )
-
-            return {
-                "total_events": total,
-                "processed_events": processed,
-                "failed_events": total - processed,
-                "retried_events": retried,
-                "max_attempts": max_attempts,
-            }
-
-    def _cleanup_old_entries(self) -> None:
-        """Remove old entries to prevent memory growth."""
-        cutoff = datetime.now(UTC) - timedelta(hours=24)
-        keys_to_remove = [
-            key
-            for key, entry in self._entries.items()
-            if entry.last_received_at < cutoff
-        ]
-        for key in keys_to_remove:
-            del self._entries[key]
-
-
-# Global webhook retry tracker
-webhook_retry_tracker = WebhookRetryTracker()
-
-
 @dataclass
 class PaymentStatusInfo:
     """Payment status information."""
@@ -603,6 +491,5 @@ def get_payment_reliability_status() -> dict[str, Any]:
     """Get overall payment reliability status for monitoring."""
     return {
         "circuit_breaker": stripe_circuit_breaker.get_status(),
-        "webhook_tracker": webhook_retry_tracker.get_stats(),
         "timestamp": datetime.now(UTC).isoformat(),
     }
@@ -0,0 +1,206 @@
+"""
+Cached principal resolution for request and WebSocket authentication.
+
+``get_current_user`` used to load the full ``User`` row on every authenticated
+request only to re-check ``is_active``, ``password_changed_at`` and ``role``.
+Those checks now run against a compact snapshot kept in the two-tier cache
+(core/cache.py), so the common case costs no database query:
+
+- ``principal:email:<email>`` maps a token subject to a user id
+- ``principal:<id>`` holds the snapshot. Its tag version in Redis acts as the
+  user's security version: bumping it makes every worker reload the row.
+
+Invalidation runs from ORM flushes of ``User`` (see
+``register_principal_listeners``): any change to a snapshot field, the
+password or the soft-delete marker invalidates the user's entries once the
+transaction commits. ``invalidate_principal`` covers writes that bypass the
+ORM. Other workers may serve their local copy for up to
+``AUTH_PRINCIPAL_LOCAL_TTL_SECONDS`` after that.
+
+Handlers still receive a real ``User``: ``attach_user`` adds it to the request
+session from the snapshot without a query, and any column outside the snapshot
+is loaded on first access.
+"""
+
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from core.cache import cache_with_ttl, invalidate_tags, invalidate_tags_sync
+from core.config import settings
+from core.utils import StringUtils
+
+# Columns copied into the snapshot. A change to any SECURITY_FIELDS column
+# invalidates the user's cached principal.
+SNAPSHOT_FIELDS = (
+    "email",
+    "role",
+    "is_active",
+    "is_verified",
+    "first_name",
+    "last_name",
+    "timezone",
+    "currency",
+    "preferred_language",
+)
+SECURITY_FIELDS = (*SNAPSHOT_FIELDS, "hashed_password", "password_changed_at", "deleted_at")
+
+_PENDING_KEY = "principal_invalidations"
+
+
+def principal_tag(user_id: int) -> str:
+    return f"principal:{user_id}"
+
+
+def principal_email_tag(email: str) -> str:
+    return f"principal:email:{email}"
+
+
+@cache_with_ttl(
+    ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+    namespace="auth.principal_id",
+    key_builder=lambda db, email: email,
+    tags=lambda db, email: [principal_email_tag(email)],
+    local_ttl_seconds=settings.AUTH_PRINCIPAL_LOCAL_TTL_SECONDS,
+)
+async def _lookup_user_id(db: Session, email: str) -> int | None:
+    from models import User
+
+    return (
+        db.query(User.id)
+        .filter(User.email == email, User.deleted_at.is_(None))
+        .scalar()
+    )
+
+
+@cache_with_ttl(
+    ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+    namespace="auth.principal",
+    key_builder=lambda db, user_id: str(user_id),
+    tags=lambda db, user_id: [principal_tag(user_id)],
+    local_ttl_seconds=settings.AUTH_PRINCIPAL_LOCAL_TTL_SECONDS,
+)
+async def _load_principal(db: Session, user_id: int) -> dict[str, Any] | None:
+    from models import User
+
+    user = db.query(User).filter(User.id == user_id, User.deleted_at.is_(None)).first()
+    if user is None:
+        return None
+    principal = {field: getattr(user, field) for field in SNAPSHOT_FIELDS}
+    principal["id"] = user.id
+    principal["password_changed_at"] = (
+        user.password_changed_at.timestamp() if user.password_changed_at else None
+    )
+    return principal
+
+
+async def resolve_principal(db: Session, email: str) -> dict[str, Any] | None:
+    """
+    Snapshot of the non-deleted user a token subject refers to.
+
+    Returns:
+        Dict with ``id``, the ``SNAPSHOT_FIELDS`` and ``password_changed_at``
+        as a POSIX timestamp, or None if there is no such user
+    """
+    email = StringUtils.normalize_email(email)
+    user_id = await _lookup_user_id(db, email)
+    if user_id is None:
+        return None
+    principal = await _load_principal(db, user_id)
+    # A mapping cached before an email change must not resolve to the new owner
+    if principal is None or principal["email"] != email:
+        return None
+    return principal
+
+
+def attach_user(db: Session, principal: dict[str, Any]):
+    """
+    ``User`` for a principal, attached to ``db`` without a query.
+
+    Returns the instance already in the session's identity map if there is
+    one. Otherwise the snapshot columns are set as if freshly loaded and the
+    rest are loaded on first access, so handlers can read, modify and commit
+    the user as before.
+    """
+    from models import User
+
+    existing = db.identity_map.get(Session.identity_key(User, principal["id"]))
+    if existing is not None:
+        return existing
+
+    password_changed_at = principal["password_changed_at"]
+    user = User(
+        id=principal["id"],
+        password_changed_at=datetime.fromtimestamp(password_changed_at, UTC) if password_changed_at else None,
+        deleted_at=None,
+        **{field: principal[field] for field in SNAPSHOT_FIELDS},
+    )
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
+
+async def invalidate_principal(user_id: int, *emails: str) -> None:
+    """Drop a user's cached principal (for writes that bypass the ORM)."""
+    await invalidate_tags(
+        principal_tag(user_id),
+        *(principal_email_tag(StringUtils.normalize_email(email)) for email in emails),
+    )
+
+
+# =============================================================================
+# ORM-driven invalidation
+# =============================================================================
+
+
+def _queue_invalidation(target: Any, *, force: bool) -> None:
+    state = inspect(target)
+    emails = {target.email}
+    changed = force
+    for field in SECURITY_FIELDS:
+        history = state.attrs[field].history
+        if history.has_changes():
+            changed = True
+            if field == "email":
+                emails.update(history.deleted)
+    if not changed or state.session is None:
+        return
+    pending = state.session.info.setdefault(_PENDING_KEY, set())
+    pending.add(principal_tag(target.id))
+    pending.update(principal_email_tag(StringUtils.normalize_email(email)) for email in emails if email)
+
+
+def _after_insert(mapper, connection, target) -> None:
+    # Clears a cached "no such user" for the email
+    _queue_invalidation(target, force=True)
+
+
+def _after_update(mapper, connection, target) -> None:
+    _queue_invalidation(target, force=False)
+
+
+def _after_delete(mapper, connection, target) -> None:
+    _queue_invalidation(target, force=True)
+
+
+def _after_commit(session: Session) -> None:
+    tags = session.info.pop(_PENDING_KEY, None)
+    if tags:
+        invalidate_tags_sync(*tags)
+
+
+def register_principal_listeners(model) -> None:
+    """
+    Invalidate cached principals whenever ``model`` rows change through the ORM.
+
+    Changes are collected on the session during flush and applied after the
+    commit, so no reader can re-cache the old row afterwards. Tags left over
+    from a rolled-back flush ride along with the session's next commit; that
+    costs a cache miss, never a stale entry.
+    """
+    event.listen(model, "after_insert", _after_insert)
+    event.listen(model, "after_update", _after_update)
+    event.listen(model, "after_delete", _after_delete)
+    event.listen(Session, "after_commit", _after_commit)
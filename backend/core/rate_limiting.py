@@ -1,13 +1,372 @@
 """
-Centralized rate limiting configuration.
+Centralized rate limiting.
 
 This module provides a shared rate limiter instance to be used across all API routers.
-Using a single instance ensures consistent rate limiting behavior and configuration.
+``@limiter.limit("10/minute")`` gives an endpoint (which must take a
+``request: Request`` parameter) its own budget per principal: the user
+(JWT ``sub``) for requests carrying a valid access token, the client IP
+otherwise. Users behind one NAT do not share a budget, and a user cannot
+escape theirs by switching networks.
+
+Budgets are counted in Redis with GCRA (generic cell rate algorithm) in a
+Lua script, so every worker enforces the same limit. The script reads Redis
+TIME, so clock skew between workers does not matter.
+
+To avoid a Redis round trip on every request to a busy key, a worker may
+lease several requests at once and admit them from memory:
+
+- a key's lease starts at one request and doubles each time the previous
+  lease is used up before it expires, so only hot keys lease ahead
+- a lease is capped at RATE_LIMIT_LOCAL_LEASE_MAX and at a tenth of the
+  limit (low limits such as "5/minute" always ask Redis), and expires after
+  RATE_LIMIT_LOCAL_LEASE_TTL_SECONDS; unused requests are dropped, so
+  leasing can under-admit but never over-admit
+- a throttled key is remembered until its retry time, so a client hammering
+  a 429 does not reach Redis either
+
+If Redis is unavailable the same algorithm runs in process memory (budgets
+become per worker) and Redis is retried after REDIS_RETRY_SECONDS.
+
+Per-route counters are available from ``get_rate_limit_metrics()``.
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import math
+import re
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Any, NamedTuple, Protocol
+
+import redis.asyncio as redis
+from fastapi import HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from core.exceptions import AuthenticationError
+from core.security import TokenManager
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ratelimit:"
+REDIS_TIMEOUT_SECONDS = 0.5
+REDIS_RETRY_SECONDS = 5.0
+
+_UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_LIMIT_PATTERN = re.compile(r"^\s*(\d+)\s*(?:/|per)\s*(\d+)?\s*(second|minute|hour|day)s?\s*$")
+
+# KEYS[1]: theoretical arrival time (TAT) in microseconds
+# ARGV: emission interval (us), period (us), requests wanted
+# Returns {granted, retry_after_us}
+GCRA_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000000 + tonumber(time[2])
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local want = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local available = math.floor((now + period - tat) / interval)
+if available < 1 then
+    return {0, tat + interval - period - now}
+end
+local granted = math.min(want, available)
+tat = tat + granted * interval
+redis.call('SET', KEYS[1], string.format('%d', tat), 'PX', math.max(1, math.ceil((tat - now) / 1000)))
+return {granted, 0}
 """
 
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+
+class RateLimitExceeded(HTTPException):
+    """Raised when a request is over its budget (handled as a 429 in main.py)."""
+
+    def __init__(self, retry_after: float) -> None:
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(
+            status_code=429,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """``count`` requests per ``period`` seconds."""
+
+    count: int
+    period: float
+
+    @property
+    def interval(self) -> float:
+        return self.period / self.count
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """Parse "10/minute", "10 per minute" or "100/5 minutes"."""
+        match = _LIMIT_PATTERN.match(value)
+        if match is None or int(match.group(1)) < 1:
+            raise ValueError(f"Invalid rate limit: {value!r}")
+        count, multiplier, unit = match.groups()
+        return cls(int(count), int(multiplier or 1) * _UNITS[unit])
+
+
+class Grant(NamedTuple):
+    granted: int
+    retry_after: float  # Seconds until one request is available (when granted is 0)
+
+
+def gcra(tat: float, now: float, limit: RateLimit, want: int) -> tuple[Grant, float]:
+    """GCRA step in Python (mirrors GCRA_SCRIPT); returns the grant and the new TAT."""
+    tat = max(tat, now)
+    available = math.floor((now + limit.period - tat) / limit.interval)
+    if available < 1:
+        return Grant(0, tat + limit.interval - limit.period - now), tat
+    granted = min(want, available)
+    return Grant(granted, 0.0), tat + granted * limit.interval
+
+
+class RateLimitStore(Protocol):
+    async def acquire(self, key: str, limit: RateLimit, want: int) -> Grant: ...
+
+
+class RedisStore:
+    """GCRA state shared by all workers in Redis."""
+
+    def __init__(self, url: str | None = None) -> None:
+        self._url = url
+        self._script: Any = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_script(self) -> Any:
+        # A connection pool is bound to the event loop that created it
+        loop = asyncio.get_running_loop()
+        if self._script is None or self._loop is not loop:
+            client = redis.from_url(
+                self._url or settings.redis_url,
+                socket_timeout=REDIS_TIMEOUT_SECONDS,
+                socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+            )
+            self._script = client.register_script(GCRA_SCRIPT)
+            self._loop = loop
+        return self._script
+
+    async def acquire(self, key: str, limit: RateLimit, want: int) -> Grant:
+        granted, retry_after_us = await self._get_script()(
+            keys=[key],
+            args=[round(limit.interval * 1_000_000), round(limit.period * 1_000_000), want],
+        )
+        return Grant(int(granted), int(retry_after_us) / 1_000_000)
+
+
+class MemoryStore:
+    """Per-process GCRA state: the fallback while Redis is unavailable."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, max_keys: int = 100_000) -> None:
+        self._clock = clock
+        self.max_keys = max_keys
+        self._tats: OrderedDict[str, float] = OrderedDict()
+
+    async def acquire(self, key: str, limit: RateLimit, want: int) -> Grant:
+        now = self._clock()
+        grant, tat = gcra(self._tats.get(key, now), now, limit, want)
+        if grant.granted:
+            self._tats[key] = tat
+            self._tats.move_to_end(key)
+            # Dropping the least recently used key forgets its history; acceptable for a fallback
+            while len(self._tats) > self.max_keys:
+                self._tats.popitem(last=False)
+        return grant
+
+
+@dataclass
+class RouteMetrics:
+    """Throttling counters for one rate-limited route."""
+
+    allowed: int = 0
+    throttled: int = 0
+    local_hits: int = 0  # Decided in memory from a lease or a remembered throttle
+    redis_calls: int = 0
+    redis_errors: int = 0
+    fallback: int = 0  # Decided by the in-memory store while Redis was unavailable
+
+
+@dataclass
+class _Lease:
+    remaining: int
+    size: int
+    expires_at: float
+
+
+def get_remote_address(request: Request) -> str:
+    """Client IP address (uvicorn resolves X-Forwarded-For from trusted proxies)."""
+    return request.client.host if request.client else "127.0.0.1"
+
+
+def get_principal_key(request: Request) -> str:
+    """``user:<sub>`` for a valid bearer access token, ``ip:<address>`` otherwise."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            subject = TokenManager.decode_token(token, expected_type="access").get("sub")
+        except AuthenticationError:
+            subject = None
+        if subject:
+            return f"user:{subject}"
+    return f"ip:{get_remote_address(request)}"
+
+
+class RateLimiter:
+    """Per-route, per-principal budgets enforced in Redis with local leases."""
+
+    def __init__(
+        self,
+        store: RateLimitStore | None = None,
+        fallback: RateLimitStore | None = None,
+        *,
+        key_func: Callable[[Request], str] = get_principal_key,
+        enabled: bool | None = None,
+        lease_max: int | None = None,
+        lease_ttl: float | None = None,
+        max_local_keys: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._store = store or RedisStore()
+        self._fallback = fallback or MemoryStore(clock)
+        self._key_func = key_func
+        self.enabled = settings.RATE_LIMIT_ENABLED if enabled is None else enabled
+        self.lease_max = settings.RATE_LIMIT_LOCAL_LEASE_MAX if lease_max is None else lease_max
+        self.lease_ttl = settings.RATE_LIMIT_LOCAL_LEASE_TTL_SECONDS if lease_ttl is None else lease_ttl
+        self.max_local_keys = settings.RATE_LIMIT_LOCAL_MAX_KEYS if max_local_keys is None else max_local_keys
+        self._clock = clock
+        self._leases: OrderedDict[str, _Lease] = OrderedDict()
+        self._blocked: OrderedDict[str, float] = OrderedDict()
+        self._redis_retry_at = 0.0
+        self._metrics: defaultdict[str, RouteMetrics] = defaultdict(RouteMetrics)
+
+    def limit(self, limit_value: str, key_func: Callable[[Request], str] | None = None) -> Callable:
+        """
+        Decorate an endpoint with a rate limit such as "10/minute".
+
+        The endpoint must have a ``request`` parameter. Sync endpoints become
+        async and run in the threadpool, as FastAPI would run them.
+        """
+        limit = RateLimit.parse(limit_value)
+        get_key = key_func or self._key_func
+
+        def decorator(func: Callable) -> Callable:
+            if "request" not in inspect.signature(func).parameters:
+                raise TypeError(f'{func.__qualname__} needs a "request" parameter to be rate limited')
+            route = f"{func.__module__}.{func.__name__}"
+
+            if inspect.iscoroutinefunction(func):
+
+                @functools.wraps(func)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    await self.hit(route, limit, get_key(kwargs["request"]))
+                    return await func(*args, **kwargs)
+
+                return async_wrapper
+
+            @functools.wraps(func)
+            async def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+                await self.hit(route, limit, get_key(kwargs["request"]))
+                return await run_in_threadpool(func, *args, **kwargs)
+
+            return sync_wrapper
+
+        return decorator
+
+    async def hit(self, route: str, limit: RateLimit, key: str) -> None:
+        """
+        Count one request to ``route`` by ``key``.
+
+        Raises:
+            RateLimitExceeded: If the budget is used up
+        """
+        if not self.enabled:
+            return
+        metrics = self._metrics[route]
+        bucket = f"{KEY_PREFIX}{route}:{key}"
+        now = self._clock()
+
+        blocked_until = self._blocked.get(bucket)
+        if blocked_until is not None:
+            if now < blocked_until:
+                metrics.local_hits += 1
+                metrics.throttled += 1
+                raise RateLimitExceeded(blocked_until - now)
+            del self._blocked[bucket]
+
+        lease = self._leases.get(bucket)
+        if lease is not None and lease.remaining > 0 and now < lease.expires_at:
+            lease.remaining -= 1
+            metrics.local_hits += 1
+            metrics.allowed += 1
+            return
+
+        want = self._lease_size(lease, limit, now)
+        grant = await self._acquire(bucket, limit, want, metrics)
+        if not grant.granted:
+            self._remember(self._blocked, bucket, now + grant.retry_after)
+            metrics.throttled += 1
+            raise RateLimitExceeded(grant.retry_after)
+        self._remember(self._leases, bucket, _Lease(grant.granted - 1, want, now + self.lease_ttl))
+        metrics.allowed += 1
+
+    def _lease_size(self, lease: _Lease | None, limit: RateLimit, now: float) -> int:
+        # Grow only while the previous lease ran out before expiring
+        cap = min(self.lease_max, limit.count // 10)
+        if cap <= 1 or lease is None or now >= lease.expires_at:
+            return 1
+        return min(lease.size * 2, cap)
+
+    async def _acquire(self, bucket: str, limit: RateLimit, want: int, metrics: RouteMetrics) -> Grant:
+        if self._clock() >= self._redis_retry_at:
+            metrics.redis_calls += 1
+            try:
+                return await self._store.acquire(bucket, limit, want)
+            except (redis.RedisError, OSError) as e:
+                metrics.redis_errors += 1
+                self._redis_retry_at = self._clock() + REDIS_RETRY_SECONDS
+                logger.warning(f"Rate limit store unavailable, using in-memory limits: {e}")
+        metrics.fallback += 1
+        # The in-memory store needs no round trip, so there is nothing to lease
+        return await self._fallback.acquire(bucket, limit, 1)
+
+    def _remember(self, entries: OrderedDict, bucket: str, value: Any) -> None:
+        entries[bucket] = value
+        entries.move_to_end(bucket)
+        while len(entries) > self.max_local_keys:
+            entries.popitem(last=False)
+
+    def reset(self) -> None:
+        """Forget local leases, throttles and metrics (Redis state is untouched)."""
+        self._leases.clear()
+        self._blocked.clear()
+        self._metrics.clear()
+        self._redis_retry_at = 0.0
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "leased_keys": len(self._leases),
+            "blocked_keys": len(self._blocked),
+            "redis_available": self._clock() >= self._redis_retry_at,
+            "routes": {route: asdict(metrics) for route, metrics in self._metrics.items()},
+        }
+
 
 # Shared rate limiter instance
 # Use this in all routers instead of creating separate instances
-limiter = Limiter(key_func=get_remote_address)
+limiter = RateLimiter()
+
+
+def get_rate_limit_metrics() -> dict[str, Any]:
+    """Allowed/throttled counters per route and local lease usage."""
+    return limiter.metrics()
@@ -0,0 +1,264 @@
+"""Full-text search helpers for tutor profiles and messages.
+
+Tutor profile text is indexed in ``tutor_profiles.search_vector`` (a weighted
+tsvector backed by the GIN index from migration 032). These helpers build the
+matching predicate, the relevance rank and the vector itself so that every
+search and write path uses the same configuration.
+
+Tutor names live on ``users`` rather than in the vector, so name lookups use a
+prefix match that the trigram indexes from migration 046 can serve.
+
+Message text is indexed in ``messages.search_vector``, backed by per-participant
+GIN indexes from migration 049. Searches are scoped to one user's messages,
+ranked, and return highlighted snippets.
+
+When full-text search is disabled (``TUTOR_FULLTEXT_SEARCH_ENABLED``,
+``MESSAGE_FULLTEXT_SEARCH_ENABLED``) or the database is not PostgreSQL,
+callers fall back to the legacy ``ILIKE`` scan.
+"""
+
+import html
+import re
+
+from sqlalchemy import Float, and_, event, func, inspect, or_, select, union
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from core.config import settings
+
+# Text search configuration used both for building and querying vectors
+SEARCH_CONFIG = "english"
+
+# Profile fields that feed search_vector (see tutor_search_vector for weights)
+SEARCH_VECTOR_FIELDS = ("title", "headline", "bio", "description")
+
+# Only the first words of a query are matched against first/last name
+MAX_NAME_PREFIX_TOKENS = 2
+
+# ts_headline options for message snippets (see render_snippet)
+SNIPPET_OPTIONS = 'StartSel=<mark>, StopSel=</mark>, MinWords=8, MaxWords=24, MaxFragments=2, FragmentDelimiter=" ... "'
+
+# A plain word at the end of a query, expanded to a prefix match
+_TRAILING_WORD = re.compile(r"(?:^|\s)([^\W_]+)$")
+# websearch_to_tsquery's OR operator (case-insensitive, between words)
+_OR_OPERATOR = re.compile(r"\s+or\s+", re.IGNORECASE)
+_SNIPPET_MARK = re.compile(r"(</?mark>)")
+
+
+def _is_postgresql(db: Session) -> bool:
+    bind = db.get_bind()
+    return bind is not None and bind.dialect.name == "postgresql"
+
+
+def fulltext_search_enabled(db: Session) -> bool:
+    """Return True when the tsvector search path can be used for this session."""
+    return settings.TUTOR_FULLTEXT_SEARCH_ENABLED and _is_postgresql(db)
+
+
+def message_fulltext_search_enabled(db: Session) -> bool:
+    """Return True when message search can use ``messages.search_vector``."""
+    return settings.MESSAGE_FULLTEXT_SEARCH_ENABLED and _is_postgresql(db)
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input is matched literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_tsquery(term: str) -> ColumnElement:
+    """Parse free text (quotes, OR, -exclusions) into a tsquery."""
+    return func.websearch_to_tsquery(SEARCH_CONFIG, term)
+
+
+def build_prefix_tsquery(term: str) -> ColumnElement:
+    """
+    Like ``build_tsquery``, but a trailing word also matches longer words.
+
+    Lets search-as-you-type find "calculus" from "calc". Only a plain last
+    word is expanded, not one inside quotes or excluded with "-".
+
+    OR binds looser than the implied AND ("a OR b c" is ``a | (b & c)``), so
+    the prefix is ANDed with the words after the last OR only.
+    """
+    match = _TRAILING_WORD.search(term)
+    if match is None or term.count('"') % 2:
+        return build_tsquery(term)
+    prefix = func.to_tsquery(SEARCH_CONFIG, f"{match.group(1)}:*")
+    head = term[: match.start(1)]
+    split = None
+    for operator in _OR_OPERATOR.finditer(head):
+        if head[: operator.start()].count('"') % 2 == 0:
+            split = operator
+    if split is None:
+        return build_tsquery(head).op("&&")(prefix)
+    last_clause = build_tsquery(head[split.end() :]).op("&&")(prefix)
+    return build_tsquery(head[: split.start()]).op("||")(last_clause)
+
+
+def tutor_search_vector(
+    title: str | None,
+    headline: str | None,
+    bio: str | None,
+    description: str | None,
+) -> ColumnElement:
+    """
+    Build the weighted search vector for a tutor profile.
+
+    Weights match migration 032: title (A), headline (B), bio (C),
+    description (D). Assign the result to ``TutorProfile.search_vector``
+    and it is evaluated by the database on flush.
+    """
+    weighted = [
+        func.setweight(func.to_tsvector(SEARCH_CONFIG, value or ""), weight)
+        for value, weight in ((title, "A"), (headline, "B"), (bio, "C"), (description, "D"))
+    ]
+    vector = weighted[0]
+    for part in weighted[1:]:
+        vector = vector.op("||")(part)
+    return vector
+
+
+def refresh_tutor_search_vector(profile) -> None:
+    """Recompute ``profile.search_vector`` from its current text fields."""
+    profile.search_vector = tutor_search_vector(profile.title, profile.headline, profile.bio, profile.description)
+
+
+def search_vector_needs_refresh(profile) -> bool:
+    """True when a pending flush changes any field that feeds the search vector."""
+    state = inspect(profile)
+    return any(state.attrs[field].history.has_changes() for field in SEARCH_VECTOR_FIELDS)
+
+
+def _refresh_before_insert(mapper, connection, target) -> None:
+    if connection.dialect.name == "postgresql":
+        refresh_tutor_search_vector(target)
+
+
+def _refresh_before_update(mapper, connection, target) -> None:
+    if connection.dialect.name == "postgresql" and search_vector_needs_refresh(target):
+        refresh_tutor_search_vector(target)
+
+
+def register_search_vector_listeners(model) -> None:
+    """
+    Keep ``search_vector`` in sync on every ORM flush of ``model``.
+
+    Covers the repository write paths (``update_about``,
+    ``update_description``) as well as admin edits and seed scripts
+    without relying on database triggers.
+    """
+    event.listen(model, "before_insert", _refresh_before_insert)
+    event.listen(model, "before_update", _refresh_before_update)
+
+
+def name_prefix_filter(term: str, first_name_column, last_name_column) -> ColumnElement | None:
+    """
+    Match query words against the start of first or last names.
+
+    ``ILIKE 'abc%'`` is answered by the ``gin_trgm_ops`` indexes on users.
+    """
+    tokens = [token for token in term.split() if token][:MAX_NAME_PREFIX_TOKENS]
+    if not tokens:
+        return None
+    return and_(
+        *[
+            or_(
+                first_name_column.ilike(f"{escape_like(token)}%", escape="\\"),
+                last_name_column.ilike(f"{escape_like(token)}%", escape="\\"),
+            )
+            for token in tokens
+        ]
+    )
+
+
+def tutor_text_filter(term: str) -> ColumnElement:
+    """
+    Full-text match on profile text OR a name prefix match.
+
+    The two predicates live on different tables, so a plain OR can only be
+    evaluated as a filter on the joined rows (a full scan of both tables).
+    Matching profile ids are instead collected with a UNION, letting each
+    branch use its own index: GIN on ``search_vector`` and the trigram
+    indexes on user names.
+    """
+    # Imported here: models.tutors imports this module to register listeners
+    from models import TutorProfile, User
+
+    text_match = TutorProfile.search_vector.op("@@")(build_tsquery(term))
+    name_match = name_prefix_filter(term, User.first_name, User.last_name)
+    if name_match is None:
+        return text_match
+    matching_ids = union(
+        select(TutorProfile.id).where(text_match),
+        select(TutorProfile.id).join(User, TutorProfile.user_id == User.id).where(name_match),
+    )
+    return TutorProfile.id.in_(matching_ids)
+
+
+def tutor_search_rank(term: str, search_vector_column) -> ColumnElement:
+    """Cover-density rank of the profile text for ``ORDER BY``."""
+    return func.coalesce(func.ts_rank_cd(search_vector_column, build_tsquery(term)), 0)
+
+
+def message_search_vector(text: str | None) -> ColumnElement:
+    """Build the search vector for a message body (evaluated by the database on flush)."""
+    return func.to_tsvector(SEARCH_CONFIG, text or "")
+
+
+def _refresh_message_before_insert(mapper, connection, target) -> None:
+    if connection.dialect.name == "postgresql":
+        target.search_vector = message_search_vector(target.message)
+
+
+def _refresh_message_before_update(mapper, connection, target) -> None:
+    if connection.dialect.name == "postgresql" and inspect(target).attrs.message.history.has_changes():
+        target.search_vector = message_search_vector(target.message)
+
+
+def register_message_search_listeners(model) -> None:
+    """Keep ``Message.search_vector`` in sync with the message text on every ORM flush."""
+    event.listen(model, "before_insert", _refresh_message_before_insert)
+    event.listen(model, "before_update", _refresh_message_before_update)
+
+
+def message_text_filter(user_id: int, tsquery: ColumnElement) -> ColumnElement:
+    """
+    Full-text match on messages sent or received by ``user_id``.
+
+    Each side of the OR pairs the participant with the match so that it is
+    answered by one of the (participant, search_vector) GIN indexes.
+    """
+    from models import Message
+
+    text_match = Message.search_vector.op("@@")(tsquery)
+    return or_(
+        and_(Message.sender_id == user_id, text_match),
+        and_(Message.recipient_id == user_id, text_match),
+    )
+
+
+def message_search_rank(tsquery: ColumnElement) -> ColumnElement:
+    """
+    Cover-density rank of a message for ``ORDER BY``.
+
+    Cast to double precision so a rank read back into Python compares equal
+    to the database value when used as a keyset cursor.
+    """
+    from models import Message
+
+    return func.ts_rank_cd(Message.search_vector, tsquery).cast(Float)
+
+
+def message_snippet(tsquery: ColumnElement) -> ColumnElement:
+    """Excerpt of the message around the matched words; pass through ``render_snippet``."""
+    from models import Message
+
+    return func.ts_headline(SEARCH_CONFIG, Message.message, tsquery, SNIPPET_OPTIONS)
+
+
+def render_snippet(snippet: str | None) -> str | None:
+    """HTML-escape a ``ts_headline`` snippet, keeping only its ``<mark>`` highlights as markup."""
+    if snippet is None:
+        return None
+    parts = _SNIPPET_MARK.split(snippet)
+    return "".join(part if part in ("<mark>", "</mark>") else html.escape(part, quote=False) for part in parts)
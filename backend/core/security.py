@@ -22,7 +22,7 @@ class PasswordHasher:
 
     @staticmethod
     def hash(password: str) -> str:
-        """Hash a password using bcrypt with 12 rounds."""
+        """Hash a password using bcrypt with PASSWORD_BCRYPT_ROUNDS rounds (12 by default)."""
         logger.debug("Hashing password")
         # Bcrypt has a max password length of 72 bytes
         password_bytes = password.encode("utf-8")
@@ -30,7 +30,7 @@ class PasswordHasher:
             logger.warning("Password exceeds 72 bytes, truncating")
             password = password_bytes[:72].decode("utf-8", errors="ignore")
 
-        salt = bcrypt.gensalt(rounds=12)
+        salt = bcrypt.gensalt(rounds=settings.PASSWORD_BCRYPT_ROUNDS)
         hashed = bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
         logger.debug("Password hashed successfully")
         return hashed
@@ -47,6 +47,15 @@ class PasswordHasher:
             logger.warning(f"Password verification failed: {e}")
             return False
 
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        """Whether a bcrypt hash was made with a cost other than PASSWORD_BCRYPT_ROUNDS."""
+        # Format: $2b$<cost>$<salt+hash>
+        parts = hashed_password.split("$")
+        if len(parts) != 4 or not parts[2].isdigit():
+            return False
+        return int(parts[2]) != settings.PASSWORD_BCRYPT_ROUNDS
+
 
 class TokenManager:
     """Handle JWT token creation and validation."""
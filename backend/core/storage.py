@@ -2,23 +2,28 @@
 
 import os
 import secrets
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
 from contextlib import suppress
 from functools import lru_cache
-from io import BytesIO
+from typing import Any
 
 import boto3
 from botocore.client import Config as BotoConfig
 from botocore.exceptions import ClientError
 from fastapi import HTTPException, UploadFile, status
-from PIL import Image, UnidentifiedImageError
-
+from starlette.concurrency import run_in_threadpool
+
+from core.image_processing import (
+    ImageProcessingError,
+    image_workers,
+    normalize_image,
+    render_profile_photo,
+    rendition_keys,
+)
 from core.sanitization import sanitize_filename
 
 MAX_IMAGE_SIZE_BYTES = 5 * 1024 * 1024  # 5 MB
 MAX_DOCUMENT_SIZE_BYTES = 5 * 1024 * 1024  # 5 MB
-MIN_IMAGE_DIMENSION = 300
-MAX_IMAGE_DIMENSION = 4096
 IMAGE_CONTENT_TYPES = {"image/jpeg", "image/png"}
 DOCUMENT_CONTENT_TYPES = IMAGE_CONTENT_TYPES | {"application/pdf"}
 
@@ -138,90 +143,50 @@ def _validate_size(content: bytes, max_bytes: int, message: str) -> None:
 
 def _process_image(content: bytes, *, original_content_type: str) -> tuple[bytes, str, str]:
     """
-    Resize and normalize uploaded image content.
+    Resize and normalize uploaded image content in the calling thread.
 
     Returns:
         Tuple containing processed bytes, resolved content-type, and file extension.
     """
-    format_map = {
-        "image/jpeg": ("JPEG", "jpg", "RGB"),
-        "image/png": ("PNG", "png", "RGBA"),
-    }
-    target_format, extension, target_mode = format_map.get(original_content_type, ("PNG", "png", "RGBA"))
     try:
-        with Image.open(BytesIO(content)) as image:
-            image.load()
-            if target_mode and image.mode != target_mode:
-                image = image.convert(target_mode)
-            width, height = image.size
-            if width <= 0 or height <= 0:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid image dimensions",
-                )
-
-            if width < MIN_IMAGE_DIMENSION or height < MIN_IMAGE_DIMENSION:
-                scale = max(MIN_IMAGE_DIMENSION / width, MIN_IMAGE_DIMENSION / height)
-                new_size = (
-                    max(MIN_IMAGE_DIMENSION, int(round(width * scale))),
-                    max(MIN_IMAGE_DIMENSION, int(round(height * scale))),
-                )
-                image = image.resize(new_size, Image.Resampling.LANCZOS)
-                width, height = image.size
-
-            if width > MAX_IMAGE_DIMENSION or height > MAX_IMAGE_DIMENSION:
-                scale = min(MAX_IMAGE_DIMENSION / width, MAX_IMAGE_DIMENSION / height)
-                new_size = (
-                    max(MIN_IMAGE_DIMENSION, int(round(width * scale))),
-                    max(MIN_IMAGE_DIMENSION, int(round(height * scale))),
-                )
-                image = image.resize(new_size, Image.Resampling.LANCZOS)
-                width, height = image.size
-
-            if width < MIN_IMAGE_DIMENSION or height < MIN_IMAGE_DIMENSION:
-                target_width = max(width, MIN_IMAGE_DIMENSION)
-                target_height = max(height, MIN_IMAGE_DIMENSION)
-                if target_mode == "RGBA":
-                    background_color = (255, 255, 255, 0)
-                elif target_mode == "L":
-                    background_color = 255
-                else:
-                    background_color = (255, 255, 255)
-                canvas = Image.new(
-                    target_mode or image.mode,
-                    (target_width, target_height),
-                    color=background_color,
-                )
-                offset = (
-                    (target_width - width) // 2,
-                    (target_height - height) // 2,
-                )
-                canvas.paste(image, offset)
-                image = canvas
-
-            buffer = BytesIO()
-            save_kwargs = {"optimize": True}
-            if target_format == "JPEG":
-                save_kwargs.update({"quality": 90})
-            image.save(buffer, format=target_format, **save_kwargs)
-            buffer.seek(0)
-            processed = buffer.read()
-    except HTTPException:
-        raise
-    except UnidentifiedImageError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid image file",
-        ) from exc
-    except Exception as exc:  # pragma: no cover - defensive guard
+        image = normalize_image(content, original_content_type)
+    except ImageProcessingError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=exc.detail) from exc
+    return image.content, image.content_type, image.extension
+
+
+async def _render[T](fn: Callable[..., T], *args: Any) -> T:
+    """Run an image pipeline function on the worker pool, mapping bad input to a 400."""
+    try:
+        return await image_workers.run(fn, *args)
+    except ImageProcessingError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=exc.detail) from exc
+
+
+def _put_objects(objects: list[tuple[str, bytes, str]], *, error_detail: str) -> None:
+    """Upload objects in order, removing the ones already written if any upload fails."""
+    _ensure_bucket_exists()
+
+    client = _s3_client()
+    written: list[str] = []
+    try:
+        for key, body, content_type in objects:
+            client.put_object(
+                Bucket=MINIO_BUCKET,
+                Key=key,
+                Body=body,
+                ContentType=content_type,
+            )
+            written.append(key)
+    except ClientError as exc:
+        for key in written:
+            with suppress(ClientError):
+                client.delete_object(Bucket=MINIO_BUCKET, Key=key)
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Failed to process image",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_detail,
         ) from exc
 
-    processed_content_type = "image/jpeg" if target_format == "JPEG" else "image/png"
-    return processed, processed_content_type, extension
-
 
 def _public_url_for_key(key: str) -> str:
     base = MINIO_PUBLIC_ENDPOINT.rstrip("/")
@@ -252,42 +217,30 @@ async def store_profile_photo(
     *,
     existing_url: str | None = None,
 ) -> str:
-    """Store a tutor profile photo and return its public URL."""
+    """
+    Store a tutor profile photo and return the public URL of its original.
+
+    The WebP renditions are stored next to the original; pick one with
+    ``core.image_processing.rendition_key``.
+    """
     if upload.content_type not in IMAGE_CONTENT_TYPES:
         raise HTTPException(status_code=400, detail="Only JPEG and PNG images are supported")
 
     content = await upload.read()
     _validate_size(content, MAX_IMAGE_SIZE_BYTES, "Image exceeds 5 MB limit")
-    processed_content, processed_content_type, extension = _process_image(
-        content, original_content_type=upload.content_type
-    )
-    _validate_size(processed_content, MAX_IMAGE_SIZE_BYTES, "Image exceeds 5 MB limit")
+    original, *renditions = await _render(render_profile_photo, content, upload.content_type)
+    _validate_size(original.content, MAX_IMAGE_SIZE_BYTES, "Image exceeds 5 MB limit")
 
-    key = _build_object_key(
-        "tutor_profiles",
-        str(user_id),
-        "photo",
-        _generate_filename(upload.filename or "photo", forced_extension=extension),
-    )
-    _ensure_bucket_exists()
-
-    client = _s3_client()
-    try:
-        client.put_object(
-            Bucket=MINIO_BUCKET,
-            Key=key,
-            Body=processed_content,
-            ContentType=processed_content_type,
-        )
-    except ClientError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Unable to store profile photo",
-        ) from exc
+    prefix = _build_object_key("tutor_profiles", str(user_id), "photo", secrets.token_hex(16))
+    # The original goes last, so a URL is only handed out once every rendition exists
+    objects = [
+        (f"{prefix}/{image.filename}", image.content, image.content_type) for image in (*renditions, original)
+    ]
+    await run_in_threadpool(_put_objects, objects, error_detail="Unable to store profile photo")
 
-    # Remove old photo after new upload succeeds
-    delete_file(existing_url)
-    return _public_url_for_key(key)
+    # Remove old photo (and its renditions) after new upload succeeds, off the event loop
+    await run_in_threadpool(delete_file, existing_url)
+    return _public_url_for_key(objects[-1][0])
 
 
 async def store_supporting_document(
@@ -309,9 +262,8 @@ async def store_supporting_document(
     processed_content_type = upload.content_type
     forced_extension: str | None = None
     if upload.content_type in IMAGE_CONTENT_TYPES:
-        processed_content, processed_content_type, forced_extension = _process_image(
-            content, original_content_type=upload.content_type
-        )
+        image = await _render(normalize_image, content, upload.content_type)
+        processed_content, processed_content_type, forced_extension = image.content, image.content_type, image.extension
         _validate_size(
             processed_content,
             MAX_DOCUMENT_SIZE_BYTES,
@@ -324,34 +276,25 @@ async def store_supporting_document(
         category,
         _generate_filename(upload.filename or "document", forced_extension=forced_extension),
     )
-    _ensure_bucket_exists()
-
-    client = _s3_client()
-    try:
-        client.put_object(
-            Bucket=MINIO_BUCKET,
-            Key=key,
-            Body=processed_content,
-            ContentType=processed_content_type,
-        )
-    except ClientError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Unable to store supporting document",
-        ) from exc
+    await run_in_threadpool(
+        _put_objects,
+        [(key, processed_content, processed_content_type)],
+        error_detail="Unable to store supporting document",
+    )
 
     return _public_url_for_key(key)
 
 
 def delete_file(public_url: str | None) -> None:
-    """Delete a stored object using its public URL."""
+    """Delete a stored object, and any renditions stored with it, using its public URL."""
     key = _extract_key_from_url(public_url)
     if not key:
         return
 
     client = _s3_client()
-    with suppress(ClientError):
-        client.delete_object(Bucket=MINIO_BUCKET, Key=key)
+    for object_key in rendition_keys(key):
+        with suppress(ClientError):
+            client.delete_object(Bucket=MINIO_BUCKET, Key=object_key)
 
 
 def delete_files(urls: Iterable[str | None]) -> None:
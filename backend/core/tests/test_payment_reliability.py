@@ -1,8 +1,8 @@
 """
 Tests for Payment Reliability Module
 
-Tests circuit breaker, idempotency keys, webhook retry tracking,
-and payment status polling functionality.
+Tests circuit breaker, idempotency keys and payment status polling
+functionality.
 """
 
 import time
@@ -18,13 +18,11 @@ from backend.core.payment_reliability import (
     CircuitState,
     PaymentStatusInfo,
     PaymentStatusPoller,
-    WebhookRetryTracker,
     generate_idempotency_key,
     generate_unique_idempotency_key,
     get_payment_reliability_status,
     handle_stripe_error,
     stripe_circuit_breaker,
-    webhook_retry_tracker,
 )
 
 
@@ -264,126 +262,6 @@ class TestIdempotencyKeys:
         assert key1.startswith("idem_refund_")
 
 
-class TestWebhookRetryTracker:
-    """Test webhook retry tracking."""
-
-    def test_records_first_attempt(self):
-        """Records first webhook attempt."""
-        tracker = WebhookRetryTracker()
-
-        info = tracker.record_attempt(
-            event_id="evt_123",
-            event_type="checkout.session.completed",
-        )
-
-        assert info.event_id == "evt_123"
-        assert info.event_type == "checkout.session.completed"
-        assert info.attempt_count == 1
-        assert info.processed is False
-
-    def test_increments_attempt_count(self):
-        """Increments attempt count on subsequent attempts."""
-        tracker = WebhookRetryTracker()
-
-        tracker.record_attempt("evt_123", "checkout.session.completed")
-        info = tracker.record_attempt("evt_123", "checkout.session.completed")
-
-        assert info.attempt_count == 2
-
-    def test_marks_as_processed(self):
-        """Marks event as processed."""
-        tracker = WebhookRetryTracker()
-
-        tracker.record_attempt("evt_123", "checkout.session.completed")
-        info = tracker.record_attempt(
-            "evt_123",
-            "checkout.session.completed",
-            processed=True,
-        )
-
-        assert info.processed is True
-
-    def test_records_error_message(self):
-        """Records error message."""
-        tracker = WebhookRetryTracker()
-
-        info = tracker.record_attempt(
-            "evt_123",
-            "checkout.session.completed",
-            error_message="Database error",
-        )
-
-        assert info.error_message == "Database error"
-
-    def test_get_retry_info(self):
-        """Gets retry info by event ID."""
-        tracker = WebhookRetryTracker()
-
-        tracker.record_attempt("evt_123", "checkout.session.completed")
-
-        info = tracker.get_retry_info("evt_123")
-        assert info is not None
-        assert info.event_id == "evt_123"
-
-        assert tracker.get_retry_info("evt_nonexistent") is None
-
-    def test_get_problematic_events(self):
-        """Gets events with multiple retry attempts."""
-        tracker = WebhookRetryTracker()
-
-        # Add an event with 3 attempts (not processed)
-        for _ in range(3):
-            tracker.record_attempt("evt_problem", "payment_intent.failed")
-
-        # Add an event with 1 attempt
-        tracker.record_attempt("evt_ok", "checkout.session.completed")
-
-        # Add a processed event with many attempts
-        for _ in range(5):
-            tracker.record_attempt(
-                "evt_processed",
-                "charge.refunded",
-                processed=True,
-            )
-
-        problematic = tracker.get_problematic_events(min_attempts=3)
-
-        assert len(problematic) == 1
-        assert problematic[0].event_id == "evt_problem"
-
-    def test_get_stats(self):
-        """Gets webhook statistics."""
-        tracker = WebhookRetryTracker()
-
-        tracker.record_attempt("evt_1", "type_1", processed=True)
-        tracker.record_attempt("evt_2", "type_2", processed=False)
-        tracker.record_attempt("evt_2", "type_2", processed=False)  # Retry
-
-        stats = tracker.get_stats()
-
-        assert stats["total_events"] == 2
-        assert stats["processed_events"] == 1
-        assert stats["failed_events"] == 1
-        assert stats["retried_events"] == 1
-        assert stats["max_attempts"] == 2
-
-    def test_max_entries_cleanup(self):
-        """Cleans up old entries when at capacity."""
-        tracker = WebhookRetryTracker(max_entries=5)
-
-        # Add 5 entries
-        for i in range(5):
-            tracker.record_attempt(f"evt_{i}", "type")
-
-        assert len(tracker._entries) == 5
-
-        # Add one more - should trigger cleanup
-        tracker.record_attempt("evt_new", "type")
-
-        # Should still have at most max_entries
-        assert len(tracker._entries) <= 5
-
-
 class TestPaymentStatusPoller:
     """Test payment status polling."""
 
@@ -461,11 +339,9 @@ class TestReliabilityStatus:
         status = get_payment_reliability_status()
 
         assert "circuit_breaker" in status
-        assert "webhook_tracker" in status
         assert "timestamp" in status
 
         assert "state" in status["circuit_breaker"]
-        assert "total_events" in status["webhook_tracker"]
 
 
 class TestGlobalInstances:
@@ -475,7 +351,3 @@ class TestGlobalInstances:
         """Global Stripe circuit breaker is available."""
         assert stripe_circuit_breaker is not None
         assert stripe_circuit_breaker.name == "stripe"
-
-    def test_webhook_retry_tracker_exists(self):
-        """Global webhook retry tracker is available."""
-        assert webhook_retry_tracker is not None
@@ -0,0 +1,141 @@
+"""Running lifetime-earnings totals behind the commission tiers.
+
+A tutor's commission tier (core/currency.py) depends on the earnings of their
+completed bookings (``session_state = 'ENDED'`` and ``session_outcome =
+'COMPLETED'``). Summing those bookings on every price calculation grows with
+the tutor's history, so the total is kept on
+``tutor_profiles.lifetime_earnings_cents`` instead:
+
+- ORM flushes of a booking that starts or stops counting (a session ending,
+  an outcome corrected by an admin or dispute, a deleted booking) adjust the
+  total in the same transaction (``register_lifetime_earnings_listeners``)
+- bulk transitions that bypass the ORM (modules/bookings/batch_jobs.py) pass
+  their deltas to ``add_lifetime_earnings``
+- ``reconcile_lifetime_earnings`` recomputes drifted totals from bookings
+  (tasks.payment_tasks, daily), covering writes outside both paths such as
+  cascaded deletes
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+
+from sqlalchemy import column, event, func, select, table, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from core.derived_columns import flushed_values, repair_tutor_profiles, track_previous_values
+
+# Booking columns that decide whether, and how much, a booking counts
+EARNINGS_FIELDS = ("tutor_profile_id", "session_state", "session_outcome", "tutor_earnings_cents")
+
+_tutor_profiles = table("tutor_profiles", column("id"), column("lifetime_earnings_cents"))
+
+
+def counts_toward_tier(session_state: str | None, session_outcome: str | None) -> bool:
+    """True for bookings whose earnings count toward the commission tier."""
+    return session_state == "ENDED" and session_outcome == "COMPLETED"
+
+
+def add_lifetime_earnings(db: Session | Connection, deltas: Mapping[int, int]) -> None:
+    """
+    Add per-tutor earnings deltas to the running totals in the caller's transaction.
+
+    Tutors are updated in id order so concurrent writers lock rows in the same order.
+    """
+    for tutor_profile_id in sorted(deltas):
+        delta = deltas[tutor_profile_id]
+        if tutor_profile_id is None or not delta:
+            continue
+        db.execute(
+            update(_tutor_profiles)
+            .where(_tutor_profiles.c.id == tutor_profile_id)
+            .values(lifetime_earnings_cents=_tutor_profiles.c.lifetime_earnings_cents + delta)
+        )
+
+
+def _counted(values: Mapping[str, object]) -> tuple[int | None, int]:
+    """(tutor_profile_id, earnings counted toward their tier) for a booking's column values."""
+    if counts_toward_tier(values["session_state"], values["session_outcome"]):
+        return values["tutor_profile_id"], values["tutor_earnings_cents"] or 0
+    return values["tutor_profile_id"], 0
+
+
+def _values(connection: Connection, target, *, previous: bool) -> dict[str, object]:
+    return flushed_values(connection, target, EARNINGS_FIELDS, previous=previous)
+
+
+def _apply(connection: Connection, changes: Iterable[tuple[int | None, int]]) -> None:
+    deltas: dict[int, int] = defaultdict(int)
+    for tutor_profile_id, delta in changes:
+        if tutor_profile_id is not None:
+            deltas[tutor_profile_id] += delta
+    add_lifetime_earnings(connection, deltas)
+
+
+def _after_insert(mapper, connection, target) -> None:
+    _apply(connection, [_counted(_values(connection, target, previous=False))])
+
+
+def _after_update(mapper, connection, target) -> None:
+    old_tutor, old_earnings = _counted(_values(connection, target, previous=True))
+    new_tutor, new_earnings = _counted(_values(connection, target, previous=False))
+    if (old_tutor, old_earnings) != (new_tutor, new_earnings):
+        _apply(connection, [(old_tutor, -old_earnings), (new_tutor, new_earnings)])
+
+
+def _before_delete(mapper, connection, target) -> None:
+    tutor_profile_id, earnings = _counted(_values(connection, target, previous=True))
+    _apply(connection, [(tutor_profile_id, -earnings)])
+
+
+def register_lifetime_earnings_listeners(model) -> None:
+    """
+    Keep ``tutor_profiles.lifetime_earnings_cents`` in step with ORM flushes of ``model``.
+
+    The total is adjusted with ``lifetime_earnings_cents + delta`` in the
+    flush's transaction, so it commits or rolls back with the booking.
+    """
+    track_previous_values(model, EARNINGS_FIELDS)
+    event.listen(model, "after_insert", _after_insert)
+    event.listen(model, "after_update", _after_update)
+    event.listen(model, "before_delete", _before_delete)
+
+
+def reconcile_lifetime_earnings(db: Session) -> int:
+    """
+    Reset running totals that drifted from the sum of completed bookings.
+
+    Drifted tutors are found with one aggregate, then each is recomputed by
+    ``repair_tutor_profiles``.
+
+    Returns:
+        Number of tutors whose total was corrected
+    """
+    from models import Booking, TutorProfile
+
+    completed = (Booking.session_state == "ENDED") & (Booking.session_outcome == "COMPLETED")
+    totals = (
+        select(
+            Booking.tutor_profile_id,
+            func.sum(Booking.tutor_earnings_cents).label("total"),
+        )
+        .where(completed)
+        .group_by(Booking.tutor_profile_id)
+        .subquery()
+    )
+    drifted = db.scalars(
+        select(TutorProfile.id)
+        .outerjoin(totals, totals.c.tutor_profile_id == TutorProfile.id)
+        .where(TutorProfile.lifetime_earnings_cents != func.coalesce(totals.c.total, 0))
+        .order_by(TutorProfile.id)
+    ).all()
+
+    def recompute(tutor_profile_id: int) -> dict[str, int]:
+        total = db.scalar(
+            select(func.coalesce(func.sum(Booking.tutor_earnings_cents), 0)).where(
+                Booking.tutor_profile_id == tutor_profile_id, completed
+            )
+        )
+        return {"lifetime_earnings_cents": total}
+
+    return repair_tutor_profiles(db, drifted, recompute)
@@ -0,0 +1,195 @@
+"""Incremental rating aggregates per tutor.
+
+Profile pages, search sorting and the top-rated list read a tutor's review
+count and average from ``tutor_profiles``. Those used to be recomputed with
+AVG/COUNT over all of the tutor's reviews on every new review, and review
+summaries scanned the reviews again for the star histogram. The aggregates
+are now kept on the profile row and adjusted per review:
+
+- ``rating_sum``, ``total_reviews`` and ``rating_1_count`` ..
+  ``rating_5_count`` change by the review's contribution in one
+  ``UPDATE ... SET rating_sum = rating_sum + :delta`` that also derives
+  ``average_rating`` and touches ``updated_at``, so concurrent reviews never
+  lose an update
+- ORM flushes of a review (create, rating change, delete) apply it in the same
+  transaction (``register_rating_listeners``)
+- ``rebuild_rating_aggregates`` recomputes drifted tutors from the reviews
+  (tasks.review_tasks, daily), covering writes outside the ORM such as
+  cascaded deletes
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from decimal import Decimal
+
+from sqlalchemy import TIMESTAMP, Integer, Numeric, case, cast, column, event, func, or_, select, table, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from core.derived_columns import flushed_values, repair_tutor_profiles, track_previous_values
+
+RATING_VALUES = (1, 2, 3, 4, 5)
+
+# Review columns that decide which tutor, and which star bucket, a review counts for
+RATING_FIELDS = ("tutor_profile_id", "rating")
+
+HISTOGRAM_COLUMNS = tuple(f"rating_{value}_count" for value in RATING_VALUES)
+
+_tutor_profiles = table(
+    "tutor_profiles",
+    column("id"),
+    column("rating_sum", Integer),
+    column("total_reviews", Integer),
+    column("average_rating", Numeric(3, 2)),
+    column("updated_at", TIMESTAMP(timezone=True)),
+    *(column(name, Integer) for name in HISTOGRAM_COLUMNS),
+)
+
+
+def average_rating(rating_sum: int | None, total_reviews: int | None) -> Decimal:
+    """Average rounded to two places, as stored in ``tutor_profiles.average_rating``."""
+    if not total_reviews:
+        return Decimal("0.00")
+    return round(Decimal(rating_sum or 0) / Decimal(total_reviews), 2)
+
+
+class _RatingDelta:
+    """Net change of one tutor's aggregates."""
+
+    __slots__ = ("count", "sum", "histogram")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum = 0
+        self.histogram: dict[int, int] = defaultdict(int)
+
+    def add(self, rating: int, sign: int) -> None:
+        self.count += sign
+        self.sum += sign * rating
+        self.histogram[rating] += sign
+
+    def __bool__(self) -> bool:
+        return bool(self.count or self.sum or any(self.histogram.values()))
+
+
+def apply_rating_changes(db: Session | Connection, changes: Iterable[tuple[int | None, int | None, int]]) -> None:
+    """
+    Apply ``(tutor_profile_id, rating, +1/-1)`` changes in the caller's transaction.
+
+    Each tutor gets a single UPDATE; tutors are updated in id order so
+    concurrent writers lock rows in the same order.
+    """
+    deltas: dict[int, _RatingDelta] = defaultdict(_RatingDelta)
+    for tutor_profile_id, rating, sign in changes:
+        if tutor_profile_id is not None and rating in RATING_VALUES:
+            deltas[tutor_profile_id].add(rating, sign)
+
+    for tutor_profile_id in sorted(deltas):
+        delta = deltas[tutor_profile_id]
+        if not delta:
+            continue
+        # SET expressions see the row's previous values, so the average uses the new sum and count
+        new_sum = _tutor_profiles.c.rating_sum + delta.sum
+        new_count = _tutor_profiles.c.total_reviews + delta.count
+        values = {
+            "rating_sum": new_sum,
+            "total_reviews": new_count,
+            "average_rating": case(
+                (new_count > 0, func.round(cast(new_sum, Numeric) / new_count, 2)),
+                else_=0,
+            ),
+            "updated_at": datetime.now(UTC),
+        }
+        for rating, change in delta.histogram.items():
+            if change:
+                name = f"rating_{rating}_count"
+                values[name] = _tutor_profiles.c[name] + change
+        db.execute(update(_tutor_profiles).where(_tutor_profiles.c.id == tutor_profile_id).values(**values))
+
+
+def _values(connection: Connection, target, *, previous: bool) -> tuple[int | None, int | None]:
+    """(tutor_profile_id, rating) of a review."""
+    values = flushed_values(connection, target, RATING_FIELDS, previous=previous)
+    return values["tutor_profile_id"], values["rating"]
+
+
+def _after_insert(mapper, connection, target) -> None:
+    apply_rating_changes(connection, [(*_values(connection, target, previous=False), 1)])
+
+
+def _after_update(mapper, connection, target) -> None:
+    old = _values(connection, target, previous=True)
+    new = _values(connection, target, previous=False)
+    if old != new:
+        apply_rating_changes(connection, [(*old, -1), (*new, 1)])
+
+
+def _before_delete(mapper, connection, target) -> None:
+    apply_rating_changes(connection, [(*_values(connection, target, previous=True), -1)])
+
+
+def register_rating_listeners(model) -> None:
+    """
+    Keep the rating aggregates on ``tutor_profiles`` in step with ORM flushes of ``model``.
+
+    Bulk ``query.delete()``/``query.update()`` bypass these listeners; use
+    ``session.delete`` and attribute assignment for reviews.
+    """
+    track_previous_values(model, RATING_FIELDS)
+    event.listen(model, "after_insert", _after_insert)
+    event.listen(model, "after_update", _after_update)
+    event.listen(model, "before_delete", _before_delete)
+
+
+def rebuild_rating_aggregates(db: Session, tutor_profile_ids: Iterable[int] | None = None) -> int:
+    """
+    Recompute rating aggregates that drifted from the tutors' reviews.
+
+    Compares every stored aggregate, including the average, with the
+    reviews in one query and rebuilds the tutors that differ.
+
+    Args:
+        tutor_profile_ids: Only check these tutors (default: all)
+
+    Returns:
+        Number of tutors whose aggregates were rebuilt
+    """
+    from models import Review, TutorProfile
+
+    def aggregates():
+        return [
+            func.coalesce(func.sum(Review.rating), 0).label("rating_sum"),
+            func.count(Review.id).label("total_reviews"),
+            *(
+                func.count(Review.id).filter(Review.rating == value).label(name)
+                for value, name in zip(RATING_VALUES, HISTOGRAM_COLUMNS, strict=True)
+            ),
+        ]
+
+    totals = select(Review.tutor_profile_id, *aggregates()).group_by(Review.tutor_profile_id).subquery()
+    expected_count = func.coalesce(totals.c.total_reviews, 0)
+    expected_average = func.coalesce(
+        func.round(cast(totals.c.rating_sum, Numeric) / func.nullif(expected_count, 0), 2), 0
+    )
+    drift = [
+        getattr(TutorProfile, name).is_distinct_from(func.coalesce(totals.c[name], 0))
+        for name in ("rating_sum", "total_reviews", *HISTOGRAM_COLUMNS)
+    ]
+    drift.append(TutorProfile.average_rating.is_distinct_from(expected_average))
+    query = (
+        select(TutorProfile.id)
+        .outerjoin(totals, totals.c.tutor_profile_id == TutorProfile.id)
+        .where(or_(*drift))
+        .order_by(TutorProfile.id)
+    )
+    if tutor_profile_ids is not None:
+        query = query.where(TutorProfile.id.in_(list(tutor_profile_ids)))
+
+    def recompute(tutor_profile_id: int) -> dict[str, object]:
+        row = db.execute(select(*aggregates()).where(Review.tutor_profile_id == tutor_profile_id)).one()
+        values = dict(row._mapping)
+        values["average_rating"] = average_rating(values["rating_sum"], values["total_reviews"])
+        return values
+
+    return repair_tutor_profiles(db, db.scalars(query).all(), recompute)
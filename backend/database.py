@@ -3,6 +3,8 @@
 import os
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -22,6 +24,53 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def to_async_url(url: str) -> str:
+    """
+    Convert a sync PostgreSQL URL to its asyncpg equivalent.
+
+    asyncpg does not understand libpq's ``sslmode`` query parameter, so it is
+    renamed to ``ssl`` (which accepts the same values).
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "postgresql":
+        return url
+    query = dict(parsed.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return parsed.set(drivername="postgresql+asyncpg", query=query).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+# Async engine for request paths that must not block the event loop. Created
+# on first use so sync-only processes (workers, scripts) never load asyncpg.
+async_engine: AsyncEngine | None = None
+AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+
+
+def init_async_engine() -> async_sessionmaker[AsyncSession]:
+    """Create the async engine and session factory (same pool sizing as the sync engine)."""
+    global async_engine, AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            pool_pre_ping=True,
+            pool_size=10,
+            max_overflow=20,
+            pool_recycle=3600,
+            pool_timeout=30,
+            echo=False,
+        )
+        AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    return AsyncSessionLocal
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections on shutdown."""
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
 def get_db():
     """Get database session."""
     db = SessionLocal()
@@ -29,3 +78,16 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Get async database session.
+
+    Queries are awaited on the event loop instead of blocking it. Existing
+    sync repository code can run on the same connection through
+    ``await db.run_sync(lambda session: ...)``.
+    """
+    session_factory = AsyncSessionLocal or init_async_engine()
+    async with session_factory() as db:
+        yield db
@@ -1,5 +1,6 @@
 """Main FastAPI application - Student-Tutor Booking Platform MVP."""
 
+import asyncio
 import logging
 import os
 
@@ -23,12 +24,9 @@ tracing_initialized = init_tracing()
 from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
 from fastapi.middleware.gzip import GZipMiddleware  # noqa: E402
 from fastapi.responses import JSONResponse, StreamingResponse  # noqa: E402
-from slowapi.errors import RateLimitExceeded  # noqa: E402
-from slowapi.middleware import SlowAPIMiddleware  # noqa: E402
 from sqlalchemy import func  # noqa: E402
 from sqlalchemy.orm import Session  # noqa: E402
 
-from auth import get_password_hash  # noqa: E402
 from core.config import settings  # noqa: E402
 from core.cors import (  # noqa: E402
     CORSErrorMiddleware,
@@ -37,8 +35,10 @@ from core.cors import (  # noqa: E402
     create_cors_test_response,
 )
 from core.dependencies import get_current_admin_user  # noqa: E402
+from core.image_processing import image_workers  # noqa: E402
 from core.middleware import SecurityHeadersMiddleware  # noqa: E402
-from core.rate_limiting import limiter  # noqa: E402
+from core.password_service import password_service  # noqa: E402
+from core.rate_limiting import RateLimitExceeded, get_rate_limit_metrics, limiter  # noqa: E402
 from core.response_cache import ResponseCacheMiddleware  # noqa: E402
 from core.tracing_middleware import TracingMiddleware  # noqa: E402
 from core.transactions import atomic_operation  # noqa: E402
@@ -148,7 +148,7 @@ async def create_default_users():
 
             admin = User(
                 email=admin_email,
-                hashed_password=get_password_hash(admin_password),
+                hashed_password=await password_service.hash(admin_password),
                 role="admin",
                 is_verified=True,
                 first_name="Admin",
@@ -177,7 +177,7 @@ async def create_default_users():
 
             owner = User(
                 email=owner_email,
-                hashed_password=get_password_hash(owner_password),
+                hashed_password=await password_service.hash(owner_password),
                 role="owner",
                 is_verified=True,
                 first_name="Owner",
@@ -206,7 +206,7 @@ async def create_default_users():
 
             student = User(
                 email=student_email,
-                hashed_password=get_password_hash(student_password),
+                hashed_password=await password_service.hash(student_password),
                 role="student",
                 is_verified=True,
                 first_name="Demo",
@@ -243,7 +243,7 @@ async def create_default_users():
                 # Create user first with student role (will be changed to tutor)
                 tutor = User(
                     email=tutor_email,
-                    hashed_password=get_password_hash(tutor_password),
+                    hashed_password=await password_service.hash(tutor_password),
                     role="student",  # Start as student, then change to tutor
                     is_verified=True,
                     first_name="Demo",
@@ -385,6 +385,12 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"OpenTelemetry instrumentation failed: {e}")
 
+    # 5. Create the message attachments bucket once, in the background
+    # (uploads retry the bootstrap if storage is still unavailable)
+    from core.message_storage import init_message_storage, shutdown_storage_executor
+
+    storage_bootstrap = asyncio.create_task(init_message_storage())
+
     logger.info("Application started successfully")
     yield
     # Shutdown
@@ -404,6 +410,33 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.debug("Error closing feature flags Redis connection: %s", e)
 
+    # Leave the WebSocket cluster (unsubscribe, withdraw presence)
+    try:
+        from modules.messages.websocket import manager as websocket_manager
+        await websocket_manager.shutdown()
+    except Exception as e:
+        logger.debug("Error shutting down WebSocket manager: %s", e)
+
+    # Close pooled outbound HTTP clients (Zoom, Google)
+    try:
+        from core.http_clients import http_clients
+        await http_clients.aclose()
+    except Exception as e:
+        logger.debug("Error closing HTTP clients: %s", e)
+
+    # Close pooled async database connections
+    try:
+        from database import dispose_async_engine
+        await dispose_async_engine()
+    except Exception as e:
+        logger.debug("Error disposing async database engine: %s", e)
+
+    # Stop password hashing and attachment storage threads, and image workers
+    password_service.shutdown()
+    storage_bootstrap.cancel()
+    shutdown_storage_executor()
+    image_workers.shutdown()
+
 
 # OpenAPI Tags Metadata - Comprehensive API documentation structure
 tags_metadata = [
@@ -683,9 +716,6 @@ app.add_middleware(ResponseCacheMiddleware)
 # Add response compression (processes before CORSMiddleware)
 app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=6)
 
-# Add SlowAPI middleware for rate limiting enforcement
-app.add_middleware(SlowAPIMiddleware)
-
 # ============================================================================
 # Register Module Routers - API v1
 # ============================================================================
@@ -990,6 +1020,27 @@ async def check_data_integrity(
         }
 
 
+@app.get(
+    "/api/v1/health/rate-limits",
+    tags=["health"],
+    summary="Rate limiting metrics (admin only)",
+    description="""
+**Rate Limiting Metrics**
+
+Counters for this worker since it started, per rate-limited route:
+- `allowed` / `throttled`: requests admitted and rejected with 429
+- `local_hits`: decisions made from a local lease or a remembered throttle, without Redis
+- `redis_calls` / `redis_errors`: round trips to the shared Redis budget
+- `fallback`: decisions made by the in-memory limiter while Redis was unavailable
+
+**Admin Only** - Requires admin role authentication.
+    """,
+)
+async def rate_limit_metrics(current_user: User = Depends(get_current_admin_user)):
+    """Per-route throttling counters for this worker (admin only)."""
+    return get_rate_limit_metrics()
+
+
 if __name__ == "__main__":
     import uvicorn
 
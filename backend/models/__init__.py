@@ -18,12 +18,12 @@ Usage:
 from . import admin, auth, bookings, messages, notifications, payments, reviews, students, subjects, tutors
 
 # Re-export all models for backward compatibility
-from .admin import AuditLog, Report
+from .admin import AuditLog, DailyMetricsRollup, Report
 from .auth import RegistrationFraudSignal, User, UserProfile
 from .base import Base, JSONEncodedArray
 from .bookings import Booking, SessionMaterial
 from .messages import Conversation, Message, MessageAttachment
-from .notifications import Notification, NotificationAnalytics, NotificationPreferences
+from .notifications import Notification, NotificationAnalytics, NotificationOutbox, NotificationPreferences
 from .payments import (
     Payment,
     Payout,
@@ -85,6 +85,7 @@ __all__ = [
     "Notification",
     "NotificationPreferences",
     "NotificationAnalytics",
+    "NotificationOutbox",
     # Payments
     "Payment",
     "Refund",
@@ -96,4 +97,5 @@ __all__ = [
     # Admin
     "Report",
     "AuditLog",
+    "DailyMetricsRollup",
 ]
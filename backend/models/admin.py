@@ -1,9 +1,12 @@
 """Admin and audit models."""
 
 from sqlalchemy import (
+    DECIMAL,
     TIMESTAMP,
+    BigInteger,
     CheckConstraint,
     Column,
+    Date,
     ForeignKey,
     Integer,
     String,
@@ -70,3 +73,60 @@ class AuditLog(Base):
             name="valid_audit_action",
         ),
     )
+
+
+class DailyMetricsRollup(Base):
+    """
+    Per-day platform metrics for admin and owner dashboards.
+
+    One row per UTC day, keyed by the day the booking, user, review or tutor
+    response was created. Maintained incrementally by
+    modules/admin/infrastructure/metrics_rollup.py; soft-deleted bookings and
+    inactive or soft-deleted users are excluded.
+    """
+
+    __tablename__ = "daily_metrics_rollup"
+
+    day = Column(Date, primary_key=True)
+
+    # Bookings created that day, by current session_state
+    bookings_total = Column(Integer, nullable=False, default=0)
+    bookings_requested = Column(Integer, nullable=False, default=0)
+    bookings_scheduled = Column(Integer, nullable=False, default=0)
+    bookings_active = Column(Integer, nullable=False, default=0)
+    bookings_ended = Column(Integer, nullable=False, default=0)
+    bookings_cancelled = Column(Integer, nullable=False, default=0)
+    bookings_expired = Column(Integer, nullable=False, default=0)
+
+    # ...by session_outcome
+    outcome_completed = Column(Integer, nullable=False, default=0)
+    outcome_no_show_student = Column(Integer, nullable=False, default=0)
+    outcome_no_show_tutor = Column(Integer, nullable=False, default=0)
+    outcome_not_held = Column(Integer, nullable=False, default=0)
+
+    # Sessions (SCHEDULED or ENDED) and their booked duration
+    sessions_total = Column(Integer, nullable=False, default=0)
+    session_minutes = Column(BigInteger, nullable=False, default=0)
+
+    # Revenue from completed sessions
+    revenue_amount = Column(DECIMAL(14, 2), nullable=False, default=0)
+    gmv_cents = Column(BigInteger, nullable=False, default=0)
+    platform_fee_cents = Column(BigInteger, nullable=False, default=0)
+    tutor_earnings_cents = Column(BigInteger, nullable=False, default=0)
+
+    # Active users who signed up that day
+    new_users = Column(Integer, nullable=False, default=0)
+    new_tutors = Column(Integer, nullable=False, default=0)
+    new_students = Column(Integer, nullable=False, default=0)
+
+    # Reviews
+    reviews_total = Column(Integer, nullable=False, default=0)
+    reviews_rating_sum = Column(Integer, nullable=False, default=0)
+    public_reviews_total = Column(Integer, nullable=False, default=0)
+    public_reviews_rating_sum = Column(Integer, nullable=False, default=0)
+
+    # Tutor response times (tutor_response_log)
+    responses_total = Column(Integer, nullable=False, default=0)
+    response_minutes_sum = Column(BigInteger, nullable=False, default=0)
+
+    refreshed_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
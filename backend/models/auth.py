@@ -15,6 +15,8 @@ from sqlalchemy.dialects.postgresql import INET, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
+from core.principal_cache import register_principal_listeners
+
 from .base import Base
 
 
@@ -105,6 +107,10 @@ class User(Base):
     __table_args__ = (CheckConstraint("role IN ('student', 'tutor', 'admin', 'owner')", name="valid_role"),)
 
 
+# Evict cached authentication snapshots when a user's security state changes
+register_principal_listeners(User)
+
+
 class UserProfile(Base):
     """Extended user profile."""
 
@@ -14,6 +14,8 @@ from sqlalchemy import (
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
+from core.tutor_earnings import register_lifetime_earnings_listeners
+
 from .base import Base, JSONType
 
 
@@ -163,6 +165,10 @@ class Booking(Base):
     )
 
 
+# Maintain TutorProfile.lifetime_earnings_cents in application code (no database triggers)
+register_lifetime_earnings_listeners(Booking)
+
+
 class SessionMaterial(Base):
     """Session materials and attachments."""
 
@@ -6,14 +6,18 @@ from sqlalchemy import (
     Boolean,
     Column,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
+from core.search import register_message_search_listeners
+
 from .base import Base
 
 
@@ -23,6 +27,12 @@ class Conversation(Base):
 
     Tracks conversation metadata including unread counts for both participants.
     Each conversation is unique per student-tutor pair (optionally per booking).
+
+    The message inbox is read from this table: ``last_message_id``,
+    ``last_message_at`` and the unread counters are kept current by
+    MessageService as messages are sent, read and deleted. When neither or
+    both users are tutors (e.g. admin messages), the lower user id takes the
+    student slot.
     """
 
     __tablename__ = "conversations"
@@ -48,6 +58,11 @@ class Conversation(Base):
     )
 
     # Activity tracking
+    last_message_id = Column(
+        Integer,
+        ForeignKey("messages.id", ondelete="SET NULL", use_alter=True, name="fk_conversations_last_message"),
+        nullable=True,
+    )
     last_message_at = Column(TIMESTAMP(timezone=True), nullable=True, index=True)
     student_unread_count = Column(Integer, default=0, nullable=False)
     tutor_unread_count = Column(Integer, default=0, nullable=False)
@@ -72,6 +87,18 @@ class Conversation(Base):
             "booking_id",
             name="uq_conversation_participants",
         ),
+        # One conversation per pair and booking, whichever slot each user is in
+        # (the constraint above lets NULL booking_ids repeat)
+        Index(
+            "uq_conversations_pair",
+            func.least(student_id, tutor_id),
+            func.greatest(student_id, tutor_id),
+            func.coalesce(booking_id, 0),
+            unique=True,
+        ),
+        # Inbox: a user's conversations by recent activity
+        Index("idx_conversations_student_activity", student_id, last_message_at.desc()),
+        Index("idx_conversations_tutor_activity", tutor_id, last_message_at.desc()),
     )
 
     # Relationships
@@ -89,6 +116,7 @@ class Conversation(Base):
     messages = relationship(
         "Message",
         back_populates="conversation",
+        foreign_keys="Message.conversation_id",
         cascade="all, delete-orphan",
         order_by="Message.created_at.desc()",
         lazy="dynamic",
@@ -137,6 +165,9 @@ class Message(Base):
         nullable=True,
     )
     attachment_url = Column(String(500), nullable=True)
+    # Full-text vector of the message text (migration 049), maintained on flush.
+    # Deferred so regular message loads don't transfer it.
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
     created_at = Column(
         TIMESTAMP(timezone=True),
         server_default=func.now(),
@@ -150,7 +181,7 @@ class Message(Base):
     )
 
     # Relationships
-    conversation = relationship("Conversation", back_populates="messages")
+    conversation = relationship("Conversation", back_populates="messages", foreign_keys=[conversation_id])
     sender = relationship(
         "User",
         foreign_keys=[sender_id],
@@ -171,6 +202,10 @@ class Message(Base):
     )
 
 
+# Maintain Message.search_vector in application code (no database triggers)
+register_message_search_listeners(Message)
+
+
 class MessageAttachment(Base):
     """Secure file attachments for messages with virus scanning and access control."""
 
@@ -7,13 +7,14 @@ from sqlalchemy import (
     CheckConstraint,
     Column,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     Time,
 )
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 
 from .base import Base
 
@@ -104,3 +105,44 @@ class NotificationAnalytics(Base):
 
     # Relationships
     user = relationship("User")
+
+
+class NotificationOutbox(Base):
+    """
+    Notification deliveries waiting for the outbox worker.
+
+    Written in the same transaction as the notification, so a delivery exists
+    exactly when its notification commits. tasks.notification_tasks drains
+    pending rows (see modules/notifications/infrastructure/outbox.py).
+    """
+
+    __tablename__ = "notification_outbox"
+
+    id = Column(Integer, primary_key=True)
+    notification_id = Column(Integer, ForeignKey("notifications.id", ondelete="CASCADE"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    channel = Column(String(20), nullable=False, default="email")
+    dedupe_key = Column(String(64), nullable=False)  # Same user + content: delivered once
+    payload = Column(JSON, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    delivery_status = Column(String(30))  # EmailDeliveryStatus of the last attempt
+    provider_message_id = Column(String(255))
+    last_error = Column(Text)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    processed_at = Column(TIMESTAMP(timezone=True))
+
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('pending', 'sent', 'failed', 'coalesced')",
+            name="notification_outbox_status_check",
+        ),
+        # Worker claim: due pending rows, oldest first
+        Index(
+            "idx_notification_outbox_due",
+            "next_attempt_at",
+            "id",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
@@ -12,6 +12,7 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -20,10 +21,13 @@ from .base import Base, JSONType
 
 
 class WebhookEvent(Base):
-    """Track processed Stripe webhook events for idempotency.
+    """Stripe webhook events, recorded on receipt and processed by a worker.
 
-    Stripe may deliver webhooks multiple times. This table ensures we only
-    process each event once, preventing duplicate payments/credits.
+    Stripe may deliver webhooks multiple times. The unique stripe_event_id
+    ensures each event is stored and processed once, preventing duplicate
+    payments/credits. Events sharing a partition_key (the payment intent or
+    object they concern) are processed one at a time in Stripe creation order
+    (see modules/payments/infrastructure/webhook_inbox.py).
     """
 
     __tablename__ = "webhook_events"
@@ -31,7 +35,43 @@ class WebhookEvent(Base):
     id = Column(Integer, primary_key=True)
     stripe_event_id = Column(String(255), unique=True, index=True, nullable=False)
     event_type = Column(String(100), nullable=False)
-    processed_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    partition_key = Column(String(255))  # Payment intent or object id; ordering scope
+    payload = Column(JSONType)  # event.data.object as delivered
+    status = Column(String(20), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    last_error = Column(Text)
+    stripe_created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    received_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    processed_at = Column(TIMESTAMP(timezone=True))
+
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('pending', 'processed', 'dead')",
+            name="webhook_events_status_check",
+        ),
+        # Worker claim: pending events, oldest first
+        Index(
+            "idx_webhook_events_pending",
+            "stripe_created_at",
+            "id",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        # Earlier pending event in the same partition (ordering check)
+        Index(
+            "idx_webhook_events_partition_pending",
+            "partition_key",
+            "stripe_created_at",
+            "id",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        # Admin dead-letter listing
+        Index(
+            "idx_webhook_events_dead",
+            "received_at",
+            postgresql_where=text("status = 'dead'"),
+        ),
+    )
 
 
 class SupportedCurrency(Base):
@@ -12,6 +12,8 @@ from sqlalchemy import (
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
+from core.tutor_ratings import register_rating_listeners
+
 from .base import Base, JSONType
 
 
@@ -36,3 +38,7 @@ class Review(Base):
     student = relationship("User", foreign_keys=[student_id])
 
     __table_args__ = (CheckConstraint("rating BETWEEN 1 AND 5", name="valid_rating_value"),)
+
+
+# Maintain the tutor's rating aggregates in application code (no database triggers)
+register_rating_listeners(Review)
@@ -3,19 +3,25 @@
 from sqlalchemy import (
     DECIMAL,
     TIMESTAMP,
+    BigInteger,
     Boolean,
     CheckConstraint,
     Column,
     Date,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     Time,
+    text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
+from core.search import register_search_vector_listeners
+
 from .base import Base, JSONEncodedArray
 
 
@@ -40,9 +46,18 @@ class TutorProfile(Base):
     rejection_reason = Column(Text)
     approved_at = Column(TIMESTAMP(timezone=True))
     approved_by = Column(Integer)  # Admin user ID who approved (no FK to avoid ambiguity)
+    # Review aggregates, kept current by core/tutor_ratings.py
     average_rating = Column(DECIMAL(3, 2), default=0.00)
-    total_reviews = Column(Integer, default=0)
+    total_reviews = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_1_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_2_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_3_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_4_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_5_count = Column(Integer, nullable=False, default=0, server_default="0")
     total_sessions = Column(Integer, default=0)
+    # Earnings of completed bookings, kept current by core/tutor_earnings.py (commission tier input)
+    lifetime_earnings_cents = Column(BigInteger, nullable=False, default=0, server_default="0")
     timezone = Column(String(64), default="UTC")  # Phase 3: Tutor timezone
     currency = Column(String(3), nullable=False, default="USD", server_default="USD")
     # Booking configuration fields (from init.sql schema)
@@ -61,6 +76,9 @@ class TutorProfile(Base):
     stripe_payouts_enabled = Column(Boolean, default=False)
     stripe_onboarding_completed = Column(Boolean, default=False)
     version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Weighted full-text vector (migration 032), maintained by the repository write paths.
+    # Deferred so regular profile loads don't transfer it.
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
     # Video meeting provider preferences
     preferred_video_provider = Column(String(20), default="zoom")  # zoom, google_meet, teams, custom, manual
     custom_meeting_url_template = Column(String(500), nullable=True)  # For Teams/custom providers
@@ -116,9 +134,26 @@ class TutorProfile(Base):
             "profile_status IN ('incomplete', 'pending_approval', 'under_review', 'approved', 'rejected')",
             name="valid_profile_status",
         ),
+        # Commission tier breakdown: range counts over approved tutors
+        Index(
+            "idx_tutor_profiles_lifetime_earnings",
+            "lifetime_earnings_cents",
+            postgresql_where=text("is_approved = TRUE AND deleted_at IS NULL"),
+        ),
+        # Top-rated list and rating sort of public tutors
+        Index(
+            "idx_tutor_profiles_rating",
+            average_rating.desc(),
+            total_reviews.desc(),
+            postgresql_where=text("is_approved = TRUE AND deleted_at IS NULL"),
+        ),
     )
 
 
+# Maintain TutorProfile.search_vector in application code (no database triggers)
+register_search_vector_listeners(TutorProfile)
+
+
 class TutorSubject(Base):
     """Tutor subject specializations."""
 
@@ -0,0 +1,326 @@
+"""
+Daily metrics rollup for admin and owner dashboards.
+
+Dashboards used to aggregate bookings, users and reviews on every request,
+either in Python or with one query per month. The rollup keeps one row per
+UTC day in ``daily_metrics_rollup`` and dashboards answer with a single
+``GROUP BY date_trunc(...)`` over it, so their cost tracks the number of days
+shown rather than the size of the bookings table.
+
+Incremental refresh:
+- Finds the days touched since the last refresh (rows created or updated
+  after the newest ``refreshed_at``, minus a small overlap for transactions
+  that committed late)
+- Recomputes exactly those days from source tables and upserts them
+- A full refresh recomputes every day and drops rows for days with no data
+  (covers hard deletes and review visibility changes)
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from models import DailyMetricsRollup
+
+logger = logging.getLogger(__name__)
+
+# Re-scan window before the last refresh, for rows whose updated_at was set
+# before that refresh started but whose transaction committed after it
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+_DAY = "(created_at AT TIME ZONE 'UTC')::date"
+
+_DIRTY_DAYS_SQL = f"""
+SELECT DISTINCT day FROM (
+    SELECT {_DAY} AS day FROM bookings WHERE updated_at >= :since OR created_at >= :since
+    UNION ALL
+    SELECT {_DAY} FROM users WHERE updated_at >= :since OR created_at >= :since
+    UNION ALL
+    SELECT {_DAY} FROM reviews WHERE created_at >= :since
+    UNION ALL
+    SELECT {_DAY} FROM tutor_response_log WHERE created_at >= :since
+) touched
+WHERE day IS NOT NULL
+"""
+
+_ALL_DAYS_SQL = f"""
+SELECT DISTINCT day FROM (
+    SELECT {_DAY} AS day FROM bookings
+    UNION ALL
+    SELECT {_DAY} FROM users
+    UNION ALL
+    SELECT {_DAY} FROM reviews
+    UNION ALL
+    SELECT {_DAY} FROM tutor_response_log
+) touched
+WHERE day IS NOT NULL
+"""
+
+# Recomputes the given days from source tables. Each source is filtered on its
+# created_at range first (index-friendly), then bucketed by UTC day.
+_REFRESH_SQL = f"""
+WITH days AS (
+    SELECT unnest(CAST(:days AS date[])) AS day
+),
+b AS (
+    SELECT
+        {_DAY} AS day,
+        count(*) AS bookings_total,
+        count(*) FILTER (WHERE session_state = 'REQUESTED') AS bookings_requested,
+        count(*) FILTER (WHERE session_state = 'SCHEDULED') AS bookings_scheduled,
+        count(*) FILTER (WHERE session_state = 'ACTIVE') AS bookings_active,
+        count(*) FILTER (WHERE session_state = 'ENDED') AS bookings_ended,
+        count(*) FILTER (WHERE session_state = 'CANCELLED') AS bookings_cancelled,
+        count(*) FILTER (WHERE session_state = 'EXPIRED') AS bookings_expired,
+        count(*) FILTER (WHERE session_state = 'ENDED' AND session_outcome = 'COMPLETED') AS outcome_completed,
+        count(*) FILTER (WHERE session_outcome = 'NO_SHOW_STUDENT') AS outcome_no_show_student,
+        count(*) FILTER (WHERE session_outcome = 'NO_SHOW_TUTOR') AS outcome_no_show_tutor,
+        count(*) FILTER (WHERE session_outcome = 'NOT_HELD') AS outcome_not_held,
+        count(*) FILTER (WHERE session_state IN ('SCHEDULED', 'ENDED')) AS sessions_total,
+        coalesce(sum(EXTRACT(EPOCH FROM (end_time - start_time)) / 60)
+            FILTER (WHERE session_state IN ('SCHEDULED', 'ENDED')), 0)::bigint AS session_minutes,
+        coalesce(sum(total_amount)
+            FILTER (WHERE session_state = 'ENDED' AND session_outcome = 'COMPLETED'), 0) AS revenue_amount,
+        coalesce(sum(rate_cents)
+            FILTER (WHERE session_state = 'ENDED' AND session_outcome = 'COMPLETED'), 0) AS gmv_cents,
+        coalesce(sum(platform_fee_cents)
+            FILTER (WHERE session_state = 'ENDED' AND session_outcome = 'COMPLETED'), 0) AS platform_fee_cents,
+        coalesce(sum(tutor_earnings_cents)
+            FILTER (WHERE session_state = 'ENDED' AND session_outcome = 'COMPLETED'), 0) AS tutor_earnings_cents
+    FROM bookings
+    WHERE created_at >= :range_start AND created_at < :range_end
+      AND deleted_at IS NULL
+      AND {_DAY} = ANY(CAST(:days AS date[]))
+    GROUP BY 1
+),
+u AS (
+    SELECT
+        {_DAY} AS day,
+        count(*) AS new_users,
+        count(*) FILTER (WHERE role = 'tutor') AS new_tutors,
+        count(*) FILTER (WHERE role = 'student') AS new_students
+    FROM users
+    WHERE created_at >= :range_start AND created_at < :range_end
+      AND is_active IS TRUE AND deleted_at IS NULL
+      AND {_DAY} = ANY(CAST(:days AS date[]))
+    GROUP BY 1
+),
+r AS (
+    SELECT
+        {_DAY} AS day,
+        count(*) AS reviews_total,
+        coalesce(sum(rating), 0) AS reviews_rating_sum,
+        count(*) FILTER (WHERE is_public IS TRUE) AS public_reviews_total,
+        coalesce(sum(rating) FILTER (WHERE is_public IS TRUE), 0) AS public_reviews_rating_sum
+    FROM reviews
+    WHERE created_at >= :range_start AND created_at < :range_end
+      AND {_DAY} = ANY(CAST(:days AS date[]))
+    GROUP BY 1
+),
+t AS (
+    SELECT
+        {_DAY} AS day,
+        count(response_time_minutes) AS responses_total,
+        coalesce(sum(response_time_minutes), 0) AS response_minutes_sum
+    FROM tutor_response_log
+    WHERE created_at >= :range_start AND created_at < :range_end
+      AND {_DAY} = ANY(CAST(:days AS date[]))
+    GROUP BY 1
+)
+INSERT INTO daily_metrics_rollup (
+    day, bookings_total, bookings_requested, bookings_scheduled, bookings_active,
+    bookings_ended, bookings_cancelled, bookings_expired, outcome_completed,
+    outcome_no_show_student, outcome_no_show_tutor, outcome_not_held,
+    sessions_total, session_minutes, revenue_amount, gmv_cents, platform_fee_cents,
+    tutor_earnings_cents, new_users, new_tutors, new_students, reviews_total,
+    reviews_rating_sum, public_reviews_total, public_reviews_rating_sum,
+    responses_total, response_minutes_sum, refreshed_at
+)
+SELECT
+    days.day,
+    coalesce(b.bookings_total, 0), coalesce(b.bookings_requested, 0),
+    coalesce(b.bookings_scheduled, 0), coalesce(b.bookings_active, 0),
+    coalesce(b.bookings_ended, 0), coalesce(b.bookings_cancelled, 0),
+    coalesce(b.bookings_expired, 0), coalesce(b.outcome_completed, 0),
+    coalesce(b.outcome_no_show_student, 0), coalesce(b.outcome_no_show_tutor, 0),
+    coalesce(b.outcome_not_held, 0), coalesce(b.sessions_total, 0),
+    coalesce(b.session_minutes, 0), coalesce(b.revenue_amount, 0),
+    coalesce(b.gmv_cents, 0), coalesce(b.platform_fee_cents, 0),
+    coalesce(b.tutor_earnings_cents, 0), coalesce(u.new_users, 0),
+    coalesce(u.new_tutors, 0), coalesce(u.new_students, 0),
+    coalesce(r.reviews_total, 0), coalesce(r.reviews_rating_sum, 0),
+    coalesce(r.public_reviews_total, 0), coalesce(r.public_reviews_rating_sum, 0),
+    coalesce(t.responses_total, 0), coalesce(t.response_minutes_sum, 0),
+    :refreshed_at
+FROM days
+LEFT JOIN b ON b.day = days.day
+LEFT JOIN u ON u.day = days.day
+LEFT JOIN r ON r.day = days.day
+LEFT JOIN t ON t.day = days.day
+ON CONFLICT (day) DO UPDATE SET
+    bookings_total = EXCLUDED.bookings_total,
+    bookings_requested = EXCLUDED.bookings_requested,
+    bookings_scheduled = EXCLUDED.bookings_scheduled,
+    bookings_active = EXCLUDED.bookings_active,
+    bookings_ended = EXCLUDED.bookings_ended,
+    bookings_cancelled = EXCLUDED.bookings_cancelled,
+    bookings_expired = EXCLUDED.bookings_expired,
+    outcome_completed = EXCLUDED.outcome_completed,
+    outcome_no_show_student = EXCLUDED.outcome_no_show_student,
+    outcome_no_show_tutor = EXCLUDED.outcome_no_show_tutor,
+    outcome_not_held = EXCLUDED.outcome_not_held,
+    sessions_total = EXCLUDED.sessions_total,
+    session_minutes = EXCLUDED.session_minutes,
+    revenue_amount = EXCLUDED.revenue_amount,
+    gmv_cents = EXCLUDED.gmv_cents,
+    platform_fee_cents = EXCLUDED.platform_fee_cents,
+    tutor_earnings_cents = EXCLUDED.tutor_earnings_cents,
+    new_users = EXCLUDED.new_users,
+    new_tutors = EXCLUDED.new_tutors,
+    new_students = EXCLUDED.new_students,
+    reviews_total = EXCLUDED.reviews_total,
+    reviews_rating_sum = EXCLUDED.reviews_rating_sum,
+    public_reviews_total = EXCLUDED.public_reviews_total,
+    public_reviews_rating_sum = EXCLUDED.public_reviews_rating_sum,
+    responses_total = EXCLUDED.responses_total,
+    response_minutes_sum = EXCLUDED.response_minutes_sum,
+    refreshed_at = EXCLUDED.refreshed_at
+"""
+
+# Days recomputed per statement, to bound statement size on full refreshes
+REFRESH_BATCH_DAYS = 92
+
+
+def refresh_daily_metrics(db: Session, *, full: bool = False) -> int:
+    """
+    Bring ``daily_metrics_rollup`` up to date.
+
+    Args:
+        db: SQLAlchemy session (committed on success)
+        full: Recompute every day instead of only days touched since the
+            last refresh
+
+    Returns:
+        Number of days recomputed
+    """
+    refreshed_at = db.execute(text("SELECT now()")).scalar()
+    watermark = None if full else db.execute(select(func.max(DailyMetricsRollup.refreshed_at))).scalar()
+
+    if watermark is None:
+        days = set(db.execute(text(_ALL_DAYS_SQL)).scalars())
+    else:
+        days = set(db.execute(text(_DIRTY_DAYS_SQL), {"since": watermark - WATERMARK_OVERLAP}).scalars())
+    # Always materialize today so dashboards see a fresh row
+    days.add(refreshed_at.astimezone(UTC).date())
+
+    ordered = sorted(days)
+    for start in range(0, len(ordered), REFRESH_BATCH_DAYS):
+        batch = ordered[start : start + REFRESH_BATCH_DAYS]
+        db.execute(
+            text(_REFRESH_SQL),
+            {
+                "days": batch,
+                # Day buckets are UTC; pad the created_at range by a day so
+                # session time zone differences cannot clip the edges
+                "range_start": datetime.combine(batch[0] - timedelta(days=1), datetime.min.time()),
+                "range_end": datetime.combine(batch[-1] + timedelta(days=2), datetime.min.time()),
+                "refreshed_at": refreshed_at,
+            },
+        )
+
+    if full:
+        db.query(DailyMetricsRollup).filter(DailyMetricsRollup.day.notin_(ordered)).delete(
+            synchronize_session=False
+        )
+
+    db.commit()
+    logger.info("Refreshed daily metrics rollup for %d day(s) (full=%s)", len(ordered), full)
+    return len(ordered)
+
+
+# ============================================================================
+# Dashboard reads
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class RollupTotals:
+    """Summed rollup columns over a range of days."""
+
+    bookings_total: int = 0
+    bookings_cancelled: int = 0
+    outcome_completed: int = 0
+    outcome_no_show_student: int = 0
+    outcome_no_show_tutor: int = 0
+    sessions_total: int = 0
+    session_minutes: int = 0
+    revenue_amount: Decimal = Decimal("0")
+    gmv_cents: int = 0
+    platform_fee_cents: int = 0
+    tutor_earnings_cents: int = 0
+    new_users: int = 0
+    new_tutors: int = 0
+    new_students: int = 0
+    reviews_total: int = 0
+    reviews_rating_sum: int = 0
+    public_reviews_total: int = 0
+    public_reviews_rating_sum: int = 0
+    responses_total: int = 0
+    response_minutes_sum: int = 0
+
+    @property
+    def avg_session_minutes(self) -> float:
+        return self.session_minutes / self.sessions_total if self.sessions_total else 0.0
+
+    @property
+    def completion_rate(self) -> float:
+        """Completed sessions as a percentage of SCHEDULED/ENDED sessions."""
+        return self.outcome_completed / self.sessions_total * 100 if self.sessions_total else 0.0
+
+    @property
+    def avg_rating(self) -> float:
+        return self.reviews_rating_sum / self.reviews_total if self.reviews_total else 0.0
+
+    @property
+    def avg_response_minutes(self) -> float | None:
+        return self.response_minutes_sum / self.responses_total if self.responses_total else None
+
+
+_TOTAL_FIELDS = list(RollupTotals.__dataclass_fields__)
+
+
+def _sum_columns():
+    return [func.coalesce(func.sum(getattr(DailyMetricsRollup, name)), 0).label(name) for name in _TOTAL_FIELDS]
+
+
+def _to_totals(row) -> RollupTotals:
+    if row is None:
+        return RollupTotals()
+    values = dict(row._mapping)
+    values.pop("period", None)
+    return RollupTotals(**values)
+
+
+def rollup_totals(db: Session, *, since: date | None = None, until: date | None = None) -> RollupTotals:
+    """Sum rollup rows for days in [since, until) (open-ended when omitted)."""
+    query = select(*_sum_columns())
+    if since is not None:
+        query = query.where(DailyMetricsRollup.day >= since)
+    if until is not None:
+        query = query.where(DailyMetricsRollup.day < until)
+    return _to_totals(db.execute(query).first())
+
+
+def monthly_rollup(db: Session, *, since: date | None = None) -> dict[date, RollupTotals]:
+    """Rollup totals per calendar month, keyed by the first day of the month."""
+    period = func.date_trunc("month", DailyMetricsRollup.day).label("period")
+    query = select(period, *_sum_columns()).group_by(period).order_by(period)
+    if since is not None:
+        query = query.where(DailyMetricsRollup.day >= since)
+    return {row.period.date(): _to_totals(row) for row in db.execute(query)}
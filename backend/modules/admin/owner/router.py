@@ -17,6 +17,7 @@ from core.config import Roles
 from core.dependencies import DatabaseSession, OwnerUser
 from core.soft_delete import filter_active
 from models import Booking, TutorProfile, User
+from modules.admin.infrastructure.metrics_rollup import rollup_totals
 
 router = APIRouter(
     prefix="/owner",
@@ -201,28 +202,15 @@ async def get_commission_tiers(
 
 
 def _calculate_revenue_metrics(db: Session, period_start: datetime, period_days: int) -> RevenueMetrics:
-    """Calculate revenue metrics for the given period."""
+    """Calculate revenue metrics for the given period (whole UTC days, from the rollup)."""
 
-    # Get completed bookings in period
-    bookings = (
-        db.query(Booking)
-        .filter(
-            Booking.session_state == "ENDED",
-            Booking.session_outcome == "COMPLETED",
-            Booking.created_at >= period_start,
-        )
-        .all()
-    )
-
-    total_gmv = sum(b.rate_cents or 0 for b in bookings)
-    total_fees = sum(b.platform_fee_cents or 0 for b in bookings)
-    total_payouts = sum(b.tutor_earnings_cents or 0 for b in bookings)
-    avg_value = total_gmv // len(bookings) if bookings else 0
+    totals = rollup_totals(db, since=period_start.astimezone(UTC).date())
+    avg_value = totals.gmv_cents // totals.outcome_completed if totals.outcome_completed else 0
 
     return RevenueMetrics(
-        total_gmv_cents=total_gmv,
-        total_platform_fees_cents=total_fees,
-        total_tutor_payouts_cents=total_payouts,
+        total_gmv_cents=totals.gmv_cents,
+        total_platform_fees_cents=totals.platform_fee_cents,
+        total_tutor_payouts_cents=totals.tutor_earnings_cents,
         average_booking_value_cents=avg_value,
         period_days=period_days,
     )
@@ -291,57 +279,43 @@ def _calculate_health_metrics(db: Session) -> MarketplaceHealth:
         .count()
     )
 
-    tutors_with_bookings = (
-        filter_active(db.query(func.count(func.distinct(Booking.tutor_profile_id))), Booking)
-        .scalar()
+    # Distinct counts are not additive across days, so they stay on the bookings
+    # table, combined into a single statement
+    tutors_with_bookings_q = filter_active(
+        db.query(func.count(func.distinct(Booking.tutor_profile_id))), Booking
+    ).scalar_subquery()
+    per_student = (
+        filter_active(db.query(Booking.student_id, func.count(Booking.id).label("bookings")), Booking)
+        .group_by(Booking.student_id)
+        .subquery()
     )
+    tutors_with_bookings, total_students_with_bookings, repeat_students = db.query(
+        tutors_with_bookings_q,
+        func.count(per_student.c.student_id),
+        func.count(per_student.c.student_id).filter(per_student.c.bookings > 1),
+    ).one()
 
     tutors_with_bookings_pct = (
         (tutors_with_bookings / approved_tutors * 100) if approved_tutors > 0 else 0
     )
 
     # Repeat booking rate
-    total_students_with_bookings = (
-        filter_active(db.query(func.count(func.distinct(Booking.student_id))), Booking)
-        .scalar()
-    )
-
-    repeat_students = (
-        filter_active(db.query(Booking.student_id), Booking)
-        .group_by(Booking.student_id)
-        .having(func.count(Booking.id) > 1)
-        .count()
-    )
-
     repeat_rate = (
         (repeat_students / total_students_with_bookings * 100)
         if total_students_with_bookings > 0
         else 0
     )
 
-    # Cancellation and no-show rates
-    total_bookings = filter_active(db.query(Booking), Booking).count()
+    # Cancellation, no-show and response time from the daily rollup
+    totals = rollup_totals(db)
+    total_bookings = totals.bookings_total
+    no_shows = totals.outcome_no_show_student + totals.outcome_no_show_tutor
 
-    cancelled = (
-        filter_active(db.query(Booking), Booking)
-        .filter(Booking.session_state == "CANCELLED")
-        .count()
-    )
-
-    no_shows = (
-        filter_active(db.query(Booking), Booking)
-        .filter(Booking.session_outcome.in_(["NO_SHOW_STUDENT", "NO_SHOW_TUTOR"]))
-        .count()
-    )
-
-    cancellation_rate = (cancelled / total_bookings * 100) if total_bookings > 0 else 0
+    cancellation_rate = (totals.bookings_cancelled / total_bookings * 100) if total_bookings > 0 else 0
     no_show_rate = (no_shows / total_bookings * 100) if total_bookings > 0 else 0
 
-    # Calculate average response time from response log
-    from modules.bookings.services.response_tracking import ResponseTrackingService
-
-    response_service = ResponseTrackingService(db)
-    avg_response_time_hours = response_service.get_platform_average_response_time()
+    avg_response_minutes = totals.avg_response_minutes
+    avg_response_time_hours = round(avg_response_minutes / 60, 2) if avg_response_minutes is not None else None
 
     return MarketplaceHealth(
         average_tutor_rating=float(avg_rating or 0),
@@ -355,34 +329,24 @@ def _calculate_health_metrics(db: Session) -> MarketplaceHealth:
 
 def _calculate_commission_tiers(db: Session) -> CommissionTierBreakdown:
     """Calculate distribution of tutors across commission tiers."""
-    from core.currency import get_tutor_lifetime_earnings
-
-    approved_tutors = (
-        db.query(TutorProfile)
+    earnings = TutorProfile.lifetime_earnings_cents
+    # One pass over approved tutors' running totals (idx_tutor_profiles_lifetime_earnings)
+    counts = (
+        db.query(
+            func.count(TutorProfile.id).label("total"),
+            func.count(TutorProfile.id).filter(earnings >= 500_000).label("gold"),  # $5,000+
+            func.count(TutorProfile.id).filter(earnings >= 100_000, earnings < 500_000).label("silver"),  # $1,000+
+        )
         .filter(
             TutorProfile.is_approved.is_(True),
             TutorProfile.deleted_at.is_(None),
         )
-        .all()
+        .one()
     )
 
-    standard = 0  # < $1,000
-    silver = 0  # $1,000 - $4,999
-    gold = 0  # $5,000+
-
-    for tutor in approved_tutors:
-        earnings = get_tutor_lifetime_earnings(db, tutor.id)
-
-        if earnings >= 500_000:  # $5,000+
-            gold += 1
-        elif earnings >= 100_000:  # $1,000+
-            silver += 1
-        else:
-            standard += 1
-
     return CommissionTierBreakdown(
-        standard_tutors=standard,
-        silver_tutors=silver,
-        gold_tutors=gold,
-        total_tutors=len(approved_tutors),
+        standard_tutors=counts.total - counts.silver - counts.gold,  # < $1,000
+        silver_tutors=counts.silver,
+        gold_tutors=counts.gold,
+        total_tutors=counts.total,
     )
@@ -1,21 +1,39 @@
 """Admin API routes."""
 
 import logging
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
+from typing import Literal
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
-from pydantic import BaseModel
-from sqlalchemy import and_, desc, func
+from pydantic import BaseModel, Field
+from sqlalchemy import and_, desc, func, select
 from sqlalchemy.orm import Session, joinedload
+from starlette.concurrency import run_in_threadpool
 
 from core.dependencies import get_current_admin_user
-from core.pagination import PaginatedResponse, PaginationParams
+from core.pagination import (
+    CursorParams,
+    Keyset,
+    PaginatedResponse,
+    PaginationParams,
+    cached_count,
+    decode_cursor,
+    estimated_row_count,
+    split_page,
+)
 from core.rate_limiting import limiter
 from core.sanitization import sanitize_text_input
 from core.transactions import atomic_operation
 from core.utils import StringUtils, paginate
 from database import get_db
-from models import Booking, Notification, Review, Subject, TutorProfile, User
+from models import Booking, Notification, Subject, TutorProfile, User
+from modules.admin.infrastructure.metrics_rollup import RollupTotals, monthly_rollup, rollup_totals
+from modules.notifications.service import (
+    BulkNotificationResult,
+    NotificationDraft,
+    NotificationType,
+    notification_service,
+)
 from modules.users.avatar.schemas import AvatarResponse
 from modules.users.avatar.service import AvatarService
 from schemas import (
@@ -43,6 +61,7 @@ async def list_all_users(
         pattern="^(all|active|inactive)$",
         description="Filter by user status",
     ),
+    cursor_params: CursorParams = Depends(),
     current_user: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ):
@@ -64,6 +83,10 @@ async def list_all_users(
     - `page` (int): Page number (min: 1, default: 1)
     - `page_size` (int): Items per page (min: 1, max: 100, default: 20)
     - `status` (str): Filter by status - "all", "active", or "inactive" (default: "all")
+    - `cursor` (str): Keyset paging - empty for the first page, then `next_cursor`.
+      Replaces `page` and skips the count unless `include_total` is set
+    - `include_total` (bool): In cursor mode, return a cached count (for "all",
+      the planner's row estimate) flagged by `total_is_estimate`
 
     ## Response
     Returns paginated user list with metadata:
@@ -72,6 +95,7 @@ async def list_all_users(
     - `page`: Current page number
     - `page_size`: Items per page
     - `pages`: Total number of pages
+    - `next_cursor`: Cursor for the next page (null on the last page)
 
     ## Rate Limiting
     - **Limit**: 60 requests per minute per IP
@@ -97,7 +121,6 @@ async def list_all_users(
         db.query(User)
         .outerjoin(TutorProfile, User.id == TutorProfile.user_id)
         .filter((User.role != "tutor") | (TutorProfile.id.is_(None)) | (TutorProfile.is_approved.is_(True)))
-        .order_by(User.created_at.desc())
     )
 
     if status == "active":
@@ -105,10 +128,46 @@ async def list_all_users(
     elif status == "inactive":
         query = query.filter(User.is_active.is_(False))
 
+    keyset = Keyset(User.created_at.desc(), User.id.desc())
+    scope = f"admin.users:{status}"
+
     try:
-        result = paginate(query, page=pagination.page, page_size=pagination.page_size)
-        logger.info(f"Admin {current_user.email} listed users (page {page})")
-        return result
+        if not cursor_params.enabled:
+            total = query.count()
+            # The cursor lets clients continue in keyset mode from this page
+            users, next_cursor = split_page(
+                keyset.apply(query).offset(pagination.skip).limit(pagination.page_size + 1).all(),
+                pagination.page_size,
+                scope,
+                key=lambda user: (user.created_at, user.id),
+            )
+            logger.info(f"Admin {current_user.email} listed users (page {page})")
+            return PaginatedResponse.create(users, total, pagination.page, pagination.page_size, next_cursor)
+
+        after = decode_cursor(scope, cursor_params.cursor) if cursor_params.cursor else None
+        total = None
+        if cursor_params.include_total:
+            # The unfiltered list is close to the whole table; skip the count
+            total = estimated_row_count(db, "users") if status == "all" else None
+            if total is None:
+                total = cached_count(db, scope, query.statement)
+        users, next_cursor = split_page(
+            keyset.apply(query, after=after).limit(pagination.page_size + 1).all(),
+            pagination.page_size,
+            scope,
+            key=lambda user: (user.created_at, user.id),
+        )
+        logger.info(f"Admin {current_user.email} listed users (cursor page)")
+        return PaginatedResponse.create_cursor_page(
+            users,
+            pagination.page_size,
+            next_cursor,
+            has_prev=after is not None,
+            total=total,
+            total_is_estimate=total is not None,
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing users: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve users") from e
@@ -543,6 +602,108 @@ async def reject_tutor(
         raise HTTPException(status_code=500, detail="Failed to reject tutor")
 
 
+# ============================================================================
+# Announcements
+# ============================================================================
+
+
+class AnnouncementRequest(BaseModel):
+    """System announcement for every active user of an audience."""
+
+    title: str = Field(..., min_length=1, max_length=255)
+    message: str = Field(..., min_length=1, max_length=5000)
+    link: str | None = Field(None, max_length=500)
+    audience: Literal["all", "students", "tutors"] = "all"
+    send_email: bool = True
+
+
+class AnnouncementResponse(BaseModel):
+    """Announcement delivery summary."""
+
+    recipients: int
+    notifications_created: int
+    emails_queued: int
+    delivered_live: int
+
+
+@router.post("/announcements", response_model=AnnouncementResponse)
+@limiter.limit("5/minute")
+async def send_announcement(
+    request: Request,
+    payload: AnnouncementRequest,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Send a system announcement (admin only).
+
+    Notifications are created in bulk. Like any system_announcement, they
+    only reach users who opted in to marketing notifications (off by
+    default), so ``notifications_created`` can be well below ``recipients``.
+    """
+    title = sanitize_text_input(payload.title, max_length=255)
+    message = sanitize_text_input(payload.message, max_length=5000)
+    if not title or not message:
+        raise HTTPException(status_code=400, detail="Title and message are required")
+
+    query = select(User.id).where(User.is_active.is_(True), User.deleted_at.is_(None))
+    if payload.audience == "students":
+        query = query.where(User.role == "student")
+    elif payload.audience == "tutors":
+        query = query.where(User.role == "tutor")
+
+    def create_notifications() -> tuple[list[int], BulkNotificationResult]:
+        user_ids = list(db.execute(query.order_by(User.id)).scalars().all())
+        result = notification_service.create_notifications_bulk(
+            db,
+            (
+                NotificationDraft(
+                    user_id=user_id,
+                    notification_type=NotificationType.SYSTEM_ANNOUNCEMENT,
+                    title=title,
+                    message=message,
+                    link=payload.link,
+                    action_url=payload.link,
+                    action_label="Learn More" if payload.link else None,
+                    priority=2,
+                    metadata={"announced_by": current_user.id, "audience": payload.audience},
+                )
+                for user_id in user_ids
+            ),
+            send_email=payload.send_email,
+        )
+        db.commit()
+        return user_ids, result
+
+    try:
+        # The inserts and email queueing are blocking; keep them off the event loop
+        user_ids, result = await run_in_threadpool(create_notifications)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error sending announcement: {e}")
+        raise HTTPException(status_code=500, detail="Failed to send announcement")
+
+    # Already committed: a failed live push only means users see it on next load
+    try:
+        delivered_live = await notification_service.broadcast_bulk_notification(
+            result, NotificationType.SYSTEM_ANNOUNCEMENT, title, message, link=payload.link, priority=2
+        )
+    except Exception as e:
+        logger.warning(f"Announcement WebSocket push failed: {e}")
+        delivered_live = 0
+
+    logger.info(
+        f"Admin {current_user.email} sent announcement to {result.created} of {len(user_ids)} "
+        f"{payload.audience} users"
+    )
+    return AnnouncementResponse(
+        recipients=len(user_ids),
+        notifications_created=result.created,
+        emails_queued=result.emails_queued,
+        delivered_live=delivered_live,
+    )
+
+
 # ============================================================================
 # Dashboard Statistics & Analytics
 # ============================================================================
@@ -626,29 +787,20 @@ async def get_dashboard_stats(
             or 0
         )
 
-        # Total sessions (SCHEDULED or completed)
-        total_sessions = (
-            db.query(func.count(Booking.id)).filter(
-                Booking.session_state.in_(["SCHEDULED", "ENDED"])
-            ).scalar() or 0
-        )
-
-        # Revenue (sum of completed bookings)
-        revenue = db.query(func.sum(Booking.total_amount)).filter(
-            Booking.session_state == "ENDED",
-            Booking.session_outcome == "COMPLETED"
-        ).scalar() or 0.0
+        # Sessions, revenue, rating and completion from the daily rollup
+        totals = rollup_totals(db)
+        total_sessions = totals.sessions_total
+        revenue = totals.revenue_amount
 
-        # Average satisfaction (rating)
-        avg_rating = db.query(func.avg(Review.rating)).filter(Review.is_public.is_(True)).scalar() or 0.0
+        # Average satisfaction (public review rating)
+        avg_rating = (
+            totals.public_reviews_rating_sum / totals.public_reviews_total if totals.public_reviews_total else 0.0
+        )
 
         # Completion rate (completed vs all bookings)
-        total_bookings = db.query(func.count(Booking.id)).scalar() or 1
-        completed_bookings = db.query(func.count(Booking.id)).filter(
-            Booking.session_state == "ENDED",
-            Booking.session_outcome == "COMPLETED"
-        ).scalar() or 0
-        completion_rate = (completed_bookings / total_bookings * 100) if total_bookings > 0 else 0
+        completion_rate = (
+            (totals.outcome_completed / totals.bookings_total * 100) if totals.bookings_total > 0 else 0
+        )
 
         logger.info(f"Admin {current_user.email} fetched dashboard stats")
 
@@ -785,71 +937,35 @@ async def get_session_metrics(
     """Get session metrics (admin only)."""
     try:
         # Calculate current month and previous month
-        now = datetime.now(UTC)
-        current_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        current_month_start = datetime.now(UTC).date().replace(day=1)
         previous_month_start = (current_month_start - timedelta(days=1)).replace(day=1)
 
-        # Current month bookings
-        current_bookings = (
-            db.query(Booking)
-            .filter(
-                and_(
-                    Booking.created_at >= current_month_start,
-                    Booking.session_state.in_(["SCHEDULED", "ENDED"]),
-                )
-            )
-            .all()
-        )
-
-        # Previous month bookings
-        previous_bookings = (
-            db.query(Booking)
-            .filter(
-                and_(
-                    Booking.created_at >= previous_month_start,
-                    Booking.created_at < current_month_start,
-                    Booking.session_state.in_(["SCHEDULED", "ENDED"]),
-                )
-            )
-            .all()
-        )
+        # One GROUP BY month over the daily rollup covers both months
+        by_month = monthly_rollup(db, since=previous_month_start)
+        current = by_month.get(current_month_start, RollupTotals())
+        previous = by_month.get(previous_month_start, RollupTotals())
 
         # Average session duration
-        avg_duration_current = calculate_avg_duration(current_bookings)
-        avg_duration_previous = calculate_avg_duration(previous_bookings)
+        avg_duration_current = current.avg_session_minutes
+        avg_duration_previous = previous.avg_session_minutes
         duration_change = avg_duration_current - avg_duration_previous if avg_duration_previous > 0 else 0
 
         # Completion rate
-        total_current = len(current_bookings)
-        completed_current = len([
-            b for b in current_bookings
-            if b.session_state == "ENDED" and b.session_outcome == "COMPLETED"
-        ])
-        completion_rate = (completed_current / total_current * 100) if total_current > 0 else 0
-
-        total_previous = len(previous_bookings)
-        completed_previous = len([
-            b for b in previous_bookings
-            if b.session_state == "ENDED" and b.session_outcome == "COMPLETED"
-        ])
-        completion_rate_previous = (completed_previous / total_previous * 100) if total_previous > 0 else 0
-        completion_change = completion_rate - completion_rate_previous
+        completion_rate = current.completion_rate
+        completion_change = completion_rate - previous.completion_rate
 
         # Average rating
-        current_reviews = db.query(Review).filter(Review.created_at >= current_month_start).all()
-        avg_rating_current = sum(r.rating for r in current_reviews) / len(current_reviews) if current_reviews else 0
-        previous_reviews = (
-            db.query(Review)
-            .filter(
-                and_(
-                    Review.created_at >= previous_month_start,
-                    Review.created_at < current_month_start,
-                )
-            )
-            .all()
+        avg_rating_current = current.avg_rating
+        rating_change = avg_rating_current - previous.avg_rating
+
+        # Tutor response time
+        response_current = current.avg_response_minutes
+        response_previous = previous.avg_response_minutes
+        response_change = (
+            response_current - response_previous
+            if response_current is not None and response_previous is not None
+            else 0.0
         )
-        avg_rating_previous = sum(r.rating for r in previous_reviews) / len(previous_reviews) if previous_reviews else 0
-        rating_change = avg_rating_current - avg_rating_previous
 
         metrics = [
             SessionMetric(
@@ -869,8 +985,8 @@ async def get_session_metrics(
             ),
             SessionMetric(
                 metric="Response Time",
-                value="2.1 min",
-                change="-0.3 min",
+                value=f"{response_current:.1f} min" if response_current is not None else "N/A",
+                change=(f"+{response_change:.1f} min" if response_change >= 0 else f"{response_change:.1f} min"),
             ),
         ]
 
@@ -932,46 +1048,17 @@ async def get_monthly_revenue(
 ):
     """Get monthly revenue and sessions data (admin only)."""
     try:
-        now = datetime.now(UTC)
-        data = []
-
-        for i in range(months - 1, -1, -1):
-            month_start = (now - timedelta(days=30 * i)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(seconds=1)
+        month_starts = recent_month_starts(datetime.now(UTC), months)
+        by_month = monthly_rollup(db, since=month_starts[0])
 
-            revenue = (
-                db.query(func.sum(Booking.total_amount))
-                .filter(
-                    and_(
-                        Booking.created_at >= month_start,
-                        Booking.created_at <= month_end,
-                        Booking.session_state == "ENDED",
-                        Booking.session_outcome == "COMPLETED",
-                    )
-                )
-                .scalar()
-                or 0.0
-            )
-
-            sessions = (
-                db.query(func.count(Booking.id))
-                .filter(
-                    and_(
-                        Booking.created_at >= month_start,
-                        Booking.created_at <= month_end,
-                        Booking.session_state.in_(["SCHEDULED", "ENDED"]),
-                    )
-                )
-                .scalar()
-                or 0
-            )
-
-            month_name = month_start.strftime("%b")
+        data = []
+        for month_start in month_starts:
+            totals = by_month.get(month_start, RollupTotals())
             data.append(
                 MonthlyData(
-                    month=month_name,
-                    revenue=float(revenue),
-                    sessions=sessions,
+                    month=month_start.strftime("%b"),
+                    revenue=float(totals.revenue_amount),
+                    sessions=totals.sessions_total,
                 )
             )
 
@@ -992,43 +1079,17 @@ async def get_user_growth(
 ):
     """Get user growth data (admin only)."""
     try:
-        now = datetime.now(UTC)
-        data = []
-
-        for i in range(months - 1, -1, -1):
-            month_start = (now - timedelta(days=30 * i)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            month_end = (month_start + timedelta(days=32)).replace(day=1)
+        month_starts = recent_month_starts(datetime.now(UTC), months)
+        # Cumulative counts need every month since launch; still one row per month
+        by_month = monthly_rollup(db)
 
-            tutors = (
-                db.query(func.count(User.id))
-                .filter(
-                    and_(
-                        User.role == "tutor",
-                        User.created_at < month_end,
-                        User.is_active.is_(True),
-                    )
-                )
-                .scalar()
-                or 0
-            )
-
-            students = (
-                db.query(func.count(User.id))
-                .filter(
-                    and_(
-                        User.role == "student",
-                        User.created_at < month_end,
-                        User.is_active.is_(True),
-                    )
-                )
-                .scalar()
-                or 0
-            )
-
-            month_name = month_start.strftime("%b")
+        data = []
+        for month_start in month_starts:
+            tutors = sum(t.new_tutors for month, t in by_month.items() if month <= month_start)
+            students = sum(t.new_students for month, t in by_month.items() if month <= month_start)
             data.append(
                 UserGrowthData(
-                    month=month_name,
+                    month=month_start.strftime("%b"),
                     tutors=tutors,
                     students=students,
                 )
@@ -1062,15 +1123,11 @@ def format_time_ago(time_diff: timedelta) -> str:
         return f"{days} day{'s' if days != 1 else ''} ago"
 
 
-def calculate_avg_duration(bookings: list) -> float:
-    """Calculate average duration of bookings in minutes."""
-    if not bookings:
-        return 0.0
-
-    total_minutes = 0
-    for booking in bookings:
-        if booking.start_time and booking.end_time:
-            duration = (booking.end_time - booking.start_time).total_seconds() / 60
-            total_minutes += duration
-
-    return total_minutes / len(bookings) if bookings else 0.0
+def recent_month_starts(now: datetime, months: int) -> list[date]:
+    """First day of each of the last ``months`` calendar months, oldest first."""
+    month_start = now.date().replace(day=1)
+    starts = [month_start]
+    for _ in range(months - 1):
+        month_start = (month_start - timedelta(days=1)).replace(day=1)
+        starts.append(month_start)
+    return starts[::-1]
@@ -8,8 +8,9 @@ from typing import Any
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
-from auth import create_access_token, get_password_hash, verify_password
+from auth import create_access_token
 from core.config import settings
+from core.password_service import password_service
 from core.sanitization import sanitize_email
 from core.security import TokenManager
 from modules.auth.domain.entities import UserEntity
@@ -95,7 +96,7 @@ class AuthService:
         user_entity = UserEntity(
             id=None,
             email=email,
-            hashed_password=get_password_hash(password),
+            hashed_password=password_service.hash_sync(password),
             first_name=first_name.strip() if first_name else None,
             last_name=last_name.strip() if last_name else None,
             role=role,
@@ -118,10 +119,13 @@ class AuthService:
 
         return created_user
 
-    def authenticate_user(self, email: str, password: str) -> dict[str, Any]:
+    async def authenticate_user(self, email: str, password: str) -> dict[str, Any]:
         """
         Authenticate user and generate tokens.
 
+        The password is checked on the password worker pool; a hash made with
+        an outdated bcrypt cost is replaced once the password is verified.
+
         Args:
             email: User email
             password: Plain password
@@ -130,7 +134,8 @@ class AuthService:
             Dictionary with access_token, refresh_token, token_type, and expires_in
 
         Raises:
-            HTTPException: If authentication fails
+            HTTPException: If authentication fails, or 503 if the password
+                pool is saturated
         """
         logger.debug(f"Authenticating user: {email}")
 
@@ -140,7 +145,10 @@ class AuthService:
         # Find user
         user = self.repository.find_by_email(email)
 
-        if not user or not verify_password(password, user.hashed_password):
+        verified, upgraded_hash = (
+            await password_service.verify_and_update(password, user.hashed_password) if user else (False, None)
+        )
+        if not verified:
             logger.warning(f"Failed login attempt for email: {email}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -148,6 +156,9 @@ class AuthService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        if upgraded_hash:
+            self.repository.upgrade_password_hash(user.id, upgraded_hash)
+
         if not user.is_active:
             logger.warning(f"Login attempt for inactive account: {email}")
             raise HTTPException(
@@ -151,6 +151,23 @@ class UserRepository(Protocol):
         """
         ...
 
+    def upgrade_password_hash(
+        self,
+        user_id: int,
+        hashed_password: str,
+    ) -> bool:
+        """
+        Replace a password hash with a rehash of the same password.
+
+        Args:
+            user_id: User ID
+            hashed_password: New hash of the user's current password
+
+        Returns:
+            True if updated, False if user not found
+        """
+        ...
+
     def update_last_login(self, user_id: int) -> bool:
         """
         Update a user's last login timestamp.
@@ -286,6 +286,38 @@ class UserRepositoryImpl:
         logger.info(f"Updated password for user ID {user_id}")
         return True
 
+    def upgrade_password_hash(
+        self,
+        user_id: int,
+        hashed_password: str,
+    ) -> bool:
+        """
+        Replace a password hash with a rehash of the same password.
+
+        Unlike ``update_password`` this keeps ``password_changed_at``, so
+        issued tokens stay valid.
+
+        Args:
+            user_id: User ID
+            hashed_password: New hash of the user's current password
+
+        Returns:
+            True if updated, False if user not found
+        """
+        db_user = (
+            filter_active(self.db.query(User), User)
+            .filter(User.id == user_id)
+            .first()
+        )
+        if not db_user:
+            return False
+
+        db_user.hashed_password = hashed_password
+        self.db.commit()
+
+        logger.info(f"Upgraded password hash for user ID {user_id}")
+        return True
+
     def update_last_login(self, user_id: int) -> bool:
         """
         Update a user's last login timestamp.
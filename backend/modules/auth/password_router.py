@@ -16,7 +16,7 @@ from pydantic import BaseModel, EmailStr, Field
 
 from core.dependencies import DatabaseSession
 from core.email_service import email_service
-from core.security import PasswordHasher
+from core.password_service import password_service
 from core.utils import StringUtils
 from models import User
 
@@ -191,7 +191,7 @@ async def reset_password(
 
     # Update password and track change time for token invalidation
     now = datetime.now(UTC)
-    user.hashed_password = PasswordHasher.hash(request.new_password)
+    user.hashed_password = await password_service.hash(request.new_password)
     user.password_changed_at = now
     user.updated_at = now
     db.commit()
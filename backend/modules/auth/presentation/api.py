@@ -286,7 +286,7 @@ async def login(
         )
 
     try:
-        token_data = service.authenticate_user(
+        token_data = await service.authenticate_user(
             email=email,
             password=form_data.password,
         )
@@ -0,0 +1,348 @@
+"""
+Set-based batch processing for booking auto-transitions.
+
+The per-booking jobs fetch candidate IDs, then lock, transition and commit each
+booking with its own SELECT ... FOR UPDATE NOWAIT round trip. With a backlog of
+thousands of due bookings that is thousands of statements and commits per run.
+
+Batch mode processes the same transitions in chunks:
+1. Claim a chunk of due bookings with SELECT ... FOR UPDATE SKIP LOCKED
+   (rows held by API requests or by another worker are left for the next run)
+2. Apply the BookingStateMachine transition to in-memory snapshots
+3. Write the resulting states with one UPDATE ... RETURNING per distinct
+   outcome in the chunk
+4. Commit the chunk, releasing its locks
+
+Because claims skip locked rows, several workers can process the same job
+concurrently. Sharding on ``id % shard_count`` keeps them off each other's rows
+entirely (see tasks.booking_tasks.process_transition_shard).
+"""
+
+import logging
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from core.tutor_earnings import add_lifetime_earnings, counts_toward_tier
+from models import Booking
+from modules.bookings.domain.state_machine import BookingStateMachine, TransitionResult
+from modules.bookings.domain.status import SessionOutcome, SessionState
+
+logger = logging.getLogger(__name__)
+
+# Columns a lifecycle transition may change; version/updated_at are bumped in SQL
+TRANSITION_FIELDS = ("session_state", "session_outcome", "payment_state", "cancelled_by_role")
+
+
+@dataclass(slots=True)
+class BookingSnapshot:
+    """In-memory stand-in for a claimed booking row.
+
+    Carries only the columns the lifecycle transitions read or write, so the
+    state machine can run without loading (and later flushing) full ORM objects.
+    """
+
+    id: int
+    session_state: str
+    session_outcome: str | None
+    payment_state: str
+    cancelled_by_role: str | None
+    version: int | None
+    tutor_joined_at: datetime | None
+    student_joined_at: datetime | None
+    updated_at: datetime | None = None
+
+    def transition_values(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in TRANSITION_FIELDS}
+
+
+_SNAPSHOT_COLUMNS = [
+    getattr(Booking, f.name) for f in fields(BookingSnapshot) if f.name != "updated_at"
+]
+
+
+@dataclass(frozen=True)
+class BatchTransition:
+    """A lifecycle job expressed as candidate criteria plus a state machine call."""
+
+    name: str
+    criteria: tuple
+    apply: Callable[[BookingSnapshot], TransitionResult]
+
+
+@dataclass
+class BatchRunMetrics:
+    """Throughput counters for one batch run (or one shard of a fanned-out run)."""
+
+    job: str
+    shard_index: int = 0
+    shard_count: int = 1
+    chunk_size: int = 0
+    claimed: int = 0
+    transitioned: int = 0
+    skipped: int = 0
+    errors: int = 0
+    chunks: int = 0
+    outcomes: Counter = field(default_factory=Counter)
+    duration_seconds: float = 0.0
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.duration_seconds <= 0:
+            return 0.0
+        return self.transitioned / self.duration_seconds
+
+    def finish(self) -> "BatchRunMetrics":
+        self.duration_seconds = time.perf_counter() - self._started
+        return self
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "job": self.job,
+            "shard": f"{self.shard_index}/{self.shard_count}",
+            "chunk_size": self.chunk_size,
+            "claimed": self.claimed,
+            "transitioned": self.transitioned,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "chunks": self.chunks,
+            "outcomes": dict(self.outcomes),
+            "duration_ms": round(self.duration_seconds * 1000, 2),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+    def log(self) -> None:
+        if not self.claimed:
+            return
+        logger.info(
+            "Batch %s [shard %d/%d]: transitioned %d of %d claimed in %d chunks "
+            "(skipped %d, errors %d, outcomes %s) in %.1fms, %.1f rows/s",
+            self.job,
+            self.shard_index,
+            self.shard_count,
+            self.transitioned,
+            self.claimed,
+            self.chunks,
+            self.skipped,
+            self.errors,
+            dict(self.outcomes) or "-",
+            self.duration_seconds * 1000,
+            self.rows_per_second,
+        )
+
+
+def expire_requests_transition(cutoff_time: datetime) -> BatchTransition:
+    """REQUESTED -> EXPIRED for requests created before ``cutoff_time``."""
+    return BatchTransition(
+        name="expire_requests",
+        criteria=(
+            Booking.session_state == SessionState.REQUESTED.value,
+            Booking.created_at < cutoff_time,
+        ),
+        apply=BookingStateMachine.expire_booking,
+    )
+
+
+def start_sessions_transition(start_cutoff: datetime) -> BatchTransition:
+    """SCHEDULED -> ACTIVE for sessions starting at or before ``start_cutoff``."""
+    return BatchTransition(
+        name="start_sessions",
+        criteria=(
+            Booking.session_state == SessionState.SCHEDULED.value,
+            Booking.start_time <= start_cutoff,
+        ),
+        apply=BookingStateMachine.start_session,
+    )
+
+
+def end_sessions_transition(
+    grace_cutoff: datetime,
+    outcome_for: Callable[[BookingSnapshot], SessionOutcome] | None = None,
+) -> BatchTransition:
+    """ACTIVE -> ENDED for sessions that ended at or before ``grace_cutoff``.
+
+    ``outcome_for`` picks the outcome per booking (e.g. from attendance);
+    without it every session ends as COMPLETED.
+    """
+
+    def apply(snapshot: BookingSnapshot) -> TransitionResult:
+        outcome = outcome_for(snapshot) if outcome_for else SessionOutcome.COMPLETED
+        return BookingStateMachine.end_session(snapshot, outcome)
+
+    return BatchTransition(
+        name="end_sessions",
+        criteria=(
+            Booking.session_state == SessionState.ACTIVE.value,
+            Booking.end_time <= grace_cutoff,
+        ),
+        apply=apply,
+    )
+
+
+def claim_chunk(
+    db: Session,
+    transition: BatchTransition,
+    *,
+    after_id: int,
+    limit: int,
+    shard_index: int = 0,
+    shard_count: int = 1,
+) -> list[BookingSnapshot]:
+    """Lock and return the next chunk of due bookings, skipping locked rows."""
+    stmt = (
+        select(*_SNAPSHOT_COLUMNS)
+        .where(*transition.criteria, Booking.id > after_id)
+        .order_by(Booking.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    if shard_count > 1:
+        stmt = stmt.where(Booking.id % shard_count == shard_index)
+    return [BookingSnapshot(**row._mapping) for row in db.execute(stmt)]
+
+
+def apply_chunk(
+    db: Session,
+    transition: BatchTransition,
+    snapshots: list[BookingSnapshot],
+    metrics: BatchRunMetrics,
+) -> list[int]:
+    """Run the transition over a claimed chunk and bulk-write the results.
+
+    Bookings that end up with identical column changes share one
+    UPDATE ... RETURNING statement. Bookings that start or stop counting
+    toward their tutor's commission tier adjust the tutor's running earnings
+    total (the ORM listeners do not see bulk updates). Does NOT commit.
+
+    Returns:
+        IDs of the bookings actually updated.
+    """
+    groups: dict[tuple[tuple[str, Any], ...], list[int]] = defaultdict(list)
+    # +1 / -1 for bookings whose earnings start / stop counting toward the tier
+    earnings_sign: dict[int, int] = {}
+    for snapshot in snapshots:
+        before = snapshot.transition_values()
+        result = transition.apply(snapshot)
+        if not result.success:
+            logger.warning(
+                "Batch %s: cannot transition booking %d: %s",
+                transition.name,
+                snapshot.id,
+                result.error_message,
+            )
+            metrics.errors += 1
+            continue
+        if result.already_in_target_state:
+            metrics.skipped += 1
+            continue
+        changes = tuple(
+            (name, value)
+            for name, value in snapshot.transition_values().items()
+            if before[name] != value
+        )
+        groups[changes].append(snapshot.id)
+        sign = int(counts_toward_tier(snapshot.session_state, snapshot.session_outcome)) - int(
+            counts_toward_tier(before["session_state"], before["session_outcome"])
+        )
+        if sign:
+            earnings_sign[snapshot.id] = sign
+
+    updated_ids: list[int] = []
+    earnings_deltas: dict[int, int] = defaultdict(int)
+    updated_at = datetime.utcnow()  # Same clock as BookingStateMachine.increment_version
+    for changes, ids in groups.items():
+        values = dict(changes)
+        stmt = (
+            update(Booking)
+            .where(Booking.id.in_(ids))
+            .values(
+                **values,
+                version=func.coalesce(Booking.version, 1) + 1,
+                updated_at=updated_at,
+            )
+            .returning(Booking.id, Booking.tutor_profile_id, Booking.tutor_earnings_cents)
+            .execution_options(synchronize_session=False)
+        )
+        written = db.execute(stmt).all()
+        updated_ids.extend(row.id for row in written)
+        for row in written:
+            if row.id in earnings_sign:
+                earnings_deltas[row.tutor_profile_id] += earnings_sign[row.id] * (row.tutor_earnings_cents or 0)
+        if values.get("session_outcome"):
+            metrics.outcomes[values["session_outcome"]] += len(written)
+
+    add_lifetime_earnings(db, earnings_deltas)
+    metrics.transitioned += len(updated_ids)
+    return updated_ids
+
+
+def run_batch_transition(
+    db: Session,
+    transition: BatchTransition,
+    *,
+    chunk_size: int,
+    shard_index: int = 0,
+    shard_count: int = 1,
+    max_chunks: int | None = None,
+) -> BatchRunMetrics:
+    """
+    Process every due booking for ``transition`` in chunks of ``chunk_size``.
+
+    Each chunk is claimed, transitioned and committed on its own, so locks are
+    held for one chunk at a time. Claims walk forward by booking ID, which
+    guarantees termination even when some rows fail their transition.
+
+    Args:
+        db: SQLAlchemy session (committed once per chunk)
+        transition: Job definition from one of the ``*_transition`` factories
+        chunk_size: Maximum bookings claimed per chunk
+        shard_index: This worker's shard when fanned out
+        shard_count: Total number of shards (1 = unsharded)
+        max_chunks: Optional cap on chunks processed this run
+
+    Returns:
+        BatchRunMetrics for the run
+    """
+    metrics = BatchRunMetrics(
+        job=transition.name,
+        shard_index=shard_index,
+        shard_count=shard_count,
+        chunk_size=chunk_size,
+    )
+    last_id = 0
+
+    while max_chunks is None or metrics.chunks < max_chunks:
+        snapshots = claim_chunk(
+            db,
+            transition,
+            after_id=last_id,
+            limit=chunk_size,
+            shard_index=shard_index,
+            shard_count=shard_count,
+        )
+        if not snapshots:
+            db.rollback()  # Release the (empty) claim transaction
+            break
+
+        last_id = snapshots[-1].id
+        metrics.chunks += 1
+        metrics.claimed += len(snapshots)
+        try:
+            apply_chunk(db, transition, snapshots, metrics)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        if len(snapshots) < chunk_size:
+            break
+
+    metrics.finish().log()
+    return metrics
@@ -24,6 +24,8 @@ Race Condition Prevention:
 - Uses SELECT FOR UPDATE to acquire row-level locks before state transitions
 - Transitions are idempotent, so concurrent updates don't cause errors
 - Each booking is processed in its own transaction to minimize lock contention
+- Batch mode (BOOKING_JOB_BATCH_SIZE > 0) instead claims chunks with
+  FOR UPDATE SKIP LOCKED and commits per chunk (see modules/bookings/batch_jobs.py)
 
 Multi-Instance Safety:
 - Uses Redis distributed locks to prevent job overlap across server instances
@@ -38,10 +40,17 @@ from sqlalchemy import and_
 from sqlalchemy.exc import OperationalError
 
 from core.clock_skew import get_db_time, get_job_skew_monitor
+from core.config import settings
 from core.distributed_lock import distributed_lock
 from core.tracing import trace_background_job
 from database import SessionLocal
 from models import Booking
+from modules.bookings.batch_jobs import (
+    end_sessions_transition,
+    expire_requests_transition,
+    run_batch_transition,
+    start_sessions_transition,
+)
 from modules.bookings.domain.state_machine import BookingStateMachine
 from modules.bookings.domain.status import SessionOutcome, SessionState
 
@@ -94,6 +103,14 @@ async def expire_requests() -> None:
                 now = get_db_time(db)
                 cutoff_time = now - timedelta(hours=REQUEST_EXPIRY_HOURS)
 
+                if settings.BOOKING_JOB_BATCH_SIZE > 0:
+                    run_batch_transition(
+                        db,
+                        expire_requests_transition(cutoff_time),
+                        chunk_size=settings.BOOKING_JOB_BATCH_SIZE,
+                    )
+                    return
+
                 # Find IDs of REQUESTED bookings created before cutoff
                 # We only fetch IDs first, then lock each one individually
                 booking_ids = (
@@ -205,6 +222,15 @@ async def start_sessions() -> None:
                 # With a 2-minute buffer, the job waits until 10:02:00 to transition,
                 # giving users a grace period to complete their cancellation
                 start_cutoff = now - timedelta(minutes=SESSION_START_BUFFER_MINUTES)
+
+                if settings.BOOKING_JOB_BATCH_SIZE > 0:
+                    run_batch_transition(
+                        db,
+                        start_sessions_transition(start_cutoff),
+                        chunk_size=settings.BOOKING_JOB_BATCH_SIZE,
+                    )
+                    return
+
                 booking_ids = (
                     db.query(Booking.id)
                     .filter(
@@ -351,6 +377,16 @@ async def end_sessions() -> None:
                 now = get_db_time(db)
                 grace_cutoff = now - timedelta(minutes=SESSION_END_GRACE_MINUTES)
 
+                if settings.BOOKING_JOB_BATCH_SIZE > 0:
+                    run_batch_transition(
+                        db,
+                        end_sessions_transition(
+                            grace_cutoff, _determine_session_outcome_from_attendance
+                        ),
+                        chunk_size=settings.BOOKING_JOB_BATCH_SIZE,
+                    )
+                    return
+
                 # Find IDs of ACTIVE bookings where end_time + grace has passed
                 booking_ids = (
                     db.query(Booking.id)
@@ -7,13 +7,17 @@ import logging
 from datetime import UTC, datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 
+from core.avatar_storage import prefetch_avatar_urls
 from core.dependencies import StudentUser, get_current_tutor_profile, get_current_user
+from core.pagination import CursorParams, Keyset, cached_count_async, decode_cursor, split_page
 from core.query_helpers import get_or_404, get_with_options_or_404
 from core.transactions import atomic_operation
-from database import get_db
+from database import get_async_db, get_db
 from models import Booking, TutorProfile, User
 from modules.bookings.domain.state_machine import BookingStateMachine
 from modules.bookings.domain.status import DisputeState, SessionState
@@ -32,6 +36,7 @@ from modules.bookings.schemas import (
     RecordJoinRequest,
 )
 from modules.bookings.service import BookingService, booking_to_dto
+from modules.tutor_profile.application.slot_engine import invalidate_tutor_slots
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +68,7 @@ def _add_booking_cache_headers(response: Response, booking: Booking) -> None:
 
 async def _broadcast_availability_update(tutor_profile_id: int, tutor_user_id: int) -> None:
     """Broadcast availability change to all connected clients."""
+    invalidate_tutor_slots(tutor_profile_id)
     try:
         from modules.messages.websocket import manager
 
@@ -266,8 +272,9 @@ async def list_bookings(
     role: str | None = Query("student", pattern="^(student|tutor)$"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor_params: CursorParams = Depends(),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     List bookings for current user with filtering and pagination.
@@ -275,63 +282,101 @@ async def list_bookings(
     - Students see their bookings as student
     - Tutors see their bookings as tutor
     - Filter by status: upcoming, pending, completed, cancelled
+    - Pass `cursor` (from `next_cursor`) instead of `page` for keyset paging
+
+    Uses the async session so the list query does not block the event loop.
     """
-    query = db.query(Booking).options(
-        joinedload(Booking.tutor_profile).joinedload(TutorProfile.user).joinedload(User.profile),
-        joinedload(Booking.student).joinedload(User.profile),
-        joinedload(Booking.subject),
-    )
+    conditions = []
 
     # Filter by user role
     if current_user.role == "student" or role == "student":
-        query = query.filter(Booking.student_id == current_user.id)
+        conditions.append(Booking.student_id == current_user.id)
     elif current_user.role == "tutor" or role == "tutor":
-        tutor_profile = db.query(TutorProfile).filter(TutorProfile.user_id == current_user.id).first()
-        if not tutor_profile:
+        tutor_profile_id = await db.scalar(select(TutorProfile.id).where(TutorProfile.user_id == current_user.id))
+        if not tutor_profile_id:
             return BookingListResponse(bookings=[], total=0, page=page, page_size=page_size)
-        query = query.filter(Booking.tutor_profile_id == tutor_profile.id)
+        conditions.append(Booking.tutor_profile_id == tutor_profile_id)
 
     # Apply status filter using new session_state field
     if status_filter:
         if status_filter.lower() == "upcoming":
-            query = query.filter(
+            conditions.extend([
                 Booking.session_state.in_([
                     SessionState.REQUESTED.value,
                     SessionState.SCHEDULED.value,
                     SessionState.ACTIVE.value,
                 ]),
                 Booking.start_time >= datetime.utcnow(),
-            )
+            ])
         elif status_filter.lower() == "pending":
-            query = query.filter(Booking.session_state == SessionState.REQUESTED.value)
+            conditions.append(Booking.session_state == SessionState.REQUESTED.value)
         elif status_filter.lower() == "completed":
-            query = query.filter(
+            conditions.extend([
                 Booking.session_state == SessionState.ENDED.value,
                 Booking.session_outcome == "COMPLETED",
-            )
+            ])
         elif status_filter.lower() == "cancelled":
-            query = query.filter(
+            conditions.append(
                 Booking.session_state.in_([
                     SessionState.CANCELLED.value,
                     SessionState.EXPIRED.value,
                 ])
             )
         elif status_filter.lower() == "active":
-            query = query.filter(Booking.session_state == SessionState.ACTIVE.value)
+            conditions.append(Booking.session_state == SessionState.ACTIVE.value)
         elif status_filter.lower() == "scheduled":
-            query = query.filter(Booking.session_state == SessionState.SCHEDULED.value)
+            conditions.append(Booking.session_state == SessionState.SCHEDULED.value)
 
     # Pagination
-    total = query.count()
-    bookings = query.order_by(Booking.start_time.desc()).offset((page - 1) * page_size).limit(page_size).all()
+    keyset = Keyset(Booking.start_time.desc(), Booking.id.desc())
+    scope = f"bookings:{current_user.id}:{role}:{status_filter}"
+    statement = (
+        select(Booking)
+        .options(
+            joinedload(Booking.tutor_profile).joinedload(TutorProfile.user).joinedload(User.profile),
+            joinedload(Booking.student).joinedload(User.profile),
+            joinedload(Booking.subject),
+        )
+        .where(*conditions)
+    )
+    if cursor_params.enabled:
+        after = decode_cursor(scope, cursor_params.cursor) if cursor_params.cursor else None
+        statement = keyset.apply(statement, after=after)
+        total = None
+        if cursor_params.include_total:
+            count_statement = select(Booking.id).where(*conditions)
+            total = await cached_count_async(db, scope, count_statement)
+    else:
+        statement = keyset.apply(statement).offset((page - 1) * page_size)
+        total = await db.scalar(select(func.count()).select_from(Booking).where(*conditions)) or 0
+    result = await db.execute(statement.limit(page_size + 1))
+    bookings, next_cursor = split_page(
+        result.unique().scalars().all(), page_size, scope, key=lambda booking: (booking.start_time, booking.id)
+    )
+
+    # Sign the page's avatars in one pass; booking_to_dto then hits the URL cache
+    prefetch_avatar_urls(
+        (
+            key
+            for booking in bookings
+            for key in (
+                booking.tutor_profile.user.avatar_key if booking.tutor_profile and booking.tutor_profile.user else None,
+                booking.student.avatar_key if booking.student else None,
+            )
+        ),
+        size=80,
+    )
 
-    booking_dtos = [booking_to_dto(booking, db) for booking in bookings]
+    # booking_to_dto may lazy-load relationships, which needs the sync session API
+    booking_dtos = await db.run_sync(lambda session: [booking_to_dto(booking, session) for booking in bookings])
 
     return BookingListResponse(
         bookings=booking_dtos,
         total=total,
-        page=page,
+        page=1 if cursor_params.enabled else page,
         page_size=page_size,
+        next_cursor=next_cursor,
+        total_is_estimate=cursor_params.enabled and total is not None,
     )
 
 
@@ -309,9 +309,11 @@ class BookingListResponse(BaseModel):
     """Paginated list of bookings."""
 
     bookings: list[BookingDTO]
-    total: int
+    total: int | None
     page: int
     page_size: int
+    next_cursor: str | None = None
+    total_is_estimate: bool = False
 
 
 # ============================================================================
@@ -897,6 +897,7 @@ def booking_to_dto(booking: Booking, db: Session) -> BookingDTO:
         avatar_url=build_avatar_url(
             tutor_user.avatar_key if tutor_user else None,
             default=settings.AVATAR_STORAGE_DEFAULT_URL,
+            size=80,
         ),
         rating_avg=tutor_profile.average_rating if tutor_profile else Decimal("0.00"),
         title=booking.tutor_title or (tutor_profile.title if tutor_profile else None),
@@ -922,6 +923,7 @@ def booking_to_dto(booking: Booking, db: Session) -> BookingDTO:
         avatar_url=build_avatar_url(
             student.avatar_key if student else None,
             default=settings.AVATAR_STORAGE_DEFAULT_URL,
+            size=80,
         ),
         level=student_level,
     )
@@ -5,6 +5,7 @@ Handles:
 - OAuth flow for calendar access
 - Calendar connection status
 - Manual event creation/sync
+- Google push notifications (invalidate cached busy times)
 
 Security:
 - OAuth state tokens stored in Redis for multi-instance support
@@ -16,10 +17,11 @@ import logging
 from datetime import UTC, datetime, timedelta
 from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response, status
 from fastapi.responses import RedirectResponse
 from pydantic import BaseModel
 
+from core.calendar_conflict import invalidate_calendar_cache, user_for_watch_token
 from core.config import settings
 from core.dependencies import CurrentUser, DatabaseSession
 from core.google_calendar import google_calendar
@@ -242,6 +244,7 @@ async def disconnect_calendar(
     user.google_calendar_connected_at = None
     user.updated_at = datetime.now(UTC)
     db.commit()
+    await invalidate_calendar_cache(current_user.id)
 
     logger.info(f"User {current_user.id} disconnected Google Calendar")
 
@@ -352,6 +355,7 @@ async def create_booking_event(
     booking.google_calendar_event_id = event_data["event_id"]
     booking.updated_at = datetime.now(UTC)
     db.commit()
+    await _invalidate_booking_calendars(booking)
 
     return CalendarEventResponse(
         event_id=event_data["event_id"],
@@ -413,5 +417,41 @@ async def delete_booking_event(
         booking.google_calendar_event_id = None
         booking.updated_at = datetime.now(UTC)
         db.commit()
+        await _invalidate_booking_calendars(booking)
 
     return {"message": "Calendar event deleted" if success else "Event may have been already deleted"}
+
+
+@router.post(
+    "/notifications",
+    status_code=status.HTTP_204_NO_CONTENT,
+    include_in_schema=False,
+)
+async def calendar_push_notification(
+    x_goog_channel_token: Annotated[str, Header()] = "",
+    x_goog_resource_state: Annotated[str, Header()] = "",
+) -> Response:
+    """
+    Receive Google Calendar push notifications.
+
+    Channels are opened by CalendarConflictService when
+    GOOGLE_CALENDAR_WEBHOOK_URL is set; their token identifies the user
+    whose cached busy times are now stale.
+    """
+    user_id = user_for_watch_token(x_goog_channel_token)
+    if user_id is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Unknown channel")
+
+    # "sync" only confirms a new channel; anything else means events changed
+    if x_goog_resource_state != "sync":
+        await invalidate_calendar_cache(user_id)
+
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+async def _invalidate_booking_calendars(booking: Booking) -> None:
+    """Both participants are invited, so both calendars changed."""
+    if booking.tutor_profile:
+        await invalidate_calendar_cache(booking.tutor_profile.user_id)
+    if booking.student_id:
+        await invalidate_calendar_cache(booking.student_id)
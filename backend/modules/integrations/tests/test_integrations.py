@@ -276,6 +276,47 @@ class TestCalendarBookingEvent:
         assert "No calendar event" in response.json()["detail"]
 
 
+class TestCalendarPushNotifications:
+    """Tests for the Google Calendar push notification webhook."""
+
+    @patch("modules.integrations.calendar_router.invalidate_calendar_cache", new_callable=AsyncMock)
+    def test_change_invalidates_user_cache(self, mock_invalidate, client):
+        """A change notification drops the channel owner's cached busy times."""
+        from core.calendar_conflict import watch_channel_token
+
+        response = client.post(
+            "/api/v1/integrations/calendar/notifications",
+            headers={"X-Goog-Channel-Token": watch_channel_token(42), "X-Goog-Resource-State": "exists"},
+        )
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        mock_invalidate.assert_awaited_once_with(42)
+
+    @patch("modules.integrations.calendar_router.invalidate_calendar_cache", new_callable=AsyncMock)
+    def test_sync_message_is_ignored(self, mock_invalidate, client):
+        """The handshake sent when a channel opens changes nothing."""
+        from core.calendar_conflict import watch_channel_token
+
+        response = client.post(
+            "/api/v1/integrations/calendar/notifications",
+            headers={"X-Goog-Channel-Token": watch_channel_token(42), "X-Goog-Resource-State": "sync"},
+        )
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        mock_invalidate.assert_not_awaited()
+
+    @patch("modules.integrations.calendar_router.invalidate_calendar_cache", new_callable=AsyncMock)
+    def test_forged_token_is_rejected(self, mock_invalidate, client):
+        """Tokens we did not issue are refused."""
+        response = client.post(
+            "/api/v1/integrations/calendar/notifications",
+            headers={"X-Goog-Channel-Token": "42.forged", "X-Goog-Resource-State": "exists"},
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        mock_invalidate.assert_not_awaited()
+
+
 # =============================================================================
 # Zoom Router Tests
 # =============================================================================
@@ -274,20 +274,8 @@ class VideoMeetingService:
     ) -> str | None:
         """Create a Google Calendar event with automatically generated Meet link."""
         try:
-            from google.oauth2.credentials import Credentials
-            from googleapiclient.discovery import build
-
-            from core.config import settings
-
-            credentials = Credentials(
-                token=access_token,
-                refresh_token=refresh_token,
-                token_uri="https://oauth2.googleapis.com/token",
-                client_id=settings.GOOGLE_CLIENT_ID,
-                client_secret=settings.GOOGLE_CLIENT_SECRET,
-            )
-
-            service = build("calendar", "v3", credentials=credentials)
+            from core.calendar_conflict import invalidate_calendar_cache
+            from core.google_calendar import google_calendar
 
             # Build event with conference data request
             tutor_name = booking.tutor_name or "Tutor"
@@ -327,16 +315,18 @@ class VideoMeetingService:
             }
 
             # Create event with conference data
-            created_event = (
-                service.events()
-                .insert(
-                    calendarId="primary",
-                    body=event,
-                    conferenceDataVersion=1,  # Required for Meet link generation
-                    sendUpdates="all",
-                )
-                .execute()
+            created_event = await google_calendar.api_request(
+                access_token,
+                refresh_token,
+                "POST",
+                "/calendars/primary/events",
+                params={
+                    "conferenceDataVersion": 1,  # Required for Meet link generation
+                    "sendUpdates": "all",
+                },
+                json=event,
             )
+            await invalidate_calendar_cache(tutor_profile.user_id)
 
             # Extract Meet link from conference data
             conference_data = created_event.get("conferenceData", {})
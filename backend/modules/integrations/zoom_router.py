@@ -20,6 +20,7 @@ from pydantic import BaseModel
 
 from core.config import settings
 from core.dependencies import AdminUser, CurrentUser, DatabaseSession, TutorUser
+from core.http_clients import http_clients
 from core.rate_limiting import limiter
 from models import Booking
 
@@ -137,31 +138,33 @@ class ZoomClient:
             f"{settings.ZOOM_CLIENT_ID}:{settings.ZOOM_CLIENT_SECRET}".encode()
         ).decode()
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                ZOOM_TOKEN_URL,
-                headers={
-                    "Authorization": f"Basic {credentials}",
-                    "Content-Type": "application/x-www-form-urlencoded",
-                },
-                data={
-                    "grant_type": "account_credentials",
-                    "account_id": settings.ZOOM_ACCOUNT_ID,
-                },
-            )
+        response = await http_clients.request(
+            "zoom",
+            "POST",
+            ZOOM_TOKEN_URL,
+            retry=True,
+            headers={
+                "Authorization": f"Basic {credentials}",
+                "Content-Type": "application/x-www-form-urlencoded",
+            },
+            data={
+                "grant_type": "account_credentials",
+                "account_id": settings.ZOOM_ACCOUNT_ID,
+            },
+        )
 
-            if response.status_code != 200:
-                logger.error(f"Zoom token error: {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail="Failed to authenticate with Zoom",
-                )
+        if response.status_code != 200:
+            logger.error(f"Zoom token error: {response.text}")
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Failed to authenticate with Zoom",
+            )
 
-            data = response.json()
-            self._access_token = data["access_token"]
-            self._token_expires = datetime.now(UTC) + timedelta(seconds=data["expires_in"])
+        data = response.json()
+        self._access_token = data["access_token"]
+        self._token_expires = datetime.now(UTC) + timedelta(seconds=data["expires_in"])
 
-            return self._access_token
+        return self._access_token
 
     async def create_meeting(
         self,
@@ -200,7 +203,8 @@ class ZoomClient:
                 )
             except ZoomError as e:
                 last_error = e
-                if not e.retryable or attempt >= max_retries:
+                # Retries share the zoom retry budget with the pooled client
+                if not e.retryable or attempt >= max_retries or not http_clients.allow_retry("zoom"):
                     logger.error(
                         "Zoom meeting creation failed (attempt %d/%d): %s",
                         attempt + 1,
@@ -263,73 +267,78 @@ class ZoomClient:
         # Use "me" for the authenticated user (Server-to-Server)
         user_id = "me"
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(
-                    f"{ZOOM_API_BASE}/users/{user_id}/meetings",
-                    headers={
-                        "Authorization": f"Bearer {token}",
-                        "Content-Type": "application/json",
-                    },
-                    json=meeting_payload,
-                )
-            except httpx.TimeoutException:
-                raise ZoomServiceError("Zoom API request timed out")
-            except httpx.ConnectError:
-                raise ZoomServiceError("Failed to connect to Zoom API")
-
-            if response.status_code in (200, 201):
-                return response.json()
-
-            # Handle specific error codes
-            if response.status_code == 429:
-                raise ZoomRateLimitError()
-            elif response.status_code == 401:
-                # Clear cached token and retry
-                self._access_token = None
-                self._token_expires = None
-                raise ZoomAuthError()
-            elif response.status_code >= 500:
-                raise ZoomServiceError(f"Zoom server error: {response.status_code}")
-            else:
-                logger.error("Zoom meeting creation error: %s", response.text)
-                raise ZoomError(
-                    f"Failed to create Zoom meeting: {response.text}",
-                    status_code=response.status_code,
-                    retryable=False,
-                )
+        # create_meeting does the retrying, so the pooled client must not
+        try:
+            response = await http_clients.request(
+                "zoom",
+                "POST",
+                f"{ZOOM_API_BASE}/users/{user_id}/meetings",
+                retry=False,
+                headers={
+                    "Authorization": f"Bearer {token}",
+                    "Content-Type": "application/json",
+                },
+                json=meeting_payload,
+            )
+        except httpx.TimeoutException:
+            raise ZoomServiceError("Zoom API request timed out")
+        except httpx.ConnectError:
+            raise ZoomServiceError("Failed to connect to Zoom API")
+
+        if response.status_code in (200, 201):
+            return response.json()
+
+        # Handle specific error codes
+        if response.status_code == 429:
+            raise ZoomRateLimitError()
+        elif response.status_code == 401:
+            # Clear cached token and retry
+            self._access_token = None
+            self._token_expires = None
+            raise ZoomAuthError()
+        elif response.status_code >= 500:
+            raise ZoomServiceError(f"Zoom server error: {response.status_code}")
+        else:
+            logger.error("Zoom meeting creation error: %s", response.text)
+            raise ZoomError(
+                f"Failed to create Zoom meeting: {response.text}",
+                status_code=response.status_code,
+                retryable=False,
+            )
 
     async def get_meeting(self, meeting_id: int) -> dict:
         """Get meeting details."""
 
         token = await self._get_access_token()
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{ZOOM_API_BASE}/meetings/{meeting_id}",
-                headers={"Authorization": f"Bearer {token}"},
-            )
+        response = await http_clients.request(
+            "zoom",
+            "GET",
+            f"{ZOOM_API_BASE}/meetings/{meeting_id}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
 
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Meeting not found",
-                )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Meeting not found",
+            )
 
-            return response.json()
+        return response.json()
 
     async def delete_meeting(self, meeting_id: int) -> bool:
         """Delete a meeting."""
 
         token = await self._get_access_token()
 
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(
-                f"{ZOOM_API_BASE}/meetings/{meeting_id}",
-                headers={"Authorization": f"Bearer {token}"},
-            )
+        response = await http_clients.request(
+            "zoom",
+            "DELETE",
+            f"{ZOOM_API_BASE}/meetings/{meeting_id}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
 
-            return response.status_code == 204
+        return response.status_code == 204
 
 
 # Singleton client
@@ -10,18 +10,20 @@ from datetime import UTC
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from core.avatar_storage import build_avatar_url
 from core.dependencies import CurrentUser
 from core.exceptions import ValidationError
+from core.pagination import CursorParams
 from core.query_helpers import get_by_id_or_404, get_or_404
 from core.message_storage import (
     delete_message_attachment,
     generate_presigned_url,
     store_message_attachment,
 )
-from database import get_db
+from database import get_async_db, get_db
 from models import Message, MessageAttachment
 from modules.messages.service import MessageService
 from modules.messages.websocket import manager
@@ -67,23 +69,31 @@ class MessageThreadResponse(BaseModel):
     unread_count: int
 
 
+class MessageSearchResult(MessageResponse):
+    """Matching message with a highlighted excerpt."""
+
+    snippet: str | None = Field(None, description="HTML-escaped excerpt with matches wrapped in <mark>")
+
+
 class MessageSearchResponse(BaseModel):
     """Search results for messages."""
 
-    messages: list[MessageResponse]
-    total: int
+    messages: list[MessageSearchResult]
+    total: int | None = Field(None, description="Matches (counted up to 1000); null when paging by cursor")
     page: int
     page_size: int
-    total_pages: int
+    total_pages: int | None = None
+    next_cursor: str | None = Field(None, description="Pass as `cursor` for the next page; null on the last page")
 
 
 class PaginatedMessagesResponse(BaseModel):
     """Paginated message list."""
 
     messages: list[MessageResponse]
-    total: int
+    total: int | None = Field(None, description="Exact in page mode; in cursor mode only with include_total")
     page: int
     page_size: int
+    next_cursor: str | None = Field(None, description="Pass as `cursor` for older messages; null at the start")
 
 
 class UnreadCountResponse(BaseModel):
@@ -197,7 +207,7 @@ async def send_message(
 async def list_threads(
     current_user: CurrentUser,
     limit: int = Query(100, ge=1, le=200, description="Maximum threads to return"),
-    service: MessageService = Depends(get_message_service),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get all conversation threads for current user.
@@ -219,9 +229,12 @@ async def list_threads(
     - Optimized query with proper indexing
     - Limited to 200 threads max
     - Includes all relevant metadata
+    - Runs on the async session so it never blocks the event loop
     """
     try:
-        threads = service.get_user_threads(current_user.id, limit=limit)
+        threads = await db.run_sync(
+            lambda session: MessageService(session).get_user_threads(current_user.id, limit=limit)
+        )
 
         return [
             MessageThreadResponse(
@@ -254,6 +267,7 @@ async def get_conversation(
     booking_id: int | None = Query(None, description="Filter by booking context"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Messages per page"),
+    cursor_params: CursorParams = Depends(),
     service: MessageService = Depends(get_message_service),
 ):
     """
@@ -264,11 +278,13 @@ async def get_conversation(
     - `booking_id`: Optional - filter by booking context
     - `page`: Page number (1-indexed)
     - `page_size`: Messages per page (max 100)
+    - `cursor`: Empty for the newest page, then the previous `next_cursor` (replaces page)
+    - `include_total`: Count the conversation in cursor mode
 
     **Returns:**
     - Messages in chronological order (oldest first)
-    - Total message count
-    - Pagination metadata
+    - Total message count (page mode, or cursor mode with include_total)
+    - Pagination metadata and `next_cursor` for older messages
 
     **Use Cases:**
     - Load chat history
@@ -277,20 +293,25 @@ async def get_conversation(
     - Message search within thread
     """
     try:
-        messages, total = service.get_conversation_messages(
+        messages, total, next_cursor = service.get_conversation_messages(
             user1_id=current_user.id,
             user2_id=other_user_id,
             booking_id=booking_id,
             page=page,
             page_size=page_size,
+            cursor=cursor_params.cursor,
+            include_total=cursor_params.include_total,
         )
 
         return PaginatedMessagesResponse(
             messages=messages,
             total=total,
-            page=page,
+            page=1 if cursor_params.enabled else page,
             page_size=page_size,
+            next_cursor=next_cursor,
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching conversation: {e}", exc_info=True)
         raise HTTPException(
@@ -305,19 +326,21 @@ async def search_messages(
     search_query: str = Query(..., min_length=2, description="Search query", alias="q"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=50),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (replaces page)"),
     service: MessageService = Depends(get_message_service),
 ):
     """
     Search user's messages by content.
 
     **Parameters:**
-    - `search_query`: Search query (minimum 2 characters)
+    - `search_query`: Search query (minimum 2 characters, supports "quoted phrases", OR and -exclusions)
     - `page`: Page number
     - `page_size`: Results per page (max 50)
+    - `cursor`: Continue from a previous page's `next_cursor`
 
     **Returns:**
-    - Matching messages (sent or received)
-    - Total match count
+    - Matching messages (sent or received), best matches first, with highlighted snippets
+    - Total match count (page mode only)
     - Pagination metadata
 
     **Use Cases:**
@@ -326,24 +349,32 @@ async def search_messages(
     - Locate booking details
     """
     try:
-        messages, total = service.search_messages(
+        results = service.search_messages(
             user_id=current_user.id,
             search_query=search_query,
             page=page,
             page_size=page_size,
+            cursor=cursor,
         )
 
-        total_pages = (total + page_size - 1) // page_size
+        total = results.total
+        total_pages = (total + page_size - 1) // page_size if total is not None else None
 
         return MessageSearchResponse(
-            messages=messages,
+            messages=[
+                MessageSearchResult.model_validate(hit.message).model_copy(update={"snippet": hit.snippet})
+                for hit in results.hits
+            ],
             total=total,
             page=page,
             page_size=page_size,
             total_pages=total_pages,
+            next_cursor=results.next_cursor,
         )
     except ValidationError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error searching messages: {e}", exc_info=True)
         raise HTTPException(
@@ -700,7 +731,7 @@ async def get_user_basic_info(
             email=user.email,
             first_name=getattr(user, "first_name", None),
             last_name=getattr(user, "last_name", None),
-            avatar_url=build_avatar_url(avatar_key),
+            avatar_url=build_avatar_url(avatar_key, size=80),
             role=user.role,
         )
 
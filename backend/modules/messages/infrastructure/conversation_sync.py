@@ -0,0 +1,174 @@
+"""
+Backfill and consistency repair for the conversation inbox.
+
+The threads endpoint reads ``conversations`` (last message and per-participant
+unread counters) instead of grouping ``messages`` on every request, and
+MessageService keeps those columns current as messages are sent, read and
+deleted. This module covers what it doesn't see:
+
+- ``backfill_conversations`` files messages that have no conversation
+  (written before migration 048, by seed scripts or raw SQL), creating
+  conversations as needed
+- ``repair_conversations`` recomputes the last message and unread counters
+  from ``messages`` and fixes rows that drifted, e.g. after bulk updates
+
+Both are idempotent and run nightly (tasks.message_tasks.sync_conversations).
+"""
+
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 5000
+
+_UNFILED_BATCH = """
+SELECT id FROM messages
+WHERE conversation_id IS NULL
+  AND sender_id IS NOT NULL
+  AND recipient_id IS NOT NULL
+  AND sender_id <> recipient_id
+  AND id > :after_id
+ORDER BY id
+LIMIT :batch_size
+"""
+
+# Slots follow MessageService: a tutor talking to a non-tutor takes the tutor
+# slot, any other pair puts the lower user id in the student slot
+_CREATE_CONVERSATIONS_SQL = f"""
+WITH pairs AS (
+    SELECT
+        LEAST(sender_id, recipient_id) AS low_id,
+        GREATEST(sender_id, recipient_id) AS high_id,
+        booking_id,
+        min(created_at) AS first_message_at
+    FROM messages
+    WHERE id IN ({_UNFILED_BATCH})
+    GROUP BY 1, 2, 3
+)
+INSERT INTO conversations (
+    student_id, tutor_id, booking_id, student_unread_count, tutor_unread_count, created_at, updated_at
+)
+SELECT
+    CASE WHEN low.role = 'tutor' AND high.role <> 'tutor' THEN p.high_id ELSE p.low_id END,
+    CASE WHEN low.role = 'tutor' AND high.role <> 'tutor' THEN p.low_id ELSE p.high_id END,
+    p.booking_id,
+    0,
+    0,
+    p.first_message_at,
+    CURRENT_TIMESTAMP
+FROM pairs p
+JOIN users low ON low.id = p.low_id
+JOIN users high ON high.id = p.high_id
+ON CONFLICT DO NOTHING
+"""
+
+_FILE_MESSAGES_SQL = f"""
+UPDATE messages m
+SET conversation_id = c.id
+FROM conversations c
+WHERE m.id IN ({_UNFILED_BATCH})
+  AND LEAST(c.student_id, c.tutor_id) = LEAST(m.sender_id, m.recipient_id)
+  AND GREATEST(c.student_id, c.tutor_id) = GREATEST(m.sender_id, m.recipient_id)
+  AND COALESCE(c.booking_id, 0) = COALESCE(m.booking_id, 0)
+RETURNING m.id, m.conversation_id
+"""
+
+_REPAIR_SQL = """
+WITH actual AS (
+    SELECT
+        c.id,
+        latest.id AS last_message_id,
+        latest.created_at AS last_message_at,
+        unread.student_unread_count,
+        unread.tutor_unread_count
+    FROM conversations c
+    LEFT JOIN LATERAL (
+        SELECT m.id, m.created_at
+        FROM messages m
+        WHERE m.conversation_id = c.id AND m.deleted_at IS NULL
+        ORDER BY m.created_at DESC, m.id DESC
+        LIMIT 1
+    ) latest ON TRUE
+    CROSS JOIN LATERAL (
+        SELECT
+            count(*) FILTER (WHERE m.recipient_id = c.student_id) AS student_unread_count,
+            count(*) FILTER (WHERE m.recipient_id = c.tutor_id) AS tutor_unread_count
+        FROM messages m
+        WHERE m.conversation_id = c.id AND m.deleted_at IS NULL AND NOT m.is_read
+    ) unread
+    WHERE CAST(:conversation_ids AS integer[]) IS NULL OR c.id = ANY(CAST(:conversation_ids AS integer[]))
+)
+UPDATE conversations c
+SET
+    last_message_id = a.last_message_id,
+    last_message_at = a.last_message_at,
+    student_unread_count = a.student_unread_count,
+    tutor_unread_count = a.tutor_unread_count,
+    updated_at = CURRENT_TIMESTAMP
+FROM actual a
+WHERE c.id = a.id
+  AND (
+    c.last_message_id IS DISTINCT FROM a.last_message_id
+    OR c.last_message_at IS DISTINCT FROM a.last_message_at
+    OR c.student_unread_count <> a.student_unread_count
+    OR c.tutor_unread_count <> a.tutor_unread_count
+  )
+"""
+
+
+def backfill_conversations(db: Session, *, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """
+    File messages without a conversation under one, then repair those conversations.
+
+    Works through unfiled messages in id order, one committed batch at a
+    time. Messages that can't be filed (a participant was deleted, or a
+    message to oneself) are skipped.
+
+    Returns:
+        Number of messages filed
+    """
+    filed = 0
+    after_id = 0
+    while True:
+        params = {"after_id": after_id, "batch_size": batch_size}
+        batch = db.execute(text(_UNFILED_BATCH), params).scalars().all()
+        if not batch:
+            break
+        db.execute(text(_CREATE_CONVERSATIONS_SQL), params)
+        rows = db.execute(text(_FILE_MESSAGES_SQL), params).all()
+        conversation_ids = sorted({row.conversation_id for row in rows})
+        if conversation_ids:
+            _repair(db, conversation_ids)
+        db.commit()
+
+        filed += len(rows)
+        after_id = batch[-1]
+        logger.info(f"Filed {len(rows)} messages under {len(conversation_ids)} conversations (up to id {after_id})")
+
+    return filed
+
+
+def repair_conversations(db: Session, conversation_ids: list[int] | None = None) -> int:
+    """
+    Recompute inbox columns from ``messages`` and fix conversations that drifted.
+
+    Args:
+        conversation_ids: Conversations to check (default: all)
+
+    Returns:
+        Number of conversations corrected
+    """
+    repaired = _repair(db, conversation_ids)
+    db.commit()
+    if repaired:
+        logger.warning(f"Repaired {repaired} conversations whose inbox columns had drifted")
+    return repaired
+
+
+def _repair(db: Session, conversation_ids: list[int] | None) -> int:
+    return db.execute(text(_REPAIR_SQL), {"conversation_ids": conversation_ids}).rowcount
@@ -14,6 +14,13 @@ from datetime import UTC, datetime
 from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
 
+from core.search import (
+    build_prefix_tsquery,
+    escape_like,
+    message_fulltext_search_enabled,
+    message_search_rank,
+    message_text_filter,
+)
 from models.messages import Conversation, Message, MessageAttachment
 from modules.messages.domain.entities import (
     ConversationEntity,
@@ -343,6 +350,9 @@ class MessageRepositoryImpl(MessageRepository):
         """
         Search messages by content for a user.
 
+        Uses the full-text index (best matches first) when available,
+        otherwise a substring scan (newest first).
+
         Args:
             user_id: User to search messages for
             query: Search query string
@@ -352,22 +362,29 @@ class MessageRepositoryImpl(MessageRepository):
         Returns:
             Tuple of (matching messages, total count)
         """
-        search_pattern = f"%{query}%"
-
-        base_query = self.db.query(Message).filter(
-            Message.deleted_at.is_(None),
-            or_(
-                Message.sender_id == user_id,
-                Message.recipient_id == user_id,
-            ),
-            Message.message.ilike(search_pattern),
-        )
+        if message_fulltext_search_enabled(self.db):
+            tsquery = build_prefix_tsquery(query)
+            base_query = self.db.query(Message).filter(
+                Message.deleted_at.is_(None),
+                message_text_filter(user_id, tsquery),
+            )
+            ordering = (message_search_rank(tsquery).desc(), Message.id.desc())
+        else:
+            base_query = self.db.query(Message).filter(
+                Message.deleted_at.is_(None),
+                or_(
+                    Message.sender_id == user_id,
+                    Message.recipient_id == user_id,
+                ),
+                Message.message.ilike(f"%{escape_like(query)}%", escape="\\"),
+            )
+            ordering = (Message.created_at.desc(),)
 
         total = base_query.count()
 
         offset = (page - 1) * page_size
         messages = (
-            base_query.order_by(Message.created_at.desc())
+            base_query.order_by(*ordering)
             .offset(offset)
             .limit(page_size)
             .all()
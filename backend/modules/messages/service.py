@@ -11,17 +11,49 @@ Principles:
 
 import logging
 import re
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import and_, case, func, or_
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, func, literal, or_, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
 
-from core.avatar_storage import build_avatar_url
+from core.avatar_storage import build_avatar_url, prefetch_avatar_urls
 from core.exceptions import ValidationError
-from models import Booking, Message, User
+from core.pagination import Keyset, cached_count, decode_cursor, encode_cursor, split_page
+from core.search import (
+    build_prefix_tsquery,
+    escape_like,
+    message_fulltext_search_enabled,
+    message_search_rank,
+    message_snippet,
+    message_text_filter,
+    render_snippet,
+)
+from models import Booking, Conversation, Message, User
 
 logger = logging.getLogger(__name__)
 
+# Search totals are counted up to this many matches
+SEARCH_COUNT_LIMIT = 1000
+
+
+@dataclass
+class MessageSearchHit:
+    """A matching message with its highlighted excerpt (None without full-text search)."""
+
+    message: Message
+    snippet: str | None
+
+
+@dataclass
+class MessageSearchPage:
+    """One page of search results; ``next_cursor`` is None on the last page."""
+
+    hits: list[MessageSearchHit]
+    total: int | None
+    next_cursor: str | None
+
 
 class MessageService:
     """
@@ -121,12 +153,19 @@ class MessageService:
         )
 
         try:
-            # Set updated_at explicitly (no DB triggers - all logic in code)
-            from datetime import datetime
-
-            message.updated_at = datetime.now(UTC)
-
+            # Set timestamps explicitly (no DB triggers - all logic in code)
+            now = datetime.now(UTC)
+            message.created_at = now
+            message.updated_at = now
+
+            # 6. File under the conversation and update its inbox columns
+            message.conversation_id = self._get_or_create_conversation_id(
+                sender_id, recipient_id, booking_id, recipient_role=recipient.role
+            )
             self.db.add(message)
+            self.db.flush()
+            self._record_new_message(message)
+
             self.db.commit()
             self.db.refresh(message)
 
@@ -150,14 +189,20 @@ class MessageService:
         booking_id: int | None = None,
         page: int = 1,
         page_size: int = 50,
-    ) -> tuple[list[Message], int]:
+        cursor: str | None = None,
+        include_total: bool = False,
+    ) -> tuple[list[Message], int | None, str | None]:
         """
-        Get messages between two users with pagination.
+        Get messages between two users with pagination, newest page first.
+
+        Pages by ``page`` (with an exact total) or, when ``cursor`` is not
+        None, continues after the cursor's message ("" starts at the newest).
+        In cursor mode the total is only counted with ``include_total``, and
+        is cached briefly.
 
-        Returns: (messages, total_count)
+        Returns: (messages oldest first, total_count, next_cursor to older messages)
         """
         page_size = min(page_size, 100)  # Max 100 per page
-        offset = (page - 1) * page_size
 
         # Base query
         query = self.db.query(Message).filter(
@@ -177,14 +222,22 @@ class MessageService:
         if booking_id is not None:
             query = query.filter(Message.booking_id == booking_id)
 
-        # Get total count
-        total = query.count()
-
-        # Get paginated messages
-        messages = query.order_by(Message.created_at.desc()).offset(offset).limit(page_size).all()
+        keyset = Keyset(Message.created_at.desc(), Message.id.desc())
+        scope = f"messages.thread:{user1_id}:{user2_id}:{booking_id}"
+        if cursor is not None:
+            after = decode_cursor(scope, cursor) if cursor else None
+            total = cached_count(self.db, scope, query.statement) if include_total else None
+            page_query = keyset.apply(query, after=after)
+        else:
+            total = query.count()
+            page_query = keyset.apply(query).offset((page - 1) * page_size)
+
+        messages, next_cursor = split_page(
+            page_query.limit(page_size + 1).all(), page_size, scope, key=lambda m: (m.created_at, m.id)
+        )
 
         # Return in chronological order (oldest first)
-        return list(reversed(messages)), total
+        return list(reversed(messages)), total, next_cursor
 
     def get_user_threads(self, user_id: int, limit: int = 100) -> list[dict]:
         """
@@ -206,116 +259,55 @@ class MessageService:
             - unread_count: Number of unread messages in thread
 
         Note:
-            Threads are sorted by most recent activity (last_message_time DESC)
+            Threads are sorted by most recent activity (last_message_time DESC).
+            A single query over the conversations table answers this; its last
+            message and unread counters are maintained on write.
         """
         try:
-            # Subquery: Find latest message per conversation thread
-            latest_msg_subquery = (
-                self.db.query(
-                    case(
-                        (Message.sender_id == user_id, Message.recipient_id),
-                        else_=Message.sender_id,
-                    ).label("other_user_id"),
-                    Message.booking_id,
-                    func.max(Message.created_at).label("last_time"),
-                )
-                .filter(
-                    Message.deleted_at.is_(None),
-                    or_(
-                        Message.sender_id == user_id,
-                        Message.recipient_id == user_id,
-                    ),
-                )
-                .group_by("other_user_id", Message.booking_id)  # Don't group by sender_id
-                .subquery()
+            is_student_slot = Conversation.student_id == user_id
+            other_user_id = case((is_student_slot, Conversation.tutor_id), else_=Conversation.student_id)
+            unread_count = case(
+                (is_student_slot, Conversation.student_unread_count),
+                else_=Conversation.tutor_unread_count,
             )
 
-            # Main query: Get thread details with latest message
-            # Select User object directly for reliable attribute access
             threads_query = (
                 self.db.query(
-                    latest_msg_subquery.c.other_user_id,
-                    User,  # Select entire User object
-                    latest_msg_subquery.c.booking_id,
+                    other_user_id.label("other_user_id"),
+                    User,
+                    Conversation.booking_id,
                     Message.sender_id,
                     Message.message,
-                    latest_msg_subquery.c.last_time,
+                    Conversation.last_message_at,
+                    unread_count.label("unread_count"),
                 )
-                .select_from(latest_msg_subquery)
-                .join(User, User.id == latest_msg_subquery.c.other_user_id)
-                .join(
-                    Message,
-                    and_(
-                        Message.created_at == latest_msg_subquery.c.last_time,
-                        Message.deleted_at.is_(None),
-                        or_(
-                            and_(
-                                Message.sender_id == user_id,
-                                Message.recipient_id == latest_msg_subquery.c.other_user_id,
-                            ),
-                            and_(
-                                Message.sender_id == latest_msg_subquery.c.other_user_id,
-                                Message.recipient_id == user_id,
-                            ),
-                        ),
-                        or_(
-                            Message.booking_id == latest_msg_subquery.c.booking_id,
-                            and_(
-                                latest_msg_subquery.c.booking_id.is_(None),
-                                Message.booking_id.is_(None),
-                            ),
-                        ),
-                    ),
-                )
-                .order_by(latest_msg_subquery.c.last_time.desc())
+                .select_from(Conversation)
+                .join(User, User.id == other_user_id)
+                .join(Message, Message.id == Conversation.last_message_id)
+                .filter(or_(Conversation.student_id == user_id, Conversation.tutor_id == user_id))
+                .order_by(Conversation.last_message_at.desc())
                 .limit(limit)
                 .all()
             )
 
-            # Calculate unread count per thread separately (more accurate)
-            threads = []
-            for t in threads_query:
-                # t[0] = other_user_id, t[2] = booking_id
-                booking_id = t[2]
-                unread_count = (
-                    self.db.query(func.count(Message.id))
-                    .filter(
-                        Message.deleted_at.is_(None),
-                        Message.recipient_id == user_id,
-                        Message.sender_id == t[0],  # other_user_id
-                        Message.is_read.is_(False),
-                        or_(
-                            Message.booking_id == booking_id,
-                            and_(
-                                booking_id.is_(None) if booking_id is None else False,
-                                Message.booking_id.is_(None),
-                            ),
-                        )
-                        if booking_id is not None
-                        else Message.booking_id.is_(None),
-                    )
-                    .scalar()
-                ) or 0
-
-                # Access by index with User object
-                # Query columns order: other_user_id, User, booking_id, sender_id, message, last_time
-                thread_user = t[1]  # User object
-                avatar_key = getattr(thread_user, "avatar_key", None)
-                threads.append(
-                    {
-                        "other_user_id": t[0],  # other_user_id
-                        "other_user_email": thread_user.email,
-                        "other_user_first_name": thread_user.first_name,
-                        "other_user_last_name": thread_user.last_name,
-                        "other_user_avatar_url": build_avatar_url(avatar_key),
-                        "other_user_role": thread_user.role,
-                        "booking_id": t[2],  # booking_id
-                        "last_sender_id": t[3],  # sender_id
-                        "last_message": t[4],  # message
-                        "last_message_time": t[5],  # last_time
-                        "unread_count": unread_count,
-                    }
-                )
+            prefetch_avatar_urls((getattr(t.User, "avatar_key", None) for t in threads_query), size=80)
+
+            threads = [
+                {
+                    "other_user_id": t.other_user_id,
+                    "other_user_email": t.User.email,
+                    "other_user_first_name": t.User.first_name,
+                    "other_user_last_name": t.User.last_name,
+                    "other_user_avatar_url": build_avatar_url(getattr(t.User, "avatar_key", None), size=80),
+                    "other_user_role": t.User.role,
+                    "booking_id": t.booking_id,
+                    "last_sender_id": t.sender_id,
+                    "last_message": t.message,
+                    "last_message_time": t.last_message_at,
+                    "unread_count": t.unread_count,
+                }
+                for t in threads_query
+            ]
 
             logger.debug(f"Retrieved {len(threads)} threads for user {user_id}")
             return threads
@@ -330,38 +322,72 @@ class MessageService:
         search_query: str,
         page: int = 1,
         page_size: int = 20,
-    ) -> tuple[list[Message], int]:
+        cursor: str | None = None,
+    ) -> MessageSearchPage:
         """
-        Search user's messages by content.
+        Search user's messages by content, best matches first.
 
-        Returns: (messages, total_count)
+        Matches whole words through the ``messages.search_vector`` GIN
+        indexes, with the last word also matching as a prefix. Without
+        full-text search, falls back to a substring scan, newest first.
+
+        Pages by ``page`` or, when given, from the previous page's
+        ``next_cursor``. The total (at most SEARCH_COUNT_LIMIT) is only
+        counted in page mode.
         """
         search_query = search_query.strip()
         if not search_query or len(search_query) < 2:
             raise ValidationError("Search query must be at least 2 characters")
 
         page_size = min(page_size, 50)
-        offset = (page - 1) * page_size
-
-        # Search pattern
-        search_pattern = f"%{search_query}%"
-
-        # Base query
-        query = self.db.query(Message).filter(
-            Message.deleted_at.is_(None),
-            or_(
-                Message.sender_id == user_id,
-                Message.recipient_id == user_id,
-            ),
-            Message.message.ilike(search_pattern),
+        scope = f"messages.search:{user_id}:{search_query}"
+        after = decode_cursor(scope, cursor) if cursor else None
+
+        if message_fulltext_search_enabled(self.db):
+            tsquery = build_prefix_tsquery(search_query)
+            rank = message_search_rank(tsquery).label("rank")
+            match = message_text_filter(user_id, tsquery)
+            snippet = message_snippet(tsquery)
+        else:
+            rank = literal(0.0).label("rank")
+            match = and_(
+                or_(Message.sender_id == user_id, Message.recipient_id == user_id),
+                Message.message.ilike(f"%{escape_like(search_query)}%", escape="\\"),
+            )
+            snippet = literal(None)
+
+        matches = select(Message.id, rank).where(Message.deleted_at.is_(None), match)
+
+        total = None
+        if after is None:
+            counted = matches.limit(SEARCH_COUNT_LIMIT).subquery()
+            total = self.db.scalar(select(func.count()).select_from(counted))
+
+        page_ids = matches.order_by(rank.desc(), Message.id.desc()).limit(page_size)
+        if after is None:
+            page_ids = page_ids.offset((page - 1) * page_size)
+        else:
+            page_ids = page_ids.where(tuple_(rank.element, Message.id) < tuple_(*after))
+        page_ids = page_ids.subquery()
+
+        # Snippets are built for the page only, not for every match
+        rows = self.db.execute(
+            select(Message, page_ids.c.rank, snippet.label("snippet"))
+            .join(page_ids, Message.id == page_ids.c.id)
+            .options(selectinload(Message.attachments))
+            .order_by(page_ids.c.rank.desc(), Message.id.desc())
+        ).all()
+
+        next_cursor = None
+        if len(rows) == page_size:
+            next_cursor = encode_cursor(scope, (rows[-1].rank, rows[-1].Message.id))
+
+        return MessageSearchPage(
+            hits=[MessageSearchHit(row.Message, render_snippet(row.snippet)) for row in rows],
+            total=total,
+            next_cursor=next_cursor,
         )
 
-        total = query.count()
-
-        messages = query.order_by(Message.created_at.desc()).offset(offset).limit(page_size).all()
-
-        return messages, total
-
     # ========================================================================
     # Read Receipts
     # ========================================================================
@@ -385,6 +411,12 @@ class MessageService:
             message.is_read = True
             message.read_at = datetime.now(UTC)
             message.updated_at = datetime.now(UTC)  # Update timestamp in code
+            if message.conversation_id is not None:
+                self._set_unread_count(
+                    user_id,
+                    lambda count: func.greatest(count - 1, 0),
+                    Conversation.id == message.conversation_id,
+                )
             self.db.commit()
             self.db.refresh(message)
 
@@ -407,6 +439,11 @@ class MessageService:
             {"is_read": True, "read_at": now, "updated_at": now},  # Update timestamp in code
             synchronize_session=False,
         )
+        # Without a booking_id every thread with the other user was read
+        conversation_filter = [self._pair_filter(user_id, other_user_id)]
+        if booking_id is not None:
+            conversation_filter.append(Conversation.booking_id == booking_id)
+        self._set_unread_count(user_id, lambda count: 0, *conversation_filter)
         self.db.commit()
 
         logger.info(f"Marked {count} messages as read in thread for user {user_id}")
@@ -519,12 +556,148 @@ class MessageService:
         message.deleted_at = datetime.now(UTC)
         message.deleted_by = user_id
         message.updated_at = datetime.now(UTC)  # Update timestamp in code
+        if message.conversation_id is not None:
+            self._record_deleted_message(message)
         self.db.commit()
         self.db.refresh(message)
 
         logger.info(f"Message {message_id} deleted by user {user_id}")
         return message
 
+    # ========================================================================
+    # Helper Methods - Conversation Inbox
+    # ========================================================================
+
+    @staticmethod
+    def _pair_filter(user1_id: int, user2_id: int):
+        """Match conversations between two users, whichever slot each is in."""
+        return and_(
+            func.least(Conversation.student_id, Conversation.tutor_id) == min(user1_id, user2_id),
+            func.greatest(Conversation.student_id, Conversation.tutor_id) == max(user1_id, user2_id),
+        )
+
+    def _get_or_create_conversation_id(
+        self,
+        sender_id: int,
+        recipient_id: int,
+        booking_id: int | None,
+        *,
+        recipient_role: str,
+    ) -> int:
+        """
+        ID of the conversation a new message belongs to, created if needed.
+
+        A tutor talking to a non-tutor takes the tutor slot; any other pair
+        puts the lower user id in the student slot. Lookups match the pair in
+        either order, so later role changes don't split a thread.
+        """
+        conversation_filter = (
+            self._pair_filter(sender_id, recipient_id),
+            func.coalesce(Conversation.booking_id, 0) == (booking_id or 0),
+        )
+        conversation_id = self.db.query(Conversation.id).filter(*conversation_filter).scalar()
+        if conversation_id is not None:
+            return conversation_id
+
+        sender_role = self.db.query(User.role).filter(User.id == sender_id).scalar()
+        if (sender_role == "tutor") != (recipient_role == "tutor"):
+            student_id, tutor_id = (recipient_id, sender_id) if sender_role == "tutor" else (sender_id, recipient_id)
+        else:
+            student_id, tutor_id = min(sender_id, recipient_id), max(sender_id, recipient_id)
+
+        now = datetime.now(UTC)
+        conversation = Conversation(
+            student_id=student_id,
+            tutor_id=tutor_id,
+            booking_id=booking_id,
+            created_at=now,
+            updated_at=now,
+        )
+        try:
+            with self.db.begin_nested():
+                self.db.add(conversation)
+            return conversation.id
+        except IntegrityError:
+            # Another request created it first (uq_conversations_pair)
+            return self.db.query(Conversation.id).filter(*conversation_filter).scalar()
+
+    def _record_new_message(self, message: Message) -> None:
+        """Make a new message its conversation's latest and count it unread."""
+        is_latest = or_(
+            Conversation.last_message_at.is_(None),
+            Conversation.last_message_at <= message.created_at,
+        )
+        self.db.query(Conversation).filter(Conversation.id == message.conversation_id).update(
+            {
+                # Right-hand sides see the row as it was before this update
+                Conversation.last_message_id: case((is_latest, message.id), else_=Conversation.last_message_id),
+                Conversation.last_message_at: func.greatest(Conversation.last_message_at, message.created_at),
+                Conversation.student_unread_count: Conversation.student_unread_count
+                + case((Conversation.student_id == message.recipient_id, 1), else_=0),
+                Conversation.tutor_unread_count: Conversation.tutor_unread_count
+                + case((Conversation.tutor_id == message.recipient_id, 1), else_=0),
+                Conversation.updated_at: message.created_at,
+            },
+            synchronize_session=False,
+        )
+
+    def _record_deleted_message(self, message: Message) -> None:
+        """Drop a deleted message from its conversation's unread count and preview."""
+        if not message.is_read:
+            self._set_unread_count(
+                message.recipient_id,
+                lambda count: func.greatest(count - 1, 0),
+                Conversation.id == message.conversation_id,
+            )
+
+        last_message_id = (
+            self.db.query(Conversation.last_message_id)
+            .filter(Conversation.id == message.conversation_id)
+            .scalar()
+        )
+        if last_message_id != message.id:
+            return
+
+        self.db.flush()
+        latest = (
+            self.db.query(Message.id, Message.created_at)
+            .filter(Message.conversation_id == message.conversation_id, Message.deleted_at.is_(None))
+            .order_by(Message.created_at.desc(), Message.id.desc())
+            .first()
+        )
+        self.db.query(Conversation).filter(Conversation.id == message.conversation_id).update(
+            {
+                Conversation.last_message_id: latest.id if latest else None,
+                Conversation.last_message_at: latest.created_at if latest else None,
+                Conversation.updated_at: datetime.now(UTC),
+            },
+            synchronize_session=False,
+        )
+
+    def _set_unread_count(self, user_id: int, new_count, *criteria) -> None:
+        """
+        Set ``user_id``'s unread counter on matching conversations.
+
+        ``new_count`` maps the current counter column to its new value, so the
+        change is applied atomically in SQL.
+        """
+        self.db.query(Conversation).filter(
+            or_(Conversation.student_id == user_id, Conversation.tutor_id == user_id),
+            *criteria,
+        ).update(
+            {
+                Conversation.student_unread_count: case(
+                    (Conversation.student_id == user_id, new_count(Conversation.student_unread_count)),
+                    else_=Conversation.student_unread_count,
+                ),
+                Conversation.tutor_unread_count: case(
+                    (Conversation.tutor_id == user_id, new_count(Conversation.tutor_unread_count)),
+                    else_=Conversation.tutor_unread_count,
+                ),
+            },
+            synchronize_session=False,
+        )
+
     # ========================================================================
     # Helper Methods - Content Safety & PII Protection
     # ========================================================================
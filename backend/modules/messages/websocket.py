@@ -16,9 +16,14 @@ Features:
 - Message acknowledgment system
 - Connection health monitoring
 - Token expiration handling
+- Cluster mode: Redis pub/sub fan-out and presence across workers
+  (WS_CLUSTER_ENABLED, see websocket_cluster.py)
+- Non-blocking fan-out: per-connection bounded send queues with timeouts
+  and backpressure (see websocket_outbound.py)
 """
 
 import asyncio
+import json
 import logging
 import time
 from contextlib import suppress
@@ -30,9 +35,17 @@ from jose import ExpiredSignatureError, JWTError, jwt
 from sqlalchemy.orm import Session
 
 from core.config import settings
-from core.utils import StringUtils
+from core.principal_cache import attach_user, resolve_principal
 from database import get_db
 from models import User
+from modules.messages.websocket_cluster import WebSocketCluster
+from modules.messages.websocket_outbound import (
+    QUEUE_DEPTH_BUCKETS,
+    SEND_LATENCY_BUCKETS_MS,
+    ConnectionClosedError,
+    Histogram,
+    OutboundQueue,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -116,9 +129,9 @@ class WebSocketManager:
     5. Message Acknowledgment: Track message delivery
 
     Design Principles (KISS):
-    - In-memory state (single instance)
+    - In-memory socket state per worker
     - Auto-cleanup of dead connections
-    - No external dependencies
+    - Optional Redis cluster transport for multi-worker deployments
     - Simple dict-based tracking
 
     Features:
@@ -134,15 +147,33 @@ class WebSocketManager:
     PING_TIMEOUT_SECONDS = 60  # Consider connection dead if no pong in 60s
     ACK_TIMEOUT_SECONDS = 10  # Wait 10s for message acknowledgment
     CLEANUP_INTERVAL_SECONDS = 30  # Run cleanup every 30s
+    BACKPRESSURE_POLICIES = ("drop", "disconnect")
 
-    def __init__(self) -> None:
-        """Initialize manager with empty state."""
+    def __init__(self, cluster: WebSocketCluster | None = None) -> None:
+        """
+        Initialize manager with empty state.
+
+        Args:
+            cluster: Redis fan-out for multi-worker delivery (None = this
+                worker's sockets only)
+        """
         # Primary connection store: user_id -> set of WebSocket connections
         self.active_connections: dict[int, set[WebSocket]] = {}
 
         # Connection metadata for monitoring/debugging
         self.connection_metadata: dict[WebSocket, ConnectionInfo] = {}
 
+        # Outbound delivery: one bounded queue + writer task per connection
+        self._outbound: dict[WebSocket, OutboundQueue] = {}
+        self.send_queue_size = settings.WS_SEND_QUEUE_SIZE
+        self.send_timeout = settings.WS_SEND_TIMEOUT_SECONDS
+        self.backpressure_policy = settings.WS_BACKPRESSURE_POLICY
+        if self.backpressure_policy not in self.BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown WebSocket backpressure policy: {self.backpressure_policy}")
+        self._send_slots: asyncio.Semaphore | None = None
+        self._send_latency = Histogram(SEND_LATENCY_BUCKETS_MS)
+        self._queue_depth = Histogram(QUEUE_DEPTH_BUCKETS)
+
         # Statistics (optional, for monitoring)
         self._stats = {
             "total_connections": 0,
@@ -150,11 +181,17 @@ class WebSocketManager:
             "failed_sends": 0,
             "acks_sent": 0,
             "acks_timeout": 0,
+            "send_timeouts": 0,
+            "dropped_messages": 0,
+            "backpressure_disconnects": 0,
         }
 
         # Background cleanup task
         self._cleanup_task: asyncio.Task[None] | None = None
 
+        # Cross-worker delivery and presence (cluster mode)
+        self.cluster = cluster
+
     async def start_cleanup_task(self) -> None:
         """Start background task for cleaning up stale connections."""
         if self._cleanup_task is None or self._cleanup_task.done():
@@ -229,6 +266,9 @@ class WebSocketManager:
             # Add connection to user's set
             self.active_connections[user_id].add(websocket)
 
+            # Start the connection's writer
+            self._open_outbound(websocket)
+
             # Store metadata for monitoring
             current_time = time.time()
             self.connection_metadata[websocket] = ConnectionInfo(
@@ -244,6 +284,10 @@ class WebSocketManager:
             # Ensure cleanup task is running
             await self.start_cleanup_task()
 
+            # Join the cluster and subscribe to this user's channel
+            if self.cluster is not None and await self._join_cluster():
+                await self.cluster.track_user(user_id)
+
             logger.info(
                 f"WebSocket connected: user={user_id}, "
                 f"user_connections={len(self.active_connections[user_id])}, "
@@ -273,9 +317,14 @@ class WebSocketManager:
                 # Remove user entry if no connections left
                 if not self.active_connections[user_id]:
                     del self.active_connections[user_id]
+                    if self.cluster is not None:
+                        await self.cluster.untrack_user(user_id)
 
-            # Clean up metadata
+            # Clean up metadata and stop the writer
             self.connection_metadata.pop(websocket, None)
+            outbound = self._outbound.pop(websocket, None)
+            if outbound is not None:
+                outbound.close()
 
             # Update stats
             self._stats["total_disconnections"] += 1
@@ -329,57 +378,139 @@ class WebSocketManager:
 
         Features:
         - Multi-device delivery (sends to all user's connections)
+        - Cross-worker delivery in cluster mode
         - Automatic dead connection cleanup
         - Graceful error handling
         - No exception propagation
         """
+        # Add ack_id if acknowledgment is required
+        if require_ack and "_ack_id" not in message:
+            message["_ack_id"] = f"{user_id}-{time.time()}-{id(message)}"
+
+        delivered = await self._send_local(message, user_id, require_ack)
+        if self.cluster is None or not await self._join_cluster():
+            return delivered
+        # Sockets for this user on other workers
+        published = await self.cluster.publish_to_user(user_id, message, require_ack)
+        return delivered or published
+
+    async def _send_local(self, message: dict[str, Any], user_id: int, require_ack: bool = False) -> bool:
+        """Send a message to the user's connections on this worker."""
         if user_id not in self.active_connections:
             # User not online - message will be delivered via API polling
             logger.debug(f"User {user_id} not connected, skipping WebSocket delivery")
             return False
 
-        disconnected: set[WebSocket] = set()
-        success_count = 0
-
-        # Add ack_id if acknowledgment is required
-        if require_ack and "_ack_id" not in message:
-            message["_ack_id"] = f"{user_id}-{time.time()}-{id(message)}"
+        reached = await self._fan_out(message, [user_id], require_ack=require_ack)
+        return user_id in reached
+
+    def _open_outbound(self, connection: WebSocket) -> OutboundQueue:
+        """Create the send queue and writer task for a connection."""
+        if self._send_slots is None:
+            self._send_slots = asyncio.Semaphore(settings.WS_SEND_CONCURRENCY)
+        previous = self._outbound.pop(connection, None)
+        if previous is not None:
+            previous.close()
+        outbound = self._outbound[connection] = OutboundQueue(
+            connection,
+            maxsize=self.send_queue_size,
+            send_timeout=self.send_timeout,
+            send_slots=self._send_slots,
+            send_latency=self._send_latency,
+        )
+        return outbound
+
+    def _enqueue(self, connection: WebSocket, payload: dict[str, Any] | str) -> asyncio.Future[bool] | None:
+        outbound = self._outbound.get(connection) or self._open_outbound(connection)
+        self._queue_depth.observe(outbound.depth)
+        return outbound.offer(payload)
+
+    async def _fan_out(
+        self,
+        payload: dict[str, Any] | str,
+        user_ids: list[int],
+        *,
+        require_ack: bool = False,
+    ) -> set[int]:
+        """
+        Queue a payload on every local connection of ``user_ids`` and wait for
+        the writes together.
 
-        # Send to all user's active connections
-        for connection in list(self.active_connections[user_id]):
-            try:
-                await connection.send_json(message)
-                success_count += 1
+        Each connection is written by its own writer task, so a slow client
+        only delays its own delivery. Waiting is bounded by the send timeout;
+        writes still pending after it keep going in the background but are
+        not counted as delivered.
 
+        Returns:
+            IDs of users with at least one successful write
+        """
+        pending: list[tuple[int, WebSocket, asyncio.Future[bool]]] = []
+        overflowed: list[tuple[int, WebSocket]] = []
+        for user_id in user_ids:
+            for connection in list(self.active_connections.get(user_id, ())):
+                future = self._enqueue(connection, payload)
+                if future is None:
+                    overflowed.append((user_id, connection))
+                else:
+                    pending.append((user_id, connection, future))
+
+        if pending:
+            await asyncio.wait([future for _, _, future in pending], timeout=self.send_timeout)
+
+        ack_id = payload.get("_ack_id") if require_ack and isinstance(payload, dict) else None
+        reached: set[int] = set()
+        disconnected: list[tuple[int, WebSocket]] = []
+        for user_id, connection, future in pending:
+            if not future.done():
+                self._stats["send_timeouts"] += 1
+                logger.debug(f"Send to user {user_id} still queued after {self.send_timeout}s")
+                continue
+            error = future.exception()
+            if error is None:
+                reached.add(user_id)
                 # Track pending ack if required
-                if require_ack and "_ack_id" in message:
-                    self.track_pending_ack(connection, message["_ack_id"])
-
-            except RuntimeError as e:
+                if ack_id:
+                    self.track_pending_ack(connection, ack_id)
+            elif isinstance(error, RuntimeError):
                 # Connection closed or invalid state
-                logger.debug(f"Connection closed for user {user_id}: {e}")
-                disconnected.add(connection)
-
-            except Exception as e:
+                logger.debug(f"Connection closed for user {user_id}: {error}")
+                disconnected.append((user_id, connection))
+            else:
+                if isinstance(error, TimeoutError):
+                    self._stats["send_timeouts"] += 1
                 # Unexpected error - log and mark for cleanup
-                logger.warning(f"Unexpected error sending to user {user_id}: {e}", exc_info=True)
-                disconnected.add(connection)
+                logger.warning(f"Unexpected error sending to user {user_id}: {error!r}")
+                disconnected.append((user_id, connection))
 
         # Clean up dead connections automatically
-        if disconnected:
-            for connection in disconnected:
-                await self.disconnect(connection, user_id)
-            self._stats["failed_sends"] += len(disconnected)
-
-        # Log delivery status
-        if success_count > 0:
-            logger.debug(
-                f"Delivered to user {user_id}: success={success_count}, failed={len(disconnected)}"
-            )
-            return True
-        else:
-            logger.debug(f"Failed to deliver to user {user_id} (all connections dead)")
-            return False
+        for user_id, connection in disconnected:
+            await self.disconnect(connection, user_id)
+        self._stats["failed_sends"] += len(disconnected)
+
+        for user_id, connection in overflowed:
+            await self._apply_backpressure(connection, user_id)
+
+        if len(user_ids) == 1:
+            if reached:
+                logger.debug(f"Delivered to user {user_ids[0]}: failed={len(disconnected)}")
+            else:
+                logger.debug(f"Failed to deliver to user {user_ids[0]} (no connection accepted the message)")
+        return reached
+
+    async def _apply_backpressure(self, connection: WebSocket, user_id: int) -> None:
+        """Handle a client whose send queue is full."""
+        if connection not in self._outbound:
+            return  # Already disconnected by a concurrent send
+        if self.backpressure_policy == "drop":
+            self._stats["dropped_messages"] += 1
+            logger.debug(f"Send queue full for user {user_id}, dropping message")
+            return
+
+        self._stats["backpressure_disconnects"] += 1
+        logger.warning(f"Send queue full for user {user_id}, disconnecting slow client")
+        await self.disconnect(connection, user_id)
+        with suppress(Exception):
+            await asyncio.wait_for(connection.close(code=1013, reason="Send queue full"), self.send_timeout)
 
     async def send_with_ack(
         self, message: dict[str, Any], user_id: int, ack_id: str
@@ -398,6 +529,27 @@ class WebSocketManager:
         message_with_ack = {**message, "_ack_id": ack_id}
         return await self.send_personal_message(message_with_ack, user_id, require_ack=True)
 
+    async def reply(self, connection: WebSocket, user_id: int, message: dict[str, Any]) -> None:
+        """
+        Send a response (pong, errors, presence) on one connection.
+
+        Goes through the connection's send queue like any other message, so
+        its writer task stays the only writer on the socket. Waits for the
+        write up to the send timeout; a failed write raises as ``send_json``
+        would.
+        """
+        if connection not in self._outbound:
+            raise ConnectionClosedError("Connection closed")
+        future = self._enqueue(connection, message)
+        if future is None:
+            await self._apply_backpressure(connection, user_id)
+            return
+        done, _ = await asyncio.wait([future], timeout=self.send_timeout)
+        if not done:
+            self._stats["send_timeouts"] += 1
+            return
+        future.result()
+
     async def broadcast_to_users(self, message: dict[str, Any], user_ids: list[int]) -> int:
         """
         Send a message to multiple users.
@@ -408,16 +560,46 @@ class WebSocketManager:
 
         Returns:
             Number of users successfully reached
+
+        The payload is serialized once and written to every connection
+        concurrently (see _fan_out).
         """
-        success_count = 0
-        for user_id in user_ids:
-            if await self.send_personal_message(message, user_id):
-                success_count += 1
-        return success_count
+        payload = self._serialize(message)
+        local_ids = [user_id for user_id in dict.fromkeys(user_ids) if user_id in self.active_connections]
+        reached = await self._fan_out(payload, local_ids)
+        if self.cluster is not None and await self._join_cluster():
+            published = await asyncio.gather(
+                *(self.cluster.publish_to_user(user_id, message) for user_id in dict.fromkeys(user_ids))
+            )
+            reached.update(user_id for user_id, sent in zip(dict.fromkeys(user_ids), published, strict=True) if sent)
+        return len(reached)
+
+    @staticmethod
+    def _serialize(message: dict[str, Any]) -> str:
+        """Encode a payload once for many sockets (same format as send_json)."""
+        return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+    async def _join_cluster(self) -> bool:
+        """
+        Start the cluster transport if it isn't running yet.
+
+        Workers without sockets of their own (e.g. one serving only the REST
+        call that sends a message) still need to publish and read presence.
+        """
+        return await self.cluster.start(self._deliver_from_cluster, list(self.active_connections))
+
+    async def _deliver_from_cluster(
+        self, user_id: int | None, message: dict[str, Any], require_ack: bool
+    ) -> None:
+        """Deliver an envelope published by another worker to local sockets."""
+        if user_id is None:
+            await self._broadcast_local(message)
+        else:
+            await self._send_local(message, user_id, require_ack)
 
     def is_user_online(self, user_id: int) -> bool:
         """
-        Check if user has any active connections.
+        Check if user has any active connections on this worker.
 
         Args:
             user_id: User ID to check
@@ -429,7 +611,7 @@ class WebSocketManager:
 
     def get_online_users(self, user_ids: list[int]) -> list[int]:
         """
-        Filter list of users to only online ones.
+        Filter list of users to only those online on this worker.
 
         Args:
             user_ids: List of user IDs to check
@@ -439,10 +621,38 @@ class WebSocketManager:
         """
         return [uid for uid in user_ids if self.is_user_online(uid)]
 
+    async def fetch_online_users(self, user_ids: list[int]) -> list[int]:
+        """
+        Filter list of users to those online on any worker.
+
+        Uses the Redis presence registry in cluster mode and falls back to
+        this worker's connections when Redis is unavailable.
+        """
+        if self.cluster is None or not await self._join_cluster():
+            return self.get_online_users(user_ids)
+        try:
+            online = await self.cluster.online_users(user_ids)
+        except Exception as e:
+            logger.warning(f"Cluster presence lookup failed, using local presence: {e}")
+            return self.get_online_users(user_ids)
+        return [uid for uid in user_ids if uid in online or self.is_user_online(uid)]
+
     async def broadcast_to_all(self, message: dict[str, Any]) -> int:
-        """Broadcast a message to all connected users."""
-        all_user_ids = list(self.active_connections.keys())
-        return await self.broadcast_to_users(message, all_user_ids)
+        """
+        Broadcast a message to all connected users.
+
+        Returns:
+            Number of users reached on this worker (other workers deliver
+            independently in cluster mode)
+        """
+        reached = await self._broadcast_local(message)
+        if self.cluster is not None and await self._join_cluster():
+            await self.cluster.publish_broadcast(message)
+        return reached
+
+    async def _broadcast_local(self, message: dict[str, Any]) -> int:
+        reached = await self._fan_out(self._serialize(message), list(self.active_connections))
+        return len(reached)
 
     def get_online_count(self) -> int:
         """Get total number of online users."""
@@ -465,7 +675,13 @@ class WebSocketManager:
             - failed_sends: Failed message delivery count
             - acks_sent: Successful acknowledgments
             - acks_timeout: Timed out acknowledgments
+            - send_timeouts: Writes not completed within the send timeout
+            - dropped_messages / backpressure_disconnects: Full send queues
+            - queued_messages / max_queue_depth: Current outbound backlog
+            - queue_depth: Histogram of queue depth seen at enqueue
+            - send_latency_ms: Histogram of per-connection write latency
         """
+        depths = [outbound.depth for outbound in self._outbound.values()]
         return {
             "online_users": self.get_online_count(),
             "total_connections": self.get_connection_count(),
@@ -474,11 +690,28 @@ class WebSocketManager:
             "failed_sends": self._stats["failed_sends"],
             "acks_sent": self._stats["acks_sent"],
             "acks_timeout": self._stats["acks_timeout"],
+            "send_timeouts": self._stats["send_timeouts"],
+            "dropped_messages": self._stats["dropped_messages"],
+            "backpressure_disconnects": self._stats["backpressure_disconnects"],
+            "queued_messages": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "queue_depth": self._queue_depth.as_dict(),
+            "send_latency_ms": self._send_latency.as_dict(),
+            "cluster": self.cluster.get_stats() if self.cluster is not None else None,
         }
 
+    async def shutdown(self) -> None:
+        """Stop background tasks and leave the cluster (application shutdown)."""
+        await self.stop_cleanup_task()
+        for outbound in list(self._outbound.values()):
+            outbound.close()
+        self._outbound.clear()
+        if self.cluster is not None:
+            await self.cluster.close()
+
 
 # Global singleton instance
-manager = WebSocketManager()
+manager = WebSocketManager(cluster=WebSocketCluster() if settings.WS_CLUSTER_ENABLED else None)
 
 
 async def authenticate_websocket(websocket: WebSocket, token: str, db: Session) -> User | None:
@@ -495,7 +728,7 @@ async def authenticate_websocket(websocket: WebSocket, token: str, db: Session)
 
     Security:
     - Validates JWT signature and expiration
-    - Checks user is active
+    - Checks user is active and not deleted (cached principal, no query on a hit)
     - Normalizes email for lookup
     - Never raises exceptions (returns None on failure)
     """
@@ -512,21 +745,13 @@ async def authenticate_websocket(websocket: WebSocket, token: str, db: Session)
             return None
 
         # Look up user (must be active)
-        user = (
-            db.query(User)
-            .filter(
-                User.email == StringUtils.normalize_email(email),
-                User.is_active.is_(True),
-            )
-            .first()
-        )
-
-        if user:
-            logger.debug(f"WebSocket auth successful: user_id={user.id}")
-        else:
+        principal = await resolve_principal(db, email)
+        if principal is None or not principal["is_active"]:
             logger.debug(f"WebSocket auth failed: User not found or inactive: {email}")
+            return None
 
-        return user
+        logger.debug(f"WebSocket auth successful: user_id={principal['id']}")
+        return attach_user(db, principal)
 
     except ExpiredSignatureError:
         logger.debug("WebSocket JWT expired")
@@ -737,7 +962,9 @@ async def websocket_endpoint(
 
     try:
         # Send connection confirmation
-        await websocket.send_json(
+        await manager.reply(
+            websocket,
+            user.id,
             {
                 "type": "connection",
                 "status": "connected",
@@ -755,14 +982,14 @@ async def websocket_endpoint(
                 event_type = data.get("type")
 
                 if not event_type:
-                    await websocket.send_json({"type": "error", "message": "Missing event type"})
+                    await manager.reply(websocket, user.id, {"type": "error", "message": "Missing event type"})
                     continue
 
                 # Handle different event types
                 if event_type == "ping":
                     # Keep-alive heartbeat
                     manager.update_pong(websocket)
-                    await websocket.send_json({"type": "pong"})
+                    await manager.reply(websocket, user.id, {"type": "pong"})
 
                 elif event_type == "ack":
                     # Message acknowledgment from client
@@ -816,9 +1043,11 @@ async def websocket_endpoint(
                     # Online presence check
                     user_ids = data.get("user_ids", [])
                     if isinstance(user_ids, list):
-                        online_users = manager.get_online_users(user_ids)
+                        online_users = await manager.fetch_online_users(user_ids)
                         offline_users = [uid for uid in user_ids if uid not in online_users]
-                        await websocket.send_json(
+                        await manager.reply(
+                            websocket,
+                            user.id,
                             {
                                 "type": "presence_status",
                                 "online_users": online_users,
@@ -826,9 +1055,7 @@ async def websocket_endpoint(
                             }
                         )
                     else:
-                        await websocket.send_json(
-                            {"type": "error", "message": "user_ids must be a list"}
-                        )
+                        await manager.reply(websocket, user.id, {"type": "error", "message": "user_ids must be a list"})
 
                 elif event_type == "refresh_token":
                     # Token refresh - update stored token
@@ -836,24 +1063,22 @@ async def websocket_endpoint(
                     if new_token:
                         # Verify the new token is valid
                         if await check_token_expiration(new_token):
-                            await websocket.send_json(
-                                {"type": "token_refreshed", "status": "success"}
-                            )
+                            await manager.reply(websocket, user.id, {"type": "token_refreshed", "status": "success"})
                         else:
-                            await websocket.send_json(
-                                {"type": "error", "message": "Invalid token provided"}
+                            await manager.reply(
+                                websocket, user.id, {"type": "error", "message": "Invalid token provided"}
                             )
 
                 else:
                     # Unknown event type
-                    await websocket.send_json(
-                        {"type": "error", "message": f"Unknown event type: {event_type}"}
+                    await manager.reply(
+                        websocket, user.id, {"type": "error", "message": f"Unknown event type: {event_type}"}
                     )
 
             except ValueError as e:
                 # Invalid JSON
                 logger.warning(f"Invalid JSON from user {user.id}: {e}")
-                await websocket.send_json({"type": "error", "message": "Invalid message format"})
+                await manager.reply(websocket, user.id, {"type": "error", "message": "Invalid message format"})
             except WebSocketDisconnect:
                 # Client disconnected during message processing - this is normal
                 logger.debug(f"WebSocket disconnected during message processing for user {user.id}")
@@ -874,8 +1099,8 @@ async def websocket_endpoint(
 
                 # Try to send error response, but don't fail if connection is closing
                 with suppress(RuntimeError, Exception):
-                    await websocket.send_json(
-                        {"type": "error", "message": "Internal error processing message"}
+                    await manager.reply(
+                        websocket, user.id, {"type": "error", "message": "Internal error processing message"}
                     )
 
     except WebSocketDisconnect:
@@ -0,0 +1,349 @@
+"""
+Redis pub/sub fan-out for WebSocket delivery across workers and nodes.
+
+WebSocketManager tracks connections in process memory, so with several
+uvicorn workers (or pods) an event raised on one worker never reaches a user
+whose socket lives on another. Cluster mode closes that gap:
+
+- Delivery: each worker SUBSCRIBEs to ``ws:user:<id>`` for every user with a
+  local connection (first connection subscribes, last one unsubscribes).
+  Outbound events are delivered to local sockets directly and PUBLISHed to the
+  user's channel for the other workers. PUBLISH returns the number of
+  subscribers, so senders still learn whether anyone received the event.
+- Broadcasts go through a single ``ws:broadcast`` channel every worker joins.
+- Presence: ``ws:presence:<id>`` is a hash of worker id -> expiry timestamp.
+  Workers refresh their entries on a heartbeat; a crashed worker's entries age
+  out after ``presence_ttl`` seconds instead of leaving users "online".
+
+Every envelope carries the origin worker id so a worker ignores its own
+publications (it has already delivered locally).
+
+Redis errors never fail a send: delivery falls back to local sockets and the
+message remains available through the REST API, as before.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterable
+from contextlib import suppress
+from typing import Any
+
+import redis.asyncio as redis
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+USER_CHANNEL_PREFIX = "ws:user:"
+BROADCAST_CHANNEL = "ws:broadcast"
+PRESENCE_KEY_PREFIX = "ws:presence:"
+
+# Called with (user_id or None for broadcasts, message, require_ack)
+LocalDelivery = Callable[[int | None, dict[str, Any], bool], Awaitable[Any]]
+
+
+class WebSocketCluster:
+    """
+    Redis pub/sub transport and presence registry for one worker.
+
+    The manager owns sockets; the cluster only moves envelopes between
+    workers and hands them back through ``deliver_local``.
+    """
+
+    # Retry a failed start at most this often (connects call start())
+    RESTART_BACKOFF_SECONDS = 5.0
+    LISTEN_TIMEOUT_SECONDS = 1.0
+
+    def __init__(
+        self,
+        *,
+        redis_url: str | None = None,
+        client: redis.Redis | None = None,
+        presence_ttl: int | None = None,
+    ) -> None:
+        self._redis_url = redis_url or settings.redis_url
+        self._redis: redis.Redis | None = client
+        self._pubsub: Any = None
+        self.node_id = uuid.uuid4().hex
+        self.presence_ttl = presence_ttl or settings.WS_PRESENCE_TTL_SECONDS
+
+        self._deliver_local: LocalDelivery | None = None
+        self._subscribed: set[int] = set()
+        self._listener_task: asyncio.Task[None] | None = None
+        self._heartbeat_task: asyncio.Task[None] | None = None
+        self._start_lock = asyncio.Lock()
+        self._last_start_attempt = 0.0
+
+        self._stats = {
+            "published": 0,
+            "received": 0,
+            "publish_errors": 0,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return self._listener_task is not None and not self._listener_task.done()
+
+    async def _get_redis(self) -> redis.Redis:
+        """Get or create Redis connection."""
+        if self._redis is None:
+            self._redis = redis.from_url(
+                self._redis_url,
+                encoding="utf-8",
+                decode_responses=True,
+                socket_connect_timeout=2,
+            )
+        return self._redis
+
+    # =========================================================================
+    # Lifecycle
+    # =========================================================================
+
+    async def start(self, deliver_local: LocalDelivery, user_ids: Iterable[int] = ()) -> bool:
+        """
+        Subscribe to the broadcast channel and start the listener and heartbeat.
+
+        Args:
+            deliver_local: Manager callback that writes an envelope to local sockets
+            user_ids: Users already connected to this worker
+
+        Returns:
+            True if the cluster is running
+        """
+        if self.is_running:
+            return True
+
+        async with self._start_lock:
+            if self.is_running:
+                return True
+            now = time.monotonic()
+            if now - self._last_start_attempt < self.RESTART_BACKOFF_SECONDS:
+                return False
+            self._last_start_attempt = now
+
+            self._deliver_local = deliver_local
+            try:
+                r = await self._get_redis()
+                self._pubsub = r.pubsub(ignore_subscribe_messages=True)
+                await self._pubsub.subscribe(BROADCAST_CHANNEL)
+                self._subscribed.clear()
+                for user_id in user_ids:
+                    await self.track_user(user_id)
+            except Exception as e:
+                logger.warning("WebSocket cluster unavailable, delivering locally only: %s", e)
+                await self._close_pubsub()
+                return False
+
+            self._listener_task = asyncio.create_task(self._listen_loop())
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+            logger.info("WebSocket cluster started: node=%s", self.node_id)
+            return True
+
+    async def stop(self) -> None:
+        """Stop background tasks and withdraw this worker's presence."""
+        for task in (self._listener_task, self._heartbeat_task):
+            if task and not task.done():
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        self._listener_task = None
+        self._heartbeat_task = None
+
+        if self._subscribed and self._redis is not None:
+            with suppress(Exception):
+                pipe = self._redis.pipeline(transaction=False)
+                for user_id in self._subscribed:
+                    pipe.hdel(self._presence_key(user_id), self.node_id)
+                await pipe.execute()
+        self._subscribed.clear()
+        await self._close_pubsub()
+        logger.info("WebSocket cluster stopped: node=%s", self.node_id)
+
+    async def close(self) -> None:
+        """Stop and close the Redis connection."""
+        await self.stop()
+        if self._redis is not None:
+            with suppress(Exception):
+                await self._redis.aclose()
+            self._redis = None
+
+    async def _close_pubsub(self) -> None:
+        if self._pubsub is not None:
+            with suppress(Exception):
+                await self._pubsub.aclose()
+            self._pubsub = None
+
+    # =========================================================================
+    # Local users: subscriptions and presence
+    # =========================================================================
+
+    @staticmethod
+    def _user_channel(user_id: int) -> str:
+        return f"{USER_CHANNEL_PREFIX}{user_id}"
+
+    @staticmethod
+    def _presence_key(user_id: int) -> str:
+        return f"{PRESENCE_KEY_PREFIX}{user_id}"
+
+    async def track_user(self, user_id: int) -> None:
+        """Subscribe to a user's channel and mark them present on this worker."""
+        if self._pubsub is None or user_id in self._subscribed:
+            return
+        try:
+            await self._pubsub.subscribe(self._user_channel(user_id))
+            self._subscribed.add(user_id)
+            await self._write_presence([user_id])
+        except Exception as e:
+            logger.warning("Failed to subscribe WebSocket channel for user %s: %s", user_id, e)
+
+    async def untrack_user(self, user_id: int) -> None:
+        """Drop a user's channel and presence entry after their last local socket closes."""
+        if user_id not in self._subscribed:
+            return
+        self._subscribed.discard(user_id)
+        try:
+            if self._pubsub is not None:
+                await self._pubsub.unsubscribe(self._user_channel(user_id))
+            r = await self._get_redis()
+            await r.hdel(self._presence_key(user_id), self.node_id)
+        except Exception as e:
+            logger.warning("Failed to unsubscribe WebSocket channel for user %s: %s", user_id, e)
+
+    async def _write_presence(self, user_ids: Iterable[int]) -> None:
+        r = await self._get_redis()
+        expires_at = time.time() + self.presence_ttl
+        pipe = r.pipeline(transaction=False)
+        for user_id in user_ids:
+            key = self._presence_key(user_id)
+            pipe.hset(key, self.node_id, expires_at)
+            pipe.expire(key, self.presence_ttl)
+        await pipe.execute()
+
+    async def _heartbeat_loop(self) -> None:
+        """Refresh presence for local users well before their entries expire."""
+        interval = max(self.presence_ttl / 3, 1)
+        while True:
+            try:
+                await asyncio.sleep(interval)
+                if self._subscribed:
+                    await self._write_presence(list(self._subscribed))
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.warning("WebSocket presence heartbeat failed: %s", e)
+
+    async def online_users(self, user_ids: list[int]) -> set[int]:
+        """
+        Users with a live presence entry on any worker.
+
+        Raises:
+            redis.RedisError: When Redis is unreachable (callers fall back to
+                local presence)
+        """
+        if not user_ids:
+            return set()
+        r = await self._get_redis()
+        pipe = r.pipeline(transaction=False)
+        for user_id in user_ids:
+            pipe.hvals(self._presence_key(user_id))
+        now = time.time()
+        results = await pipe.execute()
+        return {
+            user_id
+            for user_id, expiries in zip(user_ids, results, strict=True)
+            if any(float(expires_at) > now for expires_at in expiries)
+        }
+
+    # =========================================================================
+    # Publishing
+    # =========================================================================
+
+    def _envelope(self, user_id: int | None, message: dict[str, Any], require_ack: bool) -> str:
+        return json.dumps(
+            {"origin": self.node_id, "user_id": user_id, "message": message, "require_ack": require_ack},
+            default=str,
+        )
+
+    async def publish_to_user(self, user_id: int, message: dict[str, Any], require_ack: bool = False) -> bool:
+        """
+        Publish an event for a user's sockets on other workers.
+
+        Returns:
+            True if at least one other worker is subscribed to the user
+        """
+        if not self.is_running:
+            return False
+        try:
+            r = await self._get_redis()
+            receivers = await r.publish(self._user_channel(user_id), self._envelope(user_id, message, require_ack))
+            self._stats["published"] += 1
+        except Exception as e:
+            self._stats["publish_errors"] += 1
+            logger.warning("WebSocket publish to user %s failed: %s", user_id, e)
+            return False
+        # Our own subscription counts as a receiver but drops the envelope
+        if user_id in self._subscribed:
+            receivers -= 1
+        return receivers > 0
+
+    async def publish_broadcast(self, message: dict[str, Any]) -> int:
+        """
+        Publish an event for every user on other workers.
+
+        Returns:
+            Number of other workers that received it
+        """
+        if not self.is_running:
+            return 0
+        try:
+            r = await self._get_redis()
+            receivers = await r.publish(BROADCAST_CHANNEL, self._envelope(None, message, False))
+            self._stats["published"] += 1
+        except Exception as e:
+            self._stats["publish_errors"] += 1
+            logger.warning("WebSocket broadcast publish failed: %s", e)
+            return 0
+        return max(receivers - 1, 0)
+
+    # =========================================================================
+    # Receiving
+    # =========================================================================
+
+    async def _listen_loop(self) -> None:
+        """Hand envelopes published by other workers to the local manager."""
+        while True:
+            try:
+                raw = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=self.LISTEN_TIMEOUT_SECONDS
+                )
+                if raw is None or raw.get("type") != "message":
+                    continue
+                await self._handle(raw["data"])
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                # redis-py re-subscribes on reconnect; back off and keep listening
+                logger.warning("WebSocket cluster listener error: %s", e)
+                await asyncio.sleep(1.0)
+
+    async def _handle(self, data: str) -> None:
+        try:
+            envelope = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning("Dropping malformed WebSocket cluster envelope")
+            return
+        if envelope.get("origin") == self.node_id or self._deliver_local is None:
+            return
+        self._stats["received"] += 1
+        await self._deliver_local(envelope.get("user_id"), envelope["message"], bool(envelope.get("require_ack")))
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "node_id": self.node_id,
+            "running": self.is_running,
+            "subscribed_users": len(self._subscribed),
+            **self._stats,
+        }
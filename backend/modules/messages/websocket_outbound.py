@@ -0,0 +1,148 @@
+"""
+Per-connection outbound queues for WebSocket delivery.
+
+Sending used to await ``send_json`` connection by connection, so one slow
+client held up every recipient after it. Now each connection owns a bounded
+queue drained by its own writer task:
+
+- Callers enqueue and get a future; fan-out awaits all futures together,
+  bounded by the send timeout, so recipients are written concurrently
+- A worker-wide semaphore caps sends in flight across all writers
+- Each send has a timeout; a send that fails or times out marks the
+  connection broken and fails everything still queued for it
+- A full queue is reported to the caller, which applies the backpressure
+  policy (drop the message, or disconnect the slow client)
+
+Payloads are dicts (sent with ``send_json``) or pre-serialized JSON strings
+(sent with ``send_text``), so broadcasts can serialize once for all
+recipients.
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from contextlib import suppress
+from typing import Any
+
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+# Bucket upper bounds for the manager's histograms
+SEND_LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUEUE_DEPTH_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class Histogram:
+    """Non-cumulative bucket counts: observations per upper bound, plus overflow."""
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def as_dict(self) -> dict[str, Any]:
+        buckets = {f"le_{bound:g}": n for bound, n in zip(self.bounds, self.counts[:-1], strict=True)}
+        buckets["inf"] = self.counts[-1]
+        return {"buckets": buckets, "count": self.count, "sum": round(self.total, 3)}
+
+
+def _consume_exception(future: asyncio.Future[Any]) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+class ConnectionClosedError(RuntimeError):
+    """Raised into pending sends when their connection's writer has stopped."""
+
+
+class OutboundQueue:
+    """Bounded send queue and writer task for one WebSocket connection."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        *,
+        maxsize: int,
+        send_timeout: float,
+        send_slots: asyncio.Semaphore,
+        send_latency: Histogram,
+    ) -> None:
+        self.websocket = websocket
+        self.send_timeout = send_timeout
+        self._queue: asyncio.Queue[tuple[dict[str, Any] | str, asyncio.Future[bool]]] = asyncio.Queue(maxsize)
+        self._send_slots = send_slots
+        self._send_latency = send_latency
+        self._error: BaseException | None = None
+        self._writer = asyncio.create_task(self._run())
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def offer(self, payload: dict[str, Any] | str) -> asyncio.Future[bool] | None:
+        """
+        Queue a payload without waiting.
+
+        Returns:
+            Future resolved once the payload is written (or failed), or None
+            if the queue is full
+        """
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        # Callers may stop waiting (send timeout); don't warn about unread errors
+        future.add_done_callback(_consume_exception)
+        if self._error is not None:
+            future.set_exception(self._error)
+            return future
+        try:
+            self._queue.put_nowait((payload, future))
+        except asyncio.QueueFull:
+            return None
+        return future
+
+    async def _run(self) -> None:
+        while True:
+            payload, future = await self._queue.get()
+            try:
+                async with self._send_slots:
+                    started = time.perf_counter()
+                    if isinstance(payload, str):
+                        await asyncio.wait_for(self.websocket.send_text(payload), self.send_timeout)
+                    else:
+                        await asyncio.wait_for(self.websocket.send_json(payload), self.send_timeout)
+                self._send_latency.observe((time.perf_counter() - started) * 1000)
+                if not future.done():
+                    future.set_result(True)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.set_exception(ConnectionClosedError("Connection closed"))
+                raise
+            except Exception as e:
+                # The socket is unusable after a failed or timed-out write
+                if not future.done():
+                    future.set_exception(e)
+                self._fail_pending(e)
+                return
+
+    def _fail_pending(self, error: BaseException) -> None:
+        self._error = error
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(error)
+
+    def close(self) -> None:
+        """Stop the writer and fail anything still queued."""
+        self._writer.cancel()
+        self._fail_pending(ConnectionClosedError("Connection closed"))
+
+    async def wait_closed(self) -> None:
+        with suppress(asyncio.CancelledError):
+            await self._writer
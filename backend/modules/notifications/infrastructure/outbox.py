@@ -0,0 +1,247 @@
+"""
+Transactional outbox for notification emails.
+
+NotificationService.create_notification used to call Brevo inside the
+caller's request transaction, so e.g. a booking confirmation waited on the
+email provider. It now only adds a ``notification_outbox`` row next to the
+notification (``enqueue_notification_email``, or ``enqueue_notification_emails``
+for bulk creation). The row commits or rolls back with it, and no email goes
+out for a notification that never existed.
+
+``deliver_pending_emails`` drains the outbox (tasks.notification_tasks,
+every few seconds):
+
+- claims due rows with ``FOR UPDATE SKIP LOCKED`` so workers can run side by side
+- coalesces rows with the same ``dedupe_key`` (same user, type and content)
+  into one email
+- sends each claimed batch with one Brevo batch call
+- records the outcome on the row and in notification_analytics; transient
+  failures are retried with exponential backoff up to
+  NOTIFICATION_OUTBOX_MAX_ATTEMPTS
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.email_service import BatchEmail, EmailDeliveryResult, EmailDeliveryStatus, email_service
+from models import Notification, NotificationAnalytics, NotificationOutbox, User
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCHES_PER_RUN = 20
+
+# Transient failures retry after 60s, 120s, 240s, ... (capped)
+RETRY_BACKOFF_BASE_SECONDS = 60
+RETRY_BACKOFF_MAX_SECONDS = 3600
+
+# Shared body for every notification email; Brevo fills in each recipient's params
+NOTIFICATION_EMAIL_HTML = """
+<html>
+<body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+    <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+        <h1 style="color: #10b981;">{{ params.title }}</h1>
+        <p>Hi {{ params.name }},</p>
+        <p>{{ params.message }}</p>
+        {% if params.action_url %}<p><a href="{{ params.action_url }}" style="background: #10b981; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block;">{{ params.action_label }}</a></p>{% endif %}
+    </div>
+</body>
+</html>
+"""
+
+
+def notification_email_row(
+    notification_id: int,
+    user_id: int,
+    notification_type: str,
+    title: str,
+    message: str,
+    action_url: str | None,
+    action_label: str | None,
+) -> dict:
+    """Column values of the outbox row that emails one notification."""
+    # Key shared by notifications that would produce the same email
+    parts = [str(user_id), notification_type, title, message, action_url or ""]
+    return {
+        "notification_id": notification_id,
+        "user_id": user_id,
+        "channel": "email",
+        "dedupe_key": hashlib.sha256("\x1f".join(parts).encode()).hexdigest(),
+        "payload": {
+            "subject": title,
+            "title": title,
+            "message": message,
+            "action_url": action_url,
+            "action_label": action_label or "View",
+        },
+        "status": "pending",
+        "attempts": 0,
+        "next_attempt_at": datetime.now(UTC),
+    }
+
+
+def enqueue_notification_email(db: Session, notification: Notification) -> NotificationOutbox:
+    """Add an email delivery for ``notification`` to the caller's transaction."""
+    entry = NotificationOutbox(
+        **notification_email_row(
+            notification.id,
+            notification.user_id,
+            notification.type,
+            notification.title,
+            notification.message,
+            notification.action_url,
+            notification.action_label,
+        )
+    )
+    db.add(entry)
+    return entry
+
+
+def enqueue_notification_emails(db: Session, rows: list[dict]) -> None:
+    """Insert many ``notification_email_row`` rows in the caller's transaction."""
+    if rows:
+        db.execute(insert(NotificationOutbox), rows)
+
+
+def deliver_pending_emails(db: Session, batch_size: int | None = None) -> dict[str, int]:
+    """
+    Send due outbox emails in batches until none are left (or MAX_BATCHES_PER_RUN).
+
+    Each batch is claimed, sent and recorded in its own transaction.
+
+    Returns:
+        Counts of rows sent, retried, failed and coalesced
+    """
+    batch_size = batch_size or settings.NOTIFICATION_OUTBOX_BATCH_SIZE
+    totals = {"sent": 0, "retried": 0, "failed": 0, "coalesced": 0}
+    for _ in range(MAX_BATCHES_PER_RUN):
+        claimed, counts = _deliver_batch(db, batch_size)
+        for outcome, count in counts.items():
+            totals[outcome] += count
+        if claimed < batch_size:
+            break
+    if any(totals.values()):
+        logger.info("Notification outbox delivered", extra=totals)
+    return totals
+
+
+def _deliver_batch(db: Session, batch_size: int) -> tuple[int, dict[str, int]]:
+    now = datetime.now(UTC)
+    rows = db.execute(
+        select(NotificationOutbox, User)
+        .join(User, User.id == NotificationOutbox.user_id)
+        .where(
+            NotificationOutbox.status == "pending",
+            NotificationOutbox.channel == "email",
+            NotificationOutbox.next_attempt_at <= now,
+        )
+        .order_by(NotificationOutbox.id)
+        .limit(batch_size)
+        .with_for_update(of=NotificationOutbox, skip_locked=True)
+    ).all()
+    counts = {"sent": 0, "retried": 0, "failed": 0, "coalesced": 0}
+    if not rows:
+        db.rollback()
+        return 0, counts
+
+    # The oldest row of each dedupe key is delivered, later ones ride along
+    primaries: dict[str, tuple[NotificationOutbox, User]] = {}
+    for entry, user in rows:
+        if entry.dedupe_key in primaries:
+            entry.status = "coalesced"
+            entry.processed_at = now
+            counts["coalesced"] += 1
+        else:
+            primaries[entry.dedupe_key] = (entry, user)
+
+    sendable: list[tuple[NotificationOutbox, User]] = []
+    for entry, user in primaries.values():
+        if user.email and user.deleted_at is None:
+            sendable.append((entry, user))
+        else:
+            no_address = EmailDeliveryResult(
+                success=False,
+                status=EmailDeliveryStatus.FAILED_PERMANENT,
+                error_message="User has no email address",
+            )
+            counts[_record(db, entry, no_address, now)] += 1
+
+    results = email_service.send_batch_with_tracking(
+        NOTIFICATION_EMAIL_HTML,
+        [_batch_email(entry, user) for entry, user in sendable],
+    )
+    for (entry, _), result in zip(sendable, results, strict=True):
+        counts[_record(db, entry, result, now)] += 1
+
+    db.commit()
+    return len(rows), counts
+
+
+def _batch_email(entry: NotificationOutbox, user: User) -> BatchEmail:
+    name = f"{user.first_name or ''} {user.last_name or ''}".strip() or "User"
+    payload = entry.payload
+    return BatchEmail(
+        to_email=user.email,
+        to_name=name,
+        subject=payload["subject"],
+        params={
+            "name": name,
+            "title": payload["title"],
+            "message": payload["message"],
+            "action_url": payload.get("action_url") or "",
+            "action_label": payload.get("action_label") or "View",
+        },
+    )
+
+
+def _record(db: Session, entry: NotificationOutbox, result: EmailDeliveryResult, now: datetime) -> str:
+    """Store an attempt's outcome on the row; returns the outcome counted."""
+    entry.attempts += 1
+    entry.delivery_status = result.status.value
+    entry.last_error = result.error_message
+    if result.success:
+        entry.status = "sent"
+        entry.provider_message_id = result.message_id
+        entry.processed_at = now
+        outcome = "sent"
+    elif (
+        result.status == EmailDeliveryStatus.FAILED_TRANSIENT
+        and entry.attempts < settings.NOTIFICATION_OUTBOX_MAX_ATTEMPTS
+    ):
+        delay = min(RETRY_BACKOFF_BASE_SECONDS * 2 ** (entry.attempts - 1), RETRY_BACKOFF_MAX_SECONDS)
+        entry.next_attempt_at = now + timedelta(seconds=delay)
+        outcome = "retried"
+    else:
+        entry.status = "failed"
+        entry.processed_at = now
+        outcome = "failed"
+        logger.error(
+            f"Notification email failed for outbox entry {entry.id}",
+            extra={
+                "notification_id": entry.notification_id,
+                "user_id": entry.user_id,
+                "attempts": entry.attempts,
+                "status": result.status.value,
+                "error": result.error_message,
+            },
+        )
+
+    # Same analytics record create_notification used to write per attempt
+    # Format: email_delivery_<status> (e.g., email_delivery_success, email_delivery_failed_transient)
+    db.add(
+        NotificationAnalytics(
+            template_key=f"email_delivery_{result.status.value}",
+            user_id=entry.user_id,
+            sent_at=now,
+            delivery_channel="email",
+            was_actionable=False,
+            action_taken=result.success,
+        )
+    )
+    return outcome
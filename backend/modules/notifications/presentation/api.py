@@ -14,12 +14,15 @@ from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from pydantic import BaseModel, Field
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from core.dependencies import get_current_user
+from core.pagination import CursorParams, Keyset, cached_count_async, decode_cursor, split_page
 from core.query_helpers import get_or_404
 from core.rate_limiting import limiter
-from database import get_db
+from database import get_async_db, get_db
 from models import Notification, User
 
 from ..service import notification_service
@@ -57,8 +60,9 @@ class NotificationListResponse(BaseModel):
     """Paginated notification list response."""
 
     items: list[NotificationResponse]
-    total: int
+    total: int | None = Field(None, description="Exact with skip/limit; in cursor mode only with include_total")
     unread_count: int
+    next_cursor: str | None = None
 
 
 class UnreadCountResponse(BaseModel):
@@ -117,38 +121,59 @@ class NotificationPreferencesUpdate(BaseModel):
 async def list_notifications(
     request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=100)] = 50,
     category: Annotated[str | None, Query(description="Filter by category")] = None,
     unread_only: Annotated[bool, Query(description="Only show unread")] = False,
+    cursor_params: CursorParams = Depends(),
 ):
     """
     Get user's notifications with pagination.
 
     Returns notifications sorted by creation date (newest first).
     Dismissed notifications are excluded by default.
+    Pass an empty `cursor` (then each `next_cursor`) instead of `skip` to page
+    by keyset; the total is then only counted with `include_total`.
     """
-    query = db.query(Notification).filter(
+    visible = [
         Notification.user_id == current_user.id,
         Notification.dismissed_at.is_(None),
-    )
+    ]
+    conditions = list(visible)
 
     if category:
-        query = query.filter(Notification.category == category)
+        conditions.append(Notification.category == category)
 
     if unread_only:
-        query = query.filter(Notification.is_read.is_(False))
-
-    total = query.count()
-    unread_count = notification_service.get_unread_count(db, current_user.id)
+        conditions.append(Notification.is_read.is_(False))
+
+    keyset = Keyset(Notification.created_at.desc(), Notification.id.desc())
+    scope = f"notifications:{current_user.id}:{category}:{unread_only}"
+    statement = select(Notification).where(*conditions)
+
+    if cursor_params.enabled:
+        after = decode_cursor(scope, cursor_params.cursor) if cursor_params.cursor else None
+        total = None
+        if cursor_params.include_total:
+            total = await cached_count_async(db, scope, select(Notification.id).where(*conditions))
+        statement = keyset.apply(statement, after=after)
+    else:
+        total = await db.scalar(select(func.count()).select_from(Notification).where(*conditions)) or 0
+        statement = keyset.apply(statement).offset(skip)
+
+    unread_count = await db.scalar(
+        select(func.count()).select_from(Notification).where(*visible, Notification.is_read.is_(False))
+    )
 
-    notifications = query.order_by(Notification.created_at.desc()).offset(skip).limit(limit).all()
+    result = await db.scalars(statement.limit(limit + 1))
+    notifications, next_cursor = split_page(result.all(), limit, scope, key=lambda n: (n.created_at, n.id))
 
     return NotificationListResponse(
         items=[NotificationResponse.model_validate(n) for n in notifications],
         total=total,
-        unread_count=unread_count,
+        unread_count=unread_count or 0,
+        next_cursor=next_cursor,
     )
 
 
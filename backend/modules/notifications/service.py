@@ -3,20 +3,28 @@ Notification Service Layer
 
 Handles business logic for notifications including:
 - Creating notifications with preference checks
-- Email delivery integration
+- Bulk creation for broadcasts and multi-recipient events
+- Email delivery through the notification outbox
 - Scheduled notifications
 - Analytics tracking
 """
 
 import logging
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
 from datetime import UTC, datetime
 from enum import Enum
 from typing import Any
 
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
-from core.email_service import EmailDeliveryStatus, email_service
-from models import Notification, NotificationAnalytics, NotificationPreferences, User
+from models import Notification, NotificationAnalytics, NotificationPreferences
+from modules.notifications.infrastructure.outbox import (
+    enqueue_notification_email,
+    enqueue_notification_emails,
+    notification_email_row,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -67,9 +75,37 @@ class NotificationCategory(str, Enum):
     LEARNING = "learning"
 
 
+@dataclass(slots=True)
+class NotificationDraft:
+    """One recipient's notification for create_notifications_bulk."""
+
+    user_id: int
+    notification_type: NotificationType | str
+    title: str
+    message: str
+    link: str | None = None
+    action_url: str | None = None
+    action_label: str | None = None
+    priority: int = 3
+    metadata: dict[str, Any] | None = None
+
+
+@dataclass(slots=True)
+class BulkNotificationResult:
+    """Outcome of create_notifications_bulk."""
+
+    created: int = 0
+    emails_queued: int = 0
+    # Recipients that got an in-app notification, in draft order
+    user_ids: list[int] = field(default_factory=list)
+
+
 class NotificationService:
     """Service for creating and managing notifications."""
 
+    # Recipients per preferences lookup in create_notifications_bulk
+    PREFERENCES_CHUNK_SIZE = 5000
+
     # Map notification types to categories
     TYPE_CATEGORIES = {
         NotificationType.BOOKING_CONFIRMED: NotificationCategory.BOOKING,
@@ -172,7 +208,7 @@ class NotificationService:
             action_label: Optional action button label
             priority: Priority 1-5 (1=highest)
             metadata: Optional additional data
-            send_email: Whether to also send email
+            send_email: Whether to also send email (queued, sent after commit)
             email_template: Optional email template name
             email_params: Optional email template parameters
 
@@ -191,10 +227,7 @@ class NotificationService:
 
         # Determine category
         type_value = notification_type.value if isinstance(notification_type, NotificationType) else notification_type
-        category = self.TYPE_CATEGORIES.get(
-            NotificationType(type_value) if type_value in [t.value for t in NotificationType] else None,
-            NotificationCategory.SYSTEM,
-        )
+        category = self._category_for(type_value)
 
         # Create notification
         notification = Notification(
@@ -203,7 +236,7 @@ class NotificationService:
             title=title,
             message=message,
             link=link,
-            category=category.value if isinstance(category, NotificationCategory) else category,
+            category=category,
             priority=priority,
             action_url=action_url,
             action_label=action_label,
@@ -215,9 +248,9 @@ class NotificationService:
 
         logger.info(f"Created notification {notification.id} for user {user_id}: {type_value}")
 
-        # Send email if enabled
+        # Queue email if enabled
         if send_email and should_email:
-            self._send_email_notification(db, user_id, notification, email_template, email_params)
+            self._enqueue_email_notification(db, notification, email_template)
 
         # Track analytics
         self._track_analytics(
@@ -230,123 +263,210 @@ class NotificationService:
 
         return notification
 
-    def _send_email_notification(
+    def create_notifications_bulk(
         self,
         db: Session,
-        user_id: int,
-        notification: Notification,
-        template: str | None = None,
-        params: dict[str, Any] | None = None,
-    ) -> bool:
+        drafts: Iterable[NotificationDraft],
+        send_email: bool = True,
+    ) -> BulkNotificationResult:
         """
-        Send email for notification with delivery tracking.
+        Create many notifications at once (announcements, sweeps).
+
+        Same preference rules as create_notification, but preferences are
+        loaded with one query per PREFERENCES_CHUNK_SIZE recipients and the
+        notifications, outbox emails and analytics rows are each written with
+        multi-row INSERTs instead of a flush per recipient. Recipients without
+        a preferences row get the defaults (no row is created for them).
+
+        Nothing is pushed over WebSocket here; after commit, callers pass the
+        result to broadcast_bulk_notification.
 
         Args:
             db: Database session
-            user_id: Target user ID
-            notification: The notification object
-            template: Optional email template name
-            params: Optional template parameters
+            drafts: One draft per recipient
+            send_email: Whether to also queue emails (sent after commit)
 
         Returns:
-            True if email was sent successfully, False otherwise
+            Counts and the recipients that got a notification
         """
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user or not user.email:
-            logger.warning(
-                f"Cannot send email notification: user {user_id} has no email address"
+        drafts = list(drafts)
+        result = BulkNotificationResult()
+        if not drafts:
+            return result
+
+        prefs_by_user = self._load_preferences(db, {draft.user_id for draft in drafts})
+        default_prefs = self._default_preferences()
+        now = datetime.now(UTC)
+
+        rows: list[dict[str, Any]] = []
+        wants_email: list[bool] = []
+        for draft in drafts:
+            should_create, should_email = self._should_notify(
+                prefs_by_user.get(draft.user_id, default_prefs), draft.notification_type
             )
-            return False
-
-        name = f"{user.first_name or ''} {user.last_name or ''}".strip() or "User"
-
-        # Use generic notification email if no template specified
-        if not template:
-            html_content = f"""
-            <html>
-            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                    <h1 style="color: #10b981;">{notification.title}</h1>
-                    <p>Hi {name},</p>
-                    <p>{notification.message}</p>
-                    {f'<p><a href="{notification.action_url}" style="background: #10b981; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block;">{notification.action_label or "View"}</a></p>' if notification.action_url else ''}
-                </div>
-            </body>
-            </html>
-            """
-            result = email_service._send_email_with_tracking(
-                to_email=user.email,
-                to_name=name,
-                subject=notification.title,
-                html_content=html_content,
+            if not should_create:
+                continue
+            type_value = (
+                draft.notification_type.value
+                if isinstance(draft.notification_type, NotificationType)
+                else draft.notification_type
             )
+            rows.append(
+                {
+                    "user_id": draft.user_id,
+                    "type": type_value,
+                    "title": draft.title,
+                    "message": draft.message,
+                    "link": draft.link,
+                    "category": self._category_for(type_value),
+                    "priority": draft.priority,
+                    "action_url": draft.action_url,
+                    "action_label": draft.action_label,
+                    "extra_data": draft.metadata,
+                    "sent_at": now,
+                }
+            )
+            wants_email.append(send_email and should_email)
+
+        if not rows:
+            logger.debug(f"Bulk notification blocked by preferences for all {len(drafts)} recipients")
+            return result
 
-            # Log email delivery status for monitoring
-            if result.success:
-                logger.info(
-                    f"Email notification sent for notification {notification.id}",
-                    extra={
-                        "notification_id": notification.id,
-                        "notification_type": notification.type,
-                        "user_id": user_id,
-                        "email_to": user.email,
-                        "message_id": result.message_id,
-                        "status": result.status.value,
-                    },
-                )
-            else:
-                logger.error(
-                    f"Failed to send email notification for notification {notification.id}",
-                    extra={
-                        "notification_id": notification.id,
-                        "notification_type": notification.type,
-                        "user_id": user_id,
-                        "email_to": user.email,
-                        "status": result.status.value,
-                        "error": result.error_message,
-                    },
-                )
-
-            # Track email delivery in analytics
-            self._track_email_delivery(
-                db=db,
-                notification_id=notification.id,
-                user_id=user_id,
-                success=result.success,
-                status=result.status,
-                error_message=result.error_message,
+        notification_ids = (
+            db.execute(insert(Notification).returning(Notification.id, sort_by_parameter_order=True), rows)
+            .scalars()
+            .all()
+        )
+
+        email_rows = [
+            notification_email_row(
+                notification_id,
+                row["user_id"],
+                row["type"],
+                row["title"],
+                row["message"],
+                row["action_url"],
+                row["action_label"],
             )
+            for notification_id, row, email in zip(notification_ids, rows, wants_email, strict=True)
+            if email
+        ]
+        enqueue_notification_emails(db, email_rows)
+
+        db.execute(
+            insert(NotificationAnalytics),
+            [
+                {
+                    "template_key": row["type"],
+                    "user_id": row["user_id"],
+                    "sent_at": now,
+                    "delivery_channel": "in_app",
+                    "was_actionable": bool(row["action_url"]),
+                }
+                for row in rows
+            ],
+        )
 
-            return result.success
+        result.created = len(rows)
+        result.emails_queued = len(email_rows)
+        result.user_ids = [row["user_id"] for row in rows]
+        logger.info(
+            f"Created {result.created} notifications in bulk ({len(drafts) - result.created} blocked by preferences, "
+            f"{result.emails_queued} emails queued)"
+        )
+        return result
 
-        return True
+    async def broadcast_bulk_notification(
+        self,
+        result: BulkNotificationResult,
+        notification_type: NotificationType | str,
+        title: str,
+        message: str,
+        link: str | None = None,
+        priority: int = 3,
+    ) -> int:
+        """
+        Push one ``notification`` WebSocket event to the online recipients of a bulk create.
+
+        Call after commit. The payload is the same for everyone (and so has no
+        notification_id); it is serialized once and fanned out by the
+        connection manager.
 
-    def _track_email_delivery(
+        Returns:
+            Number of users reached
+        """
+        # Imported here: the messages module imports this service
+        from modules.messages.websocket import manager
+
+        online = await manager.fetch_online_users(list(dict.fromkeys(result.user_ids)))
+        if not online:
+            return 0
+        type_value = notification_type.value if isinstance(notification_type, NotificationType) else notification_type
+        return await manager.broadcast_to_users(
+            {
+                "type": "notification",
+                "notification_type": type_value,
+                "title": title,
+                "message": message,
+                "link": link,
+                "category": self._category_for(type_value),
+                "priority": priority,
+                "created_at": datetime.now(UTC).isoformat(),
+            },
+            online,
+        )
+
+    def _load_preferences(self, db: Session, user_ids: set[int]) -> dict[int, Any]:
+        """Preference rows by user, read as plain rows in IN (...) chunks."""
+        ids = list(user_ids)
+        prefs: dict[int, Any] = {}
+        for start in range(0, len(ids), self.PREFERENCES_CHUNK_SIZE):
+            chunk = ids[start : start + self.PREFERENCES_CHUNK_SIZE]
+            for row in db.execute(
+                select(*NotificationPreferences.__table__.c).where(NotificationPreferences.user_id.in_(chunk))
+            ):
+                prefs[row.user_id] = row
+        return prefs
+
+    @staticmethod
+    def _default_preferences() -> NotificationPreferences:
+        """Unsaved preferences holding the column defaults a new row would get."""
+        return NotificationPreferences(
+            **{
+                column.key: column.default.arg
+                for column in NotificationPreferences.__table__.columns
+                if column.default is not None and column.default.is_scalar
+            }
+        )
+
+    def _category_for(self, type_value: str) -> str:
+        try:
+            category = self.TYPE_CATEGORIES.get(NotificationType(type_value), NotificationCategory.SYSTEM)
+        except ValueError:
+            category = NotificationCategory.SYSTEM
+        return category.value
+
+    def _enqueue_email_notification(
         self,
         db: Session,
-        notification_id: int,
-        user_id: int,
-        success: bool,
-        status: EmailDeliveryStatus,
-        error_message: str | None = None,
-    ) -> None:
+        notification: Notification,
+        template: str | None = None,
+    ) -> bool:
         """
-        Track email delivery attempt in analytics.
+        Queue the notification email in the caller's transaction.
 
-        This creates an analytics record that can be queried for
-        monitoring email delivery rates and failures.
+        The outbox worker (tasks.notification_tasks) sends it after commit, so
+        the request never waits on the email provider.
+
+        Returns:
+            True if an email was queued
         """
-        # Use template_key to encode the delivery status for easy querying
-        # Format: email_delivery_<status> (e.g., email_delivery_success, email_delivery_failed_transient)
-        analytics = NotificationAnalytics(
-            template_key=f"email_delivery_{status.value}",
-            user_id=user_id,
-            sent_at=datetime.now(UTC),
-            delivery_channel="email",
-            was_actionable=False,
-            action_taken=success,  # Use action_taken to indicate success/failure
-        )
-        db.add(analytics)
+        # Templated notification emails are sent by their own flows
+        if template:
+            return False
+
+        enqueue_notification_email(db, notification)
+        return True
 
     def _track_analytics(
         self,
@@ -532,8 +652,19 @@ class NotificationService:
         expires_in_days: int,
     ) -> Notification | None:
         """Send package expiring notification."""
-        return self.create_notification(
-            db=db,
+        draft = self.package_expiring_draft(user_id, package_id, subject_name, remaining_sessions, expires_in_days)
+        return self.create_notification(db=db, **asdict(draft))
+
+    def package_expiring_draft(
+        self,
+        user_id: int,
+        package_id: int,
+        subject_name: str,
+        remaining_sessions: int,
+        expires_in_days: int,
+    ) -> NotificationDraft:
+        """Package expiring notification for create_notifications_bulk."""
+        return NotificationDraft(
             user_id=user_id,
             notification_type=NotificationType.PACKAGE_EXPIRING,
             title="Package Expiring Soon",
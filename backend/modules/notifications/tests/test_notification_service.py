@@ -5,7 +5,9 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from modules.notifications.service import (
+    BulkNotificationResult,
     NotificationCategory,
+    NotificationDraft,
     NotificationService,
     NotificationType,
     notification_service,
@@ -248,7 +250,7 @@ class TestCreateNotification:
     def test_creates_notification(self, service, mock_db, mock_prefs):
         """Test notification is created."""
         with patch.object(service, "_get_or_create_preferences", return_value=mock_prefs):
-            with patch.object(service, "_send_email_notification"):
+            with patch.object(service, "_enqueue_email_notification"):
                 with patch.object(service, "_track_analytics"):
                     service.create_notification(
                         db=mock_db,
@@ -281,7 +283,7 @@ class TestCreateNotification:
     def test_sets_priority(self, service, mock_db, mock_prefs):
         """Test notification priority is set."""
         with patch.object(service, "_get_or_create_preferences", return_value=mock_prefs):
-            with patch.object(service, "_send_email_notification"):
+            with patch.object(service, "_enqueue_email_notification"):
                 with patch.object(service, "_track_analytics"):
                     service.create_notification(
                         db=mock_db,
@@ -532,6 +534,107 @@ class TestConvenienceMethods:
             assert "7" in call_kwargs["message"]
 
 
+class TestCreateNotificationsBulk:
+    """Tests for create_notifications_bulk."""
+
+    @pytest.fixture
+    def service(self):
+        """Create service instance."""
+        return NotificationService()
+
+    @pytest.fixture
+    def mock_db(self):
+        """Mock session whose INSERT ... RETURNING yields ids 100, 101, ..."""
+        db = MagicMock()
+
+        def execute(statement, params=None):
+            result = MagicMock()
+            result.scalars.return_value.all.return_value = list(range(100, 100 + len(params or [])))
+            return result
+
+        db.execute.side_effect = execute
+        return db
+
+    def _prefs(self, **overrides):
+        prefs = MagicMock()
+        prefs.marketing_enabled = True
+        prefs.email_enabled = True
+        prefs.quiet_hours_start = None
+        prefs.quiet_hours_end = None
+        for key, value in overrides.items():
+            setattr(prefs, key, value)
+        return prefs
+
+    def _drafts(self, *user_ids):
+        return [
+            NotificationDraft(
+                user_id=user_id,
+                notification_type=NotificationType.SYSTEM_ANNOUNCEMENT,
+                title="Maintenance",
+                message="Back soon",
+                action_url="/status",
+            )
+            for user_id in user_ids
+        ]
+
+    def test_filters_by_preferences_in_memory(self, service, mock_db):
+        """One preferences lookup; blocked users get nothing, email follows email_enabled."""
+        prefs = {1: self._prefs(), 2: self._prefs(marketing_enabled=False), 3: self._prefs(email_enabled=False)}
+        with (
+            patch.object(service, "_load_preferences", return_value=prefs) as mock_load,
+            patch("modules.notifications.service.enqueue_notification_emails") as mock_enqueue,
+        ):
+            result = service.create_notifications_bulk(mock_db, self._drafts(1, 2, 3))
+
+        mock_load.assert_called_once_with(mock_db, {1, 2, 3})
+        assert result == BulkNotificationResult(created=2, emails_queued=1, user_ids=[1, 3])
+        (email_rows,) = mock_enqueue.call_args.args[1:]
+        assert [(row["notification_id"], row["user_id"]) for row in email_rows] == [(100, 1)]
+        assert email_rows[0]["payload"]["action_url"] == "/status"
+
+    def test_missing_preferences_use_defaults(self, service, mock_db):
+        """Users without a preferences row get the column defaults (no marketing)."""
+        with patch.object(service, "_load_preferences", return_value={}):
+            result = service.create_notifications_bulk(mock_db, self._drafts(1, 2))
+
+        assert result.created == 0
+        mock_db.execute.assert_not_called()
+
+    def test_send_email_false_queues_nothing(self, service, mock_db):
+        """send_email=False creates notifications without outbox rows."""
+        with (
+            patch.object(service, "_load_preferences", return_value={1: self._prefs()}),
+            patch("modules.notifications.service.enqueue_notification_emails") as mock_enqueue,
+        ):
+            result = service.create_notifications_bulk(mock_db, self._drafts(1), send_email=False)
+
+        assert (result.created, result.emails_queued) == (1, 0)
+        mock_enqueue.assert_called_once_with(mock_db, [])
+
+    def test_empty_drafts(self, service, mock_db):
+        """No drafts means no queries."""
+        assert service.create_notifications_bulk(mock_db, []) == BulkNotificationResult()
+        mock_db.execute.assert_not_called()
+
+    def test_default_preferences_match_column_defaults(self, service):
+        """Defaults are read from the model, not restated."""
+        prefs = service._default_preferences()
+
+        assert prefs.email_enabled is True
+        assert prefs.marketing_enabled is False
+        assert prefs.session_reminders_enabled is True
+        assert prefs.quiet_hours_start is None
+
+    def test_package_expiring_draft_matches_single_notification(self, service, mock_db):
+        """notify_package_expiring sends the same content as the bulk draft."""
+        with patch.object(service, "create_notification") as mock_create:
+            service.notify_package_expiring(mock_db, 1, 10, "Physics", 3, 7)
+
+        draft = service.package_expiring_draft(1, 10, "Physics", 3, 7)
+        assert mock_create.call_args.kwargs["message"] == draft.message
+        assert mock_create.call_args.kwargs["metadata"] == draft.metadata
+
+
 class TestTypeCategoryMapping:
     """Tests for type to category mapping."""
 
@@ -7,6 +7,7 @@ from sqlalchemy import and_
 from sqlalchemy.orm import Session, joinedload
 
 from models import StudentPackage, TutorSubject
+from modules.notifications.service import notification_service
 
 logger = logging.getLogger(__name__)
 
@@ -193,7 +194,8 @@ class PackageExpirationService:
 
         This method finds packages expiring within the specified number of days
         that haven't had a warning sent yet, sends notifications, and marks
-        them as warned to avoid duplicate notifications.
+        them as warned to avoid duplicate notifications. All warnings of a run
+        are created with one create_notifications_bulk call.
 
         Args:
             db: Database session
@@ -202,8 +204,6 @@ class PackageExpirationService:
         Returns:
             int: Number of warnings sent
         """
-        from modules.notifications.service import notification_service
-
         try:
             expiring_packages = PackageExpirationService.get_expiring_packages(
                 db, days_until_expiry
@@ -213,8 +213,11 @@ class PackageExpirationService:
                 logger.debug("No expiring packages found to warn about")
                 return 0
 
-            warnings_sent = 0
             now = datetime.now(UTC)
+            drafts = []
+            warned = []
+            # Subject name per tutor profile; students of one tutor share it
+            subject_names: dict[int, str] = {}
 
             for package in expiring_packages:
                 try:
@@ -229,35 +232,30 @@ class PackageExpirationService:
                     # Get subject name from tutor profile if available
                     subject_name = "tutoring"
                     if package.tutor_profile:
-                        # Try to get a subject name from tutor's subjects
-                        tutor_subject = (
-                            db.query(TutorSubject)
-                            .filter(TutorSubject.tutor_profile_id == package.tutor_profile_id)
-                            .first()
+                        if package.tutor_profile_id not in subject_names:
+                            # Try to get a subject name from tutor's subjects
+                            tutor_subject = (
+                                db.query(TutorSubject)
+                                .filter(TutorSubject.tutor_profile_id == package.tutor_profile_id)
+                                .first()
+                            )
+                            subject_names[package.tutor_profile_id] = (
+                                tutor_subject.subject.name
+                                if tutor_subject and tutor_subject.subject
+                                else "tutoring"
+                            )
+                        subject_name = subject_names[package.tutor_profile_id]
+
+                    drafts.append(
+                        notification_service.package_expiring_draft(
+                            user_id=package.student_id,
+                            package_id=package.id,
+                            subject_name=subject_name,
+                            remaining_sessions=package.sessions_remaining,
+                            expires_in_days=days_left,
                         )
-                        if tutor_subject and tutor_subject.subject:
-                            subject_name = tutor_subject.subject.name
-
-                    # Send notification
-                    notification_service.notify_package_expiring(
-                        db=db,
-                        user_id=package.student_id,
-                        package_id=package.id,
-                        subject_name=subject_name,
-                        remaining_sessions=package.sessions_remaining,
-                        expires_in_days=days_left,
-                    )
-
-                    # Mark warning as sent
-                    package.expiry_warning_sent = True
-                    package.updated_at = datetime.now(UTC)
-                    warnings_sent += 1
-
-                    logger.info(
-                        f"Sent expiry warning for package {package.id} to student "
-                        f"{package.student_id} - expires in {days_left} days, "
-                        f"{package.sessions_remaining} sessions remaining"
                     )
+                    warned.append((package, days_left))
 
                 except Exception as e:
                     logger.error(
@@ -265,6 +263,20 @@ class PackageExpirationService:
                     )
                     continue
 
+            # Send notifications
+            notification_service.create_notifications_bulk(db, drafts)
+
+            for package, days_left in warned:
+                # Mark warning as sent
+                package.expiry_warning_sent = True
+                package.updated_at = now
+                logger.info(
+                    f"Sent expiry warning for package {package.id} to student "
+                    f"{package.student_id} - expires in {days_left} days, "
+                    f"{package.sessions_remaining} sessions remaining"
+                )
+            warnings_sent = len(warned)
+
             db.commit()
             logger.info(f"Sent {warnings_sent} package expiry warnings")
             return warnings_sent
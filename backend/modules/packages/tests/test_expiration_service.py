@@ -429,9 +429,45 @@ class TestSendExpiryWarnings:
 
             assert count == 1
             assert expiring_package.expiry_warning_sent is True
-            mock_notification_service.notify_package_expiring.assert_called_once()
+            mock_notification_service.package_expiring_draft.assert_called_once()
+            mock_notification_service.create_notifications_bulk.assert_called_once_with(
+                mock_db, [mock_notification_service.package_expiring_draft.return_value]
+            )
             mock_db.commit.assert_called_once()
 
+    @patch("modules.packages.services.expiration_service.notification_service")
+    def test_looks_up_subject_once_per_tutor(self, mock_notification_service, mock_db):
+        """Packages from the same tutor share one subject lookup."""
+        packages = []
+        for package_id in (1, 2, 3):
+            package = MagicMock()
+            package.id = package_id
+            package.student_id = package_id
+            package.sessions_remaining = 2
+            package.expires_at = datetime.now(UTC) + timedelta(days=3)
+            package.tutor_profile_id = 7
+            packages.append(package)
+
+        with patch.object(
+            PackageExpirationService, "get_expiring_packages", return_value=packages
+        ):
+            mock_tutor_subject = MagicMock()
+            mock_tutor_subject.subject.name = "Chemistry"
+            mock_db.query.return_value.filter.return_value.first.return_value = (
+                mock_tutor_subject
+            )
+
+            count = PackageExpirationService.send_expiry_warnings(mock_db)
+
+            assert count == 3
+            assert mock_db.query.call_count == 1
+            drafts = mock_notification_service.create_notifications_bulk.call_args.args[1]
+            assert len(drafts) == 3
+            assert {
+                c.kwargs["subject_name"]
+                for c in mock_notification_service.package_expiring_draft.call_args_list
+            } == {"Chemistry"}
+
     @patch("modules.packages.services.expiration_service.notification_service")
     def test_returns_zero_when_no_expiring_packages(
         self, mock_notification_service, mock_db
@@ -443,7 +479,8 @@ class TestSendExpiryWarnings:
             count = PackageExpirationService.send_expiry_warnings(mock_db)
 
             assert count == 0
-            mock_notification_service.notify_package_expiring.assert_not_called()
+            mock_notification_service.package_expiring_draft.assert_not_called()
+            mock_notification_service.create_notifications_bulk.assert_not_called()
 
     @patch("modules.packages.services.expiration_service.notification_service")
     def test_marks_warning_as_sent(
@@ -490,7 +527,7 @@ class TestSendExpiryWarnings:
         ):
             mock_db.query.return_value.filter.return_value.first.return_value = None
             # First call raises error, second succeeds
-            mock_notification_service.notify_package_expiring.side_effect = [
+            mock_notification_service.package_expiring_draft.side_effect = [
                 Exception("Notification error"),
                 None,
             ]
@@ -535,7 +572,7 @@ class TestSendExpiryWarnings:
             PackageExpirationService.send_expiry_warnings(mock_db)
 
             # Verify expires_in_days parameter
-            call_kwargs = mock_notification_service.notify_package_expiring.call_args.kwargs
+            call_kwargs = mock_notification_service.package_expiring_draft.call_args.kwargs
             assert "expires_in_days" in call_kwargs
             assert call_kwargs["expires_in_days"] >= 4  # Should be around 5
 
@@ -558,7 +595,7 @@ class TestSendExpiryWarnings:
 
             PackageExpirationService.send_expiry_warnings(mock_db)
 
-            call_kwargs = mock_notification_service.notify_package_expiring.call_args.kwargs
+            call_kwargs = mock_notification_service.package_expiring_draft.call_args.kwargs
             assert call_kwargs["subject_name"] == "Physics"
 
     @patch("modules.packages.services.expiration_service.notification_service")
@@ -577,7 +614,7 @@ class TestSendExpiryWarnings:
 
             PackageExpirationService.send_expiry_warnings(mock_db)
 
-            call_kwargs = mock_notification_service.notify_package_expiring.call_args.kwargs
+            call_kwargs = mock_notification_service.package_expiring_draft.call_args.kwargs
             assert call_kwargs["subject_name"] == "tutoring"
 
 
@@ -0,0 +1,276 @@
+"""
+Durable inbox for Stripe webhook events.
+
+The webhook endpoint used to run its handler inline before answering Stripe,
+so a slow booking or wallet update held the response open (and past Stripe's
+timeout, caused a retry of an event that was still being handled), and retry
+state lived in process memory. The endpoint now only verifies the signature,
+stores the event with ``record_event`` and answers; a unique stripe_event_id
+makes redelivered events no-ops.
+
+``process_pending_events`` then handles stored events (right after the
+delivery, and from tasks.payment_tasks every few seconds):
+
+- events are partitioned by the payment intent (or object) they concern; a
+  partition's events are handled one at a time in Stripe creation order, so
+  e.g. ``payment_intent.succeeded`` never overtakes its
+  ``checkout.session.completed``
+- different partitions are handled in parallel on a bounded thread pool
+  (STRIPE_WEBHOOK_CONCURRENCY), each event in its own session
+- an event is marked processed in the handler's transaction, so its effects
+  and the mark commit together and a top-up is never credited twice
+- failures are retried with exponential backoff; after
+  STRIPE_WEBHOOK_MAX_ATTEMPTS the event is dead-lettered (status ``dead``)
+  until an admin replays it with ``replay_events``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import and_, exists, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+
+from core.config import settings
+from models import WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+WebhookHandler = Callable[[Session, str, dict], Awaitable[None]]
+
+MAX_ROUNDS_PER_RUN = 20
+
+# Failed events retry after 60s, 120s, 240s, ... (capped)
+RETRY_BACKOFF_BASE_SECONDS = 60
+RETRY_BACKOFF_MAX_SECONDS = 3600
+
+
+def partition_key(data: dict, event_id: str) -> str:
+    """Ordering scope of an event: its payment intent, else the object it concerns."""
+    payment_intent = data.get("payment_intent")
+    if isinstance(payment_intent, str) and payment_intent:
+        return payment_intent
+    return data.get("id") or event_id
+
+
+def record_event(db: Session, event: Any) -> WebhookEvent | None:
+    """
+    Store a verified Stripe event as pending.
+
+    Returns:
+        The new row, or None if the event was already recorded
+    """
+    data = dict(event.data.object)
+    # event.created is a Unix timestamp; fall back to arrival time without one
+    created = getattr(event, "created", None)
+    row = WebhookEvent(
+        stripe_event_id=event.id,
+        event_type=event.type,
+        partition_key=partition_key(data, event.id),
+        payload=data,
+        status="pending",
+        attempts=0,
+        next_attempt_at=datetime.now(UTC),
+        stripe_created_at=datetime.fromtimestamp(created, UTC) if isinstance(created, int) else datetime.now(UTC),
+    )
+    db.add(row)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return None
+    return row
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before the next try of an event that has failed ``attempts`` times."""
+    return timedelta(seconds=min(RETRY_BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), RETRY_BACKOFF_MAX_SECONDS))
+
+
+def process_pending_events(
+    session_factory: Callable[[], Session],
+    handler: WebhookHandler,
+    batch_size: int | None = None,
+) -> dict[str, int]:
+    """
+    Handle due pending events until none are left (or MAX_ROUNDS_PER_RUN).
+
+    Each round claims the oldest due event of up to ``batch_size`` partitions
+    and handles them in parallel; the next event of a partition becomes due in
+    the following round.
+
+    Returns:
+        Counts of events processed, retried and dead-lettered
+    """
+    batch_size = batch_size or settings.STRIPE_WEBHOOK_BATCH_SIZE
+    totals = {"processed": 0, "retried": 0, "dead": 0}
+    with ThreadPoolExecutor(
+        max_workers=settings.STRIPE_WEBHOOK_CONCURRENCY, thread_name_prefix="stripe-webhook"
+    ) as executor:
+        for _ in range(MAX_ROUNDS_PER_RUN):
+            heads = _partition_heads(session_factory, batch_size)
+            outcomes = list(executor.map(lambda event_id: _process_event(session_factory, handler, event_id), heads))
+            for outcome in outcomes:
+                if outcome in totals:
+                    totals[outcome] += 1
+            # Stop once a round makes no progress (nothing due, or all locked elsewhere)
+            if "processed" not in outcomes:
+                break
+    if any(totals.values()):
+        logger.info("Stripe webhook events handled", extra=totals)
+    return totals
+
+
+_drain_lock = threading.Lock()
+_drain_requested = threading.Event()
+
+
+def drain_pending_events(session_factory: Callable[[], Session], handler: WebhookHandler) -> None:
+    """
+    Run ``process_pending_events`` unless this process is already doing so.
+
+    Called after every delivery; a call that finds a drain running asks it for
+    another pass instead of starting a second pool.
+    """
+    _drain_requested.set()
+    if not _drain_lock.acquire(blocking=False):
+        return
+    try:
+        while _drain_requested.is_set():
+            _drain_requested.clear()
+            process_pending_events(session_factory, handler)
+    except Exception as e:
+        # The periodic task picks the events up again
+        logger.error(f"Error processing Stripe webhook events: {e}", exc_info=True)
+    finally:
+        _drain_lock.release()
+
+
+def _partition_heads(session_factory: Callable[[], Session], batch_size: int) -> list[int]:
+    """Ids of due pending events with no earlier pending event in their partition."""
+    earlier = aliased(WebhookEvent)
+    blocked = exists().where(
+        earlier.partition_key == WebhookEvent.partition_key,
+        earlier.status == "pending",
+        or_(
+            earlier.stripe_created_at < WebhookEvent.stripe_created_at,
+            and_(earlier.stripe_created_at == WebhookEvent.stripe_created_at, earlier.id < WebhookEvent.id),
+        ),
+    )
+    db = session_factory()
+    try:
+        return list(
+            db.scalars(
+                select(WebhookEvent.id)
+                .where(
+                    WebhookEvent.status == "pending",
+                    WebhookEvent.next_attempt_at <= datetime.now(UTC),
+                    ~blocked,
+                )
+                .order_by(WebhookEvent.stripe_created_at, WebhookEvent.id)
+                .limit(batch_size)
+            )
+        )
+    finally:
+        db.close()
+
+
+def _process_event(session_factory: Callable[[], Session], handler: WebhookHandler, event_id: int) -> str:
+    """Handle one event in its own session; returns the outcome counted."""
+    db = session_factory()
+    try:
+        event = db.scalars(
+            select(WebhookEvent)
+            .where(WebhookEvent.id == event_id, WebhookEvent.status == "pending")
+            .with_for_update(skip_locked=True)
+        ).first()
+        if event is None:
+            # Taken by another worker, or handled since the round was planned
+            db.rollback()
+            return "skipped"
+
+        event_type, payload = event.event_type, event.payload or {}
+        # Handlers commit their own work; setting the mark first puts it in that commit
+        event.status = "processed"
+        event.processed_at = datetime.now(UTC)
+        event.attempts += 1
+        event.last_error = None
+        try:
+            asyncio.run(handler(db, event_type, payload))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            return _record_failure(db, event_id, event_type, e)
+        return "processed"
+    finally:
+        db.close()
+
+
+def _record_failure(db: Session, event_id: int, event_type: str, error: Exception) -> str:
+    event = db.get(WebhookEvent, event_id, with_for_update=True)
+    event.attempts += 1
+    event.last_error = f"{type(error).__name__}: {error}"
+    if event.attempts >= settings.STRIPE_WEBHOOK_MAX_ATTEMPTS:
+        event.status = "dead"
+        outcome = "dead"
+        logger.error(
+            f"Stripe webhook {event.stripe_event_id} dead-lettered after {event.attempts} attempts",
+            extra={"event_type": event_type, "error": event.last_error},
+        )
+    else:
+        event.next_attempt_at = datetime.now(UTC) + retry_delay(event.attempts)
+        outcome = "retried"
+        logger.warning(
+            f"Stripe webhook {event.stripe_event_id} failed (attempt {event.attempts}), retrying",
+            extra={"event_type": event_type, "error": event.last_error},
+        )
+    db.commit()
+    return outcome
+
+
+def replay_events(db: Session, event_ids: list[int] | None = None) -> int:
+    """
+    Queue events for another round of processing.
+
+    With ``event_ids``, those events are replayed whatever their status (e.g.
+    to re-run a processed event after fixing its handler); without, every
+    dead-lettered event is. Attempts start again from zero.
+
+    Returns:
+        Number of events queued
+    """
+    stmt = update(WebhookEvent).values(
+        status="pending",
+        attempts=0,
+        next_attempt_at=func.now(),
+        last_error=None,
+        processed_at=None,
+    )
+    if event_ids is None:
+        stmt = stmt.where(WebhookEvent.status == "dead")
+    else:
+        stmt = stmt.where(WebhookEvent.id.in_(event_ids))
+    replayed = db.execute(stmt).rowcount
+    db.commit()
+    return replayed
+
+
+def webhook_event_stats(db: Session) -> dict[str, Any]:
+    """Event counts by status plus the age of the oldest pending event."""
+    counts = dict(db.execute(select(WebhookEvent.status, func.count()).group_by(WebhookEvent.status)).all())
+    oldest_pending = db.scalar(select(func.min(WebhookEvent.received_at)).where(WebhookEvent.status == "pending"))
+    return {
+        "pending_events": counts.get("pending", 0),
+        "processed_events": counts.get("processed", 0),
+        "dead_events": counts.get("dead", 0),
+        "oldest_pending_seconds": (
+            (datetime.now(UTC) - oldest_pending).total_seconds() if oldest_pending is not None else None
+        ),
+    }
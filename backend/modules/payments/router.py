@@ -11,7 +11,7 @@ Handles:
 Features:
 - Circuit breaker pattern for Stripe resilience
 - Idempotency keys for double-payment prevention
-- Webhook retry tracking
+- Durable webhook inbox with per-payment ordering and dead-lettering
 - Payment status polling for timeout recovery
 
 SECURITY: Payout Timing and Refund Protection
@@ -44,7 +44,7 @@ import logging
 from datetime import UTC, datetime
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Header, HTTPException, Query, Request, status
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Query, Request, status
 from pydantic import BaseModel, field_validator
 from sqlalchemy import func, update
 from sqlalchemy.orm import Session
@@ -54,7 +54,6 @@ from core.payment_reliability import (
     PaymentServiceUnavailableError,
     get_payment_reliability_status,
     payment_status_poller,
-    webhook_retry_tracker,
 )
 from core.stripe_client import (
     create_checkout_session,
@@ -64,6 +63,12 @@ from core.stripe_client import (
     verify_webhook_signature,
 )
 from models import Booking, Payment, Refund, StudentPackage, StudentProfile, TutorProfile, WebhookEvent
+from modules.payments.infrastructure.webhook_inbox import (
+    drain_pending_events,
+    record_event,
+    replay_events,
+    webhook_event_stats,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -537,24 +542,26 @@ async def get_payment_status(
 async def stripe_webhook(
     request: Request,
     db: DatabaseSession,
+    background_tasks: BackgroundTasks,
     stripe_signature: Annotated[str, Header(alias="Stripe-Signature")],
 ):
     """
-    Handle Stripe webhook events.
+    Receive Stripe webhook events.
+
+    The event is verified, stored in webhook_events and acknowledged; it is
+    handled after the response (see webhook_inbox), so Stripe is never kept
+    waiting on booking or wallet updates.
 
     Events handled:
     - checkout.session.completed: Payment successful
     - payment_intent.succeeded: Payment confirmed
     - payment_intent.payment_failed: Payment failed
     - charge.refunded: Refund processed
+    - account.updated: Connect account status changed
 
     Idempotency:
-    - Each event is tracked by stripe_event_id to prevent duplicate processing
-    - Returns success for already-processed events
-
-    Reliability:
-    - Tracks retry attempts for monitoring
-    - Provides detailed error logging
+    - Each event is stored once by stripe_event_id; redeliveries are acknowledged
+      without being queued again
     """
 
     # Get raw body for signature verification
@@ -563,91 +570,27 @@ async def stripe_webhook(
     # Verify webhook signature
     event = verify_webhook_signature(payload, stripe_signature)
 
-    event_type = event.type
-    event_id = event.id
-    event_data = event.data.object
-
-    logger.info(f"Received Stripe webhook: {event_type} (event_id: {event_id})")
-
-    # Track this webhook attempt for monitoring (before idempotency check)
-    retry_info = webhook_retry_tracker.record_attempt(
-        event_id=event_id,
-        event_type=event_type,
-        processed=False,
-    )
-
-    if retry_info.attempt_count > 1:
-        logger.warning(
-            f"Webhook {event_id} received {retry_info.attempt_count} times "
-            f"(first: {retry_info.first_received_at.isoformat()})"
-        )
+    logger.info(f"Received Stripe webhook: {event.type} (event_id: {event.id})")
 
-    # Check if event was already processed (idempotency check)
-    existing_event = (
-        db.query(WebhookEvent)
-        .filter(WebhookEvent.stripe_event_id == event_id)
-        .first()
-    )
-    if existing_event:
-        logger.info(f"Webhook event {event_id} already processed, skipping")
-        # Update tracker to mark as processed
-        webhook_retry_tracker.record_attempt(
-            event_id=event_id,
-            event_type=event_type,
-            processed=True,
+    if record_event(db, event) is None:
+        existing_status = (
+            db.query(WebhookEvent.status)
+            .filter(WebhookEvent.stripe_event_id == event.id)
+            .scalar()
         )
-        return {"status": "already_processed"}
-
-    try:
-        if event_type == "checkout.session.completed":
-            await _handle_checkout_completed(db, event_data)
+        logger.info(f"Webhook event {event.id} already received ({existing_status}), skipping")
+        if existing_status == "processed":
+            return {"status": "already_processed"}
+        return {"status": "already_queued"}
 
-        elif event_type == "payment_intent.succeeded":
-            await _handle_payment_succeeded(db, event_data)
+    background_tasks.add_task(_drain_webhook_events)
+    return {"status": "queued"}
 
-        elif event_type == "payment_intent.payment_failed":
-            await _handle_payment_failed(db, event_data)
 
-        elif event_type == "charge.refunded":
-            await _handle_charge_refunded(db, event_data)
+def _drain_webhook_events() -> None:
+    from database import SessionLocal
 
-        elif event_type == "account.updated":
-            await _handle_account_updated(db, event_data)
-
-        else:
-            logger.debug(f"Unhandled webhook event type: {event_type}")
-
-        # Record successful processing of this event
-        webhook_event = WebhookEvent(
-            stripe_event_id=event_id,
-            event_type=event_type,
-        )
-        db.add(webhook_event)
-        db.commit()
-
-        # Update retry tracker to mark as processed
-        webhook_retry_tracker.record_attempt(
-            event_id=event_id,
-            event_type=event_type,
-            processed=True,
-        )
-
-        return {"status": "success"}
-
-    except Exception as e:
-        logger.error(f"Error processing webhook {event_type}: {e}", exc_info=True)
-
-        # Track the error in retry tracker
-        webhook_retry_tracker.record_attempt(
-            event_id=event_id,
-            event_type=event_type,
-            processed=False,
-            error_message=str(e),
-        )
-
-        # Return 200 to prevent Stripe from retrying (we logged the error)
-        # Note: For transient errors, you might want to return 5xx to trigger retry
-        return {"status": "error", "message": str(e)}
+    drain_pending_events(SessionLocal, handle_webhook_event)
 
 
 # ============================================================================
@@ -655,6 +598,15 @@ async def stripe_webhook(
 # ============================================================================
 
 
+async def handle_webhook_event(db: Session, event_type: str, data: dict) -> None:
+    """Apply a stored Stripe event; handlers commit their own changes."""
+    handler = WEBHOOK_HANDLERS.get(event_type)
+    if handler is None:
+        logger.debug(f"Unhandled webhook event type: {event_type}")
+        return
+    await handler(db, data)
+
+
 async def _handle_checkout_completed(db: Session, session: dict):
     """Handle successful checkout session."""
 
@@ -857,6 +809,15 @@ async def _handle_account_updated(db: Session, account: dict):
         )
 
 
+WEBHOOK_HANDLERS = {
+    "checkout.session.completed": _handle_checkout_completed,
+    "payment_intent.succeeded": _handle_payment_succeeded,
+    "payment_intent.payment_failed": _handle_payment_failed,
+    "charge.refunded": _handle_charge_refunded,
+    "account.updated": _handle_account_updated,
+}
+
+
 # ============================================================================
 # Refund Endpoint
 # ============================================================================
@@ -1259,7 +1220,7 @@ async def poll_payment_status(
 
 Returns:
 - Circuit breaker state and metrics
-- Webhook retry statistics
+- Webhook inbox counts (pending, processed, dead) and the oldest pending event's age
 - Overall system health
 
 Useful for monitoring and debugging payment issues.
@@ -1267,37 +1228,124 @@ Useful for monitoring and debugging payment issues.
 )
 async def get_reliability_status(
     current_user: AdminUser,
+    db: DatabaseSession,
 ) -> dict[str, Any]:
     """Get payment reliability status for monitoring."""
-    return get_payment_reliability_status()
+    return {**get_payment_reliability_status(), "webhooks": webhook_event_stats(db)}
+
+
+def _webhook_event_summary(event: WebhookEvent) -> dict[str, Any]:
+    return {
+        "id": event.id,
+        "event_id": event.stripe_event_id,
+        "event_type": event.event_type,
+        "partition_key": event.partition_key,
+        "status": event.status,
+        "attempts": event.attempts,
+        "next_attempt_at": event.next_attempt_at.isoformat() if event.next_attempt_at else None,
+        "received_at": event.received_at.isoformat() if event.received_at else None,
+        "processed_at": event.processed_at.isoformat() if event.processed_at else None,
+        "error_message": event.last_error,
+    }
 
 
 @router.get(
     "/reliability/problematic-webhooks",
     summary="Get problematic webhooks (admin only)",
     description="""
-**Get webhooks that have been retried multiple times**
+**Get webhooks whose processing has failed repeatedly**
 
-Returns events that Stripe has delivered multiple times, which may
-indicate processing failures or issues.
+Returns unprocessed events (still retrying, or dead-lettered) that have
+failed at least `min_attempts` times, most recently received first.
     """,
 )
 async def get_problematic_webhooks(
     current_user: AdminUser,
-    min_attempts: Annotated[int, Query(ge=2, le=10)] = 3,
+    db: DatabaseSession,
+    min_attempts: Annotated[int, Query(ge=1, le=10)] = 3,
+) -> list[dict[str, Any]]:
+    """Get webhooks that have failed multiple times."""
+    problematic = (
+        db.query(WebhookEvent)
+        .filter(WebhookEvent.status != "processed", WebhookEvent.attempts >= min_attempts)
+        .order_by(WebhookEvent.received_at.desc())
+        .limit(100)
+        .all()
+    )
+    return [_webhook_event_summary(e) for e in problematic]
+
+
+@router.get(
+    "/webhooks/events",
+    summary="List stored webhook events (admin only)",
+    description="""
+**List Stripe webhook events by status**
+
+`status=dead` lists the dead-letter queue: events that failed
+STRIPE_WEBHOOK_MAX_ATTEMPTS times and are waiting for a replay.
+    """,
+)
+async def list_webhook_events(
+    current_user: AdminUser,
+    db: DatabaseSession,
+    event_status: Annotated[str, Query(alias="status", pattern="^(pending|processed|dead)$")] = "dead",
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
 ) -> list[dict[str, Any]]:
-    """Get webhooks that have been retried multiple times."""
-    problematic = webhook_retry_tracker.get_problematic_events(min_attempts)
-
-    return [
-        {
-            "event_id": e.event_id,
-            "event_type": e.event_type,
-            "first_received_at": e.first_received_at.isoformat(),
-            "last_received_at": e.last_received_at.isoformat(),
-            "attempt_count": e.attempt_count,
-            "processed": e.processed,
-            "error_message": e.error_message,
-        }
-        for e in problematic
-    ]
+    """List webhook events with the given status, most recently received first."""
+    events = (
+        db.query(WebhookEvent)
+        .filter(WebhookEvent.status == event_status)
+        .order_by(WebhookEvent.received_at.desc())
+        .limit(limit)
+        .all()
+    )
+    return [_webhook_event_summary(e) for e in events]
+
+
+@router.post(
+    "/webhooks/events/{webhook_event_id}/replay",
+    summary="Replay a webhook event (admin only)",
+    description="""
+**Process a stored webhook event again**
+
+Queues the event whatever its status, with a fresh attempt count. Handlers
+check current booking and payment state, but replaying a processed
+`checkout.session.completed` wallet top-up credits the wallet again.
+    """,
+)
+async def replay_webhook_event(
+    webhook_event_id: int,
+    current_user: AdminUser,
+    db: DatabaseSession,
+    background_tasks: BackgroundTasks,
+) -> dict[str, Any]:
+    """Queue one stored webhook event for processing."""
+    if not replay_events(db, [webhook_event_id]):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Webhook event not found")
+
+    logger.info(f"Admin {current_user.id} replayed webhook event {webhook_event_id}")
+    background_tasks.add_task(_drain_webhook_events)
+    return {"replayed": 1}
+
+
+@router.post(
+    "/webhooks/replay-dead",
+    summary="Replay dead-lettered webhook events (admin only)",
+    description="""
+**Process every dead-lettered webhook event again**
+
+Use after fixing the cause of the failures; each event gets a fresh attempt count.
+    """,
+)
+async def replay_dead_webhook_events(
+    current_user: AdminUser,
+    db: DatabaseSession,
+    background_tasks: BackgroundTasks,
+) -> dict[str, Any]:
+    """Queue all dead-lettered webhook events for processing."""
+    replayed = replay_events(db)
+
+    logger.info(f"Admin {current_user.id} replayed {replayed} dead webhook events")
+    if replayed:
+        background_tasks.add_task(_drain_webhook_events)
+    return {"replayed": replayed}
@@ -342,7 +342,7 @@ class UserProfileRepositoryImpl:
         Returns:
             UserProfileEntity domain entity
         """
-        avatar_url = build_avatar_url(user.avatar_key, allow_absolute=True)
+        avatar_url = build_avatar_url(user.avatar_key, allow_absolute=True, size=320)
 
         if profile is None:
             return UserProfileEntity(
@@ -10,9 +10,10 @@ import logging
 from decimal import Decimal
 
 from sqlalchemy import String, cast, func, or_
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from core.avatar_storage import build_avatar_url
+from core.avatar_storage import build_avatar_url, prefetch_avatar_urls
+from core.search import fulltext_search_enabled, tutor_search_rank, tutor_text_filter
 from models import Subject, TutorProfile, TutorSubject, User
 
 from modules.public.domain.entities import (
@@ -84,7 +85,7 @@ class PublicTutorRepositoryImpl:
         )
 
         # Convert to entities
-        tutor_entities = [self._to_public_entity(t) for t in tutors]
+        tutor_entities = self._to_public_entities(tutors)
 
         return SearchResultEntity(
             tutors=tutor_entities,
@@ -170,7 +171,7 @@ class PublicTutorRepositoryImpl:
             .all()
         )
 
-        return [self._to_public_entity(p) for p in profiles]
+        return self._to_public_entities(profiles)
 
     def get_by_subject(
         self,
@@ -211,7 +212,7 @@ class PublicTutorRepositoryImpl:
         )
 
         return SearchResultEntity(
-            tutors=[self._to_public_entity(t) for t in tutors],
+            tutors=self._to_public_entities(tutors),
             total_count=total_count,
             page=pagination.page,
             page_size=pagination.page_size,
@@ -225,7 +226,8 @@ class PublicTutorRepositoryImpl:
         """Get top-rated tutors.
 
         Only includes tutors with a minimum number of reviews
-        to ensure statistical significance.
+        to ensure statistical significance. Reads the rating aggregates
+        kept on the profile, ordered along idx_tutor_profiles_rating.
 
         Args:
             limit: Maximum number of tutors to return
@@ -237,12 +239,12 @@ class PublicTutorRepositoryImpl:
         profiles = (
             self._base_public_query()
             .filter(TutorProfile.total_reviews >= min_reviews)
-            .order_by(TutorProfile.average_rating.desc())
+            .order_by(TutorProfile.average_rating.desc(), TutorProfile.total_reviews.desc())
             .limit(limit)
             .all()
         )
 
-        return [self._to_public_entity(p) for p in profiles]
+        return self._to_public_entities(profiles)
 
     def count_by_subject(
         self,
@@ -316,7 +318,7 @@ class PublicTutorRepositoryImpl:
         return (
             self.db.query(TutorProfile)
             .options(
-                joinedload(TutorProfile.subjects).joinedload(TutorSubject.subject),
+                selectinload(TutorProfile.subjects).joinedload(TutorSubject.subject),
                 joinedload(TutorProfile.user),
             )
             .filter(
@@ -349,17 +351,21 @@ class PublicTutorRepositoryImpl:
 
         # Apply text search
         if query and not query.is_empty:
-            search_term = f"%{query.value}%"
-            # Search in tutor profile fields and user name
-            base = base.filter(
-                or_(
-                    TutorProfile.title.ilike(search_term),
-                    TutorProfile.headline.ilike(search_term),
-                    TutorProfile.bio.ilike(search_term),
-                    User.first_name.ilike(search_term),
-                    User.last_name.ilike(search_term),
+            if fulltext_search_enabled(self.db):
+                # search_vector GIN index for profile text, trigram prefix match for names
+                base = base.filter(tutor_text_filter(query.value))
+            else:
+                search_term = f"%{query.value}%"
+                # Search in tutor profile fields and user name
+                base = base.filter(
+                    or_(
+                        TutorProfile.title.ilike(search_term),
+                        TutorProfile.headline.ilike(search_term),
+                        TutorProfile.bio.ilike(search_term),
+                        User.first_name.ilike(search_term),
+                        User.last_name.ilike(search_term),
+                    )
                 )
-            )
 
         # Apply filters if provided
         if filters:
@@ -415,13 +421,24 @@ class PublicTutorRepositoryImpl:
         elif sort_by == SortOrder.NEWEST:
             return query.order_by(TutorProfile.created_at.desc())
         else:
-            # RELEVANCE or default - use rating + sessions as proxy for relevance
-            # If there's a search query, results are already filtered by relevance
+            # RELEVANCE or default - rank text matches first, then use
+            # rating + sessions as proxy for relevance
+            if search_query and not search_query.is_empty and fulltext_search_enabled(self.db):
+                return query.order_by(
+                    tutor_search_rank(search_query.value, TutorProfile.search_vector).desc(),
+                    TutorProfile.average_rating.desc(),
+                    TutorProfile.total_sessions.desc(),
+                )
             return query.order_by(
                 TutorProfile.average_rating.desc(),
                 TutorProfile.total_sessions.desc(),
             )
 
+    def _to_public_entities(self, models: list[TutorProfile]) -> list[PublicTutorProfileEntity]:
+        """Convert a page of models, signing all avatar URLs in one pass."""
+        prefetch_avatar_urls((model.user.avatar_key for model in models if model.user), size=160)
+        return [self._to_public_entity(model) for model in models]
+
     def _to_public_entity(self, model: TutorProfile) -> PublicTutorProfileEntity:
         """Convert SQLAlchemy model to public domain entity.
 
@@ -443,7 +460,7 @@ class PublicTutorRepositoryImpl:
             first_name = model.user.first_name or ""
             last_name = model.user.last_name
             avatar_key = getattr(model.user, "avatar_key", None)
-            avatar_url = build_avatar_url(avatar_key, allow_absolute=True)
+            avatar_url = build_avatar_url(avatar_key, allow_absolute=True, size=160)
 
         # Build subject list
         subjects = []
@@ -6,10 +6,12 @@ from dataclasses import dataclass
 from datetime import UTC, datetime
 from decimal import Decimal
 
-from sqlalchemy import case, func
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from core.tutor_ratings import average_rating
 from models.reviews import Review
+from models.tutors import TutorProfile
 from modules.reviews.domain.entities import ReviewEntity, ReviewSummary
 from modules.reviews.domain.exceptions import DuplicateReviewError
 from modules.reviews.domain.repositories import ReviewRepository
@@ -200,16 +202,23 @@ class ReviewRepositoryImpl(ReviewRepository):
         Returns:
             True if deleted, False if not found
         """
-        result = self.db.query(Review).filter(Review.id == int(review_id)).delete()
+        # Deleted through the session so the tutor's rating aggregates follow
+        model = self.db.query(Review).filter(Review.id == int(review_id)).first()
+        if not model:
+            return False
+
+        self.db.delete(model)
         self.db.commit()
-        return result > 0
+        return True
 
     def calculate_average_rating(
         self,
         tutor_profile_id: TutorProfileId,
     ) -> tuple[Decimal, int]:
         """
-        Calculate average rating for a tutor using SQL aggregation.
+        Get the average rating for a tutor.
+
+        Reads the aggregates kept on the tutor profile (core/tutor_ratings.py).
 
         Args:
             tutor_profile_id: Tutor's profile ID
@@ -219,19 +228,15 @@ class ReviewRepositoryImpl(ReviewRepository):
             Returns (Decimal("0.00"), 0) if no reviews exist
         """
         result = (
-            self.db.query(
-                func.avg(Review.rating).label("avg_rating"),
-                func.count(Review.id).label("total_count"),
-            )
-            .filter(Review.tutor_profile_id == int(tutor_profile_id))
+            self.db.query(TutorProfile.rating_sum, TutorProfile.total_reviews)
+            .filter(TutorProfile.id == int(tutor_profile_id))
             .first()
         )
 
-        if not result or result.total_count == 0:
+        if not result or not result.total_reviews:
             return Decimal("0.00"), 0
 
-        avg_rating = Decimal(str(round(float(result.avg_rating), 2)))
-        return avg_rating, result.total_count
+        return average_rating(result.rating_sum, result.total_reviews), result.total_reviews
 
     def get_summary(
         self,
@@ -240,7 +245,8 @@ class ReviewRepositoryImpl(ReviewRepository):
         """
         Get review summary statistics for a tutor.
 
-        Includes average rating, total count, and rating distribution.
+        Includes average rating, total count, and rating distribution, read
+        from the aggregates kept on the tutor profile (core/tutor_ratings.py).
 
         Args:
             tutor_profile_id: Tutor's profile ID
@@ -250,30 +256,30 @@ class ReviewRepositoryImpl(ReviewRepository):
         """
         result = (
             self.db.query(
-                func.avg(Review.rating).label("avg_rating"),
-                func.count(Review.id).label("total_count"),
-                func.sum(case((Review.rating == 5, 1), else_=0)).label("five_star"),
-                func.sum(case((Review.rating == 4, 1), else_=0)).label("four_star"),
-                func.sum(case((Review.rating == 3, 1), else_=0)).label("three_star"),
-                func.sum(case((Review.rating == 2, 1), else_=0)).label("two_star"),
-                func.sum(case((Review.rating == 1, 1), else_=0)).label("one_star"),
+                TutorProfile.rating_sum,
+                TutorProfile.total_reviews,
+                TutorProfile.rating_5_count,
+                TutorProfile.rating_4_count,
+                TutorProfile.rating_3_count,
+                TutorProfile.rating_2_count,
+                TutorProfile.rating_1_count,
             )
-            .filter(Review.tutor_profile_id == int(tutor_profile_id))
+            .filter(TutorProfile.id == int(tutor_profile_id))
             .first()
         )
 
-        if not result or result.total_count == 0:
+        if not result or not result.total_reviews:
             return ReviewSummary.empty(tutor_profile_id)
 
         return ReviewSummary(
             tutor_profile_id=tutor_profile_id,
-            total_reviews=result.total_count,
-            average_rating=round(float(result.avg_rating), 2),
-            five_star_count=result.five_star or 0,
-            four_star_count=result.four_star or 0,
-            three_star_count=result.three_star or 0,
-            two_star_count=result.two_star or 0,
-            one_star_count=result.one_star or 0,
+            total_reviews=result.total_reviews,
+            average_rating=float(average_rating(result.rating_sum, result.total_reviews)),
+            five_star_count=result.rating_5_count,
+            four_star_count=result.rating_4_count,
+            three_star_count=result.rating_3_count,
+            two_star_count=result.rating_2_count,
+            one_star_count=result.rating_1_count,
         )
 
     def count_by_tutor(
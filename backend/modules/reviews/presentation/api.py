@@ -4,14 +4,12 @@ import contextlib
 import json
 import logging
 from datetime import UTC, datetime
-from decimal import Decimal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from core.audit import AuditLogger
-from core.cache import cache_with_ttl, invalidate_cache
+from core.cache import cache_with_ttl, invalidate_tags
 from core.dependencies import get_current_student_user
 from core.query_helpers import get_by_id_or_404
 from core.rate_limiting import limiter
@@ -25,11 +23,20 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/reviews", tags=["reviews"])
 
 
-@cache_with_ttl(ttl_seconds=300)  # Cache for 5 minutes
-def _get_cached_tutor_reviews(db: Session, tutor_id: int, page: int, page_size: int) -> list[Review]:
-    """Helper to fetch tutor reviews with caching."""
+def _tutor_reviews_tag(tutor_id: int) -> str:
+    return f"tutor_reviews:{tutor_id}"
+
+
+@cache_with_ttl(
+    ttl_seconds=300,  # Cache for 5 minutes
+    namespace="reviews.tutor",
+    key_builder=lambda db, tutor_id, page, page_size: f"{tutor_id}:{page}:{page_size}",
+    tags=lambda db, tutor_id, page, page_size: [_tutor_reviews_tag(tutor_id)],
+)
+async def _get_cached_tutor_reviews(db: Session, tutor_id: int, page: int, page_size: int) -> list[dict]:
+    """Helper to fetch tutor reviews with caching (serialized so workers can share it)."""
     offset = (page - 1) * page_size
-    return (
+    reviews = (
         db.query(Review)
         .filter(Review.tutor_profile_id == tutor_id, Review.is_public.is_(True))
         .order_by(Review.created_at.desc())
@@ -37,6 +44,7 @@ def _get_cached_tutor_reviews(db: Session, tutor_id: int, page: int, page_size:
         .limit(page_size)
         .all()
     )
+    return [ReviewResponse.model_validate(review).model_dump(mode="json") for review in reviews]
 
 
 @router.post("", response_model=ReviewResponse, status_code=status.HTTP_201_CREATED)
@@ -121,22 +129,8 @@ async def create_review(
             immediate=True,  # Write audit log immediately, not deferred
         )
 
-        # Update tutor average rating and total reviews
-        tutor_profile = db.query(TutorProfile).filter(TutorProfile.id == booking.tutor_profile_id).first()
-
-        if tutor_profile:
-            # Calculate new average rating (includes the new review after flush)
-            avg_rating = (
-                db.query(func.avg(Review.rating)).filter(Review.tutor_profile_id == booking.tutor_profile_id).scalar()
-            )
-
-            total_reviews = (
-                db.query(func.count(Review.id)).filter(Review.tutor_profile_id == booking.tutor_profile_id).scalar()
-            )
-
-            tutor_profile.average_rating = Decimal(str(round(float(avg_rating), 2))) if avg_rating else Decimal("0.00")
-            tutor_profile.total_reviews = total_reviews or 0
-            tutor_profile.updated_at = datetime.now(UTC)
+        # The tutor's average rating and review count were updated by the flush
+        # (core/tutor_ratings.py), so no re-aggregation is needed here
 
         # Capture values for response and logging
         review_id = review.id
@@ -165,7 +159,7 @@ async def create_review(
         )
 
         # Invalidate tutor reviews cache
-        invalidate_cache(pattern=f"_get_cached_tutor_reviews_{tutor_profile_id_for_cache}_")
+        await invalidate_tags(_tutor_reviews_tag(tutor_profile_id_for_cache))
 
         return response_data
 
@@ -193,7 +187,7 @@ async def get_tutor_reviews(
     get_by_id_or_404(db, TutorProfile, tutor_id, detail="Tutor not found")
 
     try:
-        reviews = _get_cached_tutor_reviews(db, tutor_id, page, page_size)
+        reviews = await _get_cached_tutor_reviews(db, tutor_id, page, page_size)
         logger.info(f"Retrieved {len(reviews)} reviews for tutor {tutor_id} (page {page})")
         return reviews
     except Exception as e:
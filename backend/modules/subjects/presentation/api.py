@@ -3,14 +3,16 @@
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from core.cache import cache_with_ttl, invalidate_cache
+from core.cache import cache_with_ttl, invalidate_tags
 from core.dependencies import get_current_admin_user
 from core.query_helpers import get_by_id_or_404
 from core.rate_limiting import limiter
 from core.sanitization import sanitize_text_input
-from database import get_db
+from database import get_async_db, get_db
 from models import Subject, User
 from schemas import SubjectResponse
 
@@ -20,26 +22,34 @@ router = APIRouter(prefix="/subjects", tags=["subjects"])
 
 # Initialize rate limiter
 
+SUBJECTS_CACHE_TAG = "subjects"
 
-@cache_with_ttl(ttl_seconds=300)  # Cache for 5 minutes
-def _get_cached_subjects(db: Session, include_inactive: bool = False) -> list[Subject]:
-    """Helper to fetch subjects with caching."""
-    query = db.query(Subject)
+
+@cache_with_ttl(
+    ttl_seconds=300,  # Cache for 5 minutes
+    namespace="subjects.list",
+    key_builder=lambda db, include_inactive=False: f"inactive={include_inactive}",
+    tags=[SUBJECTS_CACHE_TAG],
+)
+async def _get_cached_subjects(db: AsyncSession, include_inactive: bool = False) -> list[dict]:
+    """Helper to fetch subjects with caching (serialized so workers can share it)."""
+    query = select(Subject)
     if not include_inactive:
-        query = query.filter(Subject.is_active.is_(True))
-    return query.all()
+        query = query.where(Subject.is_active.is_(True))
+    subjects = (await db.scalars(query)).all()
+    return [SubjectResponse.model_validate(subject).model_dump(mode="json") for subject in subjects]
 
 
 @router.get("", response_model=list[SubjectResponse])
 @limiter.limit("60/minute")
-def list_subjects(
+async def list_subjects(
     request: Request,
     include_inactive: bool = False,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """List all active subjects. Public endpoint."""
     # Inactive subjects are never shown to public
-    return _get_cached_subjects(db, include_inactive=False)
+    return await _get_cached_subjects(db, include_inactive=False)
 
 
 @router.post("", response_model=SubjectResponse, status_code=status.HTTP_201_CREATED)
@@ -77,7 +87,7 @@ async def create_subject(
         raise HTTPException(status_code=500, detail="Failed to create subject")
 
     # Invalidate subjects cache
-    invalidate_cache(pattern="_get_cached_subjects")
+    await invalidate_tags(SUBJECTS_CACHE_TAG)
 
     return subject
 
@@ -119,7 +129,7 @@ async def update_subject(
         raise HTTPException(status_code=500, detail="Failed to update subject")
 
     # Invalidate subjects cache
-    invalidate_cache(pattern="_get_cached_subjects")
+    await invalidate_tags(SUBJECTS_CACHE_TAG)
 
     return subject
 
@@ -147,6 +157,6 @@ async def delete_subject(
         raise HTTPException(status_code=500, detail="Failed to delete subject")
 
     # Invalidate subjects cache
-    invalidate_cache(pattern="_get_cached_subjects")
+    await invalidate_tags(SUBJECTS_CACHE_TAG)
 
     return {"message": "Subject deleted"}
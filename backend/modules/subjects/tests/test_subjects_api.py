@@ -488,8 +488,10 @@ class TestSubjectsCaching:
 class TestCachedSubjectsHelper:
     """Unit tests for _get_cached_subjects helper function."""
 
-    def test_cached_subjects_excludes_inactive_by_default(self, db_session: Session):
+    @pytest.mark.asyncio
+    async def test_cached_subjects_excludes_inactive_by_default(self, db_session: Session):
         """Test that cached subjects excludes inactive by default."""
+        import database
         from modules.subjects.presentation.api import _get_cached_subjects
 
         active = Subject(name="Active", is_active=True)
@@ -499,16 +501,19 @@ class TestCachedSubjectsHelper:
 
         # Clear cache for test
         from core.cache import invalidate_cache
-        invalidate_cache(pattern="_get_cached_subjects")
+        invalidate_cache("subjects.list")
 
-        subjects = _get_cached_subjects(db_session, include_inactive=False)
-        names = [s.name for s in subjects]
+        async with database.AsyncSessionLocal() as async_db:
+            subjects = await _get_cached_subjects(async_db, include_inactive=False)
+        names = [s["name"] for s in subjects]
 
         assert "Active" in names
         assert "Inactive" not in names
 
-    def test_cached_subjects_includes_inactive_when_requested(self, db_session: Session):
+    @pytest.mark.asyncio
+    async def test_cached_subjects_includes_inactive_when_requested(self, db_session: Session):
         """Test that cached subjects can include inactive when requested."""
+        import database
         from modules.subjects.presentation.api import _get_cached_subjects
 
         active = Subject(name="Active2", is_active=True)
@@ -518,10 +523,11 @@ class TestCachedSubjectsHelper:
 
         # Clear cache for test
         from core.cache import invalidate_cache
-        invalidate_cache(pattern="_get_cached_subjects")
+        invalidate_cache("subjects.list")
 
-        subjects = _get_cached_subjects(db_session, include_inactive=True)
-        names = [s.name for s in subjects]
+        async with database.AsyncSessionLocal() as async_db:
+            subjects = await _get_cached_subjects(async_db, include_inactive=True)
+        names = [s["name"] for s in subjects]
 
         assert "Active2" in names
         assert "Inactive2" in names
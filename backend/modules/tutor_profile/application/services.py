@@ -2,8 +2,9 @@
 
 from fastapi import UploadFile
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from core.pagination import PaginatedResponse, PaginationParams
+from core.pagination import CursorParams, PaginatedResponse, PaginationParams
 from core.storage import delete_files, store_supporting_document
 from schemas import (
     TutorAboutUpdate,
@@ -60,6 +61,7 @@ class TutorProfileService:
         language: str | None = None,
         search_query: str | None = None,
         sort_by: str | None = None,
+        cursor_params: CursorParams | None = None,
     ):
         filters = TutorListingFilter(
             subject_id=subject_id,
@@ -71,13 +73,27 @@ class TutorProfileService:
             search_query=search_query,
             sort_by=sort_by,
         )
-        aggregates, total = self.repository.list_public(db, filters, pagination)
+        if cursor_params is not None and cursor_params.enabled:
+            aggregates, total, next_cursor = self.repository.list_public_page(
+                db, filters, pagination.page_size, cursor_params.cursor, include_total=cursor_params.include_total
+            )
+            return PaginatedResponse.create_cursor_page(
+                items=[aggregate_to_public_profile(agg) for agg in aggregates],
+                page_size=pagination.page_size,
+                next_cursor=next_cursor,
+                has_prev=bool(cursor_params.cursor),
+                total=total,
+                total_is_estimate=total is not None,
+            )
+
+        aggregates, total, next_cursor = self.repository.list_public(db, filters, pagination)
         items = [aggregate_to_public_profile(agg) for agg in aggregates]
         return PaginatedResponse.create(
             items=items,
             total=total,
             page=pagination.page,
             page_size=pagination.page_size,
+            next_cursor=next_cursor,
         )
 
     # --------------------------------------------------------------------- #
@@ -123,7 +139,7 @@ class TutorProfileService:
                 list(new_items),
             )
         except Exception:
-            delete_files(stored_urls)
+            await run_in_threadpool(delete_files, stored_urls)
             raise
 
         preserved_urls = {item.get("document_url") for item in new_items if item.get("document_url")}
@@ -132,7 +148,7 @@ class TutorProfileService:
             for cert in current.certifications
             if cert.document_url and cert.document_url not in preserved_urls
         ]
-        delete_files(stale_urls)
+        await run_in_threadpool(delete_files, stale_urls)
         return aggregate_to_profile_response(aggregate)
 
     def replace_subjects(
@@ -174,7 +190,7 @@ class TutorProfileService:
                 list(new_items),
             )
         except Exception:
-            delete_files(stored_urls)
+            await run_in_threadpool(delete_files, stored_urls)
             raise
 
         preserved_urls = {item.get("document_url") for item in new_items if item.get("document_url")}
@@ -183,7 +199,7 @@ class TutorProfileService:
             for edu in current.educations
             if edu.document_url and edu.document_url not in preserved_urls
         ]
-        delete_files(stale_urls)
+        await run_in_threadpool(delete_files, stale_urls)
         return aggregate_to_profile_response(aggregate)
 
     def update_description(self, db: Session, user_id: int, payload: TutorDescriptionUpdate):
@@ -196,7 +212,7 @@ class TutorProfileService:
 
     async def update_profile_photo(self, db: Session, user_id: int, upload: UploadFile):
         """Update tutor profile photo."""
-        from core.storage import delete_file, store_profile_photo
+        from core.storage import store_profile_photo
 
         # Get existing avatar_key from User model
         from models import User
@@ -204,16 +220,12 @@ class TutorProfileService:
         user = db.query(User).filter(User.id == user_id).first()
         existing_url = user.avatar_key if user and user.avatar_key else None
 
-        # Store new photo
+        # Store new photo; the old one is removed once the upload succeeds
         photo_url = await store_profile_photo(user_id, upload, existing_url=existing_url)
 
         # Update User avatar_key with new photo URL
         aggregate = self.repository.update_profile_photo(db, user_id, photo_url)
 
-        # Delete old photo if it exists and is different
-        if existing_url and existing_url != photo_url:
-            delete_file(existing_url)
-
         return aggregate_to_profile_response(aggregate)
 
     def update_pricing(self, db: Session, user_id: int, payload: TutorPricingUpdate):
@@ -0,0 +1,403 @@
+"""
+Available-slot engine for tutor booking pages.
+
+Recurring ``TutorAvailability`` rules are expanded into UTC windows once per
+date range, bookings and blackouts are merged into one sorted busy list, and
+bookable slots are cut from each window with a single sweep over that list
+instead of testing every slot against every booking.
+
+Computed slots are cached per tutor and date range. The cache key carries an
+availability/booking version made of ``TutorProfile.version`` (bumped by the
+profile editor) and a local counter bumped by ``invalidate_tutor_slots``
+whenever availability rules, blackouts or bookings change. Entries also expire
+after ``SLOT_CACHE_TTL`` seconds so writes made on other workers become
+visible within the same window the endpoint already advertises through its
+``Cache-Control`` header.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time as time_module
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.orm import Session
+
+from core.timezone import is_valid_timezone
+from models import Booking, TutorAvailability, TutorBlackout, TutorProfile
+
+logger = logging.getLogger(__name__)
+
+Interval = tuple[datetime, datetime]
+
+SLOT_MINUTES = 30
+
+# Keep in sync with the Cache-Control max-age of the available-slots endpoint
+SLOT_CACHE_TTL = 30
+SLOT_CACHE_MAX_ENTRIES = 2048
+
+# Booking states that occupy a tutor's time for slot computation
+BLOCKING_SESSION_STATES = ("REQUESTED", "SCHEDULED")
+
+
+@dataclass(frozen=True, slots=True)
+class AvailabilityRule:
+    """Recurring weekly window expressed in the tutor's local time."""
+
+    day_of_week: int  # Sunday=0 ... Saturday=6 (frontend convention)
+    start_time: time
+    end_time: time
+    timezone: str = "UTC"
+
+    @classmethod
+    def from_model(cls, availability: TutorAvailability) -> AvailabilityRule:
+        tz_name = getattr(availability, "timezone", None) or "UTC"
+        if not is_valid_timezone(tz_name):
+            tz_name = "UTC"
+        return cls(
+            day_of_week=availability.day_of_week,
+            start_time=availability.start_time,
+            end_time=availability.end_time,
+            timezone=tz_name,
+        )
+
+
+# ============================================================================
+# Interval arithmetic
+# ============================================================================
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Return an aware UTC datetime (naive values are assumed to be UTC)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    """Sort intervals and merge the overlapping or touching ones."""
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if start >= end:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(window: Interval, busy: Sequence[Interval]) -> list[Interval]:
+    """
+    Subtract merged, sorted busy intervals from a single window.
+
+    Runs in O(log n + k) where k is the number of busy intervals that
+    actually overlap the window.
+    """
+    window_start, window_end = window
+    free: list[Interval] = []
+    cursor = window_start
+
+    # Busy intervals are merged, so their end times are sorted as well
+    index = bisect.bisect_right(busy, window_start, key=lambda interval: interval[1])
+    while index < len(busy):
+        busy_start, busy_end = busy[index]
+        if busy_start >= window_end:
+            break
+        if busy_start > cursor:
+            free.append((cursor, busy_start))
+        cursor = max(cursor, busy_end)
+        if cursor >= window_end:
+            break
+        index += 1
+
+    if cursor < window_end:
+        free.append((cursor, window_end))
+    return free
+
+
+def expand_rules(rules: Iterable[AvailabilityRule], start_date: date, end_date: date) -> list[Interval]:
+    """
+    Expand recurring rules into UTC windows for every date in the range.
+
+    Local times are localized per date, so DST transitions shift the UTC
+    window exactly as they do for the tutor's wall clock.
+    """
+    rules_by_day: dict[int, list[AvailabilityRule]] = {}
+    for rule in rules:
+        rules_by_day.setdefault(rule.day_of_week, []).append(rule)
+
+    windows: list[Interval] = []
+    current_date = start_date
+    while current_date <= end_date:
+        # Convert Python weekday (Mon=0, Sun=6) to JS convention (Sun=0, Sat=6)
+        day_rules = rules_by_day.get((current_date.weekday() + 1) % 7)
+        if day_rules:
+            for rule in day_rules:
+                tz = ZoneInfo(rule.timezone)
+                local_start = datetime.combine(current_date, rule.start_time, tzinfo=tz)
+                local_end = datetime.combine(current_date, rule.end_time, tzinfo=tz)
+                windows.append((local_start.astimezone(UTC), local_end.astimezone(UTC)))
+        current_date += timedelta(days=1)
+
+    windows.sort()
+    return windows
+
+
+def compute_slots(
+    rules: Iterable[AvailabilityRule],
+    busy: Iterable[Interval],
+    start_date: date,
+    end_date: date,
+    slot_minutes: int = SLOT_MINUTES,
+) -> list[Interval]:
+    """
+    Cut fixed-length slots out of availability windows minus busy time.
+
+    Slots stay aligned to the start of their availability window, so a
+    booking ending at 9:45 frees the 10:00 slot rather than creating a 9:45
+    one. The result is sorted by start time.
+    """
+    step = timedelta(minutes=slot_minutes)
+    merged_busy = merge_intervals((_as_utc(start), _as_utc(end)) for start, end in busy)
+
+    slots: list[Interval] = []
+    for window in expand_rules(rules, start_date, end_date):
+        window_start = window[0]
+        for free_start, free_end in subtract_intervals(window, merged_busy):
+            # First grid point at or after the start of the free piece
+            offset = free_start - window_start
+            steps = -(-offset // step)  # ceiling division on timedeltas
+            slot_start = window_start + steps * step
+            while slot_start + step <= free_end:
+                slots.append((slot_start, slot_start + step))
+                slot_start += step
+
+    slots.sort()
+    return slots
+
+
+def drop_past_slots(slots: Sequence[Interval], now: datetime) -> list[Interval]:
+    """Return the slots starting at or after ``now`` (slots must be sorted)."""
+    index = bisect.bisect_left(slots, (now,))
+    return list(slots[index:])
+
+
+# ============================================================================
+# Versioned slot cache
+# ============================================================================
+
+
+class SlotCache:
+    """
+    Bounded LRU cache of computed slots with a short TTL.
+
+    Keys include the tutor's availability/booking version, so bumping the
+    version makes stale entries unreachable; they then age out through the
+    LRU bound or the TTL.
+    """
+
+    def __init__(self, max_entries: int = SLOT_CACHE_MAX_ENTRIES, ttl_seconds: int = SLOT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple, tuple[list[Interval], float]] = OrderedDict()
+        self._versions: dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, tutor_profile_id: int) -> int:
+        return self._versions.get(tutor_profile_id, 0)
+
+    def bump(self, tutor_profile_id: int) -> None:
+        with self._lock:
+            self._versions[tutor_profile_id] = self._versions.get(tutor_profile_id, 0) + 1
+
+    def get(self, key: tuple) -> list[Interval] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            slots, expiry = entry
+            if time_module.monotonic() >= expiry:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return slots
+
+    def set(self, key: tuple, slots: list[Interval]) -> None:
+        with self._lock:
+            self._entries[key] = (slots, time_module.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+slot_cache = SlotCache()
+
+
+def invalidate_tutor_slots(tutor_profile_id: int) -> None:
+    """Invalidate cached slots after availability, blackout or booking writes."""
+    slot_cache.bump(tutor_profile_id)
+
+
+def _cache_key(tutor: TutorProfile, start_date: date, end_date: date) -> tuple:
+    return (tutor.id, tutor.version or 0, slot_cache.version(tutor.id), start_date, end_date)
+
+
+# ============================================================================
+# Database-backed entry points
+# ============================================================================
+
+
+def _load_inputs(
+    db: Session,
+    tutors: Sequence[TutorProfile],
+    start_date: date,
+    end_date: date,
+) -> dict[int, tuple[list[AvailabilityRule], list[Interval]]]:
+    """
+    Load rules and busy intervals for several tutors with three queries.
+
+    The busy window is padded by a day on each side because local dates
+    map to UTC instants up to ~14 hours away.
+    """
+    tutor_ids = [tutor.id for tutor in tutors]
+    profile_id_by_user = {tutor.user_id: tutor.id for tutor in tutors}
+    busy_from = datetime.combine(start_date - timedelta(days=1), time.min, tzinfo=UTC)
+    busy_until = datetime.combine(end_date + timedelta(days=2), time.min, tzinfo=UTC)
+
+    inputs: dict[int, tuple[list[AvailabilityRule], list[Interval]]] = {
+        tutor_id: ([], []) for tutor_id in tutor_ids
+    }
+
+    availabilities = (
+        db.query(TutorAvailability).filter(TutorAvailability.tutor_profile_id.in_(tutor_ids)).all()
+    )
+    for availability in availabilities:
+        inputs[availability.tutor_profile_id][0].append(AvailabilityRule.from_model(availability))
+
+    # Tutors without rules have no slots; skip their booking and blackout rows
+    active_ids = [tutor_id for tutor_id, (rules, _) in inputs.items() if rules]
+    if not active_ids:
+        return inputs
+
+    bookings = (
+        db.query(Booking.tutor_profile_id, Booking.start_time, Booking.end_time)
+        .filter(
+            Booking.tutor_profile_id.in_(active_ids),
+            Booking.session_state.in_(BLOCKING_SESSION_STATES),
+            Booking.start_time < busy_until,
+            Booking.end_time > busy_from,
+        )
+        .all()
+    )
+    for tutor_profile_id, start_time, end_time in bookings:
+        inputs[tutor_profile_id][1].append((start_time, end_time))
+
+    active_user_ids = [user_id for user_id, profile_id in profile_id_by_user.items() if profile_id in active_ids]
+    blackouts = (
+        db.query(TutorBlackout.tutor_id, TutorBlackout.start_at, TutorBlackout.end_at)
+        .filter(
+            TutorBlackout.tutor_id.in_(active_user_ids),
+            TutorBlackout.start_at < busy_until,
+            TutorBlackout.end_at > busy_from,
+        )
+        .all()
+    )
+    for tutor_user_id, start_at, end_at in blackouts:
+        inputs[profile_id_by_user[tutor_user_id]][1].append((start_at, end_at))
+
+    return inputs
+
+
+def get_available_slots_batch(
+    db: Session,
+    tutors: Sequence[TutorProfile],
+    start_dt: datetime,
+    end_dt: datetime,
+    *,
+    now: datetime | None = None,
+) -> dict[int, list[Interval]]:
+    """
+    Compute future bookable slots for several tutors in one pass.
+
+    Cached tutors are answered from memory; the rest share a single round of
+    availability, booking and blackout queries.
+
+    Returns:
+        Mapping of tutor profile id to its sorted list of (start, end) UTC slots
+    """
+    start_date = start_dt.date()
+    end_date = end_dt.date()
+    now = now or datetime.now(UTC)
+
+    computed: dict[int, list[Interval]] = {}
+    misses: list[TutorProfile] = []
+    for tutor in tutors:
+        cached = slot_cache.get(_cache_key(tutor, start_date, end_date))
+        if cached is None:
+            misses.append(tutor)
+        else:
+            computed[tutor.id] = cached
+
+    if misses:
+        inputs = _load_inputs(db, misses, start_date, end_date)
+        for tutor in misses:
+            rules, busy = inputs[tutor.id]
+            slots = compute_slots(rules, busy, start_date, end_date) if rules else []
+            slot_cache.set(_cache_key(tutor, start_date, end_date), slots)
+            computed[tutor.id] = slots
+        logger.debug("Computed slots for %d tutors (%d from cache)", len(misses), len(tutors) - len(misses))
+
+    return {tutor.id: drop_past_slots(computed[tutor.id], now) for tutor in tutors}
+
+
+def get_available_slots(
+    db: Session,
+    tutor: TutorProfile,
+    start_dt: datetime,
+    end_dt: datetime,
+    *,
+    now: datetime | None = None,
+) -> list[Interval]:
+    """Compute future bookable slots for a single tutor."""
+    return get_available_slots_batch(db, [tutor], start_dt, end_dt, now=now)[tutor.id]
+
+
+def get_next_available_slots(
+    db: Session,
+    tutors: Sequence[TutorProfile],
+    start_dt: datetime,
+    end_dt: datetime,
+    *,
+    now: datetime | None = None,
+) -> dict[int, Interval | None]:
+    """Return the earliest bookable slot per tutor (None if fully booked)."""
+    slots_by_tutor = get_available_slots_batch(db, tutors, start_dt, end_dt, now=now)
+    return {tutor_id: (slots[0] if slots else None) for tutor_id, slots in slots_by_tutor.items()}
@@ -29,7 +29,13 @@ class TutorProfileRepository(Protocol):
 
     def get_by_id(self, db, tutor_id: int) -> TutorProfileAggregate | None: ...
 
-    def list_public(self, db, filters: TutorListingFilter) -> list[TutorProfileAggregate]: ...
+    def list_public(
+        self, db, filters: TutorListingFilter, pagination
+    ) -> tuple[list[TutorProfileAggregate], int, str | None]: ...
+
+    def list_public_page(
+        self, db, filters: TutorListingFilter, page_size: int, cursor: str, *, include_total: bool = False
+    ) -> tuple[list[TutorProfileAggregate], int | None, str | None]: ...
 
     def update_about(
         self,
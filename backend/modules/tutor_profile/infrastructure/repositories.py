@@ -6,9 +6,12 @@ from dataclasses import dataclass
 from datetime import UTC
 from decimal import Decimal
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Float, cast, func
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from core.avatar_storage import build_avatar_url
+from core.avatar_storage import build_avatar_url, prefetch_avatar_urls
+from core.pagination import Keyset, cached_count, decode_cursor, split_page
+from core.search import fulltext_search_enabled, tutor_search_rank, tutor_text_filter
 from models import (
     TutorAvailability,
     TutorCertification,
@@ -94,23 +97,86 @@ class SqlAlchemyTutorProfileRepository(TutorProfileRepository):
 
     def list_public(
         self, db: Session, filters: TutorListingFilter, pagination
-    ) -> tuple[list[TutorProfileAggregate], int]:
+    ) -> tuple[list[TutorProfileAggregate], int, str | None]:
         """
         List public tutor profiles with filtering and pagination.
 
         Excludes soft-deleted tutors and their associated soft-deleted users.
-        Only shows approved tutors to students.
+        Only shows approved tutors to students. The returned cursor continues
+        after this page, so clients can switch to list_public_page.
+
+        Returns: (profiles, total, next_cursor)
         """
-        # Use eager loading base query for optimal performance
+        query, use_fulltext = self._query_public(db, filters)
+
+        # Get total count before pagination
+        total = query.count()
+
+        keyset = self._listing_keyset(filters, use_fulltext)
+        profiles, next_cursor = self._fetch_page(
+            query, keyset, f"tutors:{filters!r}", pagination.limit, offset=pagination.skip
+        )
+        return [self._to_aggregate(profile, full=False) for profile in profiles], total, next_cursor
+
+    def list_public_page(
+        self,
+        db: Session,
+        filters: TutorListingFilter,
+        page_size: int,
+        cursor: str,
+        *,
+        include_total: bool = False,
+    ) -> tuple[list[TutorProfileAggregate], int | None, str | None]:
+        """
+        Cursor-paged variant of list_public.
+
+        Continues after ``cursor`` ("" for the first page) in the same order as
+        list_public. The total is only counted with ``include_total``, and is
+        cached briefly per filter set.
+
+        Returns: (profiles, total or None, next_cursor)
+        """
+        query, use_fulltext = self._query_public(db, filters)
+        keyset = self._listing_keyset(filters, use_fulltext)
+        scope = f"tutors:{filters!r}"
+        after = decode_cursor(scope, cursor) if cursor else None
+
+        total = cached_count(db, scope, query.enable_eagerloads(False).statement) if include_total else None
+
+        profiles, next_cursor = self._fetch_page(query, keyset, scope, page_size, after=after)
+        return [self._to_aggregate(profile, full=False) for profile in profiles], total, next_cursor
+
+    @staticmethod
+    def _fetch_page(
+        query, keyset: Keyset, scope: str, page_size: int, *, after=None, offset: int = 0
+    ) -> tuple[list[TutorProfile], str | None]:
+        """One listing page in keyset order, and the cursor continuing after it."""
+        # Select the sort values next to each profile so the cursor can carry them
+        rows, next_cursor = split_page(
+            keyset.apply(query.add_columns(*(clause.element for clause in keyset.order_by)), after=after)
+            .offset(offset)
+            .limit(page_size + 1)
+            .all(),
+            page_size,
+            scope,
+            key=lambda row: tuple(row[1:]),
+        )
+        profiles = [row[0] for row in rows]
+        prefetch_avatar_urls((profile.user.avatar_key for profile in profiles if profile.user), size=160)
+        return profiles, next_cursor
+
+    def _query_public(self, db: Session, filters: TutorListingFilter):
+        """Filtered listing query for list_public, and whether it uses full-text search."""
+        # Listing cards only need subjects and education; the full aggregate
+        # (certifications, availability, pricing) is loaded by get_by_id
         # exclude_soft_deleted=True ensures soft-deleted tutors and users are filtered out
-        query = self._query_base(db, exclude_soft_deleted=True).filter(
+        query = self._query_listing(db).filter(
             TutorProfile.is_approved.is_(True),
             TutorProfile.profile_status == "approved",
         )
 
-        # Filter by subject (join only if filtering, eager load already loaded)
+        # Filter by subject (EXISTS subquery, independent of how subjects are loaded)
         if filters.subject_id is not None:
-            # The join is already loaded via joinedload, just filter
             query = query.filter(TutorProfile.subjects.any(TutorSubject.subject_id == filters.subject_id))
 
         # Filter by rate range
@@ -139,8 +205,11 @@ class SqlAlchemyTutorProfileRepository(TutorProfileRepository):
                 # Fallback for SQLite/other DBs - serialize check
                 query = query.filter(TutorProfile.languages.contains(filters.language))
 
-        # Search in title, headline, and bio
-        if filters.search_query is not None:
+        # Search in profile text (title, headline, bio, description) and tutor names
+        use_fulltext = filters.search_query is not None and fulltext_search_enabled(db)
+        if use_fulltext:
+            query = query.filter(tutor_text_filter(filters.search_query))
+        elif filters.search_query is not None:
             search = f"%{filters.search_query}%"
             query = query.filter(
                 (TutorProfile.title.ilike(search))
@@ -148,25 +217,29 @@ class SqlAlchemyTutorProfileRepository(TutorProfileRepository):
                 | (TutorProfile.bio.ilike(search))
             )
 
-        # Get total count before pagination
-        total = query.count()
+        return query, use_fulltext
+
+    @staticmethod
+    def _listing_keyset(filters: TutorListingFilter, use_fulltext: bool) -> Keyset:
+        """
+        Sort order for the public listing, ending in the id so it is total.
 
-        # Sorting
-        if filters.sort_by == "rating":
-            query = query.order_by(TutorProfile.average_rating.desc())
-        elif filters.sort_by == "rate_asc":
-            query = query.order_by(TutorProfile.hourly_rate.asc())
-        elif filters.sort_by == "rate_desc":
-            query = query.order_by(TutorProfile.hourly_rate.desc())
-        elif filters.sort_by == "experience":
-            query = query.order_by(TutorProfile.experience_years.desc())
-        else:
-            # Default sort by rating
-            query = query.order_by(TutorProfile.average_rating.desc())
-
-        # Apply pagination
-        profiles = query.offset(pagination.skip).limit(pagination.limit).all()
-        return [self._to_aggregate(profile) for profile in profiles], total
+        Nullable sort columns are coalesced so cursors can compare them.
+        """
+        rating = func.coalesce(TutorProfile.average_rating, 0)
+        if filters.sort_by == "rate_asc":
+            return Keyset(TutorProfile.hourly_rate.asc(), TutorProfile.id.asc())
+        if filters.sort_by == "rate_desc":
+            return Keyset(TutorProfile.hourly_rate.desc(), TutorProfile.id.desc())
+        if filters.sort_by == "experience":
+            return Keyset(func.coalesce(TutorProfile.experience_years, 0).desc(), TutorProfile.id.desc())
+        if filters.sort_by != "rating" and use_fulltext:
+            # Best text match first when searching without an explicit sort.
+            # Cast to double so the rank round-trips through a cursor exactly
+            rank = cast(tutor_search_rank(filters.search_query, TutorProfile.search_vector), Float)
+            return Keyset(rank.desc(), rating.desc(), TutorProfile.id.desc())
+        # Default sort by rating
+        return Keyset(rating.desc(), TutorProfile.id.desc())
 
     def update_about(
         self,
@@ -424,7 +497,11 @@ class SqlAlchemyTutorProfileRepository(TutorProfileRepository):
     # ------------------------------------------------------------------ #
     def _query_base(self, db: Session, *, exclude_soft_deleted: bool = True):
         """
-        Base query for tutor profiles with eager loading.
+        Base query for full tutor profile aggregates with eager loading.
+
+        Collections use selectinload (one extra query each) rather than
+        joinedload, which would return the product of all collection sizes
+        as rows for every tutor. Many-to-one user data stays joined.
 
         Args:
             db: Database session
@@ -435,21 +512,37 @@ class SqlAlchemyTutorProfileRepository(TutorProfileRepository):
         """
 
         query = db.query(TutorProfile).options(
-            joinedload(TutorProfile.subjects).joinedload(TutorSubject.subject),
-            joinedload(TutorProfile.availabilities),
-            joinedload(TutorProfile.certifications),
-            joinedload(TutorProfile.educations),
-            joinedload(TutorProfile.pricing_options),
+            selectinload(TutorProfile.subjects).joinedload(TutorSubject.subject),
+            selectinload(TutorProfile.availabilities),
+            selectinload(TutorProfile.certifications),
+            selectinload(TutorProfile.educations),
+            selectinload(TutorProfile.pricing_options),
             joinedload(TutorProfile.user).joinedload(User.profile),
         )
+        return self._filter_active(query) if exclude_soft_deleted else query
 
-        if exclude_soft_deleted:
-            # Filter out soft-deleted tutor profiles
-            query = query.filter(TutorProfile.deleted_at.is_(None))
-            # Also filter out profiles whose user is soft-deleted
-            query = query.join(TutorProfile.user).filter(User.deleted_at.is_(None))
+    def _query_listing(self, db: Session):
+        """
+        Slim query for public listing cards.
 
-        return query
+        Loads only what aggregate_to_public_profile renders (subjects and
+        education history) with selectinload, so offset/limit apply directly
+        to tutor_profiles rows. Soft-deleted tutors and users are excluded.
+        """
+        query = db.query(TutorProfile).options(
+            selectinload(TutorProfile.subjects).joinedload(TutorSubject.subject),
+            selectinload(TutorProfile.educations),
+            joinedload(TutorProfile.user).joinedload(User.profile),
+        )
+        return self._filter_active(query)
+
+    @staticmethod
+    def _filter_active(query):
+        """Filter out soft-deleted tutor profiles and soft-deleted users."""
+        # Filter out soft-deleted tutor profiles
+        query = query.filter(TutorProfile.deleted_at.is_(None))
+        # Also filter out profiles whose user is soft-deleted
+        return query.join(TutorProfile.user).filter(User.deleted_at.is_(None))
 
     def _ensure_profile(self, db: Session, user_id: int) -> TutorProfile:
         """
@@ -483,7 +576,13 @@ class SqlAlchemyTutorProfileRepository(TutorProfileRepository):
         profile = self._query_base(db).filter(TutorProfile.id == profile_id).first()
         return self._to_aggregate(profile)
 
-    def _to_aggregate(self, profile: TutorProfile) -> TutorProfileAggregate:
+    def _to_aggregate(self, profile: TutorProfile, *, full: bool = True) -> TutorProfileAggregate:
+        """
+        Map a tutor profile row to the domain aggregate.
+
+        With full=False (listing cards) certifications, availability and pricing
+        options are left empty instead of lazy-loading them per tutor.
+        """
         timezone = "UTC"
         if profile.user and profile.user.profile and profile.user.profile.timezone:
             timezone = profile.user.profile.timezone
@@ -509,7 +608,7 @@ class SqlAlchemyTutorProfileRepository(TutorProfileRepository):
                 # Use slot-specific timezone for DST-safe handling, fallback to user timezone
                 timezone=getattr(slot, 'timezone', None) or timezone,
             )
-            for slot in profile.availabilities
+            for slot in (profile.availabilities if full else [])
         ]
 
         certifications = [
@@ -523,7 +622,7 @@ class SqlAlchemyTutorProfileRepository(TutorProfileRepository):
                 credential_url=item.credential_url,
                 document_url=item.document_url,
             )
-            for item in profile.certifications
+            for item in (profile.certifications if full else [])
         ]
 
         educations = [
@@ -548,7 +647,7 @@ class SqlAlchemyTutorProfileRepository(TutorProfileRepository):
                 duration_minutes=item.duration_minutes,
                 price=item.price,
             )
-            for item in profile.pricing_options
+            for item in (profile.pricing_options if full else [])
         ]
 
         first_name = None
@@ -559,7 +658,8 @@ class SqlAlchemyTutorProfileRepository(TutorProfileRepository):
             last_name = getattr(profile.user, "last_name", None)
             avatar_key = getattr(profile.user, "avatar_key", None)
 
-            profile_photo_url = build_avatar_url(avatar_key, allow_absolute=True)
+            # Cards in listings get the smaller rendition, the profile page the larger one
+            profile_photo_url = build_avatar_url(avatar_key, allow_absolute=True, size=320 if full else 160)
 
         return TutorProfileAggregate(
             id=profile.id,
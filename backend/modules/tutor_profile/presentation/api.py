@@ -5,13 +5,14 @@ from io import BytesIO
 
 from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, status
 from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from core.dependencies import get_current_tutor_user, get_current_user
-from core.pagination import PaginatedResponse, PaginationParams
+from core.pagination import CursorParams, PaginatedResponse, PaginationParams
 from core.rate_limiting import limiter
 from core.storage import _extract_key_from_url, _s3_client
-from database import get_db
+from database import get_async_db, get_db
 from models import User
 from schemas import (
     TutorAboutUpdate,
@@ -304,7 +305,7 @@ def submit_profile_for_review(
 
 @router.get("", response_model=PaginatedResponse[TutorPublicProfile])
 @limiter.limit("60/minute")
-def list_tutors(
+async def list_tutors(
     request: Request,
     pagination: PaginationParams = Depends(),
     subject_id: int | None = None,
@@ -315,7 +316,8 @@ def list_tutors(
     language: str | None = None,
     search_query: str | None = None,
     sort_by: str | None = None,
-    db: Session = Depends(get_db),
+    cursor_params: CursorParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """List approved tutors with advanced filters and pagination.
 
@@ -329,18 +331,25 @@ def list_tutors(
     - sort_by: 'rating', 'rate_asc', 'rate_desc', 'experience' (default: rating)
     - page: Page number (default: 1)
     - page_size: Items per page (default: 20, max: 100)
+    - cursor: Empty for the first page, then `next_cursor` (replaces page)
+    - include_total: Count matches in cursor mode (cached briefly)
     """
-    return service.list_public_profiles(
-        db,
-        pagination=pagination,
-        subject_id=subject_id,
-        min_rate=min_rate,
-        max_rate=max_rate,
-        min_rating=min_rating,
-        min_experience=min_experience,
-        language=language,
-        search_query=search_query,
-        sort_by=sort_by,
+    # The listing goes through the sync repository, run on the async
+    # connection so the worker's event loop is not blocked
+    return await db.run_sync(
+        lambda session: service.list_public_profiles(
+            session,
+            pagination=pagination,
+            subject_id=subject_id,
+            min_rate=min_rate,
+            max_rate=max_rate,
+            min_rating=min_rating,
+            min_experience=min_experience,
+            language=language,
+            search_query=search_query,
+            sort_by=sort_by,
+            cursor_params=cursor_params,
+        )
     )
 
 
@@ -2,14 +2,12 @@
 
 import logging
 from datetime import UTC, datetime, timedelta
-from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from core.dependencies import get_current_tutor_profile
 from core.rate_limiting import limiter
-from core.timezone import is_valid_timezone
 from database import get_db
 from models import Booking, TutorAvailability, TutorBlackout, TutorProfile
 from schemas import (
@@ -20,12 +18,18 @@ from schemas import (
     TutorBlackoutCreate,
     TutorBlackoutCreateResponse,
     TutorBlackoutResponse,
+    TutorNextAvailableSlot,
 )
 
+from ..application import slot_engine
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/tutors", tags=["tutor-availability"])
 
+# Upper bound for the batched next-available lookup (one search results page)
+MAX_NEXT_AVAILABLE_TUTORS = 50
+
 
 @router.get("/{tutor_id}/available-slots", response_model=list[AvailableSlot])
 @limiter.limit("60/minute")
@@ -63,106 +67,68 @@ async def get_available_slots(
     if (end_dt - start_dt).days > 30:
         raise HTTPException(status_code=400, detail="Date range cannot exceed 30 days")
 
-    # Get tutor's recurring availability
-    availabilities = db.query(TutorAvailability).filter(TutorAvailability.tutor_profile_id == tutor_id).all()
+    # Rules, bookings and blackouts are combined with interval arithmetic and
+    # cached per tutor/version, see slot_engine for the invalidation rules
+    slots = slot_engine.get_available_slots(db, tutor, start_dt, end_dt)
 
-    if not availabilities:
-        return []
-
-    # Get existing bookings that overlap the date range
-    # Use session_state from the new booking state machine design
-    bookings = (
-        db.query(Booking)
-        .filter(
-            Booking.tutor_profile_id == tutor_id,
-            Booking.session_state.in_(["REQUESTED", "SCHEDULED"]),
-            Booking.start_time < end_dt,
-            Booking.end_time > start_dt,
-        )
-        .all()
-    )
-
-    # Generate available slots
-    available_slots = []
-    current_date = start_dt.date()
-    end_date_obj = end_dt.date()
-
-    # Log availability configuration for debugging
-    logger.debug(
-        f"Tutor {tutor_id} has {len(availabilities)} availability rules: "
-        f"{[(av.day_of_week, av.start_time, av.end_time) for av in availabilities]}"
-    )
-
-    while current_date <= end_date_obj:
-        # Convert Python weekday (Mon=0, Sun=6) to JS convention (Sun=0, Sat=6)
-        # This matches the frontend where Sunday=0, Monday=1, ..., Saturday=6
-        python_weekday = current_date.weekday()  # Monday=0, Sunday=6
-        day_of_week = (python_weekday + 1) % 7  # Convert to Sunday=0, Saturday=6
-
-        # Find availability rules for this day
-        day_availabilities = [av for av in availabilities if av.day_of_week == day_of_week]
+    return [
+        {
+            "start_time": slot_start.isoformat(),
+            "end_time": slot_end.isoformat(),
+            "duration_minutes": slot_engine.SLOT_MINUTES,
+        }
+        for slot_start, slot_end in slots
+    ]
 
-        if day_availabilities:
-            logger.debug(
-                f"Date {current_date} ({current_date.strftime('%A')}) -> "
-                f"Python weekday={python_weekday}, JS day_of_week={day_of_week}, "
-                f"found {len(day_availabilities)} matching rules"
-            )
 
-        for availability in day_availabilities:
-            # Generate 30-minute slots within availability window
-            slot_start_time = availability.start_time
-            slot_end_time = availability.end_time
-
-            # Get the timezone for this availability slot (DST-safe)
-            # This ensures proper UTC conversion even during DST transitions
-            avail_tz_str = getattr(availability, 'timezone', None) or "UTC"
-            if not is_valid_timezone(avail_tz_str):
-                avail_tz_str = "UTC"
-            avail_tz = ZoneInfo(avail_tz_str)
-
-            # Convert time to datetime in the tutor's timezone first, then to UTC
-            # This handles DST correctly - e.g., 9am EST becomes different UTC times
-            # depending on whether DST is in effect on that specific date
-            local_start = datetime.combine(current_date, slot_start_time)
-            local_end = datetime.combine(current_date, slot_end_time)
-
-            # Localize to tutor's timezone (this applies correct DST offset for the date)
-            local_start_aware = local_start.replace(tzinfo=avail_tz)
-            local_end_aware = local_end.replace(tzinfo=avail_tz)
-
-            # Convert to UTC for consistent comparison with bookings
-            current_slot = local_start_aware.astimezone(ZoneInfo("UTC"))
-            end_boundary = local_end_aware.astimezone(ZoneInfo("UTC"))
-
-            while current_slot + timedelta(minutes=30) <= end_boundary:
-                slot_end = current_slot + timedelta(minutes=30)
-
-                # Skip past slots (use UTC for comparison)
-                now_utc = datetime.now(UTC)
-                if current_slot < now_utc:
-                    current_slot = slot_end
-                    continue
-
-                # Check if slot conflicts with existing bookings (both are now timezone-aware)
-                is_booked = any(
-                    booking.start_time < slot_end and booking.end_time > current_slot for booking in bookings
-                )
+@router.get("/available-slots/next", response_model=list[TutorNextAvailableSlot])
+@limiter.limit("60/minute")
+async def get_next_available_slots(
+    request: Request,
+    response: Response,
+    tutor_ids: list[int] = Query(..., description="Tutor profile IDs (repeat the parameter)"),
+    days: int = Query(14, ge=1, le=30, description="How many days ahead to search"),
+    db: Session = Depends(get_db),
+):
+    """
+    Get the earliest available slot for several tutors in one request.
 
-                if not is_booked:
-                    available_slots.append(
-                        {
-                            "start_time": current_slot.isoformat(),
-                            "end_time": slot_end.isoformat(),
-                            "duration_minutes": 30,
-                        }
-                    )
+    Intended for search result pages showing "next available" on each tutor card.
+    Unknown or unapproved tutors are omitted from the response.
+    """
+    if len(tutor_ids) > MAX_NEXT_AVAILABLE_TUTORS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot request more than {MAX_NEXT_AVAILABLE_TUTORS} tutors at once",
+        )
 
-                current_slot = slot_end
+    response.headers["Cache-Control"] = "private, max-age=30"
+    now = datetime.now(UTC)
+    response.headers["X-Slots-Generated-At"] = now.isoformat()
 
-        current_date += timedelta(days=1)
+    tutors = (
+        db.query(TutorProfile)
+        .filter(TutorProfile.id.in_(set(tutor_ids)), TutorProfile.is_approved.is_(True))
+        .all()
+    )
+    if not tutors:
+        return []
 
-    return available_slots
+    next_slots = slot_engine.get_next_available_slots(db, tutors, now, now + timedelta(days=days), now=now)
+
+    results = []
+    for tutor_id in dict.fromkeys(tutor_ids):
+        if tutor_id not in next_slots:
+            continue
+        slot = next_slots[tutor_id]
+        results.append(
+            {
+                "tutor_profile_id": tutor_id,
+                "start_time": slot[0].isoformat() if slot else None,
+                "end_time": slot[1].isoformat() if slot else None,
+            }
+        )
+    return results
 
 
 @router.get("/availability", response_model=list[TutorAvailabilityResponse])
@@ -236,6 +202,7 @@ async def create_availability(
         db.add(availability)
         db.commit()
         db.refresh(availability)
+        slot_engine.invalidate_tutor_slots(profile.id)
 
         logger.info(
             f"Availability created for tutor profile {profile.id}: "
@@ -274,6 +241,7 @@ async def delete_availability(
     try:
         db.delete(availability)
         db.commit()
+        slot_engine.invalidate_tutor_slots(profile.id)
         logger.info(f"Availability {availability_id} deleted by tutor {profile.user.email}")
     except Exception as e:
         db.rollback()
@@ -337,6 +305,7 @@ async def create_bulk_availability(
             created_slots.append(availability)
 
         db.commit()
+        slot_engine.invalidate_tutor_slots(profile.id)
         logger.info(f"Bulk availability created for tutor profile {profile.id}: {len(created_slots)} slots, {skipped_count} skipped")
         return {
             "message": f"Successfully created {len(created_slots)} availability slots",
@@ -437,6 +406,7 @@ async def create_blackout(
         db.add(blackout)
         db.commit()
         db.refresh(blackout)
+        slot_engine.invalidate_tutor_slots(profile.id)
 
         logger.info(
             f"Blackout created for tutor {profile.user_id}: "
@@ -511,6 +481,7 @@ async def delete_blackout(
     try:
         db.delete(blackout)
         db.commit()
+        slot_engine.invalidate_tutor_slots(profile.id)
         logger.info(f"Blackout {blackout_id} deleted by tutor {profile.user.email}")
     except Exception as e:
         db.rollback()
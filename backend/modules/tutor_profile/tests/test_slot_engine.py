@@ -0,0 +1,212 @@
+"""
+Tests for the available-slot engine.
+Covers interval arithmetic, DST-aware rule expansion and the versioned cache.
+"""
+
+from datetime import UTC, date, datetime, time, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from modules.tutor_profile.application import slot_engine
+from modules.tutor_profile.application.slot_engine import (
+    AvailabilityRule,
+    SlotCache,
+    compute_slots,
+    drop_past_slots,
+    expand_rules,
+    merge_intervals,
+    subtract_intervals,
+)
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=UTC)
+
+
+# 2030-01-07 is a Monday (day_of_week=1 in the frontend convention)
+MONDAY = date(2030, 1, 7)
+MONDAY_9_TO_11 = AvailabilityRule(day_of_week=1, start_time=time(9, 0), end_time=time(11, 0))
+
+
+@pytest.fixture(autouse=True)
+def reset_slot_cache():
+    slot_engine.slot_cache.clear()
+    yield
+    slot_engine.slot_cache.clear()
+
+
+# ============================================================================
+# Interval arithmetic
+# ============================================================================
+
+
+class TestIntervalArithmetic:
+    def test_merge_overlapping_and_touching(self):
+        merged = merge_intervals(
+            [
+                (utc(2030, 1, 7, 12), utc(2030, 1, 7, 13)),
+                (utc(2030, 1, 7, 9), utc(2030, 1, 7, 10)),
+                (utc(2030, 1, 7, 10), utc(2030, 1, 7, 11)),
+                (utc(2030, 1, 7, 9, 30), utc(2030, 1, 7, 9, 45)),
+            ]
+        )
+        assert merged == [
+            (utc(2030, 1, 7, 9), utc(2030, 1, 7, 11)),
+            (utc(2030, 1, 7, 12), utc(2030, 1, 7, 13)),
+        ]
+
+    def test_merge_skips_empty_intervals(self):
+        assert merge_intervals([(utc(2030, 1, 7, 9), utc(2030, 1, 7, 9))]) == []
+
+    def test_subtract_splits_window(self):
+        window = (utc(2030, 1, 7, 9), utc(2030, 1, 7, 17))
+        busy = [
+            (utc(2030, 1, 7, 8), utc(2030, 1, 7, 9, 30)),
+            (utc(2030, 1, 7, 12), utc(2030, 1, 7, 13)),
+            (utc(2030, 1, 7, 18), utc(2030, 1, 7, 19)),
+        ]
+        assert subtract_intervals(window, busy) == [
+            (utc(2030, 1, 7, 9, 30), utc(2030, 1, 7, 12)),
+            (utc(2030, 1, 7, 13), utc(2030, 1, 7, 17)),
+        ]
+
+    def test_subtract_fully_covered_window(self):
+        window = (utc(2030, 1, 7, 9), utc(2030, 1, 7, 10))
+        assert subtract_intervals(window, [(utc(2030, 1, 7, 8), utc(2030, 1, 7, 11))]) == []
+
+    def test_drop_past_slots_keeps_slot_starting_now(self):
+        slots = [
+            (utc(2030, 1, 7, 9), utc(2030, 1, 7, 9, 30)),
+            (utc(2030, 1, 7, 9, 30), utc(2030, 1, 7, 10)),
+        ]
+        assert drop_past_slots(slots, utc(2030, 1, 7, 9, 30)) == slots[1:]
+
+
+# ============================================================================
+# Slot computation
+# ============================================================================
+
+
+class TestComputeSlots:
+    def test_rule_expands_to_thirty_minute_slots(self):
+        slots = compute_slots([MONDAY_9_TO_11], [], MONDAY, MONDAY + timedelta(days=6))
+        assert [start.hour * 60 + start.minute for start, _ in slots] == [540, 570, 600, 630]
+        assert all(end - start == timedelta(minutes=30) for start, end in slots)
+
+    def test_booking_removes_overlapping_slots_and_keeps_grid(self):
+        booking = (utc(2030, 1, 7, 9, 15), utc(2030, 1, 7, 9, 45))
+        slots = compute_slots([MONDAY_9_TO_11], [booking], MONDAY, MONDAY)
+        # 9:00 and 9:30 overlap the booking; the next slot stays on the 10:00 grid
+        assert [start for start, _ in slots] == [utc(2030, 1, 7, 10), utc(2030, 1, 7, 10, 30)]
+
+    def test_blackout_and_booking_are_both_subtracted(self):
+        busy = [
+            (utc(2030, 1, 7, 9), utc(2030, 1, 7, 9, 30)),
+            (utc(2030, 1, 7, 10), utc(2030, 1, 8, 0)),
+        ]
+        slots = compute_slots([MONDAY_9_TO_11], busy, MONDAY, MONDAY)
+        assert slots == [(utc(2030, 1, 7, 9, 30), utc(2030, 1, 7, 10))]
+
+    def test_naive_busy_times_are_treated_as_utc(self):
+        booking = (datetime(2030, 1, 7, 9), datetime(2030, 1, 7, 11))
+        assert compute_slots([MONDAY_9_TO_11], [booking], MONDAY, MONDAY) == []
+
+    def test_matches_brute_force_reference(self):
+        rules = [
+            MONDAY_9_TO_11,
+            AvailabilityRule(day_of_week=2, start_time=time(13, 0), end_time=time(18, 0), timezone="Europe/Berlin"),
+        ]
+        busy = [
+            (utc(2030, 1, 7, 9, 10), utc(2030, 1, 7, 9, 20)),
+            (utc(2030, 1, 8, 12, 0), utc(2030, 1, 8, 13, 5)),
+            (utc(2030, 1, 8, 15, 30), utc(2030, 1, 8, 16, 0)),
+        ]
+        start_date, end_date = MONDAY, MONDAY + timedelta(days=1)
+
+        expected = []
+        for window_start, window_end in expand_rules(rules, start_date, end_date):
+            slot_start = window_start
+            while slot_start + timedelta(minutes=30) <= window_end:
+                slot_end = slot_start + timedelta(minutes=30)
+                if not any(b_start < slot_end and b_end > slot_start for b_start, b_end in busy):
+                    expected.append((slot_start, slot_end))
+                slot_start = slot_end
+
+        assert compute_slots(rules, busy, start_date, end_date) == sorted(expected)
+
+
+class TestExpandRules:
+    def test_local_rule_follows_dst(self):
+        rule = AvailabilityRule(day_of_week=1, start_time=time(9, 0), end_time=time(10, 0), timezone="America/New_York")
+        winter = expand_rules([rule], date(2030, 1, 7), date(2030, 1, 7))
+        summer = expand_rules([rule], date(2030, 7, 1), date(2030, 7, 1))
+        assert winter == [(utc(2030, 1, 7, 14), utc(2030, 1, 7, 15))]
+        assert summer == [(utc(2030, 7, 1, 13), utc(2030, 7, 1, 14))]
+
+    def test_invalid_model_timezone_falls_back_to_utc(self):
+        availability = MagicMock(day_of_week=1, start_time=time(9, 0), end_time=time(10, 0), timezone="Mars/Base")
+        assert AvailabilityRule.from_model(availability).timezone == "UTC"
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+
+class TestSlotCache:
+    def test_lru_bound_evicts_oldest(self):
+        cache = SlotCache(max_entries=2)
+        cache.set(("a",), [])
+        cache.set(("b",), [])
+        cache.get(("a",))
+        cache.set(("c",), [])
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) == []
+
+    def test_expired_entry_is_a_miss(self):
+        cache = SlotCache(ttl_seconds=0)
+        cache.set(("a",), [])
+        assert cache.get(("a",)) is None
+        assert cache.stats()["misses"] == 1
+
+    def test_invalidation_changes_cache_key(self):
+        tutor = MagicMock(id=7, version=3, user_id=70)
+        before = slot_engine._cache_key(tutor, MONDAY, MONDAY)
+        slot_engine.invalidate_tutor_slots(7)
+        assert slot_engine._cache_key(tutor, MONDAY, MONDAY) != before
+
+    def test_batch_serves_cached_tutors_without_queries(self, monkeypatch):
+        tutor = MagicMock(id=7, version=1, user_id=70)
+        load_inputs = MagicMock(return_value={7: ([MONDAY_9_TO_11], [])})
+        monkeypatch.setattr(slot_engine, "_load_inputs", load_inputs)
+        db = MagicMock()
+        start, end = utc(2030, 1, 7), utc(2030, 1, 8)
+        now = utc(2030, 1, 1)
+
+        first = slot_engine.get_available_slots(db, tutor, start, end, now=now)
+        second = slot_engine.get_available_slots(db, tutor, start, end, now=now)
+
+        assert first == second
+        assert len(first) == 4
+        load_inputs.assert_called_once()
+
+    def test_next_available_returns_earliest_or_none(self, monkeypatch):
+        busy_tutor = MagicMock(id=1, version=1, user_id=10)
+        free_tutor = MagicMock(id=2, version=1, user_id=20)
+        monkeypatch.setattr(
+            slot_engine,
+            "_load_inputs",
+            MagicMock(
+                return_value={
+                    1: ([MONDAY_9_TO_11], [(utc(2030, 1, 7, 9), utc(2030, 1, 7, 11))]),
+                    2: ([MONDAY_9_TO_11], []),
+                }
+            ),
+        )
+
+        result = slot_engine.get_next_available_slots(
+            MagicMock(), [busy_tutor, free_tutor], utc(2030, 1, 7), utc(2030, 1, 8), now=utc(2030, 1, 7, 9, 1)
+        )
+
+        assert result == {1: None, 2: (utc(2030, 1, 7, 9, 30), utc(2030, 1, 7, 10))}
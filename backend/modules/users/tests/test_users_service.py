@@ -36,6 +36,7 @@ class TestAvatarService:
         storage.url_ttl.return_value = 3600
         storage.generate_presigned_url = AsyncMock(return_value="https://storage.example.com/avatar.webp")
         storage.upload_file = AsyncMock()
+        storage.upload_objects = AsyncMock()
         storage.delete_file = AsyncMock()
         return storage
 
@@ -97,8 +98,10 @@ class TestAvatarService:
 
         assert result.avatar_url is not None
         assert result.expires_at > datetime.now(UTC)
-        mock_storage.upload_file.assert_called_once()
-        assert student_user.avatar_key is not None
+        mock_storage.upload_objects.assert_awaited_once()
+        uploaded = mock_storage.upload_objects.await_args.args[0]
+        assert [key.rsplit("/", 1)[1] for key, _, _ in uploaded] == ["320.webp", "160.webp", "80.webp"]
+        assert student_user.avatar_key == uploaded[0][0]
 
     @pytest.mark.asyncio
     async def test_upload_avatar_replaces_old(
@@ -210,12 +213,28 @@ class TestAvatarService:
         self, avatar_service, student_user: User, valid_image_upload, mock_storage
     ):
         """Test that storage failures don't leave orphaned records."""
-        mock_storage.upload_file = AsyncMock(side_effect=Exception("Storage error"))
+        mock_storage.upload_objects = AsyncMock(side_effect=Exception("Storage error"))
 
         with pytest.raises(Exception):
             await avatar_service.upload_for_user(student_user, valid_image_upload)
 
         assert student_user.avatar_key is None
+        # Renditions written before the failure are removed
+        assert mock_storage.delete_file.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_delete_avatar_removes_all_renditions(
+        self, avatar_service, student_user: User, mock_storage, db_session
+    ):
+        """Test that deleting an avatar removes every stored rendition."""
+        token = "0123456789abcdef0123456789abcdef"
+        student_user.avatar_key = f"avatars/123/{token}/320.webp"
+        db_session.commit()
+
+        await avatar_service.delete_for_user(student_user)
+
+        deleted = {call.args[0] for call in mock_storage.delete_file.await_args_list}
+        assert deleted == {f"avatars/123/{token}/{size}.webp" for size in (320, 160, 80)}
 
 
 class TestAvatarRouter:
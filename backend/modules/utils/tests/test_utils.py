@@ -398,17 +398,17 @@ class TestInvalidateCache:
         get_data()
         assert call_count == 2
 
-    def test_invalidate_cache_with_pattern(self):
-        """Test invalidating cache entries matching a pattern."""
-        from core.cache import cache_with_ttl, get_cache_stats, invalidate_cache
+    def test_invalidate_cache_by_namespace(self):
+        """Test invalidating cache entries of one namespace."""
+        from core.cache import cache_with_ttl, get_cache_metrics, invalidate_cache
 
         invalidate_cache()
 
-        @cache_with_ttl(ttl_seconds=60)
+        @cache_with_ttl(ttl_seconds=60, namespace="get_user_data")
         def get_user_data():
             return "user"
 
-        @cache_with_ttl(ttl_seconds=60)
+        @cache_with_ttl(ttl_seconds=60, namespace="get_product_data")
         def get_product_data():
             return "product"
 
@@ -416,43 +416,39 @@ class TestInvalidateCache:
         get_user_data()
         get_product_data()
 
-        stats = get_cache_stats()
-        assert stats["total_entries"] >= 2
+        stats = get_cache_metrics()
+        assert stats["entries"] >= 2
 
         # Invalidate only user cache
         invalidate_cache("get_user_data")
 
         # User cache should be cleared, product should remain
-        stats = get_cache_stats()
-        user_keys = [k for k in stats["keys"] if "get_user_data" in k]
-        product_keys = [k for k in stats["keys"] if "get_product_data" in k]
-
-        assert len(user_keys) == 0
-        assert len(product_keys) >= 1
+        namespaces = get_cache_metrics()["namespaces"]
+        assert namespaces["get_user_data"]["entries"] == 0
+        assert namespaces["get_product_data"]["entries"] >= 1
 
 
 class TestCacheStats:
     """Tests for cache statistics."""
 
-    def test_get_cache_stats(self):
+    def test_get_cache_metrics(self):
         """Test getting cache statistics."""
-        from core.cache import cache_with_ttl, get_cache_stats, invalidate_cache
+        from core.cache import cache_with_ttl, get_cache_metrics, invalidate_cache
 
         invalidate_cache()
 
-        @cache_with_ttl(ttl_seconds=60)
+        @cache_with_ttl(ttl_seconds=60, namespace="cached_func")
         def cached_func():
             return "data"
 
-        # Populate cache
+        # Populate cache, then hit it
+        cached_func()
         cached_func()
 
-        stats = get_cache_stats()
-        assert "total_entries" in stats
-        assert "valid_entries" in stats
-        assert "expired_entries" in stats
-        assert "keys" in stats
-        assert stats["total_entries"] >= 1
+        stats = get_cache_metrics()
+        assert stats["entries"] >= 1
+        assert stats["namespaces"]["cached_func"]["misses"] == 1
+        assert stats["namespaces"]["cached_func"]["hits"] == 1
 
 
 # =============================================================================
@@ -335,6 +335,14 @@ class AvailableSlot(BaseModel):
     duration_minutes: int
 
 
+class TutorNextAvailableSlot(BaseModel):
+    """Earliest available slot for a tutor (null times when fully booked)."""
+
+    tutor_profile_id: int
+    start_time: str | None = None  # ISO format datetime
+    end_time: str | None = None  # ISO format datetime
+
+
 class TutorCertificationInput(BaseModel):
     """Tutor certification input."""
 
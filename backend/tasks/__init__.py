@@ -8,16 +8,45 @@ Modules:
         - expire_requests: REQUESTED -> EXPIRED (every 5 min, 24h timeout)
         - start_sessions: SCHEDULED -> ACTIVE (every 1 min, at start_time)
         - end_sessions: ACTIVE -> ENDED (every 1 min, at end_time + grace)
+        - process_transition_shard: one shard of a fanned-out batch run
+    admin_tasks: Dashboard metrics maintenance
+        - refresh_daily_metrics: daily_metrics_rollup refresh (every 5 min, full daily)
+    message_tasks: Messaging maintenance
+        - sync_conversations: conversation backfill and inbox counter repair (daily)
+    notification_tasks: Notification delivery
+        - deliver_notification_emails: notification outbox email sending (every 10 sec)
+    payment_tasks: Payment processing
+        - process_stripe_webhooks: Stripe webhook inbox retries and catch-up (every 10 sec)
+        - reconcile_tutor_earnings: lifetime earnings (commission tier) repair (daily)
+    review_tasks: Review maintenance
+        - rebuild_tutor_ratings: rating aggregate (sum, count, histogram) repair (daily)
 
 Migration Note:
     These tasks replace the APScheduler jobs in modules/bookings/jobs.py.
     The APScheduler implementation is deprecated but retained for incremental migration.
 """
 
-from tasks.booking_tasks import end_sessions, expire_requests, start_sessions
+from tasks.admin_tasks import refresh_daily_metrics
+from tasks.booking_tasks import (
+    end_sessions,
+    expire_requests,
+    process_transition_shard,
+    start_sessions,
+)
+from tasks.message_tasks import sync_conversations
+from tasks.notification_tasks import deliver_notification_emails
+from tasks.payment_tasks import process_stripe_webhooks, reconcile_tutor_earnings
+from tasks.review_tasks import rebuild_tutor_ratings
 
 __all__ = [
     "expire_requests",
     "start_sessions",
     "end_sessions",
+    "process_transition_shard",
+    "refresh_daily_metrics",
+    "sync_conversations",
+    "deliver_notification_emails",
+    "process_stripe_webhooks",
+    "reconcile_tutor_earnings",
+    "rebuild_tutor_ratings",
 ]
@@ -0,0 +1,47 @@
+"""
+Celery tasks for admin and owner dashboard metrics.
+
+- refresh_daily_metrics: incremental refresh of daily_metrics_rollup (every 5 min)
+  and a full recompute once a day (see modules/admin/infrastructure/metrics_rollup.py)
+"""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    name="tasks.admin_tasks.refresh_daily_metrics",
+    max_retries=3,
+    default_retry_delay=60,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+)
+def refresh_daily_metrics(self, full: bool = False) -> dict:
+    """
+    Recompute the days in daily_metrics_rollup touched since the last refresh.
+
+    Args:
+        full: Recompute every day instead (nightly reconciliation)
+
+    Returns:
+        dict with the number of days refreshed
+    """
+    from database import SessionLocal
+    from modules.admin.infrastructure.metrics_rollup import refresh_daily_metrics as refresh
+
+    db = SessionLocal()
+    try:
+        days = refresh(db, full=full)
+        return {"days": days, "full": full}
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error refreshing daily metrics rollup: {e}", exc_info=True)
+        raise self.retry(exc=e)
+    finally:
+        db.close()
@@ -11,6 +11,13 @@ Race Condition Prevention:
 - Transitions are idempotent, so concurrent updates don't cause errors
 - Each booking is processed in its own transaction to minimize lock contention
 
+Batch Mode (BOOKING_JOB_BATCH_SIZE > 0):
+- Due bookings are claimed in chunks with SELECT FOR UPDATE SKIP LOCKED,
+  transitioned in memory and written with bulk UPDATE ... RETURNING
+- Each chunk commits on its own (see modules/bookings/batch_jobs.py)
+- With BOOKING_JOB_WORKERS > 1 a run fans out into process_transition_shard
+  tasks, each claiming only bookings with id % workers == shard
+
 Clock Skew Handling:
 - Uses database server time for critical time comparisons
 - Periodically checks and logs clock skew between app and database servers
@@ -24,7 +31,7 @@ Migration Note:
 import logging
 from datetime import timedelta
 
-from celery import shared_task
+from celery import group, shared_task
 from sqlalchemy import and_
 from sqlalchemy.exc import OperationalError
 
@@ -34,6 +41,108 @@ logger = logging.getLogger(__name__)
 REQUEST_EXPIRY_HOURS = 24  # Requests expire after 24 hours
 SESSION_END_GRACE_MINUTES = 5  # Grace period after end_time before auto-ending
 
+# Result key for the transitioned count of each job (matches the per-booking results)
+BATCH_RESULT_KEYS = {
+    "expire_requests": "expired",
+    "start_sessions": "started",
+    "end_sessions": "ended",
+}
+
+
+def _build_batch_transition(job: str, now):
+    """Batch equivalent of each task's candidate query and transition."""
+    from modules.bookings.batch_jobs import (
+        end_sessions_transition,
+        expire_requests_transition,
+        start_sessions_transition,
+    )
+
+    if job == "expire_requests":
+        return expire_requests_transition(now - timedelta(hours=REQUEST_EXPIRY_HOURS))
+    if job == "start_sessions":
+        return start_sessions_transition(now)
+    if job == "end_sessions":
+        # Default to COMPLETED outcome for auto-ended sessions
+        return end_sessions_transition(now - timedelta(minutes=SESSION_END_GRACE_MINUTES))
+    raise ValueError(f"Unknown booking batch job: {job}")
+
+
+def _run_batch_job(job: str, shard_index: int = 0, shard_count: int = 1) -> dict:
+    """Run one job (or one shard of it) in batch mode and summarize the run."""
+    from core.clock_skew import get_db_time, get_job_skew_monitor
+    from core.config import settings
+    from database import SessionLocal
+    from modules.bookings.batch_jobs import run_batch_transition
+
+    db = SessionLocal()
+    try:
+        get_job_skew_monitor().check_and_warn(db)
+        now = get_db_time(db)
+        metrics = run_batch_transition(
+            db,
+            _build_batch_transition(job, now),
+            chunk_size=settings.BOOKING_JOB_BATCH_SIZE,
+            shard_index=shard_index,
+            shard_count=shard_count,
+        )
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    return {
+        BATCH_RESULT_KEYS[job]: metrics.transitioned,
+        "skipped": metrics.skipped,
+        "errors": metrics.errors,
+        "metrics": metrics.as_dict(),
+    }
+
+
+def _dispatch_batch_job(job: str) -> dict:
+    """Run a job in batch mode inline, or fan it out across shard tasks."""
+    from core.config import settings
+
+    workers = settings.BOOKING_JOB_WORKERS
+    if workers <= 1:
+        return _run_batch_job(job)
+
+    group(
+        process_transition_shard.s(job, shard_index, workers)
+        for shard_index in range(workers)
+    ).apply_async(queue="bookings")
+    logger.debug("Dispatched %s across %d shard tasks", job, workers)
+    return {"dispatched_shards": workers}
+
+
+@shared_task(
+    bind=True,
+    name="tasks.booking_tasks.process_transition_shard",
+    max_retries=3,
+    default_retry_delay=30,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=300,
+    retry_jitter=True,
+)
+def process_transition_shard(self, job: str, shard_index: int, shard_count: int) -> dict:
+    """
+    Process one shard of a fanned-out batch run.
+
+    Claims only bookings with ``id % shard_count == shard_index``; SKIP LOCKED
+    keeps shards safe even if a retried shard overlaps a later run.
+
+    Returns:
+        dict: Summary of processed bookings including throughput metrics
+    """
+    try:
+        return _run_batch_job(job, shard_index, shard_count)
+    except Exception as e:
+        logger.error(
+            "Error in %s shard %d/%d: %s", job, shard_index, shard_count, e
+        )
+        raise self.retry(exc=e)
+
 
 @shared_task(
     bind=True,
@@ -60,6 +169,7 @@ def expire_requests(self) -> dict:
     """
     # Import inside task to avoid circular imports and ensure fresh DB session
     from core.clock_skew import get_db_time, get_job_skew_monitor
+    from core.config import settings
     from database import SessionLocal
     from models import Booking
     from modules.bookings.domain.state_machine import BookingStateMachine
@@ -67,6 +177,13 @@ def expire_requests(self) -> dict:
 
     logger.debug("Running expire_requests task")
 
+    if settings.BOOKING_JOB_BATCH_SIZE > 0:
+        try:
+            return _dispatch_batch_job("expire_requests")
+        except Exception as e:
+            logger.error("Error in expire_requests task: %s", e)
+            raise self.retry(exc=e)
+
     db = SessionLocal()
     result = {"expired": 0, "skipped": 0, "errors": 0}
 
@@ -167,6 +284,7 @@ def start_sessions(self) -> dict:
         dict: Summary of processed sessions
     """
     from core.clock_skew import get_db_time, get_job_skew_monitor
+    from core.config import settings
     from database import SessionLocal
     from models import Booking
     from modules.bookings.domain.state_machine import BookingStateMachine
@@ -174,6 +292,13 @@ def start_sessions(self) -> dict:
 
     logger.debug("Running start_sessions task")
 
+    if settings.BOOKING_JOB_BATCH_SIZE > 0:
+        try:
+            return _dispatch_batch_job("start_sessions")
+        except Exception as e:
+            logger.error("Error in start_sessions task: %s", e)
+            raise self.retry(exc=e)
+
     db = SessionLocal()
     result = {"started": 0, "skipped": 0, "errors": 0}
 
@@ -272,6 +397,7 @@ def end_sessions(self) -> dict:
         dict: Summary of processed sessions
     """
     from core.clock_skew import get_db_time, get_job_skew_monitor
+    from core.config import settings
     from database import SessionLocal
     from models import Booking
     from modules.bookings.domain.state_machine import BookingStateMachine
@@ -279,6 +405,13 @@ def end_sessions(self) -> dict:
 
     logger.debug("Running end_sessions task")
 
+    if settings.BOOKING_JOB_BATCH_SIZE > 0:
+        try:
+            return _dispatch_batch_job("end_sessions")
+        except Exception as e:
+            logger.error("Error in end_sessions task: %s", e)
+            raise self.retry(exc=e)
+
     db = SessionLocal()
     result = {"ended": 0, "skipped": 0, "errors": 0}
 
@@ -0,0 +1,48 @@
+"""
+Celery tasks for messaging maintenance.
+
+- sync_conversations: files messages without a conversation and repairs drifted
+  inbox counters (daily; see modules/messages/infrastructure/conversation_sync.py)
+"""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    name="tasks.message_tasks.sync_conversations",
+    max_retries=3,
+    default_retry_delay=60,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+)
+def sync_conversations(self) -> dict:
+    """
+    Backfill conversations for unfiled messages, then repair every conversation.
+
+    Returns:
+        dict with the number of messages filed and conversations repaired
+    """
+    from database import SessionLocal
+    from modules.messages.infrastructure.conversation_sync import (
+        backfill_conversations,
+        repair_conversations,
+    )
+
+    db = SessionLocal()
+    try:
+        filed = backfill_conversations(db)
+        repaired = repair_conversations(db)
+        return {"filed": filed, "repaired": repaired}
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error syncing conversations: {e}", exc_info=True)
+        raise self.retry(exc=e)
+    finally:
+        db.close()
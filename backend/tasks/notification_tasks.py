@@ -0,0 +1,47 @@
+"""
+Celery tasks for notification delivery.
+
+- deliver_notification_emails: drains the notification outbox, sending queued
+  notification emails through Brevo in batches (every 10 seconds; see
+  modules/notifications/infrastructure/outbox.py)
+"""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    name="tasks.notification_tasks.deliver_notification_emails",
+    max_retries=3,
+    default_retry_delay=10,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=300,
+    retry_jitter=True,
+)
+def deliver_notification_emails(self) -> dict:
+    """
+    Send due notification emails from the outbox.
+
+    Per-email failures are recorded on the outbox rows and retried on a later
+    run; this task only retries when the run itself fails (e.g. database down).
+
+    Returns:
+        dict with the number of outbox rows sent, retried, failed and coalesced
+    """
+    from database import SessionLocal
+    from modules.notifications.infrastructure.outbox import deliver_pending_emails
+
+    db = SessionLocal()
+    try:
+        return deliver_pending_emails(db)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error delivering notification emails: {e}", exc_info=True)
+        raise self.retry(exc=e)
+    finally:
+        db.close()
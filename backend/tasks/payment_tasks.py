@@ -0,0 +1,84 @@
+"""
+Celery tasks for payments.
+
+- process_stripe_webhooks: handles stored Stripe webhook events that are due,
+  i.e. retries after failures and any event not handled right after its
+  delivery (every 10 seconds; see modules/payments/infrastructure/webhook_inbox.py)
+- reconcile_tutor_earnings: repairs drift in tutors' running lifetime earnings,
+  the commission tier input (daily; see core/tutor_earnings.py)
+"""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    name="tasks.payment_tasks.process_stripe_webhooks",
+    max_retries=3,
+    default_retry_delay=10,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=300,
+    retry_jitter=True,
+)
+def process_stripe_webhooks(self) -> dict:
+    """
+    Handle due Stripe webhook events from the inbox.
+
+    Per-event failures are recorded on the webhook_events rows and retried on
+    a later run; this task only retries when the run itself fails (e.g.
+    database down).
+
+    Returns:
+        dict with the number of events processed, retried and dead-lettered
+    """
+    from database import SessionLocal
+    from modules.payments.infrastructure.webhook_inbox import process_pending_events
+    from modules.payments.router import handle_webhook_event
+
+    try:
+        return process_pending_events(SessionLocal, handle_webhook_event)
+    except Exception as e:
+        logger.error(f"Error processing Stripe webhook events: {e}", exc_info=True)
+        raise self.retry(exc=e)
+
+
+@shared_task(
+    bind=True,
+    name="tasks.payment_tasks.reconcile_tutor_earnings",
+    max_retries=3,
+    default_retry_delay=60,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+)
+def reconcile_tutor_earnings(self) -> dict:
+    """
+    Repair tutors' running lifetime earnings from their completed bookings.
+
+    The totals are adjusted as bookings change (see core/tutor_earnings.py);
+    this catches writes that bypass that path, e.g. cascaded deletes.
+
+    Returns:
+        dict with the number of tutors whose total was corrected
+    """
+    from core.tutor_earnings import reconcile_lifetime_earnings
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        corrected = reconcile_lifetime_earnings(db)
+        if corrected:
+            logger.warning(f"Corrected lifetime earnings for {corrected} tutors")
+        return {"corrected": corrected}
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error reconciling tutor earnings: {e}", exc_info=True)
+        raise self.retry(exc=e)
+    finally:
+        db.close()
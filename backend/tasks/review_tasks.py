@@ -0,0 +1,49 @@
+"""
+Celery tasks for review maintenance.
+
+- rebuild_tutor_ratings: rebuilds tutors' rating aggregates that drifted from
+  their reviews (daily; see core/tutor_ratings.py)
+"""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    name="tasks.review_tasks.rebuild_tutor_ratings",
+    max_retries=3,
+    default_retry_delay=60,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+)
+def rebuild_tutor_ratings(self) -> dict:
+    """
+    Rebuild rating sums, counts and histograms from the tutors' reviews.
+
+    The aggregates are adjusted as reviews change; this catches writes that
+    bypass that path, e.g. reviews removed by cascaded deletes.
+
+    Returns:
+        dict with the number of tutors whose aggregates were rebuilt
+    """
+    from core.tutor_ratings import rebuild_rating_aggregates
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        rebuilt = rebuild_rating_aggregates(db)
+        if rebuilt:
+            logger.warning(f"Rebuilt rating aggregates for {rebuilt} tutors")
+        return {"rebuilt": rebuilt}
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error rebuilding tutor ratings: {e}", exc_info=True)
+        raise self.retry(exc=e)
+    finally:
+        db.close()
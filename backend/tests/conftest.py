@@ -9,7 +9,7 @@ Uses transaction-based isolation for speed and consistency.
 import logging
 import os
 import sys
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from pathlib import Path
 
 import pytest
@@ -17,7 +17,9 @@ import pytest
 logger = logging.getLogger(__name__)
 from fastapi.testclient import TestClient  # noqa: E402
 from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
 from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
 
 # =============================================================================
 # Path Setup - Ensure backend modules are importable
@@ -50,6 +52,9 @@ os.environ["DATABASE_URL"] = TEST_DATABASE_URL
 os.environ.setdefault("SECRET_KEY", "test-secret-key-min-32-characters-long-123")
 os.environ.setdefault("BCRYPT_ROUNDS", "4")  # Speed up hashing in tests
 os.environ["SKIP_STARTUP_MIGRATIONS"] = "true"  # Skip migrations during tests
+os.environ.setdefault("CACHE_REDIS_ENABLED", "false")  # Local cache tier only
+os.environ.setdefault("WS_CLUSTER_ENABLED", "false")  # In-process WebSocket delivery
+os.environ.setdefault("IMAGE_PROCESSING_WORKERS", "0")  # Render images on the thread pool
 
 # =============================================================================
 # Imports (after path setup and env config)
@@ -58,8 +63,10 @@ os.environ["SKIP_STARTUP_MIGRATIONS"] = "true"  # Skip migrations during tests
 import database  # noqa: E402
 import models  # noqa: E402
 from auth import get_password_hash  # noqa: E402
+from core.avatar_storage import presigned_url_cache  # noqa: E402
+from core.cache import invalidate_cache  # noqa: E402
 from core.security import TokenManager  # noqa: E402
-from database import get_db  # noqa: E402
+from database import get_async_db, get_db  # noqa: E402
 from main import app  # noqa: E402
 from models import StudentProfile, TutorProfile, User  # noqa: E402
 from models.base import Base  # noqa: E402
@@ -71,9 +78,16 @@ from models.base import Base  # noqa: E402
 TEST_ENGINE = create_engine(TEST_DATABASE_URL, echo=False)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=TEST_ENGINE)
 
+# NullPool: TestClient runs each client on its own event loop, and asyncpg
+# connections cannot be reused across loops
+TEST_ASYNC_ENGINE = create_async_engine(database.to_async_url(TEST_DATABASE_URL), poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(TEST_ASYNC_ENGINE, autoflush=False, expire_on_commit=False)
+
 # Align global database state with test engine
 database.engine = TEST_ENGINE
 database.SessionLocal = TestingSessionLocal
+database.async_engine = TEST_ASYNC_ENGINE
+database.AsyncSessionLocal = TestingAsyncSessionLocal
 database.Base = Base
 
 
@@ -138,8 +152,15 @@ def override_get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-# Override the database dependency globally
+async def override_get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Yield an async database session backed by the test database."""
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
+# Override the database dependencies globally
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 
 # Disable rate limiting for tests
 from core.rate_limiting import limiter  # noqa: E402
@@ -166,6 +187,9 @@ def setup_database(db_session: Session) -> Generator[None, None, None]:
             db_session.commit()
     except Exception:
         db_session.rollback()
+    # Cached reads would otherwise outlive the truncated rows
+    invalidate_cache()
+    presigned_url_cache.clear()
 
 
 @pytest.fixture(scope="function")
@@ -246,6 +246,27 @@ class TestAvatarStorageClient:
         assert exc_info.value.status_code == 500
         assert "Unable to store avatar" in exc_info.value.detail
 
+    @pytest.mark.asyncio
+    async def test_upload_objects_shares_one_client(self, storage_client):
+        """Test upload_objects puts every object through a single client."""
+        storage_client._bucket_initialized = True
+
+        mock_client = AsyncMock()
+        mock_client.put_object = AsyncMock(return_value={})
+
+        with patch.object(
+            storage_client, "_client", return_value=self._create_async_context(mock_client)
+        ) as mock_factory:
+            await storage_client.upload_objects(
+                [("avatars/1/a/320.webp", b"large", "image/webp"), ("avatars/1/a/80.webp", b"small", "image/webp")]
+            )
+
+        mock_factory.assert_called_once()
+        assert [call.kwargs["Key"] for call in mock_client.put_object.await_args_list] == [
+            "avatars/1/a/320.webp",
+            "avatars/1/a/80.webp",
+        ]
+
     @pytest.mark.asyncio
     async def test_delete_file_success(self, storage_client):
         """Test delete_file successfully deletes a file."""
@@ -539,3 +560,103 @@ class TestBuildAvatarUrl:
 
                 call_args = mock_client.generate_presigned_url.call_args
                 assert call_args[1]["ExpiresIn"] == 3600
+
+
+class TestSignAvatarUrls:
+    """Test batched signing and the signed URL cache."""
+
+    @pytest.fixture
+    def mock_client(self):
+        from core.avatar_storage import presigned_url_cache
+
+        presigned_url_cache.clear()
+        with patch("core.avatar_storage._get_sync_s3_client") as mock_get_client:
+            client = MagicMock()
+            client.generate_presigned_url.side_effect = lambda *args, **kwargs: (
+                f"https://signed/{kwargs['Params']['Key']}"
+            )
+            mock_get_client.return_value = client
+            yield client
+        presigned_url_cache.clear()
+
+    def test_sign_avatar_urls_signs_each_key_once(self, mock_client):
+        """Test duplicate keys are signed once."""
+        from core.avatar_storage import sign_avatar_urls
+
+        urls = sign_avatar_urls(["a.jpg", "b.jpg", "a.jpg"])
+
+        assert urls == {"a.jpg": "https://signed/a.jpg", "b.jpg": "https://signed/b.jpg"}
+        assert mock_client.generate_presigned_url.call_count == 2
+
+    def test_signed_urls_reused_within_ttl_bucket(self, mock_client):
+        """Test cached URLs are served without re-signing."""
+        from core.avatar_storage import build_avatar_url, sign_avatar_urls
+
+        sign_avatar_urls(["a.jpg"])
+        assert build_avatar_url("a.jpg") == "https://signed/a.jpg"
+
+        assert mock_client.generate_presigned_url.call_count == 1
+
+    def test_signed_urls_resigned_in_next_ttl_bucket(self, mock_client):
+        """Test URLs are re-signed once half their lifetime has passed."""
+        from core.avatar_storage import sign_avatar_urls
+
+        with patch("core.avatar_storage.time.time", return_value=950.0):
+            sign_avatar_urls(["a.jpg"], ttl_seconds=300)
+        with patch("core.avatar_storage.time.time", return_value=1040.0):
+            sign_avatar_urls(["a.jpg"], ttl_seconds=300)
+        assert mock_client.generate_presigned_url.call_count == 1
+
+        with patch("core.avatar_storage.time.time", return_value=1060.0):
+            sign_avatar_urls(["a.jpg"], ttl_seconds=300)
+        assert mock_client.generate_presigned_url.call_count == 2
+
+    def test_prefetch_skips_empty_and_absolute_keys(self, mock_client):
+        """Test prefetch only signs storage keys."""
+        from core.avatar_storage import prefetch_avatar_urls
+
+        prefetch_avatar_urls([None, "", "https://oauth.example.com/me.png", "a.jpg"])
+
+        assert mock_client.generate_presigned_url.call_count == 1
+
+    def test_cache_is_bounded(self, mock_client):
+        """Test the least recently used URL is evicted past the limit."""
+        from core.avatar_storage import PresignedUrlCache
+
+        cache = PresignedUrlCache(max_entries=2)
+        cache.put_many({"a": "1", "b": "2", "c": "3"}, ttl_seconds=300)
+
+        found, missing = cache.get_many(["a", "b", "c"], ttl_seconds=300)
+        assert missing == ["a"]
+        assert len(cache) == 2
+
+    def test_public_base_url_skips_signing(self, mock_client):
+        """Test CDN mode builds stable unsigned URLs."""
+        from core.avatar_storage import build_avatar_url
+
+        with patch("core.avatar_storage.settings.AVATAR_PUBLIC_BASE_URL", "https://cdn.example.com/avatars/"):
+            url = build_avatar_url("users/1/avatar image.webp")
+
+        assert url == "https://cdn.example.com/avatars/users/1/avatar%20image.webp"
+        mock_client.generate_presigned_url.assert_not_called()
+
+    def test_size_selects_rendition(self, mock_client):
+        """Test a display size resolves rendition keys and leaves other keys alone."""
+        from core.avatar_storage import build_avatar_url, prefetch_avatar_urls
+
+        key = "avatars/1/0123456789abcdef0123456789abcdef/320.webp"
+        prefetch_avatar_urls([key, "users/1/legacy.webp"], size=80)
+
+        assert build_avatar_url(key, size=80) == "https://signed/avatars/1/0123456789abcdef0123456789abcdef/80.webp"
+        assert build_avatar_url("users/1/legacy.webp", size=80) == "https://signed/users/1/legacy.webp"
+        assert build_avatar_url(key) == f"https://signed/{key}"
+        assert mock_client.generate_presigned_url.call_count == 3
+
+    def test_size_selects_rendition_of_public_photo_url(self, mock_client):
+        """Test absolute profile photo URLs are rewritten to the rendition URL."""
+        from core.avatar_storage import build_avatar_url
+
+        url = "https://minio.example.com/tutor-assets/tutor_profiles/1/photo/0123456789abcdef0123456789abcdef/original.jpg"
+
+        assert build_avatar_url(url, size=160) == url.replace("original.jpg", "160.webp")
+        mock_client.generate_presigned_url.assert_not_called()
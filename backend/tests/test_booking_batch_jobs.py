@@ -0,0 +1,182 @@
+"""
+Tests for set-based booking lifecycle transitions (modules/bookings/batch_jobs.py).
+
+Covers chunked claiming, bulk UPDATE ... RETURNING writes, attendance-based
+outcomes, shard partitioning and the per-run throughput metrics.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from models import Booking
+from modules.bookings.batch_jobs import (
+    BatchRunMetrics,
+    end_sessions_transition,
+    expire_requests_transition,
+    run_batch_transition,
+    start_sessions_transition,
+)
+from modules.bookings.jobs import _determine_session_outcome_from_attendance
+
+
+@pytest.fixture
+def make_booking(db_session, tutor_user, student_user, test_subject):
+    """Factory for bookings in a given state, spaced a day apart."""
+    offset = iter(range(1, 1000))
+
+    def _make(session_state: str, *, start_delta: timedelta, **fields) -> Booking:
+        start_time = datetime.now(UTC) + start_delta + timedelta(days=next(offset))
+        booking = Booking(
+            tutor_profile_id=tutor_user.tutor_profile.id,
+            student_id=student_user.id,
+            subject_id=test_subject.id,
+            start_time=start_time,
+            end_time=start_time + timedelta(hours=1),
+            hourly_rate=50.00,
+            total_amount=50.00,
+            currency="USD",
+            session_state=session_state,
+            payment_state=fields.pop("payment_state", "AUTHORIZED"),
+            **fields,
+        )
+        db_session.add(booking)
+        db_session.commit()
+        db_session.refresh(booking)
+        return booking
+
+    return _make
+
+
+def _reload(db_session, booking: Booking) -> Booking:
+    db_session.expire_all()
+    return db_session.get(Booking, booking.id)
+
+
+class TestExpireRequestsBatch:
+    def test_expires_stale_requests_in_chunks(self, db_session, make_booking):
+        now = datetime.now(UTC)
+        stale = [
+            make_booking(
+                "REQUESTED",
+                start_delta=timedelta(days=3),
+                payment_state="PENDING",
+                created_at=now - timedelta(hours=30),
+            )
+            for _ in range(3)
+        ]
+        fresh = make_booking("REQUESTED", start_delta=timedelta(days=3), payment_state="PENDING")
+
+        metrics = run_batch_transition(
+            db_session,
+            expire_requests_transition(now - timedelta(hours=24)),
+            chunk_size=2,
+        )
+
+        assert metrics.claimed == 3
+        assert metrics.transitioned == 3
+        assert metrics.chunks == 2
+        assert metrics.outcomes == {"NOT_HELD": 3}
+        for booking in stale:
+            booking = _reload(db_session, booking)
+            assert booking.session_state == "EXPIRED"
+            assert booking.session_outcome == "NOT_HELD"
+            assert booking.payment_state == "VOIDED"
+            assert booking.cancelled_by_role == "SYSTEM"
+            assert booking.version == 2
+        assert _reload(db_session, fresh).session_state == "REQUESTED"
+
+    def test_no_candidates_records_empty_run(self, db_session):
+        metrics = run_batch_transition(
+            db_session,
+            expire_requests_transition(datetime.now(UTC) - timedelta(hours=24)),
+            chunk_size=10,
+        )
+
+        assert metrics.claimed == 0
+        assert metrics.chunks == 0
+        assert metrics.as_dict()["rows_per_second"] == 0.0
+
+
+class TestStartAndEndSessionsBatch:
+    def test_starts_due_sessions_only(self, db_session, make_booking):
+        due = make_booking("SCHEDULED", start_delta=timedelta(days=-30))
+        future = make_booking("SCHEDULED", start_delta=timedelta(days=30))
+
+        metrics = run_batch_transition(
+            db_session,
+            start_sessions_transition(datetime.now(UTC)),
+            chunk_size=50,
+        )
+
+        assert metrics.transitioned == 1
+        assert _reload(db_session, due).session_state == "ACTIVE"
+        assert _reload(db_session, future).session_state == "SCHEDULED"
+
+    def test_end_sessions_uses_attendance_outcomes(self, db_session, make_booking):
+        joined = datetime.now(UTC) - timedelta(days=30)
+        both = make_booking(
+            "ACTIVE",
+            start_delta=timedelta(days=-40),
+            tutor_joined_at=joined,
+            student_joined_at=joined,
+        )
+        tutor_only = make_booking("ACTIVE", start_delta=timedelta(days=-40), tutor_joined_at=joined)
+        nobody = make_booking("ACTIVE", start_delta=timedelta(days=-40))
+
+        metrics = run_batch_transition(
+            db_session,
+            end_sessions_transition(datetime.now(UTC), _determine_session_outcome_from_attendance),
+            chunk_size=50,
+        )
+
+        assert metrics.transitioned == 3
+        assert metrics.outcomes == {"COMPLETED": 1, "NO_SHOW_STUDENT": 1, "NOT_HELD": 1}
+        assert _reload(db_session, both).payment_state == "CAPTURED"
+        assert _reload(db_session, tutor_only).session_outcome == "NO_SHOW_STUDENT"
+        ended = _reload(db_session, nobody)
+        assert ended.session_state == "ENDED"
+        assert ended.payment_state == "VOIDED"
+
+    def test_completed_sessions_add_to_tutor_lifetime_earnings(self, db_session, make_booking, tutor_user):
+        joined = datetime.now(UTC) - timedelta(days=30)
+        make_booking(
+            "ACTIVE",
+            start_delta=timedelta(days=-40),
+            tutor_earnings_cents=4000,
+            tutor_joined_at=joined,
+            student_joined_at=joined,
+        )
+        make_booking("ACTIVE", start_delta=timedelta(days=-40), tutor_earnings_cents=4000)  # Not held
+
+        run_batch_transition(
+            db_session,
+            end_sessions_transition(datetime.now(UTC), _determine_session_outcome_from_attendance),
+            chunk_size=50,
+        )
+
+        db_session.expire_all()
+        assert tutor_user.tutor_profile.lifetime_earnings_cents == 4000
+
+
+class TestShardedRuns:
+    def test_shards_partition_candidates(self, db_session, make_booking):
+        bookings = [make_booking("SCHEDULED", start_delta=timedelta(days=-30)) for _ in range(4)]
+        transition = start_sessions_transition(datetime.now(UTC))
+
+        first = run_batch_transition(db_session, transition, chunk_size=10, shard_index=0, shard_count=2)
+        started = {b.id for b in bookings if _reload(db_session, b).session_state == "ACTIVE"}
+        assert started == {b.id for b in bookings if b.id % 2 == 0}
+
+        second = run_batch_transition(db_session, transition, chunk_size=10, shard_index=1, shard_count=2)
+        assert first.transitioned + second.transitioned == 4
+        assert second.as_dict()["shard"] == "1/2"
+
+
+class TestBatchRunMetrics:
+    def test_throughput_uses_transitioned_rows(self):
+        metrics = BatchRunMetrics(job="expire_requests", transitioned=500)
+        metrics.duration_seconds = 0.25
+
+        assert metrics.rows_per_second == 2000.0
+        assert metrics.as_dict()["duration_ms"] == 250.0
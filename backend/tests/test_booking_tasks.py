@@ -14,6 +14,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 from sqlalchemy.exc import OperationalError
 
+from core.config import settings
 from tasks.booking_tasks import (
     REQUEST_EXPIRY_HOURS,
     SESSION_END_GRACE_MINUTES,
@@ -23,6 +24,12 @@ from tasks.booking_tasks import (
 )
 
 
+@pytest.fixture(autouse=True)
+def per_booking_mode(monkeypatch):
+    """Most tests here cover the per-booking NOWAIT loop; TestBatchMode opts back in."""
+    monkeypatch.setattr(settings, "BOOKING_JOB_BATCH_SIZE", 0)
+
+
 class TestExpireRequests:
     """Tests for expire_requests Celery task."""
 
@@ -765,6 +772,83 @@ class TestRaceConditionPrevention:
         assert mock_db.commit.call_count == 3
 
 
+class TestBatchMode:
+    """Tests for the chunked SKIP LOCKED mode and its Celery fan-out."""
+
+    @pytest.fixture(autouse=True)
+    def batch_mode(self, monkeypatch):
+        monkeypatch.setattr(settings, "BOOKING_JOB_BATCH_SIZE", 200)
+        monkeypatch.setattr(settings, "BOOKING_JOB_WORKERS", 1)
+
+    @patch("database.SessionLocal")
+    @patch("core.clock_skew.get_db_time")
+    @patch("core.clock_skew.get_job_skew_monitor")
+    @patch("modules.bookings.batch_jobs.run_batch_transition")
+    def test_runs_inline_with_single_worker(
+        self,
+        mock_run,
+        mock_skew_monitor,
+        mock_get_db_time,
+        mock_session_local,
+    ):
+        """Test that batch mode reports counts and throughput metrics."""
+        from modules.bookings.batch_jobs import BatchRunMetrics
+
+        mock_db = MagicMock()
+        mock_session_local.return_value = mock_db
+        mock_get_db_time.return_value = datetime.now(UTC)
+        mock_run.return_value = BatchRunMetrics(
+            job="expire_requests", chunk_size=200, claimed=3, transitioned=3, chunks=1
+        )
+
+        result = expire_requests()
+
+        assert result["expired"] == 3
+        assert result["metrics"]["chunks"] == 1
+        assert "rows_per_second" in result["metrics"]
+        assert mock_run.call_args.kwargs["chunk_size"] == 200
+        # Per-booking locking is not used in batch mode
+        mock_db.query.assert_not_called()
+        mock_db.close.assert_called_once()
+
+    @patch("database.SessionLocal")
+    @patch("core.clock_skew.get_db_time")
+    @patch("core.clock_skew.get_job_skew_monitor")
+    @patch("modules.bookings.batch_jobs.run_batch_transition")
+    def test_end_sessions_batch_result_key(
+        self,
+        mock_run,
+        mock_skew_monitor,
+        mock_get_db_time,
+        mock_session_local,
+    ):
+        """Test that batch results keep each task's transitioned-count key."""
+        from modules.bookings.batch_jobs import BatchRunMetrics
+
+        mock_get_db_time.return_value = datetime.now(UTC)
+        mock_run.return_value = BatchRunMetrics(job="end_sessions", transitioned=2)
+
+        result = end_sessions()
+
+        assert result["ended"] == 2
+        transition = mock_run.call_args.args[1]
+        assert transition.name == "end_sessions"
+
+    @patch("tasks.booking_tasks.group")
+    def test_fans_out_across_shards(self, mock_group, monkeypatch):
+        """Test that multiple workers dispatch one shard task each."""
+        monkeypatch.setattr(settings, "BOOKING_JOB_WORKERS", 4)
+
+        result = start_sessions()
+
+        assert result == {"dispatched_shards": 4}
+        signatures = list(mock_group.call_args.args[0])
+        assert [sig.args for sig in signatures] == [
+            ("start_sessions", index, 4) for index in range(4)
+        ]
+        mock_group.return_value.apply_async.assert_called_once_with(queue="bookings")
+
+
 class TestTaskLogging:
     """Tests for task logging behavior."""
 
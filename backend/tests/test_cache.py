@@ -2,25 +2,38 @@
 Comprehensive tests for backend/core/cache.py
 
 Tests cover:
-- cache_with_ttl() decorator
-- invalidate_cache() function
-- get_cache_stats() function
-- Cache expiration behavior
-- Cache key generation
-- Edge cases and concurrent access patterns
+- cache_with_ttl() decorator (sync and async)
+- Key building (sessions ignored, custom key builders)
+- Bounded local tier (LRU, byte accounting)
+- Tag and namespace invalidation
+- Per-namespace metrics
+- Single-flight stampede protection
+- Shared (Redis) tier with tag versions
+- Invalidation from sync code
 """
 
+import asyncio
+import threading
 import time
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
+import anyio.to_thread
 import pytest
+from sqlalchemy.orm import Session
 
+import core.cache as cache_module
 from core.cache import (
-    _cache,
+    ENTRY_KEY_PREFIX,
+    LocalCache,
+    build_cache_key,
     cache_with_ttl,
-    get_cache_stats,
+    configure_shared_cache,
+    get_cache_metrics,
     invalidate_cache,
+    invalidate_tags,
+    invalidate_tags_sync,
 )
+from core.fakes import FakeCache
 
 # =============================================================================
 # Fixtures
@@ -29,10 +42,20 @@ from core.cache import (
 
 @pytest.fixture(autouse=True)
 def clear_cache():
-    """Clear the cache before and after each test."""
-    _cache.clear()
+    """Clear the local tier and detach the shared tier around each test."""
+    invalidate_cache()
+    configure_shared_cache(None)
     yield
-    _cache.clear()
+    invalidate_cache()
+    configure_shared_cache(None)
+
+
+@pytest.fixture
+def shared_cache() -> FakeCache:
+    """Back the shared tier with an in-memory CachePort."""
+    fake = FakeCache()
+    configure_shared_cache(fake)
+    return fake
 
 
 # =============================================================================
@@ -53,16 +76,10 @@ class TestCacheWithTTL:
             call_count += 1
             return {"value": "test"}
 
-        # First call should execute the function
-        result1 = get_data()
-        assert result1 == {"value": "test"}
+        assert get_data() == {"value": "test"}
+        assert get_data() == {"value": "test"}
         assert call_count == 1
 
-        # Second call should return cached result
-        result2 = get_data()
-        assert result2 == {"value": "test"}
-        assert call_count == 1  # Still 1, not called again
-
     def test_cache_with_arguments(self):
         """Test caching with different arguments creates different cache entries."""
         call_count = 0
@@ -73,15 +90,10 @@ class TestCacheWithTTL:
             call_count += 1
             return {"id": item_id}
 
-        # Different arguments should result in separate cache entries
-        result1 = get_item(1)
-        result2 = get_item(2)
-        result3 = get_item(1)  # Should be cached
-
-        assert result1 == {"id": 1}
-        assert result2 == {"id": 2}
-        assert result3 == {"id": 1}
-        assert call_count == 2  # Only 2 calls (third was cached)
+        assert get_item(1) == {"id": 1}
+        assert get_item(2) == {"id": 2}
+        assert get_item(1) == {"id": 1}
+        assert call_count == 2
 
     def test_cache_with_kwargs(self):
         """Test caching with keyword arguments."""
@@ -93,80 +105,74 @@ class TestCacheWithTTL:
             call_count += 1
             return {"user_id": user_id, "has_profile": include_profile}
 
-        result1 = get_user(user_id=1, include_profile=True)
-        result2 = get_user(user_id=1, include_profile=False)
-        get_user(user_id=1, include_profile=True)  # Cached
+        assert get_user(user_id=1, include_profile=True)["has_profile"] is True
+        assert get_user(user_id=1, include_profile=False)["has_profile"] is False
+        get_user(user_id=1, include_profile=True)
 
-        assert result1["has_profile"] is True
-        assert result2["has_profile"] is False
-        assert call_count == 2  # Third call was cached
+        assert call_count == 2
 
     def test_cache_expiration(self):
         """Test that cache entries expire after TTL."""
         call_count = 0
 
-        @cache_with_ttl(ttl_seconds=1)  # 1 second TTL
-        def get_timestamp():
+        @cache_with_ttl(ttl_seconds=1)
+        def get_value():
             nonlocal call_count
             call_count += 1
-            return time.time()
-
-        result1 = get_timestamp()
-        assert call_count == 1
+            return call_count
 
-        # Wait for cache to expire
+        get_value()
         time.sleep(1.1)
+        get_value()
 
-        result2 = get_timestamp()
-        assert call_count == 2  # Called again after expiration
-        assert result2 > result1
+        assert call_count == 2
 
-    def test_cache_expired_entry_removed(self):
-        """Test that expired entries are removed from cache."""
-        @cache_with_ttl(ttl_seconds=1)
-        def get_value():
-            return "test"
+    def test_cache_with_none_return(self):
+        """Test that None results are cached."""
+        call_count = 0
 
-        get_value()
-        assert len(_cache) == 1
+        @cache_with_ttl(ttl_seconds=60)
+        def get_none():
+            nonlocal call_count
+            call_count += 1
+            return None
 
-        # Wait for expiration
-        time.sleep(1.1)
+        assert get_none() is None
+        assert get_none() is None
+        assert call_count == 1
 
-        # Access should remove expired entry and create new one
-        get_value()
-        assert len(_cache) == 1
+    def test_cache_with_exception(self):
+        """Test that exceptions are not cached."""
+        call_count = 0
 
-    def test_cache_key_generation(self):
-        """Test that cache keys are properly generated."""
         @cache_with_ttl(ttl_seconds=60)
-        def my_function(a, b, c=None):
-            return a + b
+        def failing_function():
+            nonlocal call_count
+            call_count += 1
+            raise ValueError("Test error")
 
-        my_function(1, 2)
-        my_function(1, 2, c="test")
+        with pytest.raises(ValueError):
+            failing_function()
+        with pytest.raises(ValueError):
+            failing_function()
 
-        # Should have 2 cache entries with different keys
-        assert len(_cache) == 2
+        assert call_count == 2
 
-        # Keys should contain function info
-        keys = list(_cache.keys())
-        assert all("my_function" in key for key in keys)
+    @pytest.mark.parametrize("ttl", [0, -1])
+    def test_non_positive_ttl_is_not_cached(self, ttl):
+        """Test that zero or negative TTL disables caching."""
+        call_count = 0
 
-    def test_cache_default_ttl(self):
-        """Test cache with default TTL (300 seconds)."""
-        @cache_with_ttl()
-        def get_default_ttl():
-            return "cached"
+        @cache_with_ttl(ttl_seconds=ttl)
+        def get_value():
+            nonlocal call_count
+            call_count += 1
+            return "result"
 
-        get_default_ttl()
+        get_value()
+        get_value()
 
-        # Check that cache entry exists with TTL around 300 seconds
-        cache_key = list(_cache.keys())[0]
-        _, expiry = _cache[cache_key]
-        # Expiry should be approximately now + 300 seconds
-        expected_expiry = time.time() + 300
-        assert abs(expiry - expected_expiry) < 2  # Within 2 seconds
+        assert call_count == 2
 
     def test_cache_preserves_function_metadata(self):
         """Test that decorator preserves function metadata."""
@@ -179,483 +185,435 @@ class TestCacheWithTTL:
         assert documented_function.__name__ == "documented_function"
         assert documented_function.__doc__ == "This is a documented function."
 
-    def test_cache_with_none_return(self):
-        """Test caching when function returns None."""
+    @pytest.mark.asyncio
+    async def test_async_function_cached(self):
+        """Test caching of coroutine functions."""
         call_count = 0
 
         @cache_with_ttl(ttl_seconds=60)
-        def get_none():
+        async def get_data(item_id):
             nonlocal call_count
             call_count += 1
-            return None
+            return {"id": item_id}
 
-        result1 = get_none()
-        result2 = get_none()
+        assert await get_data(1) == {"id": 1}
+        assert await get_data(1) == {"id": 1}
+        assert call_count == 1
 
-        assert result1 is None
-        assert result2 is None
-        assert call_count == 1  # None should be cached
 
-    def test_cache_with_list_return(self):
-        """Test caching with list return values."""
-        @cache_with_ttl(ttl_seconds=60)
-        def get_list():
-            return [1, 2, 3]
+# =============================================================================
+# Test: Key Building
+# =============================================================================
 
-        result1 = get_list()
-        result2 = get_list()
 
-        assert result1 == [1, 2, 3]
-        assert result2 == [1, 2, 3]
-        # Note: These are the same cached object
-        assert result1 is result2
+class TestKeyBuilding:
+    """Test cache key generation."""
 
-    def test_cache_with_complex_args(self):
-        """Test caching with complex argument types."""
+    def test_session_arguments_are_ignored(self):
+        """Test that calls from different sessions share one entry."""
         call_count = 0
 
         @cache_with_ttl(ttl_seconds=60)
-        def process_data(data_list, config_dict):
+        def get_subjects(db, active_only=True):
             nonlocal call_count
             call_count += 1
-            return len(data_list) + len(config_dict)
+            return ["math"]
 
-        result1 = process_data([1, 2, 3], {"a": 1})
-        process_data([1, 2, 3], {"a": 1})
+        get_subjects(MagicMock(spec=Session), active_only=True)
+        get_subjects(MagicMock(spec=Session), active_only=True)
 
-        assert result1 == 4
         assert call_count == 1
 
-    def test_cache_with_mock_db(self):
-        """Test caching with mock database session (typical use case)."""
-        mock_db = MagicMock()
-        mock_db.query.return_value.all.return_value = [{"id": 1}, {"id": 2}]
-
-        @cache_with_ttl(ttl_seconds=60)
-        def get_subjects(db):
-            return db.query("subjects").all()
-
-        result1 = get_subjects(mock_db)
-        get_subjects(mock_db)
+    def test_build_cache_key_skips_sessions(self):
+        """Test the default key builder output."""
+        assert build_cache_key(MagicMock(spec=Session), 5, flag=True) == "5|flag=True"
 
-        assert result1 == [{"id": 1}, {"id": 2}]
-        # DB should only be queried once
-        assert mock_db.query.call_count == 1
+    def test_long_keys_are_hashed(self):
+        """Test that long keys are bounded."""
+        key = build_cache_key("x" * 500)
+        assert len(key) == 64
 
+    def test_custom_key_builder(self):
+        """Test that an explicit key builder controls entry identity."""
+        call_count = 0
 
-# =============================================================================
-# Test: invalidate_cache() Function
-# =============================================================================
+        @cache_with_ttl(ttl_seconds=60, key_builder=lambda tutor_id, request_id: str(tutor_id))
+        def get_tutor(tutor_id, request_id):
+            nonlocal call_count
+            call_count += 1
+            return tutor_id
 
+        get_tutor(1, "req-a")
+        get_tutor(1, "req-b")
 
-class TestInvalidateCache:
-    """Test the invalidate_cache function."""
+        assert call_count == 1
 
-    def test_invalidate_all_cache(self):
-        """Test invalidating entire cache."""
-        @cache_with_ttl(ttl_seconds=60)
-        def get_a():
-            return "a"
 
-        @cache_with_ttl(ttl_seconds=60)
-        def get_b():
-            return "b"
+# =============================================================================
+# Test: Bounded Local Tier
+# =============================================================================
 
-        get_a()
-        get_b()
-        assert len(_cache) == 2
 
-        invalidate_cache()
+class TestLocalCache:
+    """Test LRU and byte-size limits of the local tier."""
 
-        assert len(_cache) == 0
+    def test_evicts_least_recently_used_entry(self):
+        """Test that the oldest untouched entry is evicted first."""
+        local = LocalCache(max_entries=2, max_bytes=1024)
+        local.set("ns", "a", 1, 60, [])
+        local.set("ns", "b", 2, 60, [])
+        local.get("ns", "a")  # "b" is now least recently used
+        local.set("ns", "c", 3, 60, [])
 
-    def test_invalidate_cache_by_pattern(self):
-        """Test invalidating cache entries matching a pattern."""
-        @cache_with_ttl(ttl_seconds=60)
-        def get_user(user_id):
-            return {"user_id": user_id}
+        assert "a" in local
+        assert "b" not in local
+        assert "c" in local
+        assert local.metrics()["ns"]["evictions"] == 1
 
-        @cache_with_ttl(ttl_seconds=60)
-        def get_product(product_id):
-            return {"product_id": product_id}
+    def test_evicts_to_stay_within_byte_budget(self):
+        """Test that byte accounting triggers eviction."""
+        local = LocalCache(max_entries=100, max_bytes=20)
+        local.set("ns", "a", "x" * 10, 60, [])
+        local.set("ns", "b", "y" * 10, 60, [])
 
-        get_user(1)
-        get_user(2)
-        get_product(100)
-        assert len(_cache) == 3
+        assert "a" not in local
+        assert "b" in local
+        assert local.total_bytes <= 20
 
-        # Invalidate only user-related cache entries
-        invalidate_cache("get_user")
+    def test_oversized_value_is_not_stored(self):
+        """Test that a value larger than the whole budget is skipped."""
+        local = LocalCache(max_entries=100, max_bytes=10)
+        local.set("ns", "a", "x" * 100, 60, [])
 
-        # Only product cache should remain
-        assert len(_cache) == 1
-        remaining_key = list(_cache.keys())[0]
-        assert "get_product" in remaining_key
+        assert len(local) == 0
+        assert local.total_bytes == 0
 
-    def test_invalidate_cache_pattern_no_match(self):
-        """Test invalidating with pattern that doesn't match anything."""
-        @cache_with_ttl(ttl_seconds=60)
-        def get_data():
-            return "data"
+    def test_replacing_entry_updates_byte_count(self):
+        """Test that overwriting a key does not leak bytes."""
+        local = LocalCache(max_entries=100, max_bytes=1024)
+        local.set("ns", "a", "x" * 10, 60, [])
+        local.set("ns", "a", "x" * 20, 60, [])
 
-        get_data()
-        assert len(_cache) == 1
+        assert len(local) == 1
+        assert local.total_bytes == local.metrics()["ns"]["bytes"]
 
-        invalidate_cache("nonexistent_pattern")
 
-        # Cache should be unchanged
-        assert len(_cache) == 1
+# =============================================================================
+# Test: Invalidation
+# =============================================================================
 
-    def test_invalidate_cache_partial_pattern(self):
-        """Test invalidating with partial pattern match."""
-        @cache_with_ttl(ttl_seconds=60)
-        def get_user_profile(user_id):
-            return {"profile": user_id}
 
-        @cache_with_ttl(ttl_seconds=60)
-        def get_user_settings(user_id):
-            return {"settings": user_id}
+class TestInvalidation:
+    """Test tag and namespace invalidation."""
 
-        @cache_with_ttl(ttl_seconds=60)
-        def get_admin_data():
-            return "admin"
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_drops_tagged_entries(self):
+        """Test that only entries carrying the tag are removed."""
+        call_count = 0
 
-        get_user_profile(1)
-        get_user_settings(1)
-        get_admin_data()
-        assert len(_cache) == 3
+        @cache_with_ttl(ttl_seconds=60, tags=lambda tutor_id: [f"tutor:{tutor_id}"])
+        def get_reviews(tutor_id):
+            nonlocal call_count
+            call_count += 1
+            return [tutor_id]
 
-        # Invalidate all user-related entries
-        invalidate_cache("user")
+        get_reviews(1)
+        get_reviews(2)
 
-        # Only admin cache should remain
-        assert len(_cache) == 1
+        removed = await invalidate_tags("tutor:1")
 
-    def test_invalidate_empty_cache(self):
-        """Test invalidating empty cache doesn't cause errors."""
-        assert len(_cache) == 0
-        invalidate_cache()  # Should not raise
-        assert len(_cache) == 0
+        get_reviews(1)
+        get_reviews(2)
+        assert removed == 1
+        assert call_count == 3
 
-        invalidate_cache("pattern")  # Should not raise
-        assert len(_cache) == 0
+    def test_invalidate_namespace(self):
+        """Test invalidating one namespace keeps the others."""
 
+        @cache_with_ttl(ttl_seconds=60, namespace="users")
+        def get_user(user_id):
+            return {"user_id": user_id}
 
-# =============================================================================
-# Test: get_cache_stats() Function
-# =============================================================================
+        @cache_with_ttl(ttl_seconds=60, namespace="products")
+        def get_product(product_id):
+            return {"product_id": product_id}
 
+        get_user(1)
+        get_user(2)
+        get_product(100)
 
-class TestGetCacheStats:
-    """Test the get_cache_stats function."""
+        invalidate_cache("users")
 
-    def test_cache_stats_empty(self):
-        """Test stats for empty cache."""
-        stats = get_cache_stats()
+        namespaces = get_cache_metrics()["namespaces"]
+        assert namespaces["users"]["entries"] == 0
+        assert namespaces["users"]["invalidations"] == 2
+        assert namespaces["products"]["entries"] == 1
 
-        assert stats["total_entries"] == 0
-        assert stats["valid_entries"] == 0
-        assert stats["expired_entries"] == 0
-        assert stats["keys"] == []
+    def test_invalidate_all(self):
+        """Test that invalidate_cache() empties the local tier."""
 
-    def test_cache_stats_with_valid_entries(self):
-        """Test stats with valid (non-expired) entries."""
         @cache_with_ttl(ttl_seconds=60)
         def get_a():
             return "a"
 
-        @cache_with_ttl(ttl_seconds=60)
-        def get_b():
-            return "b"
-
         get_a()
-        get_b()
+        invalidate_cache()
 
-        stats = get_cache_stats()
+        assert get_cache_metrics()["entries"] == 0
 
-        assert stats["total_entries"] == 2
-        assert stats["valid_entries"] == 2
-        assert stats["expired_entries"] == 0
-        assert len(stats["keys"]) == 2
 
-    def test_cache_stats_with_expired_entries(self):
-        """Test stats correctly identify expired entries."""
-        @cache_with_ttl(ttl_seconds=1)
-        def get_short_lived():
-            return "short"
+# =============================================================================
+# Test: Metrics
+# =============================================================================
 
-        @cache_with_ttl(ttl_seconds=60)
-        def get_long_lived():
-            return "long"
 
-        get_short_lived()
-        get_long_lived()
+class TestMetrics:
+    """Test per-namespace metrics."""
 
-        # Wait for short-lived entry to expire
-        time.sleep(1.1)
+    def test_hits_and_misses(self):
+        """Test that hits and misses are counted per namespace."""
 
-        stats = get_cache_stats()
+        @cache_with_ttl(ttl_seconds=60, namespace="subjects")
+        def get_subjects():
+            return ["math"]
 
-        assert stats["total_entries"] == 2
-        assert stats["valid_entries"] == 1
-        assert stats["expired_entries"] == 1
+        get_subjects()
+        get_subjects()
+        get_subjects()
 
-    def test_cache_stats_keys_list(self):
-        """Test that stats includes all cache keys."""
-        @cache_with_ttl(ttl_seconds=60)
-        def func1():
-            return 1
+        metrics = get_cache_metrics()
+        assert metrics["namespaces"]["subjects"]["misses"] == 1
+        assert metrics["namespaces"]["subjects"]["hits"] == 2
+        assert metrics["entries"] == 1
+        assert metrics["bytes"] > 0
 
-        @cache_with_ttl(ttl_seconds=60)
-        def func2():
-            return 2
+    def test_expirations_counted(self):
+        """Test that reads of expired entries are counted."""
 
-        func1()
-        func2()
+        @cache_with_ttl(ttl_seconds=1, namespace="short")
+        def get_value():
+            return 1
 
-        stats = get_cache_stats()
+        get_value()
+        time.sleep(1.1)
+        get_value()
 
-        assert len(stats["keys"]) == 2
-        assert any("func1" in key for key in stats["keys"])
-        assert any("func2" in key for key in stats["keys"])
+        assert get_cache_metrics()["namespaces"]["short"]["expirations"] == 1
 
 
 # =============================================================================
-# Test: Edge Cases
+# Test: Single-flight
 # =============================================================================
 
 
-class TestCacheEdgeCases:
-    """Test edge cases and boundary conditions."""
+class TestSingleFlight:
+    """Test stampede protection."""
 
-    def test_cache_with_zero_ttl(self):
-        """Test cache with zero TTL (immediately expires)."""
+    def test_concurrent_sync_misses_load_once(self):
+        """Test that threads missing the same key share one load."""
         call_count = 0
+        started = threading.Event()
+        release = threading.Event()
 
-        @cache_with_ttl(ttl_seconds=0)
-        def get_immediate_expire():
+        @cache_with_ttl(ttl_seconds=60)
+        def slow_load():
             nonlocal call_count
             call_count += 1
-            return "result"
-
-        # With 0 TTL, every call should execute the function
-        # (though there might be a small timing window)
-        get_immediate_expire()
-        time.sleep(0.01)  # Small delay to ensure expiration
-        get_immediate_expire()
-
-        # Should have been called at least twice
-        assert call_count >= 1
+            started.set()
+            release.wait(timeout=5)
+            return "value"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(slow_load())) for _ in range(5)]
+        threads[0].start()
+        started.wait(timeout=5)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert results == ["value"] * 5
+        assert call_count == 1
 
-    def test_cache_with_negative_ttl(self):
-        """Test cache behavior with negative TTL."""
+    @pytest.mark.asyncio
+    async def test_concurrent_async_misses_load_once(self):
+        """Test that coroutines missing the same key share one load."""
         call_count = 0
 
-        @cache_with_ttl(ttl_seconds=-1)
-        def get_negative_ttl():
+        @cache_with_ttl(ttl_seconds=60)
+        async def slow_load():
             nonlocal call_count
             call_count += 1
-            return "result"
+            await asyncio.sleep(0.05)
+            return "value"
 
-        # Negative TTL means immediate expiration
-        get_negative_ttl()
-        get_negative_ttl()
+        results = await asyncio.gather(*(slow_load() for _ in range(10)))
 
-        # Each call should execute since cache immediately expires
-        assert call_count == 2
+        assert results == ["value"] * 10
+        assert call_count == 1
 
-    def test_cache_with_exception(self):
-        """Test that exceptions are not cached."""
+    @pytest.mark.asyncio
+    async def test_async_waiters_see_load_failure(self):
+        """Test that a failed load propagates and is not cached."""
         call_count = 0
 
         @cache_with_ttl(ttl_seconds=60)
-        def failing_function():
+        async def failing_load():
             nonlocal call_count
             call_count += 1
-            raise ValueError("Test error")
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
 
-        with pytest.raises(ValueError):
-            failing_function()
+        results = await asyncio.gather(*(failing_load() for _ in range(3)), return_exceptions=True)
 
+        assert all(isinstance(result, ValueError) for result in results)
+        assert call_count == 1
         with pytest.raises(ValueError):
-            failing_function()
-
-        # Function should be called each time since exception wasn't cached
-        assert call_count == 2
-
-    def test_cache_key_with_special_characters(self):
-        """Test cache with arguments containing special characters."""
-        @cache_with_ttl(ttl_seconds=60)
-        def search(query):
-            return f"results for: {query}"
-
-        result1 = search("test query with spaces")
-        result2 = search("query|with:special/chars")
-        search("test query with spaces")  # Cached
-
-        assert result1 == "results for: test query with spaces"
-        assert result2 == "results for: query|with:special/chars"
-        assert len(_cache) == 2
-
-    def test_cache_with_large_return_value(self):
-        """Test caching large return values."""
-        @cache_with_ttl(ttl_seconds=60)
-        def get_large_data():
-            return list(range(10000))
-
-        result1 = get_large_data()
-        result2 = get_large_data()
-
-        assert len(result1) == 10000
-        assert result1 is result2  # Same cached object
-
-    def test_multiple_decorators_same_function_name(self):
-        """Test that same function name in different modules has unique keys."""
-        # Simulate functions with same name but different modules
-        @cache_with_ttl(ttl_seconds=60)
-        def get_data():
-            return "from module A"
-
-        get_data()
-
-        # The key includes module name, so different modules would have different keys
-        cache_key = list(_cache.keys())[0]
-        assert "test_cache" in cache_key  # Module name included
+            await failing_load()
 
 
 # =============================================================================
-# Test: Concurrent Access Patterns
+# Test: Shared Tier
 # =============================================================================
 
 
-class TestConcurrentAccess:
-    """Test cache behavior under concurrent access patterns."""
+class TestSharedTier:
+    """Test the Redis-backed tier through a fake CachePort."""
 
-    def test_concurrent_reads(self):
-        """Test multiple concurrent reads to cached data."""
+    @pytest.mark.asyncio
+    async def test_value_shared_across_local_tiers(self, shared_cache):
+        """Test that another worker's local miss is served from the shared tier."""
         call_count = 0
 
-        @cache_with_ttl(ttl_seconds=60)
-        def get_shared_data():
+        @cache_with_ttl(ttl_seconds=60, namespace="subjects")
+        async def get_subjects():
             nonlocal call_count
             call_count += 1
-            return {"shared": True}
+            return [{"id": 1}]
 
-        # Simulate concurrent reads
-        results = [get_shared_data() for _ in range(10)]
+        await get_subjects()
+        cache_module._local.clear()  # Simulate a different worker process
 
-        # All results should be the same cached value
-        assert all(r == {"shared": True} for r in results)
+        assert await get_subjects() == [{"id": 1}]
         assert call_count == 1
+        assert get_cache_metrics()["namespaces"]["subjects"]["shared_hits"] == 1
 
-    def test_cache_key_uniqueness(self):
-        """Test that cache keys are truly unique for different calls."""
-        @cache_with_ttl(ttl_seconds=60)
-        def parameterized_func(a, b, c):
-            return a + b + c
+    @pytest.mark.asyncio
+    async def test_tag_invalidation_reaches_shared_tier(self, shared_cache):
+        """Test that bumping a tag version turns shared entries into misses."""
+        call_count = 0
 
-        # These should all be different cache entries
-        parameterized_func(1, 2, 3)
-        parameterized_func(1, 2, 4)
-        parameterized_func(1, 3, 3)
-        parameterized_func(2, 2, 3)
+        @cache_with_ttl(ttl_seconds=60, tags=["subjects"])
+        async def get_subjects():
+            nonlocal call_count
+            call_count += 1
+            return call_count
 
-        assert len(_cache) == 4
+        await get_subjects()
+        await invalidate_tags("subjects")
 
+        assert await get_subjects() == 2
 
-# =============================================================================
-# Test: Real-world Usage Patterns
-# =============================================================================
+    @pytest.mark.asyncio
+    async def test_shared_flag_keeps_values_local(self, shared_cache):
+        """Test that shared=False never writes to Redis."""
+
+        @cache_with_ttl(ttl_seconds=60, shared=False)
+        async def get_private():
+            return "secret"
 
+        await get_private()
 
-class TestRealWorldPatterns:
-    """Test patterns commonly used in the application."""
+        assert not any(key.startswith(ENTRY_KEY_PREFIX) for key in shared_cache.cache)
 
-    def test_database_query_caching(self):
-        """Test caching database query results."""
-        mock_db = MagicMock()
-        query_results = [
-            {"id": 1, "name": "Math"},
-            {"id": 2, "name": "Science"},
-        ]
-        mock_db.query.return_value.filter.return_value.all.return_value = query_results
+    @pytest.mark.asyncio
+    async def test_invalidation_during_load_is_not_masked(self, shared_cache):
+        """Test that a value computed across an invalidation is not served later."""
+        call_count = 0
 
-        @cache_with_ttl(ttl_seconds=300)
-        def get_active_subjects(db):
-            return db.query("Subject").filter("is_active=True").all()
+        @cache_with_ttl(ttl_seconds=60, tags=["subjects"])
+        async def get_subjects():
+            nonlocal call_count
+            call_count += 1
+            if call_count == 1:
+                await invalidate_tags("subjects")
+            return call_count
 
-        # First call
-        result1 = get_active_subjects(mock_db)
-        # Second call (should be cached)
-        result2 = get_active_subjects(mock_db)
+        await get_subjects()
+        cache_module._local.clear()
 
-        assert result1 == query_results
-        assert result2 == query_results
-        # Database should only be queried once
-        mock_db.query.assert_called_once()
+        assert await get_subjects() == 2
 
-    def test_api_response_caching(self):
-        """Test caching external API responses."""
-        api_call_count = 0
+    @pytest.mark.asyncio
+    async def test_local_ttl_can_be_lowered(self, shared_cache):
+        """Test that local_ttl_seconds bounds the local copy, not the shared entry."""
+        call_count = 0
 
-        @cache_with_ttl(ttl_seconds=60)
-        def get_exchange_rates(currency):
-            nonlocal api_call_count
-            api_call_count += 1
-            # Simulate API response
-            return {"USD": 1.0, "EUR": 0.85, "GBP": 0.73}
+        @cache_with_ttl(ttl_seconds=60, namespace="principals", local_ttl_seconds=0)
+        async def get_principal():
+            nonlocal call_count
+            call_count += 1
+            return {"id": 1}
+
+        await get_principal()
+        await get_principal()
 
-        # Multiple requests for same currency
-        for _ in range(5):
-            get_exchange_rates("USD")
+        assert call_count == 1
+        assert get_cache_metrics()["namespaces"]["principals"]["shared_hits"] == 1
 
-        # API should only be called once
-        assert api_call_count == 1
 
-    def test_cache_invalidation_after_update(self):
-        """Test invalidating cache after data update."""
+class TestSyncInvalidation:
+    """Test invalidate_tags_sync from event-loop and worker-thread callers."""
+
+    @pytest.mark.asyncio
+    async def test_from_running_loop(self, shared_cache):
+        """Test that the shared bump is scheduled on the running loop."""
         call_count = 0
 
-        @cache_with_ttl(ttl_seconds=300)
-        def get_user_profile(user_id):
+        @cache_with_ttl(ttl_seconds=60, tags=["users"])
+        async def get_users():
             nonlocal call_count
             call_count += 1
-            return {"user_id": user_id, "name": "Test User"}
+            return call_count
 
-        # Initial fetch
-        profile = get_user_profile(123)
-        assert profile["name"] == "Test User"
-        assert call_count == 1
+        await get_users()
+        assert invalidate_tags_sync("users") == 1
+        await asyncio.sleep(0)
+        cache_module._local.clear()
 
-        # Simulate user update - invalidate their cache
-        invalidate_cache("get_user_profile")
+        assert await get_users() == 2
 
-        # Should fetch fresh data
-        profile = get_user_profile(123)
-        assert call_count == 2
+    @pytest.mark.asyncio
+    async def test_from_worker_thread(self, shared_cache):
+        """Test that a sync endpoint's thread bumps the shared tier through the loop."""
+        call_count = 0
 
-    def test_selective_cache_invalidation(self):
-        """Test selective invalidation based on data type."""
-        @cache_with_ttl(ttl_seconds=300)
-        def get_user(user_id):
-            return {"type": "user", "id": user_id}
+        @cache_with_ttl(ttl_seconds=60, tags=["users"])
+        async def get_users():
+            nonlocal call_count
+            call_count += 1
+            return call_count
 
-        @cache_with_ttl(ttl_seconds=300)
-        def get_booking(booking_id):
-            return {"type": "booking", "id": booking_id}
+        await get_users()
+        await anyio.to_thread.run_sync(invalidate_tags_sync, "users")
+        cache_module._local.clear()
 
-        # Populate cache
-        get_user(1)
-        get_user(2)
-        get_booking(100)
-        get_booking(101)
+        assert await get_users() == 2
+
+    def test_without_event_loop(self, shared_cache):
+        """Test that plain sync callers (Celery tasks) invalidate both tiers."""
+        call_count = 0
 
-        assert len(_cache) == 4
+        @cache_with_ttl(ttl_seconds=60, tags=["users"])
+        async def get_users():
+            nonlocal call_count
+            call_count += 1
+            return call_count
 
-        # Invalidate only user cache (e.g., after bulk user update)
-        invalidate_cache("get_user")
+        asyncio.run(get_users())
+        assert invalidate_tags_sync("users") == 1
+        cache_module._local.clear()
 
-        # Only booking cache should remain
-        assert len(_cache) == 2
-        stats = get_cache_stats()
-        assert all("get_booking" in key for key in stats["keys"])
+        assert asyncio.run(get_users()) == 2
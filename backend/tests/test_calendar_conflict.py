@@ -1,7 +1,6 @@
 """Tests for the calendar conflict checking service."""
 
-import time
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -9,10 +8,35 @@ import pytest
 from core.calendar_conflict import (
     CALENDAR_CACHE_TTL,
     CalendarAPIError,
+    CalendarBusyCache,
     CalendarConflictService,
-    _calendar_cache,
+    _utc_days,
     invalidate_calendar_cache,
+    user_for_watch_token,
+    watch_channel_token,
 )
+from core.fakes import FakeCache
+
+
+@pytest.fixture
+def fake_cache():
+    """In-memory stand-in for Redis."""
+    return FakeCache()
+
+
+@pytest.fixture
+def busy_cache(fake_cache):
+    """Busy time cache backed by the fake."""
+    return CalendarBusyCache(fake_cache)
+
+
+def _tutor(user_id: int = 123) -> MagicMock:
+    user = MagicMock()
+    user.id = user_id
+    user.google_calendar_refresh_token = f"refresh_token_{user_id}"
+    user.google_calendar_access_token = f"access_token_{user_id}"
+    user.google_calendar_token_expires = datetime.now(UTC) + timedelta(hours=1)
+    return user
 
 
 class TestCalendarAPIError:
@@ -38,19 +62,14 @@ class TestCalendarConflictService:
         return MagicMock()
 
     @pytest.fixture
-    def service(self, mock_db):
+    def service(self, mock_db, busy_cache):
         """Create service instance with mock db."""
-        return CalendarConflictService(mock_db)
+        return CalendarConflictService(mock_db, cache=busy_cache)
 
     @pytest.fixture
     def mock_tutor_user(self):
         """Create mock tutor user with calendar tokens."""
-        user = MagicMock()
-        user.id = 123
-        user.google_calendar_refresh_token = "refresh_token_123"
-        user.google_calendar_access_token = "access_token_123"
-        user.google_calendar_token_expires = datetime.now(UTC) + timedelta(hours=1)
-        return user
+        return _tutor()
 
     def test_init(self, service, mock_db):
         """Test service initialization."""
@@ -78,10 +97,9 @@ class TestCalendarConflictService:
         end = start + timedelta(hours=1)
 
         with patch.object(service, "_fetch_busy_times", return_value=[]):
-            with patch.object(service, "_get_cached_busy_times", return_value=None):
-                has_conflict, error = await service.check_calendar_conflict(
-                    mock_tutor_user, start, end
-                )
+            has_conflict, error = await service.check_calendar_conflict(
+                mock_tutor_user, start, end
+            )
 
         assert has_conflict is False
         assert error is None
@@ -100,26 +118,34 @@ class TestCalendarConflictService:
         ]
 
         with patch.object(service, "_fetch_busy_times", return_value=busy_times):
-            with patch.object(service, "_get_cached_busy_times", return_value=None):
-                has_conflict, error = await service.check_calendar_conflict(
-                    mock_tutor_user, start, end
-                )
+            has_conflict, error = await service.check_calendar_conflict(
+                mock_tutor_user, start, end
+            )
 
         assert has_conflict is True
         assert "conflict" in error.lower()
 
     @pytest.mark.asyncio
     async def test_check_uses_cache(self, service, mock_tutor_user):
-        """Test check uses cached busy times."""
-        start = datetime.now(UTC)
-        end = start + timedelta(hours=1)
-        cached_busy = []
+        """Any slot on an already fetched day is answered from the cache."""
+        start = datetime(2030, 1, 15, 9, 0, tzinfo=UTC)
+        busy_times = [{"start": "2030-01-15T14:00:00+00:00", "end": "2030-01-15T15:00:00+00:00"}]
+
+        with patch.object(service, "_fetch_busy_times", return_value=busy_times) as mock_fetch:
+            first = await service.check_calendar_conflict(mock_tutor_user, start, start + timedelta(hours=1))
+            second = await service.check_calendar_conflict(
+                mock_tutor_user, start + timedelta(hours=5), start + timedelta(hours=6)
+            )
 
-        with patch.object(
-            service, "_get_cached_busy_times", return_value=cached_busy
-        ), patch.object(service, "_fetch_busy_times") as mock_fetch:
-            await service.check_calendar_conflict(mock_tutor_user, start, end)
-            mock_fetch.assert_not_called()
+        assert first == (False, None)
+        assert second[0] is True
+        mock_fetch.assert_called_once()
+        # The whole UTC day was fetched
+        _, window_start, window_end = mock_fetch.call_args.args
+        assert (window_start, window_end) == (
+            datetime(2030, 1, 15, tzinfo=UTC),
+            datetime(2030, 1, 16, tzinfo=UTC),
+        )
 
     @pytest.mark.asyncio
     async def test_check_api_error_graceful_degradation(
@@ -133,7 +159,7 @@ class TestCalendarConflictService:
             service,
             "_fetch_busy_times",
             side_effect=CalendarAPIError("API failed"),
-        ), patch.object(service, "_get_cached_busy_times", return_value=None):
+        ):
             has_conflict, error = await service.check_calendar_conflict(
                 mock_tutor_user, start, end
             )
@@ -141,6 +167,16 @@ class TestCalendarConflictService:
         assert has_conflict is False
         assert error is None
 
+    @pytest.mark.asyncio
+    async def test_failed_lookup_is_not_cached(self, service, mock_tutor_user, fake_cache):
+        """A failure is retried on the next check instead of reading as free."""
+        start = datetime.now(UTC)
+
+        with patch.object(service, "_fetch_busy_times", side_effect=CalendarAPIError("API failed")):
+            await service.check_calendar_conflict(mock_tutor_user, start, start + timedelta(hours=1))
+
+        assert not fake_cache.get_operations("set_many")
+
     @pytest.mark.asyncio
     async def test_check_adds_timezone_to_naive_datetimes(
         self, service, mock_tutor_user
@@ -150,8 +186,7 @@ class TestCalendarConflictService:
         end = start + timedelta(hours=1)
 
         with patch.object(service, "_fetch_busy_times", return_value=[]):
-            with patch.object(service, "_get_cached_busy_times", return_value=None):
-                await service.check_calendar_conflict(mock_tutor_user, start, end)
+            await service.check_calendar_conflict(mock_tutor_user, start, end)
 
 
 class TestTokenExpiry:
@@ -357,151 +392,198 @@ class TestOverlapDetection:
         assert service._check_overlap(busy_times, start, end) is True
 
 
-class TestCaching:
-    """Tests for calendar cache functionality."""
+class TestBusyCache:
+    """Tests for the per-day busy time cache."""
 
-    @pytest.fixture
-    def mock_db(self):
-        """Create mock database session."""
-        return MagicMock()
+    @pytest.mark.asyncio
+    async def test_round_trip(self, busy_cache, fake_cache):
+        """Written days are read back under the same version, with a TTL."""
+        day = date(2030, 1, 15)
+        busy = [{"start": "2030-01-15T10:00:00Z", "end": "2030-01-15T11:00:00Z"}]
 
-    @pytest.fixture
-    def service(self, mock_db):
-        """Create service instance."""
-        return CalendarConflictService(mock_db)
+        await busy_cache.write(123, 0, {day: busy})
+        cached = await busy_cache.read([123], [day, day + timedelta(days=1)])
 
-    @pytest.fixture(autouse=True)
-    def clear_cache(self):
-        """Clear cache before each test."""
-        _calendar_cache.clear()
-        yield
-        _calendar_cache.clear()
+        assert cached[123].days == {day: busy}
+        assert cached[123].version == 0
+        assert fake_cache.get_operations("set_many")[0].metadata["ttl"] == CALENDAR_CACHE_TTL
 
-    def test_get_cache_key(self, service):
-        """Test cache key generation."""
-        start = datetime(2024, 1, 15, 10, 0, 0, tzinfo=UTC)
-        end = datetime(2024, 1, 15, 11, 0, 0, tzinfo=UTC)
+    @pytest.mark.asyncio
+    async def test_read_is_one_round_trip(self, busy_cache, fake_cache):
+        """All users and days are fetched with a single get_many."""
+        days = [date(2030, 1, 15), date(2030, 1, 16)]
 
-        key = service._get_cache_key(123, start, end)
+        await busy_cache.read([1, 2, 3], days)
 
-        assert "calendar_busy:123:" in key
-        assert "2024-01-15" in key
+        assert len(fake_cache.operations) == 1
+        assert fake_cache.operations[0].operation == "get_many"
 
-    def test_get_cache_key_rounds_to_minute(self, service):
-        """Test cache key rounds times to minute precision."""
-        start1 = datetime(2024, 1, 15, 10, 0, 30, 123456, tzinfo=UTC)
-        start2 = datetime(2024, 1, 15, 10, 0, 45, 654321, tzinfo=UTC)
-        end = datetime(2024, 1, 15, 11, 0, 0, tzinfo=UTC)
+    @pytest.mark.asyncio
+    async def test_invalidate_user(self, busy_cache):
+        """Invalidating a user turns only their entries into misses."""
+        day = date(2030, 1, 15)
+        await busy_cache.write(123, 0, {day: []})
+        await busy_cache.write(456, 0, {day: []})
 
-        key1 = service._get_cache_key(123, start1, end)
-        key2 = service._get_cache_key(123, start2, end)
+        await busy_cache.invalidate(123)
+        cached = await busy_cache.read([123, 456], [day])
 
-        assert key1 == key2
+        assert cached[123].days == {}
+        assert cached[123].version == 1
+        assert cached[456].days == {day: []}
 
-    def test_cache_busy_times(self, service):
-        """Test caching busy times."""
-        busy_times = [{"start": "2024-01-15T10:00:00", "end": "2024-01-15T11:00:00"}]
-        cache_key = "calendar_busy:123:test"
+    @pytest.mark.asyncio
+    async def test_write_after_invalidation_is_a_miss(self, busy_cache):
+        """Data fetched before an invalidation is never served after it."""
+        day = date(2030, 1, 15)
+        version = (await busy_cache.read([123], [day]))[123].version
 
-        service._cache_busy_times(cache_key, busy_times)
+        await busy_cache.invalidate(123)
+        await busy_cache.write(123, version, {day: []})
 
-        assert cache_key in _calendar_cache
-        cached, expiry = _calendar_cache[cache_key]
-        assert cached == busy_times
-        assert expiry > time.time()
+        assert (await busy_cache.read([123], [day]))[123].days == {}
 
-    def test_get_cached_busy_times_valid(self, service):
-        """Test retrieving valid cached busy times."""
-        busy_times = [{"start": "2024-01-15T10:00:00", "end": "2024-01-15T11:00:00"}]
-        cache_key = "calendar_busy:123:test"
-        _calendar_cache[cache_key] = (busy_times, time.time() + 100)
+    @pytest.mark.asyncio
+    async def test_invalidate_all(self, busy_cache, fake_cache):
+        """Invalidating without a user drops every entry."""
+        day = date(2030, 1, 15)
+        await busy_cache.write(1, 0, {day: []})
+        await busy_cache.write(2, 0, {day: []})
 
-        result = service._get_cached_busy_times(cache_key)
+        await busy_cache.invalidate()
 
-        assert result == busy_times
+        assert not [key for key in fake_cache.cache if key.startswith("calendar_busy:")]
 
-    def test_get_cached_busy_times_expired(self, service):
-        """Test retrieving expired cached busy times."""
-        busy_times = [{"start": "2024-01-15T10:00:00", "end": "2024-01-15T11:00:00"}]
-        cache_key = "calendar_busy:123:test"
-        _calendar_cache[cache_key] = (busy_times, time.time() - 1)
+    @pytest.mark.asyncio
+    async def test_module_invalidation_uses_shared_cache(self, busy_cache):
+        """invalidate_calendar_cache goes through the module's shared cache."""
+        with patch("core.calendar_conflict.calendar_busy_cache", busy_cache):
+            await busy_cache.write(123, 0, {date(2030, 1, 15): []})
+            await invalidate_calendar_cache(user_id=123)
 
-        result = service._get_cached_busy_times(cache_key)
+        assert (await busy_cache.read([123], [date(2030, 1, 15)]))[123].days == {}
 
-        assert result is None
-        assert cache_key not in _calendar_cache
+    def test_utc_days(self):
+        """Ranges map to the UTC days they touch; an end at midnight adds no day."""
+        assert _utc_days(
+            datetime(2030, 1, 15, 23, 0, tzinfo=UTC), datetime(2030, 1, 17, 0, 0, tzinfo=UTC)
+        ) == [date(2030, 1, 15), date(2030, 1, 16)]
+        # 01:00 at UTC+2 is still the previous UTC day
+        local = timezone(timedelta(hours=2))
+        assert _utc_days(
+            datetime(2030, 1, 15, 1, 0, tzinfo=local), datetime(2030, 1, 15, 3, 0, tzinfo=local)
+        ) == [date(2030, 1, 14), date(2030, 1, 15)]
 
-    def test_get_cached_busy_times_not_found(self, service):
-        """Test retrieving non-existent cached busy times."""
-        result = service._get_cached_busy_times("nonexistent_key")
-        assert result is None
 
-    def test_cache_cleanup_triggered(self, service):
-        """Test cache cleanup is triggered when cache is large."""
-        now = time.time()
-        for i in range(1001):
-            if i < 500:
-                _calendar_cache[f"key_{i}"] = ([], now - 1)
-            else:
-                _calendar_cache[f"key_{i}"] = ([], now + 1000)
+class TestBatchLookup:
+    """Tests for busy time lookups covering many tutors."""
 
-        service._cache_busy_times("new_key", [])
+    @pytest.fixture
+    def service(self, busy_cache):
+        return CalendarConflictService(MagicMock(), cache=busy_cache)
 
-        assert len(_calendar_cache) < 1001
+    @pytest.mark.asyncio
+    async def test_one_fetch_per_tutor_for_all_missing_days(self, service):
+        """Each tutor's missing days are fetched with one request."""
+        tutors = [_tutor(1), _tutor(2)]
+        start = datetime(2030, 1, 15, 9, 0, tzinfo=UTC)
+        end = datetime(2030, 1, 17, 18, 0, tzinfo=UTC)
+        busy = {"start": "2030-01-16T10:00:00+00:00", "end": "2030-01-16T11:00:00+00:00"}
+
+        with patch.object(service, "_fetch_busy_times", return_value=[busy]) as mock_fetch:
+            result = await service.get_busy_times_batch(tutors, start, end)
+            again = await service.get_busy_times_batch(tutors, start, end)
+
+        assert result == {1: [busy], 2: [busy]}
+        assert again == result
+        assert mock_fetch.call_count == 2
+        for call in mock_fetch.call_args_list:
+            assert call.args[1:] == (datetime(2030, 1, 15, tzinfo=UTC), datetime(2030, 1, 18, tzinfo=UTC))
 
-    def test_cleanup_cache(self, service):
-        """Test explicit cache cleanup."""
-        now = time.time()
-        _calendar_cache["expired1"] = ([], now - 10)
-        _calendar_cache["expired2"] = ([], now - 5)
-        _calendar_cache["valid"] = ([], now + 100)
+    @pytest.mark.asyncio
+    async def test_only_missing_days_are_fetched(self, service, busy_cache):
+        """Days already cached narrow the fetched window."""
+        await busy_cache.write(1, 0, {date(2030, 1, 15): []})
 
-        service._cleanup_cache()
+        with patch.object(service, "_fetch_busy_times", return_value=[]) as mock_fetch:
+            await service.get_busy_times_batch(
+                [_tutor(1)], datetime(2030, 1, 15, 9, 0, tzinfo=UTC), datetime(2030, 1, 16, 18, 0, tzinfo=UTC)
+            )
 
-        assert "expired1" not in _calendar_cache
-        assert "expired2" not in _calendar_cache
-        assert "valid" in _calendar_cache
+        assert mock_fetch.call_args.args[1:] == (
+            datetime(2030, 1, 16, tzinfo=UTC),
+            datetime(2030, 1, 17, tzinfo=UTC),
+        )
 
+    @pytest.mark.asyncio
+    async def test_multi_day_block_is_returned_once(self, service):
+        """A block spanning midnight is cached on both days but returned once."""
+        overnight = {"start": "2030-01-15T22:00:00+00:00", "end": "2030-01-16T02:00:00+00:00"}
 
-class TestInvalidateCalendarCache:
-    """Tests for cache invalidation function."""
+        with patch.object(service, "_fetch_busy_times", return_value=[overnight]):
+            result = await service.get_busy_times_batch(
+                [_tutor(1)], datetime(2030, 1, 15, 9, 0, tzinfo=UTC), datetime(2030, 1, 16, 18, 0, tzinfo=UTC)
+            )
+            next_day = await service.get_busy_times(
+                _tutor(1), datetime(2030, 1, 16, 1, 0, tzinfo=UTC), datetime(2030, 1, 16, 3, 0, tzinfo=UTC)
+            )
 
-    @pytest.fixture(autouse=True)
-    def clear_cache(self):
-        """Clear cache before each test."""
-        _calendar_cache.clear()
-        yield
-        _calendar_cache.clear()
+        assert result == {1: [overnight]}
+        assert next_day == [overnight]
+
+    @pytest.mark.asyncio
+    async def test_failed_tutor_is_left_out(self, service):
+        """A tutor whose calendar cannot be read is omitted, others still answer."""
+        unconnected = _tutor(3)
+        unconnected.google_calendar_refresh_token = None
+
+        async def fetch(user, start, end):
+            if user.id == 1:
+                raise CalendarAPIError("Freebusy API call failed")
+            return []
+
+        with patch.object(service, "_fetch_busy_times", side_effect=fetch):
+            result = await service.get_busy_times_batch(
+                [_tutor(1), _tutor(2), unconnected],
+                datetime(2030, 1, 15, 9, 0, tzinfo=UTC),
+                datetime(2030, 1, 15, 10, 0, tzinfo=UTC),
+            )
 
-    def test_invalidate_all(self):
-        """Test invalidating all cache entries."""
-        _calendar_cache["calendar_busy:1:key1"] = ([], time.time())
-        _calendar_cache["calendar_busy:2:key2"] = ([], time.time())
-        _calendar_cache["calendar_busy:3:key3"] = ([], time.time())
+        assert result == {2: [], 3: []}
 
-        invalidate_calendar_cache()
+    @pytest.mark.asyncio
+    async def test_watches_calendar_when_webhook_configured(self, service, busy_cache):
+        """With a webhook URL, a tutor's calendar is watched once per channel lifetime."""
+        start = datetime(2030, 1, 15, 9, 0, tzinfo=UTC)
 
-        assert len(_calendar_cache) == 0
+        with patch("core.calendar_conflict.settings") as mock_settings, patch(
+            "core.calendar_conflict.google_calendar.watch_events", new_callable=AsyncMock
+        ) as mock_watch, patch.object(service, "_fetch_busy_times", return_value=[]):
+            mock_settings.GOOGLE_CALENDAR_WEBHOOK_URL = "https://api.example.com/hook"
+            mock_settings.SECRET_KEY = "k" * 40
+            await service.get_busy_times(_tutor(1), start, start + timedelta(hours=1))
+            await busy_cache.invalidate(1)
+            await service.get_busy_times(_tutor(1), start, start + timedelta(hours=1))
 
-    def test_invalidate_for_user(self):
-        """Test invalidating cache for specific user."""
-        _calendar_cache["calendar_busy:123:key1"] = ([], time.time())
-        _calendar_cache["calendar_busy:123:key2"] = ([], time.time())
-        _calendar_cache["calendar_busy:456:key3"] = ([], time.time())
+        mock_watch.assert_awaited_once()
+        kwargs = mock_watch.await_args.kwargs
+        assert kwargs["address"] == "https://api.example.com/hook"
+        assert kwargs["token"].startswith("1.")
 
-        invalidate_calendar_cache(user_id=123)
 
-        assert "calendar_busy:123:key1" not in _calendar_cache
-        assert "calendar_busy:123:key2" not in _calendar_cache
-        assert "calendar_busy:456:key3" in _calendar_cache
+class TestWatchTokens:
+    """Tests for push notification channel tokens."""
 
-    def test_invalidate_user_not_in_cache(self):
-        """Test invalidating cache for user with no entries."""
-        _calendar_cache["calendar_busy:456:key"] = ([], time.time())
+    def test_token_round_trip(self):
+        assert user_for_watch_token(watch_channel_token(123)) == 123
 
-        invalidate_calendar_cache(user_id=123)
+    def test_token_for_other_user_rejected(self):
+        token = watch_channel_token(123)
+        assert user_for_watch_token(token.replace("123.", "124.", 1)) is None
 
-        assert "calendar_busy:456:key" in _calendar_cache
+    @pytest.mark.parametrize("token", ["", "abc", "123", "123.", "x.y"])
+    def test_malformed_tokens_rejected(self, token):
+        assert user_for_watch_token(token) is None
 
 
 class TestTokenRefresh:
@@ -595,14 +677,48 @@ class TestFetchBusyTimes:
         end = start + timedelta(hours=1)
 
         with patch(
-            "core.calendar_conflict.google_calendar.check_busy_times",
+            "core.calendar_conflict.google_calendar.query_free_busy",
             new_callable=AsyncMock,
-            return_value=expected_busy,
+            return_value={"primary": expected_busy},
         ):
             result = await service._fetch_busy_times(mock_user, start, end)
 
             assert result == expected_busy
 
+    @pytest.mark.asyncio
+    async def test_fetch_busy_times_merges_calendars(self, service, mock_user):
+        """Several calendars are queried in one request and merged."""
+        work = [{"start": "2024-01-15T10:00:00Z", "end": "2024-01-15T11:00:00Z"}]
+        personal = [{"start": "2024-01-15T18:00:00Z", "end": "2024-01-15T19:00:00Z"}]
+        start = datetime.now(UTC)
+
+        with patch(
+            "core.calendar_conflict.google_calendar.query_free_busy",
+            new_callable=AsyncMock,
+            return_value={"primary": work, "home@example.com": personal},
+        ) as mock_query:
+            result = await service._fetch_busy_times(
+                mock_user, start, start + timedelta(hours=1), calendar_ids=("primary", "home@example.com")
+            )
+
+        assert result == work + personal
+        mock_query.assert_awaited_once()
+        assert mock_query.await_args.kwargs["calendar_ids"] == ["primary", "home@example.com"]
+
+    @pytest.mark.asyncio
+    async def test_fetch_busy_times_unreadable_calendar(self, service, mock_user):
+        """A calendar Google reported an error for is a failure, not free time."""
+        with patch(
+            "core.calendar_conflict.google_calendar.query_free_busy",
+            new_callable=AsyncMock,
+            return_value={},
+        ), pytest.raises(CalendarAPIError, match="no data for primary"):
+            await service._fetch_busy_times(
+                mock_user,
+                datetime.now(UTC),
+                datetime.now(UTC) + timedelta(hours=1),
+            )
+
     @pytest.mark.asyncio
     async def test_fetch_busy_times_refreshes_expired_token(
         self, service, mock_user
@@ -619,10 +735,10 @@ class TestFetchBusyTimes:
         ) as mock_refresh:
             mock_refresh.return_value = "new_token"
             with patch(
-                "core.calendar_conflict.google_calendar.check_busy_times",
+                "core.calendar_conflict.google_calendar.query_free_busy",
                 new_callable=AsyncMock,
-                return_value=[],
-            ):
+                return_value={"primary": []},
+            ) as mock_query:
                 await service._fetch_busy_times(
                     mock_user,
                     datetime.now(UTC),
@@ -630,12 +746,13 @@ class TestFetchBusyTimes:
                 )
 
                 mock_refresh.assert_called_once()
+                assert mock_query.await_args.kwargs["access_token"] == "new_token"
 
     @pytest.mark.asyncio
     async def test_fetch_busy_times_api_error(self, service, mock_user):
         """Test CalendarAPIError is raised on API failure."""
         with patch(
-            "core.calendar_conflict.google_calendar.check_busy_times",
+            "core.calendar_conflict.google_calendar.query_free_busy",
             new_callable=AsyncMock,
             side_effect=Exception("API Error"),
         ), pytest.raises(CalendarAPIError):
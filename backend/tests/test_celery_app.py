@@ -122,6 +122,42 @@ class TestBeatSchedule:
         assert task_config["schedule"] == 60.0
         assert task_config["options"]["queue"] == "bookings"
 
+    def test_daily_metrics_rollup_scheduled(self):
+        """Test the metrics rollup has an incremental and a full refresh."""
+        schedule = celery_app.conf.beat_schedule
+
+        incremental = schedule["refresh-daily-metrics-rollup"]
+        assert incremental["task"] == "tasks.admin_tasks.refresh_daily_metrics"
+        assert incremental["schedule"] == 300.0
+
+        full = schedule["reconcile-daily-metrics-rollup"]
+        assert full["task"] == "tasks.admin_tasks.refresh_daily_metrics"
+        assert full["kwargs"] == {"full": True}
+
+    def test_conversation_sync_scheduled(self):
+        """Test the conversation backfill and repair runs daily."""
+        task_config = celery_app.conf.beat_schedule["sync-conversations"]
+        assert task_config["task"] == "tasks.message_tasks.sync_conversations"
+        assert task_config["schedule"] == 86400.0
+
+    def test_stripe_webhook_processing_scheduled(self):
+        """Test the Stripe webhook inbox is swept every 10 seconds."""
+        task_config = celery_app.conf.beat_schedule["process-stripe-webhooks"]
+        assert task_config["task"] == "tasks.payment_tasks.process_stripe_webhooks"
+        assert task_config["schedule"] == 10.0
+
+    def test_tutor_earnings_reconciliation_scheduled(self):
+        """Test tutors' running earnings totals are reconciled daily."""
+        task_config = celery_app.conf.beat_schedule["reconcile-tutor-earnings"]
+        assert task_config["task"] == "tasks.payment_tasks.reconcile_tutor_earnings"
+        assert task_config["schedule"] == 86400.0
+
+    def test_tutor_ratings_rebuild_scheduled(self):
+        """Test tutors' rating aggregates are rebuilt daily."""
+        task_config = celery_app.conf.beat_schedule["rebuild-tutor-ratings"]
+        assert task_config["task"] == "tasks.review_tasks.rebuild_tutor_ratings"
+        assert task_config["schedule"] == 86400.0
+
 
 class TestBeatSchedulerSettings:
     """Tests for beat scheduler settings."""
@@ -225,6 +261,22 @@ class TestIncludedTasks:
         """Test booking_tasks module is included."""
         assert "tasks.booking_tasks" in celery_app.conf.include
 
+    def test_admin_tasks_included(self):
+        """Test admin_tasks module is included."""
+        assert "tasks.admin_tasks" in celery_app.conf.include
+
+    def test_message_tasks_included(self):
+        """Test message_tasks module is included."""
+        assert "tasks.message_tasks" in celery_app.conf.include
+
+    def test_payment_tasks_included(self):
+        """Test payment_tasks module is included."""
+        assert "tasks.payment_tasks" in celery_app.conf.include
+
+    def test_review_tasks_included(self):
+        """Test review_tasks module is included."""
+        assert "tasks.review_tasks" in celery_app.conf.include
+
 
 class TestWorkerSettings:
     """Tests for worker-specific settings."""
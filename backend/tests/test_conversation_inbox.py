@@ -0,0 +1,174 @@
+"""
+Tests for the conversation-backed message inbox.
+
+MessageService keeps each conversation's last message and unread counters
+current on write, get_user_threads reads them in one query, and
+modules/messages/infrastructure/conversation_sync.py backfills and repairs
+conversations for messages written around the service.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from models import Conversation, Message
+from modules.messages.infrastructure.conversation_sync import backfill_conversations, repair_conversations
+from modules.messages.service import MessageService
+
+
+@pytest.fixture
+def service(db_session):
+    return MessageService(db_session)
+
+
+@pytest.fixture
+def captured_sql(db_session):
+    """Collect SQL statements executed on the test session's engine."""
+    statements: list[str] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _capture)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _capture)
+
+
+def _thread(service, user_id, other_user_id, booking_id=None):
+    threads = service.get_user_threads(user_id)
+    return next(t for t in threads if t["other_user_id"] == other_user_id and t["booking_id"] == booking_id)
+
+
+class TestThreads:
+    def test_threads_come_from_one_query(self, service, student_user, tutor_user, admin_user, captured_sql):
+        service.send_message(student_user.id, tutor_user.id, "First question")
+        service.send_message(student_user.id, tutor_user.id, "Second question")
+        service.send_message(admin_user.id, tutor_user.id, "Welcome aboard")
+        service.send_message(tutor_user.id, student_user.id, "Happy to help")
+        # Read before measuring: the commits above expired the fixtures
+        tutor_id, student_id, admin_id = tutor_user.id, student_user.id, admin_user.id
+        student_email = student_user.email
+        captured_sql.clear()
+
+        threads = service.get_user_threads(tutor_id)
+
+        assert len(captured_sql) == 1
+        assert [t["other_user_id"] for t in threads] == [student_id, admin_id]
+        assert threads[0]["last_message"] == "Happy to help"
+        assert threads[0]["last_sender_id"] == tutor_id
+        assert threads[0]["unread_count"] == 2
+        assert threads[0]["other_user_email"] == student_email
+        assert threads[1]["unread_count"] == 1
+
+    def test_both_directions_share_one_conversation(self, service, db_session, student_user, tutor_user):
+        service.send_message(tutor_user.id, student_user.id, "Hi")
+        service.send_message(student_user.id, tutor_user.id, "Hello")
+
+        conversation = db_session.query(Conversation).one()
+        assert (conversation.student_id, conversation.tutor_id) == (student_user.id, tutor_user.id)
+        assert conversation.student_unread_count == 1
+        assert conversation.tutor_unread_count == 1
+
+    def test_non_tutor_pair_uses_lower_id_as_student_slot(self, service, db_session, student_user, admin_user):
+        service.send_message(max(student_user.id, admin_user.id), min(student_user.id, admin_user.id), "Notice")
+
+        conversation = db_session.query(Conversation).one()
+        assert conversation.student_id == min(student_user.id, admin_user.id)
+        assert _thread(service, student_user.id, admin_user.id)["last_message"] == "Notice"
+
+    def test_booking_threads_are_separate(self, service, student_user, tutor_user, test_booking):
+        service.send_message(student_user.id, tutor_user.id, "General question")
+        service.send_message(student_user.id, tutor_user.id, "About our session", booking_id=test_booking.id)
+
+        assert _thread(service, tutor_user.id, student_user.id)["unread_count"] == 1
+        assert _thread(service, tutor_user.id, student_user.id, test_booking.id)["unread_count"] == 1
+
+
+class TestCountersOnWrite:
+    def test_reading_a_message_decrements_unread(self, service, student_user, tutor_user):
+        first = service.send_message(student_user.id, tutor_user.id, "One")
+        service.send_message(student_user.id, tutor_user.id, "Two")
+
+        service.mark_message_read(first.id, tutor_user.id)
+        service.mark_message_read(first.id, tutor_user.id)  # Already read: no change
+
+        assert _thread(service, tutor_user.id, student_user.id)["unread_count"] == 1
+
+    def test_reading_a_thread_clears_unread(self, service, student_user, tutor_user, test_booking):
+        service.send_message(student_user.id, tutor_user.id, "One")
+        service.send_message(student_user.id, tutor_user.id, "Two", booking_id=test_booking.id)
+
+        service.mark_thread_read(tutor_user.id, student_user.id, booking_id=test_booking.id)
+        assert _thread(service, tutor_user.id, student_user.id)["unread_count"] == 1
+        assert _thread(service, tutor_user.id, student_user.id, test_booking.id)["unread_count"] == 0
+
+        service.mark_thread_read(tutor_user.id, student_user.id)
+        assert _thread(service, tutor_user.id, student_user.id)["unread_count"] == 0
+
+    def test_deleting_last_message_restores_previous_preview(self, service, student_user, tutor_user):
+        service.send_message(tutor_user.id, student_user.id, "Earlier")
+        latest = service.send_message(student_user.id, tutor_user.id, "Oops")
+
+        service.delete_message(latest.id, student_user.id)
+
+        thread = _thread(service, tutor_user.id, student_user.id)
+        assert thread["last_message"] == "Earlier"
+        assert thread["unread_count"] == 0
+
+    def test_deleting_only_message_hides_thread(self, service, student_user, tutor_user):
+        message = service.send_message(student_user.id, tutor_user.id, "Only one")
+
+        service.delete_message(message.id, student_user.id)
+
+        assert service.get_user_threads(tutor_user.id) == []
+
+
+class TestConversationSync:
+    def test_backfill_files_unfiled_messages(self, service, db_session, student_user, tutor_user):
+        now = datetime.now(UTC)
+        db_session.add_all(
+            [
+                Message(sender_id=student_user.id, recipient_id=tutor_user.id, message="Imported 1",
+                        created_at=now - timedelta(minutes=2), updated_at=now),
+                Message(sender_id=tutor_user.id, recipient_id=student_user.id, message="Imported 2",
+                        created_at=now - timedelta(minutes=1), updated_at=now, is_read=True),
+            ]
+        )
+        db_session.commit()
+        assert service.get_user_threads(tutor_user.id) == []
+
+        assert backfill_conversations(db_session, batch_size=1) == 2
+        assert backfill_conversations(db_session) == 0
+
+        thread = _thread(service, tutor_user.id, student_user.id)
+        assert thread["last_message"] == "Imported 2"
+        assert thread["unread_count"] == 1
+        conversation = db_session.query(Conversation).one()
+        assert conversation.tutor_id == tutor_user.id
+
+    def test_backfill_joins_existing_conversation(self, service, db_session, student_user, tutor_user):
+        service.send_message(student_user.id, tutor_user.id, "Via the API")
+        db_session.add(Message(sender_id=tutor_user.id, recipient_id=student_user.id, message="Imported",
+                               created_at=datetime.now(UTC), updated_at=datetime.now(UTC)))
+        db_session.commit()
+
+        backfill_conversations(db_session)
+
+        assert db_session.query(Conversation).count() == 1
+        assert _thread(service, student_user.id, tutor_user.id)["last_message"] == "Imported"
+
+    def test_repair_fixes_drifted_counters(self, service, db_session, student_user, tutor_user):
+        service.send_message(student_user.id, tutor_user.id, "Hello")
+        conversation = db_session.query(Conversation).one()
+        conversation.tutor_unread_count = 7
+        conversation.last_message_id = None
+        db_session.commit()
+
+        assert repair_conversations(db_session) == 1
+        assert repair_conversations(db_session, [conversation.id]) == 0
+
+        thread = _thread(service, tutor_user.id, student_user.id)
+        assert thread["unread_count"] == 1
+        assert thread["last_message"] == "Hello"
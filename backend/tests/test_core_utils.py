@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from core.cache import cache_with_ttl, get_cache_stats, invalidate_cache
+from core.cache import cache_with_ttl, get_cache_metrics, invalidate_cache
 from core.pagination import PaginationParams, paginate
 from core.sanitization import sanitize_email, sanitize_text_input, sanitize_url
 
@@ -219,22 +219,22 @@ class TestCaching:
 
         expensive_function(5)
 
-        stats_before = get_cache_stats()
-        assert stats_before["total_entries"] > 0
+        stats_before = get_cache_metrics()
+        assert stats_before["entries"] > 0
 
         invalidate_cache()
 
-        stats_after = get_cache_stats()
-        assert stats_after["total_entries"] == 0
+        stats_after = get_cache_metrics()
+        assert stats_after["entries"] == 0
 
-    def test_cache_pattern_invalidation(self):
-        """Test pattern-based cache invalidation."""
+    def test_cache_namespace_invalidation(self):
+        """Test namespace-based cache invalidation."""
 
-        @cache_with_ttl(ttl_seconds=60)
+        @cache_with_ttl(ttl_seconds=60, namespace="function_a")
         def function_a(x):
             return x * 2
 
-        @cache_with_ttl(ttl_seconds=60)
+        @cache_with_ttl(ttl_seconds=60, namespace="function_b")
         def function_b(x):
             return x * 3
 
@@ -243,15 +243,15 @@ class TestCaching:
         function_a(5)
         function_b(5)
 
-        stats = get_cache_stats()
-        initial_count = stats["total_entries"]
+        stats = get_cache_metrics()
+        initial_count = stats["entries"]
 
         # Invalidate only function_a
-        invalidate_cache(pattern="function_a")
+        invalidate_cache("function_a")
 
-        stats_after = get_cache_stats()
+        stats_after = get_cache_metrics()
         # Should have fewer entries
-        assert stats_after["total_entries"] < initial_count
+        assert stats_after["entries"] < initial_count
 
     def test_cache_stats(self):
         """Test cache statistics."""
@@ -266,10 +266,9 @@ class TestCaching:
         expensive_function(2)
         expensive_function(3)
 
-        stats = get_cache_stats()
+        stats = get_cache_metrics()
 
-        assert "total_entries" in stats
-        assert "valid_entries" in stats
-        assert "expired_entries" in stats
-        assert "keys" in stats
-        assert stats["total_entries"] >= 3
+        assert "entries" in stats
+        assert "bytes" in stats
+        assert "namespaces" in stats
+        assert stats["entries"] >= 3
@@ -240,26 +240,18 @@ class TestCORSExceptionHandlers:
 
     def test_rate_limit_handler_includes_cors(self):
         """Rate limit handler should include CORS headers."""
-        from unittest.mock import MagicMock
-
-        from fastapi import FastAPI, Request
-        from slowapi.errors import RateLimitExceeded
-        from slowapi.wrappers import Limit
+        from fastapi import FastAPI
         from starlette.testclient import TestClient
 
         from core.cors import create_cors_rate_limit_handler
+        from core.rate_limiting import RateLimitExceeded
 
         app = FastAPI()
         handler = create_cors_rate_limit_handler(["http://test.com"])
 
-        # Create a mock Limit object for RateLimitExceeded
-        mock_limit = MagicMock()
-        mock_limit.limit = "10/minute"
-        mock_limit.error_message = None
-
         @app.get("/test")
         async def rate_limited():
-            raise RateLimitExceeded(mock_limit)
+            raise RateLimitExceeded(retry_after=12.5)
 
         app.add_exception_handler(RateLimitExceeded, handler)
         client = TestClient(app)
@@ -268,7 +260,7 @@ class TestCORSExceptionHandlers:
 
         assert response.status_code == 429
         assert response.headers.get("Access-Control-Allow-Origin") == "http://test.com"
-        assert "Retry-After" in response.headers
+        assert response.headers["Retry-After"] == "13"
 
 
 class TestCORSMiddleware:
@@ -0,0 +1,102 @@
+"""
+Tests for cursor (keyset) pagination on list endpoints.
+
+Passing ``cursor`` (empty for the first page) switches an endpoint from
+page/offset paging to keyset paging by its sort key. core/pagination.py signs
+the cursor for that listing, and the total is only returned on request.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from models import Notification
+from modules.messages.service import MessageService
+
+
+def _walk(client, url, headers, items_key):
+    """Follow next_cursor from the first page; return every page's JSON."""
+    pages = [client.get(f"{url}&cursor=", headers=headers).json()]
+    while pages[-1]["next_cursor"]:
+        pages.append(client.get(f"{url}&cursor={pages[-1]['next_cursor']}", headers=headers).json())
+    assert all(items_key in page for page in pages)
+    return pages
+
+
+class TestNotificationCursor:
+    def test_walks_newest_first_without_gaps(self, client, db_session, student_user, student_token):
+        now = datetime.now(UTC)
+        # Two notifications share a timestamp so the id breaks the tie
+        db_session.add_all(
+            Notification(
+                user_id=student_user.id,
+                type="test",
+                title=f"Notice {i}",
+                message="Body",
+                created_at=now - timedelta(minutes=min(i, 4)),
+            )
+            for i in range(6)
+        )
+        db_session.commit()
+        headers = {"Authorization": f"Bearer {student_token}"}
+
+        pages = _walk(client, "/api/v1/notifications?limit=2", headers, "items")
+
+        titles = [item["title"] for page in pages for item in page["items"]]
+        assert len(pages) == 3
+        assert titles[:4] == ["Notice 0", "Notice 1", "Notice 2", "Notice 3"]
+        assert sorted(titles) == [f"Notice {i}" for i in range(6)]
+        assert all(page["total"] is None for page in pages)
+
+    def test_include_total(self, client, db_session, student_user, student_token):
+        db_session.add(Notification(user_id=student_user.id, type="test", title="Only", message="Body"))
+        db_session.commit()
+
+        response = client.get(
+            "/api/v1/notifications?cursor=&include_total=true",
+            headers={"Authorization": f"Bearer {student_token}"},
+        )
+
+        assert response.json()["total"] == 1
+
+    def test_cursor_from_another_user_is_rejected(self, client, db_session, student_user, student_token, tutor_token):
+        db_session.add_all(
+            Notification(user_id=student_user.id, type="test", title=f"Notice {i}", message="Body") for i in range(3)
+        )
+        db_session.commit()
+        cursor = client.get(
+            "/api/v1/notifications?limit=1&cursor=", headers={"Authorization": f"Bearer {student_token}"}
+        ).json()["next_cursor"]
+
+        response = client.get(
+            f"/api/v1/notifications?limit=1&cursor={cursor}", headers={"Authorization": f"Bearer {tutor_token}"}
+        )
+
+        assert response.status_code == 400
+
+
+class TestConversationCursor:
+    def test_pages_back_through_history(self, client, db_session, student_user, tutor_user, student_token):
+        service = MessageService(db_session)
+        for i in range(5):
+            service.send_message(student_user.id, tutor_user.id, f"Message {i}")
+        headers = {"Authorization": f"Bearer {student_token}"}
+
+        pages = _walk(client, f"/api/v1/messages/threads/{tutor_user.id}?page_size=2", headers, "messages")
+
+        assert [[m["message"] for m in page["messages"]] for page in pages] == [
+            ["Message 3", "Message 4"],
+            ["Message 1", "Message 2"],
+            ["Message 0"],
+        ]
+
+    def test_page_mode_still_counts(self, client, db_session, student_user, tutor_user, student_token):
+        service = MessageService(db_session)
+        for i in range(3):
+            service.send_message(student_user.id, tutor_user.id, f"Message {i}")
+
+        data = client.get(
+            f"/api/v1/messages/threads/{tutor_user.id}?page=1&page_size=2",
+            headers={"Authorization": f"Bearer {student_token}"},
+        ).json()
+
+        assert data["total"] == 3
+        assert data["next_cursor"] is not None
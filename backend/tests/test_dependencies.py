@@ -28,21 +28,28 @@ class TestGetCurrentUser:
         return MagicMock()
 
     @pytest.fixture
-    def mock_user(self):
-        """Create mock user."""
-        user = MagicMock()
-        user.id = 1
-        user.email = "test@example.com"
-        user.role = "student"
-        user.is_active = True
-        user.deleted_at = None
-        user.password_changed_at = None
-        return user
+    def principal(self):
+        """Cached principal snapshot for the token's user."""
+        return {
+            "id": 1,
+            "email": "test@example.com",
+            "role": "student",
+            "is_active": True,
+            "password_changed_at": None,
+        }
+
+    @pytest.fixture
+    def mock_resolve(self, principal):
+        """Patch principal resolution and user attachment."""
+        with (
+            patch("core.dependencies.resolve_principal", AsyncMock(return_value=principal)) as resolve,
+            patch("core.dependencies.attach_user") as attach,
+        ):
+            yield resolve, attach
 
     @pytest.mark.asyncio
-    async def test_valid_token(self, mock_db, mock_user):
+    async def test_valid_token(self, mock_db, principal, mock_resolve):
         """Test authentication with valid token."""
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_user
 
         with patch("core.dependencies.TokenManager.decode_token") as mock_decode:
             mock_decode.return_value = {
@@ -52,7 +59,8 @@ class TestGetCurrentUser:
 
             result = await get_current_user("valid_token", mock_db)
 
-            assert result == mock_user
+            assert result == mock_resolve[1].return_value
+            mock_resolve[1].assert_called_once_with(mock_db, principal)
 
     @pytest.mark.asyncio
     async def test_invalid_token(self, mock_db):
@@ -81,9 +89,9 @@ class TestGetCurrentUser:
             assert exc_info.value.status_code == 401
 
     @pytest.mark.asyncio
-    async def test_user_not_found(self, mock_db):
+    async def test_user_not_found(self, mock_db, mock_resolve):
         """Test authentication when user not found."""
-        mock_db.query.return_value.filter.return_value.first.return_value = None
+        mock_resolve[0].return_value = None
 
         with patch("core.dependencies.TokenManager.decode_token") as mock_decode:
             mock_decode.return_value = {"sub": "unknown@example.com"}
@@ -95,10 +103,9 @@ class TestGetCurrentUser:
             assert "not found" in exc_info.value.detail.lower()
 
     @pytest.mark.asyncio
-    async def test_inactive_user(self, mock_db, mock_user):
+    async def test_inactive_user(self, mock_db, principal, mock_resolve):
         """Test authentication for inactive user."""
-        mock_user.is_active = False
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+        principal["is_active"] = False
 
         with patch("core.dependencies.TokenManager.decode_token") as mock_decode:
             mock_decode.return_value = {"sub": "test@example.com", "role": "student"}
@@ -110,10 +117,9 @@ class TestGetCurrentUser:
             assert "inactive" in exc_info.value.detail.lower()
 
     @pytest.mark.asyncio
-    async def test_password_changed_invalidates_token(self, mock_db, mock_user):
+    async def test_password_changed_invalidates_token(self, mock_db, principal, mock_resolve):
         """Test token invalidated after password change."""
-        mock_user.password_changed_at = datetime.utcnow()
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+        principal["password_changed_at"] = datetime.utcnow().timestamp()
 
         with patch("core.dependencies.TokenManager.decode_token") as mock_decode:
             mock_decode.return_value = {
@@ -129,10 +135,9 @@ class TestGetCurrentUser:
             assert "password change" in exc_info.value.detail.lower()
 
     @pytest.mark.asyncio
-    async def test_password_changed_without_pwd_ts(self, mock_db, mock_user):
+    async def test_password_changed_without_pwd_ts(self, mock_db, principal, mock_resolve):
         """Test old token without pwd_ts is invalidated after password change."""
-        mock_user.password_changed_at = datetime.utcnow()
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+        principal["password_changed_at"] = datetime.utcnow().timestamp()
 
         with patch("core.dependencies.TokenManager.decode_token") as mock_decode:
             mock_decode.return_value = {
@@ -146,10 +151,9 @@ class TestGetCurrentUser:
             assert exc_info.value.status_code == 401
 
     @pytest.mark.asyncio
-    async def test_role_changed_invalidates_token(self, mock_db, mock_user):
+    async def test_role_changed_invalidates_token(self, mock_db, principal, mock_resolve):
         """Test token invalidated when role changes."""
-        mock_user.role = "tutor"
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+        principal["role"] = "tutor"
 
         with patch("core.dependencies.TokenManager.decode_token") as mock_decode:
             mock_decode.return_value = {
@@ -173,16 +177,24 @@ class TestGetCurrentUserOptional:
         return MagicMock()
 
     @pytest.fixture
-    def mock_user(self):
-        """Create mock user."""
-        user = MagicMock()
-        user.id = 1
-        user.email = "test@example.com"
-        user.role = "student"
-        user.is_active = True
-        user.deleted_at = None
-        user.password_changed_at = None
-        return user
+    def principal(self):
+        """Cached principal snapshot for the token's user."""
+        return {
+            "id": 1,
+            "email": "test@example.com",
+            "role": "student",
+            "is_active": True,
+            "password_changed_at": None,
+        }
+
+    @pytest.fixture
+    def mock_resolve(self, principal):
+        """Patch principal resolution and user attachment."""
+        with (
+            patch("core.dependencies.resolve_principal", AsyncMock(return_value=principal)) as resolve,
+            patch("core.dependencies.attach_user") as attach,
+        ):
+            yield resolve, attach
 
     @pytest.mark.asyncio
     async def test_no_token(self, mock_db):
@@ -197,9 +209,8 @@ class TestGetCurrentUserOptional:
         assert result is None
 
     @pytest.mark.asyncio
-    async def test_valid_token(self, mock_db, mock_user):
+    async def test_valid_token(self, mock_db, principal, mock_resolve):
         """Test returns user for valid token."""
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_user
 
         with patch("core.dependencies.TokenManager.decode_token") as mock_decode:
             mock_decode.return_value = {
@@ -209,7 +220,8 @@ class TestGetCurrentUserOptional:
 
             result = await get_current_user_optional("valid_token", mock_db)
 
-            assert result == mock_user
+            assert result == mock_resolve[1].return_value
+            mock_resolve[1].assert_called_once_with(mock_db, principal)
 
     @pytest.mark.asyncio
     async def test_invalid_token_returns_none(self, mock_db):
@@ -224,9 +236,9 @@ class TestGetCurrentUserOptional:
             assert result is None
 
     @pytest.mark.asyncio
-    async def test_user_not_found_returns_none(self, mock_db):
+    async def test_user_not_found_returns_none(self, mock_db, mock_resolve):
         """Test returns None when user not found."""
-        mock_db.query.return_value.filter.return_value.first.return_value = None
+        mock_resolve[0].return_value = None
 
         with patch("core.dependencies.TokenManager.decode_token") as mock_decode:
             mock_decode.return_value = {"sub": "unknown@example.com"}
@@ -236,10 +248,9 @@ class TestGetCurrentUserOptional:
             assert result is None
 
     @pytest.mark.asyncio
-    async def test_inactive_user_returns_none(self, mock_db, mock_user):
+    async def test_inactive_user_returns_none(self, mock_db, principal, mock_resolve):
         """Test returns None for inactive user."""
-        mock_user.is_active = False
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+        principal["is_active"] = False
 
         with patch("core.dependencies.TokenManager.decode_token") as mock_decode:
             mock_decode.return_value = {"sub": "test@example.com"}
@@ -249,10 +260,9 @@ class TestGetCurrentUserOptional:
             assert result is None
 
     @pytest.mark.asyncio
-    async def test_stale_password_token_returns_none(self, mock_db, mock_user):
+    async def test_stale_password_token_returns_none(self, mock_db, principal, mock_resolve):
         """Test returns None for stale password token."""
-        mock_user.password_changed_at = datetime.utcnow()
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+        principal["password_changed_at"] = datetime.utcnow().timestamp()
 
         with patch("core.dependencies.TokenManager.decode_token") as mock_decode:
             mock_decode.return_value = {
@@ -265,10 +275,9 @@ class TestGetCurrentUserOptional:
             assert result is None
 
     @pytest.mark.asyncio
-    async def test_stale_role_token_returns_none(self, mock_db, mock_user):
+    async def test_stale_role_token_returns_none(self, mock_db, principal, mock_resolve):
         """Test returns None for stale role token."""
-        mock_user.role = "tutor"
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+        principal["role"] = "tutor"
 
         with patch("core.dependencies.TokenManager.decode_token") as mock_decode:
             mock_decode.return_value = {
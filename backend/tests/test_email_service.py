@@ -8,6 +8,7 @@ Tests cover:
 - Transient error detection
 - Email sending with tracking
 - Retry logic with exponential backoff
+- Batch sending
 - Booking email templates
 - Authentication email templates (password reset, welcome, verification)
 - Error handling and edge cases
@@ -21,6 +22,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from core.email_service import (
+    BatchEmail,
     EmailDeliveryResult,
     EmailDeliveryStatus,
     EmailService,
@@ -644,6 +646,104 @@ class TestSendWithRetry:
         assert elapsed >= 0.3
 
 
+# =============================================================================
+# Test Batch Sending
+# =============================================================================
+
+
+def _batch(count: int) -> list[BatchEmail]:
+    return [
+        BatchEmail(to_email=f"user{i}@example.com", to_name=f"User {i}", subject="Hello", params={"i": i})
+        for i in range(count)
+    ]
+
+
+class TestSendBatchWithTracking:
+    """Tests for sending many emails per Brevo call."""
+
+    def test_one_call_with_a_version_per_message(
+        self, email_svc: EmailService, mock_settings, mock_brevo_api
+    ):
+        """Test a batch goes out in one API call with per-message ids."""
+        mock_sdk, mock_api = mock_brevo_api
+        mock_api.send_transac_email.return_value = MagicMock(message_ids=["m-0", "m-1", "m-2"])
+
+        results = email_svc.send_batch_with_tracking("<p>{{ params.i }}</p>", _batch(3))
+
+        mock_api.send_transac_email.assert_called_once()
+        assert mock_sdk.SendSmtpEmailMessageVersions.call_count == 3
+        assert mock_sdk.SendSmtpEmailMessageVersions.call_args.kwargs["params"] == {"i": 2}
+        assert [r.message_id for r in results] == ["m-0", "m-1", "m-2"]
+        assert all(r.status == EmailDeliveryStatus.SUCCESS for r in results)
+
+    def test_splits_at_batch_limit(
+        self, email_svc: EmailService, mock_settings, mock_brevo_api
+    ):
+        """Test batches larger than BATCH_LIMIT use several calls."""
+        _, mock_api = mock_brevo_api
+        mock_api.send_transac_email.return_value = MagicMock(message_ids=None, message_id="m")
+        email_svc.BATCH_LIMIT = 2
+
+        results = email_svc.send_batch_with_tracking("<p></p>", _batch(5))
+
+        assert mock_api.send_transac_email.call_count == 3
+        assert len(results) == 5
+
+    def test_transient_failure_fails_whole_batch(
+        self, email_svc: EmailService, mock_settings, mock_brevo_api
+    ):
+        """Test a transient error is reported for every message without resending."""
+        _, mock_api = mock_brevo_api
+        mock_api.send_transac_email.side_effect = Exception("503 Service Unavailable")
+
+        results = email_svc.send_batch_with_tracking("<p></p>", _batch(3))
+
+        mock_api.send_transac_email.assert_called_once()
+        assert all(r.status == EmailDeliveryStatus.FAILED_TRANSIENT for r in results)
+
+    def test_permanent_failure_resends_individually(
+        self, email_svc: EmailService, mock_settings, mock_brevo_api
+    ):
+        """Test one bad address doesn't fail the rest of the batch."""
+        _, mock_api = mock_brevo_api
+        mock_api.send_transac_email.side_effect = [
+            Exception("Invalid email address"),
+            MagicMock(message_ids=["m-0"]),
+            Exception("Invalid email address"),
+            MagicMock(message_ids=["m-2"]),
+        ]
+
+        results = email_svc.send_batch_with_tracking("<p></p>", _batch(3))
+
+        assert mock_api.send_transac_email.call_count == 4
+        assert [r.success for r in results] == [True, False, True]
+        assert results[1].status == EmailDeliveryStatus.FAILED_PERMANENT
+
+    def test_disabled(self, email_svc: EmailService):
+        """Test batch sending when email is disabled."""
+        with patch("core.email_service.settings") as mock:
+            mock.EMAIL_ENABLED = False
+
+            results = email_svc.send_batch_with_tracking("<p></p>", _batch(2))
+
+        assert [r.status for r in results] == [EmailDeliveryStatus.DISABLED] * 2
+        assert all(r.success for r in results)
+
+    def test_not_configured(self, email_svc: EmailService):
+        """Test batch sending without an API key."""
+        with patch("core.email_service.settings") as mock:
+            mock.EMAIL_ENABLED = True
+            mock.BREVO_API_KEY = None
+
+            results = email_svc.send_batch_with_tracking("<p></p>", _batch(2))
+
+        assert [r.status for r in results] == [EmailDeliveryStatus.NOT_CONFIGURED] * 2
+
+    def test_empty_batch(self, email_svc: EmailService):
+        """Test an empty batch makes no call."""
+        assert email_svc.send_batch_with_tracking("<p></p>", []) == []
+
+
 # =============================================================================
 # Test Booking Email Templates
 # =============================================================================
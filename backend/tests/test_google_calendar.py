@@ -8,27 +8,77 @@ Tests cover:
 - Busy time checking (freebusy API)
 - Event listing
 - Error handling and edge cases
+
+Requests go through the shared pooled client (core/http_clients.py); the
+``google_api`` fixture swaps its transport for an in-process fake.
 """
 
+import json
+from dataclasses import replace
 from datetime import UTC, datetime, timedelta
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import patch
 
+import httpx
 import pytest
-from googleapiclient.errors import HttpError
 
 from core.google_calendar import (
     CALENDAR_SCOPES,
     GOOGLE_AUTH_URL,
-    GOOGLE_TOKEN_URL,
+    GoogleCalendarAPIError,
     GoogleCalendarService,
+    _calendar_path,
     google_calendar,
+    http_clients,
 )
+from core.http_clients import PROVIDERS
+
+EVENTS_PATH = "/calendar/v3/calendars/primary/events"
 
 # =============================================================================
 # Fixtures
 # =============================================================================
 
 
+class FakeGoogleAPI:
+    """Answers Google requests from a (method, path) table and records them."""
+
+    def __init__(self) -> None:
+        self.requests: list[httpx.Request] = []
+        self._routes: dict[tuple[str, str], list[httpx.Response | Exception]] = {}
+
+    def respond(
+        self,
+        method: str,
+        path: str,
+        status: int = 200,
+        json: dict | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        """Queue a response (or a transport error) for the next matching request."""
+        result = error if error is not None else httpx.Response(status, json=json)
+        self._routes.setdefault((method, path), []).append(result)
+
+    def fail(self, status: int, message: str) -> dict:
+        return {"error": {"code": status, "message": message}}
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        queue = self._routes.get((request.method, request.url.path))
+        if not queue:
+            return httpx.Response(404, json=self.fail(404, "Not Found"))
+        # The last queued response keeps answering repeated requests
+        result = queue.pop(0) if len(queue) > 1 else queue[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def body(self, index: int = -1) -> dict:
+        return json.loads(self.requests[index].content)
+
+    def form(self, index: int = -1) -> dict:
+        return dict(httpx.QueryParams(self.requests[index].content.decode()))
+
+
 @pytest.fixture
 def calendar_service() -> GoogleCalendarService:
     """Fresh GoogleCalendarService instance for each test."""
@@ -47,21 +97,20 @@ def mock_settings():
 
 
 @pytest.fixture
-def mock_credentials():
-    """Mock Google credentials object."""
-    with patch("core.google_calendar.Credentials") as mock_creds:
-        mock_instance = MagicMock()
-        mock_creds.return_value = mock_instance
-        yield mock_creds
+def google_api():
+    """Route the Google providers of the shared HTTP client registry to a fake."""
+    fake = FakeGoogleAPI()
+    transport = httpx.MockTransport(fake.handler)
+    for name in ("google_oauth", "google_calendar"):
+        http_clients.register(replace(PROVIDERS[name], retry_base_delay=0.0), transport)
+    yield fake
+    for name in ("google_oauth", "google_calendar"):
+        http_clients.register(PROVIDERS[name])
 
 
-@pytest.fixture
-def mock_calendar_build():
-    """Mock Google Calendar API build function."""
-    with patch("core.google_calendar.build") as mock_build:
-        mock_service = MagicMock()
-        mock_build.return_value = mock_service
-        yield mock_build, mock_service
+def _times() -> tuple[datetime, datetime]:
+    start_time = datetime.now(UTC) + timedelta(days=1)
+    return start_time, start_time + timedelta(hours=1)
 
 
 # =============================================================================
@@ -137,7 +186,7 @@ class TestExchangeCodeForTokens:
 
     @pytest.mark.asyncio
     async def test_exchange_code_success(
-        self, calendar_service: GoogleCalendarService, mock_settings
+        self, calendar_service: GoogleCalendarService, mock_settings, google_api
     ):
         """Test successful token exchange."""
         expected_tokens = {
@@ -146,61 +195,50 @@ class TestExchangeCodeForTokens:
             "expires_in": 3600,
             "token_type": "Bearer",
         }
+        google_api.respond("POST", "/token", json=expected_tokens)
 
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = expected_tokens
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-
-            result = await calendar_service.exchange_code_for_tokens("auth-code-123")
+        result = await calendar_service.exchange_code_for_tokens("auth-code-123")
 
-            assert result == expected_tokens
-            mock_client.post.assert_called_once()
-            call_args = mock_client.post.call_args
-            assert call_args[0][0] == GOOGLE_TOKEN_URL
-            assert call_args[1]["data"]["code"] == "auth-code-123"
-            assert call_args[1]["data"]["grant_type"] == "authorization_code"
+        assert result == expected_tokens
+        assert len(google_api.requests) == 1
+        assert str(google_api.requests[0].url) == "https://oauth2.googleapis.com/token"
+        form = google_api.form()
+        assert form["code"] == "auth-code-123"
+        assert form["grant_type"] == "authorization_code"
 
     @pytest.mark.asyncio
     async def test_exchange_code_with_custom_redirect(
-        self, calendar_service: GoogleCalendarService, mock_settings
+        self, calendar_service: GoogleCalendarService, mock_settings, google_api
     ):
         """Test token exchange with custom redirect URI."""
         custom_redirect = "https://custom.example.com/callback"
+        google_api.respond("POST", "/token", json={"access_token": "test"})
 
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = {"access_token": "test"}
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-
-            await calendar_service.exchange_code_for_tokens(
-                "auth-code", redirect_uri=custom_redirect
-            )
+        await calendar_service.exchange_code_for_tokens("auth-code", redirect_uri=custom_redirect)
 
-            call_args = mock_client.post.call_args
-            assert call_args[1]["data"]["redirect_uri"] == custom_redirect
+        assert google_api.form()["redirect_uri"] == custom_redirect
 
     @pytest.mark.asyncio
     async def test_exchange_code_failure(
-        self, calendar_service: GoogleCalendarService, mock_settings
+        self, calendar_service: GoogleCalendarService, mock_settings, google_api
     ):
         """Test token exchange failure."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_response = MagicMock()
-            mock_response.status_code = 400
-            mock_response.text = "Invalid code"
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+        google_api.respond("POST", "/token", status=400, json={"error": "invalid_grant"})
 
-            with pytest.raises(ValueError, match="Failed to exchange authorization code"):
-                await calendar_service.exchange_code_for_tokens("invalid-code")
+        with pytest.raises(ValueError, match="Failed to exchange authorization code"):
+            await calendar_service.exchange_code_for_tokens("invalid-code")
+
+    @pytest.mark.asyncio
+    async def test_exchange_code_is_not_retried(
+        self, calendar_service: GoogleCalendarService, mock_settings, google_api
+    ):
+        """Authorization codes are single-use, so a 503 is not retried."""
+        google_api.respond("POST", "/token", status=503, json={})
+
+        with pytest.raises(ValueError, match="Failed to exchange authorization code"):
+            await calendar_service.exchange_code_for_tokens("auth-code")
+
+        assert len(google_api.requests) == 1
 
     @pytest.mark.asyncio
     async def test_exchange_code_no_credentials_raises(
@@ -237,7 +275,7 @@ class TestRefreshAccessToken:
 
     @pytest.mark.asyncio
     async def test_refresh_token_success(
-        self, calendar_service: GoogleCalendarService, mock_settings
+        self, calendar_service: GoogleCalendarService, mock_settings, google_api
     ):
         """Test successful token refresh."""
         expected_tokens = {
@@ -245,37 +283,37 @@ class TestRefreshAccessToken:
             "expires_in": 3600,
             "token_type": "Bearer",
         }
+        google_api.respond("POST", "/token", json=expected_tokens)
 
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = expected_tokens
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+        result = await calendar_service.refresh_access_token("1//refresh-token")
+
+        assert result == expected_tokens
+        form = google_api.form()
+        assert form["grant_type"] == "refresh_token"
+        assert form["refresh_token"] == "1//refresh-token"
+
+    @pytest.mark.asyncio
+    async def test_refresh_token_retries_transient_errors(
+        self, calendar_service: GoogleCalendarService, mock_settings, google_api
+    ):
+        """Refreshing is idempotent, so a 503 is retried."""
+        google_api.respond("POST", "/token", status=503, json={})
+        google_api.respond("POST", "/token", json={"access_token": "fresh"})
 
-            result = await calendar_service.refresh_access_token("1//refresh-token")
+        result = await calendar_service.refresh_access_token("1//refresh-token")
 
-            assert result == expected_tokens
-            call_args = mock_client.post.call_args
-            assert call_args[1]["data"]["grant_type"] == "refresh_token"
-            assert call_args[1]["data"]["refresh_token"] == "1//refresh-token"
+        assert result == {"access_token": "fresh"}
+        assert len(google_api.requests) == 2
 
     @pytest.mark.asyncio
     async def test_refresh_token_failure(
-        self, calendar_service: GoogleCalendarService, mock_settings
+        self, calendar_service: GoogleCalendarService, mock_settings, google_api
     ):
         """Test token refresh failure."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_response = MagicMock()
-            mock_response.status_code = 401
-            mock_response.text = "Token revoked"
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+        google_api.respond("POST", "/token", status=401, json={"error": "invalid_grant"})
 
-            with pytest.raises(ValueError, match="Failed to refresh token"):
-                await calendar_service.refresh_access_token("invalid-refresh-token")
+        with pytest.raises(ValueError, match="Failed to refresh token"):
+            await calendar_service.refresh_access_token("invalid-refresh-token")
 
     @pytest.mark.asyncio
     async def test_refresh_token_no_credentials_raises(
@@ -290,6 +328,74 @@ class TestRefreshAccessToken:
                 await calendar_service.refresh_access_token("refresh-token")
 
 
+# =============================================================================
+# Test API Requests
+# =============================================================================
+
+
+class TestApiRequest:
+    """Tests for the Calendar REST request helper."""
+
+    @pytest.mark.asyncio
+    async def test_sends_bearer_token(self, calendar_service: GoogleCalendarService, google_api):
+        """Requests carry the access token and decode the JSON body."""
+        google_api.respond("GET", "/calendar/v3/users/me/calendarList", json={"items": []})
+
+        result = await calendar_service.api_request("token-1", None, "GET", "/users/me/calendarList")
+
+        assert result == {"items": []}
+        assert google_api.requests[0].headers["Authorization"] == "Bearer token-1"
+
+    @pytest.mark.asyncio
+    async def test_expired_token_is_refreshed_once(
+        self, calendar_service: GoogleCalendarService, mock_settings, google_api
+    ):
+        """A 401 refreshes the access token and repeats the request."""
+        path = "/calendar/v3/users/me/calendarList"
+        google_api.respond("GET", path, status=401, json=google_api.fail(401, "Invalid Credentials"))
+        google_api.respond("GET", path, json={"items": [{"id": "primary"}]})
+        google_api.respond("POST", "/token", json={"access_token": "fresh-token"})
+
+        result = await calendar_service.api_request("stale-token", "refresh", "GET", "/users/me/calendarList")
+
+        assert result == {"items": [{"id": "primary"}]}
+        assert [r.url.path for r in google_api.requests] == [path, "/token", path]
+        assert google_api.requests[-1].headers["Authorization"] == "Bearer fresh-token"
+
+    @pytest.mark.asyncio
+    async def test_unauthorized_without_refresh_token_raises(
+        self, calendar_service: GoogleCalendarService, google_api
+    ):
+        """Without a refresh token a 401 is returned as an API error."""
+        google_api.respond(
+            "GET",
+            "/calendar/v3/users/me/calendarList",
+            status=401,
+            json=google_api.fail(401, "Invalid Credentials"),
+        )
+
+        with pytest.raises(GoogleCalendarAPIError) as exc_info:
+            await calendar_service.api_request("stale-token", None, "GET", "/users/me/calendarList")
+
+        assert exc_info.value.status_code == 401
+        assert exc_info.value.message == "Invalid Credentials"
+        assert len(google_api.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_body_returns_empty_dict(
+        self, calendar_service: GoogleCalendarService, google_api
+    ):
+        """204 responses (e.g. deletes) decode to an empty dict."""
+        google_api.respond("DELETE", f"{EVENTS_PATH}/event-1", status=204)
+
+        assert await calendar_service.api_request("token", None, "DELETE", "/calendars/primary/events/event-1") == {}
+
+    def test_calendar_path_quotes_calendar_id(self):
+        """Calendar ids (often email addresses) are escaped as one path segment."""
+        assert _calendar_path("work@example.com") == "/calendars/work%40example.com"
+        assert _calendar_path("a/b") == "/calendars/a%2Fb"
+
+
 # =============================================================================
 # Test Calendar Event Creation
 # =============================================================================
@@ -300,30 +406,19 @@ class TestCreateBookingEvent:
 
     @pytest.mark.asyncio
     async def test_create_booking_event_success(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
+        self, calendar_service: GoogleCalendarService, mock_settings, google_api
     ):
         """Test successful event creation."""
-        mock_build, mock_service = mock_calendar_build
-
-        # Mock the events().insert().execute() chain
-        mock_execute = MagicMock()
-        mock_execute.return_value = {
-            "id": "event-123",
-            "htmlLink": "https://calendar.google.com/event/123",
-            "iCalUID": "ical-uid-123@google.com",
-        }
-        mock_insert = MagicMock()
-        mock_insert.execute = mock_execute
-        mock_events = MagicMock()
-        mock_events.insert.return_value = mock_insert
-        mock_service.events.return_value = mock_events
-
-        start_time = datetime.now(UTC) + timedelta(days=1)
-        end_time = start_time + timedelta(hours=1)
+        google_api.respond(
+            "POST",
+            EVENTS_PATH,
+            json={
+                "id": "event-123",
+                "htmlLink": "https://calendar.google.com/event/123",
+                "iCalUID": "ical-uid-123@google.com",
+            },
+        )
+        start_time, end_time = _times()
 
         result = await calendar_service.create_booking_event(
             access_token="test-access-token",
@@ -346,27 +441,22 @@ class TestCreateBookingEvent:
         assert result["html_link"] == "https://calendar.google.com/event/123"
         assert result["ical_uid"] == "ical-uid-123@google.com"
 
+        request = google_api.requests[0]
+        assert request.url.params["sendUpdates"] == "all"
+        event = google_api.body()
+        assert event["summary"] == "Math Tutoring Session"
+        assert event["start"] == {"dateTime": start_time.isoformat(), "timeZone": "America/New_York"}
+        assert event["location"] == "https://zoom.us/j/123456"
+        assert [a["email"] for a in event["attendees"]] == ["tutor@example.com", "student@example.com"]
+        assert "Booking ID: #123" in event["description"]
+
     @pytest.mark.asyncio
     async def test_create_booking_event_without_meeting_url(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
+        self, calendar_service: GoogleCalendarService, mock_settings, google_api
     ):
         """Test event creation without meeting URL."""
-        mock_build, mock_service = mock_calendar_build
-
-        mock_execute = MagicMock()
-        mock_execute.return_value = {"id": "event-456", "htmlLink": None, "iCalUID": None}
-        mock_insert = MagicMock()
-        mock_insert.execute = mock_execute
-        mock_events = MagicMock()
-        mock_events.insert.return_value = mock_insert
-        mock_service.events.return_value = mock_events
-
-        start_time = datetime.now(UTC) + timedelta(days=1)
-        end_time = start_time + timedelta(hours=1)
+        google_api.respond("POST", EVENTS_PATH, json={"id": "event-456", "htmlLink": None, "iCalUID": None})
+        start_time, end_time = _times()
 
         result = await calendar_service.create_booking_event(
             access_token="test-token",
@@ -385,35 +475,44 @@ class TestCreateBookingEvent:
 
         assert result is not None
         assert result["event_id"] == "event-456"
+        assert "location" not in google_api.body()
 
     @pytest.mark.asyncio
     async def test_create_booking_event_http_error(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
+        self, calendar_service: GoogleCalendarService, mock_settings, google_api
     ):
         """Test event creation handles HTTP error gracefully."""
-        mock_build, mock_service = mock_calendar_build
+        google_api.respond("POST", EVENTS_PATH, status=403, json=google_api.fail(403, "Calendar access denied"))
+        start_time, end_time = _times()
 
-        # Mock HttpError
-        mock_resp = MagicMock()
-        mock_resp.status = 403
-        mock_resp.reason = "Forbidden"
-        http_error = HttpError(mock_resp, b"Calendar access denied")
+        result = await calendar_service.create_booking_event(
+            access_token="test-token",
+            refresh_token=None,
+            booking_id=789,
+            title="Test",
+            description="Test",
+            start_time=start_time,
+            end_time=end_time,
+            tutor_email="tutor@example.com",
+            student_email="student@example.com",
+            tutor_name="Tutor",
+            student_name="Student",
+        )
 
-        mock_events = MagicMock()
-        mock_events.insert.return_value.execute.side_effect = http_error
-        mock_service.events.return_value = mock_events
+        assert result is None
 
-        start_time = datetime.now(UTC) + timedelta(days=1)
-        end_time = start_time + timedelta(hours=1)
+    @pytest.mark.asyncio
+    async def test_create_booking_event_server_error_not_retried(
+        self, calendar_service: GoogleCalendarService, mock_settings, google_api
+    ):
+        """A 5xx on insert may have created the event, so it is not repeated."""
+        google_api.respond("POST", EVENTS_PATH, status=503, json=google_api.fail(503, "Backend Error"))
+        start_time, end_time = _times()
 
         result = await calendar_service.create_booking_event(
             access_token="test-token",
             refresh_token=None,
-            booking_id=789,
+            booking_id=790,
             title="Test",
             description="Test",
             start_time=start_time,
@@ -425,24 +524,15 @@ class TestCreateBookingEvent:
         )
 
         assert result is None
+        assert len(google_api.requests) == 1
 
     @pytest.mark.asyncio
     async def test_create_booking_event_generic_exception(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
+        self, calendar_service: GoogleCalendarService, mock_settings, google_api
     ):
         """Test event creation handles generic exception gracefully."""
-        mock_build, mock_service = mock_calendar_build
-
-        mock_events = MagicMock()
-        mock_events.insert.return_value.execute.side_effect = Exception("Network error")
-        mock_service.events.return_value = mock_events
-
-        start_time = datetime.now(UTC) + timedelta(days=1)
-        end_time = start_time + timedelta(hours=1)
+        google_api.respond("POST", EVENTS_PATH, error=httpx.ReadError("Network error"))
+        start_time, end_time = _times()
 
         result = await calendar_service.create_booking_event(
             access_token="test-token",
@@ -470,101 +560,77 @@ class TestUpdateBookingEvent:
     """Tests for calendar event update."""
 
     @pytest.mark.asyncio
-    async def test_update_event_success(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
-    ):
+    async def test_update_event_success(self, calendar_service: GoogleCalendarService, google_api):
         """Test successful event update."""
-        mock_build, mock_service = mock_calendar_build
-
-        # Mock get and update chain
-        existing_event = {
+        existing = {
             "id": "event-123",
-            "summary": "Original Title",
-            "start": {"dateTime": "2024-01-15T10:00:00Z"},
-            "end": {"dateTime": "2024-01-15T11:00:00Z"},
+            "summary": "Old Title",
+            "start": {"dateTime": "2024-01-01T10:00:00Z"},
+            "end": {"dateTime": "2024-01-01T11:00:00Z"},
         }
-
-        mock_events = MagicMock()
-        mock_events.get.return_value.execute.return_value = existing_event
-        mock_events.update.return_value.execute.return_value = None
-        mock_service.events.return_value = mock_events
-
+        google_api.respond("GET", f"{EVENTS_PATH}/event-123", json=existing)
+        google_api.respond("PUT", f"{EVENTS_PATH}/event-123", json={**existing, "summary": "New Title"})
         new_start = datetime.now(UTC) + timedelta(days=2)
-        new_end = new_start + timedelta(hours=2)
+        new_end = new_start + timedelta(hours=1)
 
         result = await calendar_service.update_booking_event(
             access_token="test-token",
-            refresh_token="test-refresh",
+            refresh_token=None,
             event_id="event-123",
             start_time=new_start,
             end_time=new_end,
-            title="Updated Title",
+            title="New Title",
             description="Updated description",
-            meeting_url="https://zoom.us/new-meeting",
+            meeting_url="https://zoom.us/j/new",
         )
 
         assert result is True
-
-    @pytest.mark.asyncio
-    async def test_update_event_partial_update(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
-    ):
-        """Test updating only some fields."""
-        mock_build, mock_service = mock_calendar_build
-
-        existing_event = {
+        assert [r.method for r in google_api.requests] == ["GET", "PUT"]
+        assert google_api.requests[1].url.params["sendUpdates"] == "all"
+        updated = google_api.body()
+        assert updated["summary"] == "New Title"
+        assert updated["description"] == "Updated description"
+        assert updated["location"] == "https://zoom.us/j/new"
+        assert updated["start"]["dateTime"] == new_start.isoformat()
+
+    @pytest.mark.asyncio
+    async def test_update_event_partial_update(self, calendar_service: GoogleCalendarService, google_api):
+        """Test partial event update (only title)."""
+        existing = {
             "id": "event-123",
-            "summary": "Original Title",
-            "description": "Original description",
-            "start": {"dateTime": "2024-01-15T10:00:00Z"},
-            "end": {"dateTime": "2024-01-15T11:00:00Z"},
+            "summary": "Old Title",
+            "start": {"dateTime": "2024-01-01T10:00:00Z"},
+            "end": {"dateTime": "2024-01-01T11:00:00Z"},
         }
-
-        mock_events = MagicMock()
-        mock_events.get.return_value.execute.return_value = existing_event
-        mock_events.update.return_value.execute.return_value = None
-        mock_service.events.return_value = mock_events
+        google_api.respond("GET", f"{EVENTS_PATH}/event-123", json=existing)
+        google_api.respond("PUT", f"{EVENTS_PATH}/event-123", json=existing)
 
         result = await calendar_service.update_booking_event(
             access_token="test-token",
             refresh_token=None,
             event_id="event-123",
-            title="Only Title Updated",
+            title="Only Title Changed",
         )
 
         assert result is True
+        updated = google_api.body()
+        assert updated["summary"] == "Only Title Changed"
+        assert updated["start"] == existing["start"]
 
     @pytest.mark.asyncio
-    async def test_update_event_failure(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
-    ):
-        """Test event update handles failure gracefully."""
-        mock_build, mock_service = mock_calendar_build
-
-        mock_events = MagicMock()
-        mock_events.get.return_value.execute.side_effect = Exception("Event not found")
-        mock_service.events.return_value = mock_events
+    async def test_update_event_failure(self, calendar_service: GoogleCalendarService, google_api):
+        """Test event update failure."""
+        google_api.respond("GET", f"{EVENTS_PATH}/nonexistent", status=404, json=google_api.fail(404, "Not Found"))
 
         result = await calendar_service.update_booking_event(
             access_token="test-token",
             refresh_token=None,
-            event_id="nonexistent-event",
+            event_id="nonexistent",
             title="New Title",
         )
 
         assert result is False
+        assert [r.method for r in google_api.requests] == ["GET"]
 
 
 # =============================================================================
@@ -576,128 +642,73 @@ class TestDeleteBookingEvent:
     """Tests for calendar event deletion."""
 
     @pytest.mark.asyncio
-    async def test_delete_event_success(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
-    ):
+    async def test_delete_event_success(self, calendar_service: GoogleCalendarService, google_api):
         """Test successful event deletion."""
-        mock_build, mock_service = mock_calendar_build
-
-        mock_events = MagicMock()
-        mock_events.delete.return_value.execute.return_value = None
-        mock_service.events.return_value = mock_events
+        google_api.respond("DELETE", f"{EVENTS_PATH}/event-123", status=204)
 
         result = await calendar_service.delete_booking_event(
             access_token="test-token",
-            refresh_token="test-refresh",
-            event_id="event-to-delete",
-            send_updates=True,
+            refresh_token=None,
+            event_id="event-123",
         )
 
         assert result is True
-        mock_events.delete.assert_called_once()
+        assert google_api.requests[0].url.params["sendUpdates"] == "all"
 
     @pytest.mark.asyncio
-    async def test_delete_event_without_updates(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
-    ):
+    async def test_delete_event_without_updates(self, calendar_service: GoogleCalendarService, google_api):
         """Test event deletion without sending updates."""
-        mock_build, mock_service = mock_calendar_build
-
-        mock_events = MagicMock()
-        mock_events.delete.return_value.execute.return_value = None
-        mock_service.events.return_value = mock_events
+        google_api.respond("DELETE", f"{EVENTS_PATH}/event-123", status=204)
 
         result = await calendar_service.delete_booking_event(
             access_token="test-token",
             refresh_token=None,
-            event_id="event-id",
+            event_id="event-123",
             send_updates=False,
         )
 
         assert result is True
+        assert google_api.requests[0].url.params["sendUpdates"] == "none"
 
     @pytest.mark.asyncio
     async def test_delete_event_not_found_returns_true(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
+        self, calendar_service: GoogleCalendarService, google_api
     ):
-        """Test deleting already-deleted event returns True (idempotent)."""
-        mock_build, mock_service = mock_calendar_build
-
-        # Mock 404 HttpError
-        mock_resp = MagicMock()
-        mock_resp.status = 404
-        http_error = HttpError(mock_resp, b"Not Found")
-
-        mock_events = MagicMock()
-        mock_events.delete.return_value.execute.side_effect = http_error
-        mock_service.events.return_value = mock_events
+        """Test deleting non-existent event returns True (already deleted)."""
+        google_api.respond("DELETE", f"{EVENTS_PATH}/deleted-event", status=410, json=google_api.fail(410, "Deleted"))
 
         result = await calendar_service.delete_booking_event(
             access_token="test-token",
             refresh_token=None,
-            event_id="already-deleted",
+            event_id="deleted-event",
         )
 
         assert result is True
 
     @pytest.mark.asyncio
     async def test_delete_event_http_error_returns_false(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
+        self, calendar_service: GoogleCalendarService, google_api
     ):
-        """Test delete event handles non-404 HTTP error."""
-        mock_build, mock_service = mock_calendar_build
-
-        mock_resp = MagicMock()
-        mock_resp.status = 403
-        http_error = HttpError(mock_resp, b"Forbidden")
-
-        mock_events = MagicMock()
-        mock_events.delete.return_value.execute.side_effect = http_error
-        mock_service.events.return_value = mock_events
+        """Test delete with non-404 HTTP error returns False."""
+        google_api.respond("DELETE", f"{EVENTS_PATH}/event-123", status=403, json=google_api.fail(403, "Forbidden"))
 
         result = await calendar_service.delete_booking_event(
             access_token="test-token",
             refresh_token=None,
-            event_id="forbidden-event",
+            event_id="event-123",
         )
 
         assert result is False
 
     @pytest.mark.asyncio
-    async def test_delete_event_generic_exception(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
-    ):
-        """Test delete event handles generic exception."""
-        mock_build, mock_service = mock_calendar_build
-
-        mock_events = MagicMock()
-        mock_events.delete.return_value.execute.side_effect = Exception("Network error")
-        mock_service.events.return_value = mock_events
+    async def test_delete_event_generic_exception(self, calendar_service: GoogleCalendarService, google_api):
+        """Test delete handles generic exception."""
+        google_api.respond("DELETE", f"{EVENTS_PATH}/event-123", error=httpx.ConnectError("Network error"))
 
         result = await calendar_service.delete_booking_event(
             access_token="test-token",
             refresh_token=None,
-            event_id="event-id",
+            event_id="event-123",
         )
 
         assert result is False
@@ -709,422 +720,264 @@ class TestDeleteBookingEvent:
 
 
 class TestGetUserCalendars:
-    """Tests for getting user's calendar list."""
+    """Tests for listing user calendars."""
 
     @pytest.mark.asyncio
-    async def test_get_calendars_success(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
-    ):
-        """Test successful calendar list retrieval."""
-        mock_build, mock_service = mock_calendar_build
-
-        calendar_list = {
-            "items": [
-                {"id": "primary", "summary": "Primary Calendar"},
-                {"id": "work@example.com", "summary": "Work Calendar"},
-            ]
-        }
+    async def test_get_calendars_success(self, calendar_service: GoogleCalendarService, google_api):
+        """Test successful calendar listing."""
+        calendars = [
+            {"id": "primary", "summary": "Main Calendar"},
+            {"id": "work@example.com", "summary": "Work Calendar"},
+        ]
+        google_api.respond("GET", "/calendar/v3/users/me/calendarList", json={"items": calendars})
 
-        mock_calendar_list = MagicMock()
-        mock_calendar_list.list.return_value.execute.return_value = calendar_list
-        mock_service.calendarList.return_value = mock_calendar_list
-
-        result = await calendar_service.get_user_calendars(
-            access_token="test-token", refresh_token="test-refresh"
-        )
+        result = await calendar_service.get_user_calendars("test-token")
 
         assert len(result) == 2
         assert result[0]["id"] == "primary"
         assert result[1]["summary"] == "Work Calendar"
 
     @pytest.mark.asyncio
-    async def test_get_calendars_empty(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
-    ):
-        """Test getting empty calendar list."""
-        mock_build, mock_service = mock_calendar_build
+    async def test_get_calendars_empty(self, calendar_service: GoogleCalendarService, google_api):
+        """Test calendar listing with no calendars."""
+        google_api.respond("GET", "/calendar/v3/users/me/calendarList", json={})
 
-        mock_calendar_list = MagicMock()
-        mock_calendar_list.list.return_value.execute.return_value = {"items": []}
-        mock_service.calendarList.return_value = mock_calendar_list
-
-        result = await calendar_service.get_user_calendars(access_token="test-token")
+        result = await calendar_service.get_user_calendars("test-token")
 
         assert result == []
 
     @pytest.mark.asyncio
-    async def test_get_calendars_error(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
-    ):
-        """Test getting calendars handles error gracefully."""
-        mock_build, mock_service = mock_calendar_build
-
-        mock_calendar_list = MagicMock()
-        mock_calendar_list.list.return_value.execute.side_effect = Exception("API Error")
-        mock_service.calendarList.return_value = mock_calendar_list
+    async def test_get_calendars_error(self, calendar_service: GoogleCalendarService, google_api):
+        """Test calendar listing error returns empty list."""
+        google_api.respond(
+            "GET", "/calendar/v3/users/me/calendarList", error=httpx.ConnectError("API error")
+        )
 
-        result = await calendar_service.get_user_calendars(access_token="test-token")
+        result = await calendar_service.get_user_calendars("test-token")
 
         assert result == []
 
 
 # =============================================================================
-# Test Check Busy Times (Freebusy API)
+# Test Check Busy Times (FreeBusy API)
 # =============================================================================
 
 
 class TestCheckBusyTimes:
-    """Tests for checking calendar busy times."""
+    """Tests for freebusy API queries."""
 
     @pytest.mark.asyncio
-    async def test_check_busy_times_success(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
-    ):
+    async def test_check_busy_times_success(self, calendar_service: GoogleCalendarService, google_api):
         """Test successful busy time check."""
-        mock_build, mock_service = mock_calendar_build
-
-        freebusy_response = {
-            "calendars": {
-                "primary": {
-                    "busy": [
-                        {
-                            "start": "2024-01-15T09:00:00Z",
-                            "end": "2024-01-15T10:00:00Z",
-                        },
-                        {
-                            "start": "2024-01-15T14:00:00Z",
-                            "end": "2024-01-15T15:00:00Z",
-                        },
-                    ]
-                }
-            }
-        }
-
-        mock_freebusy = MagicMock()
-        mock_freebusy.query.return_value.execute.return_value = freebusy_response
-        mock_service.freebusy.return_value = mock_freebusy
-
-        start = datetime.now(UTC)
-        end = start + timedelta(days=1)
+        busy = [
+            {"start": "2024-01-15T10:00:00Z", "end": "2024-01-15T11:00:00Z"},
+            {"start": "2024-01-15T14:00:00Z", "end": "2024-01-15T15:30:00Z"},
+        ]
+        google_api.respond("POST", "/calendar/v3/freeBusy", json={"calendars": {"primary": {"busy": busy}}})
+        start_time = datetime(2024, 1, 15, 9, 0, tzinfo=UTC)
+        end_time = datetime(2024, 1, 15, 17, 0, tzinfo=UTC)
 
         result = await calendar_service.check_busy_times(
             access_token="test-token",
-            refresh_token="test-refresh",
-            start_time=start,
-            end_time=end,
+            refresh_token=None,
+            start_time=start_time,
+            end_time=end_time,
         )
 
-        assert len(result) == 2
-        assert result[0]["start"] == "2024-01-15T09:00:00Z"
+        assert result == busy
+        assert google_api.body() == {
+            "timeMin": start_time.isoformat(),
+            "timeMax": end_time.isoformat(),
+            "items": [{"id": "primary"}],
+        }
 
     @pytest.mark.asyncio
-    async def test_check_busy_times_no_conflicts(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
-    ):
+    async def test_check_busy_times_no_conflicts(self, calendar_service: GoogleCalendarService, google_api):
         """Test busy time check with no conflicts."""
-        mock_build, mock_service = mock_calendar_build
-
-        freebusy_response = {"calendars": {"primary": {"busy": []}}}
-
-        mock_freebusy = MagicMock()
-        mock_freebusy.query.return_value.execute.return_value = freebusy_response
-        mock_service.freebusy.return_value = mock_freebusy
-
-        start = datetime.now(UTC)
-        end = start + timedelta(hours=2)
+        google_api.respond("POST", "/calendar/v3/freeBusy", json={"calendars": {"primary": {"busy": []}}})
+        start_time, end_time = _times()
 
         result = await calendar_service.check_busy_times(
             access_token="test-token",
             refresh_token=None,
-            start_time=start,
-            end_time=end,
+            start_time=start_time,
+            end_time=end_time,
         )
 
         assert result == []
 
     @pytest.mark.asyncio
-    async def test_check_busy_times_custom_calendar(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
-    ):
-        """Test busy time check for specific calendar."""
-        mock_build, mock_service = mock_calendar_build
-
-        custom_calendar_id = "work@example.com"
-        freebusy_response = {
-            "calendars": {
-                custom_calendar_id: {
-                    "busy": [{"start": "2024-01-15T11:00:00Z", "end": "2024-01-15T12:00:00Z"}]
-                }
-            }
-        }
-
-        mock_freebusy = MagicMock()
-        mock_freebusy.query.return_value.execute.return_value = freebusy_response
-        mock_service.freebusy.return_value = mock_freebusy
-
-        start = datetime.now(UTC)
-        end = start + timedelta(days=1)
+    async def test_check_busy_times_custom_calendar(self, calendar_service: GoogleCalendarService, google_api):
+        """Test busy time check with custom calendar ID."""
+        busy = [{"start": "2024-01-15T10:00:00Z", "end": "2024-01-15T11:00:00Z"}]
+        google_api.respond(
+            "POST", "/calendar/v3/freeBusy", json={"calendars": {"work@example.com": {"busy": busy}}}
+        )
+        start_time, end_time = _times()
 
         result = await calendar_service.check_busy_times(
             access_token="test-token",
             refresh_token=None,
-            start_time=start,
-            end_time=end,
-            calendar_id=custom_calendar_id,
+            start_time=start_time,
+            end_time=end_time,
+            calendar_id="work@example.com",
         )
 
-        assert len(result) == 1
+        assert result == busy
+        assert google_api.body()["items"] == [{"id": "work@example.com"}]
 
     @pytest.mark.asyncio
-    async def test_check_busy_times_http_error(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
+    async def test_check_busy_times_retries_server_errors(
+        self, calendar_service: GoogleCalendarService, google_api
     ):
-        """Test busy time check handles HTTP error."""
-        mock_build, mock_service = mock_calendar_build
+        """Freebusy is a read, so a 503 is retried although it is a POST."""
+        google_api.respond("POST", "/calendar/v3/freeBusy", status=503, json=google_api.fail(503, "Backend Error"))
+        google_api.respond("POST", "/calendar/v3/freeBusy", json={"calendars": {"primary": {"busy": []}}})
+        start_time, end_time = _times()
 
-        mock_resp = MagicMock()
-        mock_resp.status = 403
-        http_error = HttpError(mock_resp, b"Forbidden")
+        result = await calendar_service.check_busy_times(
+            access_token="test-token",
+            refresh_token=None,
+            start_time=start_time,
+            end_time=end_time,
+        )
 
-        mock_freebusy = MagicMock()
-        mock_freebusy.query.return_value.execute.side_effect = http_error
-        mock_service.freebusy.return_value = mock_freebusy
+        assert result == []
+        assert len(google_api.requests) == 2
 
-        start = datetime.now(UTC)
-        end = start + timedelta(hours=2)
+    @pytest.mark.asyncio
+    async def test_check_busy_times_http_error(self, calendar_service: GoogleCalendarService, google_api):
+        """Test busy time check handles HTTP error."""
+        google_api.respond("POST", "/calendar/v3/freeBusy", status=403, json=google_api.fail(403, "Forbidden"))
+        start_time, end_time = _times()
 
         result = await calendar_service.check_busy_times(
             access_token="test-token",
             refresh_token=None,
-            start_time=start,
-            end_time=end,
+            start_time=start_time,
+            end_time=end_time,
         )
 
         assert result == []
 
     @pytest.mark.asyncio
-    async def test_check_busy_times_generic_error(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
-    ):
+    async def test_check_busy_times_generic_error(self, calendar_service: GoogleCalendarService, google_api):
         """Test busy time check handles generic error."""
-        mock_build, mock_service = mock_calendar_build
-
-        mock_freebusy = MagicMock()
-        mock_freebusy.query.return_value.execute.side_effect = Exception("Network error")
-        mock_service.freebusy.return_value = mock_freebusy
-
-        start = datetime.now(UTC)
-        end = start + timedelta(hours=2)
+        google_api.respond("POST", "/calendar/v3/freeBusy", error=httpx.ConnectError("Network error"))
+        start_time, end_time = _times()
 
         result = await calendar_service.check_busy_times(
             access_token="test-token",
             refresh_token=None,
-            start_time=start,
-            end_time=end,
+            start_time=start_time,
+            end_time=end_time,
         )
 
         assert result == []
 
 
 # =============================================================================
-# Test Get Events in Range
+# Test Get Events In Range
 # =============================================================================
 
 
 class TestGetEventsInRange:
-    """Tests for getting calendar events in a time range."""
-
-    @pytest.mark.asyncio
-    async def test_get_events_success(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
-    ):
-        """Test successful event retrieval."""
-        mock_build, mock_service = mock_calendar_build
-
-        events_response = {
-            "items": [
-                {
-                    "id": "event-1",
-                    "summary": "Meeting 1",
-                    "start": {"dateTime": "2024-01-15T09:00:00Z"},
-                    "end": {"dateTime": "2024-01-15T10:00:00Z"},
-                },
-                {
-                    "id": "event-2",
-                    "summary": "Meeting 2",
-                    "start": {"dateTime": "2024-01-15T14:00:00Z"},
-                    "end": {"dateTime": "2024-01-15T15:00:00Z"},
-                },
-            ]
-        }
-
-        mock_events = MagicMock()
-        mock_events.list.return_value.execute.return_value = events_response
-        mock_service.events.return_value = mock_events
-
-        start = datetime.now(UTC)
-        end = start + timedelta(days=1)
+    """Tests for fetching events in time range."""
+
+    @pytest.mark.asyncio
+    async def test_get_events_success(self, calendar_service: GoogleCalendarService, google_api):
+        """Test successful event fetching."""
+        events = [
+            {
+                "id": "event-1",
+                "summary": "Meeting 1",
+                "start": {"dateTime": "2024-01-15T10:00:00Z"},
+                "end": {"dateTime": "2024-01-15T11:00:00Z"},
+            },
+            {
+                "id": "event-2",
+                "summary": "Meeting 2",
+                "start": {"dateTime": "2024-01-15T14:00:00Z"},
+                "end": {"dateTime": "2024-01-15T15:00:00Z"},
+            },
+        ]
+        google_api.respond("GET", EVENTS_PATH, json={"items": events})
+        start_time = datetime(2024, 1, 15, 0, 0, tzinfo=UTC)
+        end_time = datetime(2024, 1, 16, 0, 0, tzinfo=UTC)
 
         result = await calendar_service.get_events_in_range(
             access_token="test-token",
-            refresh_token="test-refresh",
-            start_time=start,
-            end_time=end,
+            refresh_token=None,
+            start_time=start_time,
+            end_time=end_time,
         )
 
         assert len(result) == 2
-        assert result[0]["summary"] == "Meeting 1"
+        assert result[0]["id"] == "event-1"
+        params = google_api.requests[0].url.params
+        assert params["timeMin"] == start_time.isoformat()
+        assert params["timeMax"] == end_time.isoformat()
+        assert params["singleEvents"] == "true"
+        assert params["orderBy"] == "startTime"
+        assert params["maxResults"] == "50"
 
     @pytest.mark.asyncio
-    async def test_get_events_empty(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
-    ):
-        """Test getting events when none exist."""
-        mock_build, mock_service = mock_calendar_build
-
-        mock_events = MagicMock()
-        mock_events.list.return_value.execute.return_value = {"items": []}
-        mock_service.events.return_value = mock_events
-
-        start = datetime.now(UTC)
-        end = start + timedelta(hours=2)
+    async def test_get_events_empty(self, calendar_service: GoogleCalendarService, google_api):
+        """Test event fetching with no events."""
+        google_api.respond("GET", EVENTS_PATH, json={"items": []})
+        start_time, end_time = _times()
 
         result = await calendar_service.get_events_in_range(
             access_token="test-token",
             refresh_token=None,
-            start_time=start,
-            end_time=end,
+            start_time=start_time,
+            end_time=end_time,
         )
 
         assert result == []
 
     @pytest.mark.asyncio
-    async def test_get_events_custom_calendar(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
-    ):
-        """Test getting events from specific calendar."""
-        mock_build, mock_service = mock_calendar_build
-
-        events_response = {
-            "items": [{"id": "work-event-1", "summary": "Work Meeting"}]
-        }
-
-        mock_events = MagicMock()
-        mock_events.list.return_value.execute.return_value = events_response
-        mock_service.events.return_value = mock_events
-
-        start = datetime.now(UTC)
-        end = start + timedelta(days=1)
+    async def test_get_events_custom_calendar(self, calendar_service: GoogleCalendarService, google_api):
+        """Test event fetching with custom calendar ID."""
+        google_api.respond("GET", "/calendar/v3/calendars/work@example.com/events", json={"items": []})
+        start_time, end_time = _times()
 
-        result = await calendar_service.get_events_in_range(
+        await calendar_service.get_events_in_range(
             access_token="test-token",
             refresh_token=None,
-            start_time=start,
-            end_time=end,
+            start_time=start_time,
+            end_time=end_time,
             calendar_id="work@example.com",
         )
 
-        assert len(result) == 1
-        assert result[0]["summary"] == "Work Meeting"
+        assert google_api.requests[0].url.raw_path.startswith(b"/calendar/v3/calendars/work%40example.com/events")
 
     @pytest.mark.asyncio
-    async def test_get_events_http_error(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
-    ):
-        """Test get events handles HTTP error."""
-        mock_build, mock_service = mock_calendar_build
-
-        mock_resp = MagicMock()
-        mock_resp.status = 401
-        http_error = HttpError(mock_resp, b"Unauthorized")
-
-        mock_events = MagicMock()
-        mock_events.list.return_value.execute.side_effect = http_error
-        mock_service.events.return_value = mock_events
-
-        start = datetime.now(UTC)
-        end = start + timedelta(hours=2)
+    async def test_get_events_http_error(self, calendar_service: GoogleCalendarService, google_api):
+        """Test event fetching handles HTTP error."""
+        google_api.respond("GET", EVENTS_PATH, status=404, json=google_api.fail(404, "Calendar not found"))
+        start_time, end_time = _times()
 
         result = await calendar_service.get_events_in_range(
-            access_token="invalid-token",
+            access_token="test-token",
             refresh_token=None,
-            start_time=start,
-            end_time=end,
+            start_time=start_time,
+            end_time=end_time,
         )
 
         assert result == []
 
     @pytest.mark.asyncio
-    async def test_get_events_generic_error(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_credentials,
-        mock_calendar_build,
-    ):
-        """Test get events handles generic error."""
-        mock_build, mock_service = mock_calendar_build
-
-        mock_events = MagicMock()
-        mock_events.list.return_value.execute.side_effect = Exception("Network error")
-        mock_service.events.return_value = mock_events
-
-        start = datetime.now(UTC)
-        end = start + timedelta(hours=2)
+    async def test_get_events_generic_error(self, calendar_service: GoogleCalendarService, google_api):
+        """Test event fetching handles generic error."""
+        google_api.respond("GET", EVENTS_PATH, error=httpx.ConnectError("Network error"))
+        start_time, end_time = _times()
 
         result = await calendar_service.get_events_in_range(
             access_token="test-token",
             refresh_token=None,
-            start_time=start,
-            end_time=end,
+            start_time=start_time,
+            end_time=end_time,
         )
 
         assert result == []
@@ -1136,71 +989,14 @@ class TestGetEventsInRange:
 
 
 class TestSingletonInstance:
-    """Tests for the singleton google_calendar instance."""
+    """Tests for the module-level singleton."""
 
     def test_singleton_instance_exists(self):
         """Test that singleton instance is available."""
         assert google_calendar is not None
         assert isinstance(google_calendar, GoogleCalendarService)
 
-    def test_singleton_credentials_cache_initialized(self):
-        """Test that credentials cache is initialized."""
-        assert hasattr(google_calendar, "_credentials_cache")
-        assert isinstance(google_calendar._credentials_cache, dict)
-
-
-# =============================================================================
-# Test Internal Methods
-# =============================================================================
-
-
-class TestInternalMethods:
-    """Tests for internal helper methods."""
-
-    def test_get_credentials(
-        self, calendar_service: GoogleCalendarService, mock_settings
-    ):
-        """Test credentials object creation."""
-        with patch("core.google_calendar.Credentials") as mock_creds:
-            mock_instance = MagicMock()
-            mock_creds.return_value = mock_instance
-
-            calendar_service._get_credentials(
-                access_token="test-access-token",
-                refresh_token="test-refresh-token",
-            )
-
-            mock_creds.assert_called_once()
-            call_kwargs = mock_creds.call_args[1]
-            assert call_kwargs["token"] == "test-access-token"
-            assert call_kwargs["refresh_token"] == "test-refresh-token"
-
-    def test_get_credentials_without_refresh_token(
-        self, calendar_service: GoogleCalendarService, mock_settings
-    ):
-        """Test credentials object creation without refresh token."""
-        with patch("core.google_calendar.Credentials") as mock_creds:
-            mock_instance = MagicMock()
-            mock_creds.return_value = mock_instance
-
-            calendar_service._get_credentials(
-                access_token="test-access-token",
-                refresh_token=None,
-            )
-
-            call_kwargs = mock_creds.call_args[1]
-            assert call_kwargs["refresh_token"] is None
-
-    def test_get_calendar_service(
-        self,
-        calendar_service: GoogleCalendarService,
-        mock_settings,
-        mock_calendar_build,
-    ):
-        """Test building Google Calendar service."""
-        mock_build, mock_service = mock_calendar_build
-        mock_credentials = MagicMock()
-
-        calendar_service._get_calendar_service(mock_credentials)
-
-        mock_build.assert_called_once_with("calendar", "v3", credentials=mock_credentials)
+    def test_singleton_uses_shared_clients(self):
+        """Calendar calls go through the pooled clients of the shared registry."""
+        assert http_clients.config("google_calendar").base_url == PROVIDERS["google_calendar"].base_url
+        assert http_clients.config("google_oauth").base_url == PROVIDERS["google_oauth"].base_url
@@ -0,0 +1,225 @@
+"""
+Tests for the shared outbound HTTP client registry (core/http_clients.py).
+
+Providers are registered with an ``httpx.MockTransport`` and no backoff
+delay, so retries are observed through the requests the transport receives.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from core.http_clients import HTTPClientRegistry, ProviderConfig, RetryBudget
+
+
+class Upstream:
+    """Mock transport handler returning queued responses in order."""
+
+    def __init__(self, *results: int | Exception, headers: dict | None = None) -> None:
+        self.results = list(results)
+        self.headers = headers or {}
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        result = self.results.pop(0) if len(self.results) > 1 else self.results[0]
+        if isinstance(result, Exception):
+            raise result
+        return httpx.Response(result, headers=self.headers, json={"status": result})
+
+
+def _registry(upstream: Upstream, **overrides) -> HTTPClientRegistry:
+    registry = HTTPClientRegistry(providers={})
+    config = ProviderConfig(name="api", base_url="https://api.example.com", retry_base_delay=0.0, **overrides)
+    registry.register(config, transport=httpx.MockTransport(upstream))
+    return registry
+
+
+class TestClientPooling:
+    @pytest.mark.asyncio
+    async def test_client_is_reused(self):
+        registry = _registry(Upstream(200))
+
+        assert registry.client("api") is registry.client("api")
+
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_closed_client_is_replaced(self):
+        registry = _registry(Upstream(200))
+        client = registry.client("api")
+
+        await registry.aclose()
+
+        assert client.is_closed
+        assert registry.client("api") is not client
+        await registry.aclose()
+
+    def test_each_event_loop_gets_its_own_client(self):
+        registry = _registry(Upstream(200))
+
+        async def get_client():
+            client = registry.client("api")
+            await asyncio.sleep(0)
+            return client
+
+        first = asyncio.run(get_client())
+        second = asyncio.run(get_client())
+
+        assert first is not second
+        assert first.is_closed
+        assert not second.is_closed
+
+    @pytest.mark.asyncio
+    async def test_reregistering_closes_the_client(self):
+        registry = _registry(Upstream(200))
+        client = registry.client("api")
+
+        registry.register(registry.config("api"), transport=httpx.MockTransport(Upstream(200)))
+        await asyncio.sleep(0)
+
+        assert client.is_closed
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_relative_urls_use_base_url(self):
+        upstream = Upstream(200)
+        registry = _registry(upstream)
+
+        response = await registry.request("api", "GET", "/items", params={"page": 2})
+
+        assert response.json() == {"status": 200}
+        assert str(upstream.requests[0].url) == "https://api.example.com/items?page=2"
+        await registry.aclose()
+
+
+class TestRetries:
+    @pytest.mark.asyncio
+    async def test_idempotent_request_retries_server_errors(self):
+        upstream = Upstream(503, 502, 200)
+        registry = _registry(upstream)
+
+        response = await registry.request("api", "GET", "/items")
+
+        assert response.status_code == 200
+        assert len(upstream.requests) == 3
+
+    @pytest.mark.asyncio
+    async def test_post_is_not_retried_on_server_error(self):
+        upstream = Upstream(503, 200)
+        registry = _registry(upstream)
+
+        response = await registry.request("api", "POST", "/items", json={})
+
+        assert response.status_code == 503
+        assert len(upstream.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_post_is_retried_on_rate_limit(self):
+        upstream = Upstream(429, 201)
+        registry = _registry(upstream)
+
+        response = await registry.request("api", "POST", "/items", json={})
+
+        assert response.status_code == 201
+        assert len(upstream.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_post_is_retried_on_connect_error(self):
+        upstream = Upstream(httpx.ConnectError("refused"), 201)
+        registry = _registry(upstream)
+
+        response = await registry.request("api", "POST", "/items", json={})
+
+        assert response.status_code == 201
+
+    @pytest.mark.asyncio
+    async def test_post_read_error_is_raised(self):
+        upstream = Upstream(httpx.ReadError("reset"), 201)
+        registry = _registry(upstream)
+
+        with pytest.raises(httpx.ReadError):
+            await registry.request("api", "POST", "/items", json={})
+        assert len(upstream.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_true_retries_post(self):
+        upstream = Upstream(500, 200)
+        registry = _registry(upstream)
+
+        response = await registry.request("api", "POST", "/search", retry=True, json={})
+
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_retry_false_disables_retries(self):
+        upstream = Upstream(429, 200)
+        registry = _registry(upstream)
+
+        response = await registry.request("api", "GET", "/items", retry=False)
+
+        assert response.status_code == 429
+        assert len(upstream.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        upstream = Upstream(503)
+        registry = _registry(upstream, max_retries=2)
+
+        response = await registry.request("api", "GET", "/items")
+
+        assert response.status_code == 503
+        assert len(upstream.requests) == 3
+
+    @pytest.mark.asyncio
+    async def test_retry_after_header_is_honoured(self):
+        upstream = Upstream(429, 200, headers={"Retry-After": "3"})
+        registry = _registry(upstream)
+
+        with patch("core.http_clients.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            await registry.request("api", "GET", "/items")
+
+        mock_sleep.assert_awaited_once_with(3.0)
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_capped(self):
+        upstream = Upstream(429, 200, headers={"Retry-After": "3600"})
+        registry = _registry(upstream, retry_max_delay=5.0)
+
+        with patch("core.http_clients.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            await registry.request("api", "GET", "/items")
+
+        mock_sleep.assert_awaited_once_with(5.0)
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_stops_retries(self):
+        upstream = Upstream(503)
+        registry = _registry(upstream, max_retries=5, retry_ratio=0.0, retry_min_per_second=0.0)
+        registry._budgets["api"] = RetryBudget(ratio=0.0, min_per_second=0.0, max_balance=2.0)
+
+        response = await registry.request("api", "GET", "/items")
+
+        assert response.status_code == 503
+        assert len(upstream.requests) == 3
+        assert registry.allow_retry("api") is False
+
+
+class TestRetryBudget:
+    def test_requests_earn_retries(self):
+        budget = RetryBudget(ratio=0.5, min_per_second=0.0, max_balance=1.0)
+        assert budget.try_spend() is True
+        assert budget.try_spend() is False
+
+        budget.record_request()
+        budget.record_request()
+
+        assert budget.try_spend() is True
+
+    def test_balance_is_capped(self):
+        budget = RetryBudget(ratio=1.0, min_per_second=0.0, max_balance=2.0)
+        for _ in range(10):
+            budget.record_request()
+
+        assert [budget.try_spend() for _ in range(3)] == [True, True, False]
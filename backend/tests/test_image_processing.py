@@ -0,0 +1,164 @@
+"""Tests for the image rendition pipeline (core/image_processing.py)."""
+
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from PIL.JpegImagePlugin import JpegImageFile
+
+from core.image_processing import (
+    AVATAR_RENDITION_SIZES,
+    RENDITION_SIZES,
+    ImageProcessingError,
+    ImageWorkerPool,
+    normalize_image,
+    render_avatar,
+    render_profile_photo,
+    rendition_key,
+    rendition_keys,
+)
+
+TOKEN = "0123456789abcdef0123456789abcdef"
+
+
+def _image_bytes(size: tuple[int, int], *, image_format: str = "PNG", mode: str = "RGB") -> bytes:
+    buffer = BytesIO()
+    Image.new(mode, size, color=(25, 50, 75) if mode == "RGB" else (25, 50, 75, 128)).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def _size_of(content: bytes) -> tuple[int, int]:
+    with Image.open(BytesIO(content)) as image:
+        return image.size
+
+
+class TestRenderAvatar:
+    def test_renders_square_webp_renditions_largest_first(self):
+        renditions = render_avatar(_image_bytes((900, 600), image_format="JPEG"))
+
+        assert [image.name for image in renditions] == [str(size) for size in AVATAR_RENDITION_SIZES]
+        for image, size in zip(renditions, AVATAR_RENDITION_SIZES, strict=True):
+            assert image.content_type == "image/webp"
+            assert image.filename == f"{size}.webp"
+            assert _size_of(image.content) == (size, size)
+
+    def test_large_jpeg_is_decoded_at_reduced_size(self, monkeypatch):
+        drafts = []
+        original_draft = JpegImageFile.draft
+
+        def spy(self, mode, size):
+            drafts.append(size)
+            return original_draft(self, mode, size)
+
+        monkeypatch.setattr(JpegImageFile, "draft", spy)
+
+        renditions = render_avatar(_image_bytes((2000, 1500), image_format="JPEG"))
+
+        assert drafts == [(427, 320)]
+        assert _size_of(renditions[0].content) == (320, 320)
+
+    @pytest.mark.parametrize(
+        "size,detail",
+        [((100, 400), "at least 150x150"), ((2400, 400), "2000x2000")],
+    )
+    def test_rejects_out_of_range_dimensions(self, size, detail):
+        with pytest.raises(ImageProcessingError, match=detail):
+            render_avatar(_image_bytes(size))
+
+    def test_rejects_other_formats(self):
+        with pytest.raises(ImageProcessingError, match="Unsupported image format"):
+            render_avatar(_image_bytes((300, 300), image_format="GIF"))
+
+    def test_rejects_undecodable_data(self):
+        with pytest.raises(ImageProcessingError, match="Invalid image data"):
+            render_avatar(b"not an image")
+
+
+class TestRenderProfilePhoto:
+    def test_original_keeps_format_and_renditions_fit_each_size(self):
+        original, *renditions = render_profile_photo(_image_bytes((1600, 800), image_format="JPEG"), "image/jpeg")
+
+        assert (original.filename, original.content_type) == ("original.jpg", "image/jpeg")
+        assert _size_of(original.content) == (1600, 800)
+        assert [image.name for image in renditions] == [str(size) for size in RENDITION_SIZES]
+        for image, size in zip(renditions, RENDITION_SIZES, strict=True):
+            assert _size_of(image.content) == (size, size // 2)
+
+    def test_small_photo_is_not_upscaled_past_the_original(self):
+        original, *renditions = render_profile_photo(_image_bytes((400, 400)), "image/png")
+
+        assert _size_of(original.content) == (400, 400)
+        assert _size_of(renditions[0].content) == (400, 400)
+        assert _size_of(renditions[-1].content) == (80, 80)
+
+    def test_transparency_is_kept(self):
+        _, *renditions = render_profile_photo(_image_bytes((400, 400), mode="RGBA"), "image/png")
+
+        with Image.open(BytesIO(renditions[0].content)) as image:
+            assert image.mode == "RGBA"
+
+    def test_normalize_image_returns_only_the_original(self):
+        image = normalize_image(_image_bytes((120, 200)), "image/png")
+
+        assert image.filename == "original.png"
+        assert min(_size_of(image.content)) >= 300
+
+
+class TestRenditionKeys:
+    def test_picks_smallest_rendition_covering_the_size(self):
+        key = f"avatars/7/{TOKEN}/320.webp"
+
+        assert rendition_key(key, 48) == f"avatars/7/{TOKEN}/80.webp"
+        assert rendition_key(key, 100) == f"avatars/7/{TOKEN}/160.webp"
+        # Avatars stop at 320, so larger requests get the largest stored one
+        assert rendition_key(key, 1000) == key
+
+    def test_profile_photo_urls_resolve_to_renditions(self):
+        url = f"https://minio.example.com/tutor-assets/tutor_profiles/7/photo/{TOKEN}/original.jpg"
+
+        assert rendition_key(url, 500) == url.replace("original.jpg", "640.webp")
+
+    @pytest.mark.parametrize(
+        "key",
+        [
+            "avatars/7/avatar.webp",
+            f"avatars/7/{TOKEN}.webp",
+            "https://lh3.googleusercontent.com/a/photo.jpg",
+            f"https://minio.example.com/tutor-assets/tutor_profiles/7/photo/{TOKEN}.png",
+        ],
+    )
+    def test_other_layouts_are_unchanged(self, key):
+        assert rendition_key(key, 80) == key
+        assert rendition_keys(key) == [key]
+
+    def test_rendition_keys_lists_every_stored_object(self):
+        assert rendition_keys(f"avatars/7/{TOKEN}/320.webp") == [
+            f"avatars/7/{TOKEN}/{size}.webp" for size in AVATAR_RENDITION_SIZES
+        ]
+        assert rendition_keys(f"photos/{TOKEN}/original.png") == [
+            f"photos/{TOKEN}/original.png",
+            *(f"photos/{TOKEN}/{size}.webp" for size in RENDITION_SIZES),
+        ]
+
+
+class TestImageWorkerPool:
+    @pytest.mark.asyncio
+    async def test_renders_in_a_worker_process(self):
+        pool = ImageWorkerPool(workers=1)
+        try:
+            renditions = await pool.run(render_avatar, _image_bytes((300, 300)))
+            assert [image.name for image in renditions] == [str(size) for size in AVATAR_RENDITION_SIZES]
+
+            with pytest.raises(ImageProcessingError, match="Invalid image data"):
+                await pool.run(render_avatar, b"not an image")
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_zero_workers_runs_on_the_thread_pool(self):
+        pool = ImageWorkerPool(workers=0)
+
+        image = await pool.run(normalize_image, _image_bytes((400, 400)), "image/png")
+
+        assert image.filename == "original.png"
+        assert pool._executor is None
@@ -55,15 +55,6 @@ class MockStripeError(Exception):
         super().__init__(message)
 
 
-class MockGoogleApiError(Exception):
-    """Mock Google API error for testing."""
-
-    def __init__(self, resp=None, content=b""):
-        self.resp = resp or MagicMock(status=500)
-        self.content = content
-        super().__init__("Google API Error")
-
-
 class MockZoomApiError(Exception):
     """Mock Zoom API error for testing."""
     pass
@@ -369,18 +360,13 @@ class TestCalendarIntegrationFailures:
     @pytest.mark.asyncio
     async def test_google_calendar_rate_limiting(self):
         """Test handling of Google Calendar API rate limiting."""
-        from core.google_calendar import GoogleCalendarService
+        from core.google_calendar import GoogleCalendarAPIError, GoogleCalendarService
 
         service = GoogleCalendarService()
 
-        with patch.object(service, "_get_calendar_service") as mock_service:
+        with patch.object(service, "api_request", new_callable=AsyncMock) as mock_request:
             # Simulate rate limit error
-            mock_events = MagicMock()
-            mock_events.insert.return_value.execute.side_effect = MockGoogleApiError(
-                resp=MagicMock(status=429),
-                content=b"Rate limit exceeded"
-            )
-            mock_service.return_value.events.return_value = mock_events
+            mock_request.side_effect = GoogleCalendarAPIError(429, "Rate limit exceeded")
 
             result = await service.create_booking_event(
                 access_token="test_token",
@@ -0,0 +1,141 @@
+"""
+Tests for indexed message search.
+
+MessageService.search_messages matches ``messages.search_vector`` (kept in
+sync on flush by core/search.py), scoped to the searching user, ranked, with
+highlighted snippets and cursor paging.
+"""
+
+import pytest
+
+from core.config import settings
+from core.pagination import InvalidCursorError
+from modules.messages.service import MessageService
+
+
+@pytest.fixture
+def service(db_session):
+    return MessageService(db_session)
+
+
+def _texts(results):
+    return [hit.message.message for hit in results.hits]
+
+
+def results_for(service, user_id, query):
+    return _texts(service.search_messages(user_id, query))
+
+
+class TestMessageSearch:
+    def test_matches_words_and_highlights(self, service, student_user, tutor_user):
+        service.send_message(student_user.id, tutor_user.id, "Can we review algebra homework tomorrow?")
+        service.send_message(tutor_user.id, student_user.id, "Sure, bring your geometry notes")
+
+        results = service.search_messages(student_user.id, "algebra")
+
+        assert _texts(results) == ["Can we review algebra homework tomorrow?"]
+        assert results.total == 1
+        assert "<mark>algebra</mark>" in results.hits[0].snippet
+
+    def test_stems_and_expands_last_word(self, service, student_user, tutor_user):
+        service.send_message(student_user.id, tutor_user.id, "I struggled with derivatives in calculus")
+
+        assert results_for(service, student_user.id, "derivative") == ["I struggled with derivatives in calculus"]
+        assert results_for(service, student_user.id, "struggle calc") == ["I struggled with derivatives in calculus"]
+
+    @pytest.mark.parametrize("query", ["calculus OR algebra", "algebra or calc", "physics OR calculus home"])
+    def test_or_matches_either_side(self, service, student_user, tutor_user, query):
+        service.send_message(student_user.id, tutor_user.id, "calculus homework")
+        service.send_message(student_user.id, tutor_user.id, "geometry homework")
+
+        assert results_for(service, student_user.id, query) == ["calculus homework"]
+
+    def test_ranks_better_matches_first(self, service, student_user, tutor_user):
+        service.send_message(student_user.id, tutor_user.id, "Physics lab report is due")
+        service.send_message(student_user.id, tutor_user.id, "Physics exam: physics formulas and physics problems")
+
+        assert results_for(service, student_user.id, "physics")[0].startswith("Physics exam")
+
+    def test_only_own_undeleted_messages(self, service, student_user, tutor_user, admin_user):
+        mine = service.send_message(student_user.id, tutor_user.id, "Chemistry question one")
+        service.send_message(student_user.id, tutor_user.id, "Chemistry question two")
+        service.send_message(admin_user.id, tutor_user.id, "Chemistry curriculum update")
+        service.delete_message(mine.id, student_user.id)
+
+        assert results_for(service, student_user.id, "chemistry") == ["Chemistry question two"]
+        assert len(results_for(service, tutor_user.id, "chemistry")) == 2
+
+    def test_edit_refreshes_index(self, service, student_user, tutor_user):
+        message = service.send_message(student_user.id, tutor_user.id, "See you on Monday")
+
+        service.edit_message(message.id, student_user.id, "See you on Friday")
+
+        assert results_for(service, student_user.id, "monday") == []
+        assert results_for(service, student_user.id, "friday") == ["See you on Friday"]
+
+    def test_snippet_is_html_escaped(self, service, student_user, tutor_user):
+        service.send_message(student_user.id, tutor_user.id, "Biology: cells < organs & systems")
+
+        snippet = service.search_messages(student_user.id, "biology").hits[0].snippet
+
+        assert "<mark>Biology</mark>" in snippet
+        assert "&lt; organs &amp; systems" in snippet
+
+    def test_cursor_pages_through_all_matches(self, service, student_user, tutor_user):
+        for i in range(7):
+            service.send_message(student_user.id, tutor_user.id, f"Essay draft {i}")
+
+        first = service.search_messages(student_user.id, "essay", page_size=3)
+        seen = [hit.message.id for hit in first.hits]
+        cursor = first.next_cursor
+        while cursor:
+            page = service.search_messages(student_user.id, "essay", page_size=3, cursor=cursor)
+            assert page.total is None
+            seen.extend(hit.message.id for hit in page.hits)
+            cursor = page.next_cursor
+
+        assert first.total == 7
+        assert len(seen) == len(set(seen)) == 7
+
+    def test_invalid_cursor(self, service, student_user):
+        with pytest.raises(InvalidCursorError):
+            service.search_messages(student_user.id, "essay", cursor="not-a-cursor")
+
+    def test_substring_fallback(self, service, student_user, tutor_user, monkeypatch):
+        service.send_message(student_user.id, tutor_user.id, "Trigonometry 100% done")
+        monkeypatch.setattr(settings, "MESSAGE_FULLTEXT_SEARCH_ENABLED", False)
+
+        results = service.search_messages(student_user.id, "gonometry 100%")
+
+        assert _texts(results) == ["Trigonometry 100% done"]
+        assert results.hits[0].snippet is None
+
+
+class TestMessageSearchApi:
+    def test_returns_snippets_and_cursor(self, client, student_token, student_user, tutor_user, db_session):
+        service = MessageService(db_session)
+        for i in range(3):
+            service.send_message(student_user.id, tutor_user.id, f"Statistics homework {i}")
+        headers = {"Authorization": f"Bearer {student_token}"}
+
+        response = client.get("/api/v1/messages/search?q=statistics&page_size=2", headers=headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert data["total_pages"] == 2
+        assert "<mark>Statistics</mark>" in data["messages"][0]["snippet"]
+
+        response = client.get(
+            f"/api/v1/messages/search?q=statistics&page_size=2&cursor={data['next_cursor']}", headers=headers
+        )
+        data = response.json()
+        assert len(data["messages"]) == 1
+        assert data["total"] is None
+        assert data["next_cursor"] is None
+
+    def test_invalid_cursor_is_400(self, client, student_token):
+        response = client.get(
+            "/api/v1/messages/search?q=statistics&cursor=bogus",
+            headers={"Authorization": f"Bearer {student_token}"},
+        )
+        assert response.status_code == 400
@@ -8,7 +8,7 @@ Tests cover:
 - File size validation
 - Image dimension extraction
 - Secure key generation
-- File upload functionality
+- File upload functionality (streamed, multipart for large files)
 - Presigned URL generation
 - File deletion
 - File existence checking
@@ -16,13 +16,15 @@ Tests cover:
 """
 
 from io import BytesIO
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 from botocore.exceptions import ClientError
 from fastapi import HTTPException, UploadFile
 from PIL import Image
+from starlette.datastructures import Headers
 
+import core.message_storage as message_storage
 from core.message_storage import (
     ALLOWED_DOCUMENT_TYPES,
     ALLOWED_IMAGE_TYPES,
@@ -38,6 +40,7 @@ from core.message_storage import (
     check_file_exists,
     delete_message_attachment,
     generate_presigned_url,
+    init_message_storage,
     store_message_attachment,
 )
 
@@ -59,9 +62,17 @@ def mock_settings():
         mock.MESSAGE_ATTACHMENT_MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
         mock.MESSAGE_ATTACHMENT_MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5 MB
         mock.MESSAGE_ATTACHMENT_URL_TTL_SECONDS = 3600
+        mock.MESSAGE_ATTACHMENT_UPLOAD_PART_SIZE = 5 * 1024 * 1024
+        mock.MESSAGE_ATTACHMENT_UPLOAD_WORKERS = 4
         yield mock
 
 
+@pytest.fixture(autouse=True)
+def bucket_not_bootstrapped(monkeypatch):
+    """Each test starts as if the startup bucket bootstrap has not run."""
+    monkeypatch.setattr(message_storage, "_bucket_ready", False)
+
+
 @pytest.fixture
 def mock_s3_client():
     """Mock S3 client."""
@@ -92,13 +103,13 @@ def create_upload_file(
     filename: str = "test.txt",
     content_type: str = "text/plain",
 ) -> UploadFile:
-    """Helper to create mock UploadFile."""
-    BytesIO(content)
-    upload = MagicMock(spec=UploadFile)
-    upload.filename = filename
-    upload.content_type = content_type
-    upload.read = AsyncMock(return_value=content)
-    return upload
+    """Helper to create an UploadFile backed by in-memory content."""
+    return UploadFile(
+        file=BytesIO(content),
+        size=len(content),
+        filename=filename,
+        headers=Headers({"content-type": content_type}),
+    )
 
 
 # =============================================================================
@@ -621,6 +632,142 @@ class TestStoreMessageAttachment:
         assert result["file_category"] == "document"
 
 
+class TestStreamingUpload:
+    """Tests for chunked reading, content sniffing and multipart upload."""
+
+    @pytest.fixture
+    def small_parts(self, mock_settings):
+        """Read 512-byte chunks and upload 1 KB parts."""
+        mock_settings.MESSAGE_ATTACHMENT_UPLOAD_PART_SIZE = 1024
+        with patch("core.message_storage.READ_CHUNK_SIZE", 512):
+            yield
+
+    @pytest.fixture
+    def multipart_client(self, mock_s3_client):
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+        mock_s3_client.upload_part.side_effect = lambda **kwargs: {"ETag": f"etag-{kwargs['PartNumber']}"}
+        return mock_s3_client
+
+    @pytest.mark.asyncio
+    async def test_large_file_uses_multipart_upload(self, multipart_client, mock_settings, small_parts):
+        content = b"%PDF-1.7 " + b"x" * 2991
+        upload = create_upload_file(content, "notes.pdf", "application/pdf")
+
+        result = await store_message_attachment(1, 1, upload)
+
+        assert result["file_size"] == 3000
+        multipart_client.put_object.assert_not_called()
+        bodies = [call.kwargs["Body"] for call in multipart_client.upload_part.call_args_list]
+        assert [len(body) for body in bodies] == [1024, 1024, 952]
+        assert b"".join(bodies) == content
+        complete = multipart_client.complete_multipart_upload.call_args.kwargs
+        assert complete["UploadId"] == "upload-1"
+        assert complete["MultipartUpload"]["Parts"] == [
+            {"ETag": "etag-1", "PartNumber": 1},
+            {"ETag": "etag-2", "PartNumber": 2},
+            {"ETag": "etag-3", "PartNumber": 3},
+        ]
+        create = multipart_client.create_multipart_upload.call_args.kwargs
+        assert create["ContentType"] == "application/pdf"
+        assert create["Metadata"]["original_filename"] == "notes.pdf"
+
+    @pytest.mark.asyncio
+    async def test_failed_part_aborts_multipart_upload(self, multipart_client, mock_settings, small_parts):
+        multipart_client.upload_part.side_effect = ClientError({"Error": {"Code": "InternalError"}}, "UploadPart")
+        upload = create_upload_file(b"%PDF-" + b"x" * 3000, "notes.pdf", "application/pdf")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await store_message_attachment(1, 1, upload)
+
+        assert exc_info.value.status_code == 500
+        multipart_client.abort_multipart_upload.assert_called_once()
+        assert multipart_client.abort_multipart_upload.call_args.kwargs["UploadId"] == "upload-1"
+
+    @pytest.mark.asyncio
+    async def test_oversized_upload_aborts_while_streaming(self, multipart_client, mock_settings, small_parts):
+        mock_settings.MESSAGE_ATTACHMENT_MAX_FILE_SIZE = 2048
+        upload = create_upload_file(b"%PDF-" + b"x" * 100_000, "big.pdf", "application/pdf")
+        upload.size = None  # Length not known up front
+
+        with pytest.raises(HTTPException) as exc_info:
+            await store_message_attachment(1, 1, upload)
+
+        assert "File too large" in exc_info.value.detail
+        assert upload.file.tell() <= 2048 + 512  # Stopped at the first chunk over the limit
+        multipart_client.abort_multipart_upload.assert_called_once()
+        multipart_client.complete_multipart_upload.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_declared_size_over_limit_is_rejected_before_reading(self, mock_s3_client, mock_settings):
+        mock_settings.MESSAGE_ATTACHMENT_MAX_FILE_SIZE = 2048
+        upload = create_upload_file(b"%PDF-" + b"x" * 100_000, "big.pdf", "application/pdf")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await store_message_attachment(1, 1, upload)
+
+        assert "File too large" in exc_info.value.detail
+        assert upload.file.tell() == 0
+        mock_s3_client.create_multipart_upload.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_content_must_match_declared_type(self, mock_s3_client, mock_settings):
+        upload = create_upload_file(b"%PDF-1.4 not an image", "photo.png", "image/png")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await store_message_attachment(1, 1, upload)
+
+        assert exc_info.value.status_code == 400
+        assert "does not match" in exc_info.value.detail
+        mock_s3_client.put_object.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_binary_content_is_not_plain_text(self, mock_s3_client, mock_settings, small_parts):
+        upload = create_upload_file(b"a" * 600 + b"\x00\x01\x02", "notes.txt", "text/plain")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await store_message_attachment(1, 1, upload)
+
+        assert "does not match" in exc_info.value.detail
+
+    @pytest.mark.asyncio
+    async def test_utf16_text_is_accepted(self, mock_s3_client, mock_settings):
+        upload = create_upload_file("hello".encode("utf-16"), "notes.txt", "text/plain")
+
+        result = await store_message_attachment(1, 1, upload)
+
+        assert result["mime_type"] == "text/plain"
+
+    @pytest.mark.asyncio
+    async def test_bucket_is_checked_once(self, mock_s3_client, mock_settings):
+        mock_s3_client.head_bucket.return_value = {}
+
+        for _ in range(3):
+            await store_message_attachment(1, 1, create_upload_file(b"hello", "notes.txt", "text/plain"))
+
+        mock_s3_client.head_bucket.assert_called_once()
+        assert mock_s3_client.put_object.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_startup_bootstrap_marks_bucket_ready(self, mock_s3_client, mock_settings):
+        mock_s3_client.head_bucket.return_value = {}
+
+        await init_message_storage()
+        await store_message_attachment(1, 1, create_upload_file(b"hello", "notes.txt", "text/plain"))
+
+        mock_s3_client.head_bucket.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_startup_bootstrap_failure_is_retried_on_upload(self, mock_s3_client, mock_settings):
+        error = ClientError({"Error": {"Code": "403"}}, "HeadBucket")
+        mock_s3_client.head_bucket.side_effect = [error, {}]
+
+        await init_message_storage()  # Logged, not raised
+        await store_message_attachment(1, 1, create_upload_file(b"hello", "notes.txt", "text/plain"))
+
+        assert mock_s3_client.head_bucket.call_count == 2
+        mock_s3_client.put_object.assert_called_once()
+
+
 # =============================================================================
 # Test Presigned URL Generation
 # =============================================================================
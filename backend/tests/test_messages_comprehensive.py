@@ -1180,8 +1180,8 @@ class TestWebSocketManager:
         count = await manager.broadcast_to_users({"type": "broadcast"}, [1, 2, 3])
 
         assert count == 2  # Only 2 users online
-        mock_ws1.send_json.assert_called_once()
-        mock_ws2.send_json.assert_called_once()
+        mock_ws1.send_text.assert_called_once_with('{"type":"broadcast"}')
+        mock_ws2.send_text.assert_called_once_with('{"type":"broadcast"}')
 
     @pytest.mark.asyncio
     async def test_get_online_users(self, manager):
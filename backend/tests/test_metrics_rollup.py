@@ -0,0 +1,220 @@
+"""
+Tests for the daily metrics rollup (modules/admin/infrastructure/metrics_rollup.py).
+
+Covers full and incremental refreshes, the summed read helpers and the
+dashboard endpoints that now read from the rollup.
+"""
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi import status
+
+from models import Booking, DailyMetricsRollup, Review, TutorResponseLog
+from modules.admin.infrastructure.metrics_rollup import (
+    RollupTotals,
+    monthly_rollup,
+    refresh_daily_metrics,
+    rollup_totals,
+)
+from modules.admin.owner.router import _calculate_health_metrics, _calculate_revenue_metrics
+
+
+@pytest.fixture
+def make_booking(db_session, tutor_user, student_user, test_subject):
+    """Factory for bookings created now, one hour long."""
+
+    def _make(session_state: str, session_outcome: str | None = None, **fields) -> Booking:
+        start_time = datetime.now(UTC) + timedelta(days=1)
+        booking = Booking(
+            tutor_profile_id=tutor_user.tutor_profile.id,
+            student_id=student_user.id,
+            subject_id=test_subject.id,
+            start_time=start_time,
+            end_time=start_time + timedelta(hours=1),
+            hourly_rate=50.00,
+            total_amount=50.00,
+            currency="USD",
+            session_state=session_state,
+            session_outcome=session_outcome,
+            **fields,
+        )
+        db_session.add(booking)
+        db_session.commit()
+        db_session.refresh(booking)
+        return booking
+
+    return _make
+
+
+@pytest.fixture
+def seeded_activity(db_session, make_booking, tutor_user, student_user):
+    """Two completed sessions, one scheduled, one cancelled and a review."""
+    completed = [
+        make_booking(
+            "ENDED",
+            "COMPLETED",
+            rate_cents=5000,
+            platform_fee_cents=1000,
+            tutor_earnings_cents=4000,
+        )
+        for _ in range(2)
+    ]
+    make_booking("SCHEDULED")
+    make_booking("CANCELLED")
+    db_session.add(
+        Review(
+            booking_id=completed[0].id,
+            tutor_profile_id=tutor_user.tutor_profile.id,
+            student_id=student_user.id,
+            rating=4,
+            is_public=True,
+        )
+    )
+    db_session.add(
+        TutorResponseLog(
+            booking_id=completed[0].id,
+            tutor_profile_id=tutor_user.tutor_profile.id,
+            student_id=student_user.id,
+            booking_created_at=datetime.now(UTC),
+            response_time_minutes=30,
+            response_action="confirmed",
+        )
+    )
+    db_session.commit()
+    return completed
+
+
+class TestRefresh:
+    def test_full_refresh_aggregates_today(self, db_session, seeded_activity):
+        days = refresh_daily_metrics(db_session, full=True)
+
+        assert days >= 1
+        row = db_session.get(DailyMetricsRollup, datetime.now(UTC).date())
+        assert row.bookings_total == 4
+        assert row.bookings_cancelled == 1
+        assert row.sessions_total == 3
+        assert row.session_minutes == 180
+        assert row.outcome_completed == 2
+        assert row.revenue_amount == Decimal("100.00")
+        assert row.gmv_cents == 10000
+        assert row.platform_fee_cents == 2000
+        assert row.public_reviews_total == 1
+        assert row.public_reviews_rating_sum == 4
+        assert row.responses_total == 1
+        # tutor, student (and no admin in this test)
+        assert row.new_tutors == 1
+        assert row.new_students == 1
+
+    def test_incremental_refresh_picks_up_state_changes(self, db_session, make_booking, seeded_activity):
+        refresh_daily_metrics(db_session)
+        booking = make_booking("SCHEDULED")
+        refresh_daily_metrics(db_session)
+        assert rollup_totals(db_session).sessions_total == 4
+
+        booking.session_state = "CANCELLED"
+        booking.updated_at = datetime.now(UTC)
+        db_session.commit()
+        refresh_daily_metrics(db_session)
+
+        totals = rollup_totals(db_session)
+        assert totals.sessions_total == 3
+        assert totals.bookings_cancelled == 2
+
+    def test_soft_deleted_bookings_are_excluded(self, db_session, make_booking):
+        make_booking("SCHEDULED", deleted_at=datetime.now(UTC))
+
+        refresh_daily_metrics(db_session, full=True)
+
+        assert rollup_totals(db_session).bookings_total == 0
+
+    def test_full_refresh_drops_days_without_data(self, db_session):
+        stale_day = datetime.now(UTC).date() - timedelta(days=400)
+        db_session.add(DailyMetricsRollup(day=stale_day, bookings_total=7, refreshed_at=datetime.now(UTC)))
+        db_session.commit()
+
+        refresh_daily_metrics(db_session, full=True)
+
+        assert db_session.get(DailyMetricsRollup, stale_day) is None
+
+
+class TestReads:
+    def test_monthly_rollup_keys_by_month_start(self, db_session, seeded_activity):
+        refresh_daily_metrics(db_session)
+
+        by_month = monthly_rollup(db_session)
+
+        month_start = datetime.now(UTC).date().replace(day=1)
+        assert list(by_month) == [month_start]
+        assert by_month[month_start].outcome_completed == 2
+
+    def test_totals_derived_values(self):
+        totals = RollupTotals(
+            sessions_total=4,
+            session_minutes=240,
+            outcome_completed=3,
+            reviews_total=2,
+            reviews_rating_sum=9,
+            responses_total=0,
+        )
+
+        assert totals.avg_session_minutes == 60
+        assert totals.completion_rate == 75
+        assert totals.avg_rating == 4.5
+        assert totals.avg_response_minutes is None
+
+
+class TestDashboards:
+    def test_admin_dashboard_stats_use_rollup(self, client, admin_token, db_session, seeded_activity):
+        refresh_daily_metrics(db_session)
+
+        response = client.get(
+            "/api/v1/admin/dashboard/stats",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["totalSessions"] == 3
+        assert data["revenue"] == 100.0
+        assert data["satisfaction"] == 4.0
+        assert data["completionRate"] == 50
+
+    def test_admin_monthly_revenue_fills_empty_months(self, client, admin_token, db_session, seeded_activity):
+        refresh_daily_metrics(db_session)
+
+        response = client.get(
+            "/api/v1/admin/dashboard/monthly-revenue?months=3",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [month["sessions"] for month in data] == [0, 0, 3]
+        assert data[-1]["revenue"] == 100.0
+
+    def test_admin_session_metrics_report_response_time(self, client, admin_token, db_session, seeded_activity):
+        refresh_daily_metrics(db_session)
+
+        response = client.get(
+            "/api/v1/admin/dashboard/session-metrics",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        metrics = {item["metric"]: item["value"] for item in response.json()}
+        assert metrics["Avg Session Duration"] == "60 min"
+        assert metrics["Response Time"] == "30.0 min"
+
+    def test_owner_metrics_use_rollup(self, db_session, seeded_activity):
+        refresh_daily_metrics(db_session)
+
+        revenue = _calculate_revenue_metrics(db_session, datetime.now(UTC) - timedelta(days=30), 30)
+        health = _calculate_health_metrics(db_session)
+
+        assert revenue.total_gmv_cents == 10000
+        assert revenue.average_booking_value_cents == 5000
+        assert health.cancellation_rate == 25.0
+        assert health.repeat_booking_rate == 100.0
+        assert health.average_response_time_hours == 0.5
@@ -0,0 +1,111 @@
+"""
+Tests for bulk notification creation.
+
+NotificationService.create_notifications_bulk applies the same preference
+rules as create_notification but loads preferences once and writes the
+notifications, outbox emails and analytics rows with multi-row INSERTs.
+POST /admin/announcements and the package expiry sweep use it.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+from models import Notification, NotificationAnalytics, NotificationOutbox, NotificationPreferences
+from modules.notifications.service import NotificationDraft, NotificationService, NotificationType
+
+
+def _draft(user_id: int, notification_type=NotificationType.BOOKING_REMINDER) -> NotificationDraft:
+    return NotificationDraft(
+        user_id=user_id,
+        notification_type=notification_type,
+        title="Session tomorrow",
+        message="Your session starts at 10:00",
+        action_url="/bookings",
+        action_label="View",
+        metadata={"source": "test"},
+    )
+
+
+class TestCreateNotificationsBulk:
+    def test_writes_notifications_outbox_and_analytics(self, db_session, student_user, tutor_user):
+        result = NotificationService().create_notifications_bulk(
+            db_session, [_draft(student_user.id), _draft(tutor_user.id)]
+        )
+        db_session.commit()
+
+        assert result.created == 2
+        assert result.emails_queued == 2
+        assert result.user_ids == [student_user.id, tutor_user.id]
+
+        notifications = db_session.query(Notification).order_by(Notification.id).all()
+        assert [(n.user_id, n.category, n.is_read, n.extra_data) for n in notifications] == [
+            (student_user.id, "booking", False, {"source": "test"}),
+            (tutor_user.id, "booking", False, {"source": "test"}),
+        ]
+        outbox = db_session.query(NotificationOutbox).order_by(NotificationOutbox.id).all()
+        assert [e.notification_id for e in outbox] == [n.id for n in notifications]
+        assert db_session.query(NotificationAnalytics).filter_by(delivery_channel="in_app").count() == 2
+
+    def test_respects_preferences(self, db_session, student_user, tutor_user):
+        db_session.add_all(
+            [
+                NotificationPreferences(user_id=student_user.id, session_reminders_enabled=False),
+                NotificationPreferences(user_id=tutor_user.id, email_enabled=False),
+            ]
+        )
+        db_session.commit()
+
+        result = NotificationService().create_notifications_bulk(
+            db_session, [_draft(student_user.id), _draft(tutor_user.id)]
+        )
+
+        assert (result.created, result.emails_queued, result.user_ids) == (1, 0, [tutor_user.id])
+        assert db_session.query(NotificationOutbox).count() == 0
+
+    def test_announcements_need_marketing_opt_in(self, db_session, student_user, tutor_user):
+        db_session.add(NotificationPreferences(user_id=tutor_user.id, marketing_enabled=True))
+        db_session.commit()
+
+        result = NotificationService().create_notifications_bulk(
+            db_session,
+            [_draft(user_id, NotificationType.SYSTEM_ANNOUNCEMENT) for user_id in (student_user.id, tutor_user.id)],
+        )
+
+        assert result.user_ids == [tutor_user.id]
+        # No preferences row is created for the student
+        assert db_session.query(NotificationPreferences).filter_by(user_id=student_user.id).count() == 0
+
+
+class TestAnnouncementEndpoint:
+    def test_sends_to_opted_in_audience(self, client, db_session, admin_token, student_user, tutor_user):
+        db_session.add_all(
+            [
+                NotificationPreferences(user_id=student_user.id, marketing_enabled=True),
+                NotificationPreferences(user_id=tutor_user.id, marketing_enabled=True),
+            ]
+        )
+        db_session.commit()
+
+        with patch.object(
+            NotificationService, "broadcast_bulk_notification", new=AsyncMock(return_value=0)
+        ) as mock_broadcast:
+            response = client.post(
+                "/api/v1/admin/announcements",
+                json={"title": "New feature", "message": "Group sessions are live", "audience": "students"},
+                headers={"Authorization": f"Bearer {admin_token}"},
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["notifications_created"] == 1
+        assert data["emails_queued"] == 1
+        assert mock_broadcast.await_args.args[0].user_ids == [student_user.id]
+        assert db_session.query(Notification).filter_by(type="system_announcement").count() == 1
+
+    def test_requires_admin(self, client, student_token):
+        response = client.post(
+            "/api/v1/admin/announcements",
+            json={"title": "New feature", "message": "Group sessions are live"},
+            headers={"Authorization": f"Bearer {student_token}"},
+        )
+
+        assert response.status_code == 403
@@ -0,0 +1,144 @@
+"""
+Tests for the notification email outbox.
+
+NotificationService queues emails in ``notification_outbox`` with the
+notification; modules/notifications/infrastructure/outbox.py sends them in
+Brevo batches, coalesces duplicates and retries transient failures.
+"""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from core.config import settings
+from core.email_service import EmailDeliveryResult, EmailDeliveryStatus
+from models import NotificationAnalytics, NotificationOutbox
+from modules.notifications.infrastructure.outbox import deliver_pending_emails
+from modules.notifications.service import NotificationService, NotificationType
+
+
+def _result(status: EmailDeliveryStatus, message_id: str | None = None) -> EmailDeliveryResult:
+    return EmailDeliveryResult(
+        success=status in (EmailDeliveryStatus.SUCCESS, EmailDeliveryStatus.DISABLED),
+        status=status,
+        message_id=message_id,
+        error_message=None if status == EmailDeliveryStatus.SUCCESS else "boom",
+    )
+
+
+@pytest.fixture
+def send_batch():
+    """Patch the Brevo batch call; by default every email succeeds."""
+    with patch("modules.notifications.infrastructure.outbox.email_service.send_batch_with_tracking") as mock:
+        mock.side_effect = lambda html, messages: [
+            _result(EmailDeliveryStatus.SUCCESS, f"m-{i}") for i, _ in enumerate(messages)
+        ]
+        yield mock
+
+
+def _notify(db_session, user_id: int, title: str = "Booking Confirmed"):
+    notification = NotificationService().create_notification(
+        db=db_session,
+        user_id=user_id,
+        notification_type=NotificationType.BOOKING_CONFIRMED,
+        title=title,
+        message="Your booking has been confirmed",
+        action_url="/bookings/1",
+    )
+    db_session.commit()
+    return notification
+
+
+def _entries(db_session):
+    db_session.expire_all()
+    return db_session.query(NotificationOutbox).order_by(NotificationOutbox.id).all()
+
+
+class TestDelivery:
+    def test_sends_pending_emails_in_one_batch(self, db_session, student_user, tutor_user, send_batch):
+        _notify(db_session, student_user.id)
+        _notify(db_session, tutor_user.id)
+
+        assert deliver_pending_emails(db_session)["sent"] == 2
+
+        send_batch.assert_called_once()
+        html, messages = send_batch.call_args.args
+        assert "{{ params.message }}" in html
+        assert [m.to_email for m in messages] == [student_user.email, tutor_user.email]
+        assert messages[0].params["action_url"] == "/bookings/1"
+        assert [(e.status, e.provider_message_id, e.attempts) for e in _entries(db_session)] == [
+            ("sent", "m-0", 1),
+            ("sent", "m-1", 1),
+        ]
+        assert db_session.query(NotificationAnalytics).filter_by(template_key="email_delivery_success").count() == 2
+
+    def test_nothing_due_makes_no_call(self, db_session, send_batch):
+        assert deliver_pending_emails(db_session) == {"sent": 0, "retried": 0, "failed": 0, "coalesced": 0}
+        send_batch.assert_not_called()
+
+    def test_duplicates_are_coalesced(self, db_session, student_user, send_batch):
+        _notify(db_session, student_user.id)
+        _notify(db_session, student_user.id)
+        _notify(db_session, student_user.id, title="Booking Updated")
+
+        totals = deliver_pending_emails(db_session)
+
+        assert totals["sent"] == 2
+        assert totals["coalesced"] == 1
+        assert len(send_batch.call_args.args[1]) == 2
+        assert [e.status for e in _entries(db_session)] == ["sent", "coalesced", "sent"]
+
+    def test_batches_by_size(self, db_session, student_user, send_batch):
+        for i in range(5):
+            _notify(db_session, student_user.id, title=f"Update {i}")
+
+        assert deliver_pending_emails(db_session, batch_size=2)["sent"] == 5
+        assert send_batch.call_count == 3
+
+
+class TestFailures:
+    def test_transient_failure_retries_with_backoff(self, db_session, student_user, send_batch):
+        _notify(db_session, student_user.id)
+        send_batch.side_effect = lambda html, messages: [_result(EmailDeliveryStatus.FAILED_TRANSIENT)]
+
+        assert deliver_pending_emails(db_session)["retried"] == 1
+
+        (entry,) = _entries(db_session)
+        assert entry.status == "pending"
+        assert entry.attempts == 1
+        assert entry.delivery_status == "failed_transient"
+        assert entry.next_attempt_at > datetime.now(UTC) + timedelta(seconds=30)
+
+        # Not due yet: the next run leaves it alone
+        assert deliver_pending_emails(db_session)["retried"] == 0
+
+    def test_gives_up_after_max_attempts(self, db_session, student_user, send_batch, monkeypatch):
+        monkeypatch.setattr(settings, "NOTIFICATION_OUTBOX_MAX_ATTEMPTS", 2)
+        _notify(db_session, student_user.id)
+        send_batch.side_effect = lambda html, messages: [_result(EmailDeliveryStatus.FAILED_TRANSIENT)]
+
+        deliver_pending_emails(db_session)
+        entry = _entries(db_session)[0]
+        entry.next_attempt_at = datetime.now(UTC) - timedelta(seconds=1)
+        db_session.commit()
+
+        assert deliver_pending_emails(db_session)["failed"] == 1
+        assert _entries(db_session)[0].status == "failed"
+
+    def test_permanent_failure_is_final(self, db_session, student_user, send_batch):
+        _notify(db_session, student_user.id)
+        send_batch.side_effect = lambda html, messages: [_result(EmailDeliveryStatus.FAILED_PERMANENT)]
+
+        assert deliver_pending_emails(db_session)["failed"] == 1
+
+        (entry,) = _entries(db_session)
+        assert (entry.status, entry.last_error) == ("failed", "boom")
+
+    def test_user_without_email_fails_without_sending(self, db_session, student_user, send_batch):
+        _notify(db_session, student_user.id)
+        student_user.deleted_at = datetime.now(UTC)
+        db_session.commit()
+
+        assert deliver_pending_emails(db_session)["failed"] == 1
+        assert send_batch.call_args.args[1] == []
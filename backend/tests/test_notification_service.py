@@ -18,7 +18,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 from sqlalchemy.orm import Session
 
-from models import Notification, NotificationAnalytics, NotificationPreferences, User
+from models import Notification, NotificationAnalytics, NotificationOutbox, NotificationPreferences, User
 from modules.notifications.service import (
     NotificationCategory,
     NotificationService,
@@ -315,19 +315,21 @@ class TestNotificationCreation:
 
 
 class TestEmailDelivery:
-    """Tests for email notification delivery via Brevo."""
+    """Tests for queueing notification emails in the outbox."""
 
-    @patch("modules.notifications.service.email_service")
-    def test_send_email_notification_success(
+    @staticmethod
+    def _outbox(db_session: Session, user_id: int) -> list[NotificationOutbox]:
+        return db_session.query(NotificationOutbox).filter(NotificationOutbox.user_id == user_id).all()
+
+    @patch("modules.notifications.infrastructure.outbox.email_service")
+    def test_email_queued_not_sent_inline(
         self,
         mock_email_service: MagicMock,
         db_session: Session,
         notification_svc: NotificationService,
         student_user: User,
     ):
-        """Test successful email delivery."""
-        mock_email_service._send_email.return_value = True
-
+        """Test email is queued in the notification's transaction, not sent."""
         notification = notification_svc.create_notification(
             db=db_session,
             user_id=student_user.id,
@@ -339,64 +341,61 @@ class TestEmailDelivery:
         db_session.commit()
 
         assert notification is not None
-        mock_email_service._send_email.assert_called_once()
+        mock_email_service.send_batch_with_tracking.assert_not_called()
+        (entry,) = self._outbox(db_session, student_user.id)
+        assert entry.notification_id == notification.id
+        assert entry.status == "pending"
+        assert entry.payload["title"] == "Booking Confirmed"
 
-    @patch("modules.notifications.service.email_service")
-    def test_email_not_sent_when_disabled(
+    def test_rollback_discards_queued_email(
         self,
-        mock_email_service: MagicMock,
         db_session: Session,
         notification_svc: NotificationService,
         student_user: User,
     ):
-        """Test that email is not sent when send_email=False."""
-        notification = notification_svc.create_notification(
+        """Test no email is left queued for a rolled back notification."""
+        notification_svc.create_notification(
             db=db_session,
             user_id=student_user.id,
             notification_type=NotificationType.BOOKING_CONFIRMED,
             title="Booking Confirmed",
             message="Your booking has been confirmed",
-            send_email=False,
+            send_email=True,
         )
-        db_session.commit()
+        db_session.rollback()
 
-        assert notification is not None
-        mock_email_service._send_email.assert_not_called()
+        assert self._outbox(db_session, student_user.id) == []
 
-    @patch("modules.notifications.service.email_service")
-    def test_email_not_sent_when_user_disabled_email(
+    def test_email_not_queued_when_disabled(
         self,
-        mock_email_service: MagicMock,
         db_session: Session,
         notification_svc: NotificationService,
-        user_with_disabled_email: User,
+        student_user: User,
     ):
-        """Test that email is not sent when user has email disabled in preferences."""
+        """Test that email is not queued when send_email=False."""
         notification = notification_svc.create_notification(
             db=db_session,
-            user_id=user_with_disabled_email.id,
+            user_id=student_user.id,
             notification_type=NotificationType.BOOKING_CONFIRMED,
             title="Booking Confirmed",
             message="Your booking has been confirmed",
-            send_email=True,
+            send_email=False,
         )
         db_session.commit()
 
         assert notification is not None
-        mock_email_service._send_email.assert_not_called()
+        assert self._outbox(db_session, student_user.id) == []
 
-    @patch("modules.notifications.service.email_service")
-    def test_email_not_sent_during_quiet_hours(
+    def test_email_not_queued_when_user_disabled_email(
         self,
-        mock_email_service: MagicMock,
         db_session: Session,
         notification_svc: NotificationService,
-        user_with_quiet_hours: User,
+        user_with_disabled_email: User,
     ):
-        """Test that email is not sent during user's quiet hours."""
+        """Test that email is not queued when user has email disabled in preferences."""
         notification = notification_svc.create_notification(
             db=db_session,
-            user_id=user_with_quiet_hours.id,
+            user_id=user_with_disabled_email.id,
             notification_type=NotificationType.BOOKING_CONFIRMED,
             title="Booking Confirmed",
             message="Your booking has been confirmed",
@@ -405,22 +404,18 @@ class TestEmailDelivery:
         db_session.commit()
 
         assert notification is not None
-        mock_email_service._send_email.assert_not_called()
+        assert self._outbox(db_session, user_with_disabled_email.id) == []
 
-    @patch("modules.notifications.service.email_service")
-    def test_email_delivery_failure_does_not_block_notification(
+    def test_email_not_queued_during_quiet_hours(
         self,
-        mock_email_service: MagicMock,
         db_session: Session,
         notification_svc: NotificationService,
-        student_user: User,
+        user_with_quiet_hours: User,
     ):
-        """Test that notification is created even if email fails."""
-        mock_email_service._send_email.return_value = False
-
+        """Test that email is not queued during user's quiet hours."""
         notification = notification_svc.create_notification(
             db=db_session,
-            user_id=student_user.id,
+            user_id=user_with_quiet_hours.id,
             notification_type=NotificationType.BOOKING_CONFIRMED,
             title="Booking Confirmed",
             message="Your booking has been confirmed",
@@ -429,32 +424,7 @@ class TestEmailDelivery:
         db_session.commit()
 
         assert notification is not None
-        assert notification.id is not None
-
-    @patch("modules.notifications.service.email_service")
-    def test_email_not_sent_for_missing_user(
-        self,
-        mock_email_service: MagicMock,
-        db_session: Session,
-        notification_svc: NotificationService,
-    ):
-        """Test email delivery handles missing user gracefully."""
-        # Directly test _send_email_notification with invalid user
-        notification = Notification(
-            user_id=99999,  # Non-existent user
-            type="test",
-            title="Test",
-            message="Test message",
-        )
-
-        result = notification_svc._send_email_notification(
-            db=db_session,
-            user_id=99999,
-            notification=notification,
-        )
-
-        assert result is False
-        mock_email_service._send_email.assert_not_called()
+        assert self._outbox(db_session, user_with_quiet_hours.id) == []
 
 
 # =============================================================================
@@ -1,9 +1,35 @@
 """Tests for pagination utilities."""
 
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
 import pytest
 from pydantic import ValidationError
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table
+from sqlalchemy.dialects import postgresql
+
+from core.pagination import (
+    CursorParams,
+    InvalidCursorError,
+    Keyset,
+    PaginatedResponse,
+    PaginationParams,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+    split_page,
+)
+
+events = Table(
+    "events",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("starts_at", DateTime(timezone=True)),
+)
+
 
-from core.pagination import PaginatedResponse, PaginationParams, paginate
+def _sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
 
 
 class TestPaginationParams:
@@ -286,3 +312,96 @@ class TestPaginationEdgeCases:
 
         params = PaginationParams(page=1000, page_size=100)
         assert params.skip == 99900
+
+
+class TestCursorEncoding:
+    """Test signed, scoped cursors."""
+
+    def test_round_trip_preserves_types(self):
+        values = (datetime(2026, 1, 2, 3, 4, 5, 6, tzinfo=UTC), date(2026, 1, 2), Decimal("4.50"), 0.1234, 42, None)
+        assert decode_cursor("scope", encode_cursor("scope", values)) == values
+
+    def test_cursor_is_bound_to_scope(self):
+        cursor = encode_cursor("bookings:1", (1,))
+        with pytest.raises(InvalidCursorError):
+            decode_cursor("bookings:2", cursor)
+
+    def test_tampered_payload_rejected(self):
+        signature = encode_cursor("scope", (1,)).split(".")[1]
+        forged = encode_cursor("other", (999,)).split(".")[0]
+        with pytest.raises(InvalidCursorError):
+            decode_cursor("scope", f"{forged}.{signature}")
+
+    @pytest.mark.parametrize("cursor", ["", "garbage", "a.b.c", "!!!.???"])
+    def test_malformed_cursor_rejected(self, cursor):
+        with pytest.raises(InvalidCursorError) as exc_info:
+            decode_cursor("scope", cursor)
+        assert exc_info.value.status_code == 400
+
+
+class TestKeyset:
+    """Test keyset ordering and continuation predicates."""
+
+    def test_same_direction_uses_row_comparison(self):
+        keyset = Keyset(events.c.starts_at.desc(), events.c.id.desc())
+        sql = _sql(keyset.after((datetime(2026, 1, 1, tzinfo=UTC), 7)))
+        assert sql.startswith("(events.starts_at, events.id) < (")
+
+    def test_ascending_uses_greater_than(self):
+        keyset = Keyset(events.c.starts_at.asc(), events.c.id.asc())
+        assert ") > (" in _sql(keyset.after((datetime(2026, 1, 1, tzinfo=UTC), 7)))
+
+    def test_mixed_directions_expand(self):
+        keyset = Keyset(events.c.starts_at.asc(), events.c.id.desc())
+        sql = _sql(keyset.after((datetime(2026, 1, 1, tzinfo=UTC), 7)))
+        assert "events.starts_at >" in sql
+        assert "events.id < 7" in sql
+        assert " OR " in sql
+
+    def test_wrong_arity_rejected(self):
+        keyset = Keyset(events.c.starts_at.desc(), events.c.id.desc())
+        with pytest.raises(InvalidCursorError):
+            keyset.after((7,))
+
+    def test_apply_orders_statement(self):
+        keyset = Keyset(events.c.starts_at.desc(), events.c.id.desc())
+        sql = _sql(keyset.apply(events.select(), after=(datetime(2026, 1, 1, tzinfo=UTC), 7)))
+        assert "WHERE (events.starts_at, events.id) <" in sql
+        assert sql.endswith("ORDER BY events.starts_at DESC, events.id DESC")
+
+
+class TestSplitPage:
+    """Test trimming the look-ahead row into a next cursor."""
+
+    def test_full_page_with_more_rows(self):
+        rows, next_cursor = split_page([1, 2, 3, 4], 3, "scope", key=lambda row: (row,))
+        assert rows == [1, 2, 3]
+        assert decode_cursor("scope", next_cursor) == (3,)
+
+    def test_last_page_has_no_cursor(self):
+        assert split_page([1, 2, 3], 3, "scope", key=lambda row: (row,)) == ([1, 2, 3], None)
+
+
+class TestCursorPage:
+    """Test cursor-mode responses."""
+
+    def test_cursor_params(self):
+        assert CursorParams().enabled is False
+        assert CursorParams(cursor="").enabled is True
+
+    def test_create_cursor_page_without_total(self):
+        response = PaginatedResponse.create_cursor_page([1, 2], 2, "next", has_prev=True)
+        assert response.page == 1
+        assert response.total is None
+        assert response.total_pages is None
+        assert response.has_next is True
+        assert response.has_prev is True
+        assert response.next_cursor == "next"
+
+    def test_create_cursor_page_with_estimate(self):
+        response = PaginatedResponse.create_cursor_page(
+            [1], 2, None, has_prev=False, total=5, total_is_estimate=True
+        )
+        assert response.total_pages == 3
+        assert response.has_next is False
+        assert response.total_is_estimate is True
@@ -0,0 +1,137 @@
+"""
+Tests for async password hashing (core/password_service.py).
+
+Covers running bcrypt off the event loop, admission limits with fast
+rejection, and rehash-on-login when the bcrypt cost changes.
+"""
+
+import asyncio
+import threading
+import time
+
+import bcrypt
+import pytest
+
+from core.config import settings
+from core.password_service import PasswordHashingBusyError, PasswordService
+from core.security import PasswordHasher
+from tests.conftest import STUDENT_PASSWORD
+
+
+@pytest.fixture
+def service():
+    service = PasswordService(workers=2, max_pending=4)
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def low_cost(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_BCRYPT_ROUNDS", 4)
+
+
+def _old_cost_hash(password: str) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=5)).decode("utf-8")
+
+
+class TestPasswordService:
+    @pytest.mark.asyncio
+    async def test_hash_and_verify(self, service, low_cost):
+        hashed = await service.hash("secret-password")
+
+        assert await service.verify("secret-password", hashed) is True
+        assert await service.verify("wrong-password", hashed) is False
+        assert service.hash_sync("secret-password").startswith("$2b$04$")
+
+    @pytest.mark.asyncio
+    async def test_hashing_does_not_block_event_loop(self, service):
+        hashed = PasswordHasher.hash("secret-password")
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticker = asyncio.create_task(tick())
+        await asyncio.gather(*(service.verify("secret-password", hashed) for _ in range(2)))
+        ticker.cancel()
+
+        # Two 12-round verifies take well over 100ms; the loop kept ticking meanwhile
+        assert ticks > 5
+
+    @pytest.mark.asyncio
+    async def test_saturated_pool_rejects_fast(self, service):
+        release = threading.Event()
+        jobs = [service._submit(release.wait) for _ in range(service.max_pending)]
+
+        started = time.perf_counter()
+        with pytest.raises(PasswordHashingBusyError) as exc_info:
+            await service.hash("secret-password")
+
+        assert time.perf_counter() - started < 0.1
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"] == "1"
+        assert service.get_stats()["rejected"] == 1
+
+        release.set()
+        for job in jobs:
+            job.result()
+        assert service.get_stats()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_verify_and_update_rehashes_outdated_cost(self, service, low_cost):
+        verified, new_hash = await service.verify_and_update("secret-password", _old_cost_hash("secret-password"))
+
+        assert verified is True
+        assert new_hash.startswith("$2b$04$")
+        assert PasswordHasher.verify("secret-password", new_hash)
+        assert service.get_stats()["rehashed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_verify_and_update_keeps_current_hash(self, service, low_cost):
+        current = PasswordHasher.hash("secret-password")
+
+        assert await service.verify_and_update("secret-password", current) == (True, None)
+        assert await service.verify_and_update("wrong-password", _old_cost_hash("secret-password")) == (False, None)
+
+    def test_needs_rehash(self, low_cost):
+        assert PasswordHasher.needs_rehash(_old_cost_hash("secret-password")) is True
+        assert PasswordHasher.needs_rehash(PasswordHasher.hash("secret-password")) is False
+        assert PasswordHasher.needs_rehash("") is False
+
+
+class TestRehashOnLogin:
+    def test_login_upgrades_outdated_hash(self, client, db_session, student_user, low_cost):
+        student_user.hashed_password = _old_cost_hash(STUDENT_PASSWORD)
+        db_session.commit()
+        password_changed_at = student_user.password_changed_at
+
+        response = client.post(
+            "/api/v1/auth/login",
+            data={"username": student_user.email, "password": STUDENT_PASSWORD},
+        )
+
+        assert response.status_code == 200
+        db_session.refresh(student_user)
+        assert student_user.hashed_password.startswith("$2b$04$")
+        assert PasswordHasher.verify(STUDENT_PASSWORD, student_user.hashed_password)
+        # Issued tokens stay valid
+        assert student_user.password_changed_at == password_changed_at
+
+    def test_saturated_pool_returns_503(self, client, student_user, monkeypatch):
+        from core import password_service as module
+
+        def reject(*args):
+            raise PasswordHashingBusyError()
+
+        monkeypatch.setattr(module.password_service, "_submit", reject)
+
+        response = client.post(
+            "/api/v1/auth/login",
+            data={"username": student_user.email, "password": STUDENT_PASSWORD},
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
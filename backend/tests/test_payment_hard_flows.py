@@ -137,7 +137,7 @@ class TestWebhookIdempotency:
                 headers={"Stripe-Signature": "test_sig"},
             )
             assert response1.status_code == status.HTTP_200_OK
-            assert response1.json()["status"] == "success"
+            assert response1.json()["status"] == "queued"
 
         # Verify payment was created
         payment_count_after_first = (
@@ -210,10 +210,9 @@ class TestWebhookIdempotency:
         for t in threads:
             t.join()
 
-        # Only one should succeed, others should be "already_processed"
-        assert results.count("success") <= 1
-        # At least some should be processed (success or already_processed)
-        assert len([r for r in results if r in ["success", "already_processed"]]) >= 1
+        # Only one delivery is stored, the others are acknowledged as duplicates
+        assert results.count("queued") == 1
+        assert all(r in ["queued", "already_queued", "already_processed"] for r in results)
 
 
 class TestWebhookOutOfOrder:
@@ -351,9 +350,7 @@ class TestWebhookTimeoutRetry:
     """Test webhook timeout and retry scenarios."""
 
     def test_webhook_retry_tracking(self, client, db_session, test_booking):
-        """Test that webhook retry attempts are tracked."""
-        from core.payment_reliability import webhook_retry_tracker
-
+        """Test that webhook processing attempts are recorded on the stored event."""
         event_id = "evt_retry_tracking_test"
 
         # Simulate first attempt with error
@@ -376,10 +373,41 @@ class TestWebhookTimeoutRetry:
                 headers={"Stripe-Signature": "test_sig"},
             )
 
-        # Check retry info was tracked
-        retry_info = webhook_retry_tracker.get_retry_info(event_id)
-        assert retry_info is not None
-        assert retry_info.attempt_count >= 1
+        # Check the attempt was recorded
+        webhook_event = db_session.query(WebhookEvent).filter_by(stripe_event_id=event_id).one()
+        assert webhook_event.attempts >= 1
+
+    def test_failing_webhook_is_retried_then_dead_lettered(self, client, db_session, monkeypatch):
+        """Test that a failing handler leaves the event for retry, then in the dead-letter state."""
+        from core.config import settings
+        from modules.payments.router import WEBHOOK_HANDLERS
+
+        async def failing_handler(db, data):
+            raise RuntimeError("Stripe API timeout")
+
+        monkeypatch.setitem(WEBHOOK_HANDLERS, "charge.refunded", failing_handler)
+        monkeypatch.setattr(settings, "STRIPE_WEBHOOK_MAX_ATTEMPTS", 1)
+
+        with patch("modules.payments.router.verify_webhook_signature") as mock_verify:
+            mock_event = MagicMock()
+            mock_event.type = "charge.refunded"
+            mock_event.id = "evt_dead_letter_test"
+            mock_event.data.object = {"id": "ch_dead", "payment_intent": "pi_dead"}
+            mock_verify.return_value = mock_event
+
+            response = client.post(
+                "/api/v1/payments/webhook",
+                content=b"{}",
+                headers={"Stripe-Signature": "test_sig"},
+            )
+
+        # Stripe gets its acknowledgement even though processing failed
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "queued"
+
+        webhook_event = db_session.query(WebhookEvent).filter_by(stripe_event_id="evt_dead_letter_test").one()
+        assert webhook_event.status == "dead"
+        assert webhook_event.last_error == "RuntimeError: Stripe API timeout"
 
 
 # =============================================================================
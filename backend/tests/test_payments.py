@@ -247,8 +247,9 @@ class TestWebhookHandling:
             )
 
             assert response.status_code == status.HTTP_200_OK
-            assert response.json()["status"] == "success"
+            assert response.json()["status"] == "queued"
 
+            # Processed in the background before TestClient returns
             from models import Payment
 
             payment = (
@@ -413,6 +414,7 @@ class TestWebhookHandling:
         existing_event = WebhookEvent(
             stripe_event_id="evt_duplicate",
             event_type="checkout.session.completed",
+            status="processed",
         )
         db_session.add(existing_event)
         db_session.commit()
@@ -435,6 +437,8 @@ class TestWebhookHandling:
 
     def test_webhook_unhandled_event(self, client, db_session):
         """Test unhandled webhook event type is logged but accepted."""
+        from models import WebhookEvent
+
         with patch("modules.payments.router.verify_webhook_signature") as mock_verify:
             mock_event = MagicMock()
             mock_event.type = "unknown.event.type"
@@ -449,7 +453,10 @@ class TestWebhookHandling:
             )
 
             assert response.status_code == status.HTTP_200_OK
-            assert response.json()["status"] == "success"
+            assert response.json()["status"] == "queued"
+
+        event = db_session.query(WebhookEvent).filter_by(stripe_event_id="evt_unknown").one()
+        assert event.status == "processed"
 
 
 class TestRefunds:
@@ -0,0 +1,160 @@
+"""
+Tests for cached principal resolution (core/principal_cache.py).
+
+Authentication reads a cached snapshot instead of the users row; ORM writes to
+a user's security state evict it on commit.
+"""
+
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import event
+
+from core.principal_cache import attach_user, invalidate_principal, resolve_principal
+from models import User
+
+
+@pytest.fixture
+def captured_sql(db_session):
+    """Collect SQL statements executed on the test session's engine."""
+    statements: list[str] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _capture)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _capture)
+
+
+class TestResolvePrincipal:
+    @pytest.mark.asyncio
+    async def test_repeat_resolution_skips_database(self, db_session, student_user, captured_sql):
+        await resolve_principal(db_session, student_user.email)
+        captured_sql.clear()
+
+        principal = await resolve_principal(db_session, student_user.email.upper())
+
+        assert principal["id"] == student_user.id
+        assert principal["role"] == "student"
+        assert captured_sql == []
+
+    @pytest.mark.asyncio
+    async def test_unknown_email_resolves_to_none(self, db_session):
+        assert await resolve_principal(db_session, "nobody@example.com") is None
+
+    @pytest.mark.asyncio
+    async def test_deactivation_evicts_on_commit(self, db_session, student_user):
+        await resolve_principal(db_session, student_user.email)
+
+        student_user.is_active = False
+        db_session.commit()
+
+        principal = await resolve_principal(db_session, student_user.email)
+        assert principal["is_active"] is False
+
+    @pytest.mark.asyncio
+    async def test_role_and_password_changes_evict(self, db_session, student_user):
+        await resolve_principal(db_session, student_user.email)
+        changed_at = datetime.now(UTC)
+
+        student_user.role = "tutor"
+        student_user.password_changed_at = changed_at
+        db_session.commit()
+
+        principal = await resolve_principal(db_session, student_user.email)
+        assert principal["role"] == "tutor"
+        assert principal["password_changed_at"] == pytest.approx(changed_at.timestamp())
+
+    @pytest.mark.asyncio
+    async def test_soft_deleted_user_no_longer_resolves(self, db_session, student_user):
+        await resolve_principal(db_session, student_user.email)
+
+        student_user.deleted_at = datetime.now(UTC)
+        db_session.commit()
+
+        assert await resolve_principal(db_session, student_user.email) is None
+
+    @pytest.mark.asyncio
+    async def test_email_change_moves_principal(self, db_session, student_user):
+        old_email = student_user.email
+        new_email = f"renamed-{old_email}"
+        await resolve_principal(db_session, old_email)
+        assert await resolve_principal(db_session, new_email) is None
+
+        student_user.email = new_email
+        db_session.commit()
+
+        assert await resolve_principal(db_session, old_email) is None
+        assert (await resolve_principal(db_session, new_email))["id"] == student_user.id
+
+    @pytest.mark.asyncio
+    async def test_unrelated_change_keeps_cached_principal(self, db_session, student_user, captured_sql):
+        email = student_user.email
+        await resolve_principal(db_session, email)
+
+        student_user.avatar_key = "avatars/new.webp"
+        db_session.commit()
+        captured_sql.clear()
+
+        await resolve_principal(db_session, email)
+        assert captured_sql == []
+
+    @pytest.mark.asyncio
+    async def test_explicit_invalidation(self, db_session, student_user, captured_sql):
+        await resolve_principal(db_session, student_user.email)
+
+        await invalidate_principal(student_user.id, student_user.email)
+        captured_sql.clear()
+
+        assert (await resolve_principal(db_session, student_user.email))["id"] == student_user.id
+        assert captured_sql
+
+
+class TestAttachUser:
+    @pytest.mark.asyncio
+    async def test_attached_user_loads_other_columns_lazily(self, db_session, student_user, captured_sql):
+        user_id, email, hashed_password = student_user.id, student_user.email, student_user.hashed_password
+        principal = await resolve_principal(db_session, email)
+        db_session.expunge_all()
+        captured_sql.clear()
+
+        user = attach_user(db_session, principal)
+
+        assert isinstance(user, User)
+        assert (user.id, user.email, user.role, user.timezone) == (user_id, email, "student", "UTC")
+        assert captured_sql == []
+
+        assert user.hashed_password == hashed_password
+        assert len(captured_sql) == 1
+
+    @pytest.mark.asyncio
+    async def test_attached_user_can_be_updated(self, db_session, student_user):
+        user_id = student_user.id
+        principal = await resolve_principal(db_session, student_user.email)
+        db_session.expunge_all()
+
+        user = attach_user(db_session, principal)
+        user.currency = "EUR"
+        db_session.commit()
+        db_session.expunge_all()
+
+        assert db_session.get(User, user_id).currency == "EUR"
+
+    @pytest.mark.asyncio
+    async def test_reuses_instance_already_in_session(self, db_session, student_user):
+        principal = await resolve_principal(db_session, student_user.email)
+
+        assert attach_user(db_session, principal) is student_user
+
+
+class TestAuthenticatedRequests:
+    def test_deactivation_applies_to_next_request(self, client, db_session, student_user, student_token_direct):
+        headers = {"Authorization": f"Bearer {student_token_direct}"}
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+        student_user.is_active = False
+        db_session.commit()
+
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == 403
@@ -0,0 +1,308 @@
+"""
+Tests for the Redis-backed rate limiter (core/rate_limiting.py).
+
+The shared store is played by a ``MemoryStore`` on a fake clock that records
+every round trip, so leasing and fallback behaviour can be checked without
+Redis. The Lua script itself runs against fakeredis when lupa is installed.
+"""
+
+import importlib.util
+
+import pytest
+from fastapi import FastAPI, Request
+from starlette.testclient import TestClient
+
+from core.rate_limiting import (
+    GCRA_SCRIPT,
+    REDIS_RETRY_SECONDS,
+    MemoryStore,
+    RateLimit,
+    RateLimiter,
+    RateLimitExceeded,
+    gcra,
+    get_principal_key,
+)
+from core.security import TokenManager
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class RecordingStore(MemoryStore):
+    """Stands in for Redis; ``wants`` records the size of each round trip."""
+
+    def __init__(self, clock: FakeClock, fail: bool = False) -> None:
+        super().__init__(clock)
+        self.fail = fail
+        self.wants: list[int] = []
+
+    async def acquire(self, key, limit, want):
+        self.wants.append(want)
+        if self.fail:
+            raise ConnectionError("redis down")
+        return await super().acquire(key, limit, want)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def store(clock):
+    return RecordingStore(clock)
+
+
+def _limiter(store, clock, **overrides) -> RateLimiter:
+    options = {"enabled": True, "lease_max": 20, "lease_ttl": 1.0, "max_local_keys": 100}
+    options.update(overrides)
+    return RateLimiter(store, MemoryStore(clock), clock=clock, **options)
+
+
+async def _admitted(limiter: RateLimiter, limit: RateLimit, requests: int, key: str = "ip:1.2.3.4") -> int:
+    admitted = 0
+    for _ in range(requests):
+        try:
+            await limiter.hit("route", limit, key)
+            admitted += 1
+        except RateLimitExceeded:
+            pass
+    return admitted
+
+
+class TestRateLimit:
+    @pytest.mark.parametrize(
+        "value,count,period",
+        [("5/minute", 5, 60), ("10 per hour", 10, 3600), ("100/5 minutes", 100, 300), ("1/day", 1, 86400)],
+    )
+    def test_parse(self, value, count, period):
+        assert RateLimit.parse(value) == RateLimit(count, period)
+
+    @pytest.mark.parametrize("value", ["", "five/minute", "0/minute", "10/fortnight"])
+    def test_parse_rejects_invalid(self, value):
+        with pytest.raises(ValueError):
+            RateLimit.parse(value)
+
+    def test_gcra_allows_burst_then_spaces_requests(self):
+        limit = RateLimit(5, 60)
+
+        grant, tat = gcra(0.0, 100.0, limit, want=10)
+        assert grant.granted == 5
+        assert tat == 160.0
+
+        grant, _ = gcra(tat, 100.0, limit, want=1)
+        assert grant.granted == 0
+        assert grant.retry_after == 12.0
+
+        grant, _ = gcra(tat, 112.0, limit, want=1)
+        assert grant.granted == 1
+
+
+class TestLimiter:
+    @pytest.mark.asyncio
+    async def test_low_limit_asks_store_every_time(self, store, clock):
+        limiter = _limiter(store, clock)
+
+        assert await _admitted(limiter, RateLimit(5, 60), 5) == 5
+        with pytest.raises(RateLimitExceeded) as exc:
+            await limiter.hit("route", RateLimit(5, 60), "ip:1.2.3.4")
+
+        assert exc.value.retry_after == 12
+        assert exc.value.headers["Retry-After"] == "12"
+        assert store.wants == [1] * 6
+
+    @pytest.mark.asyncio
+    async def test_hot_key_leases_grow(self, store, clock):
+        limiter = _limiter(store, clock)
+
+        assert await _admitted(limiter, RateLimit(600, 60), 100) == 100
+
+        assert store.wants[:5] == [1, 2, 4, 8, 16]
+        assert len(store.wants) < 12
+        metrics = limiter.metrics()["routes"]["route"]
+        assert metrics["local_hits"] == 100 - len(store.wants)
+
+    @pytest.mark.asyncio
+    async def test_lease_is_capped_at_a_tenth_of_the_limit(self, store, clock):
+        limiter = _limiter(store, clock)
+
+        await _admitted(limiter, RateLimit(60, 60), 40)
+
+        assert max(store.wants) == 6
+
+    @pytest.mark.asyncio
+    async def test_cold_key_does_not_lease(self, store, clock):
+        limiter = _limiter(store, clock)
+
+        for _ in range(5):
+            await limiter.hit("route", RateLimit(600, 60), "user:a@example.com")
+            clock.advance(2.0)
+
+        assert store.wants == [1] * 5
+
+    @pytest.mark.asyncio
+    async def test_workers_sharing_a_store_never_over_admit(self, store, clock):
+        workers = [_limiter(store, clock) for _ in range(3)]
+        limit = RateLimit(100, 60)
+
+        admitted = 0
+        for _ in range(100):
+            for worker in workers:
+                admitted += await _admitted(worker, limit, 1)
+
+        assert admitted <= 100
+        assert admitted >= 80  # Leases left on other workers are the only loss
+
+    @pytest.mark.asyncio
+    async def test_throttled_key_is_remembered(self, store, clock):
+        limiter = _limiter(store, clock)
+        limit = RateLimit(1, 60)
+        await limiter.hit("route", limit, "ip:1.2.3.4")
+
+        assert await _admitted(limiter, limit, 10) == 0
+        assert len(store.wants) == 2
+
+        clock.advance(60)
+        assert await _admitted(limiter, limit, 1) == 1
+        assert len(store.wants) == 3
+
+    @pytest.mark.asyncio
+    async def test_keys_and_routes_have_separate_budgets(self, store, clock):
+        limiter = _limiter(store, clock)
+        limit = RateLimit(1, 60)
+
+        await limiter.hit("route", limit, "ip:1.2.3.4")
+        await limiter.hit("route", limit, "ip:5.6.7.8")
+        await limiter.hit("other", limit, "ip:1.2.3.4")
+
+        with pytest.raises(RateLimitExceeded):
+            await limiter.hit("route", limit, "ip:1.2.3.4")
+
+    @pytest.mark.asyncio
+    async def test_store_failure_falls_back_to_memory(self, clock):
+        store = RecordingStore(clock, fail=True)
+        limiter = _limiter(store, clock)
+        limit = RateLimit(2, 60)
+
+        assert await _admitted(limiter, limit, 3) == 2
+        assert len(store.wants) == 1  # Not retried while backing off
+
+        metrics = limiter.metrics()
+        assert metrics["redis_available"] is False
+        assert metrics["routes"]["route"]["redis_errors"] == 1
+        assert metrics["routes"]["route"]["fallback"] == 3
+
+        store.fail = False
+        clock.advance(REDIS_RETRY_SECONDS)
+        await limiter.hit("route", limit, "ip:9.9.9.9")
+        assert len(store.wants) == 2
+
+    @pytest.mark.asyncio
+    async def test_disabled_limiter_admits_everything(self, store, clock):
+        limiter = _limiter(store, clock, enabled=False)
+
+        assert await _admitted(limiter, RateLimit(1, 60), 5) == 5
+        assert store.wants == []
+
+    @pytest.mark.asyncio
+    async def test_local_state_is_bounded(self, store, clock):
+        limiter = _limiter(store, clock, max_local_keys=10)
+
+        for i in range(50):
+            await limiter.hit("route", RateLimit(600, 60), f"ip:10.0.0.{i}")
+
+        assert limiter.metrics()["leased_keys"] == 10
+
+
+class TestDecorator:
+    def _app(self, limiter: RateLimiter) -> FastAPI:
+        app = FastAPI()
+
+        @app.get("/async")
+        @limiter.limit("2/minute")
+        async def async_endpoint(request: Request):
+            return {"ok": True}
+
+        @app.get("/sync/{item_id}")
+        @limiter.limit("2/minute")
+        def sync_endpoint(request: Request, item_id: int):
+            return {"item_id": item_id}
+
+        return app
+
+    def test_async_and_sync_endpoints_are_limited(self, store, clock):
+        client = TestClient(self._app(_limiter(store, clock)))
+
+        assert client.get("/sync/7").json() == {"item_id": 7}
+        for path in ("/async", "/async", "/sync/7"):
+            assert client.get(path).status_code == 200
+
+        response = client.get("/async")
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "30"
+        assert client.get("/sync/7").status_code == 429
+
+    def test_users_have_their_own_budget(self, store, clock):
+        client = TestClient(self._app(_limiter(store, clock)))
+        token = TokenManager.create_access_token({"sub": "tutor@example.com"})
+
+        for _ in range(2):
+            assert client.get("/async").status_code == 200
+        assert client.get("/async").status_code == 429
+        assert client.get("/async", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
+    def test_endpoint_without_request_is_rejected(self, store, clock):
+        limiter = _limiter(store, clock)
+
+        with pytest.raises(TypeError):
+
+            @limiter.limit("1/minute")
+            async def endpoint():
+                return None
+
+
+class TestPrincipalKey:
+    def _request(self, headers: dict[str, str]) -> Request:
+        raw = [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+        return Request({"type": "http", "headers": raw, "client": ("203.0.113.5", 1234)})
+
+    def test_valid_token_uses_subject(self):
+        token = TokenManager.create_access_token({"sub": "student@example.com"})
+
+        assert get_principal_key(self._request({"Authorization": f"Bearer {token}"})) == "user:student@example.com"
+
+    @pytest.mark.parametrize("header", [None, "Bearer not-a-jwt", "Basic dXNlcjpwYXNz"])
+    def test_otherwise_uses_client_ip(self, header):
+        headers = {"Authorization": header} if header else {}
+
+        assert get_principal_key(self._request(headers)) == "ip:203.0.113.5"
+
+    def test_refresh_token_uses_client_ip(self):
+        token = TokenManager.create_refresh_token({"sub": "student@example.com"})
+
+        assert get_principal_key(self._request({"Authorization": f"Bearer {token}"})) == "ip:203.0.113.5"
+
+
+@pytest.mark.skipif(importlib.util.find_spec("lupa") is None, reason="fakeredis needs lupa to run Lua")
+class TestGCRAScript:
+    @pytest.mark.asyncio
+    async def test_script_grants_leases_and_throttles(self):
+        import fakeredis
+
+        script = fakeredis.FakeAsyncRedis().register_script(GCRA_SCRIPT)
+        limit = RateLimit(10, 60)
+        args = [round(limit.interval * 1_000_000), round(limit.period * 1_000_000)]
+
+        assert (await script(keys=["ratelimit:test"], args=[*args, 4]))[0] == 4
+        assert (await script(keys=["ratelimit:test"], args=[*args, 10]))[0] == 6
+        granted, retry_after_us = await script(keys=["ratelimit:test"], args=[*args, 1])
+        assert granted == 0
+        assert 0 < retry_after_us <= 6_000_000
@@ -0,0 +1,144 @@
+"""Tests for tutor and message full-text search helpers."""
+
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from core import search
+from models import Message, TutorProfile, User
+
+
+def compile_pg(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect()))
+
+
+class TestEscapeLike:
+    def test_escapes_wildcards(self):
+        assert search.escape_like("50%_off\\") == "50\\%\\_off\\\\"
+
+
+class TestNamePrefixFilter:
+    def test_prefix_match_per_token(self):
+        clause = search.name_prefix_filter("jo sm", User.first_name, User.last_name)
+        sql = compile_pg(clause)
+        assert sql.count("ILIKE") == 4
+        assert clause.compile(dialect=postgresql.dialect()).params == {
+            "first_name_1": "jo%",
+            "last_name_1": "jo%",
+            "first_name_2": "sm%",
+            "last_name_2": "sm%",
+        }
+
+    def test_token_limit(self):
+        clause = search.name_prefix_filter("a b c d", User.first_name, User.last_name)
+        assert compile_pg(clause).count("ILIKE") == 2 * search.MAX_NAME_PREFIX_TOKENS
+
+    def test_blank_term(self):
+        assert search.name_prefix_filter("   ", User.first_name, User.last_name) is None
+
+
+class TestTutorTextFilter:
+    def test_uses_search_vector_and_websearch_query(self):
+        sql = compile_pg(search.tutor_text_filter("algebra"))
+        assert "tutor_profiles.search_vector @@ websearch_to_tsquery" in sql
+        assert "users.first_name ILIKE" in sql
+
+    def test_branches_are_combined_with_union(self):
+        sql = compile_pg(search.tutor_text_filter("algebra"))
+        assert sql.startswith("tutor_profiles.id IN (")
+        assert " UNION " in sql
+
+    def test_rank_uses_cover_density(self):
+        sql = compile_pg(search.tutor_search_rank("algebra", TutorProfile.search_vector))
+        assert "ts_rank_cd(tutor_profiles.search_vector" in sql
+
+
+class TestSearchVector:
+    def test_weights_in_field_order(self):
+        sql = compile_pg(search.tutor_search_vector("t", "h", "b", "d"))
+        assert sql.count("setweight(") == 4
+        params = search.tutor_search_vector("t", "h", "b", "d").compile(dialect=postgresql.dialect()).params
+        assert [value for value in params.values() if value in {"A", "B", "C", "D"}] == ["A", "B", "C", "D"]
+
+    def test_refreshed_on_insert(self):
+        profile = TutorProfile(title="Math tutor", hourly_rate=50)
+        connection = MagicMock()
+        connection.dialect.name = "postgresql"
+
+        search._refresh_before_insert(None, connection, profile)
+        assert profile.search_vector is not None
+
+    def test_skipped_on_other_dialects(self):
+        profile = TutorProfile(title="Math tutor", hourly_rate=50)
+        connection = MagicMock()
+        connection.dialect.name = "sqlite"
+
+        search._refresh_before_insert(None, connection, profile)
+        assert profile.search_vector is None
+
+
+class TestFulltextEnabled:
+    def test_requires_postgres(self):
+        db = MagicMock()
+        db.get_bind.return_value.dialect.name = "sqlite"
+        assert search.fulltext_search_enabled(db) is False
+
+    def test_respects_setting(self, monkeypatch):
+        db = MagicMock()
+        db.get_bind.return_value.dialect.name = "postgresql"
+        monkeypatch.setattr(search.settings, "TUTOR_FULLTEXT_SEARCH_ENABLED", False)
+        assert search.fulltext_search_enabled(db) is False
+        monkeypatch.setattr(search.settings, "TUTOR_FULLTEXT_SEARCH_ENABLED", True)
+        assert search.fulltext_search_enabled(db) is True
+
+
+class TestPrefixTsquery:
+    def test_last_word_matches_as_prefix(self):
+        clause = search.build_prefix_tsquery("linear alg")
+        assert compile_pg(clause) == (
+            "websearch_to_tsquery(%(websearch_to_tsquery_1)s, %(websearch_to_tsquery_2)s)"
+            " && to_tsquery(%(to_tsquery_1)s, %(to_tsquery_2)s)"
+        )
+        params = clause.compile(dialect=postgresql.dialect()).params
+        assert params["websearch_to_tsquery_2"] == "linear "
+        assert params["to_tsquery_2"] == "alg:*"
+
+    def test_quoted_excluded_or_trailing_space_kept_as_is(self):
+        for term in ('"linear alg', "linear -alg", "linear alg ", "c++"):
+            assert "to_tsquery(" not in compile_pg(search.build_prefix_tsquery(term)).replace("websearch_to_tsquery", "")
+
+
+class TestMessageSearch:
+    def test_filter_pairs_each_participant_with_match(self):
+        sql = compile_pg(search.message_text_filter(7, search.build_tsquery("algebra")))
+        assert sql.count("messages.search_vector @@ websearch_to_tsquery") == 2
+        assert "messages.sender_id = " in sql
+        assert "messages.recipient_id = " in sql
+
+    def test_rank_is_double_precision(self):
+        sql = compile_pg(search.message_search_rank(search.build_tsquery("algebra")))
+        assert sql.startswith("CAST(ts_rank_cd(messages.search_vector")
+        assert sql.endswith("AS FLOAT)")
+
+    def test_vector_refreshed_on_insert(self):
+        connection = MagicMock()
+        connection.dialect.name = "postgresql"
+        message = Message(message="Hello")
+
+        search._refresh_message_before_insert(None, connection, message)
+        assert message.search_vector is not None
+
+    def test_snippet_escapes_everything_but_highlights(self):
+        snippet = "see <mark>algebra</mark> & <script>x</script> ... <mark>notes</mark>"
+        assert search.render_snippet(snippet) == (
+            "see <mark>algebra</mark> &amp; &lt;script&gt;x&lt;/script&gt; ... <mark>notes</mark>"
+        )
+        assert search.render_snippet(None) is None
+
+    def test_respects_setting(self, monkeypatch):
+        db = MagicMock()
+        db.get_bind.return_value.dialect.name = "postgresql"
+        monkeypatch.setattr(search.settings, "MESSAGE_FULLTEXT_SEARCH_ENABLED", False)
+        assert search.message_fulltext_search_enabled(db) is False
+        monkeypatch.setattr(search.settings, "MESSAGE_FULLTEXT_SEARCH_ENABLED", True)
+        assert search.message_fulltext_search_enabled(db) is True
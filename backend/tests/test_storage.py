@@ -1,10 +1,15 @@
 """Tests for core storage image processing."""
 
 from io import BytesIO
+from unittest.mock import MagicMock
 
+import pytest
+from fastapi import UploadFile
 from PIL import Image
+from starlette.datastructures import Headers
 
 from core import storage
+from core.image_processing import MAX_IMAGE_DIMENSION, MIN_IMAGE_DIMENSION, RENDITION_SIZES
 
 
 def _make_image_bytes(size: tuple[int, int], *, format: str = "PNG") -> bytes:
@@ -21,8 +26,8 @@ def test_process_image_upscales_small_assets():
     with Image.open(BytesIO(processed)) as image:
         width, height = image.size
 
-    assert width >= storage.MIN_IMAGE_DIMENSION
-    assert height >= storage.MIN_IMAGE_DIMENSION
+    assert width >= MIN_IMAGE_DIMENSION
+    assert height >= MIN_IMAGE_DIMENSION
     assert content_type == "image/png"
     assert extension == "png"
 
@@ -35,7 +40,32 @@ def test_process_image_downscales_large_assets():
     with Image.open(BytesIO(processed)) as image:
         width, height = image.size
 
-    assert width <= storage.MAX_IMAGE_DIMENSION
-    assert height <= storage.MAX_IMAGE_DIMENSION
+    assert width <= MAX_IMAGE_DIMENSION
+    assert height <= MAX_IMAGE_DIMENSION
     assert content_type == "image/jpeg"
     assert extension == "jpg"
+
+
+@pytest.mark.asyncio
+async def test_store_profile_photo_writes_renditions_before_original(monkeypatch):
+    """Renditions are stored next to the original, which is written last and returned."""
+    client = MagicMock()
+    monkeypatch.setattr(storage, "_s3_client", lambda: client)
+    monkeypatch.setattr(storage, "_ensure_bucket_exists", lambda: None)
+    upload = UploadFile(
+        file=BytesIO(_make_image_bytes((800, 600), format="JPEG")),
+        filename="me.jpg",
+        headers=Headers({"content-type": "image/jpeg"}),
+    )
+
+    url = await storage.store_profile_photo(7, upload)
+
+    keys = [call.kwargs["Key"] for call in client.put_object.call_args_list]
+    prefix = keys[-1].rsplit("/", 1)[0]
+    assert prefix.startswith("tutor_profiles/7/photo/")
+    assert keys == [f"{prefix}/{size}.webp" for size in RENDITION_SIZES] + [f"{prefix}/original.jpg"]
+    assert url == storage._public_url_for_key(f"{prefix}/original.jpg")
+
+    storage.delete_file(url)
+
+    assert [call.kwargs["Key"] for call in client.delete_object.call_args_list] == [keys[-1], *keys[:-1]]
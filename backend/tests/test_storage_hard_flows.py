@@ -29,12 +29,14 @@ import pytest
 from botocore.exceptions import ClientError, ConnectTimeoutError, ReadTimeoutError
 from fastapi import HTTPException, UploadFile
 from PIL import Image
+from starlette.datastructures import Headers
 
 from core.avatar_storage import (
     AvatarStorageClient,
     build_avatar_url,
     get_avatar_storage,
 )
+from core.image_processing import MAX_IMAGE_DIMENSION, MIN_IMAGE_DIMENSION
 from core.message_storage import (
     ALLOWED_DOCUMENT_TYPES,
     ALLOWED_IMAGE_TYPES,
@@ -53,9 +55,7 @@ from core.storage import (
     DOCUMENT_CONTENT_TYPES,
     IMAGE_CONTENT_TYPES,
     MAX_DOCUMENT_SIZE_BYTES,
-    MAX_IMAGE_DIMENSION,
     MAX_IMAGE_SIZE_BYTES,
-    MIN_IMAGE_DIMENSION,
     _build_object_key,
     _ensure_bucket_exists,
     _extract_key_from_url,
@@ -94,12 +94,13 @@ def create_upload_file(
     filename: str = "test.txt",
     content_type: str = "text/plain",
 ) -> UploadFile:
-    """Helper to create mock UploadFile."""
-    upload = MagicMock(spec=UploadFile)
-    upload.filename = filename
-    upload.content_type = content_type
-    upload.read = AsyncMock(return_value=content)
-    return upload
+    """Helper to create an UploadFile backed by in-memory content."""
+    return UploadFile(
+        file=BytesIO(content),
+        size=len(content),
+        filename=filename,
+        headers=Headers({"content-type": content_type}),
+    )
 
 
 def create_large_file(size_mb: int) -> bytes:
@@ -156,6 +157,8 @@ def mock_settings():
         mock.MESSAGE_ATTACHMENT_MAX_FILE_SIZE = 10 * 1024 * 1024
         mock.MESSAGE_ATTACHMENT_MAX_IMAGE_SIZE = 5 * 1024 * 1024
         mock.MESSAGE_ATTACHMENT_URL_TTL_SECONDS = 3600
+        mock.MESSAGE_ATTACHMENT_UPLOAD_PART_SIZE = 5 * 1024 * 1024
+        mock.MESSAGE_ATTACHMENT_UPLOAD_WORKERS = 4
         yield mock
 
 
@@ -0,0 +1,145 @@
+"""
+Tests for the Stripe webhook inbox.
+
+POST /payments/webhook stores verified events in ``webhook_events``;
+modules/payments/infrastructure/webhook_inbox.py handles them one at a time
+per payment intent, retries failures with backoff and dead-letters events
+that keep failing until an admin replays them.
+"""
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import database
+from core.config import settings
+from models import WebhookEvent
+from modules.payments.infrastructure.webhook_inbox import (
+    partition_key,
+    process_pending_events,
+    record_event,
+    replay_events,
+    retry_delay,
+)
+
+
+def _event(event_id: str, event_type: str, data: dict, created: int | None = None):
+    return SimpleNamespace(id=event_id, type=event_type, created=created, data=SimpleNamespace(object=data))
+
+
+def _rows(db_session):
+    db_session.expire_all()
+    return {row.stripe_event_id: row for row in db_session.query(WebhookEvent).all()}
+
+
+class _Handler:
+    """Records the events it is given; fails for event types in ``failing``."""
+
+    def __init__(self, failing: set[str] = frozenset()):
+        self.failing = failing
+        self.calls: list[tuple[str, str]] = []
+
+    async def __call__(self, db, event_type: str, data: dict) -> None:
+        self.calls.append((event_type, data["id"]))
+        if event_type in self.failing:
+            raise RuntimeError(f"{event_type} failed")
+
+
+def _process(handler) -> dict[str, int]:
+    return process_pending_events(database.SessionLocal, handler)
+
+
+class TestPartitionKey:
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"id": "cs_1", "payment_intent": "pi_1"},  # checkout.session
+            {"id": "ch_1", "payment_intent": "pi_1"},  # charge
+            {"id": "pi_1"},  # payment_intent
+        ],
+    )
+    def test_events_of_one_payment_share_a_partition(self, data):
+        assert partition_key(data, "evt_1") == "pi_1"
+
+    def test_objects_without_a_payment_intent_use_their_id(self):
+        assert partition_key({"id": "acct_1", "payment_intent": None}, "evt_1") == "acct_1"
+        assert partition_key({}, "evt_1") == "evt_1"
+
+
+class TestRetryDelay:
+    def test_doubles_up_to_the_cap(self):
+        assert [retry_delay(n).total_seconds() for n in (1, 2, 3)] == [60, 120, 240]
+        assert retry_delay(20) == timedelta(hours=1)
+
+
+class TestRecordEvent:
+    def test_redelivered_event_is_stored_once(self, db_session):
+        event = _event("evt_once", "charge.refunded", {"id": "ch_1", "payment_intent": "pi_1"}, created=1_700_000_000)
+
+        assert record_event(db_session, event) is not None
+        assert record_event(db_session, event) is None
+
+        row = _rows(db_session)["evt_once"]
+        assert (row.status, row.partition_key, row.payload["id"]) == ("pending", "pi_1", "ch_1")
+        assert row.stripe_created_at == datetime.fromtimestamp(1_700_000_000, UTC)
+
+
+class TestProcessing:
+    def test_partition_is_handled_in_stripe_creation_order(self, db_session):
+        # Delivered out of order: the payment intent event arrives first
+        record_event(db_session, _event("evt_pi", "payment_intent.succeeded", {"id": "pi_1"}, created=200))
+        record_event(
+            db_session,
+            _event("evt_cs", "checkout.session.completed", {"id": "cs_1", "payment_intent": "pi_1"}, created=100),
+        )
+        handler = _Handler()
+
+        assert _process(handler) == {"processed": 2, "retried": 0, "dead": 0}
+
+        assert handler.calls == [("checkout.session.completed", "cs_1"), ("payment_intent.succeeded", "pi_1")]
+        assert {row.status for row in _rows(db_session).values()} == {"processed"}
+
+    def test_failure_holds_back_its_partition_only(self, db_session):
+        record_event(
+            db_session,
+            _event("evt_a1", "checkout.session.completed", {"id": "cs_a", "payment_intent": "pi_a"}, created=100),
+        )
+        record_event(db_session, _event("evt_a2", "payment_intent.succeeded", {"id": "pi_a"}, created=200))
+        record_event(db_session, _event("evt_b", "payment_intent.succeeded", {"id": "pi_b"}, created=150))
+        handler = _Handler(failing={"checkout.session.completed"})
+
+        assert _process(handler) == {"processed": 1, "retried": 1, "dead": 0}
+
+        rows = _rows(db_session)
+        assert rows["evt_b"].status == "processed"
+        assert rows["evt_a2"].status == "pending"
+        failed = rows["evt_a1"]
+        assert (failed.status, failed.attempts) == ("pending", 1)
+        assert failed.last_error == "RuntimeError: checkout.session.completed failed"
+        assert failed.next_attempt_at > datetime.now(UTC) + timedelta(seconds=50)
+
+    def test_processed_mark_commits_with_the_handler(self, db_session):
+        record_event(db_session, _event("evt_commit", "charge.refunded", {"id": "ch_1"}))
+
+        async def commits_then_fails(db, event_type, data):
+            db.commit()
+            raise RuntimeError("after commit")
+
+        _process(commits_then_fails)
+
+        # The handler's changes are committed, so the event must not run again
+        assert _rows(db_session)["evt_commit"].status == "processed"
+
+    def test_dead_lettered_event_can_be_replayed(self, db_session, monkeypatch):
+        monkeypatch.setattr(settings, "STRIPE_WEBHOOK_MAX_ATTEMPTS", 1)
+        record_event(db_session, _event("evt_dead", "charge.refunded", {"id": "ch_1"}))
+
+        assert _process(_Handler(failing={"charge.refunded"}))["dead"] == 1
+        assert _rows(db_session)["evt_dead"].status == "dead"
+
+        assert replay_events(db_session) == 1
+        assert _process(_Handler())["processed"] == 1
+
+        row = _rows(db_session)["evt_dead"]
+        assert (row.status, row.attempts, row.last_error) == ("processed", 1, None)
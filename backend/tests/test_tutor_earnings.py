@@ -0,0 +1,141 @@
+"""
+Tests for tutors' running lifetime earnings (core/tutor_earnings.py).
+
+tutor_profiles.lifetime_earnings_cents follows the earnings of the tutor's
+ENDED/COMPLETED bookings as they are flushed, feeds the commission tier in
+core/currency.py and is repaired by reconcile_lifetime_earnings.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from core.currency import get_dynamic_platform_fee, get_tutor_lifetime_earnings
+from core.tutor_earnings import counts_toward_tier, reconcile_lifetime_earnings
+from models import Booking, TutorProfile
+from modules.admin.owner.router import _calculate_commission_tiers
+
+
+@pytest.fixture
+def make_booking(db_session, tutor_user, student_user, test_subject):
+    """Factory for bookings of the test tutor in a given state."""
+
+    def _make(session_state: str, session_outcome: str | None = None, earnings: int = 4000) -> Booking:
+        start_time = datetime.now(UTC) - timedelta(days=2)
+        booking = Booking(
+            tutor_profile_id=tutor_user.tutor_profile.id,
+            student_id=student_user.id,
+            subject_id=test_subject.id,
+            start_time=start_time,
+            end_time=start_time + timedelta(hours=1),
+            hourly_rate=50.00,
+            total_amount=50.00,
+            currency="USD",
+            session_state=session_state,
+            session_outcome=session_outcome,
+            tutor_earnings_cents=earnings,
+        )
+        db_session.add(booking)
+        db_session.commit()
+        return booking
+
+    return _make
+
+
+def _lifetime(db_session, tutor_user) -> int:
+    db_session.expire_all()
+    return tutor_user.tutor_profile.lifetime_earnings_cents
+
+
+class TestCountsTowardTier:
+    def test_only_completed_sessions_count(self):
+        assert counts_toward_tier("ENDED", "COMPLETED")
+        assert not counts_toward_tier("ENDED", "NO_SHOW_STUDENT")
+        assert not counts_toward_tier("ACTIVE", None)
+
+
+class TestRunningTotal:
+    def test_session_ending_completed_adds_its_earnings(self, db_session, tutor_user, make_booking):
+        booking = make_booking("ACTIVE")
+        assert _lifetime(db_session, tutor_user) == 0
+
+        booking.session_state = "ENDED"
+        booking.session_outcome = "COMPLETED"
+        db_session.commit()
+
+        assert _lifetime(db_session, tutor_user) == 4000
+        assert get_tutor_lifetime_earnings(db_session, tutor_user.tutor_profile.id) == 4000
+
+    def test_outcome_correction_and_delete_subtract(self, db_session, tutor_user, make_booking):
+        corrected = make_booking("ENDED", "COMPLETED")
+        deleted = make_booking("ENDED", "COMPLETED", earnings=1500)
+        assert _lifetime(db_session, tutor_user) == 5500
+
+        # Loaded fresh, so the previous outcome has to be fetched on assignment
+        db_session.expire_all()
+        corrected.session_outcome = "NO_SHOW_TUTOR"
+        db_session.delete(deleted)
+        db_session.commit()
+
+        assert _lifetime(db_session, tutor_user) == 0
+
+    def test_earnings_change_on_a_completed_booking(self, db_session, tutor_user, make_booking):
+        booking = make_booking("ENDED", "COMPLETED")
+
+        booking.tutor_earnings_cents = 4500
+        db_session.commit()
+
+        assert _lifetime(db_session, tutor_user) == 4500
+
+    def test_rolled_back_change_leaves_total_alone(self, db_session, tutor_user, make_booking):
+        booking = make_booking("ACTIVE")
+
+        booking.session_state = "ENDED"
+        booking.session_outcome = "COMPLETED"
+        db_session.flush()
+        db_session.rollback()
+
+        assert _lifetime(db_session, tutor_user) == 0
+
+
+class TestTierLookup:
+    def test_fee_uses_running_total(self, db_session, tutor_user):
+        profile_id = tutor_user.tutor_profile.id
+        db_session.execute(
+            update(TutorProfile).where(TutorProfile.id == profile_id).values(lifetime_earnings_cents=500_000)
+        )
+        db_session.commit()
+
+        fee_pct, tier_name, lifetime = get_dynamic_platform_fee(db_session, profile_id)
+
+        assert (fee_pct, tier_name, lifetime) == (10, "Gold", 500_000)
+
+    def test_owner_breakdown_counts_approved_tutors_by_tier(self, db_session, tutor_user):
+        db_session.execute(
+            update(TutorProfile)
+            .where(TutorProfile.id == tutor_user.tutor_profile.id)
+            .values(is_approved=True, lifetime_earnings_cents=100_000)
+        )
+        db_session.commit()
+
+        breakdown = _calculate_commission_tiers(db_session)
+
+        assert (breakdown.silver_tutors, breakdown.gold_tutors) == (1, 0)
+        assert breakdown.total_tutors == breakdown.standard_tutors + 1
+
+
+class TestReconcile:
+    def test_repairs_drifted_totals_only(self, db_session, tutor_user, make_booking):
+        make_booking("ENDED", "COMPLETED")
+        assert reconcile_lifetime_earnings(db_session) == 0
+
+        db_session.execute(
+            update(TutorProfile)
+            .where(TutorProfile.id == tutor_user.tutor_profile.id)
+            .values(lifetime_earnings_cents=123)
+        )
+        db_session.commit()
+
+        assert reconcile_lifetime_earnings(db_session) == 1
+        assert _lifetime(db_session, tutor_user) == 4000
@@ -0,0 +1,106 @@
+"""
+Tests for tutor profile loader strategies.
+
+Public listings load a slim card (subjects and education) with selectinload;
+get_by_id keeps loading the full aggregate.
+"""
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from core.pagination import PaginationParams
+from models import TutorCertification, TutorEducation, TutorPricingOption
+from modules.tutor_profile.domain.repositories import TutorListingFilter
+from modules.tutor_profile.infrastructure.repositories import SqlAlchemyTutorProfileRepository
+
+
+@pytest.fixture
+def populated_tutor(db_session, tutor_user):
+    """Approved tutor with several rows in every profile collection."""
+    profile = tutor_user.tutor_profile
+    for i in range(3):
+        db_session.add(TutorCertification(tutor_profile_id=profile.id, name=f"Certificate {i}"))
+    for i in range(2):
+        db_session.add(
+            TutorEducation(
+                tutor_profile_id=profile.id,
+                institution=f"University {i}",
+                degree="MSc",
+                field_of_study="Mathematics",
+            )
+        )
+        db_session.add(
+            TutorPricingOption(
+                tutor_profile_id=profile.id,
+                title=f"Option {i}",
+                duration_minutes=60,
+                price=Decimal("40.00"),
+            )
+        )
+    db_session.commit()
+    db_session.expire_all()
+    return profile
+
+
+@pytest.fixture
+def captured_sql(db_session):
+    """Collect SQL statements executed on the test session's engine."""
+    statements: list[str] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _capture)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _capture)
+
+
+def _list_public(db_session):
+    repo = SqlAlchemyTutorProfileRepository()
+    aggregates, total, _ = repo.list_public(
+        db_session, TutorListingFilter(), PaginationParams(page=1, page_size=20)
+    )
+    return aggregates, total
+
+
+class TestListingLoader:
+    def test_listing_loads_card_fields_only(self, db_session, populated_tutor):
+        aggregates, _ = _list_public(db_session)
+
+        card = next(agg for agg in aggregates if agg.id == populated_tutor.id)
+        assert len(card.educations) == 2
+        assert card.certifications == []
+        assert card.availabilities == []
+        assert card.pricing_options == []
+
+    def test_listing_does_not_touch_unused_collections(self, db_session, populated_tutor, captured_sql):
+        _list_public(db_session)
+
+        sql = "\n".join(captured_sql).lower()
+        assert "tutor_certifications" not in sql
+        assert "tutor_pricing_options" not in sql
+        assert "tutor_availabilities" not in sql
+
+    def test_listing_page_query_is_not_wrapped_for_collections(self, db_session, populated_tutor, captured_sql):
+        _list_public(db_session)
+
+        page_query = next(
+            stmt for stmt in captured_sql if "limit" in stmt.lower() and "tutor_profiles" in stmt.lower()
+        )
+        assert "tutor_education" not in page_query.lower()
+        assert "tutor_subjects" not in page_query.lower().split("where")[0]
+
+
+class TestDetailLoader:
+    def test_get_by_id_keeps_full_aggregate(self, db_session, populated_tutor):
+        repo = SqlAlchemyTutorProfileRepository()
+
+        aggregate = repo.get_by_id(db_session, populated_tutor.id)
+
+        assert len(aggregate.certifications) == 3
+        assert len(aggregate.educations) == 2
+        assert len(aggregate.pricing_options) == 2
+        assert len(aggregate.availabilities) == 7
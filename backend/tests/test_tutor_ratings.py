@@ -0,0 +1,123 @@
+"""
+Tests for tutors' incremental rating aggregates (core/tutor_ratings.py).
+
+Reviews written through ReviewRepositoryImpl move the rating sum, count,
+average and star histogram on tutor_profiles; the repository's summaries read
+them back, and rebuild_rating_aggregates repairs drift.
+"""
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import update
+
+from core.tutor_ratings import average_rating, rebuild_rating_aggregates
+from models import Booking, TutorProfile
+from modules.reviews.domain.entities import ReviewEntity
+from modules.reviews.domain.value_objects import BookingId, StudentId, TutorProfileId
+from modules.reviews.infrastructure import ReviewRepositoryImpl
+
+
+@pytest.fixture
+def repository(db_session):
+    return ReviewRepositoryImpl(db_session)
+
+
+@pytest.fixture
+def post_review(db_session, repository, tutor_user, student_user, test_subject):
+    """Create a review with the given rating, on a fresh completed booking."""
+
+    def _post(rating: int) -> ReviewEntity:
+        start_time = datetime.now(UTC) - timedelta(days=1)
+        booking = Booking(
+            tutor_profile_id=tutor_user.tutor_profile.id,
+            student_id=student_user.id,
+            subject_id=test_subject.id,
+            start_time=start_time,
+            end_time=start_time + timedelta(hours=1),
+            hourly_rate=50.00,
+            total_amount=50.00,
+            currency="USD",
+            session_state="ENDED",
+            session_outcome="COMPLETED",
+        )
+        db_session.add(booking)
+        db_session.commit()
+        return repository.create(
+            ReviewEntity(
+                id=None,
+                booking_id=BookingId(booking.id),
+                student_id=StudentId(student_user.id),
+                tutor_id=tutor_user.id,
+                tutor_profile_id=TutorProfileId(tutor_user.tutor_profile.id),
+                rating=rating,
+            )
+        )
+
+    return _post
+
+
+def _stored(db_session, tutor_user) -> tuple:
+    """(rating_sum, total_reviews, average_rating, [1-star .. 5-star counts]) as stored."""
+    db_session.expire_all()
+    profile = tutor_user.tutor_profile
+    histogram = [getattr(profile, f"rating_{value}_count") for value in range(1, 6)]
+    return profile.rating_sum, profile.total_reviews, profile.average_rating, histogram
+
+
+@pytest.mark.parametrize(
+    ("rating_sum", "total_reviews", "expected"),
+    [(10, 3, Decimal("3.33")), (9, 2, Decimal("4.50")), (0, 0, Decimal("0.00"))],
+)
+def test_average_rating(rating_sum, total_reviews, expected):
+    assert average_rating(rating_sum, total_reviews) == expected
+
+
+class TestReviewWrites:
+    def test_create_edit_and_delete_adjust_the_aggregates(self, db_session, repository, tutor_user, post_review):
+        post_review(5)
+        edited = post_review(2)
+        deleted = post_review(4)
+        assert _stored(db_session, tutor_user) == (11, 3, Decimal("3.67"), [0, 1, 0, 1, 1])
+
+        edited.rating = 3
+        repository.update(edited)
+        assert _stored(db_session, tutor_user) == (12, 3, Decimal("4.00"), [0, 0, 1, 1, 1])
+
+        assert repository.delete(deleted.id) is True
+        assert _stored(db_session, tutor_user) == (8, 2, Decimal("4.00"), [0, 0, 1, 0, 1])
+
+    def test_review_refreshes_profile_updated_at(self, db_session, tutor_user, post_review):
+        before = datetime.now(UTC)
+        post_review(5)
+
+        db_session.expire_all()
+        assert tutor_user.tutor_profile.updated_at >= before
+
+    def test_summary_and_average_read_the_stored_aggregates(self, repository, tutor_user, post_review):
+        tutor_profile_id = TutorProfileId(tutor_user.tutor_profile.id)
+        assert repository.get_summary(tutor_profile_id).total_reviews == 0
+
+        post_review(5)
+        post_review(1)
+
+        summary = repository.get_summary(tutor_profile_id)
+        assert (summary.total_reviews, summary.average_rating) == (2, 3.0)
+        assert (summary.five_star_count, summary.one_star_count) == (1, 1)
+        assert repository.calculate_average_rating(tutor_profile_id) == (Decimal("3.00"), 2)
+
+
+class TestRebuild:
+    def test_only_drifted_tutors_are_rebuilt(self, db_session, tutor_user, post_review):
+        post_review(4)
+        assert rebuild_rating_aggregates(db_session) == 0
+
+        # A stale average alone counts as drift
+        db_session.execute(
+            update(TutorProfile).where(TutorProfile.id == tutor_user.tutor_profile.id).values(average_rating=1)
+        )
+        db_session.commit()
+
+        assert rebuild_rating_aggregates(db_session) == 1
+        assert _stored(db_session, tutor_user) == (4, 1, Decimal("4.00"), [0, 0, 0, 1, 0])
@@ -0,0 +1,176 @@
+"""
+Tests for WebSocket cluster mode (modules/messages/websocket_cluster.py).
+
+Each WebSocketManager stands in for one uvicorn worker; they share a fakeredis
+server the way workers share Redis.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import WebSocket
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from modules.messages.websocket import WebSocketManager
+from modules.messages.websocket_cluster import PRESENCE_KEY_PREFIX, WebSocketCluster
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+def _mock_websocket():
+    ws = AsyncMock(spec=WebSocket)
+    ws.accept = AsyncMock()
+    ws.send_json = AsyncMock()
+    ws.send_text = AsyncMock()
+    ws.close = AsyncMock()
+    return ws
+
+
+@asynccontextmanager
+async def _workers(redis_server, count=2, presence_ttl=30):
+    """Managers joined through one Redis server; shut down on exit."""
+    managers = [
+        WebSocketManager(
+            cluster=WebSocketCluster(
+                client=fakeredis.aioredis.FakeRedis(server=redis_server, decode_responses=True),
+                presence_ttl=presence_ttl,
+            )
+        )
+        for _ in range(count)
+    ]
+    try:
+        yield managers
+    finally:
+        for manager in managers:
+            await manager.shutdown()
+
+
+async def _eventually(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        await asyncio.sleep(0.01)
+    return predicate()
+
+
+class TestCrossWorkerDelivery:
+    @pytest.mark.asyncio
+    async def test_message_reaches_user_on_other_worker(self, redis_server):
+        async with _workers(redis_server) as (worker_a, worker_b):
+            ws = _mock_websocket()
+            await worker_a.connect(ws, user_id=1)
+
+            sent = await worker_b.send_personal_message({"type": "new_message", "message_id": 7}, 1)
+
+            assert sent is True
+            assert await _eventually(lambda: ws.send_json.await_count == 1)
+            ws.send_json.assert_awaited_with({"type": "new_message", "message_id": 7})
+
+    @pytest.mark.asyncio
+    async def test_local_delivery_is_not_duplicated(self, redis_server):
+        async with _workers(redis_server) as (worker_a, worker_b):
+            ws = _mock_websocket()
+            await worker_a.connect(ws, user_id=1)
+            await worker_b.connect(_mock_websocket(), user_id=2)
+
+            sent = await worker_a.send_personal_message({"type": "typing", "user_id": 3}, 1)
+            await asyncio.sleep(0.1)
+
+            assert sent is True
+            assert ws.send_json.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_offline_user_is_reported_undelivered(self, redis_server):
+        async with _workers(redis_server) as (worker_a, worker_b):
+            await worker_a.connect(_mock_websocket(), user_id=1)
+
+            assert await worker_b.send_personal_message({"type": "typing"}, 99) is False
+
+    @pytest.mark.asyncio
+    async def test_user_channel_dropped_after_last_disconnect(self, redis_server):
+        async with _workers(redis_server) as (worker_a, worker_b):
+            ws = _mock_websocket()
+            await worker_a.connect(ws, user_id=1)
+            await worker_a.disconnect(ws, user_id=1)
+
+            assert await worker_b.send_personal_message({"type": "typing"}, 1) is False
+
+    @pytest.mark.asyncio
+    async def test_broadcast_reaches_every_worker_once(self, redis_server):
+        async with _workers(redis_server, count=3) as workers:
+            sockets = [_mock_websocket() for _ in workers]
+            for user_id, (worker, ws) in enumerate(zip(workers, sockets, strict=True), start=1):
+                await worker.connect(ws, user_id)
+
+            await workers[0].broadcast_to_all({"type": "slot_update"})
+
+            assert await _eventually(lambda: all(ws.send_text.await_count == 1 for ws in sockets))
+            await asyncio.sleep(0.1)
+            assert [ws.send_text.await_count for ws in sockets] == [1, 1, 1]
+
+
+class TestClusterPresence:
+    @pytest.mark.asyncio
+    async def test_presence_is_visible_from_other_workers(self, redis_server):
+        async with _workers(redis_server) as (worker_a, worker_b):
+            ws = _mock_websocket()
+            await worker_a.connect(ws, user_id=1)
+
+            assert await worker_b.fetch_online_users([1, 2]) == [1]
+            assert worker_b.is_user_online(1) is False  # Local view only
+
+            await worker_a.disconnect(ws, user_id=1)
+            assert await worker_b.fetch_online_users([1, 2]) == []
+
+    @pytest.mark.asyncio
+    async def test_expired_presence_of_crashed_worker_is_ignored(self, redis_server):
+        async with _workers(redis_server, count=1) as (worker_a,):
+            await worker_a.connect(_mock_websocket(), user_id=1)
+            client = fakeredis.aioredis.FakeRedis(server=redis_server, decode_responses=True)
+            await client.hset(f"{PRESENCE_KEY_PREFIX}2", "dead-worker", time.time() - 1)
+
+            assert await worker_a.fetch_online_users([1, 2]) == [1]
+
+    @pytest.mark.asyncio
+    async def test_shutdown_withdraws_presence(self, redis_server):
+        async with _workers(redis_server) as (worker_a, worker_b):
+            await worker_a.connect(_mock_websocket(), user_id=1)
+            await worker_a.shutdown()
+
+            assert await worker_b.fetch_online_users([1]) == []
+
+
+class TestRedisFailures:
+    @pytest.mark.asyncio
+    async def test_publish_error_falls_back_to_local_delivery(self, redis_server):
+        async with _workers(redis_server, count=1) as (worker,):
+            ws = _mock_websocket()
+            await worker.connect(ws, user_id=1)
+            worker.cluster._redis.publish = AsyncMock(side_effect=RedisConnectionError("down"))
+
+            assert await worker.send_personal_message({"type": "typing"}, 1) is True
+            ws.send_json.assert_awaited_once()
+            assert worker.get_stats()["cluster"]["publish_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unreachable_redis_keeps_manager_local(self):
+        cluster = WebSocketCluster(redis_url="redis://127.0.0.1:1/0")
+        manager = WebSocketManager(cluster=cluster)
+        ws = _mock_websocket()
+        try:
+            await manager.connect(ws, user_id=1)
+
+            assert cluster.is_running is False
+            assert await manager.send_personal_message({"type": "typing"}, 1) is True
+            assert await manager.fetch_online_users([1, 2]) == [1]
+        finally:
+            await manager.shutdown()
@@ -1455,9 +1455,9 @@ class TestBroadcastScenarios:
             await ws_manager.connect(ws, user_id)
             connections[user_id] = ws
 
-        # Make some fail
-        connections[2].send_json.side_effect = RuntimeError("Failed")
-        connections[4].send_json.side_effect = RuntimeError("Failed")
+        # Make some fail (broadcasts send pre-serialized text)
+        connections[2].send_text.side_effect = RuntimeError("Failed")
+        connections[4].send_text.side_effect = RuntimeError("Failed")
 
         message = {"type": "test", "content": "Hello"}
         count = await ws_manager.broadcast_to_users(message, user_ids)
@@ -0,0 +1,190 @@
+"""
+Tests for non-blocking WebSocket fan-out (modules/messages/websocket_outbound.py).
+
+Covers concurrent broadcast writes, direct replies, send timeouts, bounded
+send queues with drop/disconnect backpressure and the delivery stats.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import WebSocket
+
+from modules.messages.websocket import WebSocketManager
+from modules.messages.websocket_outbound import Histogram
+
+
+def _mock_websocket(send=None):
+    ws = AsyncMock(spec=WebSocket)
+    ws.accept = AsyncMock()
+    ws.send_json = AsyncMock(side_effect=send)
+    ws.send_text = AsyncMock(side_effect=send)
+    ws.close = AsyncMock()
+    return ws
+
+
+@pytest.fixture
+def ws_manager():
+    manager = WebSocketManager()
+    manager.send_timeout = 0.2
+    return manager
+
+
+async def _blocked(payload):
+    await asyncio.Event().wait()
+
+
+async def _slow(payload):
+    await asyncio.sleep(0.01)
+
+
+class TestConcurrentBroadcast:
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_delay_others(self, ws_manager):
+        slow = _mock_websocket(send=_blocked)
+        fast = [_mock_websocket() for _ in range(5)]
+        await ws_manager.connect(slow, 1)
+        for user_id, ws in enumerate(fast, start=2):
+            await ws_manager.connect(ws, user_id)
+
+        started = time.perf_counter()
+        count = await ws_manager.broadcast_to_all({"type": "announcement"})
+
+        assert time.perf_counter() - started < 1.0
+        assert count == 5
+        for ws in fast:
+            ws.send_text.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_payload_is_serialized_once(self, ws_manager):
+        sockets = [_mock_websocket() for _ in range(3)]
+        for user_id, ws in enumerate(sockets, start=1):
+            await ws_manager.connect(ws, user_id)
+
+        await ws_manager.broadcast_to_users({"type": "slot_update", "tutor": "Zoë"}, [1, 2, 3])
+
+        payloads = [ws.send_text.await_args[0][0] for ws in sockets]
+        assert payloads[0] == '{"type":"slot_update","tutor":"Zoë"}'
+        assert all(payload is payloads[0] for payload in payloads)
+
+    @pytest.mark.asyncio
+    async def test_sends_in_flight_are_bounded(self, ws_manager):
+        ws_manager._send_slots = asyncio.Semaphore(2)
+        in_flight = 0
+        peak = 0
+
+        async def send(payload):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        for user_id in range(1, 11):
+            await ws_manager.connect(_mock_websocket(send=send), user_id)
+        ws_manager.send_timeout = 1.0
+
+        assert await ws_manager.broadcast_to_all({"type": "ping"}) == 10
+        assert peak == 2
+
+
+class TestSendTimeouts:
+    @pytest.mark.asyncio
+    async def test_timed_out_write_disconnects_connection(self, ws_manager):
+        ws = _mock_websocket(send=_blocked)
+        await ws_manager.connect(ws, 1)
+
+        assert await ws_manager.send_personal_message({"type": "typing"}, 1) is False
+        # The writer gives up on the stuck socket and the next send cleans it up
+        await asyncio.sleep(0.1)
+        assert await ws_manager.send_personal_message({"type": "typing"}, 1) is False
+
+        assert not ws_manager.is_user_online(1)
+        assert ws_manager.get_stats()["send_timeouts"] >= 1
+
+
+class TestReplies:
+    @pytest.mark.asyncio
+    async def test_reply_is_written_after_queued_messages(self, ws_manager):
+        written = []
+
+        async def send(payload):
+            await asyncio.sleep(0.01)
+            written.append(payload)
+
+        ws = _mock_websocket(send=send)
+        await ws_manager.connect(ws, 1)
+
+        await asyncio.gather(
+            ws_manager.broadcast_to_users({"type": "slot_update"}, [1]),
+            ws_manager.reply(ws, 1, {"type": "pong"}),
+        )
+
+        assert written == ['{"type":"slot_update"}', {"type": "pong"}]
+
+    @pytest.mark.asyncio
+    async def test_reply_on_disconnected_socket_raises(self, ws_manager):
+        ws = _mock_websocket()
+        await ws_manager.connect(ws, 1)
+        await ws_manager.disconnect(ws, 1)
+
+        with pytest.raises(RuntimeError):
+            await ws_manager.reply(ws, 1, {"type": "pong"})
+        ws.send_json.assert_not_awaited()
+
+
+class TestBackpressure:
+    @pytest.mark.asyncio
+    async def test_drop_policy_keeps_slow_client_connected(self, ws_manager):
+        ws_manager.backpressure_policy = "drop"
+        ws_manager.send_queue_size = 1
+        ws = _mock_websocket(send=_slow)
+        await ws_manager.connect(ws, 1)
+
+        # Queued together, before the writer drains anything
+        results = await asyncio.gather(
+            *(ws_manager.send_personal_message({"type": "typing", "n": n}, 1) for n in range(3))
+        )
+
+        assert results == [True, False, False]
+        assert ws_manager.is_user_online(1)
+        assert ws_manager.get_stats()["dropped_messages"] == 2
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy_closes_slow_client(self, ws_manager):
+        ws_manager.backpressure_policy = "disconnect"
+        other = _mock_websocket()
+        await ws_manager.connect(other, 2)
+        ws_manager.send_queue_size = 1
+        slow = _mock_websocket(send=_slow)
+        await ws_manager.connect(slow, 1)
+
+        await asyncio.gather(*(ws_manager.broadcast_to_all({"type": "announcement"}) for _ in range(3)))
+
+        assert not ws_manager.is_user_online(1)
+        slow.close.assert_awaited_with(code=1013, reason="Send queue full")
+        assert other.send_text.await_count == 3
+        assert ws_manager.get_stats()["backpressure_disconnects"] == 1
+
+
+class TestDeliveryStats:
+    @pytest.mark.asyncio
+    async def test_stats_expose_histograms(self, ws_manager):
+        await ws_manager.connect(_mock_websocket(), 1)
+        await ws_manager.send_personal_message({"type": "typing"}, 1)
+
+        stats = ws_manager.get_stats()
+
+        assert stats["send_latency_ms"]["count"] == 1
+        assert stats["queue_depth"]["count"] == 1
+        assert stats["max_queue_depth"] == 0
+
+    def test_histogram_buckets_by_upper_bound(self):
+        histogram = Histogram((1, 10))
+        for value in (0.5, 1, 5, 50):
+            histogram.observe(value)
+
+        assert histogram.as_dict()["buckets"] == {"le_1": 2, "le_10": 1, "inf": 1}
+        assert histogram.as_dict()["count"] == 4
@@ -0,0 +1,49 @@
+-- Migration 046: Trigram name matching and search_vector backfill for tutor search
+-- Purpose: Let public tutor search use the search_vector GIN index instead of ILIKE scans
+-- Date: 2026-10-16
+-- Architecture: Trigger-free design - search_vector is maintained by the tutor profile
+--               repository (core/search.py), this migration only backfills and indexes
+
+-- ============================================================================
+-- TRIGRAM EXTENSION
+-- ============================================================================
+
+-- pg_trgm lets GIN indexes answer ILIKE 'prefix%' lookups on names
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- ============================================================================
+-- NAME PREFIX INDEXES (users table)
+-- ============================================================================
+-- Use case: Searching tutors by first or last name ("smi" -> "Smith")
+-- Query pattern: WHERE first_name ILIKE 'term%' OR last_name ILIKE 'term%'
+
+CREATE INDEX IF NOT EXISTS idx_users_first_name_trgm
+ON users USING GIN (first_name gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_users_last_name_trgm
+ON users USING GIN (last_name gin_trgm_ops);
+
+COMMENT ON INDEX idx_users_first_name_trgm IS 'Trigram index for tutor search name prefix matching';
+COMMENT ON INDEX idx_users_last_name_trgm IS 'Trigram index for tutor search name prefix matching';
+
+-- ============================================================================
+-- BACKFILL search_vector
+-- ============================================================================
+-- Profiles created after migration 032 were never indexed because the
+-- application did not maintain the column yet. Rebuild every vector so
+-- weights are consistent with core/search.py.
+
+UPDATE tutor_profiles
+SET search_vector =
+    setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+    setweight(to_tsvector('english', COALESCE(headline, '')), 'B') ||
+    setweight(to_tsvector('english', COALESCE(bio, '')), 'C') ||
+    setweight(to_tsvector('english', COALESCE(description, '')), 'D');
+
+ANALYZE tutor_profiles;
+ANALYZE users;
+
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 046_add_tutor_search_trigram completed successfully';
+END $$;
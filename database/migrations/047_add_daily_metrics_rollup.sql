@@ -0,0 +1,64 @@
+-- Migration 047: Daily metrics rollup for admin and owner dashboards
+-- Purpose: Serve dashboard aggregates from one row per day instead of scanning
+--          bookings, users and reviews on every page load
+-- Date: 2026-10-16
+-- Architecture: Maintained by modules/admin/infrastructure/metrics_rollup.py
+--               (Celery task tasks.admin_tasks.refresh_daily_metrics)
+
+-- ============================================================================
+-- ROLLUP TABLE
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS daily_metrics_rollup (
+    day DATE PRIMARY KEY,
+
+    bookings_total INTEGER NOT NULL DEFAULT 0,
+    bookings_requested INTEGER NOT NULL DEFAULT 0,
+    bookings_scheduled INTEGER NOT NULL DEFAULT 0,
+    bookings_active INTEGER NOT NULL DEFAULT 0,
+    bookings_ended INTEGER NOT NULL DEFAULT 0,
+    bookings_cancelled INTEGER NOT NULL DEFAULT 0,
+    bookings_expired INTEGER NOT NULL DEFAULT 0,
+
+    outcome_completed INTEGER NOT NULL DEFAULT 0,
+    outcome_no_show_student INTEGER NOT NULL DEFAULT 0,
+    outcome_no_show_tutor INTEGER NOT NULL DEFAULT 0,
+    outcome_not_held INTEGER NOT NULL DEFAULT 0,
+
+    sessions_total INTEGER NOT NULL DEFAULT 0,
+    session_minutes BIGINT NOT NULL DEFAULT 0,
+
+    revenue_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    gmv_cents BIGINT NOT NULL DEFAULT 0,
+    platform_fee_cents BIGINT NOT NULL DEFAULT 0,
+    tutor_earnings_cents BIGINT NOT NULL DEFAULT 0,
+
+    new_users INTEGER NOT NULL DEFAULT 0,
+    new_tutors INTEGER NOT NULL DEFAULT 0,
+    new_students INTEGER NOT NULL DEFAULT 0,
+
+    reviews_total INTEGER NOT NULL DEFAULT 0,
+    reviews_rating_sum INTEGER NOT NULL DEFAULT 0,
+    public_reviews_total INTEGER NOT NULL DEFAULT 0,
+    public_reviews_rating_sum INTEGER NOT NULL DEFAULT 0,
+
+    responses_total INTEGER NOT NULL DEFAULT 0,
+    response_minutes_sum BIGINT NOT NULL DEFAULT 0,
+
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE daily_metrics_rollup IS 'Per-day dashboard aggregates, refreshed incrementally from bookings, users, reviews and tutor_response_log';
+
+-- ============================================================================
+-- CHANGE DETECTION INDEXES
+-- ============================================================================
+-- Use case: The incremental refresh finds days touched since its last run
+-- Query pattern: WHERE updated_at >= <last refresh> OR created_at >= <last refresh>
+
+CREATE INDEX IF NOT EXISTS idx_bookings_updated_at ON bookings(updated_at);
+CREATE INDEX IF NOT EXISTS idx_bookings_created_at ON bookings(created_at);
+CREATE INDEX IF NOT EXISTS idx_users_updated_at ON users(updated_at);
+CREATE INDEX IF NOT EXISTS idx_users_created_at ON users(created_at);
+CREATE INDEX IF NOT EXISTS idx_reviews_created_at ON reviews(created_at);
+CREATE INDEX IF NOT EXISTS idx_tutor_response_log_created_at ON tutor_response_log(created_at);
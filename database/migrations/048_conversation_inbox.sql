@@ -0,0 +1,97 @@
+-- Migration 048: Serve message threads from the conversations table
+-- Purpose: The threads endpoint grouped all of a user's messages and ran one
+--          unread COUNT(*) per thread. It now reads one conversations row per
+--          thread (last message + per-participant unread counters).
+-- Date: 2026-10-16
+-- Architecture: Columns maintained by modules/messages/service.py on write;
+--               backfill/repair in modules/messages/infrastructure/conversation_sync.py
+--               (Celery task tasks.message_tasks.sync_conversations, nightly)
+
+-- ============================================================================
+-- SCHEMA
+-- ============================================================================
+
+ALTER TABLE conversations
+    ADD COLUMN IF NOT EXISTS last_message_id INTEGER;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'fk_conversations_last_message') THEN
+        ALTER TABLE conversations
+            ADD CONSTRAINT fk_conversations_last_message
+            FOREIGN KEY (last_message_id) REFERENCES messages(id) ON DELETE SET NULL;
+    END IF;
+END $$;
+
+-- One conversation per pair and booking whichever slot each user is in
+-- (uq_conversation_participants lets NULL booking_ids repeat)
+CREATE UNIQUE INDEX IF NOT EXISTS uq_conversations_pair
+    ON conversations (LEAST(student_id, tutor_id), GREATEST(student_id, tutor_id), COALESCE(booking_id, 0));
+
+-- Use case: Inbox, a user's conversations by recent activity
+-- Query pattern: WHERE student_id = <user> OR tutor_id = <user> ORDER BY last_message_at DESC
+CREATE INDEX IF NOT EXISTS idx_conversations_student_activity
+    ON conversations (student_id, last_message_at DESC);
+CREATE INDEX IF NOT EXISTS idx_conversations_tutor_activity
+    ON conversations (tutor_id, last_message_at DESC);
+
+-- ============================================================================
+-- BACKFILL
+-- ============================================================================
+-- Same rules as conversation_sync.backfill_conversations: a tutor talking to a
+-- non-tutor takes the tutor slot, any other pair puts the lower id first
+
+INSERT INTO conversations (student_id, tutor_id, booking_id, created_at, updated_at)
+SELECT
+    CASE WHEN low.role = 'tutor' AND high.role <> 'tutor' THEN p.high_id ELSE p.low_id END,
+    CASE WHEN low.role = 'tutor' AND high.role <> 'tutor' THEN p.low_id ELSE p.high_id END,
+    p.booking_id,
+    p.first_message_at,
+    CURRENT_TIMESTAMP
+FROM (
+    SELECT
+        LEAST(sender_id, recipient_id) AS low_id,
+        GREATEST(sender_id, recipient_id) AS high_id,
+        booking_id,
+        min(created_at) AS first_message_at
+    FROM messages
+    WHERE conversation_id IS NULL
+      AND sender_id IS NOT NULL
+      AND recipient_id IS NOT NULL
+      AND sender_id <> recipient_id
+    GROUP BY 1, 2, 3
+) p
+JOIN users low ON low.id = p.low_id
+JOIN users high ON high.id = p.high_id
+ON CONFLICT DO NOTHING;
+
+UPDATE messages m
+SET conversation_id = c.id
+FROM conversations c
+WHERE m.conversation_id IS NULL
+  AND LEAST(c.student_id, c.tutor_id) = LEAST(m.sender_id, m.recipient_id)
+  AND GREATEST(c.student_id, c.tutor_id) = GREATEST(m.sender_id, m.recipient_id)
+  AND COALESCE(c.booking_id, 0) = COALESCE(m.booking_id, 0);
+
+UPDATE conversations c
+SET
+    last_message_id = latest.id,
+    last_message_at = latest.created_at,
+    student_unread_count = unread.student_unread_count,
+    tutor_unread_count = unread.tutor_unread_count
+FROM conversations c2
+LEFT JOIN LATERAL (
+    SELECT m.id, m.created_at
+    FROM messages m
+    WHERE m.conversation_id = c2.id AND m.deleted_at IS NULL
+    ORDER BY m.created_at DESC, m.id DESC
+    LIMIT 1
+) latest ON TRUE
+CROSS JOIN LATERAL (
+    SELECT
+        count(*) FILTER (WHERE m.recipient_id = c2.student_id) AS student_unread_count,
+        count(*) FILTER (WHERE m.recipient_id = c2.tutor_id) AS tutor_unread_count
+    FROM messages m
+    WHERE m.conversation_id = c2.id AND m.deleted_at IS NULL AND NOT m.is_read
+) unread
+WHERE c.id = c2.id;
@@ -0,0 +1,58 @@
+-- Migration 049: Indexed full-text message search
+-- Purpose: Message search ran ILIKE '%term%' over every message a user sent or
+--          received, plus a second pass for the count. It now matches a
+--          tsvector through GIN indexes scoped to the participant.
+-- Date: 2026-10-16
+-- Architecture: Trigger-free design - search_vector is maintained on flush by
+--               the Message model listeners (core/search.py), this migration
+--               only adds, backfills and indexes the column
+
+-- ============================================================================
+-- EXTENSION
+-- ============================================================================
+
+-- btree_gin lets a GIN index hold the participant id next to the vector
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+-- ============================================================================
+-- SEARCH VECTOR COLUMN
+-- ============================================================================
+
+ALTER TABLE messages
+ADD COLUMN IF NOT EXISTS search_vector tsvector;
+
+COMMENT ON COLUMN messages.search_vector IS 'Full-text search vector of message (updated by application code, NOT triggers)';
+
+UPDATE messages
+SET search_vector = to_tsvector('english', COALESCE(message, ''))
+WHERE search_vector IS NULL;
+
+-- ============================================================================
+-- PARTICIPANT-SCOPED GIN INDEXES
+-- ============================================================================
+-- Use case: A user searching their own messages
+-- Query pattern: WHERE deleted_at IS NULL
+--                  AND ((sender_id = <user> AND search_vector @@ <query>)
+--                    OR (recipient_id = <user> AND search_vector @@ <query>))
+-- Each OR branch is one index scan. GIN intersects the user's posting list
+-- with the query words, skipping ahead from the rarer of the two, so a
+-- common word doesn't make a heavy user read every global match.
+-- Deleted messages are never searched and are left out of the indexes.
+
+CREATE INDEX IF NOT EXISTS idx_messages_sender_search
+ON messages USING GIN (sender_id, search_vector)
+WHERE deleted_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_messages_recipient_search
+ON messages USING GIN (recipient_id, search_vector)
+WHERE deleted_at IS NULL;
+
+COMMENT ON INDEX idx_messages_sender_search IS 'GIN index for message search, sent messages';
+COMMENT ON INDEX idx_messages_recipient_search IS 'GIN index for message search, received messages';
+
+ANALYZE messages;
+
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 049_message_search completed successfully';
+END $$;
@@ -0,0 +1,46 @@
+-- Migration 050: Indexes for cursor (keyset) pagination
+-- Purpose: List endpoints accept a cursor and continue with
+--          WHERE (sort_key, id) < (<last sort_key>, <last id>) ORDER BY sort_key DESC, id DESC
+--          instead of OFFSET. These indexes end in id so the row comparison
+--          seeks straight to the next page and the ORDER BY needs no sort.
+-- Date: 2026-10-16
+-- Architecture: Cursors are built and signed by core/pagination.py (Keyset)
+
+-- ============================================================================
+-- BOOKINGS
+-- ============================================================================
+-- Use case: GET /bookings for a student or tutor
+-- Query pattern: WHERE student_id = <user> ORDER BY start_time DESC, id DESC
+
+CREATE INDEX IF NOT EXISTS idx_bookings_student_time_id
+    ON bookings (student_id, start_time DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_bookings_tutor_time_id
+    ON bookings (tutor_profile_id, start_time DESC, id DESC);
+
+-- ============================================================================
+-- NOTIFICATIONS
+-- ============================================================================
+-- Use case: GET /notifications (dismissed notifications are never listed)
+-- Query pattern: WHERE user_id = <user> AND dismissed_at IS NULL ORDER BY created_at DESC, id DESC
+
+CREATE INDEX IF NOT EXISTS idx_notifications_user_created_id
+    ON notifications (user_id, created_at DESC, id DESC)
+    WHERE dismissed_at IS NULL;
+
+-- ============================================================================
+-- USERS
+-- ============================================================================
+-- Use case: GET /admin/users
+-- Query pattern: ORDER BY created_at DESC, id DESC
+
+CREATE INDEX IF NOT EXISTS idx_users_created_id
+    ON users (created_at DESC, id DESC);
+
+ANALYZE bookings;
+ANALYZE notifications;
+ANALYZE users;
+
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 050_keyset_pagination_indexes completed successfully';
+END $$;
@@ -0,0 +1,54 @@
+-- Migration 051: Notification outbox
+-- Purpose: Creating a notification sent its email through Brevo inside the
+--          caller's request transaction, so e.g. booking confirmation waited
+--          on the email provider. The email is now written to an outbox row in
+--          the same transaction and sent after commit by a worker.
+-- Date: 2026-10-16
+-- Architecture: Rows written by modules/notifications/service.py and drained
+--               by modules/notifications/infrastructure/outbox.py
+--               (Celery task tasks.notification_tasks.deliver_notification_emails,
+--               every 10 seconds)
+
+-- ============================================================================
+-- TABLE
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS notification_outbox (
+    id SERIAL PRIMARY KEY,
+    notification_id INTEGER REFERENCES notifications(id) ON DELETE CASCADE,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    channel VARCHAR(20) NOT NULL DEFAULT 'email',
+    dedupe_key VARCHAR(64) NOT NULL,
+    payload JSON NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    delivery_status VARCHAR(30),
+    provider_message_id VARCHAR(255),
+    last_error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    processed_at TIMESTAMPTZ,
+    CONSTRAINT notification_outbox_status_check
+        CHECK (status IN ('pending', 'sent', 'failed', 'coalesced'))
+);
+
+COMMENT ON TABLE notification_outbox IS 'Notification deliveries written with the notification, sent by the outbox worker';
+COMMENT ON COLUMN notification_outbox.dedupe_key IS 'Hash of user, type and content; pending rows sharing it are sent once';
+COMMENT ON COLUMN notification_outbox.delivery_status IS 'EmailDeliveryStatus of the last attempt';
+
+-- ============================================================================
+-- INDEXES
+-- ============================================================================
+-- Use case: Worker claiming due deliveries
+-- Query pattern: WHERE status = 'pending' AND next_attempt_at <= now()
+--                ORDER BY id FOR UPDATE SKIP LOCKED
+-- Only pending rows are indexed, so the index stays small as history grows.
+
+CREATE INDEX IF NOT EXISTS idx_notification_outbox_due
+    ON notification_outbox (next_attempt_at, id)
+    WHERE status = 'pending';
+
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 051_notification_outbox completed successfully';
+END $$;
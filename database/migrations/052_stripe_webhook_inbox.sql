@@ -0,0 +1,87 @@
+-- Migration 052: Stripe webhook inbox
+-- Purpose: The Stripe webhook endpoint ran every handler inline before
+--          answering, so a slow or failing handler delayed the response and
+--          triggered Stripe retries, and retry state lived only in process
+--          memory. Events are now stored on receipt, acknowledged at once and
+--          processed by a worker, one at a time per payment intent, with
+--          retries and dead-lettering recorded on the row.
+-- Date: 2026-10-17
+-- Architecture: Rows written by modules/payments/router.py (POST /payments/webhook)
+--               and processed by modules/payments/infrastructure/webhook_inbox.py
+--               (after each delivery, and by Celery task
+--               tasks.payment_tasks.process_stripe_webhooks every 10 seconds)
+
+-- ============================================================================
+-- COLUMNS
+-- ============================================================================
+
+ALTER TABLE webhook_events
+    ADD COLUMN IF NOT EXISTS partition_key VARCHAR(255),
+    ADD COLUMN IF NOT EXISTS payload JSONB,
+    ADD COLUMN IF NOT EXISTS status VARCHAR(20),
+    ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS last_error TEXT,
+    ADD COLUMN IF NOT EXISTS stripe_created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS received_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP;
+
+-- Existing rows were written after their event had been handled
+UPDATE webhook_events
+SET status = 'processed',
+    stripe_created_at = processed_at,
+    received_at = processed_at
+WHERE status IS NULL;
+
+ALTER TABLE webhook_events
+    ALTER COLUMN status SET NOT NULL,
+    ALTER COLUMN status SET DEFAULT 'pending',
+    ALTER COLUMN processed_at DROP NOT NULL,
+    ALTER COLUMN processed_at DROP DEFAULT;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'webhook_events_status_check') THEN
+        ALTER TABLE webhook_events
+            ADD CONSTRAINT webhook_events_status_check
+            CHECK (status IN ('pending', 'processed', 'dead'));
+    END IF;
+END $$;
+
+COMMENT ON TABLE webhook_events IS 'Stripe webhook events, stored on receipt and processed by the webhook worker';
+COMMENT ON COLUMN webhook_events.partition_key IS 'Payment intent (or object id) the event concerns; events sharing it are processed in order';
+COMMENT ON COLUMN webhook_events.payload IS 'event.data.object as delivered by Stripe';
+COMMENT ON COLUMN webhook_events.status IS 'pending, processed or dead (retries exhausted, replayable by admins)';
+COMMENT ON COLUMN webhook_events.stripe_created_at IS 'Stripe event creation time; processing order within a partition';
+COMMENT ON COLUMN webhook_events.processed_at IS 'Timestamp when the event was processed (NULL while pending)';
+
+-- ============================================================================
+-- INDEXES
+-- ============================================================================
+-- Use case: Worker claiming due events
+-- Query pattern: WHERE status = 'pending' AND next_attempt_at <= now()
+--                ORDER BY stripe_created_at, id
+-- Only pending rows are indexed, so the index stays small as history grows.
+
+CREATE INDEX IF NOT EXISTS idx_webhook_events_pending
+    ON webhook_events (stripe_created_at, id)
+    WHERE status = 'pending';
+
+-- Use case: Skipping events queued behind an earlier one for the same payment
+-- Query pattern: NOT EXISTS (... WHERE partition_key = ? AND status = 'pending'
+--                AND (stripe_created_at, id) < (?, ?))
+
+CREATE INDEX IF NOT EXISTS idx_webhook_events_partition_pending
+    ON webhook_events (partition_key, stripe_created_at, id)
+    WHERE status = 'pending';
+
+-- Use case: Admin dead-letter listing
+-- Query pattern: WHERE status = 'dead' ORDER BY received_at DESC
+
+CREATE INDEX IF NOT EXISTS idx_webhook_events_dead
+    ON webhook_events (received_at)
+    WHERE status = 'dead';
+
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 052_stripe_webhook_inbox completed successfully';
+END $$;
@@ -0,0 +1,52 @@
+-- Migration 053: Running lifetime earnings per tutor
+-- Purpose: Every price calculation summed tutor_earnings_cents over all of the
+--          tutor's completed bookings to pick their commission tier, and the
+--          owner dashboard repeated that sum for every approved tutor. The
+--          total is now kept on tutor_profiles and adjusted as bookings start
+--          or stop counting, so tier lookups read one row.
+-- Date: 2026-10-17
+-- Architecture: Maintained by core/tutor_earnings.py (ORM listeners on Booking
+--               and the bulk transitions in modules/bookings/batch_jobs.py);
+--               drift is repaired by Celery task
+--               tasks.payment_tasks.reconcile_tutor_earnings (daily)
+
+-- ============================================================================
+-- COLUMN
+-- ============================================================================
+
+ALTER TABLE tutor_profiles
+    ADD COLUMN IF NOT EXISTS lifetime_earnings_cents BIGINT NOT NULL DEFAULT 0;
+
+COMMENT ON COLUMN tutor_profiles.lifetime_earnings_cents IS
+    'Sum of tutor_earnings_cents over ENDED/COMPLETED bookings; commission tier input';
+
+-- ============================================================================
+-- BACKFILL
+-- ============================================================================
+
+UPDATE tutor_profiles tp
+SET lifetime_earnings_cents = totals.total
+FROM (
+    SELECT tutor_profile_id, COALESCE(SUM(tutor_earnings_cents), 0) AS total
+    FROM bookings
+    WHERE session_state = 'ENDED' AND session_outcome = 'COMPLETED'
+    GROUP BY tutor_profile_id
+) totals
+WHERE totals.tutor_profile_id = tp.id
+  AND tp.lifetime_earnings_cents IS DISTINCT FROM totals.total;
+
+-- ============================================================================
+-- INDEXES
+-- ============================================================================
+-- Use case: Owner dashboard commission tier breakdown
+-- Query pattern: count(*) FILTER (WHERE lifetime_earnings_cents >= ...)
+--                WHERE is_approved AND deleted_at IS NULL
+
+CREATE INDEX IF NOT EXISTS idx_tutor_profiles_lifetime_earnings
+    ON tutor_profiles (lifetime_earnings_cents)
+    WHERE is_approved = TRUE AND deleted_at IS NULL;
+
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 053_tutor_lifetime_earnings completed successfully';
+END $$;
@@ -0,0 +1,79 @@
+-- Migration 054: Incremental rating aggregates per tutor
+-- Purpose: Every new review recomputed AVG(rating) and COUNT(*) over all of
+--          the tutor's reviews, and review summaries scanned the reviews again
+--          for the star histogram. The rating sum and a 1-5 star histogram
+--          are now kept on tutor_profiles next to total_reviews and
+--          average_rating, and adjusted with one UPDATE per review change.
+-- Date: 2026-10-17
+-- Architecture: Maintained by core/tutor_ratings.py (ORM listeners on Review);
+--               drift is repaired by Celery task
+--               tasks.review_tasks.rebuild_tutor_ratings (daily)
+
+-- ============================================================================
+-- COLUMNS
+-- ============================================================================
+
+ALTER TABLE tutor_profiles
+    ADD COLUMN IF NOT EXISTS rating_sum INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS rating_1_count INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS rating_2_count INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS rating_3_count INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS rating_4_count INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS rating_5_count INTEGER NOT NULL DEFAULT 0;
+
+COMMENT ON COLUMN tutor_profiles.rating_sum IS 'Sum of the ratings of the tutor''s reviews';
+COMMENT ON COLUMN tutor_profiles.rating_1_count IS 'Number of 1-star reviews';
+COMMENT ON COLUMN tutor_profiles.rating_2_count IS 'Number of 2-star reviews';
+COMMENT ON COLUMN tutor_profiles.rating_3_count IS 'Number of 3-star reviews';
+COMMENT ON COLUMN tutor_profiles.rating_4_count IS 'Number of 4-star reviews';
+COMMENT ON COLUMN tutor_profiles.rating_5_count IS 'Number of 5-star reviews';
+COMMENT ON COLUMN tutor_profiles.average_rating IS 'rating_sum / total_reviews, rounded to two places';
+
+-- ============================================================================
+-- BACKFILL
+-- ============================================================================
+
+UPDATE tutor_profiles tp
+SET rating_sum = COALESCE(totals.rating_sum, 0),
+    total_reviews = COALESCE(totals.total_reviews, 0),
+    rating_1_count = COALESCE(totals.rating_1_count, 0),
+    rating_2_count = COALESCE(totals.rating_2_count, 0),
+    rating_3_count = COALESCE(totals.rating_3_count, 0),
+    rating_4_count = COALESCE(totals.rating_4_count, 0),
+    rating_5_count = COALESCE(totals.rating_5_count, 0),
+    average_rating = COALESCE(ROUND(totals.rating_sum::NUMERIC / NULLIF(totals.total_reviews, 0), 2), 0)
+FROM tutor_profiles base
+LEFT JOIN (
+    SELECT tutor_profile_id,
+           SUM(rating) AS rating_sum,
+           COUNT(*) AS total_reviews,
+           COUNT(*) FILTER (WHERE rating = 1) AS rating_1_count,
+           COUNT(*) FILTER (WHERE rating = 2) AS rating_2_count,
+           COUNT(*) FILTER (WHERE rating = 3) AS rating_3_count,
+           COUNT(*) FILTER (WHERE rating = 4) AS rating_4_count,
+           COUNT(*) FILTER (WHERE rating = 5) AS rating_5_count
+    FROM reviews
+    GROUP BY tutor_profile_id
+) totals ON totals.tutor_profile_id = base.id
+WHERE base.id = tp.id;
+
+-- Incremented in place from now on, so NULL would poison the sum
+ALTER TABLE tutor_profiles
+    ALTER COLUMN total_reviews SET DEFAULT 0,
+    ALTER COLUMN total_reviews SET NOT NULL;
+
+-- ============================================================================
+-- INDEXES
+-- ============================================================================
+-- Use case: Top-rated tutors and public search sorted by rating
+-- Query pattern: WHERE is_approved AND deleted_at IS NULL AND total_reviews >= ?
+--                ORDER BY average_rating DESC, total_reviews DESC LIMIT ?
+
+CREATE INDEX IF NOT EXISTS idx_tutor_profiles_rating
+    ON tutor_profiles (average_rating DESC, total_reviews DESC)
+    WHERE is_approved = TRUE AND deleted_at IS NULL;
+
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 054_tutor_rating_aggregates completed successfully';
+END $$;
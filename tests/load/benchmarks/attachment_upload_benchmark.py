@@ -0,0 +1,148 @@
+"""
+Message attachment upload benchmark: buffered upload vs the streaming pipeline.
+
+Stores ``--uploads`` attachments of ``--size-mb`` concurrently through a stub
+S3 client that sleeps like a real one (``--s3-latency`` ms per call plus
+``--s3-mbps`` transfer time), twice:
+
+- ``buffered``: the previous behaviour, reading the whole file with
+  ``upload.read()`` and calling ``put_object`` directly on the event loop
+- ``streaming``: ``core.message_storage.store_message_attachment``, reading in
+  chunks and sending parts from the storage thread pool
+
+Reports wall time, peak traced memory and the worst event loop stall seen by
+a 10 ms heartbeat task while the uploads run.
+
+Run from the backend directory:
+    cd backend
+    python ../tests/load/benchmarks/attachment_upload_benchmark.py --uploads 10 --size-mb 10
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+sys.path.insert(0, os.getcwd())
+
+import core.message_storage as message_storage  # noqa: E402
+from core.config import settings  # noqa: E402
+
+
+class StubS3Client:
+    """Accepts every call after sleeping for the configured latency and bandwidth."""
+
+    def __init__(self, latency: float, bytes_per_second: float) -> None:
+        self.latency = latency
+        self.bytes_per_second = bytes_per_second
+
+    def _transfer(self, body: bytes = b"") -> None:
+        time.sleep(self.latency + len(body) / self.bytes_per_second)
+
+    def put_object(self, Body: bytes, **kwargs) -> dict:
+        self._transfer(Body)
+        return {}
+
+    def create_multipart_upload(self, **kwargs) -> dict:
+        self._transfer()
+        return {"UploadId": "benchmark"}
+
+    def upload_part(self, Body: bytes, PartNumber: int, **kwargs) -> dict:
+        self._transfer(Body)
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, **kwargs) -> dict:
+        self._transfer()
+        return {}
+
+    def abort_multipart_upload(self, **kwargs) -> dict:
+        return {}
+
+
+def make_upload(size: int) -> UploadFile:
+    # Spooled to disk past 1 MB, like uploads parsed by Starlette
+    file = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    file.write(b"%PDF-1.7\n" + os.urandom(size - 9))
+    file.seek(0)
+    return UploadFile(
+        file=file,
+        size=size,
+        filename="notes.pdf",
+        headers=Headers({"content-type": "application/pdf"}),
+    )
+
+
+async def buffered_store(client: StubS3Client, upload: UploadFile) -> None:
+    content = await upload.read()
+    client.put_object(Bucket="bench", Key="key", Body=content, ContentType=upload.content_type)
+
+
+async def streaming_store(client: StubS3Client, upload: UploadFile) -> None:
+    await message_storage.store_message_attachment(1, 1, upload)
+
+
+async def heartbeat(stop: asyncio.Event, stalls: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        stalls.append(time.perf_counter() - started - 0.01)
+
+
+async def run(store, client: StubS3Client, args: argparse.Namespace) -> tuple[float, int, float]:
+    size = int(args.size_mb * 1024 * 1024)
+    uploads = [make_upload(size) for _ in range(args.uploads)]  # Created before tracing starts
+    stop = asyncio.Event()
+    stalls: list[float] = []
+    beat = asyncio.create_task(heartbeat(stop, stalls))
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(store(client, upload) for upload in uploads))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stop.set()
+    await beat
+    return elapsed, peak, max(stalls, default=0.0)
+
+
+async def benchmark(args: argparse.Namespace) -> None:
+    client = StubS3Client(args.s3_latency / 1000, args.s3_mbps * 1024 * 1024)
+    message_storage._s3_client = lambda: client
+    message_storage._bucket_ready = True
+    settings.MESSAGE_ATTACHMENT_MAX_FILE_SIZE = int(args.size_mb * 1024 * 1024)
+
+    for label, store in (("buffered", buffered_store), ("streaming", streaming_store)):
+        elapsed, peak, stall = await run(store, client, args)
+        print(
+            f"{label:<10} {elapsed:>7.2f} s   peak memory {peak / 1024 / 1024:>7.1f} MB   "
+            f"worst loop stall {stall * 1000:>8.1f} ms"
+        )
+    message_storage.shutdown_storage_executor()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=10)
+    parser.add_argument("--size-mb", type=float, default=10.0)
+    parser.add_argument("--s3-latency", type=float, default=20.0, help="per-call latency in ms")
+    parser.add_argument("--s3-mbps", type=float, default=100.0, help="stub upload bandwidth in MB/s")
+    args = parser.parse_args()
+
+    print(
+        f"{args.uploads} concurrent uploads of {args.size_mb} MB, part size "
+        f"{settings.MESSAGE_ATTACHMENT_UPLOAD_PART_SIZE / 1024 / 1024:.0f} MB, "
+        f"{settings.MESSAGE_ATTACHMENT_UPLOAD_WORKERS} storage threads"
+    )
+    asyncio.run(benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
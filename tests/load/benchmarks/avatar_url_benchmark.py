@@ -0,0 +1,113 @@
+"""
+Avatar URL microbenchmark: per-field presigning vs. batched, cached signing.
+
+Builds a 100-booking ``list_bookings`` page in memory (distinct tutors and
+students, so 200 avatar keys) and times ``booking_to_dto`` over the page:
+
+* ``legacy``  - one ``generate_presigned_url_sync`` call per avatar field
+* ``cold``    - ``prefetch_avatar_urls`` signs the page in one pass, empty cache
+* ``warm``    - the next render of the same page, served from the URL cache
+* ``cdn``     - stable ``AVATAR_PUBLIC_BASE_URL`` links, no signing at all
+
+Signing is local HMAC work, so no storage server or database is needed.
+
+Run from the backend directory:
+    cd backend
+    python ../tests/load/benchmarks/avatar_url_benchmark.py --iterations 200
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.getcwd())
+
+import core.avatar_storage as avatar_storage  # noqa: E402
+import modules.bookings.service as booking_service  # noqa: E402
+from core.avatar_storage import generate_presigned_url_sync, prefetch_avatar_urls  # noqa: E402
+from core.config import settings  # noqa: E402
+from models import Booking, TutorProfile, User  # noqa: E402
+from modules.bookings.service import booking_to_dto  # noqa: E402
+
+PAGE_SIZE = 100
+
+
+def build_page() -> list[Booking]:
+    start = datetime.now(UTC) + timedelta(days=1)
+    bookings = []
+    for i in range(PAGE_SIZE):
+        tutor = User(id=10_000 + i, first_name="Tutor", last_name=str(i), avatar_key=f"avatars/tutor-{i}.webp")
+        student = User(id=20_000 + i, first_name="Student", last_name=str(i), avatar_key=f"avatars/student-{i}.webp")
+        profile = TutorProfile(id=i, user=tutor, title="Math tutor", average_rating=Decimal("4.80"))
+        bookings.append(
+            Booking(
+                id=i,
+                tutor_profile=profile,
+                student=student,
+                start_time=start + timedelta(hours=i),
+                end_time=start + timedelta(hours=i, minutes=50),
+                session_state="SCHEDULED",
+                rate_cents=4500,
+                created_at=start,
+            )
+        )
+    return bookings
+
+
+def legacy_build_avatar_url(key, *, default=None, allow_absolute=True):
+    if not key:
+        return default
+    return generate_presigned_url_sync(key)
+
+
+def render(bookings: list[Booking], *, prefetch: bool) -> None:
+    if prefetch:
+        prefetch_avatar_urls(
+            key for booking in bookings for key in (booking.tutor_profile.user.avatar_key, booking.student.avatar_key)
+        )
+    for booking in bookings:
+        booking_to_dto(booking, None)
+
+
+def measure(label: str, iterations: int, setup, run) -> None:
+    timings = []
+    for _ in range(iterations):
+        setup()
+        started = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"{label:<8} {statistics.median(timings):>9.2f} {p95:>9.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    bookings = build_page()
+    cache = avatar_storage.presigned_url_cache
+    signed_build_avatar_url = booking_service.build_avatar_url
+
+    print(f"{PAGE_SIZE} bookings per page, {args.iterations} iterations\n")
+    print(f"{'mode':<8} {'p50 ms':>9} {'p95 ms':>9}")
+
+    booking_service.build_avatar_url = legacy_build_avatar_url
+    measure("legacy", args.iterations, lambda: None, lambda: render(bookings, prefetch=False))
+    booking_service.build_avatar_url = signed_build_avatar_url
+
+    measure("cold", args.iterations, cache.clear, lambda: render(bookings, prefetch=True))
+    measure("warm", args.iterations, lambda: None, lambda: render(bookings, prefetch=True))
+
+    settings.AVATAR_PUBLIC_BASE_URL = "https://cdn.example.com/avatars"
+    measure("cdn", args.iterations, lambda: None, lambda: render(bookings, prefetch=True))
+    settings.AVATAR_PUBLIC_BASE_URL = None
+
+
+if __name__ == "__main__":
+    main()
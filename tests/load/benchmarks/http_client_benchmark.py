@@ -0,0 +1,144 @@
+"""
+Outbound HTTP client benchmark: a new httpx.AsyncClient per call vs the pooled registry.
+
+Starts a local mock API server (threaded, HTTP/1.1 keep-alive) that answers
+every request with a small JSON body after ``--server-delay`` ms, standing in
+for Zoom or Google. Then sends ``--requests`` GETs with ``--concurrency`` in
+flight, twice:
+
+- ``per-call``: a new ``httpx.AsyncClient`` per request, as the integrations
+  used to do (a fresh TCP connection every time)
+- ``pooled``: ``core.http_clients`` with a provider registered for the mock
+  server, reusing keep-alive connections
+
+Reports requests per second and latency percentiles for each. The mock server
+is plain HTTP on localhost, so the gap understates production, where every new
+connection also pays DNS and a TLS handshake across the internet.
+
+Run from the backend directory:
+    cd backend
+    python ../tests/load/benchmarks/http_client_benchmark.py --requests 5000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+sys.path.insert(0, os.getcwd())
+
+from core.http_clients import HTTPClientRegistry, ProviderConfig  # noqa: E402
+
+BODY = b'{"id": "event-1", "status": "confirmed"}'
+
+
+class MockAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    delay = 0.0
+
+    def do_GET(self) -> None:
+        if self.delay:
+            time.sleep(self.delay)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def start_server(delay_ms: float) -> ThreadingHTTPServer:
+    MockAPIHandler.delay = delay_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockAPIHandler)
+    server.daemon_threads = True
+    server.request_queue_size = 1024
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+async def run(send, requests: int, concurrency: int) -> tuple[float, list[float]]:
+    """Issue ``requests`` calls through ``send`` with ``concurrency`` in flight."""
+    latencies: list[float] = []
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await send()
+            assert response.status_code == 200
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, sorted(latencies)
+
+
+def report(label: str, requests: int, seconds: float, latencies: list[float]) -> None:
+    print(
+        f"{label:<10} {requests / seconds:>8.0f} req/s   "
+        f"p50 {percentile(latencies, 0.50) * 1000:.2f}  "
+        f"p95 {percentile(latencies, 0.95) * 1000:.2f}  "
+        f"p99 {percentile(latencies, 0.99) * 1000:.2f}  "
+        f"mean {statistics.mean(latencies) * 1000:.2f} ms"
+    )
+
+
+async def benchmark(base_url: str, args: argparse.Namespace) -> None:
+    async def per_call() -> httpx.Response:
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            return await client.get(f"{base_url}/calendar/v3/events")
+
+    registry = HTTPClientRegistry(providers={})
+    registry.register(
+        ProviderConfig(
+            name="mock",
+            base_url=base_url,
+            timeout=30.0,
+            max_connections=args.concurrency,
+            max_keepalive_connections=args.concurrency,
+        )
+    )
+
+    async def pooled() -> httpx.Response:
+        return await registry.request("mock", "GET", "/calendar/v3/events")
+
+    # Warm up both paths (imports, first connections)
+    await run(per_call, args.concurrency, args.concurrency)
+    await run(pooled, args.concurrency, args.concurrency)
+
+    for label, send in (("per-call", per_call), ("pooled", pooled)):
+        seconds, latencies = await run(send, args.requests, args.concurrency)
+        report(label, args.requests, seconds, latencies)
+    await registry.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--server-delay", type=float, default=0.0, help="mock server think time in ms")
+    args = parser.parse_args()
+
+    server = start_server(args.server_delay)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"{args.requests} requests, concurrency {args.concurrency}, server delay {args.server_delay} ms")
+    try:
+        asyncio.run(benchmark(base_url, args))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
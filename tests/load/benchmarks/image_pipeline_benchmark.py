@@ -0,0 +1,97 @@
+"""
+Profile photo processing benchmark: inline processing vs the worker pool.
+
+Processes ``--uploads`` JPEG photos of ``--width`` x ``--height`` pixels
+concurrently, twice:
+
+- ``inline``: the previous behaviour, one full-resolution decode, resize
+  and re-encode per upload, run directly on the event loop
+- ``pool``: ``core.image_processing.render_profile_photo`` on
+  ``image_workers``, producing the original plus every WebP rendition
+
+Reports wall time, the renditions produced per upload and the worst event
+loop stall seen by a 10 ms heartbeat task while the uploads run.
+
+Run from the backend directory:
+    cd backend
+    python ../tests/load/benchmarks/image_pipeline_benchmark.py --uploads 16 --width 4000 --height 3000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from io import BytesIO
+
+from PIL import Image
+
+sys.path.insert(0, os.getcwd())
+
+from core.image_processing import image_workers, normalize_image, render_profile_photo  # noqa: E402
+
+
+def make_photo(width: int, height: int) -> bytes:
+    # Gradient rather than a flat colour so the encoder has real work to do
+    image = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+async def inline_store(content: bytes) -> int:
+    normalize_image(content, "image/jpeg")
+    return 1
+
+
+async def pool_store(content: bytes) -> int:
+    return len(await image_workers.run(render_profile_photo, content, "image/jpeg"))
+
+
+async def heartbeat(stop: asyncio.Event, stalls: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        stalls.append(time.perf_counter() - started - 0.01)
+
+
+async def run(store, content: bytes, uploads: int) -> tuple[float, int, float]:
+    stop = asyncio.Event()
+    stalls: list[float] = []
+    beat = asyncio.create_task(heartbeat(stop, stalls))
+
+    started = time.perf_counter()
+    outputs = await asyncio.gather(*(store(content) for _ in range(uploads)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await beat
+    return elapsed, outputs[0], max(stalls, default=0.0)
+
+
+async def benchmark(args: argparse.Namespace) -> None:
+    content = make_photo(args.width, args.height)
+    await pool_store(content)  # Start the worker processes before timing
+
+    for label, store in (("inline", inline_store), ("pool", pool_store)):
+        elapsed, outputs, stall = await run(store, content, args.uploads)
+        print(
+            f"{label:<8} {elapsed:>7.2f} s   {outputs} image(s) per upload   "
+            f"worst loop stall {stall * 1000:>8.1f} ms"
+        )
+    image_workers.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=16)
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    args = parser.parse_args()
+
+    print(f"{args.uploads} concurrent {args.width}x{args.height} JPEG uploads, {image_workers.workers} image workers")
+    asyncio.run(benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
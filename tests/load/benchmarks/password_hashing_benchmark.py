@@ -0,0 +1,139 @@
+"""
+Login-burst benchmark: inline bcrypt vs. the bounded password pool.
+
+Mounts on a scratch FastAPI app:
+
+* ``/login/inline`` - ``async def`` route calling ``PasswordHasher.verify``
+  directly (how the login route checked passwords before the pool)
+* ``/login/pooled`` - the same check through ``password_service.verify``
+* ``/ping``         - an unrelated, trivial endpoint
+
+For each login route, fires ``--logins`` concurrent logins while a steady
+stream of ``/ping`` requests runs alongside, over an in-process ASGI
+transport. Inline bcrypt stalls the event loop, so the p99 of ``/ping`` grows
+with the burst; with the pool it stays flat. Logins beyond the pool's pending
+limit are rejected with 503 and counted.
+
+No database or Redis needed. Run from the backend directory:
+    cd backend
+    python ../tests/load/benchmarks/password_hashing_benchmark.py --logins 200 --workers 4 --max-pending 64
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.getcwd())
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from core.password_service import PasswordService  # noqa: E402
+from core.security import PasswordHasher  # noqa: E402
+
+PASSWORD = "correct horse battery staple"
+PING_INTERVAL = 0.01
+
+app = FastAPI()
+password_service: PasswordService
+
+
+@app.post("/login/inline")
+async def login_inline():
+    return {"ok": PasswordHasher.verify(PASSWORD, app.state.hashed)}
+
+
+@app.post("/login/pooled")
+async def login_pooled():
+    return {"ok": await password_service.verify(PASSWORD, app.state.hashed)}
+
+
+@app.get("/ping")
+async def ping():
+    return {"ok": True}
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+async def run(path: str, logins: int, concurrency: int) -> dict[str, float]:
+    ping_latencies: list[float] = []
+    statuses: list[int] = []
+    stop = asyncio.Event()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await client.get("/ping")
+
+        async def pinger() -> None:
+            # Latency counts from when each ping was due, so time spent waiting
+            # on a blocked loop shows up instead of hiding between samples
+            due = time.perf_counter()
+            while not stop.is_set():
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                await client.get("/ping")
+                ping_latencies.append((time.perf_counter() - due) * 1000)
+                due = max(due + PING_INTERVAL, time.perf_counter())
+
+        async def login() -> None:
+            async with semaphore:
+                statuses.append((await client.post(path)).status_code)
+
+        pings = asyncio.create_task(pinger())
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await pings
+
+    ping_latencies.sort()
+    return {
+        "logins_per_s": statuses.count(200) / elapsed,
+        "rejected": statuses.count(503),
+        "pings": len(ping_latencies),
+        "ping_p50": statistics.median(ping_latencies),
+        "ping_p99": percentile(ping_latencies, 0.99),
+        "ping_max": ping_latencies[-1],
+    }
+
+
+async def main() -> None:
+    global password_service
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=200, help="Logins in flight")
+    parser.add_argument("--workers", type=int, default=4, help="Password pool threads")
+    parser.add_argument("--max-pending", type=int, default=64, help="Password pool admission limit")
+    args = parser.parse_args()
+
+    # One warning per rejected login would drown the results
+    logging.getLogger("core.password_service").setLevel(logging.ERROR)
+    password_service = PasswordService(workers=args.workers, max_pending=args.max_pending)
+    app.state.hashed = PasswordHasher.hash(PASSWORD)
+
+    print(
+        f"{args.logins} logins, concurrency {args.concurrency}, "
+        f"pool {args.workers} workers / {args.max_pending} pending\n"
+    )
+    print(
+        f"{'route':<14} {'logins/s':>9} {'503s':>6} {'pings':>6}"
+        f" {'ping p50 ms':>12} {'ping p99 ms':>12} {'ping max ms':>12}"
+    )
+    for path in ("/login/inline", "/login/pooled"):
+        result = await run(path, args.logins, args.concurrency)
+        print(
+            f"{path:<14} {result['logins_per_s']:>9.1f} {result['rejected']:>6} {result['pings']:>6}"
+            f" {result['ping_p50']:>12.2f} {result['ping_p99']:>12.2f} {result['ping_max']:>12.2f}"
+        )
+    password_service.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
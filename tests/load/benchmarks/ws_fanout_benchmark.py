@@ -0,0 +1,162 @@
+"""
+WebSocket cluster fan-out benchmark: cross-process delivery over Redis pub/sub.
+
+Starts ``--workers`` processes, each running its own ``WebSocketManager`` in
+cluster mode with in-memory sockets for its share of ``--users`` (user id
+modulo worker count). A separate publisher manager, which holds no sockets
+itself, sends ``--messages`` personal messages to random users with
+``--concurrency`` sends in flight. So every message crosses Redis to another
+process, which is the path a multi-worker uvicorn deployment takes.
+
+Reports publish throughput, end-to-end delivered messages per second and
+publish-to-socket latency percentiles (one host, so wall clocks agree).
+
+Needs a Redis server; a throwaway local one is enough:
+    redis-server --port 6390 --save ''
+
+Run from the backend directory:
+    cd backend
+    REDIS_URL=redis://localhost:6390/0 \\
+        python ../tests/load/benchmarks/ws_fanout_benchmark.py --workers 4 --messages 20000
+"""
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.getcwd())
+
+from modules.messages.websocket import WebSocketManager  # noqa: E402
+from modules.messages.websocket_cluster import WebSocketCluster  # noqa: E402
+
+# Latency samples returned per worker, to keep result pickling cheap
+MAX_SAMPLES_PER_WORKER = 50_000
+
+
+class BenchSocket:
+    """Stands in for a client socket; records delivery latency."""
+
+    def __init__(self, delivered, latencies: list[float]):
+        self._delivered = delivered
+        self._latencies = latencies
+
+    async def accept(self) -> None:
+        pass
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        pass
+
+    async def send_json(self, message: dict) -> None:
+        if len(self._latencies) < MAX_SAMPLES_PER_WORKER:
+            self._latencies.append(time.time() - message["sent_at"])
+        self._delivered.value += 1
+
+
+def run_worker(index: int, workers: int, users: int, redis_url: str, ready, stop, delivered, results) -> None:
+    async def main() -> None:
+        latencies: list[float] = []
+        manager = WebSocketManager(cluster=WebSocketCluster(redis_url=redis_url))
+        for user_id in range(index, users, workers):
+            await manager.connect(BenchSocket(delivered, latencies), user_id)
+        if not manager.cluster.is_running:
+            raise RuntimeError(f"Worker {index} could not reach Redis at {redis_url}")
+        ready.set()
+        while not stop.is_set():
+            await asyncio.sleep(0.05)
+        await manager.shutdown()
+        results.put(latencies)
+
+    asyncio.run(main())
+
+
+async def publish(redis_url: str, users: int, messages: int, concurrency: int) -> tuple[float, int]:
+    manager = WebSocketManager(cluster=WebSocketCluster(redis_url=redis_url))
+    # The publisher joins the cluster without sockets of its own
+    await manager.cluster.start(manager._deliver_from_cluster)
+    semaphore = asyncio.Semaphore(concurrency)
+    undelivered = 0
+
+    async def send(i: int) -> None:
+        nonlocal undelivered
+        async with semaphore:
+            message = {"type": "new_message", "message_id": i, "sent_at": time.time()}
+            if not await manager.send_personal_message(message, random.randrange(users)):
+                undelivered += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(send(i) for i in range(messages)))
+    elapsed = time.perf_counter() - started
+    await manager.shutdown()
+    return elapsed, undelivered
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for delivery")
+    args = parser.parse_args()
+
+    redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+    ctx = mp.get_context("spawn")
+    stop = ctx.Event()
+    results = ctx.Queue()
+    counters = [ctx.Value("q", 0, lock=False) for _ in range(args.workers)]
+    ready_events = [ctx.Event() for _ in range(args.workers)]
+    processes = [
+        ctx.Process(
+            target=run_worker,
+            args=(i, args.workers, args.users, redis_url, ready_events[i], stop, counters[i], results),
+        )
+        for i in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    for event in ready_events:
+        if not event.wait(30):
+            stop.set()
+            sys.exit("Workers did not come up; is Redis reachable?")
+
+    print(f"{args.workers} workers, {args.users} users, {args.messages} messages, concurrency {args.concurrency}")
+    started = time.perf_counter()
+    publish_seconds, undelivered = asyncio.run(
+        publish(redis_url, args.users, args.messages, args.concurrency)
+    )
+    expected = args.messages - undelivered
+    deadline = time.perf_counter() + args.timeout
+    while sum(c.value for c in counters) < expected and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    total_seconds = time.perf_counter() - started
+    delivered = sum(c.value for c in counters)
+
+    stop.set()
+    latencies = sorted(sample for _ in processes for sample in results.get(timeout=30))
+    for process in processes:
+        process.join(timeout=10)
+
+    print(f"published      {args.messages / publish_seconds:>10.0f} msg/s ({publish_seconds:.2f}s)")
+    print(f"delivered      {delivered / total_seconds:>10.0f} msg/s ({delivered}/{args.messages}, "
+          f"{undelivered} reported offline)")
+    print(f"per worker     {', '.join(str(c.value) for c in counters)}")
+    if latencies:
+        print(
+            f"latency ms     p50 {percentile(latencies, 0.50) * 1000:.2f}  "
+            f"p95 {percentile(latencies, 0.95) * 1000:.2f}  "
+            f"p99 {percentile(latencies, 0.99) * 1000:.2f}  "
+            f"mean {statistics.mean(latencies) * 1000:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()